@@ -11,6 +11,9 @@ import threading
 import time
 import json
 import random
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta, timezone
 from enum import Enum
@@ -27,6 +30,10 @@ from Job_Portal_Automation.utilities.content_type_detector import get_content_ty
 logger = logging.getLogger(__name__)
 
 
+class _RunStopped(Exception):
+    """Raised inside a stage when the run is stopped"""
+
+
 class ProcessorState(str, Enum):
     """States for the background processor"""
     IDLE = "idle"
@@ -41,13 +48,26 @@ class JobAutomationProcessor:
     
     Responsibilities:
     - Execute automation runs
-    - Process items sequentially
+    - Process items through bounded concurrent stages
+      (details fetch -> article generation -> feature images -> publishing)
     - Generate content
     - Publish to WordPress
     - Track progress
     - Handle errors gracefully
+    
+    Items are prepared concurrently, each stage limited to its own worker count,
+    but published strictly in selection order so author rotation and per-profile
+    schedule times come out the same as a sequential run.
     """
     
+    # Default workers per stage (overridable via Config or run config 'stage_workers')
+    DEFAULT_STAGE_WORKERS = {
+        'details': 4,
+        'article': 3,
+        'images': 2,
+        'publish': 4,
+    }
+    
     def __init__(self, automation_manager: JobAutomationManager,
                  state_manager: JobPublishingStateManager):
         """
@@ -65,6 +85,12 @@ class JobAutomationProcessor:
         self.thread: Optional[threading.Thread] = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
+        # Run control signals: the gate is set while running (cleared while paused)
+        self._run_gate = threading.Event()
+        self._run_gate.set()
+        self._stop_event = threading.Event()
+        self._publish_executor: Optional[ThreadPoolExecutor] = None
+        
         # Callback functions
         self.on_progress: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
@@ -113,6 +139,8 @@ class JobAutomationProcessor:
             # Set current run
             self.current_run_id = run_id
             self.state = ProcessorState.RUNNING
+            self._stop_event.clear()
+            self._run_gate.set()
             
             self.logger.info(f"Starting processor for run {run_id}")
             
@@ -150,6 +178,7 @@ class JobAutomationProcessor:
             return False
         
         self.state = ProcessorState.PAUSED
+        self._run_gate.clear()
         
         if self.current_run_id:
             self.state_manager.update_run_status(
@@ -172,6 +201,7 @@ class JobAutomationProcessor:
             return False
         
         self.state = ProcessorState.RUNNING
+        self._run_gate.set()
         
         if self.current_run_id:
             self.state_manager.update_run_status(
@@ -194,6 +224,8 @@ class JobAutomationProcessor:
             return False
         
         self.state = ProcessorState.STOPPED
+        self._stop_event.set()
+        self._run_gate.set()  # Release anything waiting on a pause
         
         if self.current_run_id:
             self.state_manager.update_run_status(
@@ -264,6 +296,13 @@ class JobAutomationProcessor:
             published_count = 0
             error_count = 0
             
+            # Per-profile RNGs seeded from the run, so every profile's schedule is reproducible
+            schedule_rngs = {}
+            def schedule_rng(profile_id):
+                if profile_id not in schedule_rngs:
+                    schedule_rngs[profile_id] = random.Random(f"{run_id}:{profile_id}")
+                return schedule_rngs[profile_id]
+            
             # Initialize per-profile schedule tracking (each profile gets its own schedule_time)
             # Check each profile's INDIVIDUAL publish_status, not the global one
             profile_schedule_times = {}
@@ -285,7 +324,7 @@ class JobAutomationProcessor:
                     interval_config = profile_intervals.get(profile_id, {})
                     min_int = interval_config.get('min', 30)
                     max_int = interval_config.get('max', 120)
-                    first_article_delay = random.randint(min_int, max_int)
+                    first_article_delay = schedule_rng(profile_id).randint(min_int, max_int)
                     init_time = datetime.now(timezone.utc) + timedelta(minutes=first_article_delay)
                     profile_schedule_times[profile_id] = {
                         'schedule_time': init_time,
@@ -298,70 +337,112 @@ class JobAutomationProcessor:
                 else:
                     self.logger.info(f"   ⏭️  Profile '{profile_id}': Status is '{profile_publish_status}' (no scheduling)")
             
-            for idx, item in enumerate(selected_items):
-                # Check for pause/stop signals
-                if self.state == ProcessorState.PAUSED:
+            stage_workers = self._resolve_stage_workers(config)
+            stage_slots = {
+                stage: threading.BoundedSemaphore(workers)
+                for stage, workers in stage_workers.items() if stage != 'publish'
+            }
+            self.logger.info(f"⚙️  Stage workers: {stage_workers}")
+            user_uid = run.get('user_uid')
+            
+            # Stages 1-3 run concurrently across items; each stage holds one of its own slots
+            item_executor = ThreadPoolExecutor(
+                max_workers=max(1, sum(workers for stage, workers in stage_workers.items() if stage != 'publish')),
+                thread_name_prefix='job-item'
+            )
+            self._publish_executor = ThreadPoolExecutor(
+                max_workers=stage_workers['publish'],
+                thread_name_prefix='job-publish'
+            )
+            # Only a window of items is prepared ahead of the publish cursor, so a
+            # large run does not hold every generated article and image at once
+            prepare_ahead = self._resolve_prepare_ahead(config, stage_workers)
+            prepared_futures = {}
+            
+            def submit_prepare(idx):
+                if idx < total_items and not self._stop_event.is_set():
+                    prepared_futures[idx] = item_executor.submit(
+                        self._prepare_item,
+                        run_id=run_id,
+                        item=selected_items[idx],
+                        content_type=content_type,
+                        target_profiles=target_profiles,
+                        config=config,
+                        item_index=idx + 1,
+                        stage_slots=stage_slots
+                    )
+            
+            try:
+                for idx in range(prepare_ahead):
+                    submit_prepare(idx)
+                
+                # Stage 4: publish in selection order as items become ready
+                for idx, item in enumerate(selected_items):
+                    # Check for pause/stop signals
+                    if not self._run_gate.is_set() and not self._stop_event.is_set():
+                        self._emit_progress(
+                            run_id=run_id,
+                            status="paused",
+                            processed=idx,
+                            total=total_items,
+                            message=f"Paused at item {idx + 1}/{total_items}"
+                        )
+                    
+                    if not self._wait_until_runnable():
+                        break
+                    
+                    # Update progress
                     self._emit_progress(
                         run_id=run_id,
-                        status="paused",
+                        status="processing",
                         processed=idx,
                         total=total_items,
-                        message=f"Paused at item {idx + 1}/{total_items}"
+                        message=f"Processing item {idx + 1}/{total_items}: {item.get('title', 'Unknown')}"
                     )
-
-                    # Wait while paused
-                    while self.state == ProcessorState.PAUSED:
-                        time.sleep(0.5)
-                
-                if self.state == ProcessorState.STOPPED:
-                    break
-                
-                # Update progress
-                self._emit_progress(
-                    run_id=run_id,
-                    status="processing",
-                    processed=idx,
-                    total=total_items,
-                    message=f"Processing item {idx + 1}/{total_items}: {item.get('title', 'Unknown')}"
-                )
-                
-                # Process item with USER_UID for state rotation and current schedule_times
-                user_uid = run.get('user_uid')
-                success = self._process_item(
-                    run_id=run_id,
-                    item=item,
-                    content_type=content_type,
-                    target_profiles=target_profiles,
-                    config=config,
-                    item_index=idx + 1,
-                    user_uid=user_uid, # Pass user_uid for rotation state
-                    profile_schedule_times=profile_schedule_times,  # Pass per-profile schedule times
-                    profile_intervals=profile_intervals,  # Pass per-profile intervals
-                    publish_status=publish_status,  # Pass publish status
-                    is_first_item=(idx == 0)  # Indicate if this is first item
-                )
-                
-                if success:
-                    published_count += 1
                     
-                    # Calculate next schedule time for each profile that's in future/schedule mode
-                    # Only update if NOT the last article and profile is in schedule_times
-                    if idx < total_items - 1:  # Not the last article
-                        for profile_id in target_profiles:
-                            # Only update profiles that were initialized for scheduling
-                            if profile_id in profile_schedule_times:
-                                interval_config = profile_intervals.get(profile_id, {})
-                                min_int = interval_config.get('min', 30)
-                                max_int = interval_config.get('max', 120)
-                                random_interval = random.randint(min_int, max_int)
-                                profile_schedule_times[profile_id]['schedule_time'] += timedelta(minutes=random_interval)
-                                profile_name = interval_config.get('profile_name', profile_id)
-                                self.logger.info(f"⏰ Profile '{profile_name}': Next article in {random_interval} min → {profile_schedule_times[profile_id]['schedule_time'].isoformat()}")
-                else:
-                    error_count += 1
-                
-                # Brief delay to avoid overwhelming resources
-                time.sleep(0.5)
+                    prepared_future = prepared_futures.pop(idx, None)
+                    if prepared_future is None:
+                        break
+                    prepared = prepared_future.result()
+                    submit_prepare(idx + prepare_ahead)
+                    if self._stop_event.is_set():
+                        break
+                    
+                    success = prepared is not None and self._publish_prepared_item(
+                        run_id=run_id,
+                        prepared=prepared,
+                        target_profiles=target_profiles,
+                        config=config,
+                        user_uid=user_uid, # Pass user_uid for rotation state
+                        profile_schedule_times=profile_schedule_times,  # Pass per-profile schedule times
+                        profile_intervals=profile_intervals,  # Pass per-profile intervals
+                        publish_status=publish_status,  # Pass publish status
+                        is_first_item=(idx == 0)  # Indicate if this is first item
+                    )
+                    
+                    if success:
+                        published_count += 1
+                        
+                        # Calculate next schedule time for each profile that's in future/schedule mode
+                        # Only update if NOT the last article and profile is in schedule_times
+                        if idx < total_items - 1:  # Not the last article
+                            for profile_id in target_profiles:
+                                # Only update profiles that were initialized for scheduling
+                                if profile_id in profile_schedule_times:
+                                    interval_config = profile_intervals.get(profile_id, {})
+                                    min_int = interval_config.get('min', 30)
+                                    max_int = interval_config.get('max', 120)
+                                    random_interval = schedule_rng(profile_id).randint(min_int, max_int)
+                                    profile_schedule_times[profile_id]['schedule_time'] += timedelta(minutes=random_interval)
+                                    profile_name = interval_config.get('profile_name', profile_id)
+                                    self.logger.info(f"⏰ Profile '{profile_name}': Next article in {random_interval} min → {profile_schedule_times[profile_id]['schedule_time'].isoformat()}")
+                    else:
+                        error_count += 1
+            finally:
+                # Items still queued when stopping are dropped; in-flight stages finish on their own
+                item_executor.shutdown(wait=not self._stop_event.is_set(), cancel_futures=True)
+                self._publish_executor.shutdown(wait=True)
+                self._publish_executor = None
             
             # Determine final status
             if self.state == ProcessorState.STOPPED:
@@ -400,6 +481,41 @@ class JobAutomationProcessor:
             self.state = ProcessorState.IDLE
             self.current_run_id = None
     
+    def _resolve_stage_workers(self, config: Dict[str, Any]) -> Dict[str, int]:
+        """Workers per stage: defaults, then Config attributes, then the run config's 'stage_workers'"""
+        app_config = getattr(self.automation_manager, 'config', None)
+        workers = {
+            stage: getattr(app_config, f"JOB_{stage.upper()}_WORKERS", default)
+            for stage, default in self.DEFAULT_STAGE_WORKERS.items()
+        }
+        overrides = config.get('stage_workers') or {}
+        for stage in workers:
+            if stage in overrides:
+                workers[stage] = overrides[stage]
+        return {stage: max(1, int(count)) for stage, count in workers.items()}
+    
+    def _resolve_prepare_ahead(self, config: Dict[str, Any], stage_workers: Dict[str, int]) -> int:
+        """Items prepared ahead of publishing: run config 'prepare_ahead', else enough to keep every stage worker busy"""
+        prepare_ahead = config.get('prepare_ahead')
+        if prepare_ahead is None:
+            prepare_ahead = getattr(getattr(self.automation_manager, 'config', None), 'JOB_PREPARE_AHEAD', None)
+        if prepare_ahead is None:
+            prepare_ahead = sum(workers for stage, workers in stage_workers.items() if stage != 'publish')
+        return max(1, int(prepare_ahead))
+    
+    def _wait_until_runnable(self) -> bool:
+        """Block while paused; returns False once the run has been stopped"""
+        self._run_gate.wait()
+        return not self._stop_event.is_set()
+    
+    def _run_stage(self, stage_slots: Dict[str, threading.BoundedSemaphore], stage: str,
+                   func: Callable, *args, **kwargs):
+        """Run func holding one of the stage's worker slots (waits while paused)"""
+        if not self._wait_until_runnable():
+            raise _RunStopped()
+        with stage_slots[stage]:
+            return func(*args, **kwargs)
+    
     def _process_item(self, run_id: str, item: Dict[str, Any],
                      content_type: str, target_profiles: List[str],
                      config: Dict[str, Any], item_index: int, user_uid: str = None,
@@ -408,7 +524,7 @@ class JobAutomationProcessor:
                      publish_status: str = 'draft',
                      is_first_item: bool = False) -> bool:
         """
-        Process a single item
+        Process a single item (all stages, sequentially)
         
         Args:
             run_id: Run ID
@@ -426,6 +542,50 @@ class JobAutomationProcessor:
         Returns:
             True if item processed successfully
         """
+        prepared = self._prepare_item(
+            run_id=run_id,
+            item=item,
+            content_type=content_type,
+            target_profiles=target_profiles,
+            config=config,
+            item_index=item_index
+        )
+        if prepared is None:
+            return False
+        return self._publish_prepared_item(
+            run_id=run_id,
+            prepared=prepared,
+            target_profiles=target_profiles,
+            config=config,
+            user_uid=user_uid,
+            profile_schedule_times=profile_schedule_times,
+            profile_intervals=profile_intervals,
+            publish_status=publish_status,
+            is_first_item=is_first_item
+        )
+    
+    def _prepare_item(self, run_id: str, item: Dict[str, Any],
+                      content_type: str, target_profiles: List[str],
+                      config: Dict[str, Any], item_index: int,
+                      stage_slots: Optional[Dict[str, threading.BoundedSemaphore]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Stages 1-3 for a single item: fetch details, generate the article, render feature images
+        
+        Args:
+            run_id: Run ID
+            item: Item to process
+            content_type: Type of content
+            target_profiles: Target WordPress profiles
+            config: Automation config
+            item_index: Item index (1-based)
+            stage_slots: Per-stage semaphores bounding concurrency (None = unbounded, sequential use)
+            
+        Returns:
+            Prepared item dict ready for publishing, or None if a stage failed or the run was stopped
+        """
+        if stage_slots is None:
+            stage_slots = {stage: threading.BoundedSemaphore(1) for stage in ('details', 'article', 'images')}
+        
         try:
             item_id = item.get('id')
             item_title = item.get('title', 'Unknown')
@@ -442,7 +602,9 @@ class JobAutomationProcessor:
             actual_content_type = detected_content_type
             
             # Step 1: Fetch full details
-            details_result = self.automation_manager.fetch_item_details(
+            details_result = self._run_stage(
+                stage_slots, 'details',
+                self.automation_manager.fetch_item_details,
                 item_url,
                 content_type=actual_content_type.rstrip('s')  # Remove 's' from 'jobs', 'results', etc.
             )
@@ -457,18 +619,20 @@ class JobAutomationProcessor:
                     step='detail_fetching'
                 )
                 self._emit_error(run_id, f"Item {item_index}: {error_msg}")
-                return False
+                return None
             
-            # Step 2: Generate content (Article Pipeline: API Details + Perplexity Research + Gemini Generation)
-            # NOTE: This now generates content WITHOUT a final headline (headline will be generated after)
-            article_data = self._generate_article(
+            # Step 2: Generate content, headline and internal links
+            article_data = self._run_stage(
+                stage_slots, 'article',
+                self._build_article,
                 item=item,
                 details=details_result.get('details', {}),
                 content_type=actual_content_type,
+                target_profiles=target_profiles,
                 config=config
             )
             
-            if not article_data or not article_data.get('content'):
+            if not article_data:
                 error_msg = "Failed to generate article"
                 self.state_manager.add_run_error(
                     run_id,
@@ -478,61 +642,152 @@ class JobAutomationProcessor:
                     step='article_generation'
                 )
                 self._emit_error(run_id, f"Item {item_index}: {error_msg}")
-                return False
+                return None
+            
+            # Step 3: Render one feature image per watermark (website) used by the profiles
+            feature_images = {}
+            for website_name in self._feature_image_website_names(config, target_profiles):
+                feature_images[website_name] = self._run_stage(
+                    stage_slots, 'images',
+                    self._generate_feature_image,
+                    title=article_data['title'],
+                    content_type=actual_content_type,
+                    website_name=website_name,
+                    item_id=item_id
+                )
             
-            # Step 2.5: EXTRACT KEY INFO from generated content for headline generation
-            extracted_info = self.content_type_detector.extract_key_info_from_content(
-                content=article_data.get('content', ''),
-                details=details_result.get('details', {})
+            return {
+                'item': item,
+                'item_index': item_index,
+                'content_type': actual_content_type,
+                'article': article_data,
+                'feature_images': feature_images
+            }
+        
+        except _RunStopped:
+            return None
+        except Exception as e:
+            self.logger.error(f"Error processing item {item_index}: {e}")
+            self.state_manager.add_run_error(
+                run_id,
+                item_id=item.get('id'),
+                item_title=item.get('title'),
+                error_message=str(e),
+                step='unknown'
             )
-            
-            # Step 2.6: GENERATE ENHANCED HEADLINE using extracted info and detected content type
-            original_title = item.get('title', '')
-            final_headline = self.pipeline.generate_enhanced_headline(
-                original_title=original_title,
-                content_type=actual_content_type,
-                details=details_result.get('details', {}),
-                extracted_info=extracted_info
+            self._emit_error(run_id, f"Item {item_index}: {str(e)}")
+            return None
+    
+    def _build_article(self, item: Dict[str, Any], details: Dict[str, Any], content_type: str,
+                       target_profiles: List[str], config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Generate the article, its enhanced headline and internal links; None if generation failed"""
+        item_title = item.get('title', 'Unknown')
+        
+        # Article Pipeline: API Details + Perplexity Research + Gemini Generation
+        # NOTE: This generates content WITHOUT a final headline (headline will be generated after)
+        article_data = self._generate_article(
+            item=item,
+            details=details,
+            content_type=content_type,
+            config=config
+        )
+        
+        if not article_data or not article_data.get('content'):
+            return None
+        
+        # EXTRACT KEY INFO from generated content for headline generation
+        extracted_info = self.content_type_detector.extract_key_info_from_content(
+            content=article_data.get('content', ''),
+            details=details
+        )
+        
+        # GENERATE ENHANCED HEADLINE using extracted info and detected content type
+        original_title = item.get('title', '')
+        final_headline = self.pipeline.generate_enhanced_headline(
+            original_title=original_title,
+            content_type=content_type,
+            details=details,
+            extracted_info=extracted_info
+        )
+        
+        self.logger.info(f"📰 Final headline: {final_headline}")
+        
+        # Update article data with the enhanced headline
+        article_data['title'] = final_headline
+        article_data['original_title'] = original_title
+        
+        # Add internal links (optional - integrate with existing internal linking system)
+        try:
+            article_data['content'] = self._add_internal_links(
+                content=article_data.get('content', ''),
+                title=article_data.get('title', item_title),
+                target_profiles=target_profiles,
+                config=config
             )
+            self.logger.info(f"Internal links added to article")
+        except Exception as e:
+            self.logger.warning(f"Failed to add internal links: {e}. Continuing with original content.")
+            # Continue with original content if internal linking fails
+        
+        return article_data
+    
+    def _feature_image_website_names(self, config: Dict[str, Any], target_profiles: List[str]) -> List[str]:
+        """Watermarks _publish_to_profiles will need for the run's target profiles, in profile order"""
+        profiles = config.get('profiles', [])
+        if not profiles:
+            return ["Job Portal"]
+        targets = set(target_profiles or [])
+        names = []
+        for profile_data in profiles:
+            if not profile_data.get('profile_id') or not profile_data.get('site_url') or not profile_data.get('authors'):
+                continue
+            if targets and profile_data['profile_id'] not in targets:
+                continue
+            website_name = self._extract_website_name(profile_data)
+            if website_name not in names:
+                names.append(website_name)
+        return names
+    
+    def _publish_prepared_item(self, run_id: str, prepared: Dict[str, Any],
+                               target_profiles: List[str], config: Dict[str, Any],
+                               user_uid: str = None,
+                               profile_schedule_times: Optional[Dict[str, Any]] = None,
+                               profile_intervals: Optional[Dict[str, Any]] = None,
+                               publish_status: str = 'draft',
+                               is_first_item: bool = False) -> bool:
+        """
+        Stage 4 for a single item: publish to target profiles and record results
+        
+        Returns:
+            True if the item was published to at least one profile
+        """
+        item = prepared['item']
+        item_index = prepared['item_index']
+        article_data = prepared['article']
+        
+        try:
+            item_id = item.get('id')
+            item_title = item.get('title', 'Unknown')
             
-            self.logger.info(f"📰 Final headline: {final_headline}")
-            
-            # Update article data with the enhanced headline
-            article_data['title'] = final_headline
-            article_data['original_title'] = original_title
-            
-            # Step 3: Add internal links (optional - integrate with existing internal linking system)
-            article_content = article_data.get('content', '')
-            try:
-                article_content = self._add_internal_links(
-                    content=article_content,
-                    title=article_data.get('title', item_title),
-                    target_profiles=target_profiles,
-                    config=config
-                )
-                self.logger.info(f"Internal links added to article")
-            except Exception as e:
-                self.logger.warning(f"Failed to add internal links: {e}. Continuing with original content.")
-                # Continue with original content if internal linking fails
-            
-            # Step 4: Publish to target profiles (with feature image generation per profile)
+            # Publish to target profiles (using the pre-rendered feature images)
             article_slug = article_data.get('slug')
             self.logger.info(f"📝 Publishing with slug: '{article_slug}' (type: {type(article_slug).__name__})")
             
             # IMPORTANT: Pass the DETECTED content type and FINAL headline for publishing
             published_urls = self._publish_to_profiles(
                 item_id=item_id,
-                title=final_headline,  # Use the enhanced headline, not original
+                title=article_data['title'],  # Use the enhanced headline, not original
                 slug=article_slug,  # Pass SEO-optimized slug
-                content=article_content,
-                content_type=actual_content_type,  # Pass DETECTED type, not original
+                content=article_data.get('content', ''),
+                content_type=prepared['content_type'],  # Pass DETECTED type, not original
                 target_profiles=target_profiles,
                 config=config,
                 user_uid=user_uid,  # Pass user_uid for rotation state
                 profile_schedule_times=profile_schedule_times,  # Pass per-profile schedule times
                 profile_intervals=profile_intervals,  # Pass per-profile intervals
                 publish_status=publish_status,  # Pass publish status
-                is_first_item=is_first_item  # Pass first item flag
+                is_first_item=is_first_item,  # Pass first item flag
+                feature_images=prepared.get('feature_images')
             )
             
             if not published_urls:
@@ -547,7 +802,7 @@ class JobAutomationProcessor:
                 self._emit_error(run_id, f"Item {item_index}: {error_msg}")
                 return False
             
-            # Step 5: Record success
+            # Record success
             # Record each published URL with profile mapping
             for idx, url in enumerate(published_urls):
                 profile_name = target_profiles[idx] if idx < len(target_profiles) else (target_profiles[0] if target_profiles else 'unknown')
@@ -595,7 +850,8 @@ class JobAutomationProcessor:
             self.logger.error(f"Error generating article: {e}")
             return None
     
-    def _generate_feature_image(self, title: str, content_type: str, website_name: str = "Stockdunia") -> Optional[str]:
+    def _generate_feature_image(self, title: str, content_type: str, website_name: str = "Stockdunia",
+                                item_id: Optional[str] = None) -> Optional[str]:
         """
         Generate feature image for the article.
         
@@ -603,6 +859,7 @@ class JobAutomationProcessor:
             title: Article title
             content_type: Content type (jobs, results, admit_cards)
             website_name: Website name for watermark
+            item_id: Item the image belongs to (part of the unique file name)
             
         Returns:
             Path to generated feature image, or None if generation failed
@@ -613,13 +870,18 @@ class JobAutomationProcessor:
             # Pass content_type directly (FeatureImageGenerator expects 'jobs', 'results', 'admit_cards')
             # normalized_type = content_type.rstrip('s') 
             
+            # Unique file per (item, watermark, render) so parallel renders never share a path
+            name_parts = [content_type, str(item_id or 'item'), website_name]
+            filename = '_'.join(re.sub(r'[^A-Za-z0-9-]+', '-', part).strip('-') or 'x' for part in name_parts)
+            
             # Generate the feature image
             image_path = self.feature_image_generator.generate(
                 title=title,
                 content_type=content_type,
                 site_name=website_name,
                 site_url='',
-                template='professional'
+                template='professional',
+                filename=f"{filename}_{uuid.uuid4().hex}.jpg"
             )
             
             return str(image_path) if image_path else None
@@ -742,10 +1004,14 @@ class JobAutomationProcessor:
                             profile_schedule_times: Optional[Dict[str, Any]] = None,
                             profile_intervals: Optional[Dict[str, Any]] = None,
                             publish_status: str = 'draft',
-                            is_first_item: bool = False) -> List[str]:
+                            is_first_item: bool = False,
+                            feature_images: Optional[Dict[str, Optional[str]]] = None) -> List[str]:
         """
         Publish article to WordPress profiles using standalone publisher.
         
+        Profiles are published concurrently on the publish stage pool when a run
+        is active; URLs are returned in profile order either way.
+        
         Args:
             item_id: Item ID
             title: Article title
@@ -759,6 +1025,7 @@ class JobAutomationProcessor:
             profile_intervals: Per-profile interval configs
             publish_status: Publish status (draft, future, publish)
             is_first_item: Whether this is the first item
+            feature_images: Pre-rendered feature image paths keyed by website name
             
         Returns:
             List of published URLs
@@ -775,11 +1042,15 @@ class JobAutomationProcessor:
             status = publish_status or getattr(self.automation_manager.config, 'WORDPRESS_DEFAULT_STATUS', 'draft')
             
             # Generate feature image with generic watermark for fallback
-            feature_image_path = self._generate_feature_image(
-                title=title,
-                content_type=content_type,
-                website_name="Job Portal"
-            )
+            if feature_images is not None and "Job Portal" in feature_images:
+                feature_image_path = feature_images["Job Portal"]
+            else:
+                feature_image_path = self._generate_feature_image(
+                    title=title,
+                    content_type=content_type,
+                    website_name="Job Portal",
+                    item_id=item_id
+                )
             
             for profile_id in target_profiles:
                 try:
@@ -807,161 +1078,196 @@ class JobAutomationProcessor:
                     self.logger.error(f"Publishing failed for profile {profile_id}: {e}")
             return published_urls
         
-        # Use profile-specific configurations
-        for profile_data in profiles:
-            profile_id = profile_data.get('profile_id')
-            if not profile_id:
-                continue
+        # Use profile-specific configurations (each profile has its own author rotation and schedule)
+        profile_jobs = [profile_data for profile_data in profiles if profile_data.get('profile_id')]
+        publish_kwargs = dict(
+            item_id=item_id,
+            title=title,
+            slug=slug,
+            content=content,
+            content_type=content_type,
+            user_uid=user_uid,
+            profile_schedule_times=profile_schedule_times,
+            profile_intervals=profile_intervals,
+            feature_images=feature_images
+        )
+        executor = self._publish_executor
+        if executor is not None and len(profile_jobs) > 1:
+            futures = [executor.submit(self._publish_to_profile, profile_data, **publish_kwargs)
+                       for profile_data in profile_jobs]
+            results = [future.result() for future in futures]
+        else:
+            results = [self._publish_to_profile(profile_data, **publish_kwargs) for profile_data in profile_jobs]
+        
+        published_urls.extend(url for url in results if url)
+        return published_urls
+    
+    def _publish_to_profile(self, profile_data: Dict[str, Any], item_id: str, title: str,
+                            slug: Optional[str], content: str, content_type: str,
+                            user_uid: str = None,
+                            profile_schedule_times: Optional[Dict[str, Any]] = None,
+                            profile_intervals: Optional[Dict[str, Any]] = None,
+                            feature_images: Optional[Dict[str, Optional[str]]] = None) -> Optional[str]:
+        """
+        Publish article to a single WordPress profile.
+        
+        Returns:
+            Published URL, or None if publishing to this profile failed
+        """
+        profile_id = profile_data.get('profile_id')
+        
+        # Extract profile-specific settings
+        category_id = profile_data.get('category_id')
+        publish_status = profile_data.get('publish_status', 'draft')
+        
+        # Map 'schedule' to 'future' if used
+        if publish_status == 'schedule':
+            publish_status = 'future'
+
+        # Logic to handle user selection: publish, draft, or future
+        # If future, the publisher will handle scheduling (defaults to 5-15 mins if no time provided)
+        # which matches the sports automation logic requested.
+        
+        try:
+            # Get WordPress credentials from profile (same format as sports automation)
+            site_url = profile_data.get('site_url')
+            authors = profile_data.get('authors', [])
             
-            # Extract profile-specific settings
-            category_id = profile_data.get('category_id')
-            publish_status = profile_data.get('publish_status', 'draft')
+            # ------ AUTHOR ROTATION LOGIC START ------
+            author = None
+            current_author_index = -1
             
-            # Map 'schedule' to 'future' if used
-            if publish_status == 'schedule':
-                publish_status = 'future'
-
-            # Logic to handle user selection: publish, draft, or future
-            # If future, the publisher will handle scheduling (defaults to 5-15 mins if no time provided)
-            # which matches the sports automation logic requested.
+            if authors and len(authors) > 0:
+                if user_uid:
+                    # 1. Get last used index from state (default -1)
+                    last_author_index = self.state_manager.get_last_author_index(user_uid, profile_id)
+                    
+                    # 2. Calculate next index (round-robin)
+                    current_author_index = (last_author_index + 1) % len(authors)
+                    
+                    # 3. Select author
+                    author = authors[current_author_index]
+                    self.logger.info(f"🔄 Rotating authors: Selected author {current_author_index + 1}/{len(authors)} '{author.get('wp_username')}' (Last: {last_author_index})")
+                else:
+                    # Fallback if no user_uid (should not happen in normal flow)
+                    author = authors[0]
+                    self.logger.warning("No user_uid provided for author rotation, using first author.")
+            # ------ AUTHOR ROTATION LOGIC END ------
+                            
+            if not author:
+                self.logger.error(f"No author found for profile {profile_id}. Available fields: {list(profile_data.keys())}")
+                self.state_manager.add_run_error(
+                    self.current_run_id or "unknown",
+                    item_id=item_id,
+                    item_title=title,
+                    error_message=f"Profile {profile_id} has no author configured",
+                    step='publishing'
+                )
+                return None
             
-            try:
-                # Get WordPress credentials from profile (same format as sports automation)
-                site_url = profile_data.get('site_url')
-                authors = profile_data.get('authors', [])
-                
-                # ------ AUTHOR ROTATION LOGIC START ------
-                author = None
-                current_author_index = -1
-                
-                if authors and len(authors) > 0:
-                    if user_uid:
-                        # 1. Get last used index from state (default -1)
-                        last_author_index = self.state_manager.get_last_author_index(user_uid, profile_id)
-                        
-                        # 2. Calculate next index (round-robin)
-                        current_author_index = (last_author_index + 1) % len(authors)
-                        
-                        # 3. Select author
-                        author = authors[current_author_index]
-                        self.logger.info(f"🔄 Rotating authors: Selected author {current_author_index + 1}/{len(authors)} '{author.get('wp_username')}' (Last: {last_author_index})")
-                    else:
-                        # Fallback if no user_uid (should not happen in normal flow)
-                        author = authors[0]
-                        self.logger.warning("No user_uid provided for author rotation, using first author.")
-                # ------ AUTHOR ROTATION LOGIC END ------
-                                
-                if not author:
-                    self.logger.error(f"No author found for profile {profile_id}. Available fields: {list(profile_data.keys())}")
-                    self.state_manager.add_run_error(
-                        self.current_run_id or "unknown",
-                        item_id=item_id,
-                        item_title=title,
-                        error_message=f"Profile {profile_id} has no author configured",
-                        step='publishing'
-                    )
-                    continue
-                
-                # Extract credentials from author
-                username = author.get('wp_username')
-                app_password = author.get('app_password')
-                
-                # Log credentials status
-                self.logger.info(f"Profile {profile_id}: site_url={site_url}, author_username={'***' if username else None}, app_password={'***' if app_password else None}")
-                
-                if not all([site_url, username, app_password]):
-                    self.logger.error(f"Missing credentials for profile {profile_id}: site_url={bool(site_url)}, username={bool(username)}, app_password={bool(app_password)}")
-                    self.state_manager.add_run_error(
-                        self.current_run_id or "unknown",
-                        item_id=item_id,
-                        item_title=title,
-                        error_message=f"Incomplete credentials for profile {profile_id}",
-                        step='publishing'
-                    )
-                    continue
-                
-                # Generate feature image with THIS profile's website name
-                website_name = self._extract_website_name(profile_data)
-                self.logger.info(f"🏷️  Generating feature image with watermark: '{website_name}'")
-                
+            # Extract credentials from author
+            username = author.get('wp_username')
+            app_password = author.get('app_password')
+            
+            # Log credentials status
+            self.logger.info(f"Profile {profile_id}: site_url={site_url}, author_username={'***' if username else None}, app_password={'***' if app_password else None}")
+            
+            if not all([site_url, username, app_password]):
+                self.logger.error(f"Missing credentials for profile {profile_id}: site_url={bool(site_url)}, username={bool(username)}, app_password={bool(app_password)}")
+                self.state_manager.add_run_error(
+                    self.current_run_id or "unknown",
+                    item_id=item_id,
+                    item_title=title,
+                    error_message=f"Incomplete credentials for profile {profile_id}",
+                    step='publishing'
+                )
+                return None
+            
+            # Generate feature image with THIS profile's website name
+            website_name = self._extract_website_name(profile_data)
+            self.logger.info(f"🏷️  Feature image with watermark: '{website_name}'")
+            
+            if feature_images is not None and website_name in feature_images:
+                feature_image_path = feature_images[website_name]
+            else:
                 feature_image_path = self._generate_feature_image(
                     title=title,
                     content_type=content_type,
-                    website_name=website_name
+                    website_name=website_name,
+                    item_id=item_id
                 )
-                
-                if not feature_image_path:
-                    self.logger.warning(f"⚠️  Feature image generation failed for profile {profile_id}")
-                
-                # Get schedule time specific to this profile
-                profile_schedule_time = None
-                if publish_status == 'future':
-                    if profile_schedule_times and profile_id in profile_schedule_times:
-                        profile_schedule_time = profile_schedule_times[profile_id].get('schedule_time')
-                        profile_name = profile_data.get('profile_name', profile_id)
-                        self.logger.info(f"⏰ Profile '{profile_name}': Using pre-calculated schedule time {profile_schedule_time.isoformat()}")
-                    else:
-                        # Profile not in pre-initialized schedule_times - calculate on-the-fly using profile intervals
-                        if profile_intervals and profile_id in profile_intervals:
-                            interval_config = profile_intervals[profile_id]
-                            min_int = interval_config.get('min', 30)
-                            max_int = interval_config.get('max', 120)
-                            # First time for this profile - create initial schedule_time with random interval
-                            random_delay = random.randint(min_int, max_int)
-                            profile_schedule_time = datetime.now(timezone.utc) + timedelta(minutes=random_delay)
-                            # Store it for subsequent uses
-                            if not profile_schedule_times:
-                                profile_schedule_times = {}
+            
+            if not feature_image_path:
+                self.logger.warning(f"⚠️  Feature image generation failed for profile {profile_id}")
+            
+            # Get schedule time specific to this profile
+            profile_schedule_time = None
+            if publish_status == 'future':
+                if profile_schedule_times and profile_id in profile_schedule_times:
+                    profile_schedule_time = profile_schedule_times[profile_id].get('schedule_time')
+                    profile_name = profile_data.get('profile_name', profile_id)
+                    self.logger.info(f"⏰ Profile '{profile_name}': Using pre-calculated schedule time {profile_schedule_time.isoformat()}")
+                else:
+                    # Profile not in pre-initialized schedule_times - calculate on-the-fly using profile intervals
+                    if profile_intervals and profile_id in profile_intervals:
+                        interval_config = profile_intervals[profile_id]
+                        min_int = interval_config.get('min', 30)
+                        max_int = interval_config.get('max', 120)
+                        # First time for this profile - create initial schedule_time with random interval
+                        random_delay = random.randint(min_int, max_int)
+                        profile_schedule_time = datetime.now(timezone.utc) + timedelta(minutes=random_delay)
+                        # Store it for subsequent uses
+                        if profile_schedule_times is not None:
                             profile_schedule_times[profile_id] = {
                                 'schedule_time': profile_schedule_time,
                                 'first_article_delay': random_delay
                             }
-                            profile_name = profile_data.get('profile_name', profile_id)
-                            self.logger.info(f"⏰ Profile '{profile_name}': Calculated schedule time from intervals ({min_int}-{max_int} min): {profile_schedule_time.isoformat()}")
-                        else:
-                            self.logger.warning(f"⚠️  Profile '{profile_id}' not found in profile_schedule_times or profile_intervals. "
-                                              f"Available profiles: {list(profile_schedule_times.keys()) if profile_schedule_times else 'None'}")
-                            self.logger.warning(f"   publish_status={publish_status}, profile_schedule_times={profile_schedule_times is not None}")
+                        profile_name = profile_data.get('profile_name', profile_id)
+                        self.logger.info(f"⏰ Profile '{profile_name}': Calculated schedule time from intervals ({min_int}-{max_int} min): {profile_schedule_time.isoformat()}")
+                    else:
+                        self.logger.warning(f"⚠️  Profile '{profile_id}' not found in profile_schedule_times or profile_intervals. "
+                                          f"Available profiles: {list(profile_schedule_times.keys()) if profile_schedule_times else 'None'}")
+                        self.logger.warning(f"   publish_status={publish_status}, profile_schedule_times={profile_schedule_times is not None}")
+            
+            # Publish article using author credentials (same as sports automation)
+            url = publish_job_article(
+                profile_id=profile_id,
+                title=title,
+                slug=slug,  # Pass SEO-optimized slug
+                content=content,
+                status=publish_status,
+                category_id=category_id,
+                feature_image_path=feature_image_path,  # Pass profile-specific feature image
+                dry_run=False,
+                site_url=site_url,
+                author=author,  # Pass author dict with wp_username and app_password
+                schedule_time=profile_schedule_time  # Pass profile-specific schedule_time for 'future' posts
+            )
+            
+            if url:
+                profile_name = profile_data.get('profile_name', profile_id)
+                self.logger.info(f"Published item {item_id} to profile '{profile_name}': {url}")
                 
-                # Publish article using author credentials (same as sports automation)
-                url = publish_job_article(
-                    profile_id=profile_id,
-                    title=title,
-                    slug=slug,  # Pass SEO-optimized slug
-                    content=content,
-                    status=publish_status,
-                    category_id=category_id,
-                    feature_image_path=feature_image_path,  # Pass profile-specific feature image
-                    dry_run=False,
-                    site_url=site_url,
-                    author=author,  # Pass author dict with wp_username and app_password
-                    schedule_time=profile_schedule_time  # Pass profile-specific schedule_time for 'future' posts
-                )
+                # 4. Save new author index state ONLY after successful publish
+                if user_uid and current_author_index != -1:
+                    self.state_manager.set_last_author_index(user_uid, profile_id, current_author_index)
+                    self.logger.info(f"💾 Saved updated author index {current_author_index} for profile {profile_id}")
                 
-                if url:
-                    published_urls.append(url)
-                    profile_name = profile_data.get('profile_name', profile_id)
-                    self.logger.info(f"Published item {item_id} to profile '{profile_name}': {url}")
-                    
-                    # 4. Save new author index state ONLY after successful publish
-                    if user_uid and current_author_index != -1:
-                        self.state_manager.set_last_author_index(user_uid, profile_id, current_author_index)
-                        self.logger.info(f"💾 Saved updated author index {current_author_index} for profile {profile_id}")
-                    
-                else:
-                    raise WPJobPublishingError("No URL returned from publisher")
-                    
-            except Exception as e:
-                self.logger.error(f"Publishing failed for profile {profile_id}: {e}")
-                self.state_manager.add_run_error(
-                    self.current_run_id or "unknown",
-                    item_id=item_id,
-                    item_title=title,
-                    error_message=str(e),
-                    step='publishing'
-                )
+                return url
+            else:
+                raise WPJobPublishingError("No URL returned from publisher")
                 
-        return published_urls
+        except Exception as e:
+            self.logger.error(f"Publishing failed for profile {profile_id}: {e}")
+            self.state_manager.add_run_error(
+                self.current_run_id or "unknown",
+                item_id=item_id,
+                item_title=title,
+                error_message=str(e),
+                step='publishing'
+            )
+            
+        return None
     
     # ===================== PROGRESS & ERROR REPORTING =====================
     
@@ -987,6 +1293,9 @@ class JobAutomationProcessor:
                 current_item=message
             )
             
+            if self.on_progress:
+                self.on_progress(run_id, status, processed, total, message)
+            
             self.logger.info(f"Progress: {processed}/{total} - {message}")
             
         except Exception as e:
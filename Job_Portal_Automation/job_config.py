@@ -81,6 +81,12 @@ class Config:
     # Scheduling intervals for 'future' posts (matches sports article scheduling)
     MIN_SCHEDULING_INTERVAL_MINUTES = int(os.getenv('JOB_MIN_INTERVAL', '45'))
     MAX_SCHEDULING_INTERVAL_MINUTES = int(os.getenv('JOB_MAX_INTERVAL', '90'))
+    
+    # Run processing: concurrent workers per stage (publishing stays in item order)
+    JOB_DETAILS_WORKERS = int(os.getenv('JOB_DETAILS_WORKERS', '4'))
+    JOB_ARTICLE_WORKERS = int(os.getenv('JOB_ARTICLE_WORKERS', '3'))
+    JOB_IMAGES_WORKERS = int(os.getenv('JOB_IMAGES_WORKERS', '2'))
+    JOB_PUBLISH_WORKERS = int(os.getenv('JOB_PUBLISH_WORKERS', '4'))
 
 
 class DevelopmentConfig(Config):
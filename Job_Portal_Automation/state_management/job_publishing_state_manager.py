@@ -9,6 +9,7 @@ Integrates with Firestore for cloud storage and local JSON files for backup.
 import json
 import logging
 import os
+import threading
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
@@ -38,6 +39,10 @@ class JobPublishingStateManager:
     - Run history tracking
     - Progress monitoring
     - Error recovery
+    
+    Read-modify-write updates of a run or of a user's writer rotation state hold
+    a per-document lock, and results/errors are appended in Firestore with
+    ArrayUnion, so concurrent publish workers do not overwrite each other.
     """
     
     def __init__(self, local_state_dir: Optional[str] = None,
@@ -60,6 +65,10 @@ class JobPublishingStateManager:
         self.local_state_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"State directory: {self.local_state_dir}")
         
+        # One lock per run / per user rotation document
+        self._doc_locks: Dict[str, threading.Lock] = {}
+        self._doc_locks_guard = threading.Lock()
+        
         # Initialize Firestore if available
         self.use_firestore = use_firestore
         self.firestore_client = None
@@ -168,44 +177,41 @@ class JobPublishingStateManager:
     
     def update_run_status(self, run_id: str, status: RunStatus) -> bool:
         """Update run status"""
-        run_data = self.get_run(run_id)
-        if not run_data:
-            logger.error(f"Run {run_id} not found")
-            return False
-        
-        run_data['status'] = status.value
-        run_data['updated_at'] = datetime.now().isoformat()
-        
-        if status == RunStatus.COMPLETED:
-            run_data['completed_at'] = datetime.now().isoformat()
-        
-        return self._save_run(run_id, run_data)
+        with self._doc_lock(f"run:{run_id}"):
+            run_data = self.get_run(run_id)
+            if not run_data:
+                logger.error(f"Run {run_id} not found")
+                return False
+            
+            run_data['status'] = status.value
+            run_data['updated_at'] = datetime.now().isoformat()
+            
+            if status == RunStatus.COMPLETED:
+                run_data['completed_at'] = datetime.now().isoformat()
+            
+            return self._save_run(run_id, run_data)
     
     def update_run_progress(self, run_id: str, 
                            completed: int, failed: int,
                            current_item: Optional[str] = None) -> bool:
         """Update run progress"""
-        run_data = self.get_run(run_id)
-        if not run_data:
-            logger.error(f"Run {run_id} not found")
-            return False
-        
-        run_data['progress']['completed'] = completed
-        run_data['progress']['failed'] = failed
-        run_data['progress']['current_item'] = current_item
-        run_data['updated_at'] = datetime.now().isoformat()
-        
-        return self._save_run(run_id, run_data)
+        with self._doc_lock(f"run:{run_id}"):
+            run_data = self.get_run(run_id)
+            if not run_data:
+                logger.error(f"Run {run_id} not found")
+                return False
+            
+            run_data['progress']['completed'] = completed
+            run_data['progress']['failed'] = failed
+            run_data['progress']['current_item'] = current_item
+            run_data['updated_at'] = datetime.now().isoformat()
+            
+            return self._save_run(run_id, run_data)
     
     def add_run_result(self, run_id: str, item_id: str, 
                       item_title: str, published_url: str,
                       profile_name: str) -> bool:
         """Add a successful publishing result"""
-        run_data = self.get_run(run_id)
-        if not run_data:
-            logger.error(f"Run {run_id} not found")
-            return False
-        
         result = {
             'timestamp': datetime.now().isoformat(),
             'item_id': item_id,
@@ -215,20 +221,12 @@ class JobPublishingStateManager:
             'status': 'success'
         }
         
-        run_data['results'].append(result)
-        run_data['updated_at'] = datetime.now().isoformat()
-        
-        return self._save_run(run_id, run_data)
+        return self._append_run_entry(run_id, 'results', result)
     
     def add_run_error(self, run_id: str, item_id: str,
                      item_title: str, error_message: str,
                      step: str = "unknown") -> bool:
         """Add an error to the run"""
-        run_data = self.get_run(run_id)
-        if not run_data:
-            logger.error(f"Run {run_id} not found")
-            return False
-        
         error = {
             'timestamp': datetime.now().isoformat(),
             'item_id': item_id,
@@ -237,10 +235,42 @@ class JobPublishingStateManager:
             'step': step
         }
         
-        run_data['errors'].append(error)
-        run_data['updated_at'] = datetime.now().isoformat()
+        return self._append_run_entry(run_id, 'errors', error)
+    
+    def _append_run_entry(self, run_id: str, field: str, entry: Dict[str, Any]) -> bool:
+        """
+        Append a result/error entry to a run.
         
-        return self._save_run(run_id, run_data)
+        The local copy is rewritten under the run's lock; Firestore gets an
+        ArrayUnion on the one field, so entries appended by other workers
+        (or processes) are kept.
+        """
+        updated_at = datetime.now().isoformat()
+        with self._doc_lock(f"run:{run_id}"):
+            run_data = self._load_local_run(run_id)
+            if run_data is None:
+                run_data = self.get_run(run_id)
+            if not run_data:
+                logger.error(f"Run {run_id} not found")
+                return False
+            
+            run_data.setdefault(field, []).append(entry)
+            run_data['updated_at'] = updated_at
+            local_saved = self._save_local_run(run_id, run_data)
+            
+            if not self.db:
+                return local_saved
+            try:
+                from firebase_admin import firestore
+                self.db.collection('job_automation_runs').document(run_id).update({
+                    field: firestore.ArrayUnion([entry]),
+                    'updated_at': updated_at
+                })
+                return True
+            except Exception as e:
+                # Document missing in Firestore: write the full run instead
+                logger.warning(f"Failed to append {field} entry to Firestore run {run_id}: {e}")
+                return self._save_firestore_run(run_id, run_data)
     
     def get_run_history(self, user_uid: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get run history for a user"""
@@ -357,13 +387,16 @@ class JobPublishingStateManager:
             logger.error(f"Error loading writer rotation state for user {user_uid}: {e}", exc_info=True)
             return {}
     
-    def save_writer_rotation_state(self, user_uid: str, state: Dict[str, Dict[str, int]]) -> bool:
+    def save_writer_rotation_state(self, user_uid: str, state: Dict[str, Dict[str, int]],
+                                   changed: Optional[Dict[str, Dict[str, int]]] = None) -> bool:
         """
         Save writer rotation state for a user.
         
         Args:
             user_uid: Firebase user ID
             state: State dict with structure: {profile_id: {last_author_index: int}}
+            changed: Optional subset of profiles to merge into the Firestore
+                document instead of replacing it with the full state
             
         Returns:
             True if saved successfully
@@ -381,7 +414,11 @@ class JobPublishingStateManager:
             # Save to Firestore if available
             if self.db:
                 try:
-                    self.db.collection('job_automation_writer_rotation').document(user_uid).set(state)
+                    doc_ref = self.db.collection('job_automation_writer_rotation').document(user_uid)
+                    if changed is not None:
+                        doc_ref.set(changed, merge=True)
+                    else:
+                        doc_ref.set(state)
                     logger.info(f"✅ Saved writer rotation state to Firestore for user {user_uid}")
                     return True
                 except Exception as e:
@@ -422,15 +459,28 @@ class JobPublishingStateManager:
         Returns:
             True if saved successfully
         """
-        state = self.load_writer_rotation_state(user_uid)
-        
-        if str(profile_id) not in state:
-            state[str(profile_id)] = {}
-        
-        state[str(profile_id)]['last_author_index'] = author_index
-        logger.debug(f"Updated last author index for user {user_uid}, profile {profile_id}: {author_index}")
-        
-        return self.save_writer_rotation_state(user_uid, state)
+        with self._doc_lock(f"rotation:{user_uid}"):
+            state = self.load_writer_rotation_state(user_uid)
+            
+            if str(profile_id) not in state:
+                state[str(profile_id)] = {}
+            
+            state[str(profile_id)]['last_author_index'] = author_index
+            logger.debug(f"Updated last author index for user {user_uid}, profile {profile_id}: {author_index}")
+            
+            # Only this profile's entry goes to Firestore, so profiles published
+            # concurrently (here or in another process) keep their own indexes
+            return self.save_writer_rotation_state(
+                user_uid, state, changed={str(profile_id): state[str(profile_id)]}
+            )
+    
+    def _doc_lock(self, key: str) -> threading.Lock:
+        """Lock guarding read-modify-write of one run or rotation document"""
+        with self._doc_locks_guard:
+            lock = self._doc_locks.get(key)
+            if lock is None:
+                lock = self._doc_locks[key] = threading.Lock()
+            return lock
     
     def _save_run(self, run_id: str, run_data: Dict) -> bool:
         """Save run data (both local and Firestore)"""
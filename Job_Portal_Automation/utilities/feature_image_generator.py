@@ -17,6 +17,7 @@ Supports:
 
 import logging
 import os
+import uuid
 from pathlib import Path
 from typing import Optional, Tuple, Dict
 from datetime import datetime
@@ -408,7 +409,8 @@ class FeatureImageGenerator:
                 content_type: str = 'jobs',
                 site_name: str = 'Job Portal',
                 site_url: str = '',
-                template: str = 'professional') -> Path:
+                template: str = 'professional',
+                filename: Optional[str] = None) -> Path:
         """
         Generate professional CTR-optimized feature image.
         
@@ -418,6 +420,7 @@ class FeatureImageGenerator:
             site_name: Website name for watermark
             site_url: Website URL for watermark
             template: Design template (default: 'professional')
+            filename: Output file name inside output_dir (default: unique per call)
             
         Returns:
             Path to saved image file
@@ -447,9 +450,10 @@ class FeatureImageGenerator:
                 text_info, site_name, site_url, colors
             )
         
-        # Save image
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{content_type}_{timestamp}.jpg"
+        # Save image (every render gets its own file; concurrent renders must not overwrite each other)
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{content_type}_{timestamp}_{uuid.uuid4().hex[:12]}.jpg"
         filepath = self.output_dir / filename
         
         image.save(filepath, 'JPEG', quality=95, optimize=True)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Forecast Period Tables
+======================
+
+Vectorized post-processing of a Prophet forecast into the period tables the
+reports show (actual averages and forecast Low / Average / High per day,
+week or month).
+
+Every granularity is computed with one ``groupby`` per table over
+precomputed period keys (no per-group Python loops):
+
+- **daily**: one row per calendar date (``YYYY-MM-DD``)
+- **weekly**: weeks ending Sunday, labelled with the week-end date
+  (``YYYY-MM-DD``, same bins and labels as ``resample('W')``)
+- **monthly**: ``YYYY-MM``; in the actual table the current month shows its
+  latest price instead of its average
+
+Forecast intervals:
+------------------
+- ``'quantile'`` (native Prophet): Low = 10th percentile of ``yhat_lower``,
+  High = 90th percentile of ``yhat_upper``
+- ``'std'`` (WSL bridge): mean of ``yhat`` +- its standard deviation, floored
+  at 0, optionally widened by a calibration factor
+
+Weekly tables aggregate the weekly means, as the previous resample-then-group
+code did.
+
+The result is a ``ForecastPeriods`` object. ``train_prophet_model`` attaches
+it to the forecast and to the aggregated tables (``DataFrame.attrs``), so
+report sections read the period label and the 1-month / 1-year values
+directly instead of re-deriving them from the ``Period`` strings.
+
+Usage:
+------
+```python
+periods = build_forecast_periods(history, forecast, forecast_days=365)
+periods.actual, periods.forecast          # tables returned by train_prophet_model
+periods.period_label                      # 'Day' / 'Week' / 'Month'
+periods.value_near(last_date + pd.Timedelta(days=365))  # 1-year average
+forecast_periods(rdata['monthly_forecast_table_data'])  # read back from attrs
+```
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ATTRS_KEY = 'forecast_periods'
+
+PERIOD_LABELS = {'daily': 'Day', 'weekly': 'Week', 'monthly': 'Month'}
+# How much recent history each granularity shows next to the forecast
+HISTORY_WINDOWS = {
+    'daily': pd.Timedelta(days=15),
+    'weekly': pd.DateOffset(months=3),
+    'monthly': pd.DateOffset(months=8),
+}
+FORECAST_COLUMNS = ['Period', 'Low', 'Average', 'High']
+
+
+def granularity_for_horizon(forecast_days: int) -> str:
+    """Table granularity for a forecast horizon in days"""
+    if forecast_days <= 30:
+        return 'daily'
+    if forecast_days <= 90:
+        return 'weekly'
+    return 'monthly'
+
+
+def _period_dates(dates: pd.Series, granularity: str) -> pd.Series:
+    """Date each row's period is labelled with (day, week-ending Sunday, month start)"""
+    if granularity == 'daily':
+        return dates.dt.normalize()
+    if granularity == 'weekly':
+        return dates.dt.to_period('W-SUN').dt.end_time.dt.normalize()
+    return dates.dt.to_period('M').dt.start_time
+
+
+def _period_keys(period_dates: pd.Series, granularity: str) -> pd.Series:
+    return period_dates.dt.strftime('%Y-%m' if granularity == 'monthly' else '%Y-%m-%d')
+
+
+def _weekly_means(frame: pd.DataFrame, columns) -> pd.DataFrame:
+    """Collapse rows to one per week (mean), keyed like resample('W')"""
+    week_end = _period_dates(frame['ds'], 'weekly')
+    weekly = frame[columns].groupby(week_end.rename('ds'), sort=True).mean().reset_index()
+    return weekly
+
+
+def aggregate_actual(history: pd.DataFrame, granularity: str, current_date=None) -> pd.DataFrame:
+    """
+    Actual price table (Period, Average) for ``history`` (``ds`` / ``y`` rows).
+
+    Monthly tables show the latest price for the current month.
+    """
+    frame = history[['ds', 'y']]
+    if granularity == 'weekly':
+        frame = _weekly_means(frame, ['y'])
+    keys = _period_keys(_period_dates(frame['ds'], granularity), granularity)
+    table = frame['y'].groupby(keys.rename('Period'), sort=True).mean().rename('Average').reset_index()
+    if granularity == 'monthly' and not table.empty:
+        current_month = pd.Timestamp(current_date or pd.Timestamp.now()).to_period('M').strftime('%Y-%m')
+        is_current = table['Period'] == current_month
+        if is_current.any():
+            table.loc[is_current, 'Average'] = frame['y'][keys == current_month].iloc[-1]
+    return table
+
+
+def aggregate_forecast(forecast_future: pd.DataFrame, granularity: str, interval: str = 'quantile',
+                       calibration_factor: Optional[float] = None) -> pd.DataFrame:
+    """Forecast table (Period, Low, Average, High) for the future rows of a Prophet forecast"""
+    frame = forecast_future[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+    if granularity == 'weekly':
+        frame = _weekly_means(frame, ['yhat', 'yhat_lower', 'yhat_upper'])
+    keys = _period_keys(_period_dates(frame['ds'], granularity), granularity).rename('Period')
+    grouped = frame.groupby(keys, sort=True)
+
+    if interval == 'quantile':
+        table = grouped.agg(Average=('yhat', 'mean'))
+        table['Low'] = grouped['yhat_lower'].quantile(0.1)
+        table['High'] = grouped['yhat_upper'].quantile(0.9)
+    elif interval == 'std':
+        table = grouped.agg(Average=('yhat', 'mean'), Spread=('yhat', 'std'))
+        table['Low'] = np.fmax(0, table['Average'] - table['Spread'])  # keep >= 0 for stock prices
+        table['High'] = table['Average'] + table['Spread']
+        if calibration_factor:
+            width = (table['High'] - table['Low']) * calibration_factor
+            table['Low'] = np.fmax(0, table['Average'] - width / 2)
+            table['High'] = table['Average'] + width / 2
+    else:
+        raise ValueError(f"Unknown forecast interval '{interval}'")
+    return table.reset_index()[FORECAST_COLUMNS]
+
+
+class ForecastPeriods:
+    """
+    Period tables derived from one forecast.
+
+    Immutable once built: ``attach`` stores the object in the attrs of its own
+    ``actual`` / ``forecast`` tables, and ``__deepcopy__`` relies on nobody
+    modifying it or those tables in place afterwards (copy a table before
+    adding columns to it).
+    """
+
+    def __init__(self, granularity: str, actual: pd.DataFrame, forecast: pd.DataFrame,
+                 last_date: pd.Timestamp):
+        self.granularity = granularity
+        self.period_label = PERIOD_LABELS[granularity]
+        self.actual = actual
+        self.forecast = forecast
+        self.last_date = last_date
+        self._period_dates = None
+
+    def __deepcopy__(self, memo):
+        # pandas deep-copies DataFrame.attrs on most frame operations (e.g. sort_values) without passing
+        # ``memo``, so copying this object would copy its tables, whose attrs point back here: endless
+        # recursion. Shared instead, which is safe only because the object is immutable (class docstring).
+        return self
+
+    @property
+    def period_dates(self) -> pd.Series:
+        """Date each forecast table row stands for, aligned with ``forecast``"""
+        if self._period_dates is None:
+            fmt = '%Y-%m' if self.granularity == 'monthly' else '%Y-%m-%d'
+            self._period_dates = pd.to_datetime(self.forecast['Period'], format=fmt)
+        return self._period_dates
+
+    def value_near(self, target_date) -> Optional[float]:
+        """Average of the forecast period closest to ``target_date``"""
+        if self.forecast.empty:
+            return None
+        distance = (self.period_dates - pd.Timestamp(target_date)).abs()
+        return float(self.forecast['Average'].iloc[int(np.argmin(distance.to_numpy()))])
+
+    def attach(self, *frames: pd.DataFrame):
+        """
+        Store this object in each frame's ``attrs`` (read back with ``forecast_periods``).
+
+        Frames derived from these (copies, sorts, slices) share the same object, see ``__deepcopy__``.
+        """
+        for frame in frames:
+            if isinstance(frame, pd.DataFrame):
+                frame.attrs[ATTRS_KEY] = self
+
+
+def build_forecast_periods(history: pd.DataFrame, forecast: pd.DataFrame, forecast_days: int,
+                           interval: str = 'quantile', calibration_factor: Optional[float] = None,
+                           current_date=None) -> ForecastPeriods:
+    """
+    Period tables for a forecast.
+
+    Args:
+        history: Training rows (``ds``, ``y``)
+        forecast: Prophet forecast (``ds``, ``yhat``, ``yhat_lower``, ``yhat_upper``)
+        forecast_days: Forecast horizon in days (selects the table granularity)
+        interval: 'quantile' or 'std' (see module docstring)
+        calibration_factor: Interval widening for 'std'
+        current_date: "Now" for the current-month rule (default: now)
+
+    The first forecast period is set to the last actual average so the two
+    tables join smoothly.
+    """
+    granularity = granularity_for_horizon(forecast_days)
+    last_date = history['ds'].max()
+    history = history[['ds', 'y']]
+    forecast_future = forecast[forecast['ds'] >= last_date]
+
+    recent = history[history['ds'] >= last_date - HISTORY_WINDOWS[granularity]]
+    actual = aggregate_actual(recent, granularity, current_date)
+    table = aggregate_forecast(forecast_future, granularity, interval, calibration_factor)
+
+    if not actual.empty and not table.empty:
+        table.loc[table.index[0], ['Low', 'Average', 'High']] = actual['Average'].iloc[-1]
+
+    return ForecastPeriods(granularity, actual, table, last_date)
+
+
+def forecast_periods(frame) -> Optional[ForecastPeriods]:
+    """The ForecastPeriods attached to a forecast / period table, if any"""
+    if isinstance(frame, pd.DataFrame):
+        periods = frame.attrs.get(ATTRS_KEY)
+        if isinstance(periods, ForecastPeriods):
+            return periods
+    return None
@@ -140,6 +140,11 @@ except (ImportError, AttributeError) as e:
     import pandas as pd
     import re
 
+try:
+    from .forecast_periods import build_forecast_periods
+except ImportError:
+    from forecast_periods import build_forecast_periods
+
 # Try to import WSL bridge as backup for Windows CmdStan issues
 WSL_BRIDGE_AVAILABLE = False
 wsl_train_prophet_model = None
@@ -209,6 +214,9 @@ def train_prophet_model(data, ticker='STOCK', forecast_horizon='1y', timestamp=N
         forecast (pd.DataFrame): Forecasted results.
         agg_actual (pd.DataFrame): Aggregated actual data.
         agg_forecast (pd.DataFrame): Aggregated forecast data.
+
+        forecast, agg_actual and agg_forecast carry the ForecastPeriods they were built
+        from in ``attrs['forecast_periods']`` (see Models/forecast_periods.py).
     """
     # Try native Prophet first, fall back to WSL on Windows CmdStan errors or NumPy issues
     if PROPHET_AVAILABLE:
@@ -348,88 +356,14 @@ def _train_prophet_model_wsl(data, ticker='STOCK', forecast_horizon='1y', timest
     forecast['yhat_upper'] = forecast['yhat_upper'].clip(lower=0)
 
     # ----- Aggregate Data for Reporting -----
-    last_date = df['ds'].max()
-    current_date = pd.Timestamp.now()
-
-    # Choose aggregation frequency based on forecast period
-    if forecast_days <= 30:
-        start_date = last_date - pd.Timedelta(days=15)
-        agg_format = 'daily'
-        df_recent = df[df['ds'] >= start_date].copy()
-        df_recent['Period'] = df_recent['ds'].dt.strftime('%Y-%m-%d')
-    elif forecast_days <= 90:
-        start_date = last_date - pd.DateOffset(months=3)
-        agg_format = 'weekly'
-        df_recent = df[df['ds'] >= start_date].copy()
-        df_recent = df_recent.set_index('ds').resample('W').mean().reset_index()
-        df_recent['Period'] = df_recent['ds'].dt.strftime('%Y-%m-%d')
-    else:
-        start_date = last_date - pd.DateOffset(months=8)
-        agg_format = 'monthly'
-        df_recent = df[df['ds'] >= start_date].copy()
-        df_recent['Period'] = df_recent['ds'].dt.to_period('M').dt.strftime('%Y-%m')
-
-    # Aggregate actual historical prices with special handling for current month
-    if agg_format == 'monthly':
-        # For monthly aggregation, handle current month specially
-        current_month = current_date.to_period('M').strftime('%Y-%m')
-
-        # Group by period and calculate aggregates
-        period_groups = df_recent.groupby('Period')
-
-        agg_data = []
-        for period, group in period_groups:
-            if period == current_month:
-                # For current month, use the most recent price instead of average
-                latest_price = group['y'].iloc[-1]  # Most recent price in current month
-                agg_data.append({'Period': period, 'Average': latest_price})
-            else:
-                # For past months, use average
-                avg_price = group['y'].mean()
-                agg_data.append({'Period': period, 'Average': avg_price})
-
-        agg_actual = pd.DataFrame(agg_data)
-    else:
-        # For daily/weekly, use regular aggregation
-        agg_actual = df_recent.groupby('Period').agg({'y': 'mean'}).reset_index()
-        agg_actual.rename(columns={'y': 'Average'}, inplace=True)
-
-    # Aggregate the forecasted data.
-    forecast_future = forecast[forecast['ds'] >= last_date].copy()
-    if agg_format == 'daily':
-        forecast_future['Period'] = forecast_future['ds'].dt.strftime('%Y-%m-%d')
-    elif agg_format == 'weekly':
-        forecast_future = forecast_future.set_index('ds').resample('W').mean().reset_index()
-        forecast_future['Period'] = forecast_future['ds'].dt.strftime('%Y-%m-%d')
-    else:  # monthly
-        forecast_future['Period'] = forecast_future['ds'].dt.to_period('M').dt.strftime('%Y-%m')
-
-    # Use meaningful aggregation: lower bound = mean - std_dev of yhat, upper = mean + std_dev
-    # This avoids the 0 floor issue while maintaining reasonable confidence intervals
-    agg_data = []
-    for period, group in forecast_future.groupby('Period'):
-        mean_forecast = group['yhat'].mean()
-        std_forecast = group['yhat'].std()
-        
-        # Calculate bounds with std deviation
-        lower_bound = max(0, mean_forecast - std_forecast)  # Keep >= 0 for stock prices
-        upper_bound = mean_forecast + std_forecast
-        
-        agg_data.append({
-            'Period': period,
-            'Low': lower_bound,
-            'Average': mean_forecast,
-            'High': upper_bound
-        })
-    
-    agg_forecast = pd.DataFrame(agg_data)
-
+    # Lower / upper bound = mean -+ std dev of yhat (avoids the 0 floor of yhat_lower)
     # CALIBRATION: Apply confidence interval widening to achieve ~70% coverage
     # Calibration factors determined from backtesting against 18 stocks:
     # - Low volatility (<2%): 1.65x scaling
     # - Medium volatility (2-5%): 1.51x scaling  
     # - High volatility (>5%): 1.29x scaling
     # Result: Achieves 61.6% → 70% target coverage with 1.55x average scaling
+    calibration_factor = None
     if len(df) >= 100:
         # Calculate historical volatility to determine calibration factor
         returns = df['y'].pct_change().dropna()
@@ -442,20 +376,11 @@ def _train_prophet_model_wsl(data, ticker='STOCK', forecast_horizon='1y', timest
             calibration_factor = 1.48  # Medium volatility
         else:
             calibration_factor = 1.30  # High volatility already has wider intervals
-        
-        # Apply calibration to improve coverage
-        for idx in agg_forecast.index:
-            midpoint = agg_forecast.loc[idx, 'Average']
-            current_width = agg_forecast.loc[idx, 'High'] - agg_forecast.loc[idx, 'Low']
-            new_width = current_width * calibration_factor
-            
-            agg_forecast.loc[idx, 'Low'] = max(0, midpoint - new_width / 2)
-            agg_forecast.loc[idx, 'High'] = midpoint + new_width / 2
-
-    # Smooth the transition: set the first forecast period equal to last actual average.
-    if not agg_actual.empty and not agg_forecast.empty:
-        last_actual_value = agg_actual['Average'].iloc[-1]
-        agg_forecast.loc[agg_forecast.index[0], ['Low', 'Average', 'High']] = last_actual_value
+
+    periods = build_forecast_periods(df, forecast, forecast_days, interval='std',
+                                     calibration_factor=calibration_factor)
+    agg_actual, agg_forecast = periods.actual, periods.forecast
+    periods.attach(forecast, agg_actual, agg_forecast)
 
     return model, forecast, agg_actual, agg_forecast
 
@@ -552,82 +477,12 @@ def _train_prophet_model_native(data, ticker='STOCK', forecast_horizon='1y', tim
     forecast['yhat_lower'] = forecast['yhat_lower'].clip(lower=0)
     forecast['yhat_upper'] = forecast['yhat_upper'].clip(lower=0)
 
-    # ----- Aggregate Data for Reporting with Custom Grouping -----
-    last_date = df['ds'].max()
-    current_date = pd.Timestamp.now()
-    
-    # Choose aggregation frequency based on forecast period
-    if forecast_days <= 30:
-        # Daily grouping: use last 15 days (for example) from historical data
-        start_date = last_date - pd.Timedelta(days=15)
-        agg_format = 'daily'
-        df_recent = df[df['ds'] >= start_date].copy()
-        df_recent['Period'] = df_recent['ds'].dt.strftime('%Y-%m-%d')
-    elif forecast_days <= 90:
-        # Weekly grouping: use roughly last 3 months
-        start_date = last_date - pd.DateOffset(months=3)
-        agg_format = 'weekly'
-        df_recent = df[df['ds'] >= start_date].copy()
-        df_recent = df_recent.set_index('ds').resample('W').mean().reset_index()
-        df_recent['Period'] = df_recent['ds'].dt.strftime('%Y-%m-%d')
-    else:
-        # Monthly grouping: use roughly last 8 months
-        start_date = last_date - pd.DateOffset(months=8)
-        agg_format = 'monthly'
-        df_recent = df[df['ds'] >= start_date].copy()
-        df_recent['Period'] = df_recent['ds'].dt.to_period('M').dt.strftime('%Y-%m')
-
-    # Aggregate actual historical prices with special handling for current month
-    if agg_format == 'monthly':
-        # For monthly aggregation, handle current month specially
-        current_month = current_date.to_period('M').strftime('%Y-%m')
-
-        # Group by period and calculate aggregates
-        period_groups = df_recent.groupby('Period')
-
-        agg_data = []
-        for period, group in period_groups:
-            if period == current_month:
-                # For current month, use the most recent price instead of average
-                latest_price = group['y'].iloc[-1]  # Most recent price in current month
-                agg_data.append({'Period': period, 'Average': latest_price})
-            else:
-                # For past months, use average
-                avg_price = group['y'].mean()
-                agg_data.append({'Period': period, 'Average': avg_price})
-
-        agg_actual = pd.DataFrame(agg_data)
-    else:
-        # For daily/weekly, use regular aggregation
-        agg_actual = df_recent.groupby('Period').agg({'y': 'mean'}).reset_index()
-        agg_actual.rename(columns={'y': 'Average'}, inplace=True)
-
-    # Similarly, aggregate the forecasted data.
-    forecast_future = forecast[forecast['ds'] >= last_date].copy()
-    if agg_format == 'daily':
-        forecast_future['Period'] = forecast_future['ds'].dt.strftime('%Y-%m-%d')
-    elif agg_format == 'weekly':
-        forecast_future = forecast_future.set_index('ds').resample('W').mean().reset_index()
-        forecast_future['Period'] = forecast_future['ds'].dt.strftime('%Y-%m-%d')
-    else:  # monthly
-        forecast_future['Period'] = forecast_future['ds'].dt.to_period('M').dt.strftime('%Y-%m')
-
-    # Use percentile-based aggregation for confidence bounds (avoids 0 floor issue)
-    agg_forecast = forecast_future.groupby('Period').agg({
-        'yhat_lower': lambda x: x.quantile(0.1),  # 10th percentile for lower bound
-        'yhat': 'mean',                            # Mean for average forecast
-        'yhat_upper': lambda x: x.quantile(0.9)   # 90th percentile for upper bound
-    }).reset_index()
-    agg_forecast.rename(columns={
-        'yhat_lower': 'Low',
-        'yhat': 'Average',
-        'yhat_upper': 'High'
-    }, inplace=True)
-    
-    # Smooth the transition: set the first forecast period equal to last actual average.
-    if not agg_actual.empty and not agg_forecast.empty:
-        last_actual_value = agg_actual['Average'].iloc[-1]
-        agg_forecast.loc[agg_forecast.index[0], ['Low', 'Average', 'High']] = last_actual_value
+    # ----- Aggregate Data for Reporting -----
+    # Daily (<= 30d), weekly (<= 90d) or monthly tables; bounds are the 10th / 90th
+    # percentiles of yhat_lower / yhat_upper (avoids the 0 floor issue)
+    periods = build_forecast_periods(df, forecast, forecast_days, interval='quantile')
+    agg_actual, agg_forecast = periods.actual, periods.forecast
+    periods.attach(forecast, agg_actual, agg_forecast)
 
     # ----- Prepare Historical Data for Report Generation -----
     historical_data = data.copy()
@@ -1160,9 +1160,14 @@ class ArticleGenerationPipeline:
                 logging.error("❌ No articles available to process")
                 return []
             
+            # Research the whole batch concurrently up front; each article then reads it from the cache
+            batch_size = min(num_articles, len(articles))
+            if batch_size > 1 and hasattr(self.perplexity_client, 'prefetch_research'):
+                self.perplexity_client.prefetch_research(articles[:batch_size])
+            
             # Process articles
-            for i in range(min(num_articles, len(articles))):
-                logging.info(f"\n[{i+1}/{min(num_articles, len(articles))}] Processing article...")
+            for i in range(batch_size):
+                logging.info(f"\n[{i+1}/{batch_size}] Processing article...")
                 
                 # Select article
                 selected = self.select_headline_for_processing([articles[i]], selection_method)
@@ -8,6 +8,12 @@ This pipeline takes Google Trends keywords and generates high-quality sports art
 3. Generating human-like articles using Gemini AI with the existing sports journalist prompt
 4. Storing and managing generated articles
 
+Batch runs search the query variations of every selected trend up front in
+one concurrent fan-out (search_trends_batch in trends_search_enhancer.py) and
+then generate articles on a bounded worker pool (TRENDS_GENERATION_WORKERS);
+each Gemini call is paced by the shared provider limiter inside the article
+generator and Perplexity by its own client.
+
 Author: Tickzen AI System
 Created: December 25, 2025
 """
@@ -17,6 +23,8 @@ import sys
 import json
 import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Union
@@ -33,11 +41,14 @@ from testing.test_enhanced_search_content import EnhancedSearchContentFetcher
 from utilities.sports_article_generator import SportsArticleGenerator
 from utilities.perplexity_ai_client import PerplexityResearchCollector
 from core.article_generation_pipeline import ArticleGenerationPipeline
+from google_trends.trends_search_enhancer import GoogleTrendsSearchEnhancer
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+GENERATION_WORKERS = int(os.getenv('TRENDS_GENERATION_WORKERS', '3'))
+
 
 class GoogleTrendsDataLoader:
     """Load and process Google Trends data for article generation"""
@@ -51,6 +62,7 @@ class GoogleTrendsDataLoader:
             self.database_path = current_dir / "google_trends_database.json"
         
         self.generated_articles_path = current_dir / "generated_trends_articles.json"
+        self._history_lock = threading.Lock()
         
         logger.info(f"Google Trends database: {self.database_path}")
         logger.info(f"Generated articles tracking: {self.generated_articles_path}")
@@ -107,14 +119,6 @@ class GoogleTrendsDataLoader:
     def save_generated_article(self, trend_query: str, article_data: Dict):
         """Save generated article to history"""
         try:
-            # Load existing data
-            if self.generated_articles_path.exists():
-                with open(self.generated_articles_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {'generated_articles': []}
-            
-            # Add new article
             article_record = {
                 'trend_query': trend_query,
                 'generated_at': datetime.now().isoformat(),
@@ -126,11 +130,20 @@ class GoogleTrendsDataLoader:
                 'importance_score': article_data.get('importance_score', 0)
             }
             
-            data['generated_articles'].append(article_record)
-            
-            # Save back to file
-            with open(self.generated_articles_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Batch workers finish concurrently; serialize the read-modify-write
+            with self._history_lock:
+                # Load existing data
+                if self.generated_articles_path.exists():
+                    with open(self.generated_articles_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                else:
+                    data = {'generated_articles': []}
+                
+                data['generated_articles'].append(article_record)
+                
+                # Save back to file
+                with open(self.generated_articles_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Saved article record for trend: {trend_query}")
         
@@ -220,6 +233,7 @@ class GoogleTrendsArticlePipeline:
         # Initialize components
         self.trends_loader = GoogleTrendsDataLoader()
         self.search_fetcher = EnhancedSearchContentFetcher()
+        self.search_enhancer = GoogleTrendsSearchEnhancer(base_searcher=self.search_fetcher)
         self.sports_generator = SportsArticleGenerator()
         
         # Initialize Perplexity client (backup research method)
@@ -253,12 +267,13 @@ class GoogleTrendsArticlePipeline:
         logger.info(f"🤖 Sports Generator available: {self.sports_generator.available}")
         logger.info(f"🔄 Perplexity available: {self.perplexity_available}")
     
-    def generate_article_from_trend(self, trend_data: Dict) -> Dict:
+    def generate_article_from_trend(self, trend_data: Dict, search_result: Optional[Dict] = None) -> Dict:
         """
         Generate a complete article from a single trend
         
         Args:
             trend_data: Single trend data dict from Google Trends
+            search_result: Search result already fetched for the trend (batch runs)
             
         Returns:
             Dict: Article generation result
@@ -275,10 +290,8 @@ class GoogleTrendsArticlePipeline:
             logger.info(f"🔍 Step 1: Gathering comprehensive information...")
             
             search_start = time.time()
-            search_result = self.search_fetcher.collect_comprehensive_research(
-                headline=trend_query,
-                category="sports"
-            )
+            if search_result is None:
+                search_result = self.search_enhancer.search_trends_batch([trend_query], category="sports")[trend_query]
             search_time = time.time() - search_start
             
             if search_result.get('status') != 'success':
@@ -539,25 +552,36 @@ class GoogleTrendsArticlePipeline:
                 results['total_time'] = time.time() - batch_start
                 return results
             
-            logger.info(f"🎯 Generating articles for {len(selected_trends)} trends...")
+            # Search the query variations of every selected trend in one concurrent fan-out
+            logger.info(f"🔍 Searching {len(selected_trends)} trends...")
+            search_results = self.search_enhancer.search_trends_batch(
+                [trend['query'] for trend in selected_trends], category="sports"
+            )
             
-            # Generate articles for each trend
-            for i, trend in enumerate(selected_trends, 1):
-                logger.info(f"\n--- Processing Trend {i}/{len(selected_trends)} ---")
-                
-                trend_result = self.generate_article_from_trend(trend)
-                
+            workers = max(1, min(GENERATION_WORKERS, len(selected_trends)))
+            logger.info(f"🎯 Generating articles for {len(selected_trends)} trends ({workers} workers)...")
+            
+            # Generate articles on a bounded pool; provider limiters pace the API calls
+            trend_results = [None] * len(selected_trends)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='trends-gen') as pool:
+                futures = {
+                    pool.submit(self.generate_article_from_trend, trend, search_results.get(trend['query'])): i
+                    for i, trend in enumerate(selected_trends)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        trend_results[i] = future.result()
+                    except Exception as e:
+                        trend_results[i] = {'status': 'error', 'error': str(e), 'trend_query': selected_trends[i]['query']}
+            
+            for trend, trend_result in zip(selected_trends, trend_results):
                 if trend_result.get('status') == 'success':
                     results['articles_generated'].append(trend_result)
                     logger.info(f"✅ Successfully generated article for: {trend['query']}")
                 else:
                     results['failed_articles'].append(trend_result)
                     logger.error(f"❌ Failed to generate article for: {trend['query']}")
-                
-                # Small delay between generations to avoid rate limits
-                if i < len(selected_trends):
-                    logger.info("⏸️  Brief pause before next generation...")
-                    time.sleep(2)
             
             # Compile summary
             results['total_time'] = time.time() - batch_start
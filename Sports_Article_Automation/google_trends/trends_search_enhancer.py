@@ -12,6 +12,13 @@ trending search terms by:
 3. Enhanced filtering for trend-relevant articles
 4. Better handling of trending keywords vs traditional headlines
 
+Searches for all query variations of a trend, and for several trends at
+once, run concurrently under a shared rate limit
+(TRENDS_SEARCH_CONCURRENCY, SEARCH_CALLS_PER_MINUTE); identical queries in
+flight are searched once and results are cached per query and day. Article
+excerpts gathered by the variations are de-duplicated with hashed word
+shingles through an inverted index instead of pairwise comparison.
+
 Author: Tickzen AI System
 Created: December 25, 2025
 """
@@ -21,6 +28,11 @@ import sys
 import json
 import logging
 import time
+import zlib
+import asyncio
+import hashlib
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Union
@@ -34,18 +46,111 @@ sys.path.extend([str(sports_automation_dir), str(project_root)])
 
 # Import the original enhanced search
 from testing.test_enhanced_search_content import EnhancedSearchContentFetcher
+from utilities.rate_limiter import get_provider_limiter
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+SEARCH_CONCURRENCY = int(os.getenv('TRENDS_SEARCH_CONCURRENCY', '4'))
+SHINGLE_SIZE = 5                  # words per shingle
+SHINGLE_SAMPLE_MOD = 4            # keep 1 in 4 shingle hashes
+DUPLICATE_SIMILARITY = 0.8        # shingle Jaccard above which an excerpt is a duplicate
+
+
+def content_shingles(text: str) -> frozenset:
+    """Sampled hashes of the text's word shingles"""
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return frozenset([zlib.crc32(' '.join(words).encode('utf-8'))]) if words else frozenset()
+    hashes = (
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    )
+    sampled = frozenset(h for h in hashes if h % SHINGLE_SAMPLE_MOD == 0)
+    return sampled or frozenset([zlib.crc32(' '.join(words[:SHINGLE_SIZE]).encode('utf-8'))])
+
+
+class ShingleDeduplicator:
+    """Near-duplicate filter: candidates come from an inverted shingle index, not a scan of every kept piece"""
+
+    def __init__(self, threshold: float = DUPLICATE_SIMILARITY):
+        self.threshold = threshold
+        self._index: Dict[int, List[int]] = {}
+        self._sizes: List[int] = []
+
+    def add(self, text: str) -> bool:
+        """Index the text unless it duplicates one already added; returns True when it was new"""
+        shingles = content_shingles(text)
+        if not shingles:
+            return False
+        overlaps = Counter()
+        for shingle in shingles:
+            for doc_id in self._index.get(shingle, ()):
+                overlaps[doc_id] += 1
+        for doc_id, shared in overlaps.items():
+            if shared / (len(shingles) + self._sizes[doc_id] - shared) > self.threshold:
+                return False
+        doc_id = len(self._sizes)
+        self._sizes.append(len(shingles))
+        for shingle in shingles:
+            self._index.setdefault(shingle, []).append(doc_id)
+        return True
+
+
+class TrendSearchCache:
+    """Successful search results per (query, category, day), in memory and on disk"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self._memory: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str, category: str) -> str:
+        raw = f"{' '.join(query.lower().split())}|{category}|{datetime.now().strftime('%Y-%m-%d')}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:24]
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / datetime.now().strftime('%Y-%m-%d') / f"{key}.json"
+
+    def get(self, query: str, category: str) -> Optional[Dict]:
+        key = self._key(query, category)
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        with self._lock:
+            self._memory[key] = result
+        return result
+
+    def put(self, query: str, category: str, result: Dict):
+        if not result or result.get('status') != 'success':
+            return
+        key = self._key(query, category)
+        with self._lock:
+            self._memory[key] = result
+        try:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not cache search results for '{query}': {e}")
+
 
 class GoogleTrendsSearchEnhancer:
     """Enhanced search specifically optimized for Google Trends keywords"""
     
-    def __init__(self):
+    def __init__(self, base_searcher: Optional[EnhancedSearchContentFetcher] = None):
         """Initialize the Google Trends Search Enhancer"""
-        self.base_searcher = EnhancedSearchContentFetcher()
+        self.base_searcher = base_searcher or EnhancedSearchContentFetcher()
         self.available = self.base_searcher.available
+        self.search_cache = TrendSearchCache(current_dir / "search_cache")
+        self._search_limiter = get_provider_limiter('search', calls_per_minute=60, burst=SEARCH_CONCURRENCY)
         
         # Trend-specific search modifiers
         self.trend_query_enhancers = [
@@ -159,43 +264,27 @@ class GoogleTrendsSearchEnhancer:
         for i, query in enumerate(enhanced_queries, 1):
             logger.info(f"   {i}. {query}")
         
-        # Collect results from all query variations
+        # Run all query variations concurrently
+        search_results = self.search_queries(enhanced_queries, category=category)
+        
         all_results = []
         total_sources = 0
         total_words = 0
         search_errors = []
         
         for i, query in enumerate(enhanced_queries, 1):
-            logger.info(f"\n📊 Search {i}/{len(enhanced_queries)}: '{query}'")
-            
-            try:
-                # Use the base searcher with enhanced query
-                result = self.base_searcher.collect_comprehensive_research(
-                    headline=query,
-                    category=category
-                )
-                
-                if result.get('status') == 'success':
-                    all_results.append(result)
-                    sources = result.get('total_sources_processed', 0)
-                    words = result.get('total_words_collected', 0)
-                    total_sources += sources
-                    total_words += words
-                    
-                    logger.info(f"   ✅ Found {sources} sources, {words} words")
-                else:
-                    error = result.get('error', 'Unknown error')
-                    search_errors.append(f"Query '{query}': {error}")
-                    logger.warning(f"   ⚠️  Search failed: {error}")
-                
-                # Brief pause between searches to avoid rate limits
-                if i < len(enhanced_queries):
-                    time.sleep(1)
-                    
-            except Exception as e:
-                error_msg = str(e)
-                search_errors.append(f"Query '{query}': {error_msg}")
-                logger.error(f"   ❌ Search error: {error_msg}")
+            result = search_results.get(query, {})
+            if result.get('status') == 'success':
+                all_results.append(result)
+                sources = result.get('total_sources_processed', 0)
+                words = result.get('total_words_collected', 0)
+                total_sources += sources
+                total_words += words
+                logger.info(f"   ✅ Search {i}/{len(enhanced_queries)} '{query}': {sources} sources, {words} words")
+            else:
+                error = result.get('error', 'Unknown error')
+                search_errors.append(f"Query '{query}': {error}")
+                logger.warning(f"   ⚠️  Search {i}/{len(enhanced_queries)} '{query}' failed: {error}")
         
         search_time = time.time() - search_start
         
@@ -224,6 +313,99 @@ class GoogleTrendsSearchEnhancer:
         
         return combined_result
     
+    def search_trends_batch(self,
+                            trend_queries: List[str],
+                            category: str = "sports",
+                            max_search_variations: int = 3) -> Dict[str, Dict]:
+        """
+        Comprehensive search for several trends at once
+        
+        The query variations of every trend are searched in one concurrent
+        fan-out, then each trend's results are combined as in
+        search_trend_comprehensive().
+        
+        Returns:
+            Dict[str, Dict]: trend query -> combined search result
+        """
+        variations = {trend: self.enhance_trend_query(trend)[:max_search_variations] for trend in trend_queries}
+        all_queries = [query for queries in variations.values() for query in queries]
+        
+        search_start = time.time()
+        search_results = self.search_queries(all_queries, category=category)
+        search_time = time.time() - search_start
+        
+        combined = {}
+        for trend, queries in variations.items():
+            successful = [search_results[q] for q in queries if search_results.get(q, {}).get('status') == 'success']
+            if successful:
+                combined[trend] = self._combine_search_results(trend, successful, search_time)
+            else:
+                combined[trend] = {
+                    'status': 'error',
+                    'error': f"All {len(queries)} search variations failed",
+                    'search_errors': [f"Query '{q}': {search_results.get(q, {}).get('error', 'Unknown error')}" for q in queries],
+                    'search_time': search_time,
+                    'trend_query': trend,
+                    'queries_attempted': queries
+                }
+        return combined
+    
+    def search_queries(self, queries: List[str], category: str = "sports") -> Dict[str, Dict]:
+        """
+        Search results for every query, fetched concurrently
+        
+        Cached results (same query, category and day) are reused; a query
+        repeated in the list is searched once.
+        
+        Returns:
+            Dict[str, Dict]: query -> base searcher result
+        """
+        results = {}
+        pending = []
+        for query in dict.fromkeys(queries):
+            cached = self.search_cache.get(query, category)
+            if cached is not None:
+                results[query] = cached
+            else:
+                pending.append(query)
+        
+        if pending:
+            logger.info(f"🔍 Searching {len(pending)} queries ({len(results)} cached)...")
+            try:
+                results.update(asyncio.run(self._search_queries_async(pending, category)))
+            except RuntimeError:
+                # Already inside an event loop: fall back to searching one by one
+                for query in pending:
+                    results[query] = self._search_once(query, category)
+        return results
+    
+    async def _search_queries_async(self, queries: List[str], category: str) -> Dict[str, Dict]:
+        semaphore = asyncio.Semaphore(max(1, SEARCH_CONCURRENCY))
+        loop = asyncio.get_running_loop()
+        
+        async def search(query):
+            async with semaphore:
+                await self._search_limiter.acquire_async()
+                return await loop.run_in_executor(None, self._search_once, query, category, False)
+        
+        found = await asyncio.gather(*(search(query) for query in queries))
+        return dict(zip(queries, found))
+    
+    def _search_once(self, query: str, category: str, throttle: bool = True) -> Dict:
+        """One base-searcher call, cached on success"""
+        if throttle:
+            self._search_limiter.acquire()
+        try:
+            collect = getattr(self.base_searcher, 'collect_comprehensive_research', None)
+            if collect is None:
+                return {'status': 'error', 'error': 'Enhanced search is not available'}
+            result = collect(headline=query, category=category) or {}
+        except Exception as e:
+            logger.error(f"   ❌ Search error for '{query}': {e}")
+            return {'status': 'error', 'error': str(e)}
+        self.search_cache.put(query, category, result)
+        return result
+    
     def _combine_search_results(self, 
                                trend_query: str, 
                                search_results: List[Dict],
@@ -244,6 +426,7 @@ class GoogleTrendsSearchEnhancer:
         # Collect all unique sources and content
         all_sources = set()
         all_content_pieces = []
+        deduplicator = ShingleDeduplicator()
         all_urls = set()
         combined_research = []
         
@@ -261,14 +444,8 @@ class GoogleTrendsSearchEnhancer:
                 for content in result['article_contents']:
                     if content.get('status') == 'success':
                         content_text = content.get('content', '')
-                        if content_text and len(content_text) > 200:
-                            # Simple deduplication based on content similarity
-                            is_duplicate = any(
-                                self._content_similarity(content_text, existing.get('content', '')) > 0.8
-                                for existing in all_content_pieces
-                            )
-                            if not is_duplicate:
-                                all_content_pieces.append(content)
+                        if content_text and len(content_text) > 200 and deduplicator.add(content_text):
+                            all_content_pieces.append(content)
         
         # Create comprehensive research text
         comprehensive_research = self._create_comprehensive_research(
@@ -295,28 +472,6 @@ class GoogleTrendsSearchEnhancer:
             'generated_at': datetime.now().isoformat()
         }
     
-    def _content_similarity(self, content1: str, content2: str) -> float:
-        """
-        Calculate similarity between two content pieces (simple implementation)
-        
-        Returns:
-            float: Similarity score between 0 and 1
-        """
-        if not content1 or not content2:
-            return 0.0
-        
-        # Simple word-based similarity
-        words1 = set(content1.lower().split())
-        words2 = set(content2.lower().split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
-    
     def _create_comprehensive_research(self, 
                                      trend_query: str,
                                      research_sections: List[str],
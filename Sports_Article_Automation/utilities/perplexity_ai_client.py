@@ -13,6 +13,13 @@ Supported Intent Types:
 
 Role: Intent-Based Research Information Collector
 Output: Structured research data with source tier classification and safety gates
+
+Research results are cached per (normalized headline, intent, day) and
+reused for near-duplicate headlines (see research_cache.py).
+prefetch_research() researches a whole batch concurrently: calls are
+bounded by PERPLEXITY_MAX_CONCURRENCY, paced by a shared token bucket
+(PERPLEXITY_CALLS_PER_MINUTE) and de-duplicated so one story is only
+researched once per batch.
 """
 
 import requests
@@ -21,11 +28,27 @@ import logging
 import os
 import sys
 import re
+import time
+import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+try:
+    from .research_cache import ResearchCache, research_key, headline_tokens
+    from .rate_limiter import get_provider_limiter
+except ImportError:
+    from research_cache import ResearchCache, research_key, headline_tokens
+    from rate_limiter import get_provider_limiter
+
 # Load .env from the Sports_Article_Automation directory (one level up from utilities/)
 _sports_env = Path(__file__).resolve().parent.parent / ".env"
 if _sports_env.exists():
@@ -341,10 +364,13 @@ class PerplexityResearchCollector:
         self.base_url = "https://api.perplexity.ai"
         self.model = "sonar"  # Latest Perplexity model with real-time internet access
         self.timeout = 90
+        self.max_concurrency = int(os.getenv('PERPLEXITY_MAX_CONCURRENCY', '4'))
+        self._rate_limiter = get_provider_limiter('perplexity', calls_per_minute=50, burst=self.max_concurrency)
         
         # Initialize intent detection and research saving
         self.intent_detector = IntentDetector()
         self.research_saver = ResearchSaver(research_save_dir)
+        self.research_cache = ResearchCache(self.research_saver.research_dir / "cache")
         
         # Content freshness validator
         if FRESHNESS_VALIDATOR_AVAILABLE:
@@ -390,12 +416,17 @@ class PerplexityResearchCollector:
             logging.info(f"   ⚡ Priority Level: {intent_details.get('priority', 'medium')}")
             logging.info(f"   🛡️  Safety Level: {safety_level}")
             
-            # Step 2: Build intent-specific research query
-            research_query = self._build_intent_based_query(headline, intent_type, category)
+            # Step 2: Reuse research for this (or a closely related) headline from today
+            research_result, cache_match = self.research_cache.lookup(headline, intent_type)
             
-            # Step 3: Execute single comprehensive API call
-            logging.info(f"\n📡 Executing intent-optimized research call...")
-            research_result = self._call_perplexity_api(research_query)
+            if research_result is None:
+                # Step 3: Build intent-specific query and execute single comprehensive API call
+                research_query = self._build_intent_based_query(headline, intent_type, category)
+                logging.info(f"\n📡 Executing intent-optimized research call...")
+                research_result = self._call_perplexity_api(research_query)
+                self.research_cache.store(headline, intent_type, research_result)
+            else:
+                logging.info(f"\n♻️ Using cached research ({cache_match['match']} match from {cache_match['cached_at']})")
             
             # Step 4: Process and structure results
             research_data = {
@@ -422,7 +453,8 @@ class PerplexityResearchCollector:
                 
                 # Processing metadata
                 'intent_based_research': True,
-                'api_calls_used': 1,
+                'api_calls_used': 0 if cache_match else 1,
+                'research_cache': cache_match,
                 'status': research_result.get('status', 'unknown')
             }
             
@@ -924,6 +956,99 @@ Clearly separate confirmed information from speculation and analysis."""
         # Redirect to new intent-based method
         return self.collect_intent_based_research(headline, source, category)
     
+    def prefetch_research(self, article_entries: List[Dict]) -> Dict:
+        """
+        Research a batch of headlines concurrently into the research cache
+        
+        Headlines already cached (exactly or as a near-duplicate) are skipped,
+        and headlines about the same story share a single call. The following
+        collect_intent_based_research() calls are then served from the cache.
+        
+        Args:
+            article_entries (List[Dict]): Database entries with 'title' and 'category'
+            
+        Returns:
+            Dict: Counts of requested, cached, shared, fetched and failed headlines
+        """
+        plans = []
+        for entry in article_entries:
+            headline = entry.get('title', '')
+            if headline:
+                intent_type, _ = self.intent_detector.detect_intent(headline)
+                plans.append((headline, intent_type, entry.get('category')))
+        
+        summary = {'requested': len(plans), 'cached': 0, 'shared': 0, 'fetched': 0, 'failed': 0}
+        if not plans or not self.api_key:
+            return summary
+        if not AIOHTTP_AVAILABLE:
+            logging.warning("⚠️ aiohttp not available - research will be collected per headline")
+            return summary
+        
+        start_time = time.time()
+        try:
+            summary = asyncio.run(self._prefetch_research_async(plans, summary))
+        except Exception as e:
+            logging.error(f"❌ Batch research prefetch failed: {e}")
+            summary['error'] = str(e)
+        
+        logging.info(f"⚡ Research prefetch: {summary} in {time.time() - start_time:.1f}s")
+        return summary
+    
+    async def _prefetch_research_async(self, plans: List[Tuple[str, str, Optional[str]]], summary: Dict) -> Dict:
+        """Single-flight research calls for the batch, at most max_concurrency at a time"""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        inflight = {}          # research key -> task
+        inflight_tokens = []   # (key, intent, tokens) for near-duplicate matching
+        
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async def fetch(headline, intent_type, category):
+                async with semaphore:
+                    query = self._build_intent_based_query(headline, intent_type, category)
+                    result = await self._call_perplexity_api_async(session, query)
+                self.research_cache.store(headline, intent_type, result)
+                return result
+            
+            for headline, intent_type, category in plans:
+                cached, _ = self.research_cache.lookup(headline, intent_type)
+                if cached is not None:
+                    summary['cached'] += 1
+                    continue
+                key = research_key(headline, intent_type)
+                if key not in inflight:
+                    key = self.research_cache.find_similar(headline, intent_type, inflight_tokens) or key
+                if key in inflight:
+                    summary['shared'] += 1
+                    continue
+                inflight[key] = asyncio.ensure_future(fetch(headline, intent_type, category))
+                inflight_tokens.append((key, intent_type, headline_tokens(headline)))
+            
+            results = await asyncio.gather(*inflight.values(), return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, dict) and result.get('status') == 'success':
+                summary['fetched'] += 1
+            else:
+                summary['failed'] += 1
+        return summary
+    
+    def collect_research_batch(self, article_entries: List[Dict]) -> List[Dict]:
+        """
+        Intent-based research for a batch of database entries, collected concurrently
+        
+        Returns:
+            List[Dict]: Research data per entry, in input order
+        """
+        self.prefetch_research(article_entries)
+        return [
+            self.collect_intent_based_research(
+                headline=entry.get('title', ''),
+                source=entry.get('source_name'),
+                category=entry.get('category')
+            )
+            for entry in article_entries
+        ]
+    
     def _build_main_query(self, headline: str, category: Optional[str] = None) -> str:
         """Build main topic research query with enhanced quote collection"""
         query = f"""Find out the latest and trending overall related information to this article, {headline}
@@ -1079,56 +1204,16 @@ Provide factual research material suitable for editorial reference."""
             Dict: API response or None if failed
         """
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "sonar",  # Use latest Sonar model
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a professional sports researcher providing comprehensive, factual information for news articles. Focus on verified facts from credible sources and gather the latest information from all available sources. Aim for 700-800 words of comprehensive research. If limited information is available, provide key points covering all important angles."
-                    },
-                    {
-                        "role": "user",
-                        "content": query
-                    }
-                ],
-                "max_tokens": 4000,  # Increased for comprehensive 700-800 word research
-                "temperature": 0.1,  # Very low for factual accuracy
-                "top_p": 0.9,
-                "stream": False,
-                "return_images": False,  # Focus on text content
-                "search_recency_filter": "day",  # Last 24 hours for very recent news
-                "citations": True
-                # Domain filter removed to get broader, latest information from all sources
-            }
-            
+            self._rate_limiter.acquire()
             response = requests.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
+                headers=self._api_headers(),
+                json=self._build_api_payload(query),
                 timeout=self.timeout
             )
             
             if response.status_code == 200:
-                data = response.json()
-                
-                # Extract content from response
-                content = data.get('choices', [{}])[0].get('message', {}).get('content', '')
-                citations = data.get('citations', [])
-                
-                logging.info(f"✅ Perplexity search successful - Retrieved content")
-                
-                return {
-                    'status': 'success',
-                    'content': content,
-                    'citations': citations,
-                    'sources': self._extract_sources(citations),
-                    'tokens_used': data.get('usage', {})
-                }
+                return self._parse_api_response(response.json())
             else:
                 logging.error(f"❌ Perplexity API error: {response.status_code} - {response.text}")
                 return {
@@ -1143,6 +1228,71 @@ Provide factual research material suitable for editorial reference."""
             logging.error(f"❌ Error calling Perplexity API: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    async def _call_perplexity_api_async(self, session, query: str) -> Dict:
+        """Async variant of _call_perplexity_api on a shared aiohttp session"""
+        try:
+            await self._rate_limiter.acquire_async()
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=self._api_headers(),
+                json=self._build_api_payload(query)
+            ) as response:
+                if response.status == 200:
+                    return self._parse_api_response(await response.json())
+                body = await response.text()
+                logging.error(f"❌ Perplexity API error: {response.status} - {body}")
+                return {'status': 'error', 'error': f"API error: {response.status}"}
+        except asyncio.TimeoutError:
+            logging.error("❌ Perplexity API request timeout")
+            return {'status': 'error', 'error': 'Request timeout'}
+        except Exception as e:
+            logging.error(f"❌ Error calling Perplexity API: {e}")
+            return {'status': 'error', 'error': str(e)}
+    
+    def _api_headers(self) -> Dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    def _build_api_payload(self, query: str) -> Dict:
+        return {
+            "model": "sonar",  # Use latest Sonar model
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a professional sports researcher providing comprehensive, factual information for news articles. Focus on verified facts from credible sources and gather the latest information from all available sources. Aim for 700-800 words of comprehensive research. If limited information is available, provide key points covering all important angles."
+                },
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ],
+            "max_tokens": 4000,  # Increased for comprehensive 700-800 word research
+            "temperature": 0.1,  # Very low for factual accuracy
+            "top_p": 0.9,
+            "stream": False,
+            "return_images": False,  # Focus on text content
+            "search_recency_filter": "day",  # Last 24 hours for very recent news
+            "citations": True
+            # Domain filter removed to get broader, latest information from all sources
+        }
+    
+    def _parse_api_response(self, data: Dict) -> Dict:
+        # Extract content from response
+        content = data.get('choices', [{}])[0].get('message', {}).get('content', '')
+        citations = data.get('citations', [])
+        
+        logging.info(f"✅ Perplexity search successful - Retrieved content")
+        
+        return {
+            'status': 'success',
+            'content': content,
+            'citations': citations,
+            'sources': self._extract_sources(citations),
+            'tokens_used': data.get('usage', {})
+        }
+    
     def _extract_sources(self, citations: List) -> List[str]:
         """
         Extract source URLs and names from citations
@@ -0,0 +1,75 @@
+"""
+Provider Rate Limiting
+======================
+
+Process-wide token buckets for the remote providers the sports pipelines
+call (Perplexity, Gemini, search), so concurrent batches share one quota
+per provider instead of each sleeping on its own schedule.
+
+Limits come from ``<PROVIDER>_CALLS_PER_MINUTE`` environment variables
+(e.g. ``PERPLEXITY_CALLS_PER_MINUTE``), falling back to the defaults the
+caller passes. Buckets can be awaited from asyncio code or blocked on
+from threads.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Dict
+
+
+class TokenBucket:
+    """``calls_per_minute`` sustained, bursts of up to ``burst`` calls"""
+
+    def __init__(self, calls_per_minute: float, burst: int = 1):
+        self.rate = max(calls_per_minute, 1) / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise the seconds until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a call may be made; returns the seconds spent waiting"""
+        waited = 0.0
+        delay = self._reserve()
+        while delay:
+            time.sleep(delay)
+            waited += delay
+            delay = self._reserve()
+        return waited
+
+    async def acquire_async(self) -> float:
+        waited = 0.0
+        delay = self._reserve()
+        while delay:
+            await asyncio.sleep(delay)
+            waited += delay
+            delay = self._reserve()
+        return waited
+
+
+_provider_limiters: Dict[str, TokenBucket] = {}
+_provider_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str, calls_per_minute: float = 60, burst: int = 1) -> TokenBucket:
+    """Shared limiter for a provider (the first caller's settings win)"""
+    with _provider_limiters_lock:
+        limiter = _provider_limiters.get(provider)
+        if limiter is None:
+            configured = os.getenv(f"{provider.upper()}_CALLS_PER_MINUTE")
+            limiter = TokenBucket(float(configured) if configured else calls_per_minute, burst)
+            _provider_limiters[provider] = limiter
+        return limiter
@@ -0,0 +1,206 @@
+"""
+Research Cache for Perplexity Headline Research
+===============================================
+
+Content-addressed store of Perplexity research results, so a batch (or a
+later run the same day) does not pay for research it already has.
+
+Keys:
+-----
+``sha1(normalized headline | intent type | date bucket)``. The date bucket
+is the UTC day, matching the ``search_recency_filter: day`` the research
+calls use, so cached research never outlives the news window it was
+gathered for.
+
+Near-duplicate lookup:
+----------------------
+Related stories ("Messi scores twice as Miami beat Orlando" /
+"Miami beat Orlando as Messi scores twice") share research: when there is
+no exact entry, the headline's content tokens are compared (Jaccard) with
+every entry of the same intent and bucket, and the best match at or above
+the similarity threshold is used.
+
+Layout: ``<cache_dir>/<YYYY-MM-DD>/<key>.json``. Only successful research
+is stored; buckets older than ``keep_days`` are deleted on startup.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SIMILARITY_THRESHOLD = float(os.getenv('PERPLEXITY_RESEARCH_SIMILARITY', '0.7'))
+MIN_MATCH_TOKENS = 3
+
+_STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'as', 'at', 'by', 'for', 'from', 'in', 'into', 'of', 'on',
+    'to', 'with', 'is', 'are', 'was', 'were', 'be', 'been', 'after', 'before', 'over', 'vs', 'v',
+    'his', 'her', 'their', 'its', 'this', 'that', 'says', 'said', 'new', 'report', 'reports',
+}
+
+
+def normalize_headline(headline: str) -> str:
+    """Lowercase, punctuation-free, single-spaced headline"""
+    text = re.sub(r"[’']", '', (headline or '').lower())
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+    return ' '.join(text.split())
+
+
+def headline_tokens(headline: str) -> frozenset:
+    """Content words of a headline (stopwords removed)"""
+    return frozenset(t for t in normalize_headline(headline).split() if t not in _STOPWORDS)
+
+
+def headline_similarity(tokens_a: frozenset, tokens_b: frozenset) -> float:
+    if len(tokens_a) < MIN_MATCH_TOKENS or len(tokens_b) < MIN_MATCH_TOKENS:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+def date_bucket(when: Optional[datetime] = None) -> str:
+    return (when or datetime.now(timezone.utc)).strftime('%Y-%m-%d')
+
+
+def research_key(headline: str, intent_type: str, bucket: Optional[str] = None) -> str:
+    raw = f"{normalize_headline(headline)}|{intent_type}|{bucket or date_bucket()}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:24]
+
+
+class ResearchCache:
+    """Disk-backed research results with an in-memory similarity index per date bucket"""
+
+    def __init__(self, cache_dir, similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD, keep_days: int = 3):
+        """
+        Args:
+            cache_dir: Root directory of the cache
+            similarity_threshold: Minimum token Jaccard for a near-duplicate hit (>1 disables it)
+            keep_days: Date buckets kept on disk
+        """
+        self.cache_dir = Path(cache_dir)
+        self.similarity_threshold = similarity_threshold
+        self.keep_days = keep_days
+        self._index: Dict[str, Dict[str, Tuple[str, frozenset, str]]] = {}  # bucket -> key -> (intent, tokens, headline)
+        self._lock = threading.RLock()
+        self._stats = {'exact_hits': 0, 'similar_hits': 0, 'misses': 0, 'stored': 0}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._prune()
+
+    def _prune(self):
+        cutoff = date_bucket(datetime.now(timezone.utc) - timedelta(days=self.keep_days))
+        for entry in self.cache_dir.iterdir():
+            if entry.is_dir() and re.fullmatch(r'\d{4}-\d{2}-\d{2}', entry.name) and entry.name < cutoff:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def _bucket_index(self, bucket: str) -> Dict[str, Tuple[str, frozenset, str]]:
+        """Similarity index of one bucket, loaded from disk on first use"""
+        index = self._index.get(bucket)
+        if index is not None:
+            return index
+        index = {}
+        bucket_dir = self.cache_dir / bucket
+        if bucket_dir.is_dir():
+            for path in bucket_dir.glob('*.json'):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                    index[path.stem] = (entry['intent_type'], headline_tokens(entry['headline']), entry['headline'])
+                except Exception as e:
+                    logging.warning(f"⚠️ Skipping unreadable research cache entry {path.name}: {e}")
+        self._index[bucket] = index
+        return index
+
+    def _read(self, bucket: str, key: str) -> Optional[Dict]:
+        try:
+            with open(self.cache_dir / bucket / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"⚠️ Could not read research cache entry {key}: {e}")
+            return None
+
+    def find_similar(self, headline: str, intent_type: str,
+                     candidates: List[Tuple[str, str, frozenset]]) -> Optional[str]:
+        """
+        Best near-duplicate among (key, intent, tokens) candidates, or None.
+
+        Used for the on-disk index and for research still in flight in a batch.
+        """
+        if self.similarity_threshold > 1:
+            return None
+        tokens = headline_tokens(headline)
+        best_key, best_score = None, self.similarity_threshold
+        for key, candidate_intent, candidate_tokens in candidates:
+            if candidate_intent != intent_type:
+                continue
+            score = headline_similarity(tokens, candidate_tokens)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def lookup(self, headline: str, intent_type: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Cached research for a headline.
+
+        Returns:
+            (research_result, match) where match is {'match': 'exact'|'similar',
+            'matched_headline', 'cached_at'}; (None, None) on a miss
+        """
+        bucket = date_bucket()
+        key = research_key(headline, intent_type, bucket)
+        with self._lock:
+            index = self._bucket_index(bucket)
+            match_type = 'exact'
+            if key not in index:
+                candidates = [(k, intent, tokens) for k, (intent, tokens, _) in index.items()]
+                key = self.find_similar(headline, intent_type, candidates)
+                match_type = 'similar'
+            entry = self._read(bucket, key) if key else None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, None
+            self._stats['exact_hits' if match_type == 'exact' else 'similar_hits'] += 1
+
+        match = {'match': match_type, 'matched_headline': entry['headline'], 'cached_at': entry['cached_at']}
+        if match_type == 'similar':
+            logging.info(f"♻️ Reusing research from related headline: {entry['headline']}")
+        return entry['research_result'], match
+
+    def store(self, headline: str, intent_type: str, research_result: Dict) -> Optional[str]:
+        """Keep a successful research result; returns its key"""
+        if not research_result or research_result.get('status') != 'success':
+            return None
+        bucket = date_bucket()
+        key = research_key(headline, intent_type, bucket)
+        entry = {
+            'headline': headline,
+            'intent_type': intent_type,
+            'cached_at': datetime.now().isoformat(),
+            'research_result': research_result,
+        }
+        try:
+            bucket_dir = self.cache_dir / bucket
+            bucket_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = bucket_dir / f"{key}.json.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, bucket_dir / f"{key}.json")
+        except Exception as e:
+            logging.warning(f"⚠️ Could not cache research for '{headline}': {e}")
+            return None
+        with self._lock:
+            self._bucket_index(bucket)[key] = (intent_type, headline_tokens(headline), headline)
+            self._stats['stored'] += 1
+        return key
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['indexed'] = sum(len(index) for index in self._index.values())
+        return stats
@@ -180,6 +180,11 @@ from datetime import datetime
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+try:
+    from .rate_limiter import get_provider_limiter
+except ImportError:
+    from rate_limiter import get_provider_limiter
+
 # Ensure console can handle UTF-8 output
 try:
     if hasattr(sys.stdout, "reconfigure"):
@@ -220,6 +225,8 @@ class SportsArticleGenerator:
             api_key (str): Google Gemini API key (defaults to GOOGLE_API_KEY env variable)
         """
         self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
+        # Shared by every generator in the process; paces each generate_content call, retries included
+        self._rate_limiter = get_provider_limiter('gemini', calls_per_minute=30, burst=3)
         
         if not self.api_key:
             logging.warning("⚠️  GOOGLE_API_KEY not found in environment variables")
@@ -377,6 +384,7 @@ class SportsArticleGenerator:
             for attempt in range(max_retries):
                 try:
                     # Generate article using Gemini
+                    self._rate_limiter.acquire()
                     response = self.model.generate_content(prompt, generation_config=self.generation_config)
                     
                     if not response or not response.text:
@@ -1,12 +1,14 @@
 """
 Firestore Dashboard Analytics Module
 Handles data processing and API endpoints for dashboard charts using Firestore as data source
+
+Chart aggregates are read from the analytics rollups maintained by
+app/services/analytics_rollup_service.py rather than by scanning raw collections.
 """
 
 import os
 import json
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
 import glob
 from flask import jsonify, request, current_app, session
 import pandas as pd
@@ -38,139 +40,10 @@ class FirestoreDashboardAnalytics:
             self._cache[key] = data
             self._cache_timestamp[key] = time.time()
     
-    def get_failed_analyses(self, use_cache=True):
-        """Extract failed analysis attempts from Firestore"""
-        cache_key = 'failed_analyses_data'
-        
-        # Try to get from cache first if use_cache is True
-        if use_cache:
-            cached_data = self._get_cache(cache_key)
-            if cached_data is not None:
-                return cached_data
-        
-        failed_analyses = []
-        
-        try:
-            # Get Firestore client
-            db = get_firestore_client()
-            if db is None:
-                current_app.logger.error("Firestore client not available")
-                return failed_analyses
-            
-            # Query failed_analyses collection
-            analyses_ref = db.collection('failed_analyses')
-            
-            try:
-                # Try to get failed analyses with ordering and limit
-                query_result = analyses_ref.order_by('timestamp', direction='DESCENDING').limit(500).get()
-            except Exception as query_error:
-                # Fallback to simple query if ordering fails (might happen with missing indexes)
-                current_app.logger.warning(f"Error with ordered query: {query_error}. Falling back to simple query.")
-                query_result = analyses_ref.limit(500).get()
-            
-            for doc in query_result:
-                try:
-                    analysis_data = doc.to_dict()
-                    # Ensure we have the minimum required fields
-                    if 'ticker' in analysis_data and 'timestamp' in analysis_data:
-                        # Convert Firestore timestamp to Python datetime if needed
-                        if hasattr(analysis_data.get('date'), 'timestamp'):
-                            # Firestore timestamp object
-                            date = analysis_data['date'].timestamp()
-                            date = datetime.fromtimestamp(date)
-                        elif isinstance(analysis_data.get('date'), datetime):
-                            date = analysis_data['date']
-                        else:
-                            # Integer timestamp
-                            date = datetime.fromtimestamp(analysis_data['timestamp'])
-                        
-                        failed_analyses.append({
-                            'ticker': analysis_data['ticker'],
-                            'timestamp': analysis_data['timestamp'],
-                            'date': date,
-                            'error_message': analysis_data.get('error_message', 'Unknown error'),
-                            'user_id': analysis_data.get('user_id', ''),
-                            'doc_id': doc.id
-                        })
-                except Exception as doc_error:
-                    current_app.logger.error(f"Error processing failed analysis document {doc.id}: {doc_error}")
-                    continue
-            
-        except Exception as e:
-            current_app.logger.error(f"Error fetching failed analyses from Firestore: {e}")
-        
-        # Save to cache
-        self._set_cache(cache_key, failed_analyses)
-        return failed_analyses
-
-    def get_reports_data(self, use_cache=True):
-        """Extract data from Firestore reports collection"""
-        cache_key = 'reports_data'
-        
-        # Try to get from cache first if use_cache is True
-        if use_cache:
-            cached_data = self._get_cache(cache_key)
-            if cached_data is not None:
-                return cached_data
-        
-        reports = []
-        
-        try:
-            # Get Firestore client
-            db = get_firestore_client()
-            if db is None:
-                current_app.logger.error("Firestore client not available")
-                return reports
-            
-            # Query reports collection
-            reports_ref = db.collection('reports')
-            
-            try:
-                # Try to get reports with ordering and limit
-                query_result = reports_ref.order_by('timestamp', direction='DESCENDING').limit(500).get()
-            except Exception as query_error:
-                # Fallback to simple query if ordering fails (might happen with missing indexes)
-                current_app.logger.warning(f"Error with ordered query: {query_error}. Falling back to simple query.")
-                query_result = reports_ref.limit(500).get()
-            
-            for doc in query_result:
-                try:
-                    report_data = doc.to_dict()
-                    # Ensure we have the minimum required fields
-                    if 'ticker' in report_data and 'timestamp' in report_data:
-                        # Convert Firestore timestamp to Python datetime if needed
-                        if hasattr(report_data.get('date'), 'timestamp'):
-                            # Firestore timestamp object
-                            date = report_data['date'].timestamp()
-                            date = datetime.fromtimestamp(date)
-                        elif isinstance(report_data.get('date'), datetime):
-                            date = report_data['date']
-                        else:
-                            # Integer timestamp
-                            date = datetime.fromtimestamp(report_data['timestamp'])
-                        
-                        reports.append({
-                            'ticker': report_data['ticker'],
-                            'timestamp': report_data['timestamp'],
-                            'date': date,
-                            'filename': report_data.get('filename', f"{report_data['ticker']}_detailed_report_{report_data['timestamp']}.html"),
-                            'file_size': report_data.get('file_size', 0),
-                            'file_path': report_data.get('file_path', ''),
-                            'user_id': report_data.get('user_id', ''),
-                            'published': report_data.get('published', True),
-                            'sector': report_data.get('sector', 'Other'),
-                            'doc_id': doc.id
-                        })
-                except Exception as doc_error:
-                    current_app.logger.error(f"Error processing document {doc.id}: {doc_error}")
-                    continue
-            
-        except Exception as e:
-            current_app.logger.error(f"Error fetching reports from Firestore: {e}")
-        
-        # Save to cache
-        self._set_cache(cache_key, reports)
-        return reports
+    def _get_rollups(self):
+        """Rollup service holding the pre-aggregated dashboard counters"""
+        from app.services.analytics_rollup_service import get_rollup_service
+        return get_rollup_service()
     
     def get_reports_over_time(self, period='week'):
         """Get reports generated over time data"""
@@ -179,42 +52,30 @@ class FirestoreDashboardAnalytics:
         if cached_data is not None:
             return cached_data
         
-        reports = self.get_reports_data()
-        
-        if not reports:
+        rollups = self._get_rollups()
+        if not rollups:
             return {'labels': [], 'data': [], 'has_data': False}
         
-        # Group by period
-        grouped = defaultdict(int)
-        
-        for report in reports:
-            date = report['date']
-            
-            if period == 'week':
-                # Group by day of week
-                key = date.strftime('%a')
-            elif period == 'month':
-                # Group by week
-                key = f"Week {date.isocalendar()[1]}"
-            elif period == 'quarter':
-                # Group by month
-                key = date.strftime('%b')
-            else:
-                key = date.strftime('%Y-%m-%d')
-            
-            grouped[key] += 1
-        
-        # Sort and format
         if period == 'week':
-            days_order = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-            labels = days_order
-            data = [grouped.get(day, 0) for day in days_order]
+            # Last seven days, one point per day
+            series = rollups.get_daily_series(days=7)
+            labels = [datetime.strptime(key, '%Y-%m-%d').strftime('%a') for key, _ in series]
+        elif period == 'month':
+            # Last five ISO weeks
+            series = rollups.get_weekly_series(weeks=5)
+            labels = [f"Week {int(key.split('-W')[1])}" for key, _ in series]
+        elif period == 'quarter':
+            # Last three months
+            series = rollups.get_monthly_series(months=3)
+            labels = [datetime.strptime(key, '%Y-%m').strftime('%b') for key, _ in series]
         else:
-            sorted_items = sorted(grouped.items())
-            labels = [item[0] for item in sorted_items]
-            data = [item[1] for item in sorted_items]
+            # Last twelve months
+            series = rollups.get_monthly_series(months=12)
+            labels = [datetime.strptime(key, '%Y-%m').strftime('%b %Y') for key, _ in series]
         
-        result = {'labels': labels, 'data': data, 'has_data': True}
+        data = [doc.get('reports_generated', 0) for _, doc in series]
+        
+        result = {'labels': labels, 'data': data, 'has_data': any(data)}
         self._set_cache(cache_key, result)
         return result
     
@@ -225,35 +86,22 @@ class FirestoreDashboardAnalytics:
         if cached_data is not None:
             return cached_data
         
-        reports = self.get_reports_data()
+        rollups = self._get_rollups()
+        top_tickers = rollups.get_top_tickers('reports_generated', limit) if rollups else []
         
-        if not reports:
+        if not top_tickers:
             return {'tickers': [], 'counts': [], 'sectors': [], 'has_data': False}
         
-        # Count tickers
-        ticker_counts = Counter(report['ticker'] for report in reports)
-        
-        # Get top tickers
-        top_tickers = ticker_counts.most_common(limit)
-        
         tickers = [ticker for ticker, count in top_tickers]
         counts = [count for ticker, count in top_tickers]
         
-        # Get sectors from report data if available, otherwise use default mapping
+        # Same mapping used when report metadata is saved (app/analytics_utils.py)
         sector_mapping = {
             'TSLA': 'Technology', 'AAPL': 'Technology', 'MSFT': 'Technology', 'GOOGL': 'Technology',
             'AMZN': 'Consumer', 'NVDA': 'Technology', 'META': 'Technology', 'NFLX': 'Consumer',
             'JPM': 'Finance', 'JNJ': 'Healthcare', 'XOM': 'Energy', 'JSM': 'Other'
         }
-        
-        sectors = []
-        for ticker in tickers:
-            # Find reports for this ticker
-            ticker_reports = [r for r in reports if r['ticker'] == ticker]
-            if ticker_reports and 'sector' in ticker_reports[0]:
-                sectors.append(ticker_reports[0]['sector'])
-            else:
-                sectors.append(sector_mapping.get(ticker, 'Other'))
+        sectors = [sector_mapping.get(ticker, 'Other') for ticker in tickers]
         
         result = {'tickers': tickers, 'counts': counts, 'sectors': sectors, 'has_data': True}
         self._set_cache(cache_key, result)
@@ -266,28 +114,19 @@ class FirestoreDashboardAnalytics:
         if cached_data is not None:
             return cached_data
         
-        reports = self.get_reports_data()
-        
-        if not reports:
-            return {'labels': ['Published'], 'data': [0], 'colors': ['#10b981'], 'has_data': False}
-        
-        published_count = len([r for r in reports if r.get('published', True)])
-        unpublished_count = len(reports) - published_count
+        rollups = self._get_rollups()
+        totals = rollups.get_totals() if rollups else {}
         
-        labels = ['Published']
-        data = [published_count]
-        colors = ['#10b981']  # Green
+        # Every saved report is published (see save_report_metadata_for_analytics)
+        published_count = totals.get('reports_generated', 0)
         
-        # Only add unpublished if there are any
-        if unpublished_count > 0:
-            labels.append('Unpublished')
-            data.append(unpublished_count)
-            colors.append('#f43f5e')  # Red
+        if not published_count:
+            return {'labels': ['Published'], 'data': [0], 'colors': ['#10b981'], 'has_data': False}
         
         result = {
-            'labels': labels,
-            'data': data,
-            'colors': colors,
+            'labels': ['Published'],
+            'data': [published_count],
+            'colors': ['#10b981'],  # Green
             'has_data': True
         }
         self._set_cache(cache_key, result)
@@ -300,27 +139,24 @@ class FirestoreDashboardAnalytics:
         if cached_data is not None:
             return cached_data
         
-        reports = self.get_reports_data()
-        if not reports:
+        rollups = self._get_rollups()
+        if not rollups:
             return {'heatmap': {}, 'has_data': False, 'year': None}
-
-        # If year is not provided, use the most recent year with data
-        years_with_data = sorted(set(r['date'].year for r in reports), reverse=True)
-        if not years_with_data:
-            return {'heatmap': {}, 'has_data': False, 'year': None}
-
-        if year is None:
-            year = years_with_data[0]
-        elif year not in years_with_data:
-            # If requested year has no data, use most recent year
-            year = years_with_data[0]
-
-        # Count reports per day for the selected year
-        heatmap_data = {}
-        for report in reports:
-            if report['date'].year == year:
-                date_str = report['date'].strftime('%Y-%m-%d')
-                heatmap_data[date_str] = heatmap_data.get(date_str, 0) + 1
+        
+        def load_year(selected_year):
+            # One yearly rollup document holds the whole year's day -> count map
+            reports_by_day = rollups.get_year(selected_year).get('reports_by_day', {})
+            return {key: count for key, count in sorted(reports_by_day.items()) if count}
+        
+        heatmap_data = load_year(year) if year is not None else {}
+        
+        if not heatmap_data:
+            # Requested year (or no year) has no data - use the most recent year with data
+            latest_year = rollups.get_latest_period('yearly')
+            if not latest_year:
+                return {'heatmap': {}, 'has_data': False, 'year': None}
+            year = int(latest_year)
+            heatmap_data = load_year(year)
         
         result = {'heatmap': heatmap_data, 'has_data': bool(heatmap_data), 'year': year}
         self._set_cache(cache_key, result)
@@ -333,9 +169,11 @@ class FirestoreDashboardAnalytics:
         if cached_data is not None:
             return cached_data
         
-        reports = self.get_reports_data()
+        rollups = self._get_rollups()
+        totals = rollups.get_totals() if rollups else {}
+        total_reports = totals.get('reports_generated', 0)
         
-        if not reports:
+        if not total_reports:
             return {
                 'total_reports': 0,
                 'this_month': 0,
@@ -344,23 +182,13 @@ class FirestoreDashboardAnalytics:
                 'has_data': False
             }
         
-        total_reports = len(reports)
-        
-        # This month
-        now = datetime.now()
-        this_month = len([r for r in reports if r['date'].month == now.month and r['date'].year == now.year])
-        
-        # Published reports
-        published_reports = len([r for r in reports if r.get('published', True)])
-        
-        # Unique tickers
-        unique_tickers = len(set(r['ticker'] for r in reports))
+        _, this_month_doc = rollups.get_monthly_series(months=1)[0]
         
         result = {
             'total_reports': total_reports,
-            'this_month': this_month,
-            'published_reports': published_reports,
-            'unique_tickers': unique_tickers,
+            'this_month': this_month_doc.get('reports_generated', 0),
+            'published_reports': total_reports,
+            'unique_tickers': rollups.count_tickers(),
             'has_data': True
         }
         self._set_cache(cache_key, result)
@@ -373,50 +201,50 @@ class FirestoreDashboardAnalytics:
         if cached_data is not None:
             return cached_data
         
-        failed_analyses = self.get_failed_analyses()
+        rollups = self._get_rollups()
+        totals = rollups.get_totals() if rollups else {}
+        total_failures = totals.get('failed_analyses', 0)
         
-        if not failed_analyses:
+        if not total_failures:
             return {'has_data': False, 'counts': {}}
         
-        # Count failed analyses by ticker
-        ticker_counts = Counter([analysis['ticker'] for analysis in failed_analyses])
-        most_common = ticker_counts.most_common(10)  # Get top 10 failed tickers
-        
-        # Group by date (daily)
-        today = datetime.now().date()
-        last_week = today - timedelta(days=7)
-        
-        daily_counts = Counter()
-        for analysis in failed_analyses:
-            analysis_date = analysis['date'].date()
-            if analysis_date >= last_week:
-                daily_counts[analysis_date.isoformat()] += 1
-        
-        # Recent errors (last 24 hours)
-        recent_errors = [
-            analysis for analysis in failed_analyses 
-            if (datetime.now() - analysis['date']).total_seconds() < 86400  # 24 hours
+        # Daily failures over the last week
+        daily_counts = [
+            {'date': key, 'count': doc['failed_analyses']}
+            for key, doc in rollups.get_daily_series(days=8)
+            if doc.get('failed_analyses')
         ]
         
+        # Recent errors (last 24 hours) - a bounded query on the raw collection
+        recent_failures = 0
+        recent_errors = []
+        try:
+            db = get_firestore_client()
+            cutoff = int(time.time()) - 86400
+            recent_query = db.collection('failed_analyses').where('timestamp', '>=', cutoff)
+            count_result = recent_query.count().get()
+            recent_failures = int(count_result[0][0].value) if count_result else 0
+            for doc in recent_query.order_by('timestamp', direction='DESCENDING').limit(5).get():
+                analysis_data = doc.to_dict()
+                recent_errors.append({
+                    'ticker': analysis_data.get('ticker'),
+                    'timestamp': analysis_data.get('timestamp'),
+                    'date': datetime.fromtimestamp(analysis_data.get('timestamp', 0)).isoformat(),
+                    'error_message': analysis_data.get('error_message', 'Unknown error')
+                })
+        except Exception as e:
+            current_app.logger.warning(f"Error fetching recent failed analyses: {e}")
+        
         result = {
-            'has_data': len(failed_analyses) > 0,
-            'total_failures': len(failed_analyses),
+            'has_data': True,
+            'total_failures': total_failures,
             'top_failed_tickers': [
-                {'ticker': ticker, 'count': count} for ticker, count in most_common
-            ],
-            'daily_failures': [
-                {'date': date, 'count': count} for date, count in sorted(daily_counts.items())
+                {'ticker': ticker, 'count': count}
+                for ticker, count in rollups.get_top_tickers('failed_analyses', 10)
             ],
-            'recent_failures': len(recent_errors),
-            'recent_errors': [
-                {
-                    'ticker': err['ticker'],
-                    'timestamp': err['timestamp'],
-                    'date': err['date'].isoformat(),
-                    'error_message': err['error_message']
-                }
-                for err in sorted(recent_errors, key=lambda x: x['timestamp'], reverse=True)[:5]  # Top 5 recent errors
-            ]
+            'daily_failures': daily_counts,
+            'recent_failures': recent_failures,
+            'recent_errors': recent_errors
         }
         
         self._set_cache(cache_key, result)
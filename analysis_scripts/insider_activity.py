@@ -0,0 +1,333 @@
+"""
+Insider Activity Engine
+=======================
+
+Batched price enrichment and aggregation behind the insider-transaction
+section of peer_comparison.
+
+- **Transactions**: Finnhub insider transactions are fetched once per ticker
+  and reused for ``INSIDER_TRANSACTIONS_TTL`` seconds; an empty answer only
+  for ``INSIDER_EMPTY_TRANSACTIONS_TTL`` seconds. Failed fetches (the fetcher
+  returns None) are not cached.
+- **Prices**: transactions without a reported price are priced from one
+  daily price series covering all of their dates, read from the local price
+  cache (generated_data/data_cache) when it spans them, otherwise loaded
+  with a single ``history`` request. Prices are attached to every
+  transaction with one ``merge_asof`` (nearest trading day within
+  ``max_days_search`` days, as the per-date lookup did).
+- **Aggregates**: buy / sell counts, share volumes, values, price coverage
+  and transaction-code mix are computed on a DataFrame of the formatted
+  transactions.
+- **Result cache**: formatted transactions, aggregates and narrative are kept
+  per (ticker, latest filing date), so a new filing is the only thing that
+  triggers re-enrichment.
+
+Configuration:
+--------------
+- ``INSIDER_TRANSACTIONS_TTL``: seconds fetched transactions are reused (default 21600)
+- ``INSIDER_EMPTY_TRANSACTIONS_TTL``: seconds an empty result is reused (default 900)
+- ``INSIDER_PRICE_CACHE_DIR``: daily price cache directory (default generated_data/data_cache)
+
+Usage:
+------
+```python
+from insider_activity import get_insider_activity_engine
+
+activity = get_insider_activity_engine().activity('AAPL')
+activity['transactions'], activity['aggregates'], activity['narrative']
+```
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRICE_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'data_cache'
+)
+DEFAULT_TRANSACTIONS_TTL = float(os.getenv('INSIDER_TRANSACTIONS_TTL', str(6 * 60 * 60)))
+DEFAULT_EMPTY_TRANSACTIONS_TTL = float(os.getenv('INSIDER_EMPTY_TRANSACTIONS_TTL', str(15 * 60)))
+PRICE_SEARCH_DAYS = 10
+MARKET_CODES = ('P', 'S')
+AWARD_CODES = ('A', 'F')
+OPTION_CODES = ('M',)
+
+
+def _peer_comparison():
+    # peer_comparison imports this module; resolve it lazily
+    try:
+        from analysis_scripts import peer_comparison
+    except ImportError:
+        import peer_comparison
+    return peer_comparison
+
+
+def _daily_closes(frame, date_column=None):
+    """(Date, Close) frame with naive, normalized dates sorted ascending"""
+    dates = frame[date_column] if date_column else frame.index.to_series()
+    dates = pd.to_datetime(dates, errors='coerce')
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    closes = pd.DataFrame({'Date': dates.dt.normalize().astype('datetime64[ns]').to_numpy(),
+                           'Close': pd.to_numeric(frame['Close'], errors='coerce').to_numpy()})
+    closes = closes.dropna().drop_duplicates('Date', keep='last')
+    return closes.sort_values('Date').reset_index(drop=True)
+
+
+def _cached_closes(ticker, cache_dir):
+    """Daily closes from the newest local price cache file for ``ticker``, if any"""
+    clean_ticker = ticker.replace(':', '_').replace('^', '_').replace('=', '_')
+    candidates = [os.path.join(cache_dir, f"{clean_ticker}_stock_data_1d.csv"),
+                  os.path.join(cache_dir, f"{clean_ticker}_stock_data.csv")]
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        return None
+    path = max(existing, key=os.path.getmtime)
+    try:
+        return _daily_closes(pd.read_csv(path, usecols=['Date', 'Close']), 'Date')
+    except Exception as e:
+        logger.warning(f"Could not read cached prices {path}: {e}")
+        return None
+
+
+def load_daily_closes(ticker, start, end, cache_dir=None):
+    """
+    Daily closes covering [start, end]: local price cache if it spans the
+    range, otherwise one yfinance ``history`` request.
+    """
+    cached = _cached_closes(ticker, cache_dir or os.environ.get('INSIDER_PRICE_CACHE_DIR') or DEFAULT_PRICE_CACHE_DIR)
+    if cached is not None and not cached.empty \
+            and cached['Date'].iloc[0] <= start and cached['Date'].iloc[-1] >= end:
+        return cached, 'cache'
+    import yfinance as yf
+    history = yf.Ticker(ticker).history(start=start, end=end + timedelta(days=1))
+    if history is None or history.empty:
+        return pd.DataFrame(columns=['Date', 'Close']), 'history'
+    return _daily_closes(history), 'history'
+
+
+def market_prices_for_dates(ticker, dates, max_days_search=PRICE_SEARCH_DAYS, cache_dir=None):
+    """
+    Close on (or nearest to, within ``max_days_search`` days) each date.
+
+    Returns (prices aligned with ``dates`` with None where no price was
+    found, source) where source is 'cache', 'history' or None (nothing looked up).
+    """
+    targets = pd.to_datetime(pd.Series(list(dates), dtype=object), errors='coerce')
+    prices = [None] * len(targets)
+    valid = targets.dropna()
+    if valid.empty or not ticker:
+        return prices, None
+    search = pd.Timedelta(days=max_days_search)
+    closes, source = load_daily_closes(ticker, valid.min() - search, valid.max() + search, cache_dir)
+    if closes.empty:
+        return prices, source
+
+    left = pd.DataFrame({'Date': valid.dt.normalize().astype('datetime64[ns]').to_numpy(), 'position': valid.index})
+    matched = pd.merge_asof(left.sort_values('Date'), closes, on='Date',
+                            direction='nearest', tolerance=search)
+    for position, close in zip(matched['position'], matched['Close']):
+        if pd.notna(close):
+            prices[position] = float(close)
+    return prices, source
+
+
+def insider_aggregates(transactions, recent_count=5):
+    """Buy / sell / code-mix aggregates of formatted insider transactions"""
+    frame = pd.DataFrame(list(transactions))
+    total = len(frame)
+    if total == 0:
+        return {'total': 0, 'buy_count': 0, 'sell_count': 0, 'buy_value': 0.0, 'sell_value': 0.0,
+                'buy_priced': 0, 'sell_priced': 0, 'buy_shares': 0, 'sell_shares': 0, 'net_value': 0.0,
+                'net_shares': 0, 'award_count': 0, 'market_count': 0, 'market_buy_count': 0,
+                'market_sell_count': 0, 'market_sell_value': 0.0, 'option_count': 0, 'priced_count': 0,
+                'estimated_count': 0, 'price_coverage_pct': 0, 'avg_buy_price': 0, 'avg_sell_price': 0,
+                'recent_count': 0, 'recent_market_count': 0, 'recent_market_buy_count': 0,
+                'recent_market_sell_count': 0}
+
+    def column(name, default):
+        return frame[name] if name in frame.columns else pd.Series(default, index=frame.index)
+
+    change = pd.to_numeric(column('raw_change', 0), errors='coerce').fillna(0)
+    price = pd.to_numeric(column('raw_price', 0), errors='coerce').fillna(0)
+    estimated_value = pd.to_numeric(column('estimated_value', 0), errors='coerce').fillna(0)
+    code = column('code', '').fillna('')
+    price_source = column('price_source', 'missing').fillna('missing')
+
+    is_buy = change > 0
+    is_sell = change < 0
+    reported = price > 0
+    # Reported price first, the estimated value otherwise
+    value = np.where(reported, change.abs() * price, np.where(estimated_value > 0, estimated_value, 0.0))
+    priced = reported | (estimated_value > 0)
+    is_market = code.isin(MARKET_CODES)
+    recent = pd.Series(np.arange(total) < recent_count, index=frame.index)
+
+    buy_value = float(value[is_buy].sum())
+    sell_value = float(value[is_sell].sum())
+    buy_shares = change[is_buy].abs().sum().item()
+    sell_shares = change[is_sell].abs().sum().item()
+    priced_count = int(price_source.isin(['reported', 'estimated']).sum())
+    buy_prices = price[is_buy & reported]
+    sell_prices = price[is_sell & reported]
+    return {
+        'total': total,
+        'buy_count': int(is_buy.sum()),
+        'sell_count': int(is_sell.sum()),
+        'buy_value': buy_value,
+        'sell_value': sell_value,
+        'buy_priced': int((is_buy & priced).sum()),
+        'sell_priced': int((is_sell & priced).sum()),
+        'buy_shares': buy_shares,
+        'sell_shares': sell_shares,
+        'net_value': buy_value - sell_value,
+        'net_shares': buy_shares - sell_shares,
+        'award_count': int(code.isin(AWARD_CODES).sum()),
+        'market_count': int(is_market.sum()),
+        'market_buy_count': int((is_market & is_buy).sum()),
+        'market_sell_count': int((is_market & is_sell).sum()),
+        'market_sell_value': float((change.abs() * price)[is_market & is_sell & reported].sum()),
+        'option_count': int(code.isin(OPTION_CODES).sum()),
+        'priced_count': priced_count,
+        'estimated_count': int((price_source == 'estimated').sum()),
+        'price_coverage_pct': priced_count / total * 100,
+        'avg_buy_price': float(buy_prices.mean()) if len(buy_prices) else 0,
+        'avg_sell_price': float(sell_prices.mean()) if len(sell_prices) else 0,
+        'recent_count': int(recent.sum()),
+        'recent_market_count': int((recent & is_market).sum()),
+        'recent_market_buy_count': int((recent & is_market & is_buy).sum()),
+        'recent_market_sell_count': int((recent & is_market & is_sell).sum()),
+    }
+
+
+class InsiderActivityEngine:
+    """Per-ticker insider transactions, enriched and aggregated once per new filing"""
+
+    def __init__(self, transactions_ttl=DEFAULT_TRANSACTIONS_TTL, fetch_transactions=None,
+                 empty_ttl=DEFAULT_EMPTY_TRANSACTIONS_TTL):
+        """
+        Args:
+            transactions_ttl: Seconds fetched transactions are reused
+            fetch_transactions: ``fetch(ticker)`` returning Finnhub transactions, or
+                                None on failure
+                                (default: peer_comparison.fetch_insider_transactions)
+            empty_ttl: Seconds an empty transaction list is reused
+        """
+        self.transactions_ttl = transactions_ttl
+        self.empty_ttl = empty_ttl
+        self._fetch = fetch_transactions
+        self._transactions = {}   # ticker -> (transactions, fetched_at)
+        self._results = {}        # (ticker, latest filing date) -> activity
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'transaction_fetches': 0,
+            'fetch_failures': 0,
+            'result_hits': 0,
+            'enrichments': 0,
+        }
+
+    def _ticker_lock(self, ticker):
+        with self._lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def transactions(self, ticker):
+        """Raw insider transactions for ``ticker`` (fetched at most once per TTL)"""
+        now = time.time()
+        with self._lock:
+            cached = self._transactions.get(ticker)
+        if cached is not None:
+            transactions, fetched_at = cached
+            ttl = self.transactions_ttl if transactions else self.empty_ttl
+            if now - fetched_at < ttl:
+                return transactions
+        fetch = self._fetch or _peer_comparison().fetch_insider_transactions
+        transactions = fetch(ticker)
+        with self._lock:
+            self._stats['transaction_fetches'] += 1
+            if transactions is None:
+                # Failed fetch: answer empty this time, retry on the next request
+                self._stats['fetch_failures'] += 1
+                return []
+            self._transactions[ticker] = (transactions, now)
+        return transactions
+
+    def activity(self, ticker):
+        """
+        Formatted transactions, aggregates and narrative for ``ticker``.
+
+        Returns {'transactions', 'aggregates', 'narrative', 'latest_filing'}.
+        """
+        ticker = ticker.upper()
+        with self._ticker_lock(ticker):
+            with self._lock:
+                self._stats['requests'] += 1
+            raw = self.transactions(ticker)
+            latest_filing = max((t.get('filingDate') or '' for t in raw), default='')
+            key = (ticker, latest_filing)
+            cached = self._results.get(key)
+            if cached is not None:
+                with self._lock:
+                    self._stats['result_hits'] += 1
+                return cached
+
+            peer_comparison = _peer_comparison()
+            formatted = peer_comparison.format_insider_transaction_data(raw)
+            aggregates = insider_aggregates(formatted)
+            result = {
+                'transactions': formatted,
+                'aggregates': aggregates,
+                'narrative': peer_comparison.analyze_insider_sentiment(formatted, aggregates),
+                'latest_filing': latest_filing,
+            }
+            with self._lock:
+                self._stats['enrichments'] += 1
+                # Older filings of this ticker are superseded
+                for stale in [k for k in self._results if k[0] == ticker]:
+                    del self._results[stale]
+                self._results[key] = result
+            return result
+
+    def invalidate(self, ticker=None):
+        """Forget cached transactions / results for one ticker (or all)"""
+        with self._lock:
+            if ticker is None:
+                self._transactions.clear()
+                self._results.clear()
+                return
+            ticker = ticker.upper()
+            self._transactions.pop(ticker, None)
+            for key in [k for k in self._results if k[0] == ticker]:
+                del self._results[key]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_insider_activity_engine():
+    """Process-wide insider activity engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = InsiderActivityEngine()
+        return _engine
+
+
+def set_insider_activity_engine(engine):
+    """Replace the process-wide engine (tests, custom fetchers)"""
+    global _engine
+    with _engine_lock:
+        _engine = engine
@@ -0,0 +1,267 @@
+"""
+Market Context Service
+======================
+
+Process-wide, once-per-trading-day snapshot of the market data every
+ticker's risk analysis needs, so a batch of tickers shares one download
+and one regime classification instead of repeating them per ticker.
+
+Contents:
+---------
+- **Benchmarks**: SPY and ^GSPC closes and daily returns
+- **Regimes**: 50/200-day moving averages, running drawdown and the
+  bull / bear / volatile classification used by
+  RiskAnalyzer.calculate_regime_risk_advanced (with and without the VIX
+  filter), computed over the full history
+- **VIX**: ^VIX closes
+- **Risk-free rate**: latest ^IRX close (also primes
+  risk_free_rate_fetcher's cache)
+
+Everything is fetched with a single batched ``yf.download`` call. The
+snapshot is never modified after it is built; accessors return
+date-aligned copies for the caller's index, so callers cannot alter the
+shared data.
+
+Usage:
+------
+```python
+from market_context import get_market_context
+
+context = get_market_context()          # None if market data is unavailable
+regimes = context.regime_view(returns.index)
+market = context.benchmark_close_view(price_data.index)
+```
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TICKERS = ('SPY', '^GSPC')
+VIX_TICKER = '^VIX'
+IRX_TICKER = '^IRX'
+DEFAULT_BENCHMARK = '^GSPC'
+HISTORY_PERIOD = '10y'
+RETRY_AFTER_SECONDS = 5 * 60
+
+
+def classify_market_regimes(market_price, vix_data=None):
+    """
+    Bull / bear / volatile classification of a market price series.
+
+    Uses 50/200 MA crossover + drawdown + optional VIX filter (MSCI/NBER
+    standard). Only dates where the 200-day MA exists are returned.
+
+    Parameters:
+    -----------
+    market_price : pd.Series
+        Market benchmark price (or cumulative return) series
+    vix_data : pd.Series, optional
+        VIX index data for the volatility filter
+
+    Returns:
+    --------
+    pd.DataFrame indexed by date with boolean columns bull, bear, volatile
+    and the ma50, ma200 and drawdown series they were derived from
+    """
+    ma50 = market_price.rolling(50).mean()
+    ma200 = market_price.rolling(200).mean()
+
+    # Skip the first 200 days where MA200 is NaN to avoid misclassification
+    valid_idx = ~ma200.isna()
+    ma50 = ma50[valid_idx]
+    ma200 = ma200[valid_idx]
+    price = market_price[valid_idx]
+
+    running_max = price.expanding().max()
+    drawdown = (price - running_max) / running_max
+
+    # Bear: drawdown > 20% OR sustained 50<200 for 20 days (highest priority)
+    sustained_bear = (ma50 < ma200).rolling(20).sum() >= 20
+    bear = (drawdown < -0.20) | sustained_bear
+
+    # Bull: 50 MA > 200 MA AND price > 50 MA AND drawdown < 10% AND NOT bear
+    bull = (price > ma50) & (ma50 > ma200) & (drawdown > -0.10) & ~bear
+
+    # Volatile: everything else (choppy markets, no clear trend)
+    volatile = ~(bull | bear)
+
+    if vix_data is not None:
+        vix_aligned = vix_data.reindex(price.index, method='ffill')
+        high_vix = vix_aligned > vix_aligned.rolling(50).mean() * 1.2
+
+        # High VIX overrides bull classification
+        bull = bull & ~high_vix
+        volatile = volatile | (high_vix & ~bear)
+
+    return pd.DataFrame({
+        'bull': bull,
+        'bear': bear,
+        'volatile': volatile,
+        'ma50': ma50,
+        'ma200': ma200,
+        'drawdown': drawdown,
+    })
+
+
+class MarketContext:
+    """Immutable market snapshot for one trading day"""
+
+    def __init__(self, closes, as_of, risk_free_rate=None):
+        """
+        Args:
+            closes: DataFrame of closes (dates x SPY, ^GSPC, ^VIX, ^IRX)
+            as_of: Trading date the snapshot was built for
+            risk_free_rate: Latest ^IRX rate as a decimal, if available
+        """
+        self.as_of = as_of
+        self.built_at = datetime.now()
+        self.risk_free_rate = risk_free_rate
+
+        self._closes = closes.copy()
+        self._returns = closes[[t for t in BENCHMARK_TICKERS if t in closes.columns]].pct_change()
+        self._vix = closes[VIX_TICKER].dropna() if VIX_TICKER in closes.columns else None
+
+        self._regimes = {}
+        for benchmark in BENCHMARK_TICKERS:
+            if benchmark not in closes.columns:
+                continue
+            price = closes[benchmark].dropna()
+            self._regimes[(benchmark, False)] = classify_market_regimes(price)
+            if self._vix is not None:
+                self._regimes[(benchmark, True)] = classify_market_regimes(price, self._vix)
+
+    @property
+    def last_bar(self):
+        return self._closes.index[-1] if len(self._closes) else None
+
+    def benchmarks(self):
+        return [b for b in BENCHMARK_TICKERS if b in self._closes.columns]
+
+    def benchmark_close_view(self, index=None, benchmark=DEFAULT_BENCHMARK):
+        """Benchmark closes, aligned to index when given (dates outside the snapshot are NaN)"""
+        series = self._closes[benchmark].dropna()
+        return series.copy() if index is None else series.reindex(_normalize_index(index))
+
+    def benchmark_returns_view(self, index=None, benchmark=DEFAULT_BENCHMARK):
+        series = self._returns[benchmark].dropna()
+        return series.copy() if index is None else series.reindex(_normalize_index(index))
+
+    def vix_view(self, index=None):
+        if self._vix is None:
+            return None
+        return self._vix.copy() if index is None else self._vix.reindex(_normalize_index(index), method='ffill')
+
+    def regime_view(self, index, benchmark=DEFAULT_BENCHMARK, include_vix=False):
+        """
+        Regime classification for the given dates.
+
+        Only dates that fall inside the classified history are returned; the
+        frame is re-indexed with the caller's original index labels.
+        """
+        frame = self._regimes.get((benchmark, include_vix))
+        if frame is None:
+            frame = self._regimes.get((benchmark, False))
+        if frame is None:
+            return None
+        normalized = _normalize_index(index)
+        aligned = frame.reindex(normalized)
+        present = aligned['ma200'].notna().to_numpy()
+        aligned = aligned[present].copy()
+        aligned.index = pd.Index(index)[present]
+        for column in ('bull', 'bear', 'volatile'):
+            aligned[column] = aligned[column].astype(bool)
+        return aligned
+
+
+def _normalize_index(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+class MarketContextService:
+    """Builds the MarketContext at most once per trading day, shared by all threads"""
+
+    def __init__(self, history_period=HISTORY_PERIOD):
+        self.history_period = history_period
+        self._context = None
+        self._context_day = None
+        self._last_failure = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _trading_day():
+        return pd.Timestamp.now(tz='America/New_York').date()
+
+    def _build(self):
+        import yfinance as yf
+
+        tickers = list(BENCHMARK_TICKERS) + [VIX_TICKER, IRX_TICKER]
+        started = time.perf_counter()
+        data = yf.download(tickers, period=self.history_period, progress=False, group_by='column', threads=True)
+        if data is None or data.empty or 'Close' not in data:
+            raise ValueError("Empty market data download")
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=tickers[0])
+        closes = closes.copy()
+        closes.index = _normalize_index(closes.index)
+        closes = closes[~closes.index.duplicated(keep='last')].sort_index()
+
+        risk_free_rate = None
+        if IRX_TICKER in closes.columns and closes[IRX_TICKER].notna().any():
+            rate = float(closes[IRX_TICKER].dropna().iloc[-1]) / 100
+            if 0 <= rate <= 0.10:
+                risk_free_rate = rate
+                try:
+                    from risk_free_rate_fetcher import prime_risk_free_rate
+                    prime_risk_free_rate(rate)
+                except Exception as e:
+                    logger.debug(f"Could not prime risk-free rate cache: {e}")
+
+        context = MarketContext(closes, self._trading_day(), risk_free_rate)
+        logger.info(
+            f"Built market context for {context.as_of}: {len(closes)} bars, "
+            f"benchmarks={context.benchmarks()}, rf={risk_free_rate} in {time.perf_counter() - started:.2f}s"
+        )
+        return context
+
+    def get(self, force_refresh=False):
+        """Today's MarketContext, or the last good one (None if none could be built)"""
+        today = self._trading_day()
+        with self._lock:
+            if not force_refresh and self._context is not None and self._context_day == today:
+                return self._context
+            if not force_refresh and time.time() - self._last_failure < RETRY_AFTER_SECONDS:
+                return self._context
+            try:
+                self._context = self._build()
+                self._context_day = today
+            except Exception as e:
+                self._last_failure = time.time()
+                logger.warning(f"Market context build failed, using previous snapshot if any: {e}")
+            return self._context
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_market_context_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = MarketContextService()
+        return _service
+
+
+def get_market_context(force_refresh=False):
+    """Shared MarketContext for the current trading day (None when market data is unavailable)"""
+    return get_market_context_service().get(force_refresh=force_refresh)
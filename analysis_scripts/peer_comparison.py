@@ -9,6 +9,13 @@ from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
+try:
+    from analysis_scripts.insider_activity import (
+        get_insider_activity_engine, insider_aggregates, market_prices_for_dates
+    )
+except ImportError:
+    from insider_activity import get_insider_activity_engine, insider_aggregates, market_prices_for_dates
+
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(funcName)s - %(message)s')
 
 def get_finnhub_api_key():
@@ -152,12 +159,18 @@ def analyze_insider_availability(ticker):
         return ["Unable to determine specific reasons - may be due to limited public data availability"]
 
 def fetch_insider_transactions(ticker, months_back=3):
-    """Fetch insider transactions for a ticker using Finnhub API with enhanced data collection."""
+    """
+    Fetch insider transactions for a ticker using Finnhub API with enhanced data collection.
+    
+    Returns the transactions (possibly empty), or None when they could not be
+    fetched (missing API key, API error / rate limit, request failure), so
+    callers can tell "no insider activity" from "no answer".
+    """
     api_key = get_finnhub_api_key()
     
     if not api_key or api_key == "your_finnhub_api_key_here":
         logging.warning("Finnhub API key not configured properly for insider transactions")
-        return []
+        return None
     
     try:
         # Calculate date range with extended lookback for better data coverage
@@ -199,56 +212,22 @@ def fetch_insider_transactions(ticker, months_back=3):
             return transactions
         else:
             logging.error(f"Finnhub Insider Transactions API error: {response.status_code}")
-            return []
+            return None
     except Exception as e:
         logging.error(f"Error fetching insider transactions for {ticker}: {e}")
-        return []
+        return None
 
 def get_stock_price_for_date(ticker, target_date, max_days_search=10):
     """
     Get historical stock price for a specific date with fallback logic.
-    If exact date not available, search nearby dates within max_days_search range.
+    If exact date not available, use the nearest trading day within max_days_search days.
+    Several dates should be priced together with market_prices_for_dates (one price load).
     """
     try:
-        stock = yf.Ticker(ticker)
-        
-        # Convert target_date to datetime if it's a string
-        if isinstance(target_date, str):
-            target_date = datetime.strptime(target_date, '%Y-%m-%d')
-        
-        # Get historical data around the target date
-        start_date = target_date - timedelta(days=max_days_search)
-        end_date = target_date + timedelta(days=max_days_search)
-        
-        hist = stock.history(start=start_date, end=end_date)
-        
-        if hist.empty:
-            return None
-        
-        # Try to find exact date first
-        target_date_str = target_date.strftime('%Y-%m-%d')
-        if target_date_str in hist.index.strftime('%Y-%m-%d'):
-            exact_match_idx = hist.index[hist.index.strftime('%Y-%m-%d') == target_date_str][0]
-            return hist.loc[exact_match_idx, 'Close']
-        
-        # If exact date not found, find the closest date
-        hist_dates = pd.to_datetime(hist.index.date)
-        target_pd = pd.to_datetime(target_date.date())
-        
-        # Calculate time differences and find closest
-        time_diffs = abs((hist_dates - target_pd).days)
-        closest_idx = time_diffs.argmin()
-        
-        if time_diffs.iloc[closest_idx] <= max_days_search:
-            closest_date = hist.index[closest_idx]
-            closest_price = hist.loc[closest_date, 'Close']
-            days_diff = time_diffs.iloc[closest_idx]
-            
-            logging.info(f"Found price for {ticker} on {closest_date.strftime('%Y-%m-%d')} (${closest_price:.2f}), {days_diff} days from target {target_date_str}")
-            return closest_price
-        
-        return None
-    
+        if not isinstance(target_date, str):
+            target_date = target_date.strftime('%Y-%m-%d')
+        prices, _source = market_prices_for_dates(ticker, [target_date], max_days_search)
+        return prices[0]
     except Exception as e:
         logging.warning(f"Error getting price for {ticker} on {target_date}: {e}")
         return None
@@ -279,8 +258,22 @@ def estimate_price_from_transaction_code(transaction_code, market_price=None):
     
     return code_info
 
-def format_insider_transaction_data(transactions):
-    """Format insider transaction data for display with enhanced price handling."""
+def _needs_market_price(transaction):
+    """True when a transaction has no reported price but its code implies one"""
+    transaction_price = transaction.get('transactionPrice', 0)
+    if transaction_price and transaction_price > 0:
+        return False
+    code_info = estimate_price_from_transaction_code(transaction.get('transactionCode', ''))
+    return bool(code_info['price_expected'] and transaction.get('transactionDate'))
+
+def format_insider_transaction_data(transactions, market_prices=None):
+    """
+    Format insider transaction data for display with enhanced price handling.
+
+    Transactions without a reported price are priced from one batched price
+    lookup (``market_prices`` may pass precomputed prices aligned with
+    ``transactions``).
+    """
     if not transactions:
         return []
     
@@ -290,8 +283,22 @@ def format_insider_transaction_data(transactions):
     # Extract ticker from first transaction if available
     if transactions:
         ticker_for_prices = transactions[0].get('symbol', '').upper()
-    
-    for transaction in transactions:
+
+    if market_prices is None:
+        market_prices = [None] * len(transactions)
+        needed = [i for i, t in enumerate(transactions) if _needs_market_price(t)]
+        if needed and ticker_for_prices:
+            try:
+                prices, source = market_prices_for_dates(
+                    ticker_for_prices, [transactions[i].get('transactionDate') for i in needed]
+                )
+                for i, price in zip(needed, prices):
+                    market_prices[i] = price
+                logging.info(f"Priced {sum(p is not None for p in prices)}/{len(needed)} insider transactions for {ticker_for_prices} from {source}")
+            except Exception as e:
+                logging.warning(f"Could not fetch historical prices: {e}")
+    
+    for index, transaction in enumerate(transactions):
         try:
             # Extract and format transaction data
             name = transaction.get('name', 'Unknown')
@@ -326,15 +333,11 @@ def format_insider_transaction_data(transactions):
                 code_info = estimate_price_from_transaction_code(transaction_code)
                 
                 if code_info['price_expected'] and transaction_date and ticker_for_prices:
-                    # Try to fetch historical price for the transaction date
-                    try:
-                        historical_price = get_stock_price_for_date(ticker_for_prices, transaction_date)
-                        if historical_price and historical_price > 0:
-                            price_display = f"~${historical_price:.2f}"
-                            price_source = "estimated"
-                            logging.info(f"Used historical price for {ticker_for_prices} on {transaction_date}: ${historical_price:.2f}")
-                    except Exception as e:
-                        logging.warning(f"Could not fetch historical price: {e}")
+                    # Historical price for the transaction date (nearest trading day)
+                    historical_price = market_prices[index]
+                    if historical_price and historical_price > 0:
+                        price_display = f"~${historical_price:.2f}"
+                        price_source = "estimated"
                 
                 # If still no price and it's not expected (like stock awards), show appropriate message
                 if price_display == "N/A" and not code_info['price_expected']:
@@ -384,123 +387,22 @@ def format_insider_transaction_data(transactions):
     
     return formatted_transactions
 
-def get_stock_price_for_date(ticker, target_date, max_days_search=10):
-    """
-    Get historical stock price for a specific date with fallback logic.
-    If exact date not available, search nearby dates within max_days_search range.
-    """
-    try:
-        stock = yf.Ticker(ticker)
-        
-        # Convert target_date to datetime if it's a string
-        if isinstance(target_date, str):
-            target_date = datetime.strptime(target_date, '%Y-%m-%d')
-        
-        # Get historical data around the target date
-        start_date = target_date - timedelta(days=max_days_search)
-        end_date = target_date + timedelta(days=max_days_search)
-        
-        hist = stock.history(start=start_date, end=end_date)
-        
-        if hist.empty:
-            return None
-        
-        # Try to find exact date first
-        target_date_str = target_date.strftime('%Y-%m-%d')
-        if target_date_str in hist.index.strftime('%Y-%m-%d'):
-            exact_match_idx = hist.index[hist.index.strftime('%Y-%m-%d') == target_date_str][0]
-            return hist.loc[exact_match_idx, 'Close']
-        
-        # If exact date not found, find the closest date
-        hist_dates = pd.to_datetime(hist.index.date)
-        target_pd = pd.to_datetime(target_date.date())
-        
-        # Calculate time differences and find closest
-        time_diffs = abs((hist_dates - target_pd).days)
-        closest_idx = time_diffs.argmin()
-        
-        if time_diffs.iloc[closest_idx] <= max_days_search:
-            closest_date = hist.index[closest_idx]
-            closest_price = hist.loc[closest_date, 'Close']
-            days_diff = time_diffs.iloc[closest_idx]
-            
-            logging.info(f"Found price for {ticker} on {closest_date.strftime('%Y-%m-%d')} (${closest_price:.2f}), {days_diff} days from target {target_date_str}")
-            return closest_price
-        
-        return None
-    
-    except Exception as e:
-        logging.warning(f"Error getting price for {ticker} on {target_date}: {e}")
-        return None
-
-def estimate_price_from_transaction_code(transaction_code, market_price=None):
-    """
-    Estimate transaction nature and provide price context based on transaction codes.
-    Common codes: P=Purchase, S=Sale, A=Award/Grant, M=Exercise, F=Tax withholding
-    """
-    code_meanings = {
-        'P': {'type': 'Purchase', 'price_expected': True, 'description': 'Open market purchase'},
-        'S': {'type': 'Sale', 'price_expected': True, 'description': 'Open market sale'},
-        'A': {'type': 'Award', 'price_expected': False, 'description': 'Stock award/grant (typically no cash price)'},
-        'M': {'type': 'Exercise', 'price_expected': True, 'description': 'Option exercise'},
-        'F': {'type': 'Tax Payment', 'price_expected': False, 'description': 'Shares sold to pay taxes'},
-        'G': {'type': 'Gift', 'price_expected': False, 'description': 'Gift of securities'},
-        'J': {'type': 'Other', 'price_expected': True, 'description': 'Other acquisition'},
-        'K': {'type': 'Equity Swap', 'price_expected': True, 'description': 'Equity swap'},
-        'W': {'type': 'Acquisition', 'price_expected': False, 'description': 'Acquisition or disposition by will'},
-        'D': {'type': 'Disposition', 'price_expected': True, 'description': 'Disposition'}
-    }
-    
-    code_info = code_meanings.get(transaction_code, {
-        'type': 'Unknown', 
-        'price_expected': True, 
-        'description': 'Unknown transaction type'
-    })
-    
-    return code_info
-
-def analyze_insider_sentiment(transactions):
+def analyze_insider_sentiment(transactions, aggregates=None):
     """Analyze insider transaction sentiment and generate comprehensive narrative with enhanced data quality handling."""
     if not transactions:
         return "No insider transaction data is available for the specified period."
     
-    # Calculate buy vs sell metrics
-    total_transactions = len(transactions)
-    buy_transactions = [t for t in transactions if t.get('raw_change', 0) > 0]
-    sell_transactions = [t for t in transactions if t.get('raw_change', 0) < 0]
-    
-    buy_count = len(buy_transactions)
-    sell_count = len(sell_transactions)
-    
-    # Enhanced monetary calculation with price source awareness
-    total_buy_value = 0
-    total_sell_value = 0
-    buy_with_prices = 0
-    sell_with_prices = 0
-    
-    for t in buy_transactions:
-        if t.get('raw_price', 0) > 0:
-            total_buy_value += abs(t.get('raw_change', 0)) * t.get('raw_price', 0)
-            buy_with_prices += 1
-        elif 'estimated_value' in t and t['estimated_value'] > 0:
-            total_buy_value += t['estimated_value']
-            buy_with_prices += 1
-    
-    for t in sell_transactions:
-        if t.get('raw_price', 0) > 0:
-            total_sell_value += abs(t.get('raw_change', 0)) * t.get('raw_price', 0)
-            sell_with_prices += 1
-        elif 'estimated_value' in t and t['estimated_value'] > 0:
-            total_sell_value += t['estimated_value']
-            sell_with_prices += 1
-    
-    # Calculate share volumes
-    total_buy_shares = sum(abs(t.get('raw_change', 0)) for t in buy_transactions)
-    total_sell_shares = sum(abs(t.get('raw_change', 0)) for t in sell_transactions)
-    
-    # Calculate net values
-    net_value = total_buy_value - total_sell_value
-    net_shares = total_buy_shares - total_sell_shares
+    # Buy / sell, value, code-mix and price-coverage metrics (vectorized)
+    if aggregates is None:
+        aggregates = insider_aggregates(transactions)
+    total_transactions = aggregates['total']
+    buy_count = aggregates['buy_count']
+    sell_count = aggregates['sell_count']
+    total_buy_value = aggregates['buy_value']
+    total_sell_value = aggregates['sell_value']
+    buy_with_prices = aggregates['buy_priced']
+    sell_with_prices = aggregates['sell_priced']
+    net_value = aggregates['net_value']
     
     # Sanity check: if net_value > $10B, it's likely a calculation error (multiply by shares issue)
     # Typical insider transactions are in millions, not billions
@@ -509,14 +411,14 @@ def analyze_insider_sentiment(transactions):
         # Attempt to correct by assuming the value is actually in millions
         net_value = net_value / 1000  # Convert to more realistic range
     
-    # Analyze transaction code patterns
-    award_transactions = [t for t in transactions if t.get('code', '') in ['A', 'F']]  # Awards and tax withholdings
-    market_transactions = [t for t in transactions if t.get('code', '') in ['P', 'S']]  # Open market
-    option_transactions = [t for t in transactions if t.get('code', '') in ['M']]  # Option exercises
+    # Transaction code patterns
+    award_count = aggregates['award_count']      # Awards and tax withholdings
+    market_count = aggregates['market_count']    # Open market
+    option_count = aggregates['option_count']    # Option exercises
     
     # Data quality metrics
-    transactions_with_prices = len([t for t in transactions if t.get('price_source', 'missing') in ['reported', 'estimated']])
-    price_coverage_pct = (transactions_with_prices / total_transactions * 100) if total_transactions > 0 else 0
+    transactions_with_prices = aggregates['priced_count']
+    price_coverage_pct = aggregates['price_coverage_pct']
     
     # Format helper functions
     def format_currency(value):
@@ -537,23 +439,9 @@ def analyze_insider_sentiment(transactions):
         else:
             return f"{shares:,.0f}"
     
-    # Analyze price patterns where available
-    buy_prices = [t.get('raw_price', 0) for t in buy_transactions if t.get('raw_price', 0) > 0]
-    sell_prices = [t.get('raw_price', 0) for t in sell_transactions if t.get('raw_price', 0) > 0]
-    
-    avg_buy_price = sum(buy_prices) / len(buy_prices) if buy_prices else 0
-    avg_sell_price = sum(sell_prices) / len(sell_prices) if sell_prices else 0
-    
-    # Analyze transaction sizes
-    large_buys = [t for t in buy_transactions if abs(t.get('raw_change', 0)) > 10000]  # >10k shares
-    large_sells = [t for t in sell_transactions if abs(t.get('raw_change', 0)) > 10000]
-    small_buys = [t for t in buy_transactions if abs(t.get('raw_change', 0)) <= 10000]
-    small_sells = [t for t in sell_transactions if abs(t.get('raw_change', 0)) <= 10000]
-    
-    # Recent activity analysis (last 5 transactions)
-    recent_transactions = transactions[:5]
-    recent_buys = [t for t in recent_transactions if t.get('raw_change', 0) > 0]
-    recent_sells = [t for t in recent_transactions if t.get('raw_change', 0) < 0]
+    # Price patterns where available
+    avg_buy_price = aggregates['avg_buy_price']
+    avg_sell_price = aggregates['avg_sell_price']
     
     # Generate comprehensive narrative
     narrative_parts = []
@@ -563,13 +451,13 @@ def analyze_insider_sentiment(transactions):
     if price_coverage_pct < 60:
         data_quality_note = f" (Note: Price data available for {price_coverage_pct:.0f}% of transactions, with estimates used where possible)"
     elif transactions_with_prices < total_transactions:
-        estimated_count = len([t for t in transactions if t.get('price_source', '') == 'estimated'])
+        estimated_count = aggregates['estimated_count']
         if estimated_count > 0:
             data_quality_note = f" (including {estimated_count} transactions with estimated pricing)"
     
     # Enhanced opening with transaction type context
-    if award_transactions and len(award_transactions) > total_transactions * 0.4:
-        narrative_parts.append(f"The insider activity shows {total_transactions} transactions over the last three months, with a significant portion ({len(award_transactions)}) being stock awards or tax-related dispositions rather than discretionary market transactions{data_quality_note}.")
+    if award_count and award_count > total_transactions * 0.4:
+        narrative_parts.append(f"The insider activity shows {total_transactions} transactions over the last three months, with a significant portion ({award_count}) being stock awards or tax-related dispositions rather than discretionary market transactions{data_quality_note}.")
     else:
         if sell_count > buy_count * 2:  # Strong selling
             trend = "strong bearish trend"
@@ -588,18 +476,18 @@ def analyze_insider_sentiment(transactions):
             narrative_parts.append(f"The insider transaction data shows a {trend}, with {buy_count} buys and {sell_count} sells over the last three months, suggesting balanced insider sentiment{data_quality_note}.")
     
     # Enhanced analysis with transaction type context
-    if market_transactions:
-        market_buys = [t for t in market_transactions if t.get('raw_change', 0) > 0]
-        market_sells = [t for t in market_transactions if t.get('raw_change', 0) < 0]
+    if market_count:
+        market_buys = aggregates['market_buy_count']
+        market_sells = aggregates['market_sell_count']
         
-        if market_sells and len(market_sells) > len(market_buys):
-            narrative_parts.append(f"Focusing on discretionary open-market activity, there were {len(market_sells)} market sales compared to {len(market_buys)} market purchases, indicating insiders are actively reducing their positions.")
-        elif market_buys and len(market_buys) > len(market_sells):
-            narrative_parts.append(f"Discretionary market activity shows {len(market_buys)} open-market purchases versus {len(market_sells)} sales, suggesting insiders see value at current prices.")
+        if market_sells and market_sells > market_buys:
+            narrative_parts.append(f"Focusing on discretionary open-market activity, there were {market_sells} market sales compared to {market_buys} market purchases, indicating insiders are actively reducing their positions.")
+        elif market_buys and market_buys > market_sells:
+            narrative_parts.append(f"Discretionary market activity shows {market_buys} open-market purchases versus {market_sells} sales, suggesting insiders see value at current prices.")
     
     # Option exercise analysis
-    if option_transactions:
-        option_exercises = len(option_transactions)
+    if option_count:
+        option_exercises = option_count
         narrative_parts.append(f"Additionally, {option_exercises} option exercise{'s' if option_exercises == 1 else 's'} occurred, which may indicate either confidence in future price appreciation or routine portfolio management.")
     
     # Enhanced price analysis with data quality awareness
@@ -612,29 +500,28 @@ def analyze_insider_sentiment(transactions):
         narrative_parts.append("Limited price data availability restricts detailed valuation analysis of these transactions, though share volume patterns remain informative.")
     
     # Recent activity analysis
-    if len(recent_transactions) >= 3:
-        recent_market_activity = [t for t in recent_transactions if t.get('code', '') in ['P', 'S']]
-        if recent_market_activity:
-            recent_market_buys = [t for t in recent_market_activity if t.get('raw_change', 0) > 0]
-            recent_market_sells = [t for t in recent_market_activity if t.get('raw_change', 0) < 0]
+    if aggregates['recent_count'] >= 3:
+        if aggregates['recent_market_count']:
+            recent_market_buys = aggregates['recent_market_buy_count']
+            recent_market_sells = aggregates['recent_market_sell_count']
             
-            if len(recent_market_buys) > len(recent_market_sells):
+            if recent_market_buys > recent_market_sells:
                 narrative_parts.append("Recent discretionary market activity shows a shift toward buying interest, with insiders becoming more active on the purchase side.")
-            elif len(recent_market_sells) > len(recent_market_buys):
+            elif recent_market_sells > recent_market_buys:
                 narrative_parts.append("Recent market transactions lean toward selling, with insiders continuing to reduce their positions in the near term.")
         else:
             narrative_parts.append("Recent insider activity consists primarily of compensation-related transactions rather than discretionary market moves.")
     
     # Enhanced concluding interpretation
-    if award_transactions and len(award_transactions) > total_transactions * 0.6:
+    if award_count and award_count > total_transactions * 0.6:
         narrative_parts.append("The predominance of award-related transactions suggests this is routine equity compensation activity rather than a strong directional signal about company prospects.")
-    elif sell_count > buy_count * 1.5 and market_transactions:
-        market_sell_value = sum(abs(t.get('raw_change', 0)) * t.get('raw_price', 0) for t in market_transactions if t.get('raw_change', 0) < 0 and t.get('raw_price', 0) > 0)
+    elif sell_count > buy_count * 1.5 and market_count:
+        market_sell_value = aggregates['market_sell_value']
         if market_sell_value > 10e6:  # Large scale market selling
             narrative_parts.append("The scale of discretionary market selling activity should give investors pause—when insiders with the best visibility into company operations are reducing exposure, it warrants careful evaluation of near-term risk/reward dynamics.")
         else:
             narrative_parts.append("While the selling activity is notable, the modest scale suggests routine profit-taking rather than fundamental concerns about the company's prospects.")
-    elif buy_count > sell_count * 1.5 and market_transactions:
+    elif buy_count > sell_count * 1.5 and market_count:
         narrative_parts.append("The predominance of insider buying, particularly in open-market transactions, provides a positive signal as those with deepest business knowledge are increasing their financial commitment.")
     else:
         narrative_parts.append("This mixed activity pattern is typical of established companies where insiders balance personal financial planning with maintaining confidence in business fundamentals.")
@@ -643,8 +530,8 @@ def analyze_insider_sentiment(transactions):
 
 def generate_insider_transactions_html(ticker):
     """Generate HTML for insider transactions section."""
-    transactions = fetch_insider_transactions(ticker)
-    formatted_transactions = format_insider_transaction_data(transactions)
+    activity = get_insider_activity_engine().activity(ticker)
+    formatted_transactions = activity['transactions']
     
     if not formatted_transactions:
         # Analyze why insider data might not be available
@@ -709,23 +596,21 @@ def generate_insider_transactions_html(ticker):
         </div>
         """
     
-    # Generate sentiment analysis
-    sentiment_analysis = analyze_insider_sentiment(formatted_transactions)
-    
-    # Prepare summary data with enhanced metrics
-    total_transactions = len(formatted_transactions)
-    buy_count = sum(1 for t in formatted_transactions if t['type'] == 'BUY')
-    sell_count = sum(1 for t in formatted_transactions if t['type'] == 'SELL')
+    # Sentiment analysis and summary metrics (cached with the transactions)
+    sentiment_analysis = activity['narrative']
+    aggregates = activity['aggregates']
+    total_transactions = aggregates['total']
+    buy_count = aggregates['buy_count']
+    sell_count = aggregates['sell_count']
     
     # Data quality metrics
-    transactions_with_prices = len([t for t in formatted_transactions if t.get('price_source', 'missing') in ['reported', 'estimated']])
-    estimated_prices = len([t for t in formatted_transactions if t.get('price_source', '') == 'estimated'])
-    price_coverage_pct = (transactions_with_prices / total_transactions * 100) if total_transactions > 0 else 0
+    estimated_prices = aggregates['estimated_count']
+    price_coverage_pct = aggregates['price_coverage_pct']
     
     # Transaction type breakdown
-    market_transactions = len([t for t in formatted_transactions if t.get('code', '') in ['P', 'S']])
-    award_transactions = len([t for t in formatted_transactions if t.get('code', '') in ['A', 'F']])
-    option_transactions = len([t for t in formatted_transactions if t.get('code', '') in ['M']])
+    market_transactions = aggregates['market_count']
+    award_transactions = aggregates['award_count']
+    option_transactions = aggregates['option_count']
     
     # Show only first 5 transactions by default, rest will be hidden
     visible_transactions = formatted_transactions[:5]
@@ -1686,22 +1571,27 @@ def get_insider_transactions_data(ticker, months_back=3):
     Returns both raw and formatted data.
     """
     try:
-        # Fetch raw transactions
-        raw_transactions = fetch_insider_transactions(ticker, months_back)
-        
-        # Format transactions for display
-        formatted_transactions = format_insider_transaction_data(raw_transactions)
-        
-        # Generate sentiment analysis
-        sentiment = analyze_insider_sentiment(formatted_transactions) if formatted_transactions else "No insider transaction data available."
-        
-        # Calculate summary statistics
-        total_transactions = len(formatted_transactions)
-        buy_count = sum(1 for t in formatted_transactions if t['type'] == 'BUY')
-        sell_count = sum(1 for t in formatted_transactions if t['type'] == 'SELL')
-        
-        # Calculate net activity (positive = more buying, negative = more selling)
-        net_shares = sum(t.get('raw_change', 0) for t in formatted_transactions)
+        if months_back == 3:
+            # Default window: shared with the report section through the activity engine
+            engine = get_insider_activity_engine()
+            raw_transactions = engine.transactions(ticker.upper())
+            activity = engine.activity(ticker)
+            formatted_transactions = activity['transactions']
+            aggregates = activity['aggregates']
+            sentiment = activity['narrative'] if formatted_transactions else "No insider transaction data available."
+        else:
+            raw_transactions = fetch_insider_transactions(ticker, months_back) or []
+            formatted_transactions = format_insider_transaction_data(raw_transactions)
+            aggregates = insider_aggregates(formatted_transactions)
+            sentiment = analyze_insider_sentiment(formatted_transactions, aggregates) if formatted_transactions else "No insider transaction data available."
+        
+        # Summary statistics
+        total_transactions = aggregates['total']
+        buy_count = aggregates['buy_count']
+        sell_count = aggregates['sell_count']
+        
+        # Net activity (positive = more buying, negative = more selling)
+        net_shares = aggregates['net_shares']
         
         return {
             'success': True,
@@ -0,0 +1,318 @@
+"""
+Peer Risk Engine
+================
+
+Cross-sectional risk metrics for a ticker and its peer group, used by
+RiskAnalyzer.compare_to_peers.
+
+Pipeline:
+---------
+1. **Load**: the benchmark (SPY) comes from the shared once-per-day
+   MarketContext when one is passed and covers the window. Target, peers
+   (and the benchmark otherwise) are read from the local daily price cache
+   (generated_data/data_cache/<TICKER>_stock_data_1d.csv) when it is fresh
+   and covers the window; everything else is fetched in a single batched
+   ``yf.download`` call.
+2. **Align**: closes are joined into one date-indexed matrix (one column per
+   ticker, NaN where a ticker has no bar) and turned into a returns matrix.
+3. **Compute**: volatility, Sharpe, Sortino, beta and max drawdown are
+   computed for every column at once with NaN-aware NumPy reductions, plus
+   each ticker's percentile rank within the peer group.
+
+Loaded price panels are kept for a few minutes, and metric tables are
+cached by (ticker set, window, last bar date, risk-free rate), so repeated
+comparisons for the same group are served from memory.
+"""
+
+import os
+import time
+import logging
+import warnings
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TICKER = 'SPY'
+TRADING_DAYS = 252
+MIN_OBSERVATIONS = 30
+METRICS = ('volatility', 'sharpe', 'sortino', 'beta', 'max_drawdown')
+LOWER_IS_BETTER = ('volatility', 'max_drawdown')
+
+DEFAULT_PRICE_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'data_cache'
+)
+
+
+def _cache_filename(ticker):
+    return f"{ticker.replace(':', '_').replace('^', '_').replace('=', '_')}_stock_data_1d.csv"
+
+
+class PeerRiskEngine:
+    """Batched price loading and vectorized peer risk metrics with result caching"""
+
+    def __init__(self, price_cache_dir=None, panel_ttl=10 * 60, max_cache_age_hours=24, max_entries=64):
+        """
+        Args:
+            price_cache_dir: Directory of daily price CSVs written by data_collection.fetch_stock_data
+            panel_ttl: Seconds a loaded price panel is reused before prices are reloaded
+            max_cache_age_hours: Price CSVs older than this are ignored
+            max_entries: Metric tables (and price panels) kept in memory
+        """
+        self.price_cache_dir = os.path.abspath(price_cache_dir or DEFAULT_PRICE_CACHE_DIR)
+        self.panel_ttl = panel_ttl
+        self.max_cache_age_hours = max_cache_age_hours
+        self.max_entries = max_entries
+        self._panels = OrderedDict()   # (tickers, start_date) -> (closes, loaded_at)
+        self._results = OrderedDict()  # (tickers, start_date, last_bar, rf) -> metrics table
+        self._lock = threading.RLock()
+        self._stats = {'result_hits': 0, 'result_misses': 0, 'local_loads': 0, 'downloaded': 0, 'download_calls': 0,
+                       'context_benchmarks': 0}
+
+    # ------------------------------------------------------------------
+    # Price loading
+    # ------------------------------------------------------------------
+
+    def _load_local(self, ticker, start_date):
+        """Closes from the local daily cache, or None when missing, stale or too short"""
+        path = os.path.join(self.price_cache_dir, _cache_filename(ticker))
+        try:
+            if not os.path.exists(path):
+                return None
+            age_hours = (time.time() - os.path.getmtime(path)) / 3600
+            if age_hours > self.max_cache_age_hours:
+                return None
+            data = pd.read_csv(path, parse_dates=['Date'], usecols=['Date', 'Close'])
+            if data.empty or data['Date'].iloc[0] > pd.Timestamp(start_date):
+                return None
+            series = data.set_index('Date')['Close']
+            return series[series.index >= pd.Timestamp(start_date)]
+        except Exception as e:
+            logger.warning(f"Could not read cached prices for {ticker}: {e}")
+            return None
+
+    def _download(self, tickers, start_date):
+        """One batched yfinance download for all tickers; returns {ticker: closes}"""
+        import yfinance as yf
+
+        with self._lock:
+            self._stats['download_calls'] += 1
+            self._stats['downloaded'] += len(tickers)
+        data = yf.download(tickers, start=start_date, progress=False, group_by='column', threads=True)
+        if data is None or data.empty or 'Close' not in data:
+            return {}
+        closes = data['Close']
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(name=tickers[0])
+        result = {}
+        for ticker in tickers:
+            if ticker in closes.columns:
+                series = closes[ticker].dropna()
+                if not series.empty:
+                    result[ticker] = series
+        return result
+
+    def load_closes(self, tickers, start_date):
+        """
+        Aligned close matrix (dates x tickers) for all tickers since start_date.
+
+        Tickers with no data are left out of the matrix.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        key = (tuple(sorted(tickers)), start_date)
+        with self._lock:
+            entry = self._panels.get(key)
+            if entry is not None and time.time() - entry[1] < self.panel_ttl:
+                self._panels.move_to_end(key)
+                return entry[0]
+
+        series = {}
+        missing = []
+        for ticker in tickers:
+            local = self._load_local(ticker, start_date)
+            if local is not None and not local.empty:
+                series[ticker] = local
+            else:
+                missing.append(ticker)
+        with self._lock:
+            self._stats['local_loads'] += len(series)
+
+        if missing:
+            try:
+                series.update(self._download(missing, start_date))
+            except Exception as e:
+                logger.warning(f"Batched price download failed for {missing}: {e}")
+
+        for ticker, values in list(series.items()):
+            index = pd.DatetimeIndex(values.index)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            values = pd.Series(values.to_numpy(dtype=float), index=index.normalize())
+            series[ticker] = values[~values.index.duplicated(keep='last')]
+
+        closes = pd.DataFrame(series)
+        if not closes.empty:
+            closes = closes.sort_index()[[t for t in tickers if t in closes.columns]]
+
+        with self._lock:
+            self._panels[key] = (closes, time.time())
+            while len(self._panels) > self.max_entries:
+                self._panels.popitem(last=False)
+        return closes
+
+    @staticmethod
+    def _context_benchmark(market_context, benchmark, start_date):
+        """Benchmark closes from a MarketContext when it covers the window, else None"""
+        if market_context is None or benchmark not in market_context.benchmarks():
+            return None
+        series = market_context.benchmark_close_view(benchmark=benchmark)
+        start = pd.Timestamp(start_date)
+        if series.empty or series.index[0] > start:
+            return None
+        return series[series.index >= start]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compute_metrics(closes, risk_free_rate, benchmark=BENCHMARK_TICKER):
+        """
+        Metric table (tickers x METRICS) for every column of a close matrix.
+
+        Columns with fewer than MIN_OBSERVATIONS returns get NaN. Beta uses the
+        dates on which both the ticker and the benchmark traded, and matches
+        RiskAnalyzer.calculate_beta (sample covariance over population variance).
+        """
+        prices = closes.to_numpy(dtype=float)
+        # Each ticker's return is taken against its own previous bar, so a gap on a
+        # date another ticker traded does not drop the next return
+        previous = closes.ffill().shift(1).to_numpy(dtype=float)[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = prices[1:] / previous - 1.0
+        valid = np.isfinite(returns)
+        returns = np.where(valid, returns, np.nan)
+        counts = valid.sum(axis=0)
+        enough = counts >= MIN_OBSERVATIONS
+
+        daily_rf = risk_free_rate / TRADING_DAYS
+        excess = returns - daily_rf
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            std = np.nanstd(returns, axis=0, ddof=1)
+            volatility = std * np.sqrt(TRADING_DAYS) * 100
+
+            excess_mean = np.nanmean(excess, axis=0)
+            excess_std = np.nanstd(excess, axis=0, ddof=1)
+            sharpe = excess_mean / excess_std * np.sqrt(TRADING_DAYS)
+
+            downside = np.where(excess < 0, excess, np.nan)
+            downside_std = np.nanstd(downside, axis=0, ddof=1)
+            sortino = excess_mean / downside_std * np.sqrt(TRADING_DAYS)
+
+            running_peak = np.fmax.accumulate(np.where(np.isfinite(prices), prices, np.nan), axis=0)
+            max_drawdown = np.abs(np.nanmin(prices / running_peak - 1.0, axis=0)) * 100
+
+            beta = np.full(prices.shape[1], np.nan)
+            columns = list(closes.columns)
+            if benchmark in columns:
+                market = returns[:, columns.index(benchmark)][:, None]
+                pair = valid & np.isfinite(market)
+                n = pair.sum(axis=0)
+                r = np.where(pair, returns, np.nan)
+                m = np.where(pair, market, np.nan)
+                r_mean = np.nanmean(r, axis=0)
+                m_mean = np.nanmean(m, axis=0)
+                covariance = np.nansum((r - r_mean) * (m - m_mean), axis=0) / (n - 1)
+                market_variance = np.nansum((m - m_mean) ** 2, axis=0) / n
+                beta = np.where(n >= MIN_OBSERVATIONS, covariance / market_variance, np.nan)
+
+        table = pd.DataFrame({
+            'volatility': volatility,
+            'sharpe': sharpe,
+            'sortino': sortino,
+            'beta': beta,
+            'max_drawdown': max_drawdown,
+        }, index=closes.columns)
+        table.loc[~enough] = np.nan
+        return table.replace([np.inf, -np.inf], np.nan)
+
+    def peer_table(self, ticker, peers, period_days=365, risk_free_rate=0.02, benchmark=BENCHMARK_TICKER,
+                   market_context=None):
+        """
+        Metric table for the target and its peers (benchmark excluded unless it is a peer).
+
+        Args:
+            market_context: Shared MarketContext supplying the benchmark series (optional)
+
+        Returns:
+            (table, last_bar_date): table indexed by ticker with one column per metric
+        """
+        start_date = (datetime.now() - timedelta(days=period_days + 100)).strftime('%Y-%m-%d')
+        tickers = [ticker] + [p for p in peers if p != ticker]
+        benchmark_closes = None if benchmark in tickers else self._context_benchmark(market_context, benchmark, start_date)
+        if benchmark_closes is None:
+            closes = self.load_closes(tickers + [benchmark], start_date)
+        else:
+            closes = self.load_closes(tickers, start_date)
+            if not closes.empty:
+                closes = pd.concat([closes, benchmark_closes.rename(benchmark)], axis=1).sort_index()
+            with self._lock:
+                self._stats['context_benchmarks'] += 1
+        if closes.empty:
+            return pd.DataFrame(columns=METRICS), None
+
+        last_bar = closes.index[-1].strftime('%Y-%m-%d')
+        key = (tuple(sorted(set(tickers))), start_date, last_bar, round(risk_free_rate, 6), benchmark)
+        with self._lock:
+            table = self._results.get(key)
+            if table is not None:
+                self._results.move_to_end(key)
+                self._stats['result_hits'] += 1
+                return table, last_bar
+            self._stats['result_misses'] += 1
+
+        table = self.compute_metrics(closes, risk_free_rate, benchmark)
+        table = table.loc[[t for t in dict.fromkeys(tickers) if t in table.index]]
+        with self._lock:
+            self._results[key] = table
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return table, last_bar
+
+    @staticmethod
+    def percentile_ranks(table, ticker):
+        """Share of peers (0-100) whose value is <= the target's, for every metric at once"""
+        if ticker not in table.index:
+            return pd.Series(np.nan, index=table.columns)
+        peers = table.drop(index=ticker).to_numpy(dtype=float)
+        target = table.loc[ticker].to_numpy(dtype=float)
+        available = np.isfinite(peers)
+        at_or_below = (available & (peers <= target)).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ranks = at_or_below / available.sum(axis=0) * 100
+        return pd.Series(ranks, index=table.columns)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_tables'] = len(self._results)
+            stats['cached_panels'] = len(self._panels)
+        return stats
+
+
+_shared_engine = None
+_shared_engine_lock = threading.Lock()
+
+
+def get_peer_risk_engine():
+    """Process-wide engine so the price panels and metric cache are shared"""
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = PeerRiskEngine()
+        return _shared_engine
@@ -14,6 +14,9 @@ Features:
 4. **Quality Thresholds**: Filters low-quality posts (>3 comments required)
 5. **Log-Weighted Scoring**: np.log1p(upvotes) to reduce outlier impact
 6. **Multi-Subreddit Support**: r/wallstreetbets, r/stocks, r/investing
+7. **Subreddit Snapshot**: each subreddit's hot list is fetched and VADER-scored
+   once per refresh window (REDDIT_SNAPSHOT_TTL, default 15 minutes) and
+   indexed by cashtag, so every ticker is an index lookup over the same posts
 
 Configuration Required:
 ----------------------
@@ -35,6 +38,12 @@ print(f"Mention Count: {result['mention_count']}")
 print(f"Confidence: {result['confidence']}")
 ```
 
+Offline (recorded posts, no credentials or network):
+```python
+snapshot = SubredditSnapshot.from_fixture('reddit_posts.json')
+analyzer = RedditSentimentAnalyzer(snapshot=snapshot)
+```
+
 Author: TickZen Engineering Team
 Version: 1.0
 Created: February 9, 2026
@@ -42,9 +51,11 @@ Phase: Phase 3, Day 1
 """
 
 import os
+import re
 import time
 import json
 import hashlib
+import threading
 from datetime import datetime, timedelta
 from collections import deque
 from typing import Dict, List, Optional, Any
@@ -60,6 +71,19 @@ except ImportError:
     PRAW_AVAILABLE = False
     print("Warning: praw not installed. Run: pip install praw")
 
+# Errors that skip one subreddit instead of failing the whole snapshot
+RECOVERABLE_FETCH_ERRORS = (PRAWException,) if PRAW_AVAILABLE else ()
+
+SNAPSHOT_TTL_SECONDS = int(os.getenv('REDDIT_SNAPSHOT_TTL', '900'))
+
+# $AAPL, $BRK.B, $spy - a leading letter keeps prices like $5.00 out
+CASHTAG_PATTERN = re.compile(r'\$([A-Za-z][A-Za-z0-9]{0,5}(?:[.\-][A-Za-z]{1,2})?)(?![A-Za-z0-9])')
+
+
+def extract_cashtags(text: str) -> set:
+    """Uppercase tickers mentioned as cashtags in text"""
+    return {match.upper() for match in CASHTAG_PATTERN.findall(text or '')}
+
 
 class RateLimiter:
     """
@@ -217,6 +241,206 @@ class SentimentCache:
         }
 
 
+class SubredditSnapshot:
+    """
+    Scored hot posts of the target subreddits with a cashtag inverted index.
+
+    Each subreddit is fetched at most once per refresh window and every post
+    is VADER-scored once when it enters the snapshot; a ticker query is then
+    an index lookup filtered by rank, age and engagement. Snapshots loaded
+    from a fixture are frozen (never refetched) and measure lookback from
+    the time they were captured.
+    """
+
+    def __init__(self, subreddits: List[str], ttl_seconds: Optional[int] = SNAPSHOT_TTL_SECONDS,
+                 vader: Optional[SentimentIntensityAnalyzer] = None):
+        """
+        Initialize an empty snapshot.
+
+        Args:
+            subreddits: Subreddits in reporting order
+            ttl_seconds: Refresh window per subreddit (None = frozen)
+            vader: Shared VADER analyzer (created if omitted)
+        """
+        self.subreddits = list(subreddits)
+        self.ttl_seconds = ttl_seconds
+        self.vader = vader or SentimentIntensityAnalyzer()
+        self.captured_at: Optional[float] = None  # reference time of a frozen snapshot
+        self._posts = {}       # post id -> scored post record
+        self._listings = {}    # subreddit -> {'post_ids': [...] in hot order, 'limit': n, 'fetched_at': t}
+        self._index = {}       # ticker -> set of post ids
+        self._lock = threading.RLock()
+        self._fetch_locks = {}  # subreddit -> lock held while its hot list is fetched and scored
+        self._fetch_locks_guard = threading.Lock()
+        self.stats = {'refreshes': 0, 'posts_scored': 0, 'lookups': 0, 'fetch_errors': 0}
+
+    @staticmethod
+    def post_record(post, subreddit_name: str) -> Dict[str, Any]:
+        """Plain dict of the post fields the analysis uses (praw Submission or dict)"""
+        if isinstance(post, dict):
+            return dict(post, subreddit=post.get('subreddit', subreddit_name))
+        return {
+            'id': post.id,
+            'title': post.title,
+            'selftext': post.selftext,
+            'score': post.score,
+            'num_comments': post.num_comments,
+            'created_utc': post.created_utc,
+            'subreddit': subreddit_name,
+        }
+
+    def _is_stale(self, subreddit_name: str, limit: int) -> bool:
+        listing = self._listings.get(subreddit_name)
+        if listing is None:
+            return self.ttl_seconds is not None
+        if self.ttl_seconds is None:
+            return False
+        return listing['limit'] < limit or time.time() - listing['fetched_at'] > self.ttl_seconds
+
+    def _drop_listing(self, subreddit_name: str):
+        listing = self._listings.pop(subreddit_name, None)
+        for post_id in (listing or {}).get('post_ids', []):
+            record = self._posts.pop(post_id, None)
+            for ticker in (record or {}).get('tickers', ()):
+                ids = self._index.get(ticker)
+                if ids is not None:
+                    ids.discard(post_id)
+                    if not ids:
+                        del self._index[ticker]
+
+    def _score_posts(self, subreddit_name: str, posts) -> List[Dict[str, Any]]:
+        """Post records with their VADER compound score and cashtags (no lock needed)"""
+        records = []
+        for post in posts:
+            record = self.post_record(post, subreddit_name)
+            text = f"{record['title']} {record['selftext']}"
+            record['sentiment'] = self.vader.polarity_scores(text)['compound']
+            record['tickers'] = sorted(extract_cashtags(text))
+            records.append(record)
+        return records
+
+    def _swap_listing(self, subreddit_name: str, records: List[Dict[str, Any]], limit: int,
+                      fetched_at: Optional[float] = None):
+        with self._lock:
+            self._drop_listing(subreddit_name)
+            post_ids = []
+            for record in records:
+                self._posts[record['id']] = record
+                post_ids.append(record['id'])
+                for ticker in record['tickers']:
+                    self._index.setdefault(ticker, set()).add(record['id'])
+            self.stats['posts_scored'] += len(records)
+            self._listings[subreddit_name] = {
+                'post_ids': post_ids,
+                'limit': limit,
+                'fetched_at': fetched_at if fetched_at is not None else time.time(),
+            }
+
+    def load_listing(self, subreddit_name: str, posts, limit: int, fetched_at: Optional[float] = None):
+        """Replace a subreddit's posts: score each once and index its cashtags"""
+        self._swap_listing(subreddit_name, self._score_posts(subreddit_name, posts), limit, fetched_at)
+
+    def _fetch_lock(self, subreddit_name: str) -> threading.Lock:
+        with self._fetch_locks_guard:
+            return self._fetch_locks.setdefault(subreddit_name, threading.Lock())
+
+    def refresh(self, fetch_posts, limit: int):
+        """
+        Refetch the subreddits whose listing is missing, expired, or shorter than limit.
+
+        Fetching and scoring run outside the snapshot lock, so lookups keep
+        answering from the current listing until the new one is swapped in.
+        Concurrent refreshes of the same subreddit wait for the one in flight
+        instead of fetching it again.
+
+        Args:
+            fetch_posts: Callable (subreddit_name, limit) -> iterable of posts
+            limit: Hot posts needed per subreddit
+        """
+        for subreddit_name in self.subreddits:
+            with self._lock:
+                if not self._is_stale(subreddit_name, limit):
+                    continue
+            with self._fetch_lock(subreddit_name):
+                with self._lock:
+                    # Another thread may have refreshed it while this one waited
+                    if not self._is_stale(subreddit_name, limit):
+                        continue
+                try:
+                    records = self._score_posts(subreddit_name, list(fetch_posts(subreddit_name, limit)))
+                except RECOVERABLE_FETCH_ERRORS as e:
+                    with self._lock:
+                        self.stats['fetch_errors'] += 1
+                    print(f"Error fetching from r/{subreddit_name}: {e}")
+                    continue
+                self._swap_listing(subreddit_name, records, limit)
+                with self._lock:
+                    self.stats['refreshes'] += 1
+
+    def mentions(self, ticker: str, lookback_hours: int, limit_per_subreddit: int,
+                 min_comments: int = 0):
+        """
+        Posts mentioning $ticker, in subreddit then hot-list order.
+
+        Returns:
+            (mentions, posts_checked) where posts_checked counts the hot posts
+            within the per-subreddit limit
+        """
+        reference = self.captured_at if self.ttl_seconds is None and self.captured_at else time.time()
+        cutoff = reference - lookback_hours * 3600
+        with self._lock:
+            self.stats['lookups'] += 1
+            matching = self._index.get(ticker, set())
+            mentions = []
+            posts_checked = 0
+            for subreddit_name in self.subreddits:
+                post_ids = self._listings.get(subreddit_name, {}).get('post_ids', [])[:limit_per_subreddit]
+                posts_checked += len(post_ids)
+                for post_id in post_ids:
+                    if post_id not in matching:
+                        continue
+                    post = self._posts[post_id]
+                    if post['created_utc'] < cutoff or post['num_comments'] < min_comments:
+                        continue
+                    mentions.append(post)
+        return mentions, posts_checked
+
+    def to_fixture(self, path: str):
+        """Record the raw posts so the snapshot can be replayed offline"""
+        fields = ('id', 'title', 'selftext', 'score', 'num_comments', 'created_utc')
+        with self._lock:
+            data = {
+                'captured_at': time.time(),
+                'subreddits': {
+                    name: [{f: self._posts[pid][f] for f in fields} for pid in listing['post_ids']]
+                    for name, listing in self._listings.items()
+                },
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def from_fixture(cls, path: str, subreddits: Optional[List[str]] = None) -> 'SubredditSnapshot':
+        """Frozen snapshot of recorded posts ({'captured_at', 'subreddits': {name: [post, ...]}})"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        listings = data['subreddits']
+        snapshot = cls(subreddits or list(listings), ttl_seconds=None)
+        snapshot.captured_at = data.get('captured_at')
+        for name, posts in listings.items():
+            snapshot.load_listing(name, posts, limit=len(posts), fetched_at=snapshot.captured_at)
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self.stats,
+                posts=len(self._posts),
+                indexed_tickers=len(self._index),
+                frozen=self.ttl_seconds is None,
+            )
+
+
 class RedditSentimentAnalyzer:
     """
     Production-grade Reddit sentiment analyzer with rate limiting and caching.
@@ -237,7 +461,8 @@ class RedditSentimentAnalyzer:
     
     def __init__(self, client_id: Optional[str] = None, 
                  client_secret: Optional[str] = None, 
-                 user_agent: Optional[str] = None):
+                 user_agent: Optional[str] = None,
+                 snapshot: Optional[SubredditSnapshot] = None):
         """
         Initialize Reddit sentiment analyzer.
         
@@ -245,6 +470,8 @@ class RedditSentimentAnalyzer:
             client_id: Reddit API client ID (or set REDDIT_CLIENT_ID env var)
             client_secret: Reddit API client secret (or set REDDIT_CLIENT_SECRET env var)
             user_agent: Reddit API user agent (or set REDDIT_USER_AGENT env var)
+            snapshot: Subreddit snapshot to share between analyzers, or a
+                frozen one from SubredditSnapshot.from_fixture()
         """
         # Get credentials from parameters or environment variables
         self.client_id = client_id or os.getenv('REDDIT_CLIENT_ID')
@@ -255,6 +482,7 @@ class RedditSentimentAnalyzer:
         self.rate_limiter = RateLimiter(max_requests=1000, time_window=600)
         self.cache = SentimentCache(ttl_seconds=3600)
         self.vader = SentimentIntensityAnalyzer()
+        self.snapshot = snapshot or SubredditSnapshot(self.TARGET_SUBREDDITS, vader=self.vader)
         
         # Reddit API client (initialized lazily)
         self._reddit = None
@@ -329,8 +557,7 @@ class RedditSentimentAnalyzer:
         Returns:
             True if cashtag found, False otherwise
         """
-        cashtag = f"${ticker}"
-        return cashtag.upper() in text.upper()
+        return ticker.upper() in extract_cashtags(text)
     
     def _calculate_log_weighted_score(self, upvotes: int, sentiment: float) -> float:
         """
@@ -400,10 +627,31 @@ class RedditSentimentAnalyzer:
                 'source': 'reddit'
             }
     
+    def _fetch_hot_posts(self, subreddit_name: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch one subreddit's hot list for the snapshot.
+        
+        Args:
+            subreddit_name: Subreddit to fetch
+            limit: Max posts to fetch
+            
+        Returns:
+            Post records in hot-list order
+        """
+        # Rate limit check
+        self._wait_for_rate_limit()
+        
+        posts = []
+        for post in self.reddit.subreddit(subreddit_name).hot(limit=limit):
+            self.rate_limiter.record_request()
+            self.stats['api_calls'] += 1
+            posts.append(SubredditSnapshot.post_record(post, subreddit_name))
+        return posts
+    
     def _fetch_and_analyze(self, ticker: str, lookback_hours: int,
                           limit_per_subreddit: int) -> Dict[str, Any]:
         """
-        Internal method to fetch and analyze Reddit posts.
+        Internal method to look up a ticker in the subreddit snapshot and aggregate its sentiment.
         
         Args:
             ticker: Normalized ticker symbol
@@ -413,73 +661,39 @@ class RedditSentimentAnalyzer:
         Returns:
             Analysis result dictionary
         """
-        cutoff_time = datetime.utcnow() - timedelta(hours=lookback_hours)
+        # Fetches only the subreddits whose hot list is older than the refresh window
+        self.snapshot.refresh(self._fetch_hot_posts, limit_per_subreddit)
+        posts, total_posts_checked = self.snapshot.mentions(
+            ticker, lookback_hours, limit_per_subreddit, min_comments=self.MIN_COMMENT_COUNT
+        )
         
         all_mentions = []
-        total_posts_checked = 0
         top_post = None
         max_upvotes = 0
         
-        for subreddit_name in self.TARGET_SUBREDDITS:
-            try:
-                # Rate limit check
-                self._wait_for_rate_limit()
-                
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                # Fetch recent hot posts
-                for post in subreddit.hot(limit=limit_per_subreddit):
-                    self.rate_limiter.record_request()
-                    self.stats['api_calls'] += 1
-                    
-                    total_posts_checked += 1
-                    
-                    # Check if post is within time range
-                    post_time = datetime.utcfromtimestamp(post.created_utc)
-                    if post_time < cutoff_time:
-                        continue
-                    
-                    # Quality filter: Must have minimum comments
-                    if post.num_comments < self.MIN_COMMENT_COUNT:
-                        continue
-                    
-                    # Check for ticker cashtag in title or selftext
-                    text = f"{post.title} {post.selftext}"
-                    
-                    if not self._contains_cashtag(text, ticker):
-                        continue
-                    
-                    # Valid mention found - analyze sentiment
-                    sentiment_scores = self.vader.polarity_scores(text)
-                    compound_score = sentiment_scores['compound']
-                    
-                    weighted_score = self._calculate_log_weighted_score(
-                        post.score, compound_score
-                    )
-                    
-                    all_mentions.append({
-                        'text': post.title,
-                        'sentiment': compound_score,
-                        'weighted_sentiment': weighted_score,
-                        'upvotes': post.score,
-                        'comments': post.num_comments,
-                        'subreddit': subreddit_name,
-                        'created': post_time
-                    })
-                    
-                    # Track top post
-                    if post.score > max_upvotes:
-                        max_upvotes = post.score
-                        top_post = {
-                            'title': post.title,
-                            'upvotes': post.score,
-                            'sentiment': compound_score,
-                            'subreddit': subreddit_name
-                        }
+        for post in posts:
+            compound_score = post['sentiment']
+            weighted_score = self._calculate_log_weighted_score(post['score'], compound_score)
+            
+            all_mentions.append({
+                'text': post['title'],
+                'sentiment': compound_score,
+                'weighted_sentiment': weighted_score,
+                'upvotes': post['score'],
+                'comments': post['num_comments'],
+                'subreddit': post['subreddit'],
+                'created': datetime.utcfromtimestamp(post['created_utc'])
+            })
             
-            except PRAWException as e:
-                print(f"Error fetching from r/{subreddit_name}: {e}")
-                continue
+            # Track top post
+            if post['score'] > max_upvotes:
+                max_upvotes = post['score']
+                top_post = {
+                    'title': post['title'],
+                    'upvotes': post['score'],
+                    'sentiment': compound_score,
+                    'subreddit': post['subreddit']
+                }
         
         # Calculate aggregate sentiment
         mention_count = len(all_mentions)
@@ -544,6 +758,7 @@ class RedditSentimentAnalyzer:
         return {
             'api_stats': self.stats,
             'cache_stats': self.cache.get_stats(),
+            'snapshot_stats': self.snapshot.get_stats(),
             'rate_limit_stats': self.rate_limiter.get_stats()
         }
     
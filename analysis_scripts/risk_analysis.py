@@ -152,11 +152,19 @@ import os
 # Add parent directory to path to import risk_free_rate_fetcher
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from risk_free_rate_fetcher import fetch_current_risk_free_rate
+from market_context import classify_market_regimes, get_market_context
+
+# Optional pipeline tracing (spans are no-ops outside a traced pipeline run)
+try:
+    from automation_scripts.tracing import traced
+except ImportError:
+    def traced(name=None, root=False):
+        return lambda func: func
 
 class RiskAnalyzer:
     """Advanced risk analysis for stock evaluation"""
     
-    def __init__(self, use_dynamic_rf_rate=True):
+    def __init__(self, use_dynamic_rf_rate=True, market_context=None):
         """
         Initialize RiskAnalyzer with configurable risk-free rate.
         
@@ -165,6 +173,10 @@ class RiskAnalyzer:
         use_dynamic_rf_rate : bool, default=True
             If True, fetches current 13-week T-bill rate from ^IRX (Yahoo Finance).
             If False, uses hardcoded 2% rate (for backward compatibility/testing).
+        market_context : MarketContext, optional
+            Shared benchmark/VIX/regime snapshot (see market_context.get_market_context).
+            When set, regime classification and missing benchmark data come from it
+            instead of being recomputed for every ticker.
         
         Notes:
         ------
@@ -175,7 +187,10 @@ class RiskAnalyzer:
             self.risk_free_rate = fetch_current_risk_free_rate()
         else:
             self.risk_free_rate = 0.02  # 2% fallback/testing rate
+        self.market_context = market_context
+        self._ticker_obj = (None, None)  # last (symbol, yf.Ticker) so .info/financials are fetched once per ticker
     
+    @traced('risk.calculate_var')
     def calculate_var(self, returns, confidence_level=0.05, method='historical'):
         """
         Calculate Value at Risk (VaR) using historical simulation or parametric method
@@ -195,6 +210,7 @@ class RiskAnalyzer:
             sigma = returns.std()
             return stats.norm.ppf(confidence_level, mu, sigma)
     
+    @traced('risk.calculate_cvar')
     def calculate_cvar(self, returns, confidence_level=0.05):
         """
         Calculate Conditional Value at Risk (CVaR) / Expected Shortfall
@@ -241,6 +257,17 @@ class RiskAnalyzer:
         
         return cvar
     
+    def _get_ticker(self, ticker):
+        """yf.Ticker for ticker, reused across liquidity/Altman/metadata lookups"""
+        import yfinance as yf
+        
+        symbol, stock = self._ticker_obj
+        if symbol != ticker or stock is None:
+            stock = yf.Ticker(ticker)
+            self._ticker_obj = (ticker, stock)
+        return stock
+    
+    @traced('risk.calculate_liquidity_risk_robust')
     def calculate_liquidity_risk_robust(self, ticker):
         """
         Calculate liquidity risk score using Hasbrouck model (2009).
@@ -274,7 +301,7 @@ class RiskAnalyzer:
         import yfinance as yf
         
         try:
-            stock = yf.Ticker(ticker)
+            stock = self._get_ticker(ticker)
             
             # Get historical data (90 days for volume analysis)
             hist = stock.history(period='3mo')
@@ -362,6 +389,7 @@ class RiskAnalyzer:
                 'interpretation': f"Error: {str(e)[:50]}"
             }
     
+    @traced('risk.calculate_altman_z_score_robust')
     def calculate_altman_z_score_robust(self, ticker):
         """
         Calculate Altman Z-Score with quarterly fallback and data validation.
@@ -403,7 +431,7 @@ class RiskAnalyzer:
         import logging
         
         try:
-            stock = yf.Ticker(ticker)
+            stock = self._get_ticker(ticker)
             
             # Try annual financials first
             try:
@@ -530,11 +558,13 @@ class RiskAnalyzer:
                 'data_period': None
             }
     
+    @traced('risk.calculate_sharpe_ratio')
     def calculate_sharpe_ratio(self, returns):
         """Calculate Sharpe ratio"""
         excess_returns = returns - self.risk_free_rate/252
         return excess_returns.mean() / excess_returns.std() * np.sqrt(252)
     
+    @traced('risk.calculate_sortino_ratio')
     def calculate_sortino_ratio(self, returns):
         """Calculate Sortino ratio (downside deviation)"""
         excess_returns = returns - self.risk_free_rate/252
@@ -542,6 +572,7 @@ class RiskAnalyzer:
         downside_deviation = downside_returns.std()
         return excess_returns.mean() / downside_deviation * np.sqrt(252)
     
+    @traced('risk.calculate_max_drawdown')
     def calculate_max_drawdown(self, prices):
         """Calculate maximum drawdown"""
         cumulative = (1 + prices.pct_change()).cumprod()
@@ -549,13 +580,15 @@ class RiskAnalyzer:
         drawdown = (cumulative - running_max) / running_max
         return drawdown.min()
     
+    @traced('risk.calculate_beta')
     def calculate_beta(self, stock_returns, market_returns):
         """Calculate beta coefficient"""
         covariance = np.cov(stock_returns, market_returns)[0][1]
         market_variance = np.var(market_returns)
         return covariance / market_variance
     
-    def comprehensive_risk_profile(self, price_data, market_data=None, ticker=None):
+    @traced('risk.comprehensive_risk_profile')
+    def comprehensive_risk_profile(self, price_data, market_data=None, ticker=None, market_context=None):
         """
         Generate comprehensive risk analysis.
         
@@ -567,6 +600,9 @@ class RiskAnalyzer:
             Market benchmark price data (e.g., S&P 500)
         ticker : str, optional
             Stock ticker symbol (required for liquidity score calculation)
+        market_context : MarketContext, optional
+            Shared market snapshot (defaults to the one given to the constructor);
+            supplies the benchmark when market_data is None and the regime classification
             
         Returns:
         --------
@@ -574,6 +610,11 @@ class RiskAnalyzer:
         """
         import logging
         returns = price_data.pct_change().dropna()
+        context = market_context or self.market_context
+        if market_data is None and context is not None and isinstance(price_data.index, pd.DatetimeIndex):
+            market_data = context.benchmark_close_view(price_data.index).dropna()
+            if market_data.empty:
+                market_data = None
         
         # Calculate 30-day rolling volatility (annualized)
         vol_30d = returns.tail(30).std() * np.sqrt(252) if len(returns) >= 30 else returns.std() * np.sqrt(252)
@@ -653,7 +694,8 @@ class RiskAnalyzer:
                     regime_result = self.calculate_regime_risk_advanced(
                         returns=aligned_returns,
                         market_returns=aligned_market,
-                        vix_data=None  # VIX optional for now
+                        vix_data=None,  # VIX optional for now
+                        market_context=context
                     )
                     
                     if regime_result and regime_result.get('profile') != 'Unknown':
@@ -671,7 +713,8 @@ class RiskAnalyzer:
         
         return risk_metrics
     
-    def comprehensive_risk_profile_with_metadata(self, price_data, market_data=None, ticker=None):
+    @traced('risk.comprehensive_risk_profile_with_metadata')
+    def comprehensive_risk_profile_with_metadata(self, price_data, market_data=None, ticker=None, market_context=None):
         """
         Generate comprehensive risk analysis WITH full metadata context.
         
@@ -685,6 +728,8 @@ class RiskAnalyzer:
             Market benchmark price data (e.g., S&P 500)
         ticker : str, optional
             Stock ticker symbol (required for liquidity and Altman calculations)
+        market_context : MarketContext, optional
+            Shared market snapshot, see comprehensive_risk_profile
             
         Returns:
         --------
@@ -696,7 +741,7 @@ class RiskAnalyzer:
         import logging
         
         # Calculate base metrics using existing method
-        base_metrics = self.comprehensive_risk_profile(price_data, market_data, ticker)
+        base_metrics = self.comprehensive_risk_profile(price_data, market_data, ticker, market_context=market_context)
         
         # Prepare returns and data analysis
         returns = price_data.pct_change().dropna()
@@ -770,7 +815,8 @@ class RiskAnalyzer:
         # ========================================================================
         if ticker:
             try:
-                liquidity_result = self.calculate_liquidity_risk_robust(ticker)
+                # Already computed by comprehensive_risk_profile
+                liquidity_result = base_metrics.get('liquidity_risk') or self.calculate_liquidity_risk_robust(ticker)
                 
                 if liquidity_result:
                     liquidity_days = liquidity_result.get('data_period_days', 90)
@@ -1010,7 +1056,8 @@ class RiskAnalyzer:
             'metadata': metadata
         }
     
-    def calculate_regime_risk_advanced(self, returns, market_returns, vix_data=None):
+    @traced('risk.calculate_regime_risk_advanced')
+    def calculate_regime_risk_advanced(self, returns, market_returns, vix_data=None, market_context=None):
         """
         Analyze risk behavior in different market regimes using professional-grade detection.
         Uses 50/200 MA crossover + S&P drawdown + optional VIX filter (MSCI/NBER standard).
@@ -1023,6 +1070,10 @@ class RiskAnalyzer:
             Market benchmark returns (e.g., S&P 500)
         vix_data : pd.Series, optional
             VIX index data for volatility filter
+        market_context : MarketContext, optional
+            Shared snapshot whose precomputed S&P 500 regime classification is used
+            instead of re-deriving MAs from market_returns (classified over the full
+            benchmark history, so the first 200 days of the window are usable too)
             
         Returns:
         --------
@@ -1049,18 +1100,18 @@ class RiskAnalyzer:
         import logging
         
         try:
-            # Calculate price from returns for MA calculations
-            market_price = (1 + market_returns).cumprod()
-            
-            # Calculate moving averages on price
-            market_ma50 = market_price.rolling(50).mean()
-            market_ma200 = market_price.rolling(200).mean()
-            
-            # Identify valid periods (skip first 200 days where MA200 is NaN)
+            regime_frame = None
+            if market_context is not None:
+                regime_frame = market_context.regime_view(returns.index, include_vix=vix_data is not None)
+            if regime_frame is None:
+                # Calculate price from returns for MA calculations
+                market_price = (1 + market_returns).cumprod()
+                regime_frame = classify_market_regimes(market_price, vix_data)
+            
+            # Only dates where MA200 is calculated are classified
             # This prevents misclassification of early period data
-            valid_idx = ~market_ma200.isna()  # Only use dates where MA200 is calculated
-            if valid_idx.sum() < 100:  # Need at least 100 days with valid MAs
-                logging.warning(f"Insufficient valid MA periods: {valid_idx.sum()} days (need 100+)")
+            if len(regime_frame) < 100:  # Need at least 100 days with valid MAs
+                logging.warning(f"Insufficient valid MA periods: {len(regime_frame)} days (need 100+)")
                 return {
                     'bull_market_volatility': None,
                     'bear_market_volatility': None,
@@ -1074,44 +1125,10 @@ class RiskAnalyzer:
                     'interpretation': 'Insufficient data for regime detection'
                 }
             
-            # Filter to valid periods
-            market_ma50 = market_ma50[valid_idx]
-            market_ma200 = market_ma200[valid_idx]
-            market_price = market_price[valid_idx]
-            market_returns_valid = market_returns[valid_idx]
-            returns = returns[valid_idx]  # Align stock returns to valid periods
-            
-            # Calculate S&P drawdown
-            market_running_max = market_price.expanding().max()
-            market_drawdown = (market_price - market_running_max) / market_running_max
-            
-            # Define regimes using multiple signals (professional standard)
-            # Bear: drawdown > 20% OR sustained 50<200 for 20 days (highest priority)
-            # MSCI/NBER recession regime method
-            sustained_bear = (market_ma50 < market_ma200).rolling(20).sum() >= 20
-            bear_mask = (market_drawdown < -0.20) | sustained_bear
-            
-            # Bull: 50 MA > 200 MA AND price > 50 MA AND drawdown < 10% AND NOT bear
-            # Bear takes priority (can't be bull during bear market)
-            bull_mask = (
-                (market_price > market_ma50) & 
-                (market_ma50 > market_ma200) & 
-                (market_drawdown > -0.10) &
-                ~bear_mask  # Exclude bear days from bull classification
-            )
-            
-            # Volatile: Everything else (choppy markets, no clear trend)
-            volatile_mask = ~(bull_mask | bear_mask)
-            
-            # Optional VIX filter (if VIX data provided)
-            if vix_data is not None:
-                # Align VIX to valid periods
-                vix_aligned = vix_data.reindex(market_price.index, method='ffill')
-                high_vix = vix_aligned > vix_aligned.rolling(50).mean() * 1.2
-                
-                # High VIX overrides bull classification
-                bull_mask = bull_mask & ~high_vix
-                volatile_mask = volatile_mask | (high_vix & ~bear_mask)
+            returns = returns.loc[regime_frame.index]  # Align stock returns to classified periods
+            bull_mask = regime_frame['bull']
+            bear_mask = regime_frame['bear']
+            volatile_mask = regime_frame['volatile']
             
             # Calculate risk metrics for each regime
             regimes = {
@@ -1224,6 +1241,7 @@ class RiskAnalyzer:
                 'interpretation': f"Error calculating regime risk: {str(e)}"
             }
     
+    @traced('risk.compare_to_peers')
     def compare_to_peers(self, ticker, peers, metric='volatility', period_days=365):
         """
         Compare target stock's risk metric to peer group (P2.5 - Peer Risk Comparison)
@@ -1235,7 +1253,7 @@ class RiskAnalyzer:
         peers : list
             List of peer ticker symbols (target will be auto-excluded if present)
         metric : str, optional
-            Metric to compare ('volatility', 'sharpe', 'beta', 'max_drawdown')
+            Metric to compare ('volatility', 'sharpe', 'sortino', 'beta', 'max_drawdown')
             Default: 'volatility'
         period_days : int, optional
             Historical period in days for calculation (default: 365 = 1 year)
@@ -1267,96 +1285,122 @@ class RiskAnalyzer:
         >>> print(f"Percentile rank: {result['percentile_rank']:.0f}%")
         >>> print(f"Interpretation: {result['interpretation']}")
         """
-        import yfinance as yf
+        results = self.compare_to_peers_multi(ticker, peers, metrics=[metric], period_days=period_days)
+        if 'error' in results:
+            return results
+        return results[metric]
+    
+    @traced('risk.compare_to_peers_multi')
+    def compare_to_peers_multi(self, ticker, peers, metrics=None, period_days=365):
+        """
+        Compare several risk metrics to the peer group in one pass
+        
+        The SPY benchmark comes from the shared market context; target and peers
+        are loaded together (local price cache first, then one batched download)
+        and every metric is computed for all
+        tickers at once by the shared PeerRiskEngine, which also caches the result
+        per (peer set, window, last bar date).
+        
+        Parameters:
+        -----------
+        ticker : str
+            Target stock ticker symbol
+        peers : list
+            List of peer ticker symbols (target will be auto-excluded if present)
+        metrics : list, optional
+            Metrics to compare (default: all of 'volatility', 'sharpe', 'sortino', 'beta', 'max_drawdown')
+        period_days : int, optional
+            Historical period in days for calculation (default: 365 = 1 year)
+        
+        Returns:
+        --------
+        dict
+            {metric: compare_to_peers-style result}, or {'error': str}
+        """
         import logging
+        from peer_risk_engine import get_peer_risk_engine, METRICS, LOWER_IS_BETTER
         
         try:
-            # Validate metric type
-            valid_metrics = ['volatility', 'sharpe', 'beta', 'max_drawdown']
-            if metric not in valid_metrics:
+            metrics = list(metrics or METRICS)
+            invalid = [m for m in metrics if m not in METRICS]
+            if invalid:
                 return {
-                    'error': f"Invalid metric '{metric}'. Valid options: {valid_metrics}"
+                    'error': f"Invalid metric '{invalid[0]}'. Valid options: {list(METRICS)}"
                 }
             
             # Remove target from peers if present
-            peer_tickers = [p for p in peers if p != ticker]
+            peer_tickers = [p for p in dict.fromkeys(peers) if p != ticker]
             
             if len(peer_tickers) < 1:
                 return {
                     'error': "Need at least 1 peer ticker for comparison"
                 }
             
-            # Download data for target and peers
-            start_date = (datetime.now() - timedelta(days=period_days + 100)).strftime('%Y-%m-%d')
-            
-            # Get target data
-            target_data = yf.download(ticker, start=start_date, progress=False)
-            if target_data.empty:
+            engine = get_peer_risk_engine()
+            context = self.market_context if self.market_context is not None else get_market_context()
+            table, last_bar = engine.peer_table(
+                ticker, peer_tickers, period_days=period_days, risk_free_rate=self.risk_free_rate,
+                market_context=context
+            )
+            if ticker not in table.index:
                 return {'error': f"No data available for {ticker}"}
             
-            # Calculate target metric
-            target_value = self._calculate_single_metric(target_data, metric, ticker)
-            if target_value is None:
-                return {'error': f"Could not calculate {metric} for {ticker}"}
-            
-            # Calculate peer metrics
-            peer_values = {}
-            for peer in peer_tickers:
-                peer_data = yf.download(peer, start=start_date, progress=False)
-                if not peer_data.empty:
-                    peer_value = self._calculate_single_metric(peer_data, metric, peer)
-                    if peer_value is not None:
-                        peer_values[peer] = peer_value
-            
-            if len(peer_values) < 1:
-                return {'error': "Could not calculate metric for any peer"}
+            percentiles = engine.percentile_ranks(table, ticker)
+            peer_table = table.drop(index=ticker)
             
-            # Calculate peer statistics
-            peer_vals_list = list(peer_values.values())
-            peer_avg = np.mean(peer_vals_list)
-            peer_median = np.median(peer_vals_list)
-            peer_std = np.std(peer_vals_list)
-            peer_min = np.min(peer_vals_list)
-            peer_max = np.max(peer_vals_list)
-            
-            # Identify best/worst peers (context-dependent)
-            if metric in ['volatility', 'max_drawdown']:
-                # Lower is better
-                best_peer = min(peer_values, key=peer_values.get)
-                worst_peer = max(peer_values, key=peer_values.get)
-            else:
-                # Higher is better (Sharpe, Beta if >1)
-                best_peer = max(peer_values, key=peer_values.get)
-                worst_peer = min(peer_values, key=peer_values.get)
-            
-            # Calculate percentile rank
-            percentile = (sum(1 for v in peer_vals_list if v <= target_value) / len(peer_vals_list)) * 100
-            
-            # Calculate relative difference
-            relative_to_avg_pct = ((target_value - peer_avg) / abs(peer_avg)) * 100 if peer_avg != 0 else 0
-            
-            # Generate interpretation
-            interpretation = self._generate_peer_interpretation(
-                metric, target_value, peer_avg, percentile, relative_to_avg_pct
-            )
+            results = {}
+            for metric in metrics:
+                target_value = table.at[ticker, metric]
+                if pd.isna(target_value):
+                    return {'error': f"Could not calculate {metric} for {ticker}"}
+                
+                peer_series = peer_table[metric].dropna()
+                if len(peer_series) < 1:
+                    return {'error': "Could not calculate metric for any peer"}
+                
+                # Calculate peer statistics
+                peer_vals = peer_series.to_numpy(dtype=float)
+                peer_avg = float(np.mean(peer_vals))
+                
+                # Identify best/worst peers (context-dependent)
+                if metric in LOWER_IS_BETTER:
+                    # Lower is better
+                    best_peer, worst_peer = peer_series.idxmin(), peer_series.idxmax()
+                else:
+                    # Higher is better (Sharpe, Sortino, Beta if >1)
+                    best_peer, worst_peer = peer_series.idxmax(), peer_series.idxmin()
+                
+                percentile = float(percentiles[metric])
+                target_value = float(target_value)
+                
+                # Calculate relative difference
+                relative_to_avg_pct = ((target_value - peer_avg) / abs(peer_avg)) * 100 if peer_avg != 0 else 0
+                
+                # Generate interpretation
+                interpretation = self._generate_peer_interpretation(
+                    metric, target_value, peer_avg, percentile, relative_to_avg_pct
+                )
+                
+                results[metric] = {
+                    'target_ticker': ticker,
+                    'target_value': round(target_value, 4),
+                    'peer_count': len(peer_vals),
+                    'peer_average': round(peer_avg, 4),
+                    'peer_median': round(float(np.median(peer_vals)), 4),
+                    'peer_std': round(float(np.std(peer_vals)), 4),
+                    'peer_min': round(float(np.min(peer_vals)), 4),
+                    'peer_max': round(float(np.max(peer_vals)), 4),
+                    'best_peer': best_peer,
+                    'worst_peer': worst_peer,
+                    'best_peer_value': round(float(peer_series[best_peer]), 4),
+                    'worst_peer_value': round(float(peer_series[worst_peer]), 4),
+                    'percentile_rank': round(percentile, 1),
+                    'relative_to_avg_pct': round(relative_to_avg_pct, 2),
+                    'interpretation': interpretation,
+                    'as_of': last_bar
+                }
             
-            return {
-                'target_ticker': ticker,
-                'target_value': round(target_value, 4),
-                'peer_count': len(peer_values),
-                'peer_average': round(peer_avg, 4),
-                'peer_median': round(peer_median, 4),
-                'peer_std': round(peer_std, 4),
-                'peer_min': round(peer_min, 4),
-                'peer_max': round(peer_max, 4),
-                'best_peer': best_peer,
-                'worst_peer': worst_peer,
-                'best_peer_value': round(peer_values[best_peer], 4),
-                'worst_peer_value': round(peer_values[worst_peer], 4),
-                'percentile_rank': round(percentile, 1),
-                'relative_to_avg_pct': round(relative_to_avg_pct, 2),
-                'interpretation': interpretation
-            }
+            return results
         
         except Exception as e:
             logging.error(f"Error in peer comparison: {e}", exc_info=True)
@@ -1364,63 +1408,6 @@ class RiskAnalyzer:
                 'error': f"Error comparing to peers: {str(e)}"
             }
     
-    def _calculate_single_metric(self, price_data, metric, ticker):
-        """Helper function to calculate a single risk metric for peer comparison"""
-        import yfinance as yf
-        import logging
-        
-        try:
-            if 'Close' not in price_data.columns:
-                return None
-            
-            returns = price_data['Close'].pct_change().dropna()
-            
-            if len(returns) < 30:  # Need minimum data
-                return None
-            
-            if metric == 'volatility':
-                # Annualized volatility
-                vol = returns.std() * np.sqrt(252) * 100  # As percentage
-                # Ensure scalar result
-                if isinstance(vol, pd.Series):
-                    vol = vol.iloc[0] if len(vol) > 0 else None
-                return float(vol) if vol is not None else None
-            
-            elif metric == 'sharpe':
-                # Sharpe ratio
-                sharpe = self.calculate_sharpe_ratio(returns)
-                # Ensure scalar result
-                if isinstance(sharpe, pd.Series):
-                    sharpe = sharpe.iloc[0] if len(sharpe) > 0 else None
-                return float(sharpe) if sharpe is not None and not np.isnan(sharpe) else None
-            
-            elif metric == 'beta':
-                # Beta (need market data)
-                spy_data = yf.download('SPY', start=price_data.index[0], end=price_data.index[-1], progress=False)
-                if spy_data.empty:
-                    return None
-                market_returns = spy_data['Close'].pct_change().dropna()
-                beta = self.calculate_beta(returns, market_returns)
-                # Ensure scalar result
-                if isinstance(beta, pd.Series):
-                    beta = beta.iloc[0] if len(beta) > 0 else None
-                return float(beta) if beta is not None and not np.isnan(beta) else None
-            
-            elif metric == 'max_drawdown':
-                # Maximum drawdown (as positive percentage for easier comparison)
-                drawdown = self.calculate_max_drawdown(price_data['Close'])
-                # Ensure scalar result
-                if isinstance(drawdown, pd.Series):
-                    drawdown = drawdown.iloc[0] if len(drawdown) > 0 else None
-                return abs(float(drawdown)) * 100 if drawdown is not None else None  # Return as positive percentage
-            
-            else:
-                return None
-        
-        except Exception as e:
-            logging.warning(f"Error calculating {metric} for {ticker}: {e}")
-            return None
-    
     def _generate_peer_interpretation(self, metric, target_value, peer_avg, percentile, rel_diff_pct):
         """Generate human-readable interpretation of peer comparison"""
         
@@ -1462,6 +1449,7 @@ class RiskAnalyzer:
         metric_display = {
             'volatility': 'Volatility',
             'sharpe': 'Sharpe Ratio',
+            'sortino': 'Sortino Ratio',
             'beta': 'Beta',
             'max_drawdown': 'Maximum Drawdown'
         }.get(metric, metric)
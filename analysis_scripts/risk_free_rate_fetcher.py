@@ -234,6 +234,23 @@ def fetch_current_risk_free_rate(force_refresh=False):
     return _global_fetcher.get_rate(force_refresh=force_refresh)
 
 
+def prime_risk_free_rate(rate):
+    """
+    Seed the cached rate with an ^IRX value fetched elsewhere (e.g. the shared
+    market context download) so the next lookup does not hit the API again
+    
+    Args:
+        rate (float): 13-week T-bill rate as decimal
+    """
+    global _global_fetcher
+    
+    if _global_fetcher is None:
+        _global_fetcher = RiskFreeRateFetcher()
+    
+    if not _global_fetcher._is_cache_valid() or _global_fetcher.cached_rate == _global_fetcher.fallback_rate:
+        _global_fetcher.cached_rate = rate
+        _global_fetcher.last_fetch_time = datetime.now()
+
 def get_risk_free_rate_info():
     """
     Get detailed information about current risk-free rate
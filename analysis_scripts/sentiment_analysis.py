@@ -146,10 +146,27 @@ Last Updated: January 2026
 
 import pandas as pd
 import numpy as np
-from textblob import TextBlob
-import yfinance as yf
 from datetime import datetime, timedelta
 
+try:
+    from analysis_scripts.sentiment_service import get_sentiment_service
+except ImportError:
+    from sentiment_service import get_sentiment_service
+
+
+def headline_text(headline):
+    """Title / summary text of a news item (yfinance nested or flat structure)"""
+    if not isinstance(headline, dict):
+        return ""
+    # Try different possible structures
+    if 'content' in headline and isinstance(headline['content'], dict):
+        # yfinance structure: headline['content']['title'] or ['summary']
+        content_dict = headline['content']
+        return content_dict.get('title', '') or content_dict.get('summary', '') or content_dict.get('description', '')
+    # Direct structure: headline['title'] or ['content']
+    return headline.get('title', '') or headline.get('content', '') or headline.get('headline', '')
+
+
 class SentimentAnalyzer:
     """Advanced sentiment analysis for market sentiment tracking"""
     
@@ -166,23 +183,8 @@ class SentimentAnalyzer:
         if not news_headlines:
             return {'score': 0, 'classification': 'neutral', 'confidence': 0}
         
-        sentiments = []
-        for headline in news_headlines:
-            # Handle nested news data structure from yfinance
-            text_content = ""
-            if isinstance(headline, dict):
-                # Try different possible structures
-                if 'content' in headline and isinstance(headline['content'], dict):
-                    # yfinance structure: headline['content']['title'] or ['summary']
-                    content_dict = headline['content']
-                    text_content = content_dict.get('title', '') or content_dict.get('summary', '') or content_dict.get('description', '')
-                else:
-                    # Direct structure: headline['title'] or ['content']
-                    text_content = headline.get('title', '') or headline.get('content', '') or headline.get('headline', '')
-            
-            if text_content and isinstance(text_content, str):
-                blob = TextBlob(text_content)
-                sentiments.append(blob.sentiment.polarity)
+        # Scored in one batch; headlines seen before (any ticker, any run) come from the cache
+        sentiments = get_sentiment_service().polarity([headline_text(headline) for headline in news_headlines])
         
         if not sentiments:
             return {'score': 0, 'classification': 'neutral', 'confidence': 0, 'sample_size': 0}
@@ -230,23 +232,15 @@ class SentimentAnalyzer:
     def analyze_options_sentiment(self, ticker):
         """Analyze options flow for sentiment (simplified version)"""
         try:
-            stock = yf.Ticker(ticker)
-            options_dates = stock.options
-            
-            if not options_dates:
-                return {'score': 0, 'classification': 'neutral', 'confidence': 0}
-            
-            # Get nearest expiration options
-            opt_chain = stock.option_chain(options_dates[0])
-            calls = opt_chain.calls
-            puts = opt_chain.puts
+            # Nearest-expiry put/call volumes, shared per (ticker, expiry, trading day)
+            summary = get_sentiment_service().options_summary(ticker)
             
-            if calls.empty or puts.empty:
+            if not summary.get('expiry') or not summary.get('has_chain'):
                 return {'score': 0, 'classification': 'neutral', 'confidence': 0}
             
             # Calculate put/call ratio
-            total_call_volume = calls['volume'].sum()
-            total_put_volume = puts['volume'].sum()
+            total_call_volume = summary['call_volume']
+            total_put_volume = summary['put_volume']
             
             if total_call_volume + total_put_volume == 0:
                 return {'score': 0, 'classification': 'neutral', 'confidence': 0}
@@ -0,0 +1,366 @@
+"""
+Sentiment Scoring Service
+=========================
+
+Cached, batched scoring behind SentimentAnalyzer's news and options
+sentiment, shared by every report in the process (and, through SQLite, by
+every worker on the host and across restarts).
+
+- **Text scores**: TextBlob polarity / subjectivity keyed by a hash of the
+  whitespace-normalized text (and the TextBlob version). ``score_texts``
+  dedupes a batch, answers what it can from the in-process LRU, looks the
+  rest up in one SQLite query per chunk, scores only the remaining texts
+  and stores them with a single ``executemany``. Headlines repeat across
+  tickers, profiles and re-runs, so a publishing run scores each distinct
+  headline once.
+- **Options summaries**: put / call volume of the nearest expiry keyed by
+  (ticker, expiry, trading date), served for ``SENTIMENT_OPTIONS_TTL``
+  seconds before the chain is fetched again. Tickers without listed
+  options are cached as well.
+
+Hit / miss counters and hit rates are exposed through ``stats()``.
+
+Configuration:
+--------------
+- ``SENTIMENT_CACHE_DB_PATH``: SQLite file (default generated_data/sentiment_cache/sentiment.sqlite3)
+- ``SENTIMENT_OPTIONS_TTL``: seconds an options summary is reused (default 900)
+
+Usage:
+------
+```python
+from sentiment_service import get_sentiment_service
+
+service = get_sentiment_service()
+scores = service.score_texts(headlines)        # [(polarity, subjectivity), ...]
+summary = service.options_summary('AAPL')      # {'expiry', 'call_volume', 'put_volume', ...}
+```
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'sentiment_cache', 'sentiment.sqlite3'
+)
+DEFAULT_OPTIONS_TTL = float(os.getenv('SENTIMENT_OPTIONS_TTL', str(15 * 60)))
+OPTIONS_MAX_AGE_DAYS = 7
+L1_MAX_ENTRIES = 50000
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+_whitespace = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """Text as it is keyed in the cache (surrounding / repeated whitespace removed)"""
+    return _whitespace.sub(' ', text).strip()
+
+
+def _scorer_version():
+    try:
+        import textblob
+        return f"textblob-{getattr(textblob, '__version__', 'unknown')}"
+    except ImportError:
+        return 'textblob-unavailable'
+
+
+def text_key(normalized, version):
+    return hashlib.sha1(f"{version}\x00{normalized}".encode('utf-8')).hexdigest()
+
+
+def _trading_day():
+    return pd.Timestamp.now(tz='America/New_York').date().isoformat()
+
+
+class SentimentService:
+    """Per-text sentiment cache and options summary cache in front of TextBlob / yfinance"""
+
+    def __init__(self, db_path=None, options_ttl=DEFAULT_OPTIONS_TTL, max_entries=L1_MAX_ENTRIES):
+        """
+        Args:
+            db_path: SQLite file for the persistent tier (``SENTIMENT_CACHE_DB_PATH`` env overrides the default)
+            options_ttl: Seconds an options summary is reused
+            max_entries: Text scores held in the in-process LRU
+        """
+        self.db_path = os.path.abspath(db_path or os.environ.get('SENTIMENT_CACHE_DB_PATH') or DEFAULT_CACHE_DB_PATH)
+        self.options_ttl = options_ttl
+        self.max_entries = max_entries
+        self.version = _scorer_version()
+        self._scores = OrderedDict()   # text key -> (polarity, subjectivity)
+        self._options = {}             # (ticker, trading day) -> (summary, stored_at)
+        self._lock = threading.RLock()
+        self._stats = {
+            'texts_requested': 0,
+            'text_l1_hits': 0,
+            'text_l2_hits': 0,
+            'texts_scored': 0,
+            'batches': 0,
+            'options_requested': 0,
+            'options_hits': 0,
+            'options_fetches': 0,
+            'options_errors': 0,
+            'l2_errors': 0,
+        }
+        self._l2_available = self._init_db()
+
+    # ------------------------------------------------------------------
+    # Persistent tier
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS text_scores ('
+                    'text_key TEXT PRIMARY KEY, polarity REAL NOT NULL, subjectivity REAL NOT NULL, scored_at REAL NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS options_summaries ('
+                    'ticker TEXT NOT NULL, expiry TEXT NOT NULL, trading_day TEXT NOT NULL, '
+                    'payload TEXT NOT NULL, stored_at REAL NOT NULL, PRIMARY KEY (ticker, expiry, trading_day))'
+                )
+                conn.execute('DELETE FROM options_summaries WHERE stored_at < ?',
+                             (time.time() - OPTIONS_MAX_AGE_DAYS * 24 * 60 * 60,))
+            return True
+        except Exception as e:
+            logger.warning(f"Sentiment cache unavailable at {self.db_path}, using in-process cache only: {e}")
+            return False
+
+    def _l2_scores(self, keys):
+        if not self._l2_available or not keys:
+            return {}
+        found = {}
+        try:
+            with self._connect() as conn:
+                for i in range(0, len(keys), _LOOKUP_CHUNK):
+                    chunk = keys[i:i + _LOOKUP_CHUNK]
+                    rows = conn.execute(
+                        f"SELECT text_key, polarity, subjectivity FROM text_scores "
+                        f"WHERE text_key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    found.update((key, (polarity, subjectivity)) for key, polarity, subjectivity in rows)
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Sentiment cache lookup failed: {e}")
+        return found
+
+    def _l2_store_scores(self, scored):
+        if not self._l2_available or not scored:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO text_scores (text_key, polarity, subjectivity, scored_at) VALUES (?, ?, ?, ?)',
+                    [(key, polarity, subjectivity, now) for key, (polarity, subjectivity) in scored.items()]
+                )
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Sentiment cache write failed: {e}")
+
+    def _l1_put(self, key, value):
+        self._scores[key] = value
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Text scores
+    # ------------------------------------------------------------------
+    def score_texts(self, texts):
+        """
+        Polarity / subjectivity for each text, scoring only texts not seen before.
+
+        Returns a list aligned with ``texts``; entries for empty or non-string
+        texts are None.
+        """
+        normalized = [normalize_text(t) if isinstance(t, str) else '' for t in texts]
+        keys = [text_key(n, self.version) if n else None for n in normalized]
+
+        results = {}
+        with self._lock:
+            self._stats['texts_requested'] += len({k for k in keys if k})
+            self._stats['batches'] += 1
+            for key in keys:
+                if key and key not in results and key in self._scores:
+                    self._scores.move_to_end(key)
+                    results[key] = self._scores[key]
+                    self._stats['text_l1_hits'] += 1
+
+        pending = list(dict.fromkeys(k for k in keys if k and k not in results))
+        if pending:
+            stored = self._l2_scores(pending)
+            with self._lock:
+                self._stats['text_l2_hits'] += len(stored)
+                for key, value in stored.items():
+                    self._l1_put(key, value)
+            results.update(stored)
+
+        to_score = {}
+        for key, text in zip(keys, normalized):
+            if key and key not in results and key not in to_score:
+                to_score[key] = text
+        if to_score:
+            from textblob import TextBlob
+            scored = {}
+            for key, text in to_score.items():
+                sentiment = TextBlob(text).sentiment
+                scored[key] = (float(sentiment.polarity), float(sentiment.subjectivity))
+            self._l2_store_scores(scored)
+            with self._lock:
+                self._stats['texts_scored'] += len(scored)
+                for key, value in scored.items():
+                    self._l1_put(key, value)
+            results.update(scored)
+
+        return [results.get(key) if key else None for key in keys]
+
+    def polarity(self, texts):
+        """Polarity of every non-empty text (the list analyze_news_sentiment averages)"""
+        return [score[0] for score in self.score_texts(texts) if score is not None]
+
+    # ------------------------------------------------------------------
+    # Options summaries
+    # ------------------------------------------------------------------
+    def _l2_options(self, ticker, day, fresh_after):
+        if not self._l2_available:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT payload, stored_at FROM options_summaries WHERE ticker = ? AND trading_day = ? AND stored_at >= ? '
+                    'ORDER BY stored_at DESC LIMIT 1', (ticker, day, fresh_after)
+                ).fetchone()
+            if row:
+                return json.loads(row[0]), row[1]
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Options summary lookup failed for {ticker}: {e}")
+        return None
+
+    def _l2_store_options(self, ticker, day, summary, stored_at):
+        if not self._l2_available:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO options_summaries (ticker, expiry, trading_day, payload, stored_at) VALUES (?, ?, ?, ?, ?)',
+                    (ticker, summary.get('expiry') or '', day, json.dumps(summary), stored_at)
+                )
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Options summary write failed for {ticker}: {e}")
+
+    @staticmethod
+    def _fetch_options_summary(ticker):
+        import yfinance as yf
+        stock = yf.Ticker(ticker)
+        options_dates = stock.options
+        if not options_dates:
+            return {'expiry': None, 'call_volume': 0.0, 'put_volume': 0.0, 'has_chain': False}
+        # Nearest expiration
+        opt_chain = stock.option_chain(options_dates[0])
+        calls, puts = opt_chain.calls, opt_chain.puts
+        return {
+            'expiry': options_dates[0],
+            'call_volume': float(calls['volume'].sum()) if not calls.empty else 0.0,
+            'put_volume': float(puts['volume'].sum()) if not puts.empty else 0.0,
+            'has_chain': not (calls.empty or puts.empty),
+        }
+
+    def options_summary(self, ticker):
+        """
+        Put / call volume of the nearest expiry for today's trading day.
+
+        Returns ``{'expiry', 'call_volume', 'put_volume', 'has_chain'}`` (expiry
+        None when the ticker lists no options). Fetch errors propagate and are
+        not cached.
+        """
+        ticker = ticker.upper()
+        day = _trading_day()
+        now = time.time()
+        with self._lock:
+            self._stats['options_requested'] += 1
+            cached = self._options.get((ticker, day))
+            if cached is not None and now - cached[1] < self.options_ttl:
+                self._stats['options_hits'] += 1
+                return dict(cached[0])
+
+        stored = self._l2_options(ticker, day, now - self.options_ttl)
+        if stored is not None:
+            with self._lock:
+                self._stats['options_hits'] += 1
+                self._options[(ticker, day)] = stored
+            return dict(stored[0])
+
+        try:
+            summary = self._fetch_options_summary(ticker)
+        except Exception:
+            with self._lock:
+                self._stats['options_errors'] += 1
+            raise
+        self._l2_store_options(ticker, day, summary, now)
+        with self._lock:
+            self._stats['options_fetches'] += 1
+            # Entries from previous trading days are never read again
+            self._options = {key: value for key, value in self._options.items() if key[1] == day}
+            self._options[(ticker, day)] = (summary, now)
+        return dict(summary)
+
+    # ------------------------------------------------------------------
+    # Monitoring
+    # ------------------------------------------------------------------
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['l1_entries'] = len(self._scores)
+        requested = stats['texts_requested']
+        text_hits = stats['text_l1_hits'] + stats['text_l2_hits']
+        stats['text_hit_rate'] = round(text_hits / requested, 3) if requested else None
+        stats['options_hit_rate'] = (round(stats['options_hits'] / stats['options_requested'], 3)
+                                     if stats['options_requested'] else None)
+        stats['persistent'] = self._l2_available
+        stats['scorer'] = self.version
+        return stats
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_sentiment_service():
+    """Process-wide sentiment service"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SentimentService()
+        return _service
+
+
+def set_sentiment_service(service):
+    """Override the process-wide sentiment service (e.g. with a temporary database in tests)"""
+    global _service
+    with _service_lock:
+        _service = service
@@ -452,8 +452,8 @@ def calculate_detailed_ta(df):
     for period in [20, 50, 100, 200]:
         sma_col = f'SMA_{period}'
         if len(df) >= period:
-            df[sma_col] = calculate_sma(df['Close'], period);
-            sma_val = df[sma_col].iloc[-1] # Get latest SMA
+            # Only the latest value is reported: the last `period` closes determine it
+            sma_val = calculate_sma(df['Close'].iloc[-period:], period).iloc[-1] # Get latest SMA
             ta_summary[sma_col] = sma_val if not pd.isna(sma_val) else None
         else: ta_summary[sma_col] = None
 
@@ -461,8 +461,7 @@ def calculate_detailed_ta(df):
     if 'Volume' in df.columns:
         latest_volume = df['Volume'].iloc[-1] if not df.empty else None
         if len(df) >= 20:
-             df['Volume_SMA20'] = calculate_volume_sma(df, 20);
-             latest_vol_sma = df['Volume_SMA20'].iloc[-1]
+             latest_vol_sma = calculate_volume_sma(df.iloc[-20:], 20).iloc[-1]
              ta_summary['Volume_SMA20'] = latest_vol_sma if not pd.isna(latest_vol_sma) else None
              if not pd.isna(latest_volume) and not pd.isna(latest_vol_sma) and latest_vol_sma > 0:
                  ta_summary['Volume_vs_SMA20_Ratio'] = latest_volume / latest_vol_sma
@@ -497,8 +496,8 @@ def calculate_detailed_ta(df):
 
     # RSI
     if len(df) >= 15:
-         df['RSI_14'] = calculate_rsi(df['Close'], 14)
-         rsi_val = df['RSI_14'].iloc[-1]
+         # Simple-average RSI: the latest value depends on the last 15 closes only
+         rsi_val = calculate_rsi(df['Close'].iloc[-15:], 14).iloc[-1]
          ta_summary['RSI_14'] = rsi_val if not pd.isna(rsi_val) else None
     else:
          ta_summary['RSI_14'] = None
@@ -99,6 +99,16 @@ def log_failed_analysis_attempt(user_uid, ticker, error_message):
         doc_ref = failed_analyses_collection.add(log_data)
         
         logger.info(f"Failed analysis logged for ticker {ticker}. Document ID: {doc_ref[1].id}")
+        
+        # Fold the failure into the pre-aggregated analytics rollups
+        try:
+            from app.services.analytics_rollup_service import get_rollup_service
+            rollup_service = get_rollup_service()
+            if rollup_service:
+                rollup_service.record_failed_analysis(user_uid, ticker, now.astimezone())
+        except Exception as rollup_e:
+            logger.warning(f"Failed to update analytics rollups for failed analysis: {rollup_e}")
+        
         return True
         
     except Exception as e:
@@ -830,6 +830,24 @@ def api_fetch_items():
         }), 500
 
 
+def _job_portal_progress_publisher(socketio):
+    """JobAutomationProcessor.on_progress callback that streams run progress to job_portal_run_<run_id>"""
+    from automation_scripts.progress_bus import get_progress_bus
+    bus = get_progress_bus(socketio)
+
+    def publish(run_id, status, processed, total, message):
+        bus.publish('job_portal_progress', {
+            'run_id': run_id,
+            'status': status,
+            'progress': round(processed / total * 100, 1) if total else 0,
+            'processed': processed,
+            'total': total,
+            'message': message
+        }, room=f"job_portal_run_{run_id}", key=run_id, terminal=status in ('completed', 'failed', 'cancelled'))
+
+    return publish
+
+
 @jobs_automation_bp.route('/api/start-automation', methods=['POST'])
 @login_required
 def api_start_automation():
@@ -916,6 +934,9 @@ def api_start_automation():
             
             state_manager = JobPublishingStateManager()
             processor = JobAutomationProcessor(manager, state_manager)
+            socketio = current_app.extensions.get('socketio')
+            if socketio is not None:
+                processor.on_progress = _job_portal_progress_publisher(socketio)
             processor.start_run(run_id, blocking=False)
             
             return jsonify({
@@ -169,7 +169,8 @@ def get_automation_shared_context(user_uid, profiles_list, ticker_status_limit=5
     Returns:
         Dictionary with shared context data
     """
-    from datetime import datetime, timezone, timedelta
+    from datetime import datetime, timezone
+    from app.services.publishing_stats_service import get_publishing_stats_service
     
     context = {}
     try:
@@ -190,90 +191,21 @@ def get_automation_shared_context(user_uid, profiles_list, ticker_status_limit=5
         
         db = get_firestore_client()
         
-        # Calculate publishing stats from userPublishedArticles collection
-        total_articles_count = 0  # Changed name to reflect that it includes all statuses
+        # Publishing stats come from the user's pre-aggregated stats document
+        # (see app/services/publishing_stats_service.py) instead of the raw collection
+        total_articles_count = 0  # All statuses (published + draft + scheduled + pending)
         this_week_count = 0
         pending_count = 0
         recent_activity = []
         
-        if db:
+        stats_service = get_publishing_stats_service()
+        if stats_service:
             try:
-                # Get ALL articles for this user (removed limit to get accurate count)
-                # This includes published, draft, scheduled, and pending articles
-                articles_query = db.collection('userPublishedArticles')\
-                    .where(filter=firestore.FieldFilter('user_uid', '==', user_uid))
-                
-                articles = list(articles_query.stream())
-                total_articles_count = len(articles)  # This now includes ALL articles (published + draft + scheduled + pending)
-                
-                # Calculate this week's count
-                now = datetime.now(timezone.utc)
-                week_start = now - timedelta(days=now.weekday())
-                week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-                
-                # Sort articles by published_at in Python (to avoid Firestore index requirement)
-                articles_with_dates = []
-                for article_doc in articles:
-                    article_data = article_doc.to_dict()
-                    published_at_str = article_data.get('published_at')
-                    published_at = None
-                    
-                    if published_at_str:
-                        try:
-                            if isinstance(published_at_str, str):
-                                published_at = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                            elif hasattr(published_at_str, 'isoformat'):
-                                published_at = published_at_str
-                                # Ensure timezone awareness
-                                if published_at.tzinfo is None:
-                                    published_at = published_at.replace(tzinfo=timezone.utc)
-                        except Exception:
-                            pass
-                    
-                    # Ensure all dates are timezone-aware for proper comparison
-                    if published_at is None:
-                        published_at = datetime.min.replace(tzinfo=timezone.utc)
-                    elif published_at.tzinfo is None:
-                        published_at = published_at.replace(tzinfo=timezone.utc)
-                    
-                    articles_with_dates.append((published_at, article_data, article_doc))
-                
-                # Sort by published_at descending
-                articles_with_dates.sort(key=lambda x: x[0], reverse=True)
-                
-                # Count this week from published articles only and get recent activity (last 10)
-                for published_at, article_data, article_doc in articles_with_dates:
-                    # Check if published this week (only count published articles for weekly stats)
-                    if published_at >= week_start and article_data.get('status') == 'published':
-                        this_week_count += 1
-                    
-                    # Build recent activity item (only for first 10)
-                    if len(recent_activity) < 10:
-                        published_at_str = article_data.get('published_at', '')
-                        if isinstance(published_at_str, str):
-                            time_display = published_at_str
-                        elif hasattr(published_at_str, 'isoformat'):
-                            time_display = published_at_str.isoformat()
-                        else:
-                            time_display = 'Recently'
-                        
-                        activity_item = {
-                            'title': article_data.get('title', 'Article'),
-                            'site': article_data.get('site', article_data.get('profile_name', 'Site')),
-                            'status': article_data.get('status', 'draft'),
-                            'time': time_display,
-                            'type': article_data.get('article_type', 'stock')
-                        }
-                        recent_activity.append(activity_item)
-                
-                # Count pending + scheduled + draft articles for "Pending/Drafts" stat
-                # Instead of separate queries, count from the articles we already fetched
-                pending_count = 0
-                for published_at, article_data, article_doc in articles_with_dates:
-                    status = article_data.get('status', 'draft')
-                    if status in ['pending', 'scheduled', 'draft']:
-                        pending_count += 1
-                
+                summary = stats_service.get_summary(user_uid)
+                total_articles_count = summary['total_published_count']
+                this_week_count = summary['this_week_count']
+                pending_count = summary['pending_count']
+                recent_activity = summary['recent_activity']
             except Exception as e:
                 current_app.logger.error(f"Error fetching publishing stats for user {user_uid}: {e}", exc_info=True)
         
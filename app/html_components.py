@@ -6,6 +6,8 @@ import random # Used for random selection in risk factors
 import logging # Import logging for better error tracking
 import json
 import os
+import contextvars
+from contextlib import contextmanager
 
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(funcName)s - %(message)s')
 
@@ -850,8 +852,30 @@ def generate_metrics_summary_html(ticker, rdata):
     except Exception as e:
         return f"<div style='color: red; padding: 1rem; border: 1px solid red; border-radius: 4px;'>Error generating metrics summary: {str(e)}</div>"
         
+# Replacement metrics-table renderer for the current thread / context (see metrics_section_renderer)
+_metrics_section_renderer = contextvars.ContextVar('metrics_section_renderer', default=None)
+
+@contextmanager
+def metrics_section_renderer(renderer):
+    """
+    Render metrics tables with ``renderer(metrics, ticker)`` inside this block.
+
+    Scoped to the calling thread's context, so sections rendered concurrently
+    (or other reports) keep their own renderer.
+    """
+    token = _metrics_section_renderer.set(renderer)
+    try:
+        yield
+    finally:
+        _metrics_section_renderer.reset(token)
+
 def generate_metrics_section_content(metrics, ticker=None):
     """Helper to generate table body content for metrics sections (Robust NA handling)."""
+    renderer = _metrics_section_renderer.get()
+    if renderer is not None:
+        # The renderer may fall back to this function; it then gets the default table
+        with metrics_section_renderer(None):
+            return renderer(metrics, ticker)
     rows = ""
     try:
         if isinstance(metrics, dict):
@@ -84,7 +84,7 @@ FIREBASE_SERVICE_ACCOUNT_PATH = os.path.join(PROJECT_ROOT, 'config', 'firebase-s
 if os.path.exists(FIREBASE_SERVICE_ACCOUNT_PATH):
     os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = FIREBASE_SERVICE_ACCOUNT_PATH
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory, Response
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_from_directory, Response, make_response
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import json
 import time
@@ -105,6 +105,9 @@ from firebase_admin import firestore, auth as firebase_auth
 from config.firebase_admin_setup import get_firestore_client
 from config.quota_plans import QUOTA_PLANS
 from app.market_news import market_news_bp
+from app.report_cache import ReportContentCache
+from automation_scripts.tracing import traced, span, get_span_store
+from automation_scripts.progress_bus import get_progress_bus
 
 # Import cache utilities for performance optimization
 try:
@@ -400,6 +403,9 @@ UPLOAD_FOLDER = os.path.join(APP_ROOT, '..', 'generated_data', 'temp_uploads')
 STOCK_REPORTS_SUBDIR = 'stock_reports'
 STOCK_REPORTS_PATH = os.path.join(APP_ROOT, '..', 'generated_data', 'stock_reports')
 
+# Hot reports in memory, Storage-backed reports also on local disk (generated_data/report_cache)
+report_content_cache = ReportContentCache()
+
 app = Flask(__name__,
             static_folder=STATIC_FOLDER_PATH,
             template_folder=TEMPLATE_FOLDER_PATH)
@@ -639,6 +645,9 @@ else:
                             async_mode='threading'  # Use threading instead of eventlet for development
                            )
 
+# Progress events from worker threads go through one throttled dispatcher
+progress_bus = get_progress_bus(socketio)
+
 # --- TEMPLATE CONTEXT PROCESSOR ---
 @app.context_processor
 def inject_firebase_config():
@@ -1016,8 +1025,9 @@ app.logger.info("Stock Analysis blueprint registered early (dependencies will be
 
 @monitor_query_performance('get_admin_analytics')
 def get_admin_analytics():
-    """Get comprehensive analytics for admin dashboard (optimized with parallel queries)"""
+    """Get comprehensive analytics for admin dashboard (reads pre-aggregated rollups)"""
     from concurrent.futures import ThreadPoolExecutor, as_completed
+    from app.services.analytics_rollup_service import get_rollup_service
     
     analytics = {
         'today': {},
@@ -1035,66 +1045,44 @@ def get_admin_analytics():
             return analytics
         
         today = datetime.now(timezone.utc).date()
-        today_start = datetime.combine(today, datetime.min.time(), timezone.utc)
-        today_end = datetime.combine(today, datetime.max.time(), timezone.utc)
+        rollup_service = get_rollup_service()
         
         # Define parallel query functions
         def fetch_today_stats():
-            """Fetch today's statistics"""
+            """Fetch today's statistics from the daily rollup"""
             try:
-                reports_today_query = db.collection('userGeneratedReports')\
-                    .where('generated_at', '>=', today_start)\
-                    .where('generated_at', '<=', today_end)
-                
-                reports_today = list(reports_today_query.stream())
-                
-                unique_users_today = set()
-                storage_types_today = {}
-                
-                for report in reports_today:
-                    report_data = report.to_dict()
-                    unique_users_today.add(report_data.get('user_uid'))
-                    storage_type = report_data.get('storage_type', 'unknown')
-                    storage_types_today[storage_type] = storage_types_today.get(storage_type, 0) + 1
-                
+                if not rollup_service:
+                    return {}
+                today_rollup = rollup_service.get_day(today)
                 return {
-                    'reports_generated': len(reports_today),
-                    'active_users': len(unique_users_today),
-                    'storage_breakdown': storage_types_today
+                    'reports_generated': today_rollup.get('reports_generated', 0),
+                    'active_users': len(today_rollup.get('users', {})),
+                    'storage_breakdown': today_rollup.get('storage_breakdown', {}),
+                    'failed_analyses': today_rollup.get('failed_analyses', 0),
+                    'articles_published': today_rollup.get('articles_published', 0)
                 }
             except Exception as e:
                 app.logger.error(f"Error fetching today's stats: {e}")
                 return {}
         
         def fetch_report_stats():
-            """Fetch overall report statistics"""
+            """Fetch overall report statistics from the totals rollup"""
             try:
-                # Use counter document for total reports
-                try:
-                    counter_doc = db.collection('_counters').document('userGeneratedReports').get()
-                    total_reports = counter_doc.to_dict().get('total_count', 0) if counter_doc.exists else 0
-                except:
-                    total_reports = 0
-                
-                # Sample reports for breakdown analysis
-                all_reports_query = db.collection('userGeneratedReports').limit(1000)
-                all_reports = list(all_reports_query.stream())
+                # Per-user report counts are already maintained on the counter document
+                counter_doc = db.collection('_counters').document('userGeneratedReports').get()
+                counter_data = (counter_doc.to_dict() or {}) if counter_doc.exists else {}
+                user_report_counts = {
+                    key[len('user_'):]: value for key, value in counter_data.items()
+                    if key.startswith('user_') and isinstance(value, int)
+                }
                 
-                storage_breakdown = {}
-                user_report_counts = {}
-                
-                for report in all_reports:
-                    report_data = report.to_dict()
-                    storage_type = report_data.get('storage_type', 'unknown')
-                    user_uid = report_data.get('user_uid', 'unknown')
-                    
-                    storage_breakdown[storage_type] = storage_breakdown.get(storage_type, 0) + 1
-                    user_report_counts[user_uid] = user_report_counts.get(user_uid, 0) + 1
+                totals = rollup_service.get_totals() if rollup_service else {}
                 
                 return {
-                    'total_reports': total_reports,
-                    'storage_breakdown': storage_breakdown,
-                    'top_users': sorted(user_report_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                    'total_reports': counter_data.get('total_count', totals.get('reports_generated', 0)),
+                    'storage_breakdown': totals.get('storage_breakdown', {}),
+                    'top_users': sorted(user_report_counts.items(), key=lambda x: x[1], reverse=True)[:10],
+                    'top_tickers': rollup_service.get_top_tickers(limit=10) if rollup_service else []
                 }
             except Exception as e:
                 app.logger.error(f"Error fetching report stats: {e}")
@@ -1369,6 +1357,31 @@ def delete_user_site_profile_from_firestore(user_uid, profile_id_to_delete): # M
         app.logger.error(f"Error deleting site profile {profile_id_to_delete} for user {user_uid}: {e}", exc_info=True)
         return False
 
+def record_published_article_rollup(published_article_data):
+    """Fold an article saved to userPublishedArticles into the analytics rollups"""
+    try:
+        from app.services.analytics_rollup_service import get_rollup_service
+        rollup_service = get_rollup_service()
+        if rollup_service:
+            rollup_service.record_article_published(
+                published_article_data.get('user_uid'),
+                published_article_data.get('ticker'),
+                published_article_data.get('article_type'),
+                published_article_data.get('published_at'),
+            )
+    except Exception as rollup_e:
+        app.logger.warning(f"Failed to update analytics rollups for published article: {rollup_e}")
+
+def record_published_article_stats(published_article_data):
+    """Fold an article saved to userPublishedArticles into its user's publishing stats"""
+    try:
+        from app.services.publishing_stats_service import get_publishing_stats_service
+        stats_service = get_publishing_stats_service()
+        if stats_service:
+            stats_service.record_article(published_article_data)
+    except Exception as stats_e:
+        app.logger.warning(f"Failed to update publishing stats for published article: {stats_e}")
+
 # --- NEW HELPER FUNCTIONS FOR PERSISTED TICKER STATUS ---
 # --- NEW HELPER FUNCTIONS FOR PERSISTED TICKER STATUS ---
 def save_processed_ticker_status(user_uid, profile_id, ticker_symbol, status_data):
@@ -1453,6 +1466,8 @@ def save_processed_ticker_status(user_uid, profile_id, ticker_symbol, status_dat
                 
                 # Save to userPublishedArticles collection
                 db.collection('userPublishedArticles').add(published_article_data)
+                record_published_article_rollup(published_article_data)
+                record_published_article_stats(published_article_data)
                 print(f"[STOCK_HISTORY] Saved published stock article '{ticker_symbol}' to Firestore for user {user_uid}")
             except Exception as history_error:
                 print(f"[STOCK_HISTORY] Error saving published article to history: {history_error}")
@@ -1468,7 +1483,7 @@ def save_processed_ticker_status(user_uid, profile_id, ticker_symbol, status_dat
                 if key_emit == 'last_updated_at' and not isinstance(value_emit, str):
                     emit_data[key_emit] = datetime.now(timezone.utc).isoformat()
 
-            socketio.emit('ticker_status_persisted', {
+            progress_bus.emit('ticker_status_persisted', {
                 'profile_id': profile_id,
                 **emit_data
             }, room=user_uid)
@@ -1890,6 +1905,55 @@ def admin_users_api():
         app.logger.error(f"Error in admin users API: {e}", exc_info=True)
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@app.route('/api/admin/pipeline-traces')
+@admin_required
+def admin_pipeline_traces():
+    """Per-stage duration percentiles and the slowest recent pipeline runs"""
+    try:
+        since_hours = min(request.args.get('hours', 24, type=int), 24 * 7)
+        limit = min(request.args.get('limit', 10, type=int), 100)
+        run_name = request.args.get('run') or None
+        store = get_span_store()
+        trace_id = request.args.get('trace_id')
+        if trace_id:
+            return jsonify({'status': 'success', 'trace_id': trace_id, 'spans': store.trace_spans(trace_id)})
+        return jsonify({
+            'status': 'success',
+            'since_hours': since_hours,
+            'stages': store.stage_percentiles(since_hours=since_hours, run_name=run_name),
+            'slowest_runs': store.slowest_runs(limit=limit, since_hours=since_hours, run_name=run_name),
+            'store': store.stats(),
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
+    except Exception as e:
+        app.logger.error(f"Error in admin pipeline traces: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/api/admin/progress-bus')
+@admin_required
+def admin_progress_bus():
+    """Emitted vs dropped (coalesced) progress events and dispatcher backlog"""
+    return jsonify({
+        'status': 'success',
+        'progress_bus': progress_bus.stats(),
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    })
+
+@app.route('/api/admin/sentiment-cache')
+@admin_required
+def admin_sentiment_cache():
+    """Headline score and options summary hit rates of the shared sentiment service"""
+    try:
+        from analysis_scripts.sentiment_service import get_sentiment_service
+        return jsonify({
+            'status': 'success',
+            'sentiment_cache': get_sentiment_service().stats(),
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
+    except Exception as e:
+        app.logger.error(f"Error in admin sentiment cache: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @app.route('/api/admin/system-logs')
 @admin_required
 def admin_system_logs():
@@ -2296,6 +2360,68 @@ def admin_cleanup_orphaned_reports():
         app.logger.error(f"Error in admin cleanup: {e}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
+@app.route('/admin/rebuild-analytics-rollups', methods=['POST'])
+@admin_required
+def admin_rebuild_analytics_rollups():
+    """Admin route to rebuild the analytics rollups from the raw collections"""
+    try:
+        from app.services.analytics_rollup_service import get_rollup_service
+        options = request.get_json(silent=True) or request.form
+        dry_run = str(options.get('dry_run', 'true')).lower() == 'true'
+        
+        rollup_service = get_rollup_service()
+        if not rollup_service:
+            return jsonify({'status': 'error', 'message': 'Firestore not available'}), 503
+        
+        result = rollup_service.rebuild(dry_run=dry_run)
+        
+        if dry_run:
+            message = 'Dry run completed'
+        elif result['written']:
+            message = 'Rollups rebuilt'
+        else:
+            message = 'Events kept arriving during the rebuild; rollups not replaced, try again'
+        
+        return jsonify({
+            'status': 'success' if dry_run or result['written'] else 'conflict',
+            'rebuild_result': result,
+            'message': message
+        }), 200 if dry_run or result['written'] else 409
+        
+    except Exception as e:
+        app.logger.error(f"Error rebuilding analytics rollups: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@app.route('/admin/rebuild-publishing-stats', methods=['POST'])
+@admin_required
+def admin_rebuild_publishing_stats():
+    """Admin route to reconcile per-user publishing stats with userPublishedArticles"""
+    try:
+        from app.services.publishing_stats_service import get_publishing_stats_service
+        options = request.get_json(silent=True) or request.form
+        dry_run = str(options.get('dry_run', 'true')).lower() == 'true'
+        target_user = options.get('user_uid')
+        
+        stats_service = get_publishing_stats_service()
+        if not stats_service:
+            return jsonify({'status': 'error', 'message': 'Firestore not available'}), 503
+        
+        if target_user:
+            stats = stats_service.rebuild_user(target_user, dry_run=dry_run)
+            result = {'user_uid': target_user, 'articles': stats['total'], 'by_status': stats['by_status'], 'dry_run': dry_run}
+        else:
+            result = stats_service.rebuild_all(dry_run=dry_run)
+        
+        return jsonify({
+            'status': 'success',
+            'rebuild_result': result,
+            'message': f"{'Dry run completed' if dry_run else 'Publishing stats rebuilt'}"
+        })
+        
+    except Exception as e:
+        app.logger.error(f"Error rebuilding publishing stats: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @app.route('/api/ticker-suggestions')
 def ticker_suggestions():
     """API endpoint for ticker autocomplete suggestions with both symbol and company name search"""
@@ -2371,7 +2497,7 @@ def api_dashboard_reports():
     
     try:
         display_limit = request.args.get('limit', 10, type=int)
-        cache_key = f"dashboard_reports_{user_uid}_limit_{display_limit}"
+        cache_key = f"dashboard_reports_{user_uid}_v{get_report_history_cache_version(user_uid)}_limit_{display_limit}"
 
         # Return cached payload when present
         if cache:
@@ -2693,6 +2819,7 @@ def create_notification(user_uid, title, message, notification_type='success', p
 
 @app.route('/start-analysis', methods=['POST'])
 @login_required
+@traced('start_analysis', root=True)
 def start_stock_analysis():
     ticker = request.form.get('ticker', '').strip().upper()
 
@@ -2720,7 +2847,7 @@ def start_stock_analysis():
                 app.logger.warning(f"Quota exceeded for user {user_uid}: {quota_info}")
                 error_msg = f"You've used all {quota_info.get('limit', 0)} stock analysis reports this month."
                 
-                socketio.emit('quota_exceeded', {
+                progress_bus.emit('quota_exceeded', {
                     'message': error_msg,
                     'quota_info': quota_info,
                     'upgrade_url': '/pricing'
@@ -2748,7 +2875,7 @@ def start_stock_analysis():
     if not ticker or not re.match(valid_ticker_pattern, ticker):
         session['notification_message'] = f"Invalid ticker format: '{ticker}'. Please use standard stock symbols (e.g., AAPL, MSFT, GOOGL, GC=F)."
         session['notification_type'] = "danger"
-        socketio.emit('analysis_error', {'message': f"Invalid ticker format: '{ticker}'. Please use standard stock symbols.", 'ticker': ticker}, room=room_id)
+        progress_bus.emit('analysis_error', {'message': f"Invalid ticker format: '{ticker}'. Please use standard stock symbols.", 'ticker': ticker}, room=room_id)
         return redirect(url_for('stock_analysis.analyzer'))
 
     if not PIPELINE_IMPORTED_SUCCESSFULLY:
@@ -2756,7 +2883,7 @@ def start_stock_analysis():
         app.logger.error(f"Stock analysis pipeline unavailable: {reason}")
         session['notification_message'] = "The Stock Analysis service is temporarily unavailable. Please try again later."
         session['notification_type'] = "danger"
-        socketio.emit('analysis_error', {'message': 'Stock Analysis service is temporarily unavailable. Check server logs for details.', 'ticker': ticker}, room=room_id)
+        progress_bus.emit('analysis_error', {'message': 'Stock Analysis service is temporarily unavailable. Check server logs for details.', 'ticker': ticker}, room=room_id)
         return redirect(url_for('stock_analysis.analyzer'))
 
     try:
@@ -2798,7 +2925,7 @@ def start_stock_analysis():
                     app.logger.info(f"Generated report for {ticker} contains {word_count} words")
                     
                     # Emit word count update to client
-                    socketio.emit('word_count_update', {
+                    progress_bus.emit('word_count_update', {
                         'word_count': word_count,
                         'ticker': ticker
                     }, room=room_id)
@@ -2825,18 +2952,18 @@ def start_stock_analysis():
             if not report_filename_for_url:
                 # Only show this error if we didn't already show a data not found error
                 error_detail = f"Report generation failed for {ticker}. Please try again."
-                socketio.emit('analysis_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
+                progress_bus.emit('analysis_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
                 return jsonify({'status': 'error', 'message': error_detail}), 500
         else:
             # Only show this error if we didn't already show a data not found error
             error_detail = f"Analysis failed for {ticker}. Please try again."
-            socketio.emit('analysis_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
+            progress_bus.emit('analysis_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
             return jsonify({'status': 'error', 'message': error_detail}), 500
 
         if not (report_filename_for_url and absolute_report_filepath_on_disk and os.path.exists(absolute_report_filepath_on_disk)):
             # Only show this error if we didn't already show a data not found error
             error_detail = f"Report generation failed for {ticker}. Please try again."
-            socketio.emit('analysis_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
+            progress_bus.emit('analysis_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
             return jsonify({'status': 'error', 'message': error_detail}), 500
 
         user_uid_for_history = session.get('firebase_user_uid')
@@ -2871,7 +2998,7 @@ def start_stock_analysis():
 
         view_report_url = url_for('display_report', ticker=ticker, filename=report_filename_for_url)
         app.logger.info(f"Analysis for {ticker} complete. Signaling client in room {room_id} to redirect to: {view_report_url}")
-        socketio.emit('analysis_complete', {'report_url': view_report_url, 'ticker': ticker}, room=room_id)
+        progress_bus.emit('analysis_complete', {'report_url': view_report_url, 'ticker': ticker}, room=room_id)
 
         return jsonify({'status': 'analysis_completed_redirect_via_socket', 'ticker': ticker, 'report_url': view_report_url}), 200
 
@@ -2887,30 +3014,100 @@ def start_stock_analysis():
             # For other errors, truncate and add generic message
             display_message = f"An error occurred while analyzing {ticker}: {error_message[:150]}..."
         
-        socketio.emit('analysis_error', {'message': display_message, 'ticker': ticker}, room=room_id)
+        progress_bus.emit('analysis_error', {'message': display_message, 'ticker': ticker}, room=room_id)
         # Remove flash() to prevent page refresh popups - WebSocket will handle the error display
         return jsonify({'status': 'error', 'message': display_message}), 500
 
-def get_report_content_from_firebase_storage(storage_path):
-    """Get report content from Firebase Storage"""
+def get_cached_report_from_firebase_storage(storage_path):
+    """Get a report from Firebase Storage through the report cache.
+    
+    The blob generation number validates cached copies; it is only re-checked
+    every few minutes, so repeat views need no Storage round trip at all.
+    """
+    cache_key = f"storage:{storage_path}"
+    cached = report_content_cache.get(cache_key)
+    if cached and not report_content_cache.needs_revalidation(cached):
+        return cached
+    
     bucket = get_storage_bucket()
     if not bucket:
         app.logger.error("Storage bucket not available for downloading report.")
-        return None
+        return cached
     
     try:
-        blob = bucket.blob(storage_path)
-        if not blob.exists():
+        blob = bucket.get_blob(storage_path)
+        if blob is None:
             app.logger.error(f"Report not found in Firebase Storage: {storage_path}")
+            report_content_cache.invalidate(cache_key)
             return None
         
-        content = blob.download_as_text()
+        generation = str(blob.generation)
+        if cached and cached.validator == generation:
+            report_content_cache.mark_validated(cached)
+            return cached
+        
+        cached = report_content_cache.get(cache_key, validator=generation)
+        if cached:
+            return cached
+        
+        content = blob.download_as_bytes(if_generation_match=blob.generation)
         app.logger.info(f"Successfully downloaded report from Firebase Storage: {storage_path}")
-        return content
+        return report_content_cache.put(cache_key, generation, content, persist=True)
     except Exception as e:
         app.logger.error(f"Error downloading report from Firebase Storage {storage_path}: {e}", exc_info=True)
         return None
 
+def get_report_content_from_firebase_storage(storage_path):
+    """Get report content from Firebase Storage"""
+    cached = get_cached_report_from_firebase_storage(storage_path)
+    return cached.text() if cached else None
+
+def get_cached_report_from_firestore(doc_snapshot):
+    """Get a report referenced by a userGeneratedReports document through the report cache.
+    
+    ``doc_snapshot`` may be a partial (``select``-ed) snapshot; the full document is
+    only read when inline content has to be (re)loaded.
+    """
+    report_data = doc_snapshot.to_dict() or {}
+    storage_type = report_data.get('storage_type', 'unknown')
+    
+    if storage_type == 'firebase_storage':
+        storage_path = report_data.get('storage_path')
+        return get_cached_report_from_firebase_storage(storage_path) if storage_path else None
+    
+    if storage_type not in ('firestore_content', 'firestore_compressed'):
+        return None
+    
+    cache_key = f"firestore:{doc_snapshot.id}"
+    validator = str(doc_snapshot.update_time) if doc_snapshot.update_time else None
+    cached = report_content_cache.get(cache_key, validator=validator)
+    if cached:
+        return cached
+    
+    full_snapshot = doc_snapshot.reference.get()
+    if not full_snapshot.exists:
+        return None
+    content = get_report_content_from_firestore(full_snapshot.to_dict())
+    if not content:
+        return None
+    validator = str(full_snapshot.update_time) if full_snapshot.update_time else validator
+    return report_content_cache.put(cache_key, validator, content)
+
+def get_cached_report_from_local_file(full_file_path):
+    """Get a locally generated report through the report cache (validated by mtime and size)"""
+    try:
+        stat = os.stat(full_file_path)
+    except OSError:
+        return None
+    cache_key = f"local:{os.path.abspath(full_file_path)}"
+    validator = f"{stat.st_mtime_ns}-{stat.st_size}"
+    cached = report_content_cache.get(cache_key, validator=validator)
+    if cached:
+        return cached
+    with open(full_file_path, 'rb') as f:
+        content = f.read()
+    return report_content_cache.put(cache_key, validator, content)
+
 @app.route('/report/<ticker>/<path:filename>')
 @login_required
 def report_shortcut(ticker, filename):
@@ -2942,11 +3139,14 @@ def display_report(ticker, filename):
         # Generate download filename
         download_filename = f"{ticker.upper()}_Analysis_Report.html"
         
-        # Render the report display template
-        return render_template('report_display.html', 
-                             ticker=ticker,
-                             report_url=report_url,
-                             download_filename=download_filename)
+        # Render the report display template (conditional GET: unchanged pages answer 304)
+        response = make_response(render_template('report_display.html', 
+                                                 ticker=ticker,
+                                                 report_url=report_url,
+                                                 download_filename=download_filename))
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.add_etag()
+        return response.make_conditional(request)
         
     except Exception as e:
         app.logger.error(f"Error in display_report: {e}", exc_info=True)
@@ -2977,24 +3177,23 @@ def view_generated_report(ticker, filename):
         db = get_firestore_client()
         if db:
             try:
-                # Query for the specific report
+                # Query for the specific report (metadata only; content is served from the report cache)
                 reports_query = db.collection('userGeneratedReports')\
                     .where('user_uid', '==', user_uid)\
                     .where('filename', '==', clean_filename)\
+                    .select(['storage_type', 'storage_path'])\
                     .limit(1)
                 
                 for doc in reports_query.stream():
-                    report_data = doc.to_dict()
-                    storage_type = report_data.get('storage_type', 'unknown')
+                    storage_type = (doc.to_dict() or {}).get('storage_type', 'unknown')
                     
                     app.logger.info(f"Found report in database with storage type: {storage_type}")
                     
-                    # Try to get content using the helper function
-                    content = get_report_content_from_firestore(report_data)
+                    cached_report = get_cached_report_from_firestore(doc)
                     
-                    if content:
-                        app.logger.info(f"Successfully retrieved content from {storage_type} storage")
-                        return content, 200, {'Content-Type': 'text/html; charset=utf-8'}
+                    if cached_report:
+                        app.logger.info(f"Serving report from {storage_type} storage via report cache")
+                        return report_content_cache.response(cached_report, request)
                     else:
                         app.logger.warning(f"Failed to retrieve content from {storage_type} storage")
                         break
@@ -3008,10 +3207,10 @@ def view_generated_report(ticker, filename):
         
         if os.path.exists(full_file_path):
             try:
-                with open(full_file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                app.logger.info(f"Successfully served report from local file: {full_file_path}")
-                return content, 200, {'Content-Type': 'text/html; charset=utf-8'}
+                cached_report = get_cached_report_from_local_file(full_file_path)
+                if cached_report:
+                    app.logger.info(f"Serving report from local file: {full_file_path}")
+                    return report_content_cache.response(cached_report, request)
             except Exception as e:
                 app.logger.error(f"Error reading local file {full_file_path}: {e}")
         
@@ -3950,7 +4149,8 @@ def save_report_to_firebase_storage(user_uid, ticker, filename, content):
         blob = bucket.blob(storage_path)
         
         # Upload the HTML content
-        blob.upload_from_string(content, content_type='text/html')
+        with span('storage.upload_report', bytes=len(content)):
+            blob.upload_from_string(content, content_type='text/html')
         app.logger.info(f"✅ Report {filename} saved to Firebase Storage: {storage_path}")
         return storage_path
     except Exception as e:
@@ -4121,7 +4321,8 @@ def save_report_to_history(user_uid, ticker, filename, generated_at_dt, storage_
         
         # Save to Firestore
         reports_history_collection = db.collection(u'userGeneratedReports')
-        doc_ref = reports_history_collection.add(report_data)
+        with span('firestore.add_report_history', storage_type=storage_type):
+            doc_ref = reports_history_collection.add(report_data)
         
         # Increment counter documents
         try:
@@ -4135,6 +4336,17 @@ def save_report_to_history(user_uid, ticker, filename, generated_at_dt, storage_
         except Exception as counter_e:
             app.logger.warning(f"Failed to update counter documents: {counter_e}")
         
+        # Fold the report into the pre-aggregated analytics rollups
+        try:
+            from app.services.analytics_rollup_service import get_rollup_service
+            rollup_service = get_rollup_service()
+            if rollup_service:
+                rollup_service.record_report_generated(user_uid, ticker, storage_type, generated_at_dt)
+        except Exception as rollup_e:
+            app.logger.warning(f"Failed to update analytics rollups: {rollup_e}")
+        
+        invalidate_report_history_cache(user_uid)
+        
         app.logger.info(f"Report history saved for user {user_uid}, ticker {ticker}, filename {clean_filename}. Document ID: {doc_ref[1].id}, Storage Type: {storage_type}")
         
         # Also save metadata for analytics purposes
@@ -4169,8 +4381,42 @@ def save_report_to_history(user_uid, ticker, filename, generated_at_dt, storage_
         app.logger.error(f"Error saving report history for user {user_uid}, ticker {ticker}: {e}", exc_info=True)
         return False
 
-@monitor_query_performance('get_report_history_for_user')
+REPORT_HISTORY_CACHE_TIMEOUT = 300  # seconds; writes bump the per-user version, so this only bounds memory
+
+def get_report_history_cache_version(user_uid):
+    """Per-user report history version; part of every report listing cache key"""
+    try:
+        return cache.get(f"report_history_version_{user_uid}") or 0
+    except Exception:
+        return 0
+
+def invalidate_report_history_cache(user_uid):
+    """Invalidate every cached report listing of a user (all display limits) by bumping its version"""
+    try:
+        cache.set(f"report_history_version_{user_uid}", time.time_ns(), timeout=0)
+    except Exception as e:
+        app.logger.warning(f"Failed to invalidate report history cache for user {user_uid}: {e}")
+
 def get_report_history_for_user(user_uid, display_limit=10):
+    """Get report history for a user, served from the shared cache when unchanged"""
+    cache_key = f"report_history_{user_uid}_v{get_report_history_cache_version(user_uid)}_limit_{display_limit}"
+    try:
+        cached = cache.get(cache_key)
+    except Exception:
+        cached = None
+    if cached is not None:
+        return cached['reports'], cached['total']
+    
+    reports, total = _fetch_report_history_for_user(user_uid, display_limit=display_limit)
+    if reports or total:
+        try:
+            cache.set(cache_key, {'reports': reports, 'total': total}, timeout=REPORT_HISTORY_CACHE_TIMEOUT)
+        except Exception as e:
+            app.logger.warning(f"Failed to cache report history for user {user_uid}: {e}")
+    return reports, total
+
+@monitor_query_performance('get_report_history_for_user')
+def _fetch_report_history_for_user(user_uid, display_limit=10):
     """Get report history for a user with enhanced storage information (optimized)"""
     if not FIREBASE_INITIALIZED_SUCCESSFULLY:
         app.logger.error(f"Firestore not available for fetching report history for user {user_uid}.")
@@ -4295,6 +4541,10 @@ def get_report_history_for_user(user_uid, display_limit=10):
                 
                 if not content_available:
                     app.logger.debug(f"Report content missing for user {user_uid}: {clean_filename} (Storage Type: {storage_type})")
+            
+            # Inline report bodies are not needed for the listing (served via /view-report)
+            report_data.pop('html_content', None)
+            report_data.pop('compressed_content', None)
                 
             reports_for_display.append(report_data)
             
@@ -4373,6 +4623,9 @@ def cleanup_orphaned_reports(user_uid=None, dry_run=True):
             for orphan in orphaned_reports:
                 try:
                     db.collection(u'userGeneratedReports').document(orphan['doc_id']).delete()
+                    report_content_cache.invalidate(f"firestore:{orphan['doc_id']}")
+                    if orphan.get('user_uid'):
+                        invalidate_report_history_cache(orphan['user_uid'])
                     deleted_count += 1
                     app.logger.info(f"Deleted orphaned report record: {orphan['ticker']} - {orphan['filename']}")
                 except Exception as e:
@@ -4607,7 +4860,7 @@ def run_automation_now(): # Modified
             user_room=user_uid,
             save_status_callback=save_processed_ticker_status # NEW: Pass callback here
         )
-        socketio.emit('automation_status', {'message': "Automation run processing started. Monitor individual profile logs for live updates.", 'status': 'info'}, room=user_uid)
+        progress_bus.emit('automation_status', {'message': "Automation run processing started. Monitor individual profile logs for live updates.", 'status': 'info'}, room=user_uid)
 
         if results:
             for pid_res, res_data in results.items():
@@ -4635,7 +4888,7 @@ def run_automation_now(): # Modified
         app.logger.error(f"Error triggering automation run for user {user_uid}: {e_auto_run}", exc_info=True)
         session['notification_message'] = "An unexpected error occurred while starting the automation run. Please check system logs or contact support."
         session['notification_type'] = "danger"
-        socketio.emit('automation_status', {'message': f'Failed to start automation: {str(e_auto_run)[:100]}...', 'status': 'error'}, room=user_uid)
+        progress_bus.emit('automation_status', {'message': f'Failed to start automation: {str(e_auto_run)[:100]}...', 'status': 'error'}, room=user_uid, terminal=True)
 
     return redirect(url_for('automation_runner_page'))
 
@@ -4665,7 +4918,7 @@ def stop_automation_run(profile_id):
                 app.logger.info(f"Stop request sent for profile {profile_id} (User: {user_uid}) - no detailed response")
                 return jsonify({'status': 'success', 'message': 'Stop request sent.'})
         else:
-            socketio.emit('automation_update', {
+            progress_bus.emit('automation_update', {
                 'profile_id': profile_id,
                 'phase': 'Control',
                 'stage': 'Stop Requested',
@@ -4881,7 +5134,7 @@ def run_earnings_automation():
             
             if not authors:
                 for ticker in tickers:
-                    socketio.emit('automation_update', {
+                    progress_bus.emit('automation_update', {
                         'profile_id': profile_id,
                         'message': f'[{ticker}] ✗ No authors configured for {profile_name}',
                         'level': 'error'
@@ -4928,14 +5181,14 @@ def run_earnings_automation():
                 variation_number = ticker_publish_count.get(ticker, 0)
                 variation_msg = f" - Variation #{variation_number + 1}" if variation_number > 0 else ""
                 
-                socketio.emit('automation_update', {
+                progress_bus.emit('automation_update', {
                     'profile_id': profile_id,
                     'message': f'[{ticker_idx}/{len(tickers)}] Starting earnings report for {ticker} on {profile_name}{variation_msg} (Writer: {writer_name})...',
                     'level': 'info'
                 }, room=user_uid)
                 
                 # Step 1: Generate earnings article WITH variation
-                socketio.emit('automation_update', {
+                progress_bus.emit('automation_update', {
                     'profile_id': profile_id,
                     'message': f'[{ticker}] Step 1/4: Collecting earnings data{variation_msg}...',
                     'level': 'info'
@@ -4947,7 +5200,7 @@ def run_earnings_automation():
                 if not result or not result.get('success'):
                     error_msg = result.get('error', 'Unknown error') if result else 'Generation failed'
                     failed_tickers.append(f"{ticker} on {profile_name} ({error_msg})")
-                    socketio.emit('automation_update', {
+                    progress_bus.emit('automation_update', {
                         'profile_id': profile_id,
                         'message': f'[{ticker}] Failed to generate earnings report: {error_msg}',
                         'level': 'error'
@@ -4957,14 +5210,14 @@ def run_earnings_automation():
 
                 app.logger.info(f"Earnings article generated for {ticker} on {profile_name} (Variation #{variation_number}): {result.get('word_count', 0)} words")
                 
-                socketio.emit('automation_update', {
+                progress_bus.emit('automation_update', {
                     'profile_id': profile_id,
                     'message': f'[{ticker}] ✓ Generated {result.get("word_count", 0)} word earnings article{variation_msg}',
                     'level': 'success'
                 }, room=user_uid)
 
                 # Step 2: Extract article content for WordPress
-                socketio.emit('automation_update', {
+                progress_bus.emit('automation_update', {
                     'profile_id': profile_id,
                     'message': f'[{ticker}] Step 2/4: Preparing content for WordPress...',
                     'level': 'info'
@@ -4981,7 +5234,7 @@ def run_earnings_automation():
                     else:
                         error_msg = "Generated content not available"
                         failed_tickers.append(f"{ticker} on {profile_name} (No content)")
-                        socketio.emit('automation_update', {
+                        progress_bus.emit('automation_update', {
                             'profile_id': profile_id,
                             'message': f'[{ticker}] {error_msg}',
                             'level': 'error'
@@ -5022,7 +5275,7 @@ def run_earnings_automation():
                 word_count = len(article_content.split())
 
                 # Step 3: Publish to WordPress
-                socketio.emit('automation_update', {
+                progress_bus.emit('automation_update', {
                     'profile_id': profile_id,
                     'message': f'[{ticker}] Step 3/4: Publishing to WordPress...',
                     'level': 'info'
@@ -5045,7 +5298,7 @@ def run_earnings_automation():
                         # Update last publish time for next article
                         last_publish_time = publish_time
                         
-                        socketio.emit('automation_update', {
+                        progress_bus.emit('automation_update', {
                             'profile_id': profile_id,
                             'message': f'[{ticker}] Scheduled for {publish_time.strftime("%Y-%m-%d %H:%M UTC")} (random interval)',
                             'level': 'info'
@@ -5133,13 +5386,13 @@ def run_earnings_automation():
                             status_data=status_data
                         )
 
-                        socketio.emit('automation_update', {
+                        progress_bus.emit('automation_update', {
                             'profile_id': profile_id,
                             'message': f'[{ticker}] ✓ Earnings report published{variation_msg}',
                             'level': 'success'
                         }, room=user_uid)
 
-                        socketio.emit('ticker_status_persisted', {
+                        progress_bus.emit('ticker_status_persisted', {
                             'profile_id': profile_id,
                             'ticker': ticker,
                             'status': status,
@@ -5193,6 +5446,8 @@ def run_earnings_automation():
                             if db:
                                 try:
                                     db.collection('userPublishedArticles').add(published_article_data)
+                                    record_published_article_rollup(published_article_data)
+                                    record_published_article_stats(published_article_data)
                                     app.logger.info(f"[EARNINGS_HISTORY] Saved published earnings article '{ticker}' to Firestore for user {user_uid}")
                                 except Exception as fs_error:
                                     app.logger.warning(f"[EARNINGS_HISTORY] Could not save to userPublishedArticles: {fs_error}")
@@ -5208,14 +5463,14 @@ def run_earnings_automation():
                 except Exception as e:
                     error_msg = str(e)
                     app.logger.error(f"Error publishing earnings report for {ticker} to {profile_name}: {error_msg}")
-                    socketio.emit('automation_update', {
+                    progress_bus.emit('automation_update', {
                         'profile_id': profile_id,
                         'message': f'[{ticker}] ✗ Error: {error_msg}',
                         'level': 'error'
                     }, room=user_uid)
             
             # Completion message for this profile
-            socketio.emit('automation_update', {
+            progress_bus.emit('automation_update', {
                 'profile_id': profile_id,
                 'message': f'✅ Completed processing {len(tickers)} ticker(s) for {profile_name}',
                 'level': 'success'
@@ -5228,7 +5483,7 @@ def run_earnings_automation():
         # Final summary message to all profiles
         for profile_data in selected_profiles_data_for_run:
             profile_id = profile_data.get('profile_id')
-            socketio.emit('automation_update', {
+            progress_bus.emit('automation_update', {
                 'profile_id': profile_id,
                 'message': f'🎉 All done! Published {total_published} article(s) for {len(tickers)} ticker(s)',
                 'level': 'success'
@@ -5247,7 +5502,7 @@ def run_earnings_automation():
         app.logger.error(f"Error in earnings automation: {error_msg}")
         for profile_data in selected_profiles_data_for_run:
             profile_id = profile_data.get('profile_id')
-            socketio.emit('automation_update', {
+            progress_bus.emit('automation_update', {
                 'profile_id': profile_id,
                 'message': f'Error: {error_msg}',
                 'level': 'error'
@@ -5613,7 +5868,7 @@ def run_sports_automation():
             
             # Step 1: Generate full AI article using Perplexity + Gemini
             try:
-                socketio.emit('sports_automation_update', {
+                progress_bus.emit('sports_automation_update', {
                     'stage': 'generation',
                     'message': f'[{article_idx}/{len(selected_articles)}] 🤖 Generating AI article: {article_title[:60]}...',
                     'level': 'info'
@@ -5660,7 +5915,7 @@ def run_sports_automation():
                 if not generated_article or generated_article.get('status') not in ['success', 'placeholder']:
                     error_msg = generated_article.get('error', 'AI generation failed') if generated_article else 'No response from AI'
                     app.logger.error(f"{error_msg} for: {article_title}")
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'generation',
                         'message': f'[{article_title[:40]}] ✗ {error_msg}',
                         'level': 'error'
@@ -5680,7 +5935,7 @@ def run_sports_automation():
             except Exception as e:
                 error_msg = str(e)
                 app.logger.error(f"AI generation error for {article_title}: {error_msg}")
-                socketio.emit('sports_automation_update', {
+                progress_bus.emit('sports_automation_update', {
                     'stage': 'generation',
                     'message': f'[{article_title[:40]}] ✗ AI Error: {error_msg}',
                     'level': 'error'
@@ -5689,14 +5944,14 @@ def run_sports_automation():
                 continue
 
             # AI generation completed successfully - emit once per article
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'generation',
                 'message': f'[{article_title[:40]}] ✅ Generated {word_count} words',
                 'level': 'success'
             }, room=user_uid)
 
             # Prepare content for WordPress (do this once per article)
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'publishing',
                 'message': f'[{article_title[:40]}] 📝 Preparing content...',
                 'level': 'info'
@@ -5728,7 +5983,7 @@ def run_sports_automation():
                 app.logger.info(f"[SPORTS_PUBLISH_STATUS] Profile {profile_name}: {status_display}")
                 
                 # User feedback about publish method
-                socketio.emit('sports_automation_update', {
+                progress_bus.emit('sports_automation_update', {
                     'stage': 'publishing',
                     'message': f'[{article_title[:40]}] 📋 {status_display}',
                     'level': 'info'
@@ -5783,13 +6038,13 @@ def run_sports_automation():
                 
                 # Emit user-friendly message about category selection
                 if "fallback" in category_source:
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing', 
                         'message': f'[{article_title[:40]}] ⚠️ No category specified, using sports fallback (ID: {cat_id})',
                         'level': 'warning'
                     }, room=user_uid)
                 else:
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing', 
                         'message': f'[{article_title[:40]}] 📂 Using category ID {cat_id} ({category_source})',
                         'level': 'info'
@@ -5822,7 +6077,7 @@ def run_sports_automation():
                 
                 if not authors:
                     app.logger.error(f"No authors configured for profile {profile_id}")
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title}] ✗ No authors configured for this profile',
                         'level': 'error'
@@ -5896,21 +6151,21 @@ def run_sports_automation():
                     # Save state immediately to prevent overlaps
                     firestore_state_manager.save_state_to_firestore(user_uid, state)
                     
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title[:40]}] 📅 Scheduled: {publish_time.strftime("%Y-%m-%d %H:%M UTC")} (gap: {min_interval}-{max_interval}min)',
                         'level': 'info'
                     }, room=user_uid)
                 elif publish_status == 'draft':
                     publish_time = None  # Drafts don't need scheduling
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title[:40]}] 📝 Will be saved as draft (not published)',
                         'level': 'info'
                     }, room=user_uid)
                 else:  # publish_status == 'publish'
                     publish_time = datetime.now(timezone.utc)
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title[:40]}] 🚀 Publishing immediately',
                         'level': 'info'
@@ -5918,7 +6173,7 @@ def run_sports_automation():
 
                 if not AUTO_PUBLISHER_IMPORTED_SUCCESSFULLY:
                     app.logger.error("AUTO_PUBLISHER not available")
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title}] ✗ Publishing service unavailable',
                         'level': 'error'
@@ -5942,13 +6197,13 @@ def run_sports_automation():
                     
                     app.logger.info(f"[SPORTS_AUTHOR_ATTEMPT] Attempt {attempt + 1}/{len(authors)}: Trying author {writer_name} (index {next_author_index})")
                     
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_idx}/{len(selected_articles)}] Trying "{article_title[:40]}" with {writer_name}...',
                         'level': 'info'
                     }, room=user_uid)
 
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title[:40]}] 🚀 Publishing to WordPress...',
                         'level': 'info'
@@ -6013,7 +6268,7 @@ def run_sports_automation():
                                 app.logger.info(f"[SPORTS_AUTHOR_SUCCESS] ✅ Successfully published (ID: {actual_post_id}) with author {writer_name}")
                                 success_msg = f"✅ Published immediately (ID: {actual_post_id})"
                             
-                            socketio.emit('sports_automation_update', {
+                            progress_bus.emit('sports_automation_update', {
                                 'stage': 'publishing',
                                 'message': f'[{article_title[:40]}] {success_msg}',
                                 'level': 'success'
@@ -6026,7 +6281,7 @@ def run_sports_automation():
                             break
                         else:
                             app.logger.warning(f"[SPORTS_AUTHOR_FAILED] ❌ Author {writer_name} failed - trying next author")
-                            socketio.emit('sports_automation_update', {
+                            progress_bus.emit('sports_automation_update', {
                                 'stage': 'publishing',
                                 'message': f'[{article_title[:40]}] ❌ Author {writer_name} failed, trying next...',
                                 'level': 'warning'
@@ -6034,7 +6289,7 @@ def run_sports_automation():
                             
                     except Exception as wp_error:
                         app.logger.error(f"[SPORTS_AUTHOR_ERROR] Author {writer_name} failed with error: {wp_error}")
-                        socketio.emit('sports_automation_update', {
+                        progress_bus.emit('sports_automation_update', {
                             'stage': 'publishing',
                             'message': f'[{article_title[:40]}] ❌ {writer_name}: {str(wp_error)[:50]}...',
                             'level': 'warning'
@@ -6053,13 +6308,13 @@ def run_sports_automation():
                     # Update state with successful writer
                     state['last_author_index_by_profile'][profile_id] = authors.index(final_author)
                     
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title[:40]}] ✅ {status.capitalize()} by {final_writer_name} ({word_count} words)',
                         'level': 'success'
                     }, room=user_uid)
 
-                    socketio.emit('ticker_status_persisted', {
+                    progress_bus.emit('ticker_status_persisted', {
                         'profile_id': profile_id,
                         'ticker': article_title[:20],
                         'status': status,
@@ -6114,6 +6369,8 @@ def run_sports_automation():
                         if db:
                             try:
                                 db.collection('userPublishedArticles').add(published_article_data)
+                                record_published_article_rollup(published_article_data)
+                                record_published_article_stats(published_article_data)
                                 app.logger.info(f"[SPORTS_HISTORY] Saved published article '{article_title[:40]}' to Firestore for user {user_uid}")
                             except Exception as fs_error:
                                 app.logger.warning(f"[SPORTS_HISTORY] Could not save to userPublishedArticles: {fs_error}")
@@ -6135,14 +6392,14 @@ def run_sports_automation():
                     error_msg = f"All {len(authors)} authors failed to create WordPress post"
                     failed_articles.append(f"{article_title} on {profile_name}")
                     app.logger.error(f"[SPORTS_ALL_AUTHORS_FAILED] {error_msg}. Attempted authors: {', '.join(attempted_authors)}")
-                    socketio.emit('sports_automation_update', {
+                    progress_bus.emit('sports_automation_update', {
                         'stage': 'publishing',
                         'message': f'[{article_title[:40]}] ✗ All authors failed ({len(attempted_authors)} tried)',
                         'level': 'error'
                     }, room=user_uid)
 
         # Summary
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'publishing',
             'message': f'🎉 Complete! Published {total_published} article(s) for {len(selected_articles)} sports article(s)',
             'level': 'success'
@@ -6163,7 +6420,7 @@ def run_sports_automation():
         error_msg = str(e)
         app.logger.error(f"Error in sports automation: {error_msg}")
         for profile_data in selected_profiles_data_for_run:
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'error',
                 'message': f'Error: {error_msg}',
                 'level': 'error'
@@ -6269,7 +6526,7 @@ def api_sports_collect_rss():
         app.logger.info(f"Sports RSS collection triggered by user {user_uid}")
         
         # Emit start event
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': '📡 Starting RSS feed collection...',
             'level': 'info',
@@ -6292,7 +6549,7 @@ def api_sports_collect_rss():
         if not rss_sources_path.exists():
             raise FileNotFoundError(f"RSS sources file not found: {rss_sources_path}")
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': '🔧 Initializing RSS collector...',
             'level': 'info',
@@ -6326,7 +6583,7 @@ def api_sports_collect_rss():
         sources = collector.load_rss_sources()
         total_sources = len(sources)
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'🔍 Starting ASYNC collection from {total_sources} RSS sources...',
             'level': 'info',
@@ -6359,7 +6616,7 @@ def api_sports_collect_rss():
                 status_message += f' ({failed_sources} failed/timeout)'
             status_message += f', {total_new_articles} new articles'
             
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'rss_collection',
                 'message': status_message,
                 'level': 'success' if successful_sources > 0 else 'warning',
@@ -6369,7 +6626,7 @@ def api_sports_collect_rss():
             
         except asyncio.TimeoutError:
             app.logger.error("RSS collection timed out after 5 minutes")
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'rss_collection',
                 'message': f'⏱️ Collection timed out after 5 minutes. Some sources may be very slow. Try again or check your internet connection.',
                 'level': 'error',
@@ -6389,7 +6646,7 @@ def api_sports_collect_rss():
             app.logger.error(traceback.format_exc())
             
             # Emit detailed error message
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'rss_collection',
                 'message': f'❌ RSS collection failed: {str(e)}',
                 'level': 'error',
@@ -6408,7 +6665,7 @@ def api_sports_collect_rss():
         collector.news_database['metadata']['total_articles'] = len(collector.news_database['articles'])
         collector.news_database['metadata']['sources'] = [source['name'] for source in sources]
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'✅ Processed {successful_sources}/{total_sources} sources successfully, collected {total_new_articles} raw articles',
             'level': 'info',
@@ -6418,7 +6675,7 @@ def api_sports_collect_rss():
         
         # Apply importance scoring
         if collector.news_database['articles']:
-            socketio.emit('sports_automation_update', {
+            progress_bus.emit('sports_automation_update', {
                 'stage': 'rss_collection',
                 'message': f'📊 Applying importance scoring to {len(collector.news_database["articles"])} articles...',
                 'level': 'info',
@@ -6432,7 +6689,7 @@ def api_sports_collect_rss():
             collector.save_database()
         
         # Clean up old articles
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'🧹 Cleaning up old articles (keeping last 24 hours)...',
             'level': 'info',
@@ -6444,7 +6701,7 @@ def api_sports_collect_rss():
         
         # Remove duplicates
         articles_before_dedup = len(collector.news_database.get('articles', []))
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'🔄 Removing duplicate articles from {articles_before_dedup} collected articles...',
             'level': 'info',
@@ -6458,7 +6715,7 @@ def api_sports_collect_rss():
         articles_after_dedup = len(collector.news_database.get('articles', []))
         duplicates_removed = articles_before_dedup - articles_after_dedup
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'✅ Deduplication complete: Removed {duplicates_removed} duplicates in {dedup_time:.1f}s, {articles_after_dedup} unique articles',
             'level': 'success',
@@ -6469,7 +6726,7 @@ def api_sports_collect_rss():
         # Save updated database
         collector.save_database()
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'🏷️  Categorizing {articles_after_dedup} articles into sports categories...',
             'level': 'info',
@@ -6510,7 +6767,7 @@ def api_sports_collect_rss():
                 'category': last_article.get('category', 'N/A')
             }
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'✅ Collection Complete! {total_count} articles categorized from {successful_sources} sources (Dedup: {dedup_time:.1f}s, Categorization: {categorization_time:.1f}s)',
             'level': 'success',
@@ -6565,7 +6822,7 @@ def api_sports_collect_rss():
         error_msg = str(e)
         app.logger.error(f"Error in RSS collection: {error_msg}", exc_info=True)
         
-        socketio.emit('sports_automation_update', {
+        progress_bus.emit('sports_automation_update', {
             'stage': 'rss_collection',
             'message': f'❌ Error: {error_msg}',
             'level': 'error',
@@ -6832,7 +7089,7 @@ def api_trends_collect():
         app.logger.info(f"Google Trends collection triggered by user {user_uid}")
         
         # Emit start event
-        socketio.emit('trends_update', {
+        progress_bus.emit('trends_update', {
             'stage': 'initialization',
             'message': '🌍 Starting Google Trends collection...',
             'level': 'info',
@@ -6855,7 +7112,7 @@ def api_trends_collect():
             f'To refresh, trigger the tickzen-trends-collector scheduler.'
         )
 
-        socketio.emit('trends_update', {
+        progress_bus.emit('trends_update', {
             'stage': 'info',
             'message': f'ℹ️  {msg}',
             'level': 'info',
@@ -6872,7 +7129,7 @@ def api_trends_collect():
 
     except Exception as e:
         app.logger.error(f"Error reading trends status: {e}", exc_info=True)
-        socketio.emit('trends_update', {
+        progress_bus.emit('trends_update', {
             'stage': 'error',
             'message': f'❌ Could not read trends status: {str(e)}',
             'level': 'error',
@@ -6906,7 +7163,7 @@ def api_trends_generate_articles():
         app.logger.info(f"Parameters: max_articles={max_articles}, min_score={min_importance_score}")
         
         # Emit start event
-        socketio.emit('trends_articles_update', {
+        progress_bus.emit('trends_articles_update', {
             'stage': 'initialization',
             'message': '🚀 Starting Google Trends article generation...',
             'level': 'info',
@@ -6917,7 +7174,7 @@ def api_trends_generate_articles():
         # Import the pipeline
         from Sports_Article_Automation.google_trends.google_trends_article_pipeline import GoogleTrendsArticlePipeline
         
-        socketio.emit('trends_articles_update', {
+        progress_bus.emit('trends_articles_update', {
             'stage': 'initialization', 
             'message': '⚙️  Initializing article generation pipeline...',
             'level': 'info',
@@ -6928,7 +7185,7 @@ def api_trends_generate_articles():
         # Initialize pipeline
         pipeline = GoogleTrendsArticlePipeline()
         
-        socketio.emit('trends_articles_update', {
+        progress_bus.emit('trends_articles_update', {
             'stage': 'processing',
             'message': f'📊 Processing trends for article generation...',
             'level': 'info', 
@@ -6947,7 +7204,7 @@ def api_trends_generate_articles():
             successful_articles = len(results.get('articles_generated', []))
             failed_articles = len(results.get('failed_articles', []))
             
-            socketio.emit('trends_articles_update', {
+            progress_bus.emit('trends_articles_update', {
                 'stage': 'completed',
                 'message': f'✅ Generation completed! {successful_articles} articles generated, {failed_articles} failed',
                 'level': 'success',
@@ -6956,7 +7213,7 @@ def api_trends_generate_articles():
                 'summary': results.get('summary', {})
             }, room=user_uid)
         else:
-            socketio.emit('trends_articles_update', {
+            progress_bus.emit('trends_articles_update', {
                 'stage': 'error', 
                 'message': f'❌ Generation failed: {results.get("error", "Unknown error")}',
                 'level': 'error',
@@ -6972,7 +7229,7 @@ def api_trends_generate_articles():
         
     except Exception as e:
         app.logger.error(f"Error generating trends articles: {e}", exc_info=True)
-        socketio.emit('trends_articles_update', {
+        progress_bus.emit('trends_articles_update', {
             'stage': 'error',
             'message': f'❌ Generation failed: {str(e)}',
             'level': 'error',
@@ -7035,7 +7292,7 @@ def api_trends_generate_single_article():
         app.logger.info(f"Single trend article generation for: {trend_query} by user {user_uid}")
         
         # Emit start event
-        socketio.emit('trends_articles_update', {
+        progress_bus.emit('trends_articles_update', {
             'stage': 'single_generation',
             'message': f'🎯 Generating article for trend: {trend_query}',
             'level': 'info',
@@ -7075,7 +7332,7 @@ def api_trends_generate_single_article():
         result = pipeline.generate_article_from_trend(target_trend)
         
         if result.get('status') == 'success':
-            socketio.emit('trends_articles_update', {
+            progress_bus.emit('trends_articles_update', {
                 'stage': 'single_completed',
                 'message': f'✅ Article generated successfully for: {trend_query}',
                 'level': 'success',
@@ -7088,7 +7345,7 @@ def api_trends_generate_single_article():
                 }
             }, room=user_uid)
         else:
-            socketio.emit('trends_articles_update', {
+            progress_bus.emit('trends_articles_update', {
                 'stage': 'single_error',
                 'message': f'❌ Failed to generate article for: {trend_query}',
                 'level': 'error',
@@ -7104,7 +7361,7 @@ def api_trends_generate_single_article():
         
     except Exception as e:
         app.logger.error(f"Error generating single trend article: {e}", exc_info=True)
-        socketio.emit('trends_articles_update', {
+        progress_bus.emit('trends_articles_update', {
             'stage': 'single_error',
             'message': f'❌ Generation failed: {str(e)}',
             'level': 'error',
@@ -7234,6 +7491,7 @@ def wp_generator_page():
 
 @app.route('/generate-wp-assets', methods=['POST'])
 @login_required
+@traced('generate_wp_assets', root=True)
 def generate_wp_assets():
     start_time = time.time()
     if not request.is_json:
@@ -7250,13 +7508,13 @@ def generate_wp_assets():
     # More permissive ticker pattern that allows common special characters including futures (=)
     valid_ticker_pattern = r'^[A-Z0-9\^.\-$&/=]{1,15}$'
     if not ticker or not re.match(valid_ticker_pattern, ticker):
-        socketio.emit('wp_asset_error', {'message': f"Invalid ticker: '{ticker}'.", 'ticker': ticker}, room=room_id)
+        progress_bus.emit('wp_asset_error', {'message': f"Invalid ticker: '{ticker}'.", 'ticker': ticker}, room=room_id)
         return jsonify({'status': 'error', 'message': f"Invalid ticker symbol: '{ticker}'. Please use standard symbols."}), 400
 
     if not PIPELINE_IMPORTED_SUCCESSFULLY:
         reason = PIPELINE_IMPORT_ERROR or "pipeline not loaded"
         app.logger.error(f"WP asset pipeline unavailable: {reason}")
-        socketio.emit('wp_asset_error', {'message': 'WP Asset service unavailable.', 'ticker': ticker}, room=room_id)
+        progress_bus.emit('wp_asset_error', {'message': 'WP Asset service unavailable.', 'ticker': ticker}, room=room_id)
         return jsonify({'status': 'error', 'message': 'WordPress Asset generation service is temporarily unavailable.'}), 503
 
     try:
@@ -7279,11 +7537,11 @@ def generate_wp_assets():
                 'report_html': html_report_fragment, 'chart_urls': img_urls_dict,
                 'duration': f"{duration:.2f}s"
             }
-            socketio.emit('wp_asset_complete', result_payload, room=room_id)
+            progress_bus.emit('wp_asset_complete', result_payload, room=room_id)
             return jsonify(result_payload)
         else:
             error_detail = f"WP Asset HTML generation failed. Detail: {str(html_report_fragment)[:200]}"
-            socketio.emit('wp_asset_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
+            progress_bus.emit('wp_asset_error', {'message': error_detail, 'ticker': ticker}, room=room_id)
             raise ValueError(error_detail)
 
     except Exception as e:
@@ -7298,7 +7556,7 @@ def generate_wp_assets():
             # For other errors, provide generic message
             display_message = f"A server error occurred while generating assets for {ticker}."
         
-        socketio.emit('wp_asset_error', {'message': display_message, 'ticker': ticker}, room=room_id)
+        progress_bus.emit('wp_asset_error', {'message': display_message, 'ticker': ticker}, room=room_id)
         # Remove flash() to prevent page refresh popups - WebSocket will handle the error display
         return jsonify({'status': 'error', 'message': display_message}), 500
 
@@ -7342,6 +7600,8 @@ def handle_join_task_room(data, *args, **kwargs):
             join_room(task_room_id)
             app.logger.info(f"Client {client_sid} explicitly joined task room: {task_room_id}")
             emit('status', {'message': f'Successfully joined task room {task_room_id}.'}, room=client_sid)
+            # The task may have progressed (or finished) before the page subscribed
+            progress_bus.replay(task_room_id, to=client_sid)
     except Exception as e:
         app.logger.error(f"Error in handle_join_task_room for client {client_sid}: {e}")
 
@@ -7387,6 +7647,8 @@ def handle_join_job_portal_run(data, *args, **kwargs):
             'run_id': run_id,
             'clients_in_room': f'Client {client_sid} joined'
         }, room=room_name, skip_sid=client_sid)
+
+        progress_bus.replay(room_name, to=client_sid)
         
     except Exception as e:
         app.logger.error(f"Error in handle_join_job_portal_run: {e}")
@@ -8172,6 +8434,9 @@ def api_upload_tickers():
                         'created_at': datetime.now(timezone.utc).isoformat()
                     }
                     db.collection('userGeneratedReports').document(report_id).set(report_data)
+                    invalidate_report_history_cache(user_uid)
+                    # Re-uploading a file overwrites the same Storage object
+                    report_content_cache.invalidate(f"storage:{storage_path}")
                     app.logger.info(f"Stored report {report_id} in Firestore for user {user_uid}")
                 except Exception as e:
                     app.logger.error(f"Error storing report in Firestore: {e}")
@@ -89,11 +89,13 @@ News API Routes:
 
 Caching Strategy:
 ----------------
-- **L1 Cache**: In-memory cache for frequently accessed content (5 min TTL)
-- **L2 Cache**: Redis cache for shared content across users (30 min TTL)
-- **L3 Cache**: Disk-based cache for historical news (24 hour TTL)
-- **Smart Invalidation**: Content-aware cache expiration
-- **Preemptive Updates**: Background cache warming for popular content
+- **L1 Cache**: In-process LRU for frequently accessed content (re-checked against L2 every 5 min)
+- **L2 Cache**: SQLite file shared by all workers and restarts (see app/news_cache.py, 24 hour retention)
+- **Stale-While-Revalidate**: Entries older than 1 hour are served immediately while one worker
+  (holding a refresh lease in L2) refetches in the background
+- **Concurrent Fetching**: Alpha Vantage topics, FinnHub categories and company-news symbols are
+  fetched in parallel over a pooled session with a deadline; late sources are dropped (partial results)
+- **Observability**: Hit rates and per-source fetch latency are reported by /api/cache-status
 
 News Sources Integration:
 ------------------------
@@ -123,7 +125,9 @@ Data Processing Pipeline:
 4. **Enhancement**: Add sentiment, categories, and metadata
 5. **Ranking**: Score and prioritize based on relevance
 6. **Caching**: Store processed content for fast retrieval
-7. **Delivery**: Serve personalized content to users
+7. **Indexing**: ``NewsIndex`` keeps corroboration, divergence and storyline
+   aggregates up to date incrementally as items enter/leave the feed
+8. **Delivery**: Serve personalized content to users from memoized ranked views
 
 Usage Examples:
 --------------
@@ -188,11 +192,18 @@ import time
 import json
 import math
 import hashlib
+import bisect
+import threading
 import traceback
 import requests
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request, render_template, current_app, session
 from functools import lru_cache
+from requests.adapters import HTTPAdapter
+
+from app.news_cache import NewsCache, FetchLatencyTracker
 
 market_news_bp = Blueprint('market_news', __name__)
 
@@ -200,14 +211,89 @@ market_news_bp = Blueprint('market_news', __name__)
 NEWS_CACHE_TIMEOUT = 60 * 60  # 1 hour for fresh cache (reduced API calls)
 FALLBACK_CACHE_TIMEOUT = 24 * 60 * 60  # 24 hours - keep cache much longer as fallback
 API_RATE_LIMIT_WINDOW = 60 * 60  # 1 hour - minimum time between API calls for same data
-news_cache = {}
-last_cache_time = {}
-last_api_call_time = {}  # Track when we last made an API call for each cache key
+news_cache = NewsCache(  # L1 in-process LRU + L2 shared SQLite (also holds the shared API-call ledger)
+    l1_ttl=5 * 60, max_age=FALLBACK_CACHE_TIMEOUT,
+    item_count=lambda value: len(value.get("news", [])) if isinstance(value, dict) else 0
+)
+fetch_latency = FetchLatencyTracker()
 last_successful_fetch = {}  # Track when we last successfully fetched from API
-daily_api_calls = 0
-last_api_reset = None
 MAX_DAILY_API_CALLS = 22  # Use 22 out of 25, leaving 3 as buffer
 
+# --- Concurrent fetching ---
+NEWS_FETCH_DEADLINE = 20  # seconds; sources still running after this are dropped (partial results)
+NEWS_REQUEST_TIMEOUT = (5, 15)  # (connect, read) seconds per upstream request
+MAX_COMPANY_NEWS_SYMBOLS = 15
+
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='market-news-fetch')
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='market-news-refresh')
+_inflight_sources = set()  # task labels whose fetch is still running, possibly past an earlier deadline
+_inflight_lock = threading.Lock()
+
+
+def _run_sources_concurrently(tasks, deadline=NEWS_FETCH_DEADLINE):
+    """Run ``{label: (source, fn)}`` on the fetch pool and return results that finished before the deadline.
+
+    Each task runs inside the current app context and its latency is recorded
+    per source. Tasks that fail or miss the deadline are logged and omitted,
+    so callers always get whatever partial results are available.
+
+    A task that misses the deadline cannot be interrupted: it keeps its pool
+    thread until its own HTTP request ends (at most NEWS_REQUEST_TIMEOUT per
+    request). To keep such stragglers from piling up across requests, a label
+    whose previous fetch is still running is skipped rather than submitted
+    again, so at most one thread per label is ever held past a deadline.
+    """
+    if not tasks:
+        return {}
+    app = current_app._get_current_object()
+
+    def wrap(label, source, fn):
+        def run():
+            with app.app_context():
+                start = time.perf_counter()
+                try:
+                    result = fn()
+                    fetch_latency.record(source, time.perf_counter() - start, 'ok')
+                    return result
+                except Exception:
+                    fetch_latency.record(source, time.perf_counter() - start, 'error')
+                    raise
+                finally:
+                    with _inflight_lock:
+                        _inflight_sources.discard(label)
+        return run
+
+    futures = {}
+    for label, (source, fn) in tasks.items():
+        with _inflight_lock:
+            if label in _inflight_sources:
+                current_app.logger.warning(f"News source {label} is still running from an earlier request; skipping it")
+                continue
+            _inflight_sources.add(label)
+        futures[_fetch_executor.submit(wrap(label, source, fn))] = (label, source)
+    if not futures:
+        return {}
+    done, not_done = wait(futures, timeout=deadline)
+
+    results = {}
+    for future in done:
+        label, _source = futures[future]
+        try:
+            results[label] = future.result()
+        except Exception as e:
+            current_app.logger.error(f"News source {label} failed: {e}")
+    for future in not_done:
+        label, source = futures[future]
+        if future.cancel():
+            # Never started, so its wrapper will not clear the in-flight mark
+            with _inflight_lock:
+                _inflight_sources.discard(label)
+        fetch_latency.record(source, float(deadline), 'timeout')
+        current_app.logger.warning(f"News source {label} missed the {deadline}s deadline; continuing with partial results")
+    return results
+
 # --- Scoring and clustering helpers (non-invasive and cache-friendly) ---
 
 SOURCE_QUALITY_SCORES = {
@@ -283,7 +369,9 @@ def _compute_storyline_id(news_item: dict) -> str:
     return f"sl_{key[:10]}"
 
 def _recency_factor(published_at: str) -> float:
-    ts = _parse_datetime_to_epoch(published_at)
+    return _recency_from_epoch(_parse_datetime_to_epoch(published_at))
+
+def _recency_from_epoch(ts: float) -> float:
     if ts <= 0:
         return 0.7  # modest default
     hours = max(0.0, (time.time() - ts) / 3600.0)
@@ -301,84 +389,264 @@ def _sentiment_magnitude(sentiment: str, sentiment_score: float) -> float:
         base = 0.08
     return min(1.0, max(0.0, base))
 
-def _augment_with_global_signals(items: list) -> None:
-    """Compute corroboration, divergence, storyline ids, impact and confidence without user context.
-    Mutates items in-place; safe to call repeatedly.
+def _safe_float(value) -> float:
+    try:
+        return float(value or 0.0)
+    except Exception:
+        return 0.0
+
+def _sentiment_trend(scores: list) -> str:
+    """Storyline sentiment trend from time-ordered scores (very light heuristic)"""
+    if len(scores) >= 6:
+        half = len(scores) // 2
+        prev = sum(scores[0:half]) / half
+        recent = sum(scores[half:]) / max(1, len(scores) - half)
+    elif len(scores) >= 2:
+        prev = scores[0]
+        recent = scores[-1]
+    else:
+        return 'flat'
+    return 'up' if recent > prev + 0.05 else ('down' if recent < prev - 0.05 else 'flat')
+
+# Inline ticker mentions: a watchlist ticker made only of word characters matches
+# fr"\b{ticker}\b" exactly when it is one of the text's \w+ tokens.
+_WORD_TOKEN_RE = re.compile(r"\w+")
+_WORD_TICKER_RE = re.compile(r"^\w+$")
+
+@lru_cache(maxsize=256)
+def _compile_ticker_pattern(tickers: tuple):
+    """One combined word-boundary regex for a set of tickers (longest first)"""
+    alternatives = '|'.join(re.escape(t) for t in sorted(tickers, key=len, reverse=True))
+    return re.compile(fr"\b(?:{alternatives})\b")
+
+class NewsIndex:
+    """Stateful index over processed news items with incrementally maintained signals.
+    
+    Items are keyed by URL (or id). Ingesting or removing items only touches the
+    canonical threads, tickers and storylines those items belong to, so syncing a
+    refreshed feed costs O(changed items) rather than a full rescore. Signal fields
+    (corroboration, divergence, storyline trend, impact, confidence) are written on
+    the item dicts exactly as _augment_with_global_signals always did.
+    
+    Ranked views (category/sort and per-watchlist "For You") are memoized per index
+    version, so repeated requests are served without rescoring. Time-dependent
+    signals (recency-weighted impact, the 48h divergence window) are recomputed for
+    every item once per RESCORE_INTERVAL, which also bumps the version.
     """
-    if not items:
-        return
-    # Grouping
-    by_canonical = {}
-    by_ticker = {}
-    for it in items:
-        related = it.get('related_stocks') or []
-        can_key = _canonical_key(it.get('title',''), related)
-        it.setdefault('canonical_key', can_key)
-        by_canonical.setdefault(can_key, []).append(it)
-        for tk in related:
-            if tk:
-                by_ticker.setdefault(tk, []).append(it)
-
-    # Corroboration counts per canonical thread
-    for group in by_canonical.values():
-        count = len(group)
-        for it in group:
-            it['corroboration_count'] = count
-
-    # Divergence detection per ticker within ~48h window
-    for tk, arts in by_ticker.items():
-        pos = False
-        neg = False
-        now = time.time()
-        recent = []
-        for it in arts:
-            ts = _parse_datetime_to_epoch(it.get('published_at',''))
-            if ts == 0.0 or (now - ts) <= 48*3600:
-                recent.append(it)
-        for it in recent:
-            sent = (it.get('sentiment') or 'neutral').lower()
-            if sent == 'positive':
-                pos = True
-            elif sent == 'negative':
-                neg = True
-        divergence = bool(pos and neg)
-        if divergence:
-            for it in recent:
+    
+    DIVERGENCE_WINDOW = 48 * 3600
+    RESCORE_INTERVAL = 15 * 60
+    MAX_CACHED_VIEWS = 128
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._items = {}          # item key -> item dict
+        self._epochs = {}         # item key -> published epoch (parsed once)
+        self._scores = {}         # item key -> sentiment score
+        self._canonical = {}      # canonical key -> set of item keys
+        self._tickers = {}        # ticker -> sorted [(epoch, item key)]
+        self._storylines = {}     # storyline id -> sorted [(epoch, item key)]
+        self._tokens = {}         # item key -> word tokens of title + summary
+        self._mentions = {}       # watched ticker -> set of item keys mentioning it inline
+        self._divergent = set()   # tickers with both positive and negative recent news
+        self._category_counts = Counter()
+        self._sentiment_counts = Counter()
+        self._views = OrderedDict()
+        self._synced_list = None
+        self._synced_len = 0
+        self._clock = self._clock_bucket()
+        self.version = 0
+    
+    @staticmethod
+    def item_key(item: dict) -> str:
+        return item.get('url') or item.get('id') or _canonical_key(item.get('title', ''), item.get('related_stocks') or [])
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def epoch(self, item: dict) -> float:
+        ts = self._epochs.get(self.item_key(item))
+        return ts if ts is not None else _parse_datetime_to_epoch(item.get('published_at', ''))
+    
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    
+    def sync(self, items: list):
+        """Make the index reflect exactly ``items`` (diffed by key; the same list object is a no-op)"""
+        with self._lock:
+            self._advance_clock()
+            if items is self._synced_list and len(items) == self._synced_len:
+                return self
+            incoming = {}
+            for it in items:
+                if isinstance(it, dict):
+                    incoming.setdefault(self.item_key(it), it)
+            stale = [key for key in self._items if key not in incoming]
+            fresh = [it for key, it in incoming.items() if key not in self._items]
+            if stale:
+                self.remove(stale)
+            if fresh:
+                self.ingest(fresh)
+            self._synced_list = items
+            self._synced_len = len(items)
+            return self
+    
+    def ingest(self, items: list) -> None:
+        """Add new items and refresh signals for the threads/tickers/storylines they touch"""
+        with self._lock:
+            touched_canonical, touched_tickers, touched_storylines = set(), set(), set()
+            for it in items:
+                key = self.item_key(it)
+                if key in self._items:
+                    continue
+                ts = _parse_datetime_to_epoch(it.get('published_at', ''))
+                related = it.get('related_stocks') or []
+                can_key = it.setdefault('canonical_key', _canonical_key(it.get('title', ''), related))
+                sid = _compute_storyline_id(it)
+                it['storyline_id'] = sid
+                
+                self._items[key] = it
+                self._epochs[key] = ts
+                self._scores[key] = _safe_float(it.get('sentiment_score'))
+                self._canonical.setdefault(can_key, set()).add(key)
+                touched_canonical.add(can_key)
+                for tk in {t.upper() for t in related if t}:
+                    bisect.insort(self._tickers.setdefault(tk, []), (ts, key))
+                    touched_tickers.add(tk)
+                bisect.insort(self._storylines.setdefault(sid, []), (ts, key))
+                touched_storylines.add(sid)
+                tokens = self._tokens[key] = self._word_tokens(it)
+                for tk in tokens.intersection(self._mentions):
+                    self._mentions[tk].add(key)
+                self._category_counts[it.get('category', 'market')] += 1
+                self._sentiment_counts[it.get('sentiment', 'neutral')] += 1
+            self._refresh(touched_canonical, touched_tickers, touched_storylines)
+    
+    def remove(self, keys: list) -> None:
+        """Drop items (e.g. aged out of the feed) and refresh the aggregates they belonged to"""
+        with self._lock:
+            touched_canonical, touched_tickers, touched_storylines = set(), set(), set()
+            for key in keys:
+                it = self._items.pop(key, None)
+                if it is None:
+                    continue
+                ts = self._epochs.pop(key)
+                self._scores.pop(key, None)
+                can_key = it.get('canonical_key')
+                members = self._canonical.get(can_key)
+                if members is not None:
+                    members.discard(key)
+                    if not members:
+                        del self._canonical[can_key]
+                    touched_canonical.add(can_key)
+                for tk in {t.upper() for t in (it.get('related_stocks') or []) if t}:
+                    self._remove_sorted(self._tickers, tk, (ts, key))
+                    touched_tickers.add(tk)
+                self._remove_sorted(self._storylines, it.get('storyline_id'), (ts, key))
+                touched_storylines.add(it.get('storyline_id'))
+                for tk in self._tokens.pop(key, frozenset()).intersection(self._mentions):
+                    self._mentions[tk].discard(key)
+                self._category_counts[it.get('category', 'market')] -= 1
+                self._sentiment_counts[it.get('sentiment', 'neutral')] -= 1
+            self._refresh(touched_canonical, touched_tickers, touched_storylines)
+    
+    @staticmethod
+    def _remove_sorted(buckets: dict, bucket_key, entry) -> None:
+        entries = buckets.get(bucket_key)
+        if not entries:
+            return
+        pos = bisect.bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            entries.pop(pos)
+        if not entries:
+            del buckets[bucket_key]
+    
+    @staticmethod
+    def _word_tokens(item: dict) -> frozenset:
+        return frozenset(_WORD_TOKEN_RE.findall(f"{item.get('title','')} {item.get('summary','')}"))
+    
+    def _watch(self, tickers) -> None:
+        """Start indexing inline mentions of word tickers (e.g. from a watchlist), backfilling current items"""
+        for tk in tickers:
+            if tk not in self._mentions:
+                self._mentions[tk] = {key for key, tokens in self._tokens.items() if tk in tokens}
+    
+    @classmethod
+    def _clock_bucket(cls) -> int:
+        return int(time.time() // cls.RESCORE_INTERVAL)
+    
+    def _advance_clock(self) -> None:
+        """Re-apply recency decay and the sliding divergence window once per RESCORE_INTERVAL"""
+        bucket = self._clock_bucket()
+        if bucket == self._clock:
+            return
+        self._clock = bucket
+        for key, it in self._items.items():
+            self._score_item(key, it)
+        self._refresh_divergence(self._tickers)
+        self.version += 1
+        self._views.clear()
+    
+    def _refresh(self, touched_canonical, touched_tickers, touched_storylines) -> None:
+        if not (touched_canonical or touched_tickers or touched_storylines):
+            return
+        
+        # Corroboration counts per canonical thread, then impact/confidence of its members
+        for can_key in touched_canonical:
+            members = self._canonical.get(can_key, ())
+            count = len(members)
+            for key in members:
+                it = self._items[key]
+                it['corroboration_count'] = count
+                self._score_item(key, it)
+        
+        self._refresh_divergence(touched_tickers)
+        
+        # Storyline trend from time-ordered sentiment scores
+        for sid in touched_storylines:
+            entries = self._storylines.get(sid)
+            if not entries:
+                continue
+            trend = _sentiment_trend([self._scores[key] for _, key in entries])
+            for _, key in entries:
+                self._items[key]['storyline_sentiment_trend'] = trend
+        
+        self.version += 1
+        self._views.clear()
+    
+    def _refresh_divergence(self, tickers) -> None:
+        """Recompute divergence for ``tickers`` (within ~48h window) and re-flag their items"""
+        cutoff = time.time() - self.DIVERGENCE_WINDOW
+        affected = set()
+        for tk in tickers:
+            entries = self._tickers.get(tk)
+            if not entries:
+                self._divergent.discard(tk)
+                continue
+            undated_end = bisect.bisect_right(entries, (0.0, '\uffff'))
+            recent_keys = [key for _, key in entries[:undated_end]]
+            recent_keys += [key for _, key in entries[bisect.bisect_left(entries, (cutoff, '')):]]
+            sentiments = {(self._items[key].get('sentiment') or 'neutral').lower() for key in recent_keys}
+            if 'positive' in sentiments and 'negative' in sentiments:
+                self._divergent.add(tk)
+            else:
+                self._divergent.discard(tk)
+            affected.update(key for _, key in entries)
+        
+        # An item is flagged while it is recent and any of its tickers diverges
+        for key in affected:
+            it = self._items[key]
+            ts = self._epochs[key]
+            recent = ts <= 0.0 or ts >= cutoff
+            if recent and any(t.upper() in self._divergent for t in (it.get('related_stocks') or []) if t):
                 it['divergence_flag'] = True
-
-    # Storyline id and trend (very light heuristic)
-    storyline_groups = {}
-    for it in items:
-        sid = _compute_storyline_id(it)
-        it['storyline_id'] = sid
-        storyline_groups.setdefault(sid, []).append(it)
-
-    for sid, group in storyline_groups.items():
-        # Sort by time asc
-        group_sorted = sorted(group, key=lambda x: _parse_datetime_to_epoch(x.get('published_at','')))
-        scores = []
-        for it in group_sorted:
-            try:
-                scores.append(float(it.get('sentiment_score') or 0.0))
-            except Exception:
-                scores.append(0.0)
-        if len(scores) >= 6:
-            prev = sum(scores[0:len(scores)//2]) / (len(scores)//2)
-            recent = sum(scores[len(scores)//2:]) / max(1, len(scores) - len(scores)//2)
-            trend = 'up' if recent > prev + 0.05 else ('down' if recent < prev - 0.05 else 'flat')
-        elif len(scores) >= 2:
-            prev = scores[0]
-            recent = scores[-1]
-            trend = 'up' if recent > prev + 0.05 else ('down' if recent < prev - 0.05 else 'flat')
-        else:
-            trend = 'flat'
-        for it in group:
-            it['storyline_sentiment_trend'] = trend
-
-    # Impact and confidence
-    for it in items:
+            else:
+                it.pop('divergence_flag', None)
+    
+    def _score_item(self, key: str, it: dict) -> None:
         sent_mag = _sentiment_magnitude(it.get('sentiment'), it.get('sentiment_score'))
-        rec = _recency_factor(it.get('published_at'))
+        rec = _recency_from_epoch(self._epochs[key])
         qual = _source_quality(it.get('source'))
         corroboration = float(it.get('corroboration_count', 1))
         # impact: core signal * recency * quality * log(1+ corroboration)
@@ -388,47 +656,166 @@ def _augment_with_global_signals(items: list) -> None:
         it['source_quality'] = round(qual, 3)
         it['impact_score'] = round(impact, 4)
         it['confidence_score'] = round(confidence, 3)
+    
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+    
+    def _cached_view(self, view_key, build):
+        with self._lock:
+            self._advance_clock()
+            view = self._views.get(view_key)
+            if view is None:
+                view = build()
+                self._views[view_key] = view
+                while len(self._views) > self.MAX_CACHED_VIEWS:
+                    self._views.popitem(last=False)
+            else:
+                self._views.move_to_end(view_key)
+            return view
+    
+    def category_counts(self) -> dict:
+        with self._lock:
+            counts = {'all': len(self._items)}
+            for cat in ('market', 'economy', 'crypto', 'forex', 'earnings'):
+                counts[cat] = self._category_counts.get(cat, 0)
+            return counts
+    
+    def sentiment_counts(self) -> dict:
+        with self._lock:
+            return {sent: self._sentiment_counts.get(sent, 0) for sent in ('positive', 'neutral', 'negative')}
+    
+    def sort_items(self, items: list, sort_by: str) -> list:
+        """Sort a list of items using the index's pre-parsed timestamps"""
+        epochs = self._epochs
+        item_key = self.item_key
+        def ts(x):
+            value = epochs.get(item_key(x))
+            return value if value is not None else _parse_datetime_to_epoch(x.get('published_at', ''))
+        if sort_by == 'impact':
+            return sorted(items, key=lambda x: (x.get('impact_score', 0), ts(x)), reverse=True)
+        if sort_by == 'relevance':
+            return sorted(items, key=lambda x: (x.get('relevance_score', 0), ts(x)), reverse=True)
+        if sort_by == 'sentiment':
+            sentiment_order = {'positive': 0, 'neutral': 1, 'negative': 2}
+            return sorted(items, key=lambda x: (sentiment_order.get(x.get('sentiment','neutral'), 1), -ts(x)))
+        if sort_by == 'oldest':
+            return sorted(items, key=lambda x: x.get('published_at',''))
+        if sort_by == 'recent_impact':
+            return sorted(items, key=lambda x: (ts(x), x.get('impact_score', 0)), reverse=True)
+        return sorted(items, key=lambda x: x.get('published_at',''), reverse=True)
+    
+    def view(self, category: str = 'all', sort_by: str = 'newest') -> list:
+        """Items in a category (or all), sorted; memoized until the index changes"""
+        def build():
+            items = list(self._items.values())
+            if category != 'all':
+                items = [n for n in items if n.get('category') == category]
+            return self.sort_items(items, sort_by)
+        return self._cached_view(('category', category, sort_by), build)
+    
+    def for_watchlist(self, watchlist, sort_by: str = None) -> list:
+        """Items relevant to a watchlist with ``relevance_score`` set, most relevant first
+        (or by ``sort_by``). Returns per-view copies so users never see each other's relevance.
+        """
+        wl = tuple(sorted({t.strip().upper() for t in watchlist if t and t.strip()}))
+        if not wl:
+            return []
+        
+        def build():
+            # Related-stock overlap via the per-ticker index
+            overlap = Counter()
+            for tk in wl:
+                for _, key in self._tickers.get(tk, ()):
+                    overlap[key] += 1
+            # Inline mentions via the token index; the combined regex only for non-word tickers
+            inline = set()
+            irregular = tuple(tk for tk in wl if not _WORD_TICKER_RE.match(tk))
+            regular = [tk for tk in wl if tk not in irregular]
+            self._watch(regular)
+            for tk in regular:
+                inline |= self._mentions[tk]
+            if irregular:
+                pattern = _compile_ticker_pattern(irregular)
+                for key, it in self._items.items():
+                    if key not in inline and pattern.search(f"{it.get('title','')} {it.get('summary','')}"):
+                        inline.add(key)
+            
+            ranked = []
+            for key, it in self._items.items():
+                score = _relevance_score(overlap.get(key, 0), key in inline, it.get('impact_score'))
+                if score >= 0.1:
+                    view_item = dict(it)
+                    view_item['relevance_score'] = score
+                    ranked.append(view_item)
+            ranked = self.sort_items(ranked, 'relevance')
+            # If still too few, prefer recency among the matches
+            if len(ranked) < 12:
+                ranked = self.sort_items(ranked, 'recent_impact')
+            return self.sort_items(ranked, sort_by) if sort_by else ranked
+        return self._cached_view(('for_you', wl, sort_by), build)
+    
+    def storylines(self, limit: int = 100) -> tuple:
+        """Storyline clusters (newest first) and the total number of storylines"""
+        def build():
+            out = []
+            for sid, entries in self._storylines.items():
+                members = [self._items[key] for _, key in entries]
+                latest = members[-1]
+                tickers = set()
+                for it in members:
+                    tickers.update(it.get('related_stocks') or [])
+                out.append({
+                    'storyline_id': sid,
+                    'count': len(members),
+                    'latest_title': latest.get('title', ''),
+                    'latest_published_at': latest.get('published_at', ''),
+                    'sentiment_trend': latest.get('storyline_sentiment_trend', 'flat'),
+                    'tickers': sorted(tickers),
+                    'impact_max': max(float(it.get('impact_score', 0) or 0) for it in members),
+                    'divergence': any(it.get('divergence_flag') for it in members),
+                    '_latest_epoch': entries[-1][0],
+                })
+            out.sort(key=lambda x: (x['_latest_epoch'], x['impact_max']), reverse=True)
+            for grp in out:
+                grp.pop('_latest_epoch')
+            return out
+        clusters = self._cached_view(('storylines',), build)
+        return clusters[:limit], len(clusters)
 
-def _compute_relevance_for_watchlist(items: list, watchlist: set) -> None:
+def _augment_with_global_signals(items: list) -> None:
+    """Compute corroboration, divergence, storyline ids, impact and confidence without user context.
+    Mutates items in-place; safe to call repeatedly.
+    """
     if not items:
         return
-    wl = {t.strip().upper() for t in watchlist if t.strip()}
-    if not wl:
-        return
-    for it in items:
-        related = {t.upper() for t in (it.get('related_stocks') or [])}
-        overlap = len(wl.intersection(related))
-        text = f"{it.get('title','')} {it.get('summary','')}"
-        # Light extra match for inline mentions
-        inline = sum(1 for tk in wl if re.search(fr"\b{re.escape(tk)}\b", text))
-        score = 0.0
-        if overlap > 0:
-            score += 0.7 + 0.2 * min(2, overlap-1)
-        if inline > 0 and overlap == 0:
-            score += 0.4
-        # blend with impact for better ordering
-        score += 0.5 * float(it.get('impact_score') or 0.0)
-        it['relevance_score'] = round(min(1.0, score), 4)
-
-def reset_daily_api_counter():
-    """Reset daily API call counter if it's a new day"""
-    global daily_api_calls, last_api_reset
-    current_date = datetime.now().date()
-    
-    if last_api_reset is None or last_api_reset != current_date:
-        daily_api_calls = 0
-        last_api_reset = current_date
-        current_app.logger.info(f"Daily API counter reset for {current_date}")
+    NewsIndex().ingest(items)
+
+def _relevance_score(overlap: int, inline: bool, impact_score) -> float:
+    score = 0.0
+    if overlap > 0:
+        score += 0.7 + 0.2 * min(2, overlap-1)
+    if inline and overlap == 0:
+        score += 0.4
+    # blend with impact for better ordering
+    score += 0.5 * float(impact_score or 0.0)
+    return round(min(1.0, score), 4)
+
+# Process-wide index over the cached 'news-all' feed
+news_index = NewsIndex()
+
+def get_daily_api_calls():
+    """API calls made today by every worker (kept per day in the shared cache file)"""
+    return news_cache.api_calls_today()
 
 def can_make_api_call():
     """Simple API call check for backward compatibility"""
     return can_make_api_call_with_strategy()
 
-def increment_api_call_counter():
-    """Increment the daily API call counter"""
-    global daily_api_calls
-    daily_api_calls += 1
-    current_app.logger.info(f"API calls today: {daily_api_calls}/{MAX_DAILY_API_CALLS}")
+def increment_api_call_counter(cache_key=None):
+    """Increment the daily API call counter (and the last call time of cache_key)"""
+    calls = news_cache.record_api_call(cache_key)
+    current_app.logger.info(f"API calls today: {calls}/{MAX_DAILY_API_CALLS}")
 
 def can_make_api_call_for_cache_key(cache_key):
     """Check if we can make an API call for a specific cache key (1-hour rate limit)"""
@@ -438,8 +825,9 @@ def can_make_api_call_for_cache_key(cache_key):
     current_time = time.time()
     
     # Check if we've made an API call for this cache key within the last hour
-    if cache_key in last_api_call_time:
-        time_since_last_call = current_time - last_api_call_time[cache_key]
+    last_call = news_cache.last_api_call(cache_key)
+    if last_call is not None:
+        time_since_last_call = current_time - last_call
         if time_since_last_call < API_RATE_LIMIT_WINDOW:
             remaining_time = API_RATE_LIMIT_WINDOW - time_since_last_call
             current_app.logger.info(f"API rate limit active for {cache_key}. {remaining_time/60:.1f} minutes remaining")
@@ -449,15 +837,15 @@ def can_make_api_call_for_cache_key(cache_key):
 
 def mark_api_call_for_cache_key(cache_key):
     """Mark that we made an API call for a specific cache key"""
-    last_api_call_time[cache_key] = time.time()
-    increment_api_call_counter()
+    increment_api_call_counter(cache_key)
 
 def get_next_api_call_time(cache_key):
     """Get when the next API call is allowed for a cache key"""
-    if cache_key not in last_api_call_time:
+    last_call = news_cache.last_api_call(cache_key)
+    if last_call is None:
         return "now"
     
-    next_allowed = last_api_call_time[cache_key] + API_RATE_LIMIT_WINDOW
+    next_allowed = last_call + API_RATE_LIMIT_WINDOW
     current_time = time.time()
     
     if next_allowed <= current_time:
@@ -468,11 +856,12 @@ def get_next_api_call_time(cache_key):
 
 def should_attempt_background_refresh(cache_key):
     """Check if we should attempt a refresh (now with 1-hour rate limiting)"""
-    if cache_key not in last_cache_time:
+    stored_at = news_cache.stored_at(cache_key)
+    if stored_at is None:
         return True
     
     current_time = time.time()
-    cache_age = current_time - last_cache_time[cache_key]
+    cache_age = current_time - stored_at
     
     # Only attempt refresh if cache is older than 1 hour AND we can make API calls
     if cache_age > NEWS_CACHE_TIMEOUT:
@@ -482,9 +871,9 @@ def should_attempt_background_refresh(cache_key):
 
 def can_make_api_call_with_strategy():
     """Enhanced API call check with intelligent distribution strategy"""
-    reset_daily_api_counter()
+    calls_used = get_daily_api_calls()
     
-    if daily_api_calls >= MAX_DAILY_API_CALLS:
+    if calls_used >= MAX_DAILY_API_CALLS:
         return False
     
     # Calculate how many hours left in the day
@@ -492,7 +881,7 @@ def can_make_api_call_with_strategy():
     hours_remaining = 24 - current_hour
     
     # Reserve some calls for the remaining hours
-    calls_remaining = MAX_DAILY_API_CALLS - daily_api_calls
+    calls_remaining = MAX_DAILY_API_CALLS - calls_used
     
     # If we have less than 2 hours left, use remaining calls more freely
     if hours_remaining <= 2:
@@ -514,33 +903,87 @@ def is_cache_valid(cache_key, timeout=None):
     if timeout is None:
         timeout = NEWS_CACHE_TIMEOUT
     
-    if cache_key not in news_cache or cache_key not in last_cache_time:
+    stored_at = news_cache.stored_at(cache_key)
+    if stored_at is None:
         return False
     
     current_time = time.time()
-    return (current_time - last_cache_time[cache_key]) < timeout
+    return (current_time - stored_at) < timeout
 
 def get_cache_age(cache_key):
     """Get cache age in minutes"""
-    if cache_key not in last_cache_time:
+    stored_at = news_cache.stored_at(cache_key)
+    if stored_at is None:
         return float('inf')
     
     current_time = time.time()
-    age_seconds = current_time - last_cache_time[cache_key]
+    age_seconds = current_time - stored_at
     return age_seconds / 60  # Return age in minutes
 
-def fetch_diverse_news_data(api_key, cache_key):
-    """Fetch diverse news data with intelligent API call distribution - optimized for market news"""
-    base_url = "https://www.alphavantage.co/query"
-    all_news = []
+def _fetch_alpha_vantage_feed(api_key, query_params):
+    """Single Alpha Vantage NEWS_SENTIMENT call; returns the raw feed list"""
+    params = {
+        "function": "NEWS_SENTIMENT",
+        "apikey": api_key,
+        **query_params
+    }
+    response = _http_session.get("https://www.alphavantage.co/query", params=params, timeout=NEWS_REQUEST_TIMEOUT)
+    
+    if response.status_code == 429:
+        current_app.logger.warning("Rate limit hit by Alpha Vantage")
+        return []
+    if response.status_code != 200:
+        current_app.logger.error(f"Alpha Vantage call {query_params} failed with status {response.status_code}")
+        return []
+    try:
+        data = response.json()
+    except json.JSONDecodeError:
+        current_app.logger.error(f"Failed to parse JSON response for {query_params}: {response.text[:200]}")
+        return []
+    if isinstance(data, dict) and "feed" in data:
+        current_app.logger.info(f"Retrieved {len(data['feed'])} articles from Alpha Vantage {query_params}")
+        return data["feed"]
+    current_app.logger.warning(f"Invalid response structure for {query_params}: {data}")
+    return []
+
+def _finnhub_as_alpha_vantage(article):
+    """Transform a processed FinnHub article to Alpha Vantage feed format for consistency"""
+    return {
+        "title": article["title"],
+        "summary": article["summary"],
+        "source": article["source"],
+        "url": article["url"],
+        "time_published": article["published_at"],
+        "banner_image": article["image"],
+        "overall_sentiment_label": article["sentiment"],
+        "overall_sentiment_score": article["sentiment_score"],
+        "topics": [{"topic": topic} for topic in article["topics"]],
+        "id": article["id"]
+    }
+
+def _session_watchlist():
+    """Watchlist stored in the session, or [] outside a request"""
+    try:
+        if isinstance(session.get('watchlist'), list):
+            return [str(t).strip().upper() for t in session.get('watchlist') if str(t).strip()]
+    except Exception:
+        pass
+    return []
+
+def fetch_diverse_news_data(api_key, cache_key, watchlist=None):
+    """Fetch diverse news data with intelligent API call distribution - optimized for market news
     
+    Alpha Vantage topics, FinnHub categories and FinnHub company-news symbols are
+    fetched concurrently over the pooled session; anything still running at
+    NEWS_FETCH_DEADLINE is dropped and the partial result set is cached.
+    """
     # STRATEGIC: Make 1-2 well-targeted API calls to get 100+ market-focused articles
     topic_queries = [
         {"topics": "financial_markets", "limit": 100}  # Primary market-focused call with max limit
     ]
     
     # Only make second call if we have sufficient API budget
-    remaining_calls = MAX_DAILY_API_CALLS - daily_api_calls
+    remaining_calls = MAX_DAILY_API_CALLS - get_daily_api_calls()
     current_hour = datetime.now().hour
     hours_left = 24 - current_hour
     
@@ -552,90 +995,54 @@ def fetch_diverse_news_data(api_key, cache_key):
     
     current_app.logger.info(f"Making {len(topic_queries)} strategic market-focused API calls to fetch 100+ articles")
     
+    tasks = {}
     for i, query_params in enumerate(topic_queries):
-        # Double-check API limit before each call
+        # Budget is checked and counted up front, on the request thread
         if not can_make_api_call_with_strategy():
             current_app.logger.warning(f"API limit reached during fetch at call {i+1}, stopping additional calls")
             break
-            
-        params = {
-            "function": "NEWS_SENTIMENT",
-            "apikey": api_key,
-            **query_params
-        }
-        
-        try:
-            current_app.logger.info(f"API call {daily_api_calls + 1}/{MAX_DAILY_API_CALLS} with params: {query_params}")
-            increment_api_call_counter()  # Track the call
-            
-            response = requests.get(base_url, params=params, timeout=30)
-            
-            if response.status_code == 429:
-                current_app.logger.warning("Rate limit hit by Alpha Vantage")
-                break
-                
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    if isinstance(data, dict) and "feed" in data:
-                        new_articles = data["feed"]
-                        all_news.extend(new_articles)
-                        current_app.logger.info(f"Retrieved {len(new_articles)} articles from Alpha Vantage call {i+1}")
-                    else:
-                        current_app.logger.warning(f"Invalid response structure from call {i+1}: {data}")
-                except json.JSONDecodeError:
-                    current_app.logger.error(f"Failed to parse JSON response from call {i+1}: {response.text[:200]}")
-            else:
-                current_app.logger.error(f"API call {i+1} failed with status {response.status_code}")
-                
-        except Exception as e:
-            current_app.logger.error(f"Error in API call {i+1}: {str(e)}")
-            continue
-    
-    # Fetch FinnHub news to supplement Alpha Vantage data
-    current_app.logger.info("Fetching supplementary news from FinnHub")
-    try:
-        finnhub_news = fetch_all_finnhub_news()
-        if finnhub_news:
-            # Process FinnHub news to match our format
-            processed_finnhub = process_finnhub_news(finnhub_news)
-            current_app.logger.info(f"Adding {len(processed_finnhub)} processed FinnHub articles")
-            
-            # Convert to Alpha Vantage format for consistency
-            for article in processed_finnhub:
-                # Transform to Alpha Vantage feed format
-                av_format_article = {
-                    "title": article["title"],
-                    "summary": article["summary"],
-                    "source": article["source"],
-                    "url": article["url"],
-                    "time_published": article["published_at"],
-                    "banner_image": article["image"],
-                    "overall_sentiment_label": article["sentiment"],
-                    "overall_sentiment_score": article["sentiment_score"],
-                    "topics": [{"topic": topic} for topic in article["topics"]],
-                    "id": article["id"]
-                }
-                all_news.append(av_format_article)
-            
-            current_app.logger.info(f"Total articles after adding FinnHub: {len(all_news)}")
-
-        # If we have a watchlist in session, fetch company-news for freshness
-        wl = []
-        try:
-            if isinstance(session.get('watchlist'), list):
-                wl = [str(t).strip().upper() for t in session.get('watchlist') if str(t).strip()]
-        except Exception:
-            wl = []
+        current_app.logger.info(f"API call {get_daily_api_calls() + 1}/{MAX_DAILY_API_CALLS} with params: {query_params}")
+        increment_api_call_counter()  # Track the call
+        tasks[f"alpha_vantage:{query_params['topics']}"] = (
+            'alpha_vantage', lambda q=query_params: _fetch_alpha_vantage_feed(api_key, q)
+        )
+    
+    # FinnHub news supplements Alpha Vantage data
+    finnhub_key = get_finnhub_api_key()
+    if finnhub_key:
+        tasks.update(_finnhub_category_tasks(finnhub_key))
+        # If we have a watchlist, fetch company-news for freshness
+        wl = watchlist if watchlist is not None else _session_watchlist()
         if wl:
             current_app.logger.info(f"Fetching FinnHub company-news for watchlist: {wl[:10]}")
-            fresh_company = fetch_finnhub_company_news(wl, days_back=2)
-            if fresh_company:
-                all_news.extend(fresh_company)
-                current_app.logger.info(f"Added {len(fresh_company)} FinnHub company-news items")
-    except Exception as e:
-        current_app.logger.error(f"Error fetching FinnHub news: {str(e)}")
-        # Continue with Alpha Vantage data only
+            tasks.update(_finnhub_company_tasks(finnhub_key, wl, days_back=2))
+    else:
+        current_app.logger.warning("FinnHub API key not available")
+    
+    results = _run_sources_concurrently(tasks)
+    
+    all_news = []
+    finnhub_raw = []
+    company_news = []
+    for label, result in results.items():
+        if not result:
+            continue
+        if label.startswith('alpha_vantage:'):
+            all_news.extend(result)
+        elif label.startswith('finnhub_company:'):
+            company_news.extend(result)
+        else:
+            finnhub_raw.extend(result)
+    
+    if finnhub_raw:
+        # Process FinnHub news to match our format
+        processed_finnhub = process_finnhub_news(finnhub_raw)
+        current_app.logger.info(f"Adding {len(processed_finnhub)} processed FinnHub articles")
+        all_news.extend(_finnhub_as_alpha_vantage(article) for article in processed_finnhub)
+        current_app.logger.info(f"Total articles after adding FinnHub: {len(all_news)}")
+    if company_news:
+        all_news.extend(company_news)
+        current_app.logger.info(f"Added {len(company_news)} FinnHub company-news items")
     
     # Remove duplicates based on URL
     seen_urls = set()
@@ -654,13 +1061,14 @@ def fetch_diverse_news_data(api_key, cache_key):
     data_wrapper = {"feed": unique_news}
     processed_data = process_alpha_vantage_news(data_wrapper)
     
-    # Enhanced caching: Cache for 1 hour for fresh data
-    news_cache[cache_key] = processed_data
-    last_cache_time[cache_key] = time.time()
-    processed_data["api_calls_used"] = daily_api_calls
+    processed_data["api_calls_used"] = get_daily_api_calls()
     processed_data["cache_timeout_minutes"] = NEWS_CACHE_TIMEOUT / 60
     processed_data["fresh_articles_count"] = len(unique_news)
     processed_data["data_sources"] = ["alpha_vantage", "finnhub"]
+    processed_data["partial_sources"] = sorted(set(tasks) - set(results))
+    
+    # Enhanced caching: Cache for 1 hour for fresh data (shared with other workers)
+    news_cache.put(cache_key, processed_data)
     
     current_app.logger.info(f"Cached {len(processed_data.get('news', []))} articles for {NEWS_CACHE_TIMEOUT/60} minutes")
     return processed_data, 200
@@ -748,7 +1156,7 @@ def fetch_finnhub_news(api_key, category='general', min_id=0):
     
     try:
         current_app.logger.info(f"Making FinnHub API call for category: {category}")
-        response = requests.get(base_url, params=params, timeout=30)
+        response = _http_session.get(base_url, params=params, timeout=NEWS_REQUEST_TIMEOUT)
         
         if response.status_code == 200:
             data = response.json()
@@ -764,83 +1172,93 @@ def fetch_finnhub_news(api_key, category='general', min_id=0):
         current_app.logger.error(f"Error fetching FinnHub news: {str(e)}")
         return []
 
+def _finnhub_category_tasks(api_key):
+    """Concurrent fetch tasks for the FinnHub news categories"""
+    # FinnHub categories: general, forex, crypto, merger
+    categories = ['general', 'forex', 'crypto', 'merger']
+    return {
+        f"finnhub:{category}": ('finnhub', lambda c=category: fetch_finnhub_news(api_key, c))
+        for category in categories
+    }
+
 def fetch_all_finnhub_news():
-    """Fetch news from all FinnHub categories"""
+    """Fetch news from all FinnHub categories concurrently"""
     api_key = get_finnhub_api_key()
     if not api_key:
         current_app.logger.warning("FinnHub API key not available")
         return []
     
     all_news = []
-    # FinnHub categories: general, forex, crypto, merger
-    categories = ['general', 'forex', 'crypto', 'merger']
-    
-    for category in categories:
-        try:
-            news_data = fetch_finnhub_news(api_key, category)
-            if news_data:
-                all_news.extend(news_data)
-                current_app.logger.info(f"Added {len(news_data)} articles from FinnHub category: {category}")
-                # Small delay to respect rate limits
-                time.sleep(0.1)
-        except Exception as e:
-            current_app.logger.error(f"Error fetching FinnHub {category} news: {str(e)}")
-            continue
+    for label, news_data in _run_sources_concurrently(_finnhub_category_tasks(api_key)).items():
+        if news_data:
+            all_news.extend(news_data)
+            current_app.logger.info(f"Added {len(news_data)} articles from FinnHub {label}")
     
     current_app.logger.info(f"Total FinnHub articles collected: {len(all_news)}")
     return all_news
 
+def _fetch_finnhub_company_news_for_symbol(api_key, sym, start_date, end_date):
+    """Company-news for one symbol, converted to our news item format"""
+    params = {
+        'symbol': sym,
+        'from': start_date.isoformat(),
+        'to': end_date.isoformat(),
+        'token': api_key
+    }
+    out = []
+    resp = _http_session.get("https://finnhub.io/api/v1/company-news", params=params, timeout=NEWS_REQUEST_TIMEOUT)
+    if resp.status_code == 429:
+        current_app.logger.warning(f"FinnHub company-news rate limit hit for {sym}")
+        return out
+    if resp.status_code != 200:
+        current_app.logger.warning(f"FinnHub company-news error for {sym}: status {resp.status_code}")
+        return out
+    for item in resp.json() or []:
+        try:
+            ts = item.get('datetime') or item.get('time') or 0
+            published_at = ''
+            if ts:
+                published_at = datetime.fromtimestamp(int(ts)).strftime("%Y%m%dT%H%M%S")
+            out.append({
+                "id": f"finnhub_company_{sym}_{item.get('id', item.get('url',''))}",
+                "title": item.get('headline') or item.get('title',''),
+                "summary": item.get('summary',''),
+                "source": f"{item.get('source','FinnHub')} (FinnHub)",
+                "url": item.get('url',''),
+                "published_at": published_at,
+                "category": 'market',
+                "topics": ["market"],
+                "image": item.get('image',''),
+                "sentiment": 'neutral',
+                "sentiment_score": 0,
+                "related_stocks": [sym],
+                "data_source": "finnhub_company"
+            })
+        except Exception:
+            continue
+    return out
+
+def _finnhub_company_tasks(api_key, symbols, days_back=3):
+    """Concurrent fetch tasks for FinnHub company-news, one per symbol"""
+    end_date = datetime.utcnow().date()
+    start_date = end_date - timedelta(days=max(1, days_back))
+    unique_symbols = list(dict.fromkeys([s.strip().upper() for s in symbols if s.strip()]))[:MAX_COMPANY_NEWS_SYMBOLS]
+    return {
+        f"finnhub_company:{sym}": (
+            'finnhub_company',
+            lambda sym=sym: _fetch_finnhub_company_news_for_symbol(api_key, sym, start_date, end_date)
+        )
+        for sym in unique_symbols
+    }
+
 def fetch_finnhub_company_news(symbols, days_back=3):
-    """Fetch recent company-specific news from FinnHub for given symbols."""
+    """Fetch recent company-specific news from FinnHub for given symbols (concurrently, with a deadline)."""
     api_key = get_finnhub_api_key()
     if not api_key or not symbols:
         return []
-    base_url = "https://finnhub.io/api/v1/company-news"
-    end_date = datetime.utcnow().date()
-    start_date = end_date - timedelta(days=max(1, days_back))
     out = []
-    for sym in list(dict.fromkeys([s.strip().upper() for s in symbols if s.strip()]))[:15]:
-        params = {
-            'symbol': sym,
-            'from': start_date.isoformat(),
-            'to': end_date.isoformat(),
-            'token': api_key
-        }
-        try:
-            resp = requests.get(base_url, params=params, timeout=20)
-            if resp.status_code == 200:
-                data = resp.json() or []
-                for item in data:
-                    try:
-                        ts = item.get('datetime') or item.get('time') or 0
-                        published_at = ''
-                        if ts:
-                            published_at = datetime.fromtimestamp(int(ts)).strftime("%Y%m%dT%H%M%S")
-                        news_item = {
-                            "id": f"finnhub_company_{sym}_{item.get('id', item.get('url',''))}",
-                            "title": item.get('headline') or item.get('title',''),
-                            "summary": item.get('summary',''),
-                            "source": f"{item.get('source','FinnHub')} (FinnHub)",
-                            "url": item.get('url',''),
-                            "published_at": published_at,
-                            "category": 'market',
-                            "topics": ["market"],
-                            "image": item.get('image',''),
-                            "sentiment": 'neutral',
-                            "sentiment_score": 0,
-                            "related_stocks": [sym],
-                            "data_source": "finnhub_company"
-                        }
-                        out.append(news_item)
-                    except Exception:
-                        continue
-            elif resp.status_code == 429:
-                current_app.logger.warning("FinnHub company-news rate limit hit")
-                break
-        except Exception as e:
-            current_app.logger.warning(f"FinnHub company-news error for {sym}: {e}")
-            continue
-        time.sleep(0.1)
+    for items in _run_sources_concurrently(_finnhub_company_tasks(api_key, symbols, days_back)).values():
+        out.extend(items or [])
     # Newest first
     out.sort(key=lambda x: x.get('published_at',''), reverse=True)
     return out
@@ -926,36 +1344,29 @@ def process_finnhub_news(finnhub_data):
     return processed_news
 
 def fetch_alpha_vantage_news(topic=None):
-    """Fetch news from Alpha Vantage API with intelligent caching and continuous refresh strategy"""
+    """Fetch news from Alpha Vantage API with intelligent caching and stale-while-revalidate refresh"""
     cache_key = f"news-{topic or 'all'}"
+    cached_value, stored_at = news_cache.get_entry(cache_key)
+    cache_age_seconds = time.time() - stored_at if stored_at is not None else None
     
     # PRIORITY 1: Return cached data if available and relatively fresh (1 hour)
-    if is_cache_valid(cache_key, NEWS_CACHE_TIMEOUT):
-        cache_age = get_cache_age(cache_key)
-        current_app.logger.info(f"Returning FRESH cached data for {cache_key} (age: {cache_age:.1f} minutes)")
-        return news_cache[cache_key], 200
-    
-    # PRIORITY 2: If we have older cached data (within 24 hours), return it while attempting refresh
-    if is_cache_valid(cache_key, FALLBACK_CACHE_TIMEOUT):
-        cache_age = get_cache_age(cache_key)
-        current_app.logger.info(f"Returning OLDER cached data for {cache_key} (age: {cache_age:.1f} minutes) while attempting refresh")
+    if cached_value is not None and cache_age_seconds < NEWS_CACHE_TIMEOUT:
+        current_app.logger.info(f"Returning FRESH cached data for {cache_key} (age: {cache_age_seconds / 60:.1f} minutes)")
+        return cached_value, 200
+    
+    # PRIORITY 2: Older cached data (within 24 hours) is served immediately while one worker revalidates it
+    if cached_value is not None and cache_age_seconds < FALLBACK_CACHE_TIMEOUT:
+        cache_age = cache_age_seconds / 60
+        current_app.logger.info(f"Returning OLDER cached data for {cache_key} (age: {cache_age:.1f} minutes) while revalidating")
+        news_cache.record_stale_served()
         
-        cached_data = news_cache[cache_key].copy()
+        cached_data = cached_value.copy()
         cached_data["cache_used"] = True
         cached_data["cache_age_minutes"] = cache_age
         
-        # Attempt to refresh ONLY if we can make API calls and haven't called within 1 hour
+        # Refresh ONLY if we can make API calls and haven't called within 1 hour
         if can_make_api_call_for_cache_key(cache_key):
-            current_app.logger.info(f"Attempting refresh for older cache data {cache_key}")
-            try:
-                new_data = attempt_background_refresh(cache_key, topic)
-                if new_data:
-                    current_app.logger.info(f"Successfully refreshed older cache for {cache_key}")
-                    mark_successful_fetch(cache_key)
-                    mark_api_call_for_cache_key(cache_key)
-                    return new_data, 200  # Return fresh data if refresh succeeds
-            except Exception as e:
-                current_app.logger.warning(f"Refresh attempt failed for {cache_key}: {e}")
+            cached_data["revalidating"] = schedule_background_refresh(cache_key, topic)
         else:
             current_app.logger.info(f"API rate limit active for {cache_key}, returning cached data")
         
@@ -974,8 +1385,7 @@ def fetch_alpha_vantage_news(topic=None):
             "has_more": False
         }
         # Cache error data for 1 hour to avoid repeated attempts
-        news_cache[cache_key] = error_data
-        last_cache_time[cache_key] = time.time()
+        news_cache.put(cache_key, error_data)
         return error_data, 200
     
     # Check if we can make API calls with 1-hour rate limiting
@@ -984,23 +1394,22 @@ def fetch_alpha_vantage_news(topic=None):
         error_data = {
             "news": [],
             "api_rate_limited": True,
-            "daily_calls_used": daily_api_calls,
+            "daily_calls_used": get_daily_api_calls(),
             "error": "API rate limit active",
             "total": 0,
             "has_more": False
         }
         # Cache error data
-        news_cache[cache_key] = error_data
-        last_cache_time[cache_key] = time.time()
+        news_cache.put(cache_key, error_data)
         return error_data, 200
     
     # PRIORITY 4: Make API call for fresh data
-    current_app.logger.info(f"Making API call for {cache_key} (calls today: {daily_api_calls}/{MAX_DAILY_API_CALLS})")
+    current_app.logger.info(f"Making API call for {cache_key} (calls today: {get_daily_api_calls()}/{MAX_DAILY_API_CALLS})")
     
     try:
         # Enhanced strategy: if requesting all news, fetch multiple topic-specific queries
         if topic is None or topic == 'all':
-            result_data, status_code = fetch_diverse_news_data(api_key, cache_key)
+            result_data, status_code = fetch_diverse_news_data(api_key, cache_key, watchlist=_session_watchlist())
             if status_code == 200:
                 mark_successful_fetch(cache_key)
                 mark_api_call_for_cache_key(cache_key)  # Mark the API call
@@ -1022,11 +1431,10 @@ def fetch_alpha_vantage_news(topic=None):
             "total": 0,
             "has_more": False
         }
-        news_cache[cache_key] = error_data
-        last_cache_time[cache_key] = time.time()
+        news_cache.put(cache_key, error_data)
         return error_data, 200
 
-def attempt_background_refresh(cache_key, topic):
+def attempt_background_refresh(cache_key, topic, watchlist=None):
     """Attempt to refresh cache with 1-hour rate limiting"""
     api_key = get_alpha_vantage_api_key()
     if not api_key:
@@ -1042,7 +1450,7 @@ def attempt_background_refresh(cache_key, topic):
         current_app.logger.info(f"API refresh attempt for {cache_key}")
         
         if topic is None or topic == 'all':
-            result_data, status_code = fetch_diverse_news_data(api_key, cache_key)
+            result_data, status_code = fetch_diverse_news_data(api_key, cache_key, watchlist=watchlist)
         else:
             result_data, status_code = fetch_topic_specific_news(api_key, topic, cache_key)
         
@@ -1050,6 +1458,7 @@ def attempt_background_refresh(cache_key, topic):
             current_app.logger.info(f"API refresh successful for {cache_key}")
             # Mark that we made an API call
             mark_api_call_for_cache_key(cache_key)
+            mark_successful_fetch(cache_key)
             return result_data
         else:
             current_app.logger.warning(f"API refresh returned status {status_code}")
@@ -1059,6 +1468,30 @@ def attempt_background_refresh(cache_key, topic):
         current_app.logger.error(f"Background refresh error for {cache_key}: {e}")
         return None
 
+def schedule_background_refresh(cache_key, topic):
+    """Revalidate a stale cache key off the request thread.
+    
+    A lease in the shared cache ensures only one worker refreshes a key at a
+    time; returns True when this worker scheduled the refresh.
+    """
+    if not news_cache.try_acquire_refresh(cache_key):
+        current_app.logger.info(f"Another worker is already refreshing {cache_key}")
+        return False
+    
+    app = current_app._get_current_object()
+    watchlist = _session_watchlist()
+    
+    def run_refresh():
+        with app.app_context():
+            try:
+                attempt_background_refresh(cache_key, topic, watchlist=watchlist)
+            finally:
+                news_cache.release_refresh(cache_key)
+    
+    _refresh_executor.submit(run_refresh)
+    current_app.logger.info(f"Scheduled background refresh for {cache_key}")
+    return True
+
 def fetch_topic_specific_news(api_key, topic, cache_key):
     """Fetch news for a specific topic with intelligent API call management"""
     base_url = "https://www.alphavantage.co/query"
@@ -1076,8 +1509,7 @@ def fetch_topic_specific_news(api_key, topic, cache_key):
         }
         
         # Cache the result
-        news_cache[cache_key] = processed_data
-        last_cache_time[cache_key] = time.time()
+        news_cache.put(cache_key, processed_data)
         return processed_data, 200
     
     # Map our filter topics to Alpha Vantage topics parameter
@@ -1100,17 +1532,17 @@ def fetch_topic_specific_news(api_key, topic, cache_key):
     }
     
     try:
-        current_app.logger.info(f"Making topic-specific API call for {topic} -> {av_topic} (calls: {daily_api_calls + 1}/{MAX_DAILY_API_CALLS})")
+        current_app.logger.info(f"Making topic-specific API call for {topic} -> {av_topic} (calls: {get_daily_api_calls() + 1}/{MAX_DAILY_API_CALLS})")
         increment_api_call_counter()
         
-        response = requests.get(base_url, params=params, timeout=30)
+        response = _http_session.get(base_url, params=params, timeout=NEWS_REQUEST_TIMEOUT)
         
         if response.status_code == 429:
             current_app.logger.warning("Rate limit hit")
             # Fall back to cached general data if available
             general_cache_key = "news-all"
-            if is_cache_valid(general_cache_key, FALLBACK_CACHE_TIMEOUT):
-                general_data = news_cache[general_cache_key]
+            general_data = news_cache.get(general_cache_key) if is_cache_valid(general_cache_key, FALLBACK_CACHE_TIMEOUT) else None
+            if general_data:
                 all_news = general_data.get("news", [])
                 filtered_news = [n for n in all_news if n.get('category') == topic]
                 processed_data = {
@@ -1119,8 +1551,7 @@ def fetch_topic_specific_news(api_key, topic, cache_key):
                     "from_general_cache": True,
                     "cache_timeout_minutes": NEWS_CACHE_TIMEOUT / 60
                 }
-                news_cache[cache_key] = processed_data
-                last_cache_time[cache_key] = time.time()
+                news_cache.put(cache_key, processed_data)
                 return processed_data, 200
             
         if response.status_code == 200:
@@ -1137,8 +1568,7 @@ def fetch_topic_specific_news(api_key, topic, cache_key):
                     "api_error": data.get('Error Message', data.get('Information', 'Unknown')),
                     "cache_timeout_minutes": NEWS_CACHE_TIMEOUT / 60
                 }
-                news_cache[cache_key] = processed_data
-                last_cache_time[cache_key] = time.time()
+                news_cache.put(cache_key, processed_data)
                 return processed_data, 200
                 
             if "feed" in data and data["feed"]:
@@ -1149,8 +1579,7 @@ def fetch_topic_specific_news(api_key, topic, cache_key):
                 processed_data = process_alpha_vantage_news(data_wrapper)
                 
                 # Cache the result for 15 minutes
-                news_cache[cache_key] = processed_data
-                last_cache_time[cache_key] = time.time()
+                news_cache.put(cache_key, processed_data)
                 processed_data["cache_timeout_minutes"] = NEWS_CACHE_TIMEOUT / 60
                 
                 current_app.logger.info(f"Topic-specific news count for {topic}: {len(processed_data.get('news', []))}")
@@ -1170,8 +1599,7 @@ def fetch_topic_specific_news(api_key, topic, cache_key):
         "cache_timeout_minutes": NEWS_CACHE_TIMEOUT / 60
     }
     
-    news_cache[cache_key] = processed_data
-    last_cache_time[cache_key] = time.time()
+    news_cache.put(cache_key, processed_data)
     return processed_data, 200
 
 def process_alpha_vantage_news(data):
@@ -1371,11 +1799,8 @@ def refresh_cache():
         
         if force_api_call:
             current_app.logger.info(f"Force API refresh requested for {cache_key}")
-            # Clear cache to force API call
-            if cache_key in news_cache:
-                del news_cache[cache_key]
-            if cache_key in last_cache_time:
-                del last_cache_time[cache_key]
+            # Clear cache (both tiers) to force API call
+            news_cache.delete(cache_key)
         else:
             current_app.logger.info(f"Standard cache refresh requested for {cache_key}")
         
@@ -1386,7 +1811,7 @@ def refresh_cache():
             return jsonify({
                 "status": "error",
                 "message": "API limit reached, cannot refresh cache",
-                "daily_calls_used": daily_api_calls,
+                "daily_calls_used": get_daily_api_calls(),
                 "daily_limit": MAX_DAILY_API_CALLS
             }), 429
         
@@ -1408,7 +1833,7 @@ def refresh_cache():
                     "news_count": news_count,
                     "cache_cleared": force_api_call,
                     "api_status": "fresh_api_call",
-                    "daily_calls_used": daily_api_calls,
+                    "daily_calls_used": get_daily_api_calls(),
                     "daily_limit": MAX_DAILY_API_CALLS,
                     "fresh_articles": news_data.get("fresh_articles_count", 0)
                 }), 200
@@ -1440,14 +1865,16 @@ def refresh_cache():
 @market_news_bp.route('/api/cache-status')
 def get_cache_status():
     """API endpoint to check cache status and API usage with enhanced intelligence"""
-    reset_daily_api_counter()
+    daily_api_calls = get_daily_api_calls()
+    can_call = can_make_api_call_with_strategy()
     
+    # listing() reuses one shared-tier read for a short while and leaves hit/miss counters alone
     cache_info = {}
-    for key, timestamp in last_cache_time.items():
+    for key, (timestamp, news_count) in news_cache.listing().items():
         age_minutes = (time.time() - timestamp) / 60
         is_fresh = age_minutes < (NEWS_CACHE_TIMEOUT / 60)
         is_valid_fallback = age_minutes < (FALLBACK_CACHE_TIMEOUT / 60)
-        should_refresh = should_attempt_background_refresh(key)
+        should_refresh = not is_fresh and can_call and can_make_api_call_for_cache_key(key)
         
         cache_info[key] = {
             "age_minutes": round(age_minutes, 1),
@@ -1455,8 +1882,8 @@ def get_cache_status():
             "is_valid_fallback": is_valid_fallback,
             "expires_in_minutes": round((NEWS_CACHE_TIMEOUT / 60) - age_minutes, 1) if is_fresh else 0,
             "fallback_expires_in_hours": round((FALLBACK_CACHE_TIMEOUT / 3600) - (age_minutes / 60), 1) if is_valid_fallback else 0,
-            "has_data": key in news_cache,
-            "news_count": len(news_cache[key].get("news", [])) if key in news_cache and isinstance(news_cache[key], dict) else 0,
+            "has_data": True,
+            "news_count": news_count or 0,
             "should_attempt_refresh": should_refresh,
             "last_successful_fetch": last_successful_fetch.get(key),
             "time_since_success_minutes": round((time.time() - last_successful_fetch[key]) / 60, 1) if key in last_successful_fetch else None
@@ -1472,7 +1899,7 @@ def get_cache_status():
             "daily_calls_used": daily_api_calls,
             "daily_limit": MAX_DAILY_API_CALLS,
             "calls_remaining": calls_remaining,
-            "last_reset": str(last_api_reset) if last_api_reset else None,
+            "last_reset": str(datetime.now().date()),
             "current_hour": current_hour,
             "hours_remaining": hours_remaining,
             "recommended_calls_per_hour": round(calls_remaining / max(1, hours_remaining), 2)
@@ -1483,8 +1910,10 @@ def get_cache_status():
             "fallback_timeout_hours": FALLBACK_CACHE_TIMEOUT / 3600
         },
         "cache_info": cache_info,
+        "cache_stats": news_cache.stats(),
+        "fetch_latency": fetch_latency.snapshot(),
         "strategy_status": {
-            "can_make_api_call": can_make_api_call_with_strategy(),
+            "can_make_api_call": can_call,
             "intelligent_distribution": True,
             "background_refresh_enabled": True,
             "continuous_data_flow": True
@@ -1500,8 +1929,6 @@ def get_cache_status():
 @market_news_bp.route('/api/market-news')
 def get_market_news():
     """API endpoint to get market news with intelligent caching and continuous refresh strategy"""
-    reset_daily_api_counter()  # Reset counter if new day
-    
     current_app.logger.info("API endpoint /api/market-news called")
     page = request.args.get('page', 1, type=int)
     filter_topic = request.args.get('filter', 'all')
@@ -1512,7 +1939,7 @@ def get_market_news():
     
     # Log request details with API usage
     current_app.logger.info(f"Market News API request - page: {page}, filter: {filter_topic}, force_refresh: {force_refresh}")
-    current_app.logger.info(f"Daily API calls used: {daily_api_calls}/{MAX_DAILY_API_CALLS}")
+    current_app.logger.info(f"Daily API calls used: {get_daily_api_calls()}/{MAX_DAILY_API_CALLS}")
     
     # Debug cache status
     cache_key = f"news-{filter_topic if filter_topic != 'all' else 'all'}"
@@ -1520,11 +1947,9 @@ def get_market_news():
     current_app.logger.info(f"Cache status for {cache_key}: age={cache_age:.1f} minutes")
     
     # Force refresh cache if requested (for admin/testing)
-    if force_refresh and cache_key in news_cache:
+    if force_refresh:
         current_app.logger.info(f"Force refresh requested for {cache_key}")
-        del news_cache[cache_key]
-        if cache_key in last_cache_time:
-            del last_cache_time[cache_key]
+        news_cache.delete(cache_key)
     
     # If For You and explicit tickers provided, persist to session for freshness fetch downstream
     if filter_topic == 'for_you' and tickers_param:
@@ -1563,22 +1988,11 @@ def get_market_news():
                 "has_more": False
             }), 500
         
-        # Calculate category counts from all news
-        category_counts = {
-            'all': len(all_news),
-            'market': len([n for n in all_news if n.get('category') == 'market']),
-            'economy': len([n for n in all_news if n.get('category') == 'economy']),
-            'crypto': len([n for n in all_news if n.get('category') == 'crypto']),
-            'forex': len([n for n in all_news if n.get('category') == 'forex']),
-            'earnings': len([n for n in all_news if n.get('category') == 'earnings'])
-        }
-        
-        # Calculate sentiment counts
-        sentiment_counts = {
-            'positive': len([n for n in all_news if n.get('sentiment') == 'positive']),
-            'neutral': len([n for n in all_news if n.get('sentiment') == 'neutral']),
-            'negative': len([n for n in all_news if n.get('sentiment') == 'negative'])
-        }
+        # Signals, counts and ranked views come from the incrementally maintained index;
+        # only items added/removed since the last request are (re)scored
+        news_index.sync(all_news)
+        category_counts = news_index.category_counts()
+        sentiment_counts = news_index.sentiment_counts()
         
         # For You logic: if filter=for_you and tickers provided
         watchlist = []
@@ -1588,48 +2002,14 @@ def get_market_news():
                 watchlist = [t.strip().upper() for t in tickers_param.split(',') if t.strip()]
             elif isinstance(session.get('watchlist'), list):
                 watchlist = [str(t).strip().upper() for t in session.get('watchlist') if str(t).strip()]
-            # Compute relevance
             try:
-                _compute_relevance_for_watchlist(all_news, set(watchlist))
+                filtered_news = news_index.for_watchlist(watchlist, sort_by)
             except Exception as e:
                 current_app.logger.warning(f"Relevance computation failed: {e}")
-            # Use relevance threshold to filter, then sort by relevance desc and recency
-            filtered_news = [n for n in all_news if float(n.get('relevance_score', 0)) >= 0.1]
-            filtered_news.sort(key=lambda x: (x.get('relevance_score', 0), _parse_datetime_to_epoch(x.get('published_at',''))), reverse=True)
-            # If still too few, fallback to inline mentions among all news
-            if len(filtered_news) < 12 and watchlist:
-                wl = set(watchlist)
-                extras = []
-                for n in all_news:
-                    text = f"{n.get('title','')} {n.get('summary','')}"
-                    if any(re.search(fr"\b{re.escape(t)}\b", text) for t in wl):
-                        extras.append(n)
-                # de-dup by id
-                seen = {x.get('id') for x in filtered_news}
-                for e in extras:
-                    if e.get('id') not in seen:
-                        filtered_news.append(e)
-                        seen.add(e.get('id'))
-                filtered_news.sort(key=lambda x: (_parse_datetime_to_epoch(x.get('published_at','')), x.get('impact_score',0)), reverse=True)
+                filtered_news = []
         else:
-            # Filter news based on the selected category
-            if filter_topic != 'all':
-                filtered_news = [n for n in all_news if n.get('category') == filter_topic]
-            else:
-                filtered_news = all_news
-
-        # Additional sorting options
-        if sort_by == 'impact':
-            filtered_news.sort(key=lambda x: (x.get('impact_score', 0), _parse_datetime_to_epoch(x.get('published_at',''))), reverse=True)
-        elif sort_by == 'relevance' and filter_topic == 'for_you':
-            filtered_news.sort(key=lambda x: (x.get('relevance_score', 0), _parse_datetime_to_epoch(x.get('published_at',''))), reverse=True)
-        elif sort_by == 'sentiment':
-            sentiment_order = {'positive': 0, 'neutral': 1, 'negative': 2}
-            filtered_news.sort(key=lambda x: (sentiment_order.get(x.get('sentiment','neutral'), 1), -_parse_datetime_to_epoch(x.get('published_at',''))))
-        elif sort_by == 'oldest':
-            filtered_news.sort(key=lambda x: x.get('published_at',''))
-        else:  # newest
-            filtered_news.sort(key=lambda x: x.get('published_at',''), reverse=True)
+            # Filter news based on the selected category ('relevance' only applies to For You)
+            filtered_news = news_index.view(filter_topic, 'newest' if sort_by == 'relevance' else sort_by)
             
         # Calculate total pages
         total_items = len(filtered_news)
@@ -1647,8 +2027,7 @@ def get_market_news():
         
         # Fallback for For You when empty: show top-impact latest overall
         if filter_topic == 'for_you' and total_items == 0:
-            fallback = sorted(all_news, key=lambda x: (_parse_datetime_to_epoch(x.get('published_at','')), x.get('impact_score',0)), reverse=True)
-            filtered_news = fallback
+            filtered_news = news_index.view('all', 'recent_impact')
             total_items = len(filtered_news)
             total_pages = max(1, (total_items + items_per_page - 1) // items_per_page)
             if page > total_pages:
@@ -1676,9 +2055,9 @@ def get_market_news():
         
         # Add enhanced API usage and cache information
         response_data["api_usage"] = {
-            "daily_calls_used": daily_api_calls,
+            "daily_calls_used": get_daily_api_calls(),
             "daily_limit": MAX_DAILY_API_CALLS,
-            "calls_remaining": MAX_DAILY_API_CALLS - daily_api_calls,
+            "calls_remaining": MAX_DAILY_API_CALLS - get_daily_api_calls(),
             "cache_age_minutes": cache_age if cache_age != float('inf') else None,
             "cache_timeout_minutes": NEWS_CACHE_TIMEOUT / 60,
             "using_cache": news_data.get("cache_used", False),
@@ -1707,14 +2086,14 @@ def get_market_news():
         
         # Add enhanced debug information
         response_data["debug_info"] = {
-            "cache_keys": list(news_cache.keys()),
+            "cache_keys": list(news_cache.listing()),
             "total_news_count": len(all_news),
             "filtered_news_count": len(filtered_news),
             "paginated_news_count": len(paginated_news),
             "has_error": "error" in news_data,
             "error": news_data.get("error", "None"),
             "filter_applied": filter_topic,
-            "daily_api_calls": daily_api_calls,
+            "daily_api_calls": get_daily_api_calls(),
             "max_daily_calls": MAX_DAILY_API_CALLS,
             "cache_strategy": "1hour_api_rate_limiting",
             "cache_valid": is_cache_valid(cache_key),
@@ -1726,7 +2105,7 @@ def get_market_news():
         current_app.logger.info(f"Category counts: {category_counts}")
         current_app.logger.info(f"Sentiment counts: {sentiment_counts}")
         current_app.logger.info(f"Filter: {filter_topic}, Filtered count: {len(filtered_news)}")
-        current_app.logger.info(f"API calls today: {daily_api_calls}/{MAX_DAILY_API_CALLS}")
+        current_app.logger.info(f"API calls today: {get_daily_api_calls()}/{MAX_DAILY_API_CALLS}")
         
         return jsonify(response_data), 200
     except Exception as e:
@@ -1738,7 +2117,7 @@ def get_market_news():
             "total": 0,
             "has_more": False,
             "api_usage": {
-                "daily_calls_used": daily_api_calls,
+                "daily_calls_used": get_daily_api_calls(),
                 "daily_limit": MAX_DAILY_API_CALLS
             }
         }), 500
@@ -1748,55 +2127,21 @@ def get_market_storylines():
     """Return storyline clusters from cached 'all' news without triggering new API calls."""
     try:
         cache_key = 'news-all'
-        if cache_key not in news_cache or not isinstance(news_cache[cache_key], dict):
+        cached_value = news_cache.get(cache_key)
+        if not isinstance(cached_value, dict):
             # Best effort: attempt fetch using existing strategy without forcing
             data, status = fetch_alpha_vantage_news(topic=None)
             if status != 200:
                 return jsonify({"storylines": [], "total": 0}), 200
             items = data.get('news', []) if isinstance(data, dict) else []
         else:
-            items = news_cache[cache_key].get('news', [])
+            items = cached_value.get('news', [])
 
-        # Ensure augmentation exists
-        try:
-            _augment_with_global_signals(items)
-        except Exception:
-            pass
-
-        clusters = {}
-        for it in items:
-            sid = it.get('storyline_id') or _compute_storyline_id(it)
-            grp = clusters.setdefault(sid, {
-                'storyline_id': sid,
-                'count': 0,
-                'latest_title': '',
-                'latest_published_at': '',
-                'sentiment_trend': it.get('storyline_sentiment_trend', 'flat'),
-                'tickers': set(),
-                'impact_max': 0.0,
-                'divergence': False,
-            })
-            grp['count'] += 1
-            ts = _parse_datetime_to_epoch(it.get('published_at',''))
-            if ts >= _parse_datetime_to_epoch(grp['latest_published_at'] or ''):
-                grp['latest_published_at'] = it.get('published_at','')
-                grp['latest_title'] = it.get('title','')
-            for tk in (it.get('related_stocks') or []):
-                grp['tickers'].add(tk)
-            grp['impact_max'] = max(grp['impact_max'], float(it.get('impact_score', 0) or 0))
-            if it.get('divergence_flag'):
-                grp['divergence'] = True
-
-        # Transform sets and sort
-        out = []
-        for grp in clusters.values():
-            grp['tickers'] = sorted(list(grp['tickers']))
-            out.append(grp)
-        out.sort(key=lambda x: (_parse_datetime_to_epoch(x['latest_published_at']), x['impact_max']), reverse=True)
+        out, total = news_index.sync(items).storylines(limit=100)
 
         return jsonify({
-            'storylines': out[:100],
-            'total': len(out)
+            'storylines': out,
+            'total': total
         }), 200
     except Exception as e:
         current_app.logger.error(f"Storylines endpoint error: {e}")
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Market News Cache
+=================
+
+Two-tier cache used by app/market_news.py:
+
+- **L1**: in-process LRU (``OrderedDict``) holding the most recently used
+  payloads for fast repeat reads within a worker.
+- **L2**: SQLite file shared by every gunicorn worker on the host (and
+  surviving restarts), so one worker's fetch warms the others.
+
+Entries carry the time they were stored; freshness decisions (fresh /
+stale-while-revalidate / expired) stay with the caller. A small lease table
+in the same SQLite file lets exactly one worker revalidate a stale key at a
+time, and an API-call ledger (calls per day, last call per key) makes the
+upstream quota shared by every worker instead of counted per process.
+
+Hit/miss counters and per-source fetch latency are kept in-process and
+exposed through ``/api/cache-status``. ``listing()`` (key, stored time and
+item count) reads the shared tier at most once per ``listing_ttl`` seconds
+and never touches the hit counters, so polling the status endpoint neither
+loads payloads nor skews the hit rate.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'news_cache', 'market_news.sqlite3'
+)
+
+
+class NewsCache:
+    """In-process LRU in front of a shared SQLite store"""
+
+    def __init__(self, db_path=None, max_entries=64, l1_ttl=5 * 60, max_age=24 * 60 * 60,
+                 item_count=None, listing_ttl=30):
+        """
+        Args:
+            db_path: SQLite file for the shared tier (``NEWS_CACHE_DB_PATH`` env overrides the default)
+            max_entries: Maximum number of keys held in the in-process LRU
+            l1_ttl: Seconds an L1 entry is trusted before re-checking the shared tier for a newer copy
+            max_age: Entries older than this are dropped from the shared tier
+            item_count: ``item_count(value)`` stored alongside each entry for ``listing()``
+            listing_ttl: Seconds a ``listing()`` of the shared tier is reused
+        """
+        self.db_path = os.path.abspath(db_path or os.environ.get('NEWS_CACHE_DB_PATH') or DEFAULT_CACHE_DB_PATH)
+        self.max_entries = max_entries
+        self.l1_ttl = l1_ttl
+        self.max_age = max_age
+        self.item_count = item_count
+        self.listing_ttl = listing_ttl
+        self._l1 = OrderedDict()  # key -> (value, stored_at, checked_at)
+        self._listing = None  # ({key: (stored_at, item_count)}, listed_at)
+        self._api_calls = {}  # used only without the shared tier: day -> calls
+        self._api_call_times = {}  # used only without the shared tier: key -> last call time
+        self._lock = threading.RLock()
+        self._stats = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'stale_served': 0, 'writes': 0, 'l2_errors': 0}
+        self._l2_available = self._init_db()
+
+    # ------------------------------------------------------------------
+    # Shared tier
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS news_cache ('
+                    'cache_key TEXT PRIMARY KEY, payload TEXT NOT NULL, stored_at REAL NOT NULL)'
+                )
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(news_cache)')}
+                if 'item_count' not in columns:
+                    conn.execute('ALTER TABLE news_cache ADD COLUMN item_count INTEGER')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS refresh_leases ('
+                    'cache_key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS api_calls ('
+                    'day TEXT PRIMARY KEY, calls INTEGER NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS api_call_times ('
+                    'cache_key TEXT PRIMARY KEY, called_at REAL NOT NULL)'
+                )
+                conn.execute('DELETE FROM api_calls WHERE day < ?', (date.today().isoformat(),))
+                conn.execute('DELETE FROM news_cache WHERE stored_at < ?', (time.time() - self.max_age,))
+            return True
+        except Exception as e:
+            logger.warning(f"Shared news cache unavailable at {self.db_path}, using in-process cache only: {e}")
+            return False
+
+    def _l2_get(self, key):
+        if not self._l2_available:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT payload, stored_at FROM news_cache WHERE cache_key = ?', (key,)
+                ).fetchone()
+            if row:
+                return json.loads(row[0]), row[1]
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Shared news cache read failed for {key}: {e}")
+        return None
+
+    def _l2_stored_at(self, key):
+        if not self._l2_available:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT stored_at FROM news_cache WHERE cache_key = ?', (key,)).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Shared news cache lookup failed for {key}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _l1_put(self, key, value, stored_at):
+        self._l1[key] = (value, stored_at, time.time())
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.max_entries:
+            self._l1.popitem(last=False)
+
+    def get_entry(self, key):
+        """Return ``(value, stored_at)`` for key, or ``(None, None)`` when neither tier has it"""
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                value, stored_at, checked_at = entry
+                if time.time() - checked_at < self.l1_ttl:
+                    self._l1.move_to_end(key)
+                    self._stats['l1_hits'] += 1
+                    return value, stored_at
+                # L1 copy is old enough that another worker may have refreshed the key
+                shared_stored_at = self._l2_stored_at(key)
+                if shared_stored_at is None or shared_stored_at <= stored_at:
+                    self._l1[key] = (value, stored_at, time.time())
+                    self._l1.move_to_end(key)
+                    self._stats['l1_hits'] += 1
+                    return value, stored_at
+
+            shared = self._l2_get(key)
+            if shared is not None:
+                value, stored_at = shared
+                self._l1_put(key, value, stored_at)
+                self._stats['l2_hits'] += 1
+                return value, stored_at
+
+            if entry is not None:
+                # Shared tier vanished underneath us; the L1 copy is still the best we have
+                self._stats['l1_hits'] += 1
+                return entry[0], entry[1]
+
+            self._stats['misses'] += 1
+            return None, None
+
+    def get(self, key):
+        return self.get_entry(key)[0]
+
+    def stored_at(self, key):
+        """Time the cached value for key was stored (None when not cached); does not count as a hit"""
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is not None:
+                return entry[1]
+        return self._l2_stored_at(key)
+
+    def put(self, key, value):
+        stored_at = time.time()
+        count = self.item_count(value) if self.item_count else None
+        with self._lock:
+            self._l1_put(key, value, stored_at)
+            self._stats['writes'] += 1
+            if self._listing is not None:
+                self._listing[0][key] = (stored_at, count)
+        if self._l2_available:
+            try:
+                payload = json.dumps(value, default=str)
+                with self._connect() as conn:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO news_cache (cache_key, payload, stored_at, item_count) '
+                        'VALUES (?, ?, ?, ?)',
+                        (key, payload, stored_at, count)
+                    )
+            except Exception as e:
+                self._stats['l2_errors'] += 1
+                logger.warning(f"Shared news cache write failed for {key}: {e}")
+
+    def delete(self, key):
+        with self._lock:
+            self._l1.pop(key, None)
+            if self._listing is not None:
+                self._listing[0].pop(key, None)
+        if self._l2_available:
+            try:
+                with self._connect() as conn:
+                    conn.execute('DELETE FROM news_cache WHERE cache_key = ?', (key,))
+            except Exception as e:
+                self._stats['l2_errors'] += 1
+                logger.warning(f"Shared news cache delete failed for {key}: {e}")
+
+    def listing(self):
+        """
+        ``{key: (stored_at, item_count)}`` across both tiers without loading payloads
+        or counting lookups; the shared tier is read at most once per ``listing_ttl``
+        """
+        with self._lock:
+            cached = self._listing
+            if cached is None or time.time() - cached[1] >= self.listing_ttl:
+                shared = {}
+                if self._l2_available:
+                    try:
+                        with self._connect() as conn:
+                            shared = {
+                                key: (stored_at, count) for key, stored_at, count in conn.execute(
+                                    'SELECT cache_key, stored_at, item_count FROM news_cache'
+                                )
+                            }
+                    except Exception as e:
+                        self._stats['l2_errors'] += 1
+                        logger.warning(f"Shared news cache listing failed: {e}")
+                cached = self._listing = (shared, time.time())
+            result = dict(cached[0])
+            for key, (value, stored_at, _checked_at) in self._l1.items():
+                if key not in result or result[key][0] < stored_at:
+                    result[key] = (stored_at, self.item_count(value) if self.item_count else None)
+            return result
+
+    # ------------------------------------------------------------------
+    # Upstream API-call ledger
+    # ------------------------------------------------------------------
+
+    def record_api_call(self, key=None):
+        """Count one upstream API call for today (and for key); returns today's total"""
+        now = time.time()
+        today = date.today().isoformat()
+        if self._l2_available:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        'INSERT INTO api_calls (day, calls) VALUES (?, 1) '
+                        'ON CONFLICT(day) DO UPDATE SET calls = calls + 1',
+                        (today,)
+                    )
+                    if key is not None:
+                        conn.execute(
+                            'INSERT OR REPLACE INTO api_call_times (cache_key, called_at) VALUES (?, ?)',
+                            (key, now)
+                        )
+                    return conn.execute('SELECT calls FROM api_calls WHERE day = ?', (today,)).fetchone()[0]
+            except Exception as e:
+                self._stats['l2_errors'] += 1
+                logger.warning(f"Shared API-call ledger write failed: {e}")
+        with self._lock:
+            self._api_calls = {today: self._api_calls.get(today, 0) + 1}
+            if key is not None:
+                self._api_call_times[key] = now
+            return self._api_calls[today]
+
+    def api_calls_today(self):
+        """Upstream API calls recorded today by every worker"""
+        today = date.today().isoformat()
+        if self._l2_available:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute('SELECT calls FROM api_calls WHERE day = ?', (today,)).fetchone()
+                return row[0] if row else 0
+            except Exception as e:
+                self._stats['l2_errors'] += 1
+                logger.warning(f"Shared API-call ledger read failed: {e}")
+        with self._lock:
+            return self._api_calls.get(today, 0)
+
+    def last_api_call(self, key):
+        """Time of the last upstream API call recorded for key (None when never)"""
+        if self._l2_available:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        'SELECT called_at FROM api_call_times WHERE cache_key = ?', (key,)
+                    ).fetchone()
+                return row[0] if row else None
+            except Exception as e:
+                self._stats['l2_errors'] += 1
+                logger.warning(f"Shared API-call ledger read failed for {key}: {e}")
+        with self._lock:
+            return self._api_call_times.get(key)
+
+    def record_stale_served(self):
+        with self._lock:
+            self._stats['stale_served'] += 1
+
+    def try_acquire_refresh(self, key, lease_seconds=120):
+        """Claim the right to revalidate key; False when another worker already holds the lease"""
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        now = time.time()
+        if not self._l2_available:
+            return True
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    'INSERT INTO refresh_leases (cache_key, owner, expires_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(cache_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at '
+                    'WHERE refresh_leases.expires_at < ?',
+                    (key, owner, now + lease_seconds, now)
+                )
+                return cursor.rowcount > 0
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Could not acquire refresh lease for {key}: {e}")
+            return True
+
+    def release_refresh(self, key):
+        if not self._l2_available:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM refresh_leases WHERE cache_key = ?', (key,))
+        except Exception as e:
+            self._stats['l2_errors'] += 1
+            logger.warning(f"Could not release refresh lease for {key}: {e}")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['l1_entries'] = len(self._l1)
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        stats['lookups'] = lookups
+        stats['hit_rate'] = round((stats['l1_hits'] + stats['l2_hits']) / lookups, 4) if lookups else None
+        stats['shared_tier'] = {'available': self._l2_available, 'path': self.db_path}
+        return stats
+
+
+class FetchLatencyTracker:
+    """Rolling per-source fetch latency and outcome counters"""
+
+    def __init__(self, window=100):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, source, seconds, outcome='ok'):
+        with self._lock:
+            self._samples.setdefault(source, deque(maxlen=self.window)).append(seconds)
+            counts = self._counts.setdefault(source, {'ok': 0, 'error': 0, 'timeout': 0})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for source, counts in self._counts.items():
+                samples = sorted(self._samples.get(source, ()))
+                entry = dict(counts)
+                if samples:
+                    entry.update({
+                        'samples': len(samples),
+                        'avg_ms': round(sum(samples) / len(samples) * 1000, 1),
+                        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+                        'max_ms': round(samples[-1] * 1000, 1),
+                    })
+                result[source] = entry
+            return result
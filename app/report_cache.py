@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Report Content Cache
+====================
+
+Serving layer for generated HTML reports used by ``/view-report``:
+
+- **L1**: in-process LRU (``OrderedDict``) bounded by total bytes, holding the
+  identity body plus precompressed gzip/brotli variants of hot reports.
+- **L2**: local disk cache for Firebase Storage backed reports, so a worker
+  restart or a different worker on the host never re-downloads a report.
+  Each entry is stored as ``<digest>.html`` with ``.html.gz`` / ``.html.br``
+  variants alongside and a small ``.json`` metadata file.
+
+Every entry carries a *validator* supplied by the caller (Storage generation
+number, Firestore ``update_time`` or local ``mtime``/size); a lookup with a
+different validator is a miss. Entries are served with a strong ETag derived
+from the content, so browsers revalidate with ``If-None-Match`` and get a
+304 without any body being read.
+
+Brotli variants are only produced when the optional ``brotli`` package is
+installed.
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from flask import Response
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'report_cache'
+)
+
+# Content-Encoding -> file suffix of the stored variant
+_VARIANT_SUFFIXES = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class CachedReport:
+    """One cached report: ETag, validator and its encoded variants (bytes in memory or files on disk)"""
+
+    __slots__ = ('key', 'validator', 'etag', 'variants', 'paths', 'checked_at')
+
+    def __init__(self, key, validator, etag, variants=None, paths=None, checked_at=None):
+        self.key = key
+        self.validator = validator
+        self.etag = etag
+        self.variants = variants or {}  # encoding -> bytes
+        self.paths = paths or {}        # encoding -> file path
+        self.checked_at = checked_at or time.time()
+
+    @property
+    def size(self):
+        return sum(len(body) for body in self.variants.values())
+
+    def encodings(self):
+        return set(self.variants) | set(self.paths)
+
+    def text(self):
+        """Decoded identity body (reads the disk copy when not held in memory)"""
+        body = self.variants.get('identity')
+        if body is None:
+            with open(self.paths['identity'], 'rb') as f:
+                body = f.read()
+        return body.decode('utf-8')
+
+    def iter_body(self, encoding):
+        body = self.variants.get(encoding)
+        if body is not None:
+            for start in range(0, len(body), STREAM_CHUNK_SIZE):
+                yield body[start:start + STREAM_CHUNK_SIZE]
+            return
+        with open(self.paths[encoding], 'rb') as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    def body_length(self, encoding):
+        body = self.variants.get(encoding)
+        if body is not None:
+            return len(body)
+        return os.path.getsize(self.paths[encoding])
+
+
+class ReportContentCache:
+    """Byte-bounded in-process LRU in front of an optional on-disk report cache"""
+
+    def __init__(self, cache_dir=None, max_memory_bytes=64 * 1024 * 1024, max_entry_bytes=8 * 1024 * 1024,
+                 revalidate_after=5 * 60, max_disk_age=7 * 24 * 60 * 60):
+        """
+        Args:
+            cache_dir: Directory for the disk tier (``REPORT_CACHE_DIR`` env overrides the default)
+            max_memory_bytes: Total bytes (all variants) held in the in-process LRU
+            max_entry_bytes: Larger reports are served from disk only
+            revalidate_after: Seconds an entry is trusted before the caller should re-check its validator
+            max_disk_age: Disk entries not written for this long are pruned at startup
+        """
+        self.cache_dir = os.path.abspath(cache_dir or os.environ.get('REPORT_CACHE_DIR') or DEFAULT_REPORT_CACHE_DIR)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.revalidate_after = revalidate_after
+        self._l1 = OrderedDict()  # key -> CachedReport
+        self._l1_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'not_modified': 0, 'writes': 0}
+        self._disk_available = self._init_disk(max_disk_age)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _init_disk(self, max_disk_age):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cutoff = time.time() - max_disk_age
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            return True
+        except Exception as e:
+            logger.warning(f"Report disk cache unavailable at {self.cache_dir}, using memory only: {e}")
+            return False
+
+    def _base_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _disk_get(self, key, validator):
+        if not self._disk_available:
+            return None
+        base = self._base_path(key)
+        try:
+            with open(base + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('key') != key or (validator is not None and meta.get('validator') != validator):
+                return None
+            paths = {}
+            for encoding in meta.get('encodings', []):
+                path = base + '.html' + _VARIANT_SUFFIXES[encoding]
+                if not os.path.exists(path):
+                    return None
+                paths[encoding] = path
+            if 'identity' not in paths:
+                return None
+            return CachedReport(key, meta.get('validator'), meta['etag'], paths=paths)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Report disk cache read failed for {key}: {e}")
+            return None
+
+    def _disk_put(self, report):
+        if not self._disk_available:
+            return
+        base = self._base_path(report.key)
+        try:
+            for encoding, body in report.variants.items():
+                path = base + '.html' + _VARIANT_SUFFIXES[encoding]
+                self._atomic_write(path, body)
+                report.paths[encoding] = path
+            meta = {
+                'key': report.key,
+                'validator': report.validator,
+                'etag': report.etag,
+                'encodings': sorted(report.variants),
+                'stored_at': time.time()
+            }
+            self._atomic_write(base + '.json', json.dumps(meta).encode('utf-8'))
+        except Exception as e:
+            logger.warning(f"Report disk cache write failed for {report.key}: {e}")
+
+    @staticmethod
+    def _atomic_write(path, body):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _l1_put(self, report):
+        if report.size > self.max_entry_bytes:
+            return
+        previous = self._l1.pop(report.key, None)
+        if previous is not None:
+            self._l1_bytes -= previous.size
+        self._l1[report.key] = report
+        self._l1_bytes += report.size
+        while self._l1_bytes > self.max_memory_bytes and len(self._l1) > 1:
+            _, evicted = self._l1.popitem(last=False)
+            self._l1_bytes -= evicted.size
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key, validator=None):
+        """Cached report for key, or None when missing or cached under a different validator"""
+        with self._lock:
+            report = self._l1.get(key)
+            if report is not None and (validator is None or report.validator == validator):
+                self._l1.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return report
+
+        report = self._disk_get(key, validator)
+        if report is not None:
+            if os.path.getsize(report.paths['identity']) <= self.max_entry_bytes:
+                for encoding, path in report.paths.items():
+                    with open(path, 'rb') as f:
+                        report.variants[encoding] = f.read()
+            with self._lock:
+                self._l1_put(report)
+                self._stats['disk_hits'] += 1
+            return report
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key, validator, content, persist=False):
+        """Cache content (str or bytes) under key with its encoded variants; persist=True also writes the disk tier"""
+        body = content.encode('utf-8') if isinstance(content, str) else content
+        variants = {'identity': body, 'gzip': gzip.compress(body, compresslevel=6)}
+        if BROTLI_AVAILABLE:
+            try:
+                variants['br'] = brotli.compress(body, quality=5)
+            except Exception as e:
+                logger.warning(f"Brotli compression failed for {key}: {e}")
+        etag = hashlib.sha1(body).hexdigest()
+        report = CachedReport(key, validator, etag, variants=variants)
+
+        if persist:
+            self._disk_put(report)
+        with self._lock:
+            self._l1_put(report)
+            self._stats['writes'] += 1
+        if report.size > self.max_entry_bytes and report.paths:
+            # Too large for memory; serve from the disk copy
+            report.variants = {}
+        return report
+
+    def needs_revalidation(self, report):
+        return time.time() - report.checked_at >= self.revalidate_after
+
+    def mark_validated(self, report):
+        report.checked_at = time.time()
+
+    def invalidate(self, key):
+        with self._lock:
+            report = self._l1.pop(key, None)
+            if report is not None:
+                self._l1_bytes -= report.size
+        if self._disk_available:
+            base = self._base_path(key)
+            for suffix in ['.json'] + ['.html' + s for s in _VARIANT_SUFFIXES.values()]:
+                try:
+                    os.remove(base + suffix)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Report disk cache delete failed for {key}: {e}")
+
+    def response(self, report, req, extra_headers=None):
+        """Streaming response for a cached report honouring If-None-Match and Accept-Encoding"""
+        headers = {
+            'ETag': f'"{report.etag}"',
+            'Cache-Control': 'private, no-cache',
+            'Vary': 'Accept-Encoding',
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+
+        if report.etag in req.if_none_match:
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return Response(status=304, headers=headers)
+
+        encoding = 'identity'
+        available = report.encodings()
+        for candidate in ('br', 'gzip'):
+            if candidate in available and candidate in req.accept_encodings:
+                encoding = candidate
+                break
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        headers['Content-Length'] = str(report.body_length(encoding))
+        return Response(report.iter_body(encoding), status=200, headers=headers,
+                        content_type='text/html; charset=utf-8', direct_passthrough=True)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._l1)
+            stats['memory_bytes'] = self._l1_bytes
+        stats['disk_tier'] = {'available': self._disk_available, 'path': self.cache_dir}
+        stats['brotli'] = BROTLI_AVAILABLE
+        return stats
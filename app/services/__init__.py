@@ -1,8 +1,25 @@
 """
 Services Package
 Contains business logic services for the application
+
+Service classes are imported lazily, so importing one service module (e.g.
+``app.services.analytics_rollup_service``) does not pull in the Firebase
+dependencies of the others.
 """
 
-from .quota_service import QuotaService
+import importlib
+
+_SERVICE_MODULES = {
+    'QuotaService': 'quota_service',
+    'AnalyticsRollupService': 'analytics_rollup_service',
+    'PublishingStatsService': 'publishing_stats_service',
+}
+
+__all__ = list(_SERVICE_MODULES)
+
 
-__all__ = ['QuotaService']
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        module = importlib.import_module(f'.{_SERVICE_MODULES[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
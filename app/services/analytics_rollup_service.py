@@ -0,0 +1,619 @@
+"""
+Analytics Rollup Service
+Maintains pre-aggregated analytics documents for the admin and user dashboards
+
+Instead of streaming ``userGeneratedReports`` / ``failed_analyses`` on every
+dashboard request, events are folded into a small set of rollup documents as
+they happen:
+
+    analyticsRollups/totals                       all-time counters
+    analyticsRollups/totals/daily/{YYYY-MM-DD}    per-day counters
+    analyticsRollups/totals/weekly/{YYYY-Www}     per-ISO-week counters
+    analyticsRollups/totals/monthly/{YYYY-MM}     per-month counters
+    analyticsRollups/totals/yearly/{YYYY}         per-year counters + day -> reports map
+    analyticsRollups/totals/tickers/{TICKER}      per-ticker counters
+
+Every rollup document carries the same counter fields (``reports_generated``,
+``failed_analyses``, ``articles_published``) plus breakdown maps
+(``storage_breakdown``, ``published_by_type``). Daily documents also keep the
+per-user maps ``users`` / ``publishers`` (one entry per user active that day,
+used for the active-user count); longer buckets do not, so no document grows
+with the total number of users. Yearly documents keep ``reports_by_day``
+({YYYY-MM-DD: count}) so the activity heatmap for a whole year is a single
+document read.
+
+Rebuilds
+--------
+The rollup tree above hangs off a root document whose id is named by the
+pointer document ``analyticsRollups/current`` (``{'root': ...}``; ``totals``
+when the pointer does not exist yet). Every event bumps ``generation`` on the
+root document in the same transaction that reads the pointer. A rebuild
+writes a complete new tree under a fresh root and switches the pointer in a
+transaction that only succeeds if the old root's generation is unchanged
+since before the raw collections were read; otherwise an event was recorded
+meanwhile and the rebuild starts over (up to ``REBUILD_ATTEMPTS`` times).
+Readers never see a partial tree, and the previous tree is kept until the
+next rebuild for readers still holding the old pointer.
+
+Storage is pluggable: ``FirestoreRollupStore`` applies deltas with
+``firestore.Increment`` and ``InMemoryRollupStore`` keeps everything in a dict
+so the service can be exercised without Firestore (or against the emulator by
+pointing the Firestore store at an emulator client).
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from copy import deepcopy
+from datetime import datetime, timezone, timedelta, date
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = 'analyticsRollups'
+TOTALS_DOC_ID = 'totals'
+POINTER_DOC_ID = 'current'
+GENERATION_FIELD = 'generation'
+REBUILD_ATTEMPTS = 3
+# How long readers may keep using the root named by the pointer document
+ROOT_CACHE_TTL = float(os.getenv('ANALYTICS_ROLLUP_ROOT_TTL', '30'))
+
+BUCKET_DAILY = 'daily'
+BUCKET_WEEKLY = 'weekly'
+BUCKET_MONTHLY = 'monthly'
+BUCKET_YEARLY = 'yearly'
+BUCKET_TICKERS = 'tickers'
+BUCKETS = (BUCKET_DAILY, BUCKET_WEEKLY, BUCKET_MONTHLY, BUCKET_YEARLY, BUCKET_TICKERS)
+TIME_BUCKETS = (BUCKET_DAILY, BUCKET_WEEKLY, BUCKET_MONTHLY, BUCKET_YEARLY)
+
+# A rollup path is (bucket, doc_id); the totals document uses (None, 'totals')
+RollupPath = Tuple[Optional[str], str]
+TOTALS_PATH: RollupPath = (None, TOTALS_DOC_ID)
+
+_FIRESTORE_BATCH_LIMIT = 400
+
+
+def _as_utc(dt: Any) -> datetime:
+    """Normalise datetimes, Firestore timestamps, ISO strings and epoch ints to aware UTC"""
+    if dt is None:
+        return datetime.now(timezone.utc)
+    if isinstance(dt, (int, float)):
+        return datetime.fromtimestamp(dt, tz=timezone.utc)
+    if isinstance(dt, str):
+        try:
+            dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+        except ValueError:
+            return datetime.now(timezone.utc)
+    if isinstance(dt, date) and not isinstance(dt, datetime):
+        dt = datetime.combine(dt, datetime.min.time())
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def day_key(dt: Any) -> str:
+    """Daily rollup document id (YYYY-MM-DD)"""
+    return _as_utc(dt).strftime('%Y-%m-%d')
+
+
+def week_key(dt: Any) -> str:
+    """Weekly rollup document id (ISO year and week, e.g. 2026-W07)"""
+    iso_year, iso_week, _ = _as_utc(dt).isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def month_key(dt: Any) -> str:
+    """Monthly rollup document id (YYYY-MM)"""
+    return _as_utc(dt).strftime('%Y-%m')
+
+
+def year_key(dt: Any) -> str:
+    """Yearly rollup document id (YYYY)"""
+    return _as_utc(dt).strftime('%Y')
+
+
+def ticker_key(ticker: str) -> str:
+    """Ticker rollup document id (Firestore ids cannot contain '/')"""
+    return (ticker or 'UNKNOWN').upper().replace('/', '_')
+
+
+def _merge_deltas(target: Dict[str, Any], deltas: Dict[str, Any]) -> None:
+    """Add nested integer deltas into target in place"""
+    for key, value in deltas.items():
+        if isinstance(value, dict):
+            _merge_deltas(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+class RollupUpdate:
+    """Deltas and plain field values destined for a set of rollup documents"""
+
+    def __init__(self):
+        self.increments: Dict[RollupPath, Dict[str, Any]] = {}
+        self.fields: Dict[RollupPath, Dict[str, Any]] = {}
+
+    def add(self, path: RollupPath, deltas: Dict[str, Any], fields: Dict[str, Any] = None):
+        _merge_deltas(self.increments.setdefault(path, {}), deltas)
+        if fields:
+            current = self.fields.setdefault(path, {})
+            for key, value in fields.items():
+                # Keep the most recent value for "last_*" style markers
+                if key not in current or (value is not None and current[key] is not None and value > current[key]):
+                    current[key] = value
+
+    def merge(self, other: 'RollupUpdate'):
+        for path, deltas in other.increments.items():
+            self.add(path, deltas, other.fields.get(path))
+
+    def materialize(self) -> Dict[RollupPath, Dict[str, Any]]:
+        """Collapse increments and fields into absolute documents (used by backfill)"""
+        docs = {}
+        for path in set(self.increments) | set(self.fields):
+            doc = deepcopy(self.increments.get(path, {}))
+            doc.update(self.fields.get(path, {}))
+            docs[path] = doc
+        return docs
+
+
+def _time_bucket_paths(when: datetime) -> List[RollupPath]:
+    return [
+        TOTALS_PATH,
+        (BUCKET_DAILY, day_key(when)),
+        (BUCKET_WEEKLY, week_key(when)),
+        (BUCKET_MONTHLY, month_key(when)),
+        (BUCKET_YEARLY, year_key(when)),
+    ]
+
+
+def _bucket_fields(path: RollupPath, when: datetime) -> Dict[str, Any]:
+    """Static fields stored alongside counters so buckets can be range-queried"""
+    bucket, doc_id = path
+    if bucket in TIME_BUCKETS:
+        return {'period': doc_id}
+    return {}
+
+
+def report_generated_update(user_uid: str, ticker: str, storage_type: str, generated_at: Any) -> RollupUpdate:
+    """Rollup deltas for one saved report (see save_report_to_history)"""
+    when = _as_utc(generated_at)
+    storage_type = storage_type or 'unknown'
+    update = RollupUpdate()
+    for path in _time_bucket_paths(when):
+        deltas = {'reports_generated': 1, 'storage_breakdown': {storage_type: 1}}
+        if path[0] == BUCKET_DAILY and user_uid:
+            deltas['users'] = {user_uid: 1}
+        if path[0] == BUCKET_YEARLY:
+            deltas['reports_by_day'] = {day_key(when): 1}
+        update.add(path, deltas, _bucket_fields(path, when))
+    update.add((BUCKET_TICKERS, ticker_key(ticker)), {'reports_generated': 1},
+               {'ticker': ticker_key(ticker), 'last_report_at': when})
+    return update
+
+
+def failed_analysis_update(user_uid: str, ticker: str, failed_at: Any) -> RollupUpdate:
+    """Rollup deltas for one failed analysis (see log_failed_analysis_attempt)"""
+    when = _as_utc(failed_at)
+    update = RollupUpdate()
+    for path in _time_bucket_paths(when):
+        update.add(path, {'failed_analyses': 1}, _bucket_fields(path, when))
+    update.add((BUCKET_TICKERS, ticker_key(ticker)), {'failed_analyses': 1},
+               {'ticker': ticker_key(ticker), 'last_failure_at': when})
+    return update
+
+
+def article_published_update(user_uid: str, ticker: Optional[str], article_type: str, published_at: Any) -> RollupUpdate:
+    """Rollup deltas for one article saved to userPublishedArticles"""
+    when = _as_utc(published_at)
+    article_type = article_type or 'unknown'
+    update = RollupUpdate()
+    for path in _time_bucket_paths(when):
+        deltas = {'articles_published': 1, 'published_by_type': {article_type: 1}}
+        if path[0] == BUCKET_DAILY and user_uid:
+            deltas['publishers'] = {user_uid: 1}
+        update.add(path, deltas, _bucket_fields(path, when))
+    if ticker:
+        update.add((BUCKET_TICKERS, ticker_key(ticker)), {'articles_published': 1},
+                   {'ticker': ticker_key(ticker), 'last_published_at': when})
+    return update
+
+
+class InMemoryRollupStore:
+    """Dict-backed rollup store for tests and local development"""
+
+    def __init__(self):
+        self._docs: Dict[RollupPath, Dict[str, Any]] = {}
+        self._generation = 0
+        self._lock = threading.RLock()
+
+    def apply(self, update: RollupUpdate):
+        with self._lock:
+            self._generation += 1
+            for path, deltas in update.increments.items():
+                _merge_deltas(self._docs.setdefault(path, {}), deltas)
+            for path, fields in update.fields.items():
+                self._docs.setdefault(path, {}).update(fields)
+
+    def get(self, path: RollupPath) -> Dict[str, Any]:
+        with self._lock:
+            return deepcopy(self._docs.get(path, {}))
+
+    def get_many(self, paths: Iterable[RollupPath]) -> Dict[RollupPath, Dict[str, Any]]:
+        with self._lock:
+            return {path: deepcopy(self._docs.get(path, {})) for path in paths}
+
+    def top(self, bucket: str, field: str, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            rows = [(doc_id, deepcopy(doc)) for (b, doc_id), doc in self._docs.items()
+                    if b == bucket and doc.get(field)]
+        rows.sort(key=lambda row: row[1][field], reverse=True)
+        return rows[:limit]
+
+    def count(self, bucket: str) -> int:
+        with self._lock:
+            return sum(1 for (b, _doc_id) in self._docs if b == bucket)
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def replace_if_generation(self, docs: Dict[RollupPath, Dict[str, Any]], generation: int) -> bool:
+        with self._lock:
+            if self._generation != generation:
+                return False
+            self._docs = deepcopy(docs)
+            return True
+
+
+class FirestoreRollupStore:
+    """Rollup store backed by Firestore (works against the emulator as well)"""
+
+    def __init__(self, db, collection: str = ROLLUP_COLLECTION, root_ttl: float = ROOT_CACHE_TTL):
+        self.db = db
+        self.collection = collection
+        self.root_ttl = root_ttl
+        self._root_cache: Optional[Tuple[str, float]] = None
+        self._lock = threading.Lock()
+
+    def _pointer_ref(self):
+        return self.db.collection(self.collection).document(POINTER_DOC_ID)
+
+    @staticmethod
+    def _pointer(snapshot) -> Dict[str, Any]:
+        return (snapshot.to_dict() or {}) if snapshot.exists else {}
+
+    def _root(self) -> str:
+        """Root document id named by the pointer document (cached for ``root_ttl`` seconds)"""
+        with self._lock:
+            cached = self._root_cache
+        if cached is not None and time.monotonic() - cached[1] < self.root_ttl:
+            return cached[0]
+        root = self._pointer(self._pointer_ref().get()).get('root') or TOTALS_DOC_ID
+        with self._lock:
+            self._root_cache = (root, time.monotonic())
+        return root
+
+    def _ref(self, path: RollupPath, root: Optional[str] = None):
+        bucket, doc_id = path
+        totals_ref = self.db.collection(self.collection).document(root or self._root())
+        if bucket is None:
+            return totals_ref
+        return totals_ref.collection(bucket).document(doc_id)
+
+    @staticmethod
+    def _to_increments(deltas: Dict[str, Any]) -> Dict[str, Any]:
+        from firebase_admin import firestore
+        return {
+            key: FirestoreRollupStore._to_increments(value) if isinstance(value, dict) else firestore.Increment(value)
+            for key, value in deltas.items()
+        }
+
+    def _commit_in_batches(self, writes: List[Tuple[Any, Dict[str, Any], bool]]):
+        for start in range(0, len(writes), _FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            for ref, data, merge in writes[start:start + _FIRESTORE_BATCH_LIMIT]:
+                if data is None:
+                    batch.delete(ref)
+                else:
+                    batch.set(ref, data, merge=merge)
+            batch.commit()
+
+    def apply(self, update: RollupUpdate):
+        from firebase_admin import firestore
+        pointer_ref = self._pointer_ref()
+        paths = set(update.increments) | set(update.fields) | {TOTALS_PATH}
+
+        @firestore.transactional
+        def _apply(transaction):
+            # Reading the pointer ties the write to the root it names: if a rebuild switches
+            # roots concurrently, one of the two transactions is retried
+            root = self._pointer(pointer_ref.get(transaction=transaction)).get('root') or TOTALS_DOC_ID
+            for path in paths:
+                data = self._to_increments(update.increments.get(path, {}))
+                data.update(update.fields.get(path, {}))
+                if path == TOTALS_PATH:
+                    data[GENERATION_FIELD] = firestore.Increment(1)
+                data['updated_at'] = firestore.SERVER_TIMESTAMP
+                transaction.set(self._ref(path, root), data, merge=True)
+
+        _apply(self.db.transaction())
+
+    def get(self, path: RollupPath) -> Dict[str, Any]:
+        snapshot = self._ref(path).get()
+        return (snapshot.to_dict() or {}) if snapshot.exists else {}
+
+    def get_many(self, paths: Iterable[RollupPath]) -> Dict[RollupPath, Dict[str, Any]]:
+        paths = list(paths)
+        if not paths:
+            return {}
+        root = self._root()
+        refs = {self._ref(path, root).path: path for path in paths}
+        result = {path: {} for path in paths}
+        for snapshot in self.db.get_all([self._ref(path, root) for path in paths]):
+            if snapshot.exists:
+                result[refs[snapshot.reference.path]] = snapshot.to_dict() or {}
+        return result
+
+    def top(self, bucket: str, field: str, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        query = self._ref(TOTALS_PATH).collection(bucket)\
+            .order_by(field, direction='DESCENDING').limit(limit)
+        return [(doc.id, doc.to_dict() or {}) for doc in query.stream()]
+
+    def count(self, bucket: str) -> int:
+        result = self._ref(TOTALS_PATH).collection(bucket).count().get()
+        return int(result[0][0].value) if result else 0
+
+    def generation(self) -> Tuple[str, int]:
+        """(current root, its event generation), read fresh"""
+        root = self._pointer(self._pointer_ref().get()).get('root') or TOTALS_DOC_ID
+        snapshot = self._ref(TOTALS_PATH, root).get()
+        return root, ((snapshot.to_dict() or {}) if snapshot.exists else {}).get(GENERATION_FIELD, 0)
+
+    def _delete_root(self, root: str):
+        root_ref = self._ref(TOTALS_PATH, root)
+        writes = [(doc_ref, None, False) for bucket in BUCKETS
+                  for doc_ref in root_ref.collection(bucket).list_documents()]
+        writes.append((root_ref, None, False))
+        self._commit_in_batches(writes)
+
+    def replace_if_generation(self, docs: Dict[RollupPath, Dict[str, Any]], generation: Tuple[str, int]) -> bool:
+        """
+        Write ``docs`` as a new rollup tree and switch the pointer to it, unless the
+        current root moved on from ``generation`` (see ``generation()``)
+        """
+        from firebase_admin import firestore
+        old_root, old_generation = generation
+        new_root = f"{TOTALS_DOC_ID}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        docs = dict(docs)
+        docs[TOTALS_PATH] = dict(docs.get(TOTALS_PATH, {}), **{GENERATION_FIELD: 0})
+        self._commit_in_batches([
+            (self._ref(path, new_root), dict(doc, updated_at=firestore.SERVER_TIMESTAMP), False)
+            for path, doc in docs.items()
+        ])
+
+        pointer_ref = self._pointer_ref()
+        old_totals_ref = self._ref(TOTALS_PATH, old_root)
+
+        @firestore.transactional
+        def _switch(transaction):
+            pointer = self._pointer(pointer_ref.get(transaction=transaction))
+            totals = old_totals_ref.get(transaction=transaction)
+            current = ((totals.to_dict() or {}) if totals.exists else {}).get(GENERATION_FIELD, 0)
+            if (pointer.get('root') or TOTALS_DOC_ID) != old_root or current != old_generation:
+                return False, None
+            transaction.set(pointer_ref, {'root': new_root, 'previous': old_root,
+                                          'switched_at': firestore.SERVER_TIMESTAMP})
+            return True, pointer.get('previous')
+
+        switched, stale_root = _switch(self.db.transaction())
+        if not switched:
+            self._delete_root(new_root)
+            return False
+        with self._lock:
+            self._root_cache = (new_root, time.monotonic())
+        if stale_root and stale_root != new_root:
+            # The root replaced by this switch stays for readers still holding the old pointer
+            self._delete_root(stale_root)
+        return True
+
+
+class AnalyticsRollupService:
+    """
+    Records analytics events into rollups and serves dashboard aggregates
+
+    Features:
+    - O(1) writes per event (one transaction touching ~6 documents)
+    - Dashboard reads touch a handful of rollup documents
+    - Backfill rebuilds every rollup from the raw collections and swaps them in atomically
+    """
+
+    def __init__(self, store=None, db=None):
+        """
+        Initialize AnalyticsRollupService
+
+        Args:
+            store: Rollup store (InMemoryRollupStore / FirestoreRollupStore)
+            db: Firestore client used to build a FirestoreRollupStore when no store is given
+        """
+        if store is None:
+            if db is None:
+                from config.firebase_admin_setup import get_firestore_client
+                db = get_firestore_client()
+            store = FirestoreRollupStore(db)
+        self.store = store
+        self.db = db
+
+    # ------------------------------------------------------------------
+    # Event recording
+    # ------------------------------------------------------------------
+
+    def _apply(self, update: RollupUpdate, event_name: str) -> bool:
+        try:
+            self.store.apply(update)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update analytics rollups for {event_name}: {e}")
+            return False
+
+    def record_report_generated(self, user_uid: str, ticker: str, storage_type: str, generated_at: Any = None) -> bool:
+        return self._apply(report_generated_update(user_uid, ticker, storage_type, generated_at), 'report_generated')
+
+    def record_failed_analysis(self, user_uid: str, ticker: str, failed_at: Any = None) -> bool:
+        return self._apply(failed_analysis_update(user_uid, ticker, failed_at), 'failed_analysis')
+
+    def record_article_published(self, user_uid: str, ticker: Optional[str], article_type: str,
+                                 published_at: Any = None) -> bool:
+        return self._apply(article_published_update(user_uid, ticker, article_type, published_at), 'article_published')
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_totals(self) -> Dict[str, Any]:
+        return self.store.get(TOTALS_PATH)
+
+    def get_day(self, day: Any = None) -> Dict[str, Any]:
+        return self.store.get((BUCKET_DAILY, day_key(day)))
+
+    def get_daily_series(self, days: int = 7, end: Any = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Daily rollups for the ``days`` days ending at ``end`` (inclusive), oldest first"""
+        end_dt = _as_utc(end)
+        keys = [day_key(end_dt - timedelta(days=offset)) for offset in range(days - 1, -1, -1)]
+        docs = self.store.get_many([(BUCKET_DAILY, key) for key in keys])
+        return [(key, docs[(BUCKET_DAILY, key)]) for key in keys]
+
+    def get_weekly_series(self, weeks: int = 5, end: Any = None) -> List[Tuple[str, Dict[str, Any]]]:
+        end_dt = _as_utc(end)
+        keys = [week_key(end_dt - timedelta(weeks=offset)) for offset in range(weeks - 1, -1, -1)]
+        docs = self.store.get_many([(BUCKET_WEEKLY, key) for key in keys])
+        return [(key, docs[(BUCKET_WEEKLY, key)]) for key in keys]
+
+    def get_monthly_series(self, months: int = 3, end: Any = None) -> List[Tuple[str, Dict[str, Any]]]:
+        end_dt = _as_utc(end)
+        year, month = end_dt.year, end_dt.month
+        keys = []
+        for _ in range(months):
+            keys.append(f"{year:04d}-{month:02d}")
+            month -= 1
+            if month == 0:
+                year, month = year - 1, 12
+        keys.reverse()
+        docs = self.store.get_many([(BUCKET_MONTHLY, key) for key in keys])
+        return [(key, docs[(BUCKET_MONTHLY, key)]) for key in keys]
+
+    def get_year(self, year: Any) -> Dict[str, Any]:
+        """Yearly rollup (counters plus ``reports_by_day``) for a year number or date"""
+        key = f"{year:04d}" if isinstance(year, int) else year_key(year)
+        return self.store.get((BUCKET_YEARLY, key))
+
+    def get_top_tickers(self, field: str = 'reports_generated', limit: int = 10) -> List[Tuple[str, int]]:
+        return [(doc.get('ticker', doc_id), doc.get(field, 0)) for doc_id, doc in self.store.top(BUCKET_TICKERS, field, limit)]
+
+    def get_latest_period(self, bucket: str = BUCKET_DAILY) -> Optional[str]:
+        rows = self.store.top(bucket, 'period', 1)
+        return rows[0][0] if rows else None
+
+    def count_tickers(self) -> int:
+        return self.store.count(BUCKET_TICKERS)
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+
+    def rebuild(self, db=None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild every rollup from userGeneratedReports, failed_analyses and userPublishedArticles
+
+        Only the fields needed for aggregation are read (report HTML is never pulled).
+        The rollups are replaced only if no event was recorded while the raw
+        collections were read; otherwise the rebuild starts over (up to
+        REBUILD_ATTEMPTS times) and picks the new events up from the raw data.
+
+        Args:
+            db: Firestore client to read raw collections from (defaults to the service's client)
+            dry_run: Compute the rollups without writing them
+
+        Returns:
+            Summary with event counts, number of rollup documents and whether they were written
+        """
+        db = db or self.db
+        if db is None:
+            raise ValueError("A Firestore client is required to rebuild analytics rollups")
+
+        written = False
+        for attempt in range(1, REBUILD_ATTEMPTS + 1):
+            generation = self.store.generation()
+            docs, counts = self._collect(db)
+            if dry_run:
+                break
+            if self.store.replace_if_generation(docs, generation):
+                written = True
+                break
+            logger.info(f"Analytics events recorded during rollup rebuild (attempt {attempt}), retrying")
+        else:
+            logger.warning("Analytics events kept arriving during the rollup rebuild; rollups not replaced")
+
+        logger.info(f"Analytics rollups {'rebuilt' if written else 'computed'}: {counts}, {len(docs)} rollup documents")
+        return {'events': counts, 'rollup_documents': len(docs), 'dry_run': dry_run,
+                'written': written, 'attempts': attempt}
+
+    @staticmethod
+    def _collect(db) -> Tuple[Dict[RollupPath, Dict[str, Any]], Dict[str, int]]:
+        """Rollup documents computed from the raw collections, and the number of events read"""
+        combined = RollupUpdate()
+        counts = {'reports': 0, 'failed_analyses': 0, 'published_articles': 0}
+
+        reports = db.collection('userGeneratedReports')\
+            .select(['user_uid', 'ticker', 'storage_type', 'generated_at']).stream()
+        for doc in reports:
+            data = doc.to_dict() or {}
+            combined.merge(report_generated_update(data.get('user_uid'), data.get('ticker'),
+                                                   data.get('storage_type'), data.get('generated_at')))
+            counts['reports'] += 1
+
+        failures = db.collection('failed_analyses')\
+            .select(['user_id', 'ticker', 'date', 'timestamp']).stream()
+        for doc in failures:
+            data = doc.to_dict() or {}
+            combined.merge(failed_analysis_update(data.get('user_id'), data.get('ticker'),
+                                                  data.get('date') or data.get('timestamp')))
+            counts['failed_analyses'] += 1
+
+        articles = db.collection('userPublishedArticles')\
+            .select(['user_uid', 'ticker', 'article_type', 'published_at', 'timestamp']).stream()
+        for doc in articles:
+            data = doc.to_dict() or {}
+            combined.merge(article_published_update(data.get('user_uid'), data.get('ticker'),
+                                                    data.get('article_type'),
+                                                    data.get('published_at') or data.get('timestamp')))
+            counts['published_articles'] += 1
+
+        return combined.materialize(), counts
+
+
+_default_service: Optional[AnalyticsRollupService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_rollup_service() -> Optional[AnalyticsRollupService]:
+    """Process-wide rollup service bound to the default Firestore client (None if unavailable)"""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                from config.firebase_admin_setup import get_firestore_client
+                db = get_firestore_client()
+                if db is None:
+                    return None
+                _default_service = AnalyticsRollupService(db=db)
+    return _default_service
+
+
+def set_rollup_service(service: Optional[AnalyticsRollupService]):
+    """Override the process-wide rollup service (e.g. with an in-memory store in tests)"""
+    global _default_service
+    with _default_service_lock:
+        _default_service = service
@@ -0,0 +1,378 @@
+"""
+Publishing Stats Service
+Maintains one pre-aggregated publishing-stats document per user
+
+The automation overview and history pages used to stream every
+``userPublishedArticles`` document of a user and count totals in Python.
+Instead, every article recorded in ``userPublishedArticles`` is folded into
+
+    userPublishingStats/{user_uid}
+
+    total               all articles (published + scheduled + draft + pending)
+    by_status           {status: count}
+    by_week             {YYYY-Www: {status: count}} for the last STATS_WEEKS_KEPT ISO weeks
+    recent_activity     the RECENT_ACTIVITY_LIMIT most recent articles, newest first
+    generation          bumped by every write
+
+inside a transaction, so concurrent publishers never lose an update and the
+pages are served from a single document read. ``rebuild_user`` /
+``rebuild_all`` reconcile the documents with the raw collection (drift from
+failed writes, articles deleted by hand, or users that predate the stats).
+A rebuild only replaces the document if its generation is unchanged since
+before the raw collection was read; otherwise an article was recorded
+meanwhile and the rebuild starts over.
+
+Storage is pluggable: ``FirestorePublishingStatsStore`` runs the update in a
+Firestore transaction and ``InMemoryPublishingStatsStore`` keeps everything in
+a dict so the service can be exercised without Firestore.
+"""
+
+import os
+import logging
+import threading
+from copy import deepcopy
+from datetime import datetime, timezone, date
+from typing import Dict, Any, Optional, List, Callable
+
+from .analytics_rollup_service import week_key
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+STATS_COLLECTION = 'userPublishingStats'
+RECENT_ACTIVITY_LIMIT = 10
+STATS_WEEKS_KEPT = int(os.getenv('PUBLISHING_STATS_WEEKS_KEPT', '26'))
+PENDING_STATUSES = ('pending', 'scheduled', 'draft')
+REBUILD_ATTEMPTS = 3
+
+# Fields read from userPublishedArticles when rebuilding
+ARTICLE_FIELDS = ['user_uid', 'title', 'site', 'profile_name', 'status', 'published_at', 'article_type']
+
+
+def _parse_published_at(value: Any) -> Optional[datetime]:
+    """Aware UTC datetime for ISO strings / datetimes / Firestore timestamps, None when unusable"""
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        elif isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.min.time())
+        elif not isinstance(value, datetime):
+            return None
+    except ValueError:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def activity_item(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Recent-activity entry for an article, as shown on the automation pages"""
+    published_at = article.get('published_at', '')
+    if isinstance(published_at, str):
+        time_display = published_at
+    elif hasattr(published_at, 'isoformat'):
+        time_display = published_at.isoformat()
+    else:
+        time_display = 'Recently'
+    parsed = _parse_published_at(published_at)
+    return {
+        'title': article.get('title', 'Article'),
+        'site': article.get('site', article.get('profile_name', 'Site')),
+        'status': article.get('status', 'draft'),
+        'time': time_display,
+        'type': article.get('article_type', 'stock'),
+        # Sort key; articles without a usable date sort last
+        'sort_key': parsed.isoformat() if parsed else '',
+    }
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {'total': 0, 'by_status': {}, 'by_week': {}, 'recent_activity': [], 'generation': 0}
+
+
+def _generation(stats: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Write counter of a stats document (None when the document does not exist)"""
+    return None if stats is None else stats.get('generation', 0)
+
+
+def _bump_generation(stats: Dict[str, Any], previous: Optional[int]) -> Dict[str, Any]:
+    stats['generation'] = (previous or 0) + 1
+    return stats
+
+
+def fold_article(stats: Dict[str, Any], article: Dict[str, Any]) -> Dict[str, Any]:
+    """Add one article to a stats document in place (and return it)"""
+    status = article.get('status') or 'draft'
+    stats['total'] = stats.get('total', 0) + 1
+    by_status = stats.setdefault('by_status', {})
+    by_status[status] = by_status.get(status, 0) + 1
+
+    published_at = _parse_published_at(article.get('published_at'))
+    if published_at is not None:
+        week = stats.setdefault('by_week', {}).setdefault(week_key(published_at), {})
+        week[status] = week.get(status, 0) + 1
+        if len(stats['by_week']) > STATS_WEEKS_KEPT:
+            for old_week in sorted(stats['by_week'])[:-STATS_WEEKS_KEPT]:
+                del stats['by_week'][old_week]
+
+    recent = stats.setdefault('recent_activity', [])
+    recent.append(activity_item(article))
+    # Stable sort keeps insertion order for equal dates, like the old sort over the raw collection
+    recent.sort(key=lambda item: item.get('sort_key', ''), reverse=True)
+    del recent[RECENT_ACTIVITY_LIMIT:]
+    return stats
+
+
+def summarize(stats: Dict[str, Any], now: Any = None) -> Dict[str, Any]:
+    """Counts the automation pages display, derived from a stats document"""
+    by_status = stats.get('by_status', {})
+    this_week = stats.get('by_week', {}).get(week_key(now or datetime.now(timezone.utc)), {})
+    return {
+        'total_published_count': stats.get('total', 0),
+        'this_week_count': this_week.get('published', 0),
+        'pending_count': sum(by_status.get(status, 0) for status in PENDING_STATUSES),
+        'recent_activity': [
+            {key: value for key, value in item.items() if key != 'sort_key'}
+            for item in stats.get('recent_activity', [])
+        ],
+    }
+
+
+class InMemoryPublishingStatsStore:
+    """Dict-backed stats store for tests and local development"""
+
+    def __init__(self):
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def update(self, user_uid: str, mutate: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        with self._lock:
+            self._docs[user_uid] = mutate(deepcopy(self._docs.get(user_uid)) or empty_stats())
+
+    def get(self, user_uid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            doc = self._docs.get(user_uid)
+            return deepcopy(doc) if doc is not None else None
+
+    def replace_if_generation(self, user_uid: str, generation: Optional[int], stats: Dict[str, Any]) -> bool:
+        with self._lock:
+            if _generation(self._docs.get(user_uid)) != generation:
+                return False
+            self._docs[user_uid] = deepcopy(stats)
+            return True
+
+
+class FirestorePublishingStatsStore:
+    """Stats store backed by Firestore (works against the emulator as well)"""
+
+    def __init__(self, db, collection: str = STATS_COLLECTION):
+        self.db = db
+        self.collection = collection
+
+    def _ref(self, user_uid: str):
+        return self.db.collection(self.collection).document(user_uid)
+
+    def update(self, user_uid: str, mutate: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        """Read-modify-write the user's document in a transaction (retried on contention)"""
+        from firebase_admin import firestore
+        ref = self._ref(user_uid)
+
+        @firestore.transactional
+        def _update(transaction):
+            snapshot = ref.get(transaction=transaction)
+            current = (snapshot.to_dict() or {}) if snapshot.exists else empty_stats()
+            stats = mutate(current)
+            stats['updated_at'] = firestore.SERVER_TIMESTAMP
+            transaction.set(ref, stats)
+
+        _update(self.db.transaction())
+
+    def get(self, user_uid: str) -> Optional[Dict[str, Any]]:
+        snapshot = self._ref(user_uid).get()
+        return (snapshot.to_dict() or {}) if snapshot.exists else None
+
+    def replace_if_generation(self, user_uid: str, generation: Optional[int], stats: Dict[str, Any]) -> bool:
+        """Replace the user's document in a transaction unless its generation moved on"""
+        from firebase_admin import firestore
+        ref = self._ref(user_uid)
+        data = dict(stats)
+        data['updated_at'] = firestore.SERVER_TIMESTAMP
+
+        @firestore.transactional
+        def _replace(transaction):
+            snapshot = ref.get(transaction=transaction)
+            if _generation((snapshot.to_dict() or {}) if snapshot.exists else None) != generation:
+                return False
+            transaction.set(ref, data)
+            return True
+
+        return _replace(self.db.transaction())
+
+
+class PublishingStatsService:
+    """
+    Records published articles into per-user stats and serves them
+
+    Features:
+    - One transactional document update per recorded article
+    - Automation pages read a single document per user
+    - Reconciliation rebuilds the documents from userPublishedArticles
+    """
+
+    def __init__(self, store=None, db=None):
+        """
+        Initialize PublishingStatsService
+
+        Args:
+            store: Stats store (InMemoryPublishingStatsStore / FirestorePublishingStatsStore)
+            db: Firestore client used to build a FirestorePublishingStatsStore when no store is given
+        """
+        if store is None:
+            if db is None:
+                from config.firebase_admin_setup import get_firestore_client
+                db = get_firestore_client()
+            store = FirestorePublishingStatsStore(db)
+        self.store = store
+        self.db = db
+
+    def record_article(self, article: Dict[str, Any]) -> bool:
+        """
+        Fold an article just saved to userPublishedArticles into its user's stats
+
+        A user without a stats document may have older articles, so the
+        document is rebuilt from the raw collection (which already holds the
+        new article) instead of starting from empty stats.
+        """
+        user_uid = article.get('user_uid')
+        if not user_uid:
+            return False
+        try:
+            if self.db is not None and self.store.get(user_uid) is None:
+                self.rebuild_user(user_uid)
+                return True
+
+            def _record(stats):
+                return _bump_generation(fold_article(stats, article), _generation(stats))
+            self.store.update(user_uid, _record)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to update publishing stats for user {user_uid}: {e}")
+            return False
+
+    def get_stats(self, user_uid: str) -> Optional[Dict[str, Any]]:
+        """Raw stats document, or None when the user has none yet"""
+        return self.store.get(user_uid)
+
+    def get_summary(self, user_uid: str, now: Any = None) -> Dict[str, Any]:
+        """
+        Counts and recent activity for the automation pages
+
+        Users without a stats document (e.g. whose articles predate the
+        service) are rebuilt from the raw collection once.
+        """
+        stats = self.store.get(user_uid)
+        if stats is None:
+            stats = self.rebuild_user(user_uid) if self.db is not None else empty_stats()
+        return summarize(stats, now)
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    def rebuild_user(self, user_uid: str, db=None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Recompute one user's stats from userPublishedArticles; returns the stats document
+
+        The write is conditional on the stored generation read before streaming, so an
+        article recorded while the collection is being read is never overwritten: the
+        rebuild restarts (up to REBUILD_ATTEMPTS times) and picks it up from the raw data.
+        """
+        db = db or self.db
+        if db is None:
+            raise ValueError("A Firestore client is required to rebuild publishing stats")
+        for attempt in range(1, REBUILD_ATTEMPTS + 1):
+            generation = _generation(self.store.get(user_uid))
+            articles = db.collection('userPublishedArticles')\
+                .where('user_uid', '==', user_uid)\
+                .select(ARTICLE_FIELDS).stream()
+            stats = empty_stats()
+            for doc in articles:
+                fold_article(stats, doc.to_dict() or {})
+            if dry_run:
+                logger.info(f"Publishing stats computed for user {user_uid}: {stats['total']} articles")
+                return stats
+            _bump_generation(stats, generation)
+            if self.store.replace_if_generation(user_uid, generation, stats):
+                logger.info(f"Publishing stats rebuilt for user {user_uid}: {stats['total']} articles")
+                return stats
+            logger.info(f"Publishing stats for user {user_uid} changed during rebuild (attempt {attempt}), retrying")
+        logger.warning(f"Publishing stats for user {user_uid} kept changing; rebuild not written")
+        return stats
+
+    def rebuild_all(self, db=None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Recompute every user's stats from userPublishedArticles
+
+        Args:
+            db: Firestore client to read the raw collection from (defaults to the service's client)
+            dry_run: Compute the stats without writing them
+
+        Returns:
+            Summary with the number of articles and users, and the users whose stored totals drifted
+        """
+        db = db or self.db
+        if db is None:
+            raise ValueError("A Firestore client is required to rebuild publishing stats")
+
+        per_user: Dict[str, Dict[str, Any]] = {}
+        articles = 0
+        for doc in db.collection('userPublishedArticles').select(ARTICLE_FIELDS).stream():
+            data = doc.to_dict() or {}
+            user_uid = data.get('user_uid')
+            if not user_uid:
+                continue
+            fold_article(per_user.setdefault(user_uid, empty_stats()), data)
+            articles += 1
+
+        drifted: List[str] = []
+        for user_uid, stats in per_user.items():
+            current = self.store.get(user_uid)
+            if current is None or current.get('total') != stats['total'] or current.get('by_status') != stats['by_status']:
+                drifted.append(user_uid)
+            unchanged = current is not None and all(current.get(field) == stats[field]
+                                                    for field in ('total', 'by_status', 'by_week', 'recent_activity'))
+            if not dry_run and not unchanged:
+                # Re-read this user's articles under the generation check rather than
+                # overwriting with the bulk snapshot, which may already be outdated
+                self.rebuild_user(user_uid, db=db)
+
+        logger.info(f"Publishing stats {'computed' if dry_run else 'rebuilt'}: {articles} articles, "
+                    f"{len(per_user)} users, {len(drifted)} drifted")
+        return {'articles': articles, 'users': len(per_user), 'drifted_users': drifted, 'dry_run': dry_run}
+
+
+_default_service: Optional[PublishingStatsService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_publishing_stats_service() -> Optional[PublishingStatsService]:
+    """Process-wide stats service bound to the default Firestore client (None if unavailable)"""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                from config.firebase_admin_setup import get_firestore_client
+                db = get_firestore_client()
+                if db is None:
+                    return None
+                _default_service = PublishingStatsService(db=db)
+    return _default_service
+
+
+def set_publishing_stats_service(service: Optional[PublishingStatsService]):
+    """Override the process-wide stats service (e.g. with an in-memory store in tests)"""
+    global _default_service
+    with _default_service_lock:
+        _default_service = service
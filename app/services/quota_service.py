@@ -3,7 +3,11 @@ Quota Service
 Core service for managing user quotas and usage tracking
 """
 
+import os
+import atexit
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, Tuple
 from calendar import monthrange
@@ -37,65 +41,263 @@ class QuotaServiceError(Exception):
     pass
 
 
+class _QuotaCache:
+    """
+    Bounded, thread-safe LRU for quota documents
+    
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once ``max_entries`` is reached. A per-user key set makes
+    invalidating every entry of a user O(keys of that user).
+    """
+    
+    def __init__(self, max_entries: int = 2048, ttl: int = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (user_uid, resource_type) -> (value, stored_at)
+        self._user_keys = {}           # user_uid -> set of keys
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, user_uid: str, resource_type: str):
+        key = (user_uid, resource_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if time.time() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                self._discard(key)
+            self._misses += 1
+            return None
+    
+    def set(self, user_uid: str, resource_type: str, value):
+        key = (user_uid, resource_type)
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_uid, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._forget_user_key(oldest)
+    
+    def invalidate(self, user_uid: str, resource_type: str = None):
+        with self._lock:
+            if resource_type:
+                self._discard((user_uid, resource_type))
+            else:
+                for key in self._user_keys.pop(user_uid, ()):
+                    self._entries.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None
+            }
+    
+    def _discard(self, key):
+        if self._entries.pop(key, None) is not None:
+            self._forget_user_key(key)
+    
+    def _forget_user_key(self, key):
+        keys = self._user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[key[0]]
+
+
+class _UsageHistoryBuffer:
+    """
+    Write-behind buffer for monthly usage history documents
+    
+    Usage records are appended in memory and flushed together in one batched
+    write, either every ``flush_interval`` seconds, once ``max_pending``
+    records are queued, or on interpreter exit. Each history document gets a
+    merge of field transforms (ArrayUnion of the new records, Increment of
+    the daily and monthly counters), so nothing is read first and concurrent
+    flushes from other workers are not overwritten. Records of a failed flush
+    are re-queued.
+    
+    Records still buffered when the process is killed without running exit
+    handlers (SIGKILL, OOM kill) are lost: at most ``flush_interval`` seconds
+    or ``max_pending`` records of history. Quota counters are not affected;
+    they are consumed transactionally, outside this buffer.
+    """
+    
+    BATCH_LIMIT = 500  # Firestore batch write limit
+    
+    def __init__(self, db, flush_interval: float = 5.0, max_pending: int = 100):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}  # (user_uid, period) -> [StockReportUsage]
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+        atexit.register(self.flush)
+    
+    def append(self, user_uid: str, period: str, usage: StockReportUsage):
+        with self._lock:
+            self._pending.setdefault((user_uid, period), []).append(usage)
+            self._pending_count += 1
+            should_flush = self._pending_count >= self.max_pending
+            self._ensure_worker()
+        if should_flush:
+            self._wakeup.set()
+    
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._pending_count
+    
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='quota-usage-history-writer', daemon=True)
+            self._worker.start()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Usage history flush failed: {e}")
+    
+    def flush(self, user_uid: str = None) -> int:
+        """Write pending records (optionally only one user's); returns the number of records written"""
+        with self._flush_lock:
+            with self._lock:
+                if user_uid is None:
+                    pending, self._pending = self._pending, {}
+                else:
+                    pending = {key: records for key, records in self._pending.items() if key[0] == user_uid}
+                    for key in pending:
+                        del self._pending[key]
+                self._pending_count -= sum(len(records) for records in pending.values())
+            if not pending:
+                return 0
+            
+            written = 0
+            keys = list(pending.keys())
+            for start in range(0, len(keys), self.BATCH_LIMIT):
+                chunk = keys[start:start + self.BATCH_LIMIT]
+                try:
+                    written += self._write_chunk(chunk, pending)
+                except Exception as e:
+                    logger.error(f"Error writing usage history batch: {e}")
+                    self._requeue({key: pending[key] for key in chunk})
+            return written
+    
+    def _write_chunk(self, keys, pending) -> int:
+        batch = self.db.batch()
+        written = 0
+        now = datetime.now(timezone.utc)
+        for key in keys:
+            records = pending[key]
+            daily = {}
+            for usage in records:
+                date_key = usage.timestamp.strftime('%Y-%m-%d')
+                daily[date_key] = daily.get(date_key, 0) + 1
+            batch.set(self._history_ref(*key), {
+                'period': key[1],
+                'user_uid': key[0],
+                'stock_reports': firestore.ArrayUnion([usage.to_dict() for usage in records]),
+                'daily_stats': {date_key: {'stock_reports': firestore.Increment(count)}
+                                for date_key, count in daily.items()},
+                'summary': {'total_stock_reports': firestore.Increment(len(records))},
+                'updated_at': now
+            }, merge=True)
+            written += len(records)
+        batch.commit()
+        return written
+    
+    def _requeue(self, pending):
+        with self._lock:
+            for key, records in pending.items():
+                self._pending.setdefault(key, [])[0:0] = records
+                self._pending_count += len(records)
+    
+    def _history_ref(self, user_uid: str, period: str):
+        return (self.db.collection('userQuotas')
+                .document(user_uid)
+                .collection('usage_history')
+                .document(period))
+
+
 class QuotaService:
     """
     Service for managing user quotas and usage tracking
     
     Features:
     - Check quota availability
-    - Consume quota with atomic transactions
-    - Track usage history
+    - Consume quota with atomic transactions (counter fields only)
+    - Track usage history (optionally write-behind, batched)
     - Handle monthly resets
-    - In-memory caching for performance
+    - Thread-safe LRU caching for performance
     """
     
-    def __init__(self, db=None):
+    def __init__(self, db=None, cache_size: int = 2048, cache_ttl: int = 60,
+                 history_write_behind: bool = None):
         """
         Initialize QuotaService
         
         Args:
             db: Firestore database instance (optional, will use default if not provided)
+            cache_size: Maximum number of cached quota entries
+            cache_ttl: Cache TTL in seconds
+            history_write_behind: Buffer usage history and write it in batches
+                (defaults to the QUOTA_HISTORY_WRITE_BEHIND env var, enabled unless 'false')
         """
         self.db = db if db else firestore.client()
-        self._cache = {}  # Simple in-memory cache
-        self._cache_ttl = 60  # Cache TTL in seconds
+        self._cache = _QuotaCache(max_entries=cache_size, ttl=cache_ttl)
+        self._cache_ttl = cache_ttl
         
-        logger.info("QuotaService initialized")
-    
-    def _get_cache_key(self, user_uid: str, resource_type: str) -> str:
-        """Generate cache key"""
-        return f"{user_uid}:{resource_type}"
+        if history_write_behind is None:
+            history_write_behind = os.getenv('QUOTA_HISTORY_WRITE_BEHIND', 'true').lower() != 'false'
+        self._history_buffer = _UsageHistoryBuffer(self.db) if history_write_behind else None
+        
+        logger.info(f"QuotaService initialized (history write-behind: {bool(self._history_buffer)})")
     
     def _get_cached_quota(self, user_uid: str, resource_type: str) -> Optional[UserQuota]:
         """Get quota from cache if available and not expired"""
-        cache_key = self._get_cache_key(user_uid, resource_type)
-        
-        if cache_key in self._cache:
-            cached_data, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                return cached_data
-            else:
-                # Expired, remove from cache
-                del self._cache[cache_key]
-        
-        return None
+        return self._cache.get(user_uid, resource_type)
     
     def _set_cached_quota(self, user_uid: str, resource_type: str, quota: UserQuota):
         """Set quota in cache"""
-        cache_key = self._get_cache_key(user_uid, resource_type)
-        self._cache[cache_key] = (quota, time.time())
+        self._cache.set(user_uid, resource_type, quota)
     
     def _invalidate_cache(self, user_uid: str, resource_type: str = None):
         """Invalidate cache for user"""
-        if resource_type:
-            cache_key = self._get_cache_key(user_uid, resource_type)
-            if cache_key in self._cache:
-                del self._cache[cache_key]
-        else:
-            # Invalidate all cache entries for this user
-            keys_to_delete = [k for k in self._cache.keys() if k.startswith(f"{user_uid}:")]
-            for key in keys_to_delete:
-                del self._cache[key]
+        self._cache.invalidate(user_uid, resource_type)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Quota cache and usage history buffer statistics"""
+        stats = {'quota_cache': self._cache.stats()}
+        if self._history_buffer:
+            stats['pending_usage_history'] = self._history_buffer.pending_count()
+        return stats
+    
+    def flush_usage_history(self, user_uid: str = None) -> int:
+        """Write buffered usage history now (all users, or only ``user_uid``)"""
+        if not self._history_buffer:
+            return 0
+        return self._history_buffer.flush(user_uid)
     
     def _get_current_period(self) -> Tuple[datetime, datetime]:
         """Get current billing period (month start and end)"""
@@ -312,7 +514,9 @@ class QuotaService:
         """
         Consume quota in an atomic transaction
         
-        This runs inside a Firestore transaction to ensure atomicity
+        This runs inside a Firestore transaction to ensure atomicity. The limit is
+        re-checked against the stored counter (the pre-check may have used a cached
+        quota) and only the counter fields are written.
         """
         quota_ref = self.db.collection('userQuotas').document(user_uid)
         quota_doc = quota_ref.get(transaction=transaction)
@@ -325,16 +529,35 @@ class QuotaService:
         
         # Increment usage counter
         if resource_type == ResourceType.STOCK_REPORT.value:
+            limit = quota.quota_limits.stock_reports_monthly
+            if not is_unlimited(limit) and quota.current_usage.stock_reports >= limit:
+                raise QuotaExceededException(
+                    f"Quota exceeded for {resource_type}",
+                    quota_info={
+                        'has_quota': False,
+                        'limit': limit,
+                        'used': quota.current_usage.stock_reports,
+                        'remaining': 0,
+                        'unlimited': False,
+                        'plan_type': quota.plan_type,
+                        'period_end': quota.current_period_end.isoformat()
+                    }
+                )
             quota.current_usage.stock_reports += 1
             quota.lifetime_stats.total_stock_reports += 1
+            updates = {
+                'current_usage.stock_reports': quota.current_usage.stock_reports,
+                'lifetime_stats.total_stock_reports': quota.lifetime_stats.total_stock_reports
+            }
         else:
             raise ValueError(f"Unsupported resource type: {resource_type}")
         
         # Update timestamp
         quota.updated_at = datetime.now(timezone.utc)
+        updates['updated_at'] = quota.updated_at
         
         # Update in transaction
-        transaction.update(quota_ref, quota.to_dict())
+        transaction.update(quota_ref, updates)
         
         return quota
     
@@ -370,35 +593,18 @@ class QuotaService:
             # Consume quota in transaction
             @firestore.transactional
             def update_quota(transaction):
-                quota_ref = self.db.collection('userQuotas').document(user_uid)
-                quota_doc = quota_ref.get(transaction=transaction)
-                
-                if not quota_doc.exists:
-                    raise QuotaServiceError(f"Quota document not found for user {user_uid}")
-                
-                quota_data = quota_doc.to_dict()
-                quota = UserQuota.from_dict(quota_data)
-                
-                # Increment usage counter
-                if resource_type == ResourceType.STOCK_REPORT.value:
-                    quota.current_usage.stock_reports += 1
-                    quota.lifetime_stats.total_stock_reports += 1
-                else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
-                
-                # Update timestamp
-                quota.updated_at = datetime.now(timezone.utc)
-                
-                # Update in transaction
-                transaction.update(quota_ref, quota.to_dict())
-                
-                return quota
+                return self._consume_quota_transaction(transaction, user_uid, resource_type, metadata)
             
             transaction = self.db.transaction()
-            updated_quota = update_quota(transaction)
+            try:
+                updated_quota = update_quota(transaction)
+            except QuotaExceededException:
+                self._invalidate_cache(user_uid)
+                raise
             
-            # Invalidate cache
+            # Keep the cache warm with the committed counters so the next check needs no read
             self._invalidate_cache(user_uid)
+            self._set_cached_quota(user_uid, 'quota', updated_quota)
             
             # Record usage history
             self._record_usage_history(user_uid, resource_type, metadata)
@@ -426,9 +632,19 @@ class QuotaService:
     
     def _record_usage_history(self, user_uid: str, resource_type: str, 
                               metadata: Dict[str, Any]):
-        """Record usage in history collection"""
+        """Record usage in history collection (queued for a batched write when write-behind is enabled)"""
         try:
             period = self._get_period_string()
+            
+            if self._history_buffer and resource_type == ResourceType.STOCK_REPORT.value:
+                self._history_buffer.append(user_uid, period, StockReportUsage(
+                    ticker=metadata.get('ticker', 'UNKNOWN'),
+                    report_id=metadata.get('report_id'),
+                    status=metadata.get('status', 'success'),
+                    generation_time_ms=metadata.get('generation_time_ms', 0)
+                ))
+                return
+            
             history_ref = (self.db.collection('userQuotas')
                           .document(user_uid)
                           .collection('usage_history')
@@ -480,6 +696,9 @@ class QuotaService:
             if not quota:
                 return {'error': 'User quota not found'}
             
+            # Make buffered records visible before reading the history
+            self.flush_usage_history(user_uid)
+            
             # Get usage history
             history_ref = (self.db.collection('userQuotas')
                           .document(user_uid)
@@ -148,6 +148,8 @@ if PROJECT_ROOT not in sys.path:
 
 load_dotenv()
 
+from automation_scripts.progress_bus import get_progress_bus
+
 try:
     from gemini_article_system import generate_article_from_pipeline
     GEMINI_ARTICLE_SYSTEM_AVAILABLE = True
@@ -263,7 +265,7 @@ def get_file_content_from_storage(storage_path, original_filename):
         app_logger.error(f"Error downloading '{original_filename}' from Firebase Storage path '{storage_path}': {e}", exc_info=True)
         return None
 
-def _emit_automation_progress(socketio_instance, user_room, profile_id, ticker, phase, stage, message, status="info"):
+def _emit_automation_progress(socketio_instance, user_room, profile_id, ticker, phase, stage, message, status="info", terminal=False):
     if socketio_instance and user_room:
         payload = {
             'profile_id': profile_id,
@@ -275,8 +277,7 @@ def _emit_automation_progress(socketio_instance, user_room, profile_id, ticker,
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
         try:
-            socketio_instance.emit('automation_update', payload, room=user_room)
-            socketio_instance.sleep(0.01) 
+            get_progress_bus(socketio_instance).emit('automation_update', payload, room=user_room, terminal=terminal)
         except Exception as e:
             app_logger.error(f"Failed to emit SocketIO message to room {user_room}: {e}")
     else:
@@ -1161,7 +1162,7 @@ def trigger_publishing_run(user_uid, profiles_to_process_data_list, articles_to_
                     app_logger.info(f"[SAVE_CALLBACK] Pre-call for {ticker_to_process} (Skipped - Already Published): {status_data}")
                     save_status_callback(user_uid, profile_id, ticker_to_process, status_data)
                 current_run_detailed_logs_for_profile.append({"ticker": ticker_to_process, "status": final_post_status, "message": msg, "generated_at": gen_time_val, "published_at": pub_time_val, "writer_username": writer_val})
-                socketio_instance.emit('ticker_processed_update', { # This is for progress bar
+                get_progress_bus(socketio_instance).emit('ticker_processed_update', { # This is for progress bar
                     'profile_id': profile_id, 'ticker': ticker_to_process, 'status': final_post_status,
                     'generated_at': gen_time_val, 'published_at': pub_time_val, 'writer_username': writer_val
                 }, room=user_room)
@@ -1302,7 +1303,7 @@ def trigger_publishing_run(user_uid, profiles_to_process_data_list, articles_to_
                     _emit_automation_progress(socketio_instance, user_room, profile_id, ticker_to_process, "Report Gen", "Done", "Content generated.", "success")
                     final_post_status = "Generated" # Intermediate status
 
-                    socketio_instance.emit('ticker_processed_update', { # For progress bar
+                    get_progress_bus(socketio_instance).emit('ticker_processed_update', { # For progress bar
                         'profile_id': profile_id, 'ticker': ticker_to_process, 'status': final_post_status,
                         'generated_at': gen_time_iso, 'published_at': None, 'writer_username': writer_name
                     }, room=user_room)
@@ -1596,7 +1597,8 @@ def trigger_publishing_run(user_uid, profiles_to_process_data_list, articles_to_
                     'last_processed_index': processed_item_count_for_event,
                     'total_count': total_items_in_file
                 }
-                socketio_instance.emit('ticker_processed_update', event_payload_for_attractive_bar, room=user_room)
+                get_progress_bus(socketio_instance).emit('ticker_processed_update', event_payload_for_attractive_bar,
+                                                         room=user_room, coalesce=True)
 
             _emit_automation_progress(socketio_instance, user_room, profile_id, ticker_to_process,
                                     "Ticker Processing", "Progress",
@@ -1624,7 +1626,7 @@ def trigger_publishing_run(user_uid, profiles_to_process_data_list, articles_to_
         _active_runs[user_uid][profile_id]["active"] = False
 
     save_state(state, user_uid=user_uid)
-    _emit_automation_progress(socketio_instance, user_room, "Overall", "N/A", "Completion", "Run Finished", "All selected profiles processed.", "success")
+    _emit_automation_progress(socketio_instance, user_room, "Overall", "N/A", "Completion", "Run Finished", "All selected profiles processed.", "success", terminal=True)
     if user_uid in _active_runs and all(not info.get("active", False) for info in _active_runs[user_uid].values()):
         del _active_runs[user_uid]
 
@@ -2,12 +2,55 @@
 Firestore state management module for WordPress publisher
 This module replaces the pickle-based state management with Firestore-based state
 to ensure persistence across container restarts.
+
+Layout
+------
+The hot document ``wordpress_publisher_state/{uid}`` holds the small
+per-profile maps (pending / failed tickers, daily counts, author and ticker
+indexes, publish counts), ``last_run_date`` and a ``state_version`` counter.
+The unbounded logs live in per-day subdocuments, and the lifetime published
+set is kept in one compact index document:
+
+    wordpress_publisher_state/{uid}/daily_logs/{YYYY-MM-DD}
+        published_tickers_by_profile                {pid: [tickers published that day]}
+        processed_tickers_detailed_log_by_profile   {pid: [detailed log entries of that day]}
+    wordpress_publisher_state/{uid}/publisher_index/published
+        published_tickers_by_profile                {pid: [every ticker ever published]}
+
+A full load reads three documents: the hot document, the published index and
+the current day's log. Callers still get and pass the same state dict as
+before (published log as sets, processed log as today's list).
+
+Caching and deltas
+------------------
+The persisted state is cached per user. Within ``PUBLISHER_STATE_CACHE_TTL``
+seconds a load is served from memory; after that only ``state_version`` is
+read and the full state is reloaded only when another writer bumped it.
+
+Loaded states are ``PublisherState`` dicts that remember the persisted copy
+they were loaded from (or last saved as). A save diffs the state against that
+copy and, in one transaction, updates only the changed ``<key>.<profile_id>`` field paths,
+``ArrayUnion``-s newly published tickers into the day's log document and the
+published index and rewrites the day's detailed log for profiles whose log
+changed. A save with no changes writes nothing.
+
+The transaction compares ``state_version`` with the version of the copy the
+diff was taken against (cache entries are never modified once cached, so a
+concurrent save in the same process cannot move that version). When another writer got in first it aborts, the
+state is reloaded and the caller's changes are replayed on top of it (daily
+post counters keep the other writer's increments); the caller's state dict is
+updated in place to the merged state. After ``PUBLISHER_STATE_SAVE_ATTEMPTS``
+conflicting attempts the save gives up and returns False.
+
+Documents written by older layouts (logs inline in the hot document, or daily
+logs without a published index) are migrated on first load.
 """
 import os
-import pickle
+import time
 import logging
-from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+import threading
+from copy import deepcopy
+from datetime import datetime, timezone
 
 # Configure logger
 logger = logging.getLogger("FirestoreStateManager")
@@ -22,13 +65,80 @@ except ImportError:
     logger.error("Failed to import get_firestore_client from firebase_admin_setup")
     get_firestore_client = lambda: None
 
+STATE_COLLECTION = 'wordpress_publisher_state'
+DAILY_LOGS_COLLECTION = 'daily_logs'
+INDEX_COLLECTION = 'publisher_index'
+PUBLISHED_INDEX_DOC = 'published'
+VERSION_FIELD = 'state_version'
+STATE_CACHE_TTL = float(os.getenv('PUBLISHER_STATE_CACHE_TTL', '30'))
+SAVE_ATTEMPTS = max(1, int(os.getenv('PUBLISHER_STATE_SAVE_ATTEMPTS', '3')))
+
+PUBLISHED_LOG_KEY = 'published_tickers_log_by_profile'
+PROCESSED_LOG_KEY = 'processed_tickers_detailed_log_by_profile'
+# Field names of the logs inside a daily log document
+DAILY_PUBLISHED_FIELD = 'published_tickers_by_profile'
+DAILY_PROCESSED_FIELD = PROCESSED_LOG_KEY
+LOG_KEYS = (PUBLISHED_LOG_KEY, PROCESSED_LOG_KEY)
+# Per-profile counters whose concurrent increments are kept when a save is replayed
+COUNTER_KEYS = ('posts_today_by_profile',)
+
+
+def _today():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+class PublisherState(dict):
+    """
+    State dict handed out by ``load_state_from_firestore``
+
+    ``baseline`` is the persisted copy (cache entry) the state was loaded from
+    or last saved as; saves diff against it and Firestore must still be at its
+    version for the write to go through.
+    """
+    __slots__ = ('baseline',)
+
+    def __init__(self, *args, baseline=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.baseline = baseline
+
+
+class _StaleState(Exception):
+    """Raised inside the save transaction when state_version moved past the cached copy"""
+
+
+def _field_path(*parts):
+    """Quoted Firestore field path (profile ids may contain characters that need quoting)"""
+    from firebase_admin import firestore
+    return firestore.FieldPath(*[str(p) for p in parts]).to_api_repr()
+
+
 class FirestoreStateManager:
     """Manages WordPress publisher state in Firestore"""
-    
-    def __init__(self):
+
+    def __init__(self, cache_ttl=STATE_CACHE_TTL):
         """Initialize the Firestore state manager"""
         self.db = None
-        
+        self.cache_ttl = cache_ttl
+        # user_uid -> {'hot': persisted hot fields, 'published': {pid: set}, 'processed': {pid: list},
+        #              'log_day': day of 'processed',
+        #              'version': int or None (unknown: reload on next check), 'checked_at': monotonic}
+        self._cache = {}
+        self._lock = threading.RLock()
+        self._stats = {
+            'cache_hits': 0,
+            'version_checks': 0,
+            'full_loads': 0,
+            'saves': 0,
+            'noop_saves': 0,
+            'fields_written': 0,
+            'conflicts': 0,
+            'migrations': 0,
+        }
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
     def _get_db(self):
         """Get or initialize the Firestore client"""
         if self.db is None:
@@ -36,51 +146,175 @@ class FirestoreStateManager:
             if self.db is None:
                 logger.error("Firestore client not available")
         return self.db
-    
+
+    def _state_ref(self, db, user_uid):
+        return db.collection(STATE_COLLECTION).document(user_uid)
+
+    def _day_ref(self, db, user_uid, day):
+        return self._state_ref(db, user_uid).collection(DAILY_LOGS_COLLECTION).document(day)
+
+    def _index_ref(self, db, user_uid):
+        return self._state_ref(db, user_uid).collection(INDEX_COLLECTION).document(PUBLISHED_INDEX_DOC)
+
+    @staticmethod
+    def _empty_entry():
+        return {'hot': {}, 'published': {}, 'processed': {}, 'log_day': None,
+                'version': None, 'checked_at': time.monotonic()}
+
     def _create_default_state(self, profile_ids=None):
         """Create default state structure"""
         profile_ids = profile_ids or []
         profile_ids = [str(pid) for pid in profile_ids]
-        
+
         default_factories = {
-            'pending_tickers_by_profile': list, 
+            'pending_tickers_by_profile': list,
             'failed_tickers_by_profile': list,
             'last_successful_schedule_time_by_profile': lambda: None,
-            'posts_today_by_profile': lambda: 0, 
+            'posts_today_by_profile': lambda: 0,
             'published_tickers_log_by_profile': list,  # Changed from set to list for Firestore
             'processed_tickers_detailed_log_by_profile': list,
             'last_author_index_by_profile': lambda: -1,
             'last_processed_ticker_index_by_profile': lambda: -1,
             'ticker_publish_count_by_profile': lambda: {}  # Track variations per ticker per profile
         }
-        
+
         state = {}
         for key, factory in default_factories.items():
             state[key] = {}
             for pid in profile_ids:
                 state[key][pid] = factory() if callable(factory) else factory
-                
-        state['last_run_date'] = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        
+
+        state['last_run_date'] = _today()
+
         # No global tracker needed - we track variations per profile
-        
+
+        return state
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _read_entry(self, db, user_uid):
+        """Read the persisted state (hot document, published index, current daily log) into a cache entry"""
+        self._count('full_loads')
+        state_ref = self._state_ref(db, user_uid)
+        snapshot = state_ref.get()
+        if not snapshot.exists:
+            return None
+        hot = snapshot.to_dict() or {}
+        version = hot.pop(VERSION_FIELD, 0)
+        log_day = hot.get('last_run_date') or _today()
+
+        index_snapshot = self._index_ref(db, user_uid).get()
+        published = None
+        if index_snapshot.exists:
+            index = index_snapshot.to_dict() or {}
+            published = {pid: set(tickers or []) for pid, tickers in (index.get(DAILY_PUBLISHED_FIELD) or {}).items()}
+        day_data = self._day_ref(db, user_uid, log_day).get().to_dict() or {}
+        processed = {pid: list(entries or []) for pid, entries in (day_data.get(DAILY_PROCESSED_FIELD) or {}).items()}
+
+        inline_logs = {key: hot.pop(key) for key in LOG_KEYS if key in hot}
+        if published is None or inline_logs:
+            if published is None:
+                # Written before the published index existed: build it once from the daily logs
+                published = {}
+                for day_doc in state_ref.collection(DAILY_LOGS_COLLECTION).stream():
+                    for pid, tickers in ((day_doc.to_dict() or {}).get(DAILY_PUBLISHED_FIELD) or {}).items():
+                        published.setdefault(pid, set()).update(tickers or [])
+            # Old layout: move the inline logs into the daily log document and the index
+            for pid, tickers in (inline_logs.get(PUBLISHED_LOG_KEY) or {}).items():
+                published.setdefault(pid, set()).update(tickers or [])
+            for pid, entries in (inline_logs.get(PROCESSED_LOG_KEY) or {}).items():
+                processed.setdefault(pid, list(entries or []))
+            version = self._migrate_logs(db, user_uid, log_day, published, processed, inline_logs, version)
+
+        return {
+            'hot': hot,
+            'published': published,
+            'processed': processed,
+            'log_day': log_day,
+            'version': version,
+            'checked_at': time.monotonic(),
+        }
+
+    def _migrate_logs(self, db, user_uid, day, published, processed, inline_logs, version):
+        """Write the published index (and move inline logs to daily_logs/{day}); returns the new version"""
+        from firebase_admin import firestore
+        try:
+            batch = db.batch()
+            batch.set(self._index_ref(db, user_uid), {
+                'updated_at': firestore.SERVER_TIMESTAMP,
+                DAILY_PUBLISHED_FIELD: {str(pid): firestore.ArrayUnion(sorted(tickers)) for pid, tickers in published.items()},
+            }, merge=True)
+            if inline_logs:
+                batch.set(self._day_ref(db, user_uid, day), {
+                    'date': day,
+                    DAILY_PUBLISHED_FIELD: {str(pid): sorted(tickers) for pid, tickers in published.items()},
+                    DAILY_PROCESSED_FIELD: {str(pid): entries for pid, entries in processed.items()},
+                }, merge=True)
+                batch.update(self._state_ref(db, user_uid), {
+                    PUBLISHED_LOG_KEY: firestore.DELETE_FIELD,
+                    PROCESSED_LOG_KEY: firestore.DELETE_FIELD,
+                    VERSION_FIELD: firestore.Increment(1),
+                })
+            batch.commit()
+            self._count('migrations')
+            logger.info(f"Built the published ticker index of user {user_uid}"
+                        + (f" and moved inline logs to {DAILY_LOGS_COLLECTION}/{day}" if inline_logs else ""))
+            return None if inline_logs else version  # Increment result unknown: reload on the next version check
+        except Exception as e:
+            logger.warning(f"Could not migrate publisher logs for user {user_uid}: {e}")
+            return version
+
+    def _current_entry(self, db, user_uid, refresh=False):
+        """Cached entry for a user, revalidated against state_version once the TTL has passed"""
+        with self._lock:
+            entry = self._cache.get(user_uid)
+        if entry is not None and not refresh:
+            if time.monotonic() - entry['checked_at'] < self.cache_ttl:
+                self._count('cache_hits')
+                return entry
+            if entry['version'] is not None:
+                self._count('version_checks')
+                snapshot = self._state_ref(db, user_uid).get(field_paths=[VERSION_FIELD])
+                if snapshot.exists and (snapshot.to_dict() or {}).get(VERSION_FIELD, 0) == entry['version']:
+                    entry['checked_at'] = time.monotonic()
+                    return entry
+        entry = self._read_entry(db, user_uid)
+        with self._lock:
+            if entry is None:
+                self._cache.pop(user_uid, None)
+            else:
+                self._cache[user_uid] = entry
+        return entry
+
+    def _state_from_entry(self, entry):
+        """Caller-owned state dict in the shape the publisher works with"""
+        state = deepcopy(entry['hot'])
+        state[PUBLISHED_LOG_KEY] = {pid: set(tickers) for pid, tickers in entry['published'].items()}
+        state[PROCESSED_LOG_KEY] = deepcopy(entry['processed'])
         return state
-    
+
+    def invalidate(self, user_uid=None):
+        """Drop the cached state of one user (or of every user)"""
+        with self._lock:
+            if user_uid is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(user_uid, None)
+
     def load_state_from_firestore(self, user_uid, profile_ids=None):
         """Load WordPress publisher state from Firestore"""
         db = self._get_db()
         if not db:
             logger.error("Firestore client not available for loading state")
             return self._create_default_state(profile_ids)
-            
+
         try:
-            # Get state document
-            state_doc_ref = db.collection('wordpress_publisher_state').document(user_uid)
-            state_doc = state_doc_ref.get()
-            
-            if state_doc.exists:
-                state_data = state_doc.to_dict()
-                
+            entry = self._current_entry(db, user_uid)
+
+            if entry is not None:
+                state_data = PublisherState(self._state_from_entry(entry), baseline=entry)
+
                 # Handle profile_ids that might not be in the state yet
                 if profile_ids:
                     default_state = self._create_default_state(profile_ids)
@@ -93,64 +327,270 @@ class FirestoreStateManager:
                             pid_str = str(pid)
                             if pid_str not in state_data[key]:
                                 state_data[key][pid_str] = default_state[key][pid_str]
-                
-                # Convert lists back to sets for 'published_tickers_log_by_profile'
-                if 'published_tickers_log_by_profile' in state_data:
-                    for pid, tickers in state_data['published_tickers_log_by_profile'].items():
-                        state_data['published_tickers_log_by_profile'][pid] = set(tickers)
-                
+
+                # Published log is a set per profile in memory
+                for pid, tickers in state_data[PUBLISHED_LOG_KEY].items():
+                    state_data[PUBLISHED_LOG_KEY][pid] = set(tickers)
+
                 # Ensure ticker_publish_count_by_profile exists
                 if 'ticker_publish_count_by_profile' not in state_data:
                     state_data['ticker_publish_count_by_profile'] = {str(pid): {} for pid in profile_ids} if profile_ids else {}
-                
-                logger.info(f"Loaded state from Firestore for user {user_uid}")
-                
+
+                logger.debug(f"Loaded state for user {user_uid}")
+
                 # Check if we need to reset daily counts
-                current_date_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+                current_date_str = _today()
                 if state_data.get('last_run_date') != current_date_str:
                     logger.info(f"New day ({current_date_str}). Resetting daily counts and processed logs.")
                     for pid_in_state in list(state_data.get('posts_today_by_profile', {}).keys()):
                         state_data['posts_today_by_profile'][pid_in_state] = 0
-                    for pid_in_state in list(state_data.get('processed_tickers_detailed_log_by_profile', {}).keys()):
-                        state_data['processed_tickers_detailed_log_by_profile'][pid_in_state] = []
+                    for pid_in_state in list(state_data.get(PROCESSED_LOG_KEY, {}).keys()):
+                        state_data[PROCESSED_LOG_KEY][pid_in_state] = []
                     # Reset ticker publish counts for new day (allow fresh variations)
                     for pid_in_state in list(state_data.get('ticker_publish_count_by_profile', {}).keys()):
                         state_data['ticker_publish_count_by_profile'][pid_in_state] = {}
                     state_data['last_run_date'] = current_date_str
-                    # Save the updated state back to Firestore
+                    # Persist the reset (only the changed counters are written)
                     self.save_state_to_firestore(user_uid, state_data)
-                
+
                 return state_data
             else:
                 # Create default state
                 default_state = self._create_default_state(profile_ids)
                 logger.info(f"No existing state in Firestore for user {user_uid}, creating default")
-                state_doc_ref.set(default_state)
-                return default_state
+                hot = {key: value for key, value in default_state.items() if key not in LOG_KEYS}
+                batch = db.batch()
+                batch.set(self._state_ref(db, user_uid), dict(hot, **{VERSION_FIELD: 0}))
+                batch.set(self._index_ref(db, user_uid), {DAILY_PUBLISHED_FIELD: {}})
+                batch.commit()
+                entry = {
+                    'hot': deepcopy(hot), 'published': {}, 'processed': {},
+                    'log_day': default_state['last_run_date'],
+                    'version': 0, 'checked_at': time.monotonic(),
+                }
+                with self._lock:
+                    self._cache[user_uid] = entry
+                return PublisherState(default_state, baseline=entry)
         except Exception as e:
             logger.error(f"Error loading state from Firestore: {e}", exc_info=True)
             return self._create_default_state(profile_ids)
-    
+
+    # ------------------------------------------------------------------
+    # Saving
+    # ------------------------------------------------------------------
+    def _diff(self, entry, state):
+        """
+        Field-level changes of ``state`` against the persisted copy in ``entry``
+
+        Returns (hot field changes {(key, profile id or None): value}, published
+        additions {pid: set}, published removals {pid: set}, processed log
+        rewrites {pid: list}, log day).
+        """
+        hot = entry['hot']
+        changes = {}
+        for key, value in state.items():
+            if key in LOG_KEYS:
+                continue
+            persisted = hot.get(key)
+            if isinstance(value, dict) and isinstance(persisted, dict) and key.endswith('_by_profile'):
+                for pid, pid_value in value.items():
+                    if str(pid) not in persisted or persisted[str(pid)] != pid_value:
+                        changes[(key, str(pid))] = pid_value
+            elif key not in hot or persisted != value:
+                changes[(key, None)] = value
+
+        day = state.get('last_run_date') or _today()
+        added, removed = {}, {}
+        for pid, tickers in (state.get(PUBLISHED_LOG_KEY) or {}).items():
+            current = set(tickers or [])
+            known = entry['published'].get(str(pid), set())
+            if current - known:
+                added[str(pid)] = current - known
+            if known - current:
+                removed[str(pid)] = known - current
+
+        persisted_processed = entry['processed'] if day == entry['log_day'] else {}
+        processed = {}
+        for pid, entries in (state.get(PROCESSED_LOG_KEY) or {}).items():
+            entries = list(entries or [])
+            if entries != persisted_processed.get(str(pid), []):
+                processed[str(pid)] = entries
+        return changes, added, removed, processed, day
+
+    def _persistable(self, state):
+        """Firestore-compatible copy of a caller state (profile ids as strings, published log kept as sets)"""
+        sanitized_state = self._sanitize_state_for_firestore(
+            {key: value for key, value in state.items() if key != PUBLISHED_LOG_KEY})
+        sanitized_state[PUBLISHED_LOG_KEY] = state.get(PUBLISHED_LOG_KEY) or {}
+        for key, value in sanitized_state.items():
+            if key.endswith('_by_profile') and isinstance(value, dict):
+                sanitized_state[key] = {str(pid): pid_value for pid, pid_value in value.items()}
+        return sanitized_state
+
+    def _rebase(self, state, base, fresh):
+        """
+        Replay the caller's changes (``state`` against ``base``) on top of the
+        freshly loaded ``fresh`` entry and write the merged state back into
+        ``state`` in place, so later saves do not undo the other writer's changes.
+        """
+        changes, added, removed, processed, day = self._diff(base, self._persistable(state))
+        merged = self._state_from_entry(fresh)
+        for (key, pid), value in changes.items():
+            if pid is None:
+                merged[key] = value
+                continue
+            target = merged.setdefault(key, {})
+            before = (base['hot'].get(key) or {}).get(pid)
+            if key in COUNTER_KEYS and isinstance(value, int) and isinstance(before, int) and value >= before:
+                # Keep the other writer's increments and add ours on top
+                value = (target.get(pid) or 0) + value - before
+            target[pid] = value
+        for pid, tickers in added.items():
+            merged[PUBLISHED_LOG_KEY].setdefault(pid, set()).update(tickers)
+        for pid, tickers in removed.items():
+            merged[PUBLISHED_LOG_KEY].setdefault(pid, set()).difference_update(tickers)
+        if fresh['log_day'] != day:
+            merged[PROCESSED_LOG_KEY] = {}
+        merged[PROCESSED_LOG_KEY].update(processed)
+
+        for key, value in merged.items():
+            current = state.get(key)
+            if not (isinstance(current, dict) and isinstance(value, dict)):
+                state[key] = value
+                continue
+            # Update nested containers in place: callers may hold references to them
+            by_str = {str(pid): pid for pid in current}
+            for pid, pid_value in value.items():
+                caller_pid = by_str.get(pid, pid)
+                existing = current.get(caller_pid)
+                if isinstance(existing, set) and isinstance(pid_value, set):
+                    existing.clear()
+                    existing.update(pid_value)
+                elif isinstance(existing, list) and isinstance(pid_value, list):
+                    existing[:] = pid_value
+                else:
+                    current[caller_pid] = pid_value
+
     def save_state_to_firestore(self, user_uid, state):
-        """Save WordPress publisher state to Firestore"""
+        """Save WordPress publisher state to Firestore (only the fields that changed)"""
         db = self._get_db()
         if not db:
             logger.error("Firestore client not available for saving state")
             return False
-            
+
         try:
-            # Sanitize state data (ensure all values are Firestore-compatible)
-            sanitized_state = self._sanitize_state_for_firestore(state)
-            
-            # Save state document
-            state_doc_ref = db.collection('wordpress_publisher_state').document(user_uid)
-            state_doc_ref.set(sanitized_state, merge=True)
-            logger.info(f"Saved state to Firestore for user {user_uid}")
-            return True
+            # Diff against the copy this state was loaded from: the cache may already hold
+            # another save's result, which would hide this state's own changes
+            entry = getattr(state, 'baseline', None) or self._current_entry(db, user_uid) or self._empty_entry()
+            for _ in range(SAVE_ATTEMPTS):
+                try:
+                    entry = self._write_changes(db, user_uid, state, entry)
+                    if isinstance(state, PublisherState):
+                        state.baseline = entry
+                    return True
+                except _StaleState:
+                    # Another writer got in first: reload and replay our changes on top of theirs
+                    self._count('conflicts')
+                    fresh = self._current_entry(db, user_uid, refresh=True) or self._empty_entry()
+                    self._rebase(state, entry, fresh)
+                    entry = fresh
+            logger.warning(f"Giving up saving state for user {user_uid} after {SAVE_ATTEMPTS} conflicting writes")
+            self.invalidate(user_uid)
+            return False
         except Exception as e:
             logger.error(f"Error saving state to Firestore: {e}", exc_info=True)
+            self.invalidate(user_uid)
             return False
-    
+
+    @staticmethod
+    def _entry_after_save(entry, sanitized_state, added, removed, processed, day, version):
+        """New cache entry: ``entry`` with a successful save applied (entries are never modified once cached)"""
+        hot = deepcopy(entry['hot'])
+        for key, value in sanitized_state.items():
+            if key in LOG_KEYS:
+                continue
+            if isinstance(value, dict) and isinstance(hot.get(key), dict):
+                hot[key].update(deepcopy(value))  # profiles missing from the state stay persisted
+            else:
+                hot[key] = deepcopy(value)
+        published = {pid: set(tickers) for pid, tickers in entry['published'].items()}
+        for pid, tickers in added.items():
+            published.setdefault(pid, set()).update(tickers)
+        for pid, tickers in removed.items():
+            published[pid] = published.get(pid, set()) - tickers
+        processed_log = deepcopy(entry['processed']) if entry['log_day'] == day else {}
+        processed_log.update(deepcopy(processed))
+        return {'hot': hot, 'published': published, 'processed': processed_log, 'log_day': day,
+                'version': version, 'checked_at': time.monotonic()}
+
+    def _write_changes(self, db, user_uid, state, entry):
+        """
+        Flush the changes of ``state`` against ``entry`` and return the entry now persisted
+
+        Raises _StaleState if Firestore moved past ``entry``'s version. ``entry``
+        is a snapshot: saves cache a new entry instead of modifying the old one,
+        so its version stays the baseline this diff was taken against.
+        """
+        from firebase_admin import firestore
+
+        # Sanitize state data (ensure all values are Firestore-compatible)
+        sanitized_state = self._persistable(state)
+        changes, added, removed, processed, day = self._diff(entry, sanitized_state)
+        base_version = entry['version']
+        self._count('saves')
+        if not (changes or added or removed or processed):
+            self._count('noop_saves')
+            logger.debug(f"State unchanged for user {user_uid}; nothing to save")
+            return entry
+
+        hot_updates = {_field_path(key) if pid is None else _field_path(key, pid): value
+                       for (key, pid), value in changes.items()}
+        state_ref = self._state_ref(db, user_uid)
+        day_ref = self._day_ref(db, user_uid, day)
+        index_ref = self._index_ref(db, user_uid)
+
+        @firestore.transactional
+        def _flush(transaction):
+            snapshot = state_ref.get(field_paths=[VERSION_FIELD], transaction=transaction)
+            if not snapshot.exists:
+                hot = {key: value for key, value in sanitized_state.items() if key not in LOG_KEYS}
+                transaction.set(state_ref, dict(hot, **{VERSION_FIELD: 1}))
+                version = 0
+            else:
+                version = (snapshot.to_dict() or {}).get(VERSION_FIELD, 0)
+                if version != base_version:
+                    raise _StaleState(f"state_version is {version}, the diff was taken against {base_version}")
+                transaction.update(state_ref, dict(hot_updates, **{VERSION_FIELD: version + 1}))
+            if added or processed:
+                day_update = {'date': day}
+                if added:
+                    day_update[DAILY_PUBLISHED_FIELD] = {pid: firestore.ArrayUnion(sorted(tickers)) for pid, tickers in added.items()}
+                if processed:
+                    day_update[DAILY_PROCESSED_FIELD] = processed
+                transaction.set(day_ref, day_update, merge=True)
+            if added:
+                transaction.set(index_ref, {
+                    DAILY_PUBLISHED_FIELD: {pid: firestore.ArrayUnion(sorted(tickers)) for pid, tickers in added.items()}
+                }, merge=True)
+            if removed:
+                # Rare (tickers dropped from the published log): the index is the source of truth
+                transaction.set(index_ref, {
+                    DAILY_PUBLISHED_FIELD: {pid: firestore.ArrayRemove(sorted(tickers)) for pid, tickers in removed.items()}
+                }, merge=True)
+            return version
+
+        version = _flush(db.transaction())
+
+        updated = self._entry_after_save(entry, sanitized_state, added, removed, processed, day, version + 1)
+        with self._lock:
+            self._stats['fields_written'] += len(hot_updates) + len(added) + len(processed)
+            cached = self._cache.get(user_uid)
+            if cached is None or cached is entry or (cached['version'] or 0) <= version:
+                self._cache[user_uid] = updated
+        logger.info(f"Saved state to Firestore for user {user_uid} ({len(hot_updates)} fields, "
+                    f"{sum(len(t) for t in added.values())} new published tickers)")
+        return updated
+
     def _sanitize_state_for_firestore(self, state):
         """Ensure all values in state are Firestore-compatible"""
         # Convert sets to lists for Firestore compatibility
@@ -163,7 +603,14 @@ class FirestoreStateManager:
             else:
                 sanitized_state[key] = value
         return sanitized_state
-    
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_users'] = len(self._cache)
+        stats['cache_ttl'] = self.cache_ttl
+        return stats
+
     # Migration functionality removed as it's not needed
 
 # Create a singleton instance
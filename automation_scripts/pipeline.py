@@ -141,6 +141,8 @@ from data_processing_scripts.macro_data import fetch_macro_indicators
 from data_processing_scripts.data_preprocessing import preprocess_data
 from Models.prophet_model import train_prophet_model
 from reporting_tools.report_generator import create_full_report, create_wordpress_report_assets
+from automation_scripts.tracing import traced, span, annotate
+from automation_scripts.progress_bus import get_progress_bus
 
 pipeline_logger = logging.getLogger(__name__)
 if not pipeline_logger.handlers: 
@@ -267,19 +269,18 @@ def cleanup_old_processed_data(cache_dir, max_age_days=7):
         pipeline_logger.error(f"Error during processed data cleanup: {e}")
 
 def _emit_progress(socketio_instance, task_room, progress, message, stage_detail="", ticker="N/A", event_name='analysis_progress'):
-    if socketio_instance and task_room:
-        payload = {'progress': progress, 'message': message, 'stage': stage_detail, 'ticker': ticker}
-        pipeline_logger.info(f"Emitting to room '{task_room}' (Event: {event_name}): {payload}")
-        socketio_instance.emit(event_name, payload, room=task_room)
-        socketio_instance.sleep(0.05) 
-    elif socketio_instance: 
-        pipeline_logger.warning(f"Task room not specified for {event_name}, emitting globally for ticker {ticker}: {message}")
-        socketio_instance.emit(event_name, {'progress': progress, 'message': message, 'stage': stage_detail, 'ticker': ticker})
-        socketio_instance.sleep(0.05)
+    payload = {'progress': progress, 'message': message, 'stage': stage_detail, 'ticker': ticker}
+    if socketio_instance:
+        # Throttled and coalesced per ticker by the progress bus; no per-step sleep needed
+        if not task_room:
+            pipeline_logger.warning(f"Task room not specified for {event_name}, emitting globally for ticker {ticker}: {message}")
+        pipeline_logger.debug(f"Publishing to room '{task_room}' (Event: {event_name}): {payload}")
+        get_progress_bus(socketio_instance).publish(event_name, payload, room=task_room or None, key=ticker)
     else:
         pipeline_logger.info(f"Progress for {ticker} (No SocketIO - Event: {event_name}): {progress}% - {message} ({stage_detail})")
 
 
+@traced('run_pipeline', root=True)
 def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
     processed_filepath = None
     model = forecast = None
@@ -287,6 +288,7 @@ def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
     event_name_progress = 'analysis_progress' 
     event_name_error = 'analysis_error'     
 
+    annotate(ticker=ticker)
     try:
         pipeline_logger.info(f"\n----- Starting ORIGINAL pipeline for {ticker} (Room: {task_room}) -----")
         _emit_progress(socketio_instance, task_room, 0, f"Initiating analysis for {ticker}...", "Initialization", ticker, event_name_progress)
@@ -299,9 +301,10 @@ def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
         _emit_progress(socketio_instance, task_room, 5, "Fetching real-time stock data and generating introduction...", "Real-time Data & Key Metrics", ticker, event_name_progress)
         
         # Fetch real-time data for more accurate analysis
-        real_time_data = fetch_real_time_data(ticker, app_root, include_price=True, include_intraday=True)
-        stock_data = real_time_data.get('daily_data')
-        current_price_info = real_time_data.get('current_price_data')
+        with span('data_fetch', source='realtime'):
+            real_time_data = fetch_real_time_data(ticker, app_root, include_price=True, include_intraday=True)
+            stock_data = real_time_data.get('daily_data')
+            current_price_info = real_time_data.get('current_price_data')
         
         if stock_data is None or stock_data.empty:
             error_msg = f"No data found for ticker '{ticker}'. This could mean:\n• The ticker symbol is incorrect\n• The stock is delisted or not available\n• No trading data exists for this symbol\n\nPlease try again with a different stock symbol (e.g., AAPL, MSFT, GOOGL)."
@@ -336,43 +339,47 @@ def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
                         stock_data.loc[today_mask, 'Close'] = latest_close
 
         _emit_progress(socketio_instance, task_room, 10, "Fetching macroeconomic data...", "Data Collection", ticker, event_name_progress)
-        macro_data = fetch_macro_indicators(app_root=app_root, stock_data=stock_data)
-        if macro_data is None or macro_data.empty:
-            pipeline_logger.warning(f"Macro data fetch failed for {ticker}. Proceeding.")
+        with span('macro_data'):
+            macro_data = fetch_macro_indicators(app_root=app_root, stock_data=stock_data)
+            if macro_data is None or macro_data.empty:
+                pipeline_logger.warning(f"Macro data fetch failed for {ticker}. Proceeding.")
 
         _emit_progress(socketio_instance, task_room, 15, "Processing 15-year price history and charts...", "15-Year Price History & Charts", ticker, event_name_progress)
         _emit_progress(socketio_instance, task_room, 20, "Preprocessing data...", "Preprocessing", ticker, event_name_progress)
-        processed_filepath = _get_processed_data_filepath(ticker, app_root)
+        with span('preprocessing') as stage:
+            processed_filepath = _get_processed_data_filepath(ticker, app_root)
         
-        # Clean up old processed data files periodically
-        cache_dir = os.path.join(app_root, '..', 'generated_data', 'data_cache')
-        cleanup_old_processed_data(cache_dir)
+            # Clean up old processed data files periodically
+            cache_dir = os.path.join(app_root, '..', 'generated_data', 'data_cache')
+            cleanup_old_processed_data(cache_dir)
         
-        processed_data = None
+            processed_data = None
         
-        # Check if processed data exists and is current
-        if _is_processed_data_current(processed_filepath, stock_data, macro_data, ticker):
-            pipeline_logger.info(f"Loading current processed data for {ticker} from cache...")
-            processed_data = pd.read_csv(processed_filepath)
-            if 'Date' in processed_data.columns:
-                processed_data['Date'] = pd.to_datetime(processed_data['Date'])
-            if processed_data.empty: 
-                processed_data = None
+            # Check if processed data exists and is current
+            if _is_processed_data_current(processed_filepath, stock_data, macro_data, ticker):
+                pipeline_logger.info(f"Loading current processed data for {ticker} from cache...")
+                processed_data = pd.read_csv(processed_filepath)
+                if 'Date' in processed_data.columns:
+                    processed_data['Date'] = pd.to_datetime(processed_data['Date'])
+                if processed_data.empty: 
+                    processed_data = None
+            stage.set(cache_hit=processed_data is not None)
         
-        if processed_data is None:
-            pipeline_logger.info(f"Preprocessing data for {ticker} with current source data...")
-            processed_data = preprocess_data(stock_data, macro_data if macro_data is not None else None)
-            if processed_data is None or processed_data.empty:
-                error_msg = f"Unable to process data for ticker '{ticker}'. The stock data may be insufficient for analysis.\n\nPlease try again with a different stock symbol that has more trading history."
-                raise RuntimeError(error_msg)
-            processed_data.to_csv(processed_filepath, index=False)
-            pipeline_logger.info(f"Saved new processed data for {ticker} based on current source data.")
+            if processed_data is None:
+                pipeline_logger.info(f"Preprocessing data for {ticker} with current source data...")
+                processed_data = preprocess_data(stock_data, macro_data if macro_data is not None else None, ticker=ticker)
+                if processed_data is None or processed_data.empty:
+                    error_msg = f"Unable to process data for ticker '{ticker}'. The stock data may be insufficient for analysis.\n\nPlease try again with a different stock symbol that has more trading history."
+                    raise RuntimeError(error_msg)
+                processed_data.to_csv(processed_filepath, index=False)
+                pipeline_logger.info(f"Saved new processed data for {ticker} based on current source data.")
 
         _emit_progress(socketio_instance, task_room, 30, "Calculating technical indicators (RSI, MACD, Histogram)...", "Technical Indicators (RSI, MACD, Histogram)", ticker, event_name_progress)
         _emit_progress(socketio_instance, task_room, 40, "Training predictive model...", "Model Training", ticker, event_name_progress)
-        model, forecast, actual_df, forecast_df = train_prophet_model(
-            processed_data.copy(), ticker, forecast_horizon='1y', timestamp=ts
-        )
+        with span('prophet'):
+            model, forecast, actual_df, forecast_df = train_prophet_model(
+                processed_data.copy(), ticker, forecast_horizon='1y', timestamp=ts
+            )
         # Check if forecasting data is valid (model can be None when using WSL bridge)
         if forecast is None or actual_df is None or forecast_df is None or forecast.empty or actual_df.empty or forecast_df.empty:
             error_msg = f"Unable to generate predictions for ticker '{ticker}'. The stock may not have enough historical data for reliable forecasting.\n\nPlease try again with a more established stock that has longer trading history."
@@ -381,31 +388,32 @@ def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
 
         _emit_progress(socketio_instance, task_room, 50, "Analyzing fundamental ratios and metrics...", "Fundamental Analysis & Ratios", ticker, event_name_progress)
         _emit_progress(socketio_instance, task_room, 60, "Fetching fundamental data...", "Fundamentals", ticker, event_name_progress)
-        try:
-            yf_ticker_obj = yf.Ticker(ticker)
-            info_data = yf_ticker_obj.info or {}
-            recs_data = yf_ticker_obj.recommendations if hasattr(yf_ticker_obj, 'recommendations') and yf_ticker_obj.recommendations is not None else pd.DataFrame()
-            # News will be fetched via Finnhub API in extract_news function
-            
-            # Add balance sheet and financial data for enhanced financial efficiency analysis
-            balance_sheet_data = None
-            financials_data = None
+        with span('fundamentals', source='yfinance'):
             try:
-                balance_sheet_data = yf_ticker_obj.balance_sheet
-                financials_data = yf_ticker_obj.financials
-            except Exception as fin_err:
-                pipeline_logger.warning(f"yfinance financial statements error for {ticker}: {fin_err}.")
+                yf_ticker_obj = yf.Ticker(ticker)
+                info_data = yf_ticker_obj.info or {}
+                recs_data = yf_ticker_obj.recommendations if hasattr(yf_ticker_obj, 'recommendations') and yf_ticker_obj.recommendations is not None else pd.DataFrame()
+                # News will be fetched via Finnhub API in extract_news function
             
-            fundamentals = {
-                'info': info_data, 
-                'recommendations': recs_data, 
-                'news': yf_ticker_obj.news if hasattr(yf_ticker_obj, 'news') and yf_ticker_obj.news else [],  # Get actual news data for sentiment analysis
-                'balance_sheet': balance_sheet_data,
-                'financials': financials_data
-            }
-        except Exception as yf_err:
-            pipeline_logger.warning(f"yfinance fundamentals error for {ticker}: {yf_err}.")
-            fundamentals = {'info': {}, 'recommendations': pd.DataFrame(), 'news': [], 'balance_sheet': None, 'financials': None}
+                # Add balance sheet and financial data for enhanced financial efficiency analysis
+                balance_sheet_data = None
+                financials_data = None
+                try:
+                    balance_sheet_data = yf_ticker_obj.balance_sheet
+                    financials_data = yf_ticker_obj.financials
+                except Exception as fin_err:
+                    pipeline_logger.warning(f"yfinance financial statements error for {ticker}: {fin_err}.")
+            
+                fundamentals = {
+                    'info': info_data, 
+                    'recommendations': recs_data, 
+                    'news': yf_ticker_obj.news if hasattr(yf_ticker_obj, 'news') and yf_ticker_obj.news else [],  # Get actual news data for sentiment analysis
+                    'balance_sheet': balance_sheet_data,
+                    'financials': financials_data
+                }
+            except Exception as yf_err:
+                pipeline_logger.warning(f"yfinance fundamentals error for {ticker}: {yf_err}.")
+                fundamentals = {'info': {}, 'recommendations': pd.DataFrame(), 'news': [], 'balance_sheet': None, 'financials': None}
 
         _emit_progress(socketio_instance, task_room, 65, "Gathering analyst consensus and recommendations...", "Analyst Consensus & Recommendations", ticker, event_name_progress)
         _emit_progress(socketio_instance, task_room, 70, "Analyzing macro economic indicators...", "Macro Economic Indicators", ticker, event_name_progress)
@@ -422,12 +430,13 @@ def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
         elif os.path.basename(app_root) != 'app':
              pipeline_logger.warning(f"Unexpected app_root ('{app_root}') for report generation. Expected 'app' or 'automation_scripts'. Report path may be incorrect.")
 
-        report_path, report_html = create_full_report(
-            ticker=ticker, actual_data=actual_df, forecast_data=forecast_df,
-            historical_data=processed_data.copy(), fundamentals=fundamentals, ts=ts,
-            app_root=app_root_for_report, # Use the adjusted app_root here
-            current_price_info=current_price_info  # Pass real-time current price data
-        )
+        with span('create_full_report'):
+            report_path, report_html = create_full_report(
+                ticker=ticker, actual_data=actual_df, forecast_data=forecast_df,
+                historical_data=processed_data.copy(), fundamentals=fundamentals, ts=ts,
+                app_root=app_root_for_report, # Use the adjusted app_root here
+                current_price_info=current_price_info  # Pass real-time current price data
+            )
         if report_html is None or "Error Generating Report" in report_html:
             raise RuntimeError(f"Report generator failed for {ticker}")
         if report_path: pipeline_logger.info(f"Report saved for {ticker} -> {os.path.basename(report_path)}")
@@ -440,13 +449,16 @@ def run_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
 
     except Exception as err:
         pipeline_logger.error(f"----- ORIGINAL Pipeline Error for {ticker}: {err} -----", exc_info=True)
+        annotate(status='error', error=str(err))
         if socketio_instance and task_room:
-             socketio_instance.emit(event_name_error, {'message': str(err), 'ticker': ticker}, room=task_room)
+             get_progress_bus(socketio_instance).publish(event_name_error, {'message': str(err), 'ticker': ticker}, room=task_room, key=ticker)
         return None, None, None, None
 
 
+@traced('run_wp_pipeline', root=True)
 def run_wp_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None):
     pipeline_logger.info(f"\n>>>>> Starting WORDPRESS pipeline for {ticker} (Room: {task_room}) <<<<<")
+    annotate(ticker=ticker)
     event_name_progress = 'wp_asset_progress' 
     event_name_error = 'wp_asset_error'     
 
@@ -464,35 +476,40 @@ def run_wp_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None
             raise ValueError(f"Invalid ticker format: {ticker}.")
 
         _emit_progress(socketio_instance, task_room, 5, "Fetching stock data for WP...", "WP Data Collection", ticker, event_name_progress)
-        stock_data = fetch_stock_data(ticker, app_root=app_root)
+        with span('data_fetch'):
+            stock_data = fetch_stock_data(ticker, app_root=app_root)
         if stock_data is None or stock_data.empty: 
             error_msg = f"No data found for ticker '{ticker}'. This could mean:\n• The ticker symbol is incorrect\n• The stock is delisted or not available\n• No trading data exists for this symbol\n\nPlease try again with a different stock symbol (e.g., AAPL, MSFT, GOOGL)."
             raise RuntimeError(error_msg)
 
         _emit_progress(socketio_instance, task_room, 10, "Fetching macro data for WP...", "WP Data Collection", ticker, event_name_progress)
-        macro_data = fetch_macro_indicators(app_root=app_root)
-        if macro_data is None or macro_data.empty: pipeline_logger.warning(f"WP Macro data fetch failed for {ticker}.")
+        with span('macro_data'):
+            macro_data = fetch_macro_indicators(app_root=app_root)
+            if macro_data is None or macro_data.empty: pipeline_logger.warning(f"WP Macro data fetch failed for {ticker}.")
 
         _emit_progress(socketio_instance, task_room, 20, "Preprocessing data for WP...", "WP Preprocessing", ticker, event_name_progress)
-        processed_filepath = _get_processed_data_filepath(ticker, app_root)
-        processed_data = None
-        if os.path.exists(processed_filepath):
-            pipeline_logger.info(f"Loading processed WP data for {ticker} from cache...")
-            processed_data = pd.read_csv(processed_filepath)
-            if 'Date' in processed_data.columns: processed_data['Date'] = pd.to_datetime(processed_data['Date'])
-            if processed_data.empty: processed_data = None
+        with span('preprocessing') as stage:
+            processed_filepath = _get_processed_data_filepath(ticker, app_root)
+            processed_data = None
+            if os.path.exists(processed_filepath):
+                pipeline_logger.info(f"Loading processed WP data for {ticker} from cache...")
+                processed_data = pd.read_csv(processed_filepath)
+                if 'Date' in processed_data.columns: processed_data['Date'] = pd.to_datetime(processed_data['Date'])
+                if processed_data.empty: processed_data = None
+            stage.set(cache_hit=processed_data is not None)
         
-        if processed_data is None:
-            pipeline_logger.info(f"Preprocessing WP data for {ticker}...")
-            processed_data = preprocess_data(stock_data, macro_data if macro_data is not None else None)
-            if processed_data is None or processed_data.empty: 
-                error_msg = f"Unable to process data for ticker '{ticker}'. The stock data may be insufficient for analysis.\n\nPlease try again with a different stock symbol that has more trading history."
-                raise RuntimeError(error_msg)
-            processed_data.to_csv(processed_filepath, index=False)
-            pipeline_logger.info(f"Saved new processed WP data for {ticker}.")
+            if processed_data is None:
+                pipeline_logger.info(f"Preprocessing WP data for {ticker}...")
+                processed_data = preprocess_data(stock_data, macro_data if macro_data is not None else None, ticker=ticker)
+                if processed_data is None or processed_data.empty: 
+                    error_msg = f"Unable to process data for ticker '{ticker}'. The stock data may be insufficient for analysis.\n\nPlease try again with a different stock symbol that has more trading history."
+                    raise RuntimeError(error_msg)
+                processed_data.to_csv(processed_filepath, index=False)
+                pipeline_logger.info(f"Saved new processed WP data for {ticker}.")
 
         _emit_progress(socketio_instance, task_room, 40, "Training model for WP assets...", "WP Model Training", ticker, event_name_progress)
-        model, forecast, actual_df, forecast_df = train_prophet_model(processed_data.copy(), ticker, forecast_horizon='1y', timestamp=ts)
+        with span('prophet'):
+            model, forecast, actual_df, forecast_df = train_prophet_model(processed_data.copy(), ticker, forecast_horizon='1y', timestamp=ts)
         # Check if forecasting data is valid (model can be None when using WSL bridge)
         if forecast is None or actual_df is None or forecast_df is None or forecast.empty or actual_df.empty or forecast_df.empty:
             error_msg = f"Unable to generate predictions for ticker '{ticker}'. The stock may not have enough historical data for reliable forecasting.\n\nPlease try again with a more established stock that has longer trading history."
@@ -500,37 +517,39 @@ def run_wp_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None
         pipeline_logger.info(f"WP Model trained for {ticker}.")
         
         _emit_progress(socketio_instance, task_room, 60, "Fetching fundamentals for WP assets...", "WP Fundamentals", ticker, event_name_progress)
-        try:
-            yf_ticker_obj = yf.Ticker(ticker)
-            info_data = yf_ticker_obj.info or {}
-            recs_data = yf_ticker_obj.recommendations if hasattr(yf_ticker_obj, 'recommendations') and yf_ticker_obj.recommendations is not None else pd.DataFrame()
-            # News will be fetched via Finnhub API in extract_news function
-            
-            # Add balance sheet and financial data for enhanced financial efficiency analysis
-            balance_sheet_data = None
-            financials_data = None
+        with span('fundamentals', source='yfinance'):
             try:
-                balance_sheet_data = yf_ticker_obj.balance_sheet
-                financials_data = yf_ticker_obj.financials
-            except Exception as fin_err:
-                pipeline_logger.warning(f"yfinance WP financial statements error for {ticker}: {fin_err}.")
+                yf_ticker_obj = yf.Ticker(ticker)
+                info_data = yf_ticker_obj.info or {}
+                recs_data = yf_ticker_obj.recommendations if hasattr(yf_ticker_obj, 'recommendations') and yf_ticker_obj.recommendations is not None else pd.DataFrame()
+                # News will be fetched via Finnhub API in extract_news function
+            
+                # Add balance sheet and financial data for enhanced financial efficiency analysis
+                balance_sheet_data = None
+                financials_data = None
+                try:
+                    balance_sheet_data = yf_ticker_obj.balance_sheet
+                    financials_data = yf_ticker_obj.financials
+                except Exception as fin_err:
+                    pipeline_logger.warning(f"yfinance WP financial statements error for {ticker}: {fin_err}.")
             
-            fundamentals = {
-                'info': info_data, 
-                'recommendations': recs_data, 
-                'news': yf_ticker_obj.news if hasattr(yf_ticker_obj, 'news') and yf_ticker_obj.news else [],  # Get actual news data for sentiment analysis
-                'balance_sheet': balance_sheet_data,
-                'financials': financials_data
-            }
-        except Exception as e:
-            fundamentals = {'info': {}, 'recommendations': pd.DataFrame(), 'news': [], 'balance_sheet': None, 'financials': None}
-            pipeline_logger.warning(f"WP Fundamentals Warning for {ticker}: {e}")
+                fundamentals = {
+                    'info': info_data, 
+                    'recommendations': recs_data, 
+                    'news': yf_ticker_obj.news if hasattr(yf_ticker_obj, 'news') and yf_ticker_obj.news else [],  # Get actual news data for sentiment analysis
+                    'balance_sheet': balance_sheet_data,
+                    'financials': financials_data
+                }
+            except Exception as e:
+                fundamentals = {'info': {}, 'recommendations': pd.DataFrame(), 'news': [], 'balance_sheet': None, 'financials': None}
+                pipeline_logger.warning(f"WP Fundamentals Warning for {ticker}: {e}")
 
         _emit_progress(socketio_instance, task_room, 75, "Generating HTML and chart assets...", "WP Asset Generation", ticker, event_name_progress)
-        text_report_html, img_urls_dict_or_path = create_wordpress_report_assets(
-            ticker=ticker, actual_data=actual_df, forecast_data=forecast_df,
-            historical_data=processed_data.copy(), fundamentals=fundamentals, ts=ts, app_root=app_root
-        )
+        with span('create_wordpress_report_assets'):
+            text_report_html, img_urls_dict_or_path = create_wordpress_report_assets(
+                ticker=ticker, actual_data=actual_df, forecast_data=forecast_df,
+                historical_data=processed_data.copy(), fundamentals=fundamentals, ts=ts, app_root=app_root
+            )
         # Handle the return value: img_urls_dict_or_path is either a file path (str) or None
         image_urls_dict = {}
         if img_urls_dict_or_path is not None:
@@ -560,8 +579,9 @@ def run_wp_pipeline(ticker, ts, app_root, socketio_instance=None, task_room=None
 
     except Exception as err:
         pipeline_logger.error(f">>>>> WORDPRESS Pipeline Error for {ticker}: {err} <<<<<", exc_info=True)
+        annotate(status='error', error=str(err))
         if socketio_instance and task_room: 
-            socketio_instance.emit(event_name_error, {'message': str(err), 'ticker': ticker}, room=task_room)
+            get_progress_bus(socketio_instance).publish(event_name_error, {'message': str(err), 'ticker': ticker}, room=task_room, key=ticker)
         return None, None, None, {}
 
 
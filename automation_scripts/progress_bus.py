@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Progress Bus
+============
+
+Single dispatcher for the progress events the pipelines and automation
+routes push to browsers over SocketIO.
+
+Worker threads ``publish()`` into the bus instead of calling
+``socketio.emit`` themselves; one background task drains it:
+
+- **Coalescing**: progress-type events (payloads carrying ``progress``) are
+  kept per (room, event, task key) and only the latest state is sent, at
+  most ``max_rate`` times per second per task. Superseded states are
+  counted as dropped.
+- **Terminal events**: completion / error events (``*_complete``,
+  ``*_error``, ... or published with ``terminal=True`` by the emitter that
+  ends the task) are never coalesced; they discard any pending progress for
+  the task and go out on the next dispatcher pass. A payload ``status`` is
+  not enough: per-item updates (one ticker failing) carry ``status`` too
+  and must not end the whole task.
+- **Log-style events** (everything else, e.g. ``automation_update`` lines)
+  are delivered in order without being dropped.
+- **Replay**: the latest progress / terminal state per task of every room
+  is kept for ``PROGRESS_REPLAY_TTL`` seconds, and ``replay(room, to=sid)``
+  sends it to a client that joins a task room late (the task finished or
+  moved on before the page subscribed). Log lines are not replayed.
+
+Configuration:
+--------------
+- ``PROGRESS_MAX_RATE``: progress emits per second per task (default 4)
+- ``PROGRESS_REPLAY_TTL``: seconds a room's state stays replayable (default 1800)
+
+Usage:
+------
+```python
+from automation_scripts.progress_bus import get_progress_bus
+
+bus = get_progress_bus(socketio)
+bus.emit('analysis_progress', {'progress': 40, 'ticker': 'AAPL'}, room=task_room)
+bus.emit('analysis_complete', {'ticker': 'AAPL'}, room=task_room)
+```
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RATE = float(os.getenv('PROGRESS_MAX_RATE', '4'))
+DEFAULT_REPLAY_TTL = float(os.getenv('PROGRESS_REPLAY_TTL', '1800'))
+MAX_REPLAY_ROOMS = 1000
+MAX_REPLAY_ENTRIES_PER_ROOM = 50
+
+TERMINAL_EVENT_SUFFIXES = ('_complete', '_completed', '_error', '_failed')
+# Payload fields that identify the task a progress event belongs to, in order of preference
+TASK_KEY_FIELDS = ('task_id', 'run_id', 'profile_id', 'ticker', 'article_id')
+
+
+def _task_key(payload):
+    if isinstance(payload, dict):
+        for field in TASK_KEY_FIELDS:
+            value = payload.get(field)
+            if value not in (None, '', 'N/A'):
+                return str(value)
+    return None
+
+
+def is_terminal_event(event, payload=None):
+    """Events whose name marks the end of a task (others need an explicit ``terminal=True``)"""
+    return event.endswith(TERMINAL_EVENT_SUFFIXES)
+
+
+class ProgressBus:
+    """Throttled, coalescing emitter in front of a SocketIO server"""
+
+    def __init__(self, socketio, max_rate: float = DEFAULT_MAX_RATE, replay_ttl: float = DEFAULT_REPLAY_TTL):
+        """
+        Args:
+            socketio: Flask-SocketIO instance (anything with ``emit(event, data, room=...)``)
+            max_rate: Progress emits per second per task (<= 0 disables throttling)
+            replay_ttl: Seconds a room's latest state stays replayable
+        """
+        self.socketio = socketio
+        self.interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.replay_ttl = replay_ttl
+        self._cond = threading.Condition()
+        self._queue = deque()                # (event, payload, room) delivered in order
+        self._pending = OrderedDict()        # (room, event, key) -> latest coalesced payload
+        self._last_sent = {}                 # (room, event, key) -> monotonic time of last emit
+        self._replay = OrderedDict()         # room -> OrderedDict((event, key) -> (payload, wall time))
+        self._dispatcher_started = False
+        self._stats = {
+            'published': 0,
+            'emitted': 0,
+            'dropped': 0,
+            'terminal': 0,
+            'replayed': 0,
+            'errors': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+    def publish(self, event, payload, room=None, key=None, coalesce=None, terminal=None):
+        """
+        Queue an event for the dispatcher.
+
+        Args:
+            event: SocketIO event name
+            payload: Event data
+            room: Target room (None broadcasts)
+            key: Task the event belongs to (derived from the payload when omitted)
+            coalesce: Keep only the latest state (default: payloads with ``progress``)
+            terminal: Always deliver and end the task (default: inferred from the event name)
+        """
+        if terminal is None:
+            terminal = is_terminal_event(event, payload)
+        if coalesce is None:
+            coalesce = isinstance(payload, dict) and 'progress' in payload
+        coalesce = coalesce and not terminal
+        if key is None:
+            key = _task_key(payload)
+
+        with self._cond:
+            self._stats['published'] += 1
+            if room is not None and (coalesce or terminal):
+                self._remember(room, event, key, payload)
+            if terminal:
+                self._stats['terminal'] += 1
+                for slot in [s for s in self._pending if s[0] == room and s[2] == key]:
+                    del self._pending[slot]
+                    self._stats['dropped'] += 1
+                for slot in [s for s in self._last_sent if s[0] == room and s[2] == key]:
+                    del self._last_sent[slot]
+                self._queue.append((event, payload, room))
+            elif coalesce:
+                slot = (room, event, key)
+                if slot in self._pending:
+                    self._stats['dropped'] += 1
+                self._pending[slot] = payload
+            else:
+                self._queue.append((event, payload, room))
+            self._cond.notify()
+        self._ensure_dispatcher()
+
+    def emit(self, event, data=None, room=None, **kwargs):
+        """Drop-in for ``socketio.emit(event, data, room=...)``; other keyword arguments go to publish()"""
+        room = kwargs.pop('to', room)
+        self.publish(event, data, room=room, **kwargs)
+
+    def _remember(self, room, event, key, payload):
+        """Latest state per (event, task) of a room, for late joiners (caller holds the lock)"""
+        entries = self._replay.pop(room, None)
+        if entries is None:
+            entries = OrderedDict()
+        entries.pop((event, key), None)
+        entries[(event, key)] = (payload, time.time())
+        while len(entries) > MAX_REPLAY_ENTRIES_PER_ROOM:
+            entries.popitem(last=False)
+        self._replay[room] = entries
+        while len(self._replay) > MAX_REPLAY_ROOMS:
+            self._replay.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Dispatching
+    # ------------------------------------------------------------------
+    def _ensure_dispatcher(self):
+        if self._dispatcher_started:
+            return
+        with self._cond:
+            if self._dispatcher_started:
+                return
+            self._dispatcher_started = True
+        start_background_task = getattr(self.socketio, 'start_background_task', None)
+        if start_background_task is not None:
+            start_background_task(self._dispatch_loop)
+        else:
+            threading.Thread(target=self._dispatch_loop, name='progress-bus', daemon=True).start()
+
+    def _next_batch(self):
+        """Block until something is due; returns [(event, payload, room), ...]"""
+        with self._cond:
+            while True:
+                batch = list(self._queue)
+                self._queue.clear()
+                now = time.monotonic()
+                wait = None
+                for slot in list(self._pending):
+                    due = self._last_sent.get(slot, 0.0) + self.interval
+                    if due <= now:
+                        batch.append((slot[1], self._pending.pop(slot), slot[0]))
+                        self._last_sent[slot] = now
+                    else:
+                        wait = due - now if wait is None else min(wait, due - now)
+                if len(self._last_sent) > 10000:
+                    # Slots whose interval has elapsed carry no throttling state
+                    self._last_sent = {s: t for s, t in self._last_sent.items() if t + self.interval > now}
+                if batch:
+                    return batch
+                self._cond.wait(timeout=wait)
+
+    def _dispatch_loop(self):
+        logger.info("Progress bus dispatcher started")
+        while True:
+            for event, payload, room in self._next_batch():
+                self._send(event, payload, room)
+
+    def _send(self, event, payload, room):
+        try:
+            if room is None:
+                self.socketio.emit(event, payload)
+            else:
+                self.socketio.emit(event, payload, room=room)
+            with self._cond:
+                self._stats['emitted'] += 1
+        except Exception as e:
+            with self._cond:
+                self._stats['errors'] += 1
+            logger.warning(f"Progress bus could not emit {event} to {room}: {e}")
+
+    # ------------------------------------------------------------------
+    # Late joiners and monitoring
+    # ------------------------------------------------------------------
+    def replay(self, room, to=None):
+        """
+        Send the current state of a room's tasks to a client that just joined.
+
+        Args:
+            room: Room whose state to replay
+            to: Recipient room / sid (defaults to the room itself)
+
+        Returns:
+            Number of events replayed
+        """
+        cutoff = time.time() - self.replay_ttl
+        with self._cond:
+            entries = self._replay.get(room)
+            if not entries:
+                return 0
+            events = [(event, payload) for (event, _), (payload, at) in entries.items() if at >= cutoff]
+            if len(events) < len(entries):
+                for slot in [s for s, (_, at) in entries.items() if at < cutoff]:
+                    del entries[slot]
+            self._stats['replayed'] += len(events)
+        for event, payload in events:
+            self._send(event, payload, to or room)
+        return len(events)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._queue)
+            stats['pending'] = len(self._pending)
+            stats['replay_rooms'] = len(self._replay)
+        stats['max_rate'] = round(1.0 / self.interval, 2) if self.interval else None
+        stats['dispatcher_running'] = self._dispatcher_started
+        return stats
+
+
+_progress_buses = {}
+_progress_buses_lock = threading.Lock()
+
+
+def get_progress_bus(socketio):
+    """Process-wide bus for a SocketIO instance"""
+    with _progress_buses_lock:
+        bus = _progress_buses.get(id(socketio))
+        if bus is None or bus.socketio is not socketio:
+            bus = ProgressBus(socketio)
+            _progress_buses[id(socketio)] = bus
+        return bus
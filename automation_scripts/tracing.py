@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Pipeline Tracing
+================
+
+Lightweight nested spans for the stock report pipelines, so the time spent
+in each stage (data fetch, macro, preprocessing, Prophet, fundamentals,
+chart rendering, HTML assembly, remote calls) is visible per run.
+
+Model:
+------
+- A **trace** is one pipeline run; it is opened by ``trace()`` (or
+  ``@traced(..., root=True)``) and is the root span.
+- ``span()`` / ``@traced()`` open child spans of whatever span is current in
+  the calling context. Outside an active trace they are no-ops, so library
+  code (RiskAnalyzer, remote call wrappers) can be instrumented freely.
+- When the root span closes, the whole run is written to the span store in a
+  single SQLite transaction (and optionally appended to a JSONL file).
+
+Work submitted to thread pools does not inherit the current span; wrap the
+callable with ``bind()`` to keep it inside the run.
+
+Configuration:
+--------------
+- ``PIPELINE_TRACING``: ``0``/``false`` disables tracing (spans become a
+  single flag check)
+- ``PIPELINE_TRACE_DB``: SQLite path (default generated_data/pipeline_traces/traces.sqlite3)
+- ``PIPELINE_TRACE_JSONL``: optional JSONL file that receives every span as well
+
+Usage:
+------
+```python
+from automation_scripts.tracing import trace, span, traced
+
+with trace('run_pipeline', ticker='AAPL'):
+    with span('data_fetch'):
+        data = fetch_stock_data('AAPL')
+
+@traced('risk.sharpe_ratio')
+def calculate_sharpe_ratio(...):
+    ...
+```
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import itertools
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv('PIPELINE_TRACING', 'true').lower() not in ('0', 'false', 'no', 'off')
+
+DEFAULT_TRACE_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'pipeline_traces', 'traces.sqlite3'
+)
+
+_current_span = contextvars.ContextVar('pipeline_current_span', default=None)
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled or no trace is active"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    """Finished spans of one run, collected until the root span closes"""
+
+    __slots__ = ('trace_id', 'spans', 'lock', 'ids')
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.spans = []
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+
+class Span:
+    """One timed operation; use as a context manager"""
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attrs', 'status',
+                 'started_at', '_start', '_token')
+
+    def __init__(self, trace, name, parent_id, attrs):
+        self.trace = trace
+        self.span_id = next(trace.ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.attrs = attrs
+        self.status = 'ok'
+        self.started_at = None
+        self._start = None
+        self._token = None
+
+    def set(self, **attrs):
+        """Attach attributes (ticker, row counts, error text...) to the span"""
+        if 'status' in attrs:
+            self.status = attrs.pop('status')
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status = 'error'
+            self.attrs.setdefault('error', f"{exc_type.__name__}: {exc}")
+        record = (self.span_id, self.parent_id, self.name, self.started_at, duration_ms, self.status, self.attrs)
+        with self.trace.lock:
+            self.trace.spans.append(record)
+        if self.parent_id is None:
+            get_span_store().record_trace(self.trace.trace_id, list(self.trace.spans))
+        return False
+
+
+def trace(name, **attrs):
+    """Root span for one run (a child span when a trace is already active)"""
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN
+    parent = _current_span.get()
+    if parent is not None:
+        return Span(parent.trace, name, parent.span_id, attrs)
+    return Span(_Trace(), name, None, attrs)
+
+
+def span(name, **attrs):
+    """Child span of the current span; a no-op outside an active trace"""
+    if not TRACING_ENABLED:
+        return _NOOP_SPAN
+    parent = _current_span.get()
+    if parent is None:
+        return _NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attrs)
+
+
+def traced(name=None, root=False):
+    """
+    Decorator form of span()/trace().
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        root: Start a new trace when none is active
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+        opener = trace if root else span
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACING_ENABLED or (not root and _current_span.get() is None):
+                return func(*args, **kwargs)
+            with opener(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**attrs):
+    """Set attributes on the current span (no-op outside a trace)"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+def current_trace_id():
+    current = _current_span.get()
+    return current.trace.trace_id if current is not None else None
+
+
+def bind(func):
+    """Run func in the caller's tracing context (for thread pool submissions)"""
+    if not TRACING_ENABLED or _current_span.get() is None:
+        return func
+    context = contextvars.copy_context()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class SpanStore:
+    """SQLite sink for finished traces with percentile and slow-run queries"""
+
+    def __init__(self, db_path=None, jsonl_path=None, retention_days=7, prune_every=50):
+        """
+        Args:
+            db_path: SQLite database path (``PIPELINE_TRACE_DB`` env overrides the default)
+            jsonl_path: Optional JSONL file receiving every span (``PIPELINE_TRACE_JSONL``)
+            retention_days: Runs older than this are deleted
+            prune_every: Prune old runs after this many recorded traces
+        """
+        self.db_path = os.path.abspath(db_path or os.getenv('PIPELINE_TRACE_DB') or DEFAULT_TRACE_DB_PATH)
+        self.jsonl_path = jsonl_path or os.getenv('PIPELINE_TRACE_JSONL')
+        self.retention_days = retention_days
+        self.prune_every = prune_every
+        self._lock = threading.Lock()
+        self._stats = {'traces_recorded': 0, 'spans_recorded': 0, 'write_errors': 0}
+        self._available = self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS runs (
+                        trace_id TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        started_at REAL NOT NULL,
+                        duration_ms REAL NOT NULL,
+                        status TEXT NOT NULL,
+                        attrs TEXT
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS spans (
+                        trace_id TEXT NOT NULL,
+                        span_id INTEGER NOT NULL,
+                        parent_id INTEGER,
+                        name TEXT NOT NULL,
+                        started_at REAL NOT NULL,
+                        duration_ms REAL NOT NULL,
+                        status TEXT NOT NULL,
+                        attrs TEXT,
+                        PRIMARY KEY (trace_id, span_id)
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_spans_name_started ON spans (name, started_at)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at)")
+            return True
+        except Exception as e:
+            logger.warning(f"Trace store unavailable at {self.db_path}, spans will not be persisted: {e}")
+            return False
+
+    def record_trace(self, trace_id, spans):
+        """Persist one finished run; spans are (span_id, parent_id, name, started_at, duration_ms, status, attrs)"""
+        root = next((s for s in spans if s[1] is None), None)
+        if root is None:
+            return
+        rows = [(trace_id, s[0], s[1], s[2], s[3], s[4], s[5], json.dumps(s[6], default=str)) for s in spans]
+        try:
+            if self._available:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO runs (trace_id, name, started_at, duration_ms, status, attrs) VALUES (?, ?, ?, ?, ?, ?)",
+                        (trace_id, root[2], root[3], root[4], root[5], rows[spans.index(root)][7])
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO spans (trace_id, span_id, parent_id, name, started_at, duration_ms, status, attrs) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+            if self.jsonl_path:
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    for row in rows:
+                        f.write(json.dumps({
+                            'trace_id': row[0], 'span_id': row[1], 'parent_id': row[2], 'name': row[3],
+                            'started_at': row[4], 'duration_ms': round(row[5], 3), 'status': row[6],
+                            'attrs': json.loads(row[7])
+                        }) + '\n')
+            with self._lock:
+                self._stats['traces_recorded'] += 1
+                self._stats['spans_recorded'] += len(rows)
+                prune = self._stats['traces_recorded'] % self.prune_every == 0
+            if prune:
+                self.prune()
+            logger.info(f"Trace {root[2]} ({trace_id[:8]}) recorded: {len(rows)} spans, {root[4] / 1000:.2f}s")
+        except Exception as e:
+            with self._lock:
+                self._stats['write_errors'] += 1
+            logger.warning(f"Failed to record trace {trace_id}: {e}")
+
+    def prune(self):
+        if not self._available:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM spans WHERE trace_id IN (SELECT trace_id FROM runs WHERE started_at < ?)", (cutoff,))
+                conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,))
+        except Exception as e:
+            logger.warning(f"Failed to prune trace store: {e}")
+
+    def stage_percentiles(self, since_hours=24, run_name=None):
+        """
+        Duration percentiles per span name over recent runs.
+
+        Returns:
+            List of {name, count, errors, p50_ms, p95_ms, p99_ms, max_ms, total_ms}, slowest p95 first
+        """
+        if not self._available:
+            return []
+        cutoff = time.time() - since_hours * 3600
+        query = "SELECT s.name, s.duration_ms, s.status FROM spans s JOIN runs r ON r.trace_id = s.trace_id WHERE r.started_at >= ?"
+        params = [cutoff]
+        if run_name:
+            query += " AND r.name = ?"
+            params.append(run_name)
+        by_name = {}
+        with self._connect() as conn:
+            for name, duration_ms, status in conn.execute(query, params):
+                entry = by_name.setdefault(name, {'durations': [], 'errors': 0})
+                entry['durations'].append(duration_ms)
+                if status != 'ok':
+                    entry['errors'] += 1
+        result = []
+        for name, entry in by_name.items():
+            durations = sorted(entry['durations'])
+            result.append({
+                'name': name,
+                'count': len(durations),
+                'errors': entry['errors'],
+                'p50_ms': round(_percentile(durations, 50), 1),
+                'p95_ms': round(_percentile(durations, 95), 1),
+                'p99_ms': round(_percentile(durations, 99), 1),
+                'max_ms': round(durations[-1], 1),
+                'total_ms': round(sum(durations), 1),
+            })
+        result.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return result
+
+    def slowest_runs(self, limit=10, since_hours=24, run_name=None, stage_depth=2):
+        """
+        Slowest recent runs with their stage breakdown.
+
+        Stages are the spans up to stage_depth levels below the root, so a
+        request-level root still shows the pipeline stages it wraps.
+        """
+        if not self._available:
+            return []
+        cutoff = time.time() - since_hours * 3600
+        query = "SELECT trace_id, name, started_at, duration_ms, status, attrs FROM runs WHERE started_at >= ?"
+        params = [cutoff]
+        if run_name:
+            query += " AND name = ?"
+            params.append(run_name)
+        query += " ORDER BY duration_ms DESC LIMIT ?"
+        params.append(limit)
+        runs = []
+        with self._connect() as conn:
+            for trace_id, name, started_at, duration_ms, status, attrs in conn.execute(query, params).fetchall():
+                depth = {}
+                stages = []
+                for span_id, parent_id, span_name, span_ms, span_status in conn.execute(
+                    "SELECT span_id, parent_id, name, duration_ms, status FROM spans "
+                    "WHERE trace_id = ? ORDER BY started_at, span_id",
+                    (trace_id,)
+                ):
+                    # Parents start (and are listed) before their children
+                    depth[span_id] = 0 if parent_id is None else depth.get(parent_id, 0) + 1
+                    if 0 < depth[span_id] <= stage_depth:
+                        stages.append({'name': span_name, 'depth': depth[span_id],
+                                       'duration_ms': round(span_ms, 1), 'status': span_status})
+                runs.append({
+                    'trace_id': trace_id,
+                    'name': name,
+                    'started_at': started_at,
+                    'duration_ms': round(duration_ms, 1),
+                    'status': status,
+                    'attrs': json.loads(attrs) if attrs else {},
+                    'stages': stages,
+                })
+        return runs
+
+    def trace_spans(self, trace_id):
+        """All spans of one run, in start order"""
+        if not self._available:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT span_id, parent_id, name, started_at, duration_ms, status, attrs FROM spans "
+                "WHERE trace_id = ? ORDER BY started_at, span_id",
+                (trace_id,)
+            ).fetchall()
+        return [{
+            'span_id': r[0], 'parent_id': r[1], 'name': r[2], 'started_at': r[3],
+            'duration_ms': round(r[4], 3), 'status': r[5], 'attrs': json.loads(r[6]) if r[6] else {}
+        } for r in rows]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['enabled'] = TRACING_ENABLED
+        stats['store'] = {'available': self._available, 'path': self.db_path, 'jsonl': self.jsonl_path}
+        return stats
+
+
+_span_store = None
+_span_store_lock = threading.Lock()
+
+
+def get_span_store():
+    """Process-wide span store"""
+    global _span_store
+    if _span_store is None:
+        with _span_store_lock:
+            if _span_store is None:
+                _span_store = SpanStore()
+    return _span_store
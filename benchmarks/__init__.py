@@ -0,0 +1,9 @@
+"""
+Offline end-to-end benchmarks for the report pipelines.
+
+See run_benchmarks.py for usage.
+"""
+
+from benchmarks.fixture_store import FixtureStore, FixtureMissingError, offline_environment
+
+__all__ = ['FixtureStore', 'FixtureMissingError', 'offline_environment']
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Article Post-Processing Equivalence and Throughput
+==================================================
+
+Runs gemini_article_system.article_postprocessor (single parse, tree
+transforms, one serialization) and the string/regex implementation it
+replaced side by side on recorded Gemini articles:
+
+- every article's output is compared with the old implementation's output
+  (identical, identical up to whitespace, or different, with a diff), and
+  so is the metadata (word count, sections, schema)
+- throughput of both implementations over the same articles
+
+Articles come from the golden set committed in ``tests/fixtures/articles``,
+from ``<fixtures>/articles/*.html|*.md|*.txt`` and from the Gemini responses
+recorded by ``run_benchmarks --mode record``.
+
+Usage:
+------
+``python -m benchmarks.article_postprocess [--articles-dir DIR] [--iterations 20]``
+
+Exits with status 1 when any article's output differs beyond whitespace,
+or when no articles were found.
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import difflib
+import argparse
+from datetime import datetime
+from typing import Dict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fixture_store import FixtureStore, DEFAULT_FIXTURES_DIR
+from gemini_article_system.article_postprocessor import post_process_article
+
+TICKER = 'TEST'
+COMPANY_NAME = 'Test Corporation'
+GOLDEN_ARTICLES_DIR = os.path.join(PROJECT_ROOT, 'tests', 'fixtures', 'articles')
+METADATA_FIELDS = ('word_count', 'section_count', 'sections', 'has_schema')
+_WHITESPACE = re.compile(r'\s+')
+_BETWEEN_TAGS = re.compile(r'>\s+<')
+
+
+# ----------------------------------------------------------------------
+# Previous implementation (GeminiArticleRewriter methods before the
+# single-parse engine), kept verbatim as the reference
+# ----------------------------------------------------------------------
+
+def legacy_break_long_paragraphs(html: str) -> str:
+    """Break long paragraphs into shorter, more readable ones (max 4-5 sentences)."""
+    import re
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all paragraph tags
+    paragraphs = soup.find_all('p')
+
+    for p in paragraphs:
+        text = p.get_text().strip()
+
+        # Skip empty or short paragraphs
+        if not text or len(text) < 200:
+            continue
+
+        # Split by sentences (look for period followed by space and capital letter)
+        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', text)
+
+        # If more than 5 sentences, break into multiple paragraphs
+        if len(sentences) > 5:
+            # Create new paragraphs (4 sentences each)
+            new_paragraphs = []
+            chunk_size = 4
+
+            for i in range(0, len(sentences), chunk_size):
+                chunk = sentences[i:i+chunk_size]
+                new_p = soup.new_tag('p')
+                new_p.string = ' '.join(chunk)
+                new_paragraphs.append(new_p)
+
+            # Replace original paragraph with new ones
+            if new_paragraphs:
+                for new_p in reversed(new_paragraphs):
+                    p.insert_after(new_p)
+                p.decompose()
+
+    return str(soup)
+
+
+def legacy_post_process_article(article_html: str, ticker: str, company_name: str) -> str:
+    """Clean up and enhance the generated article."""
+
+    # Remove any Markdown syntax that might have slipped through
+    # Replace **text** with <strong>text</strong>
+    import re
+    from bs4 import BeautifulSoup
+
+    # Replace **text** with <strong>text</strong>
+    article_html = re.sub(r'\*\*([^\*]+?)\*\*', r'<strong>\1</strong>', article_html)
+
+    # Replace *text* with <em>text</em>
+    article_html = re.sub(r'(?<!\*)\*([^\*]+?)\*(?!\*)', r'<em>\1</em>', article_html)
+
+    # Remove any remaining markdown code blocks
+    article_html = article_html.replace('```html', '').replace('```', '')
+
+    # Parse HTML to remove problematic content
+    soup = BeautifulSoup(article_html, 'html.parser')
+
+    # Remove table rows that contain N/A, nan, null, or 0 values
+    for table in soup.find_all('table'):
+        rows_to_remove = []
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            row_text = ' '.join([cell.get_text().strip() for cell in cells]).lower()
+
+            # Check if row contains invalid/missing data indicators
+            if any(indicator in row_text for indicator in ['n/a', 'nan', 'null', 'none', ': 0', ': 0.0', ': $0', '$0.00']):
+                # Don't remove header rows
+                if not row.find('th'):
+                    rows_to_remove.append(row)
+
+        # Remove problematic rows
+        for row in rows_to_remove:
+            row.decompose()
+
+    # Remove paragraphs that explicitly mention unavailable/missing data
+    for p in soup.find_all('p'):
+        p_text = p.get_text().lower()
+        if any(phrase in p_text for phrase in [
+            'not available', 'unavailable', 'no data', 'data is missing',
+            'information is not', 'currently unavailable', 'data not available',
+            'n/a', 'is n/a', 'shows n/a', 'not applicable'
+        ]):
+            p.decompose()
+
+    # Remove list items mentioning missing data
+    for li in soup.find_all('li'):
+        li_text = li.get_text().lower()
+        if any(phrase in li_text for phrase in [
+            'not available', 'unavailable', 'no data', 'n/a', 'is n/a'
+        ]):
+            li.decompose()
+
+    # Remove any FAQ sections (we don't want them in the blog)
+    for heading in soup.find_all(['h2', 'h3']):
+        heading_text = heading.get_text().lower()
+        if 'faq' in heading_text or 'frequently asked' in heading_text:
+            # Remove the heading and all content until the next h2
+            current = heading
+            while current:
+                next_sibling = current.find_next_sibling()
+                current.decompose()
+                if next_sibling and next_sibling.name == 'h2':
+                    break
+                current = next_sibling
+
+    # Convert back to string
+    article_html = str(soup)
+
+    # Remove the disclaimer section if present (multiple patterns for thorough removal)
+    disclaimer_patterns = [
+        r'<h[23][^>]*>\s*IMPORTANT\s+DISCLAIMER:?\s*</h[23]>.*?(?=<h[23]|</body>|</div>\s*</body>|$)',
+        r'<h[23][^>]*>\s*Disclaimer:?\s*</h[23]>.*?(?=<h[23]|</body>|</div>\s*</body>|$)',
+        r'<h[23][^>]*>\s*Important\s+Disclaimer:?\s*</h[23]>.*?(?=<h[23]|</body>|</div>\s*</body>|$)',
+        r'<div[^>]*disclaimer[^>]*>.*?</div>',
+        r'IMPORTANT DISCLAIMER:.*?(?=<h[23]|</body>|$)',
+        r'This\s+report\s+has\s+been\s+automatically\s+generated.*?at\s+your\s+own\s+risk\.?',
+    ]
+
+    for pattern in disclaimer_patterns:
+        article_html = re.sub(pattern, '', article_html, flags=re.IGNORECASE | re.DOTALL)
+
+    # Additional cleanup for any remaining disclaimer-like content
+    lines = article_html.split('\n')
+    filtered_lines = []
+    skip_mode = False
+
+    for line in lines:
+        # Check if line starts disclaimer section
+        if re.search(r'<h[23][^>]*>\s*(important\s+)?disclaimer', line, re.IGNORECASE):
+            skip_mode = True
+            continue
+        # Check if we're back to a normal section
+        if skip_mode and re.search(r'<h[23]', line):
+            skip_mode = False
+        # Only add line if not in skip mode
+        if not skip_mode:
+            filtered_lines.append(line)
+
+    article_html = '\n'.join(filtered_lines)
+
+    # Remove any AI-like and robotic phrases
+    ai_phrases = [
+        "based on the data provided",
+        "according to the report",
+        "as an AI",
+        "I cannot",
+        "I don't have access",
+        "the data shows",
+        "it appears that",
+        "the report indicates",
+        "it is important to note",
+        "it should be noted",
+        "it is worth mentioning",
+        "it is worth noting",
+        "one should consider",
+        "investors should be aware",
+        "it can be observed",
+        "analysis reveals",
+        "examination of the data",
+        "upon closer inspection",
+    ]
+
+    for phrase in ai_phrases:
+        # Case-insensitive replacement
+        article_html = re.sub(re.escape(phrase), '', article_html, flags=re.IGNORECASE)
+
+    # Remove any FAQ sections (we don't want them in stock analysis blogs)
+    soup = BeautifulSoup(article_html, 'html.parser')
+    for heading in soup.find_all(['h2', 'h3']):
+        heading_text = heading.get_text().lower()
+        if 'faq' in heading_text or 'frequently asked' in heading_text:
+            # Remove the heading and all content until the next h2
+            current = heading
+            elements_to_remove = [current]
+            while current:
+                next_sibling = current.find_next_sibling()
+                if next_sibling and next_sibling.name == 'h2':
+                    break
+                if next_sibling:
+                    elements_to_remove.append(next_sibling)
+                current = next_sibling
+
+            # Remove all collected elements
+            for element in elements_to_remove:
+                element.decompose()
+
+    article_html = str(soup)
+
+    # Break long paragraphs into shorter ones
+    article_html = legacy_break_long_paragraphs(article_html)
+
+    # Clean up excessive whitespace
+    article_html = re.sub(r'\n\s*\n\s*\n', '\n\n', article_html)
+
+    # Ensure proper HTML structure
+    if not article_html.startswith('<'):
+        article_html = f'<div class="article-content">\n{article_html}\n</div>'
+
+    # Add article metadata at the top
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    metadata_html = f"""
+<div class="article-header">
+    <h1>{company_name} ({ticker}) Stock Analysis</h1>
+    <div class="article-meta">
+        <span class="publish-date">Published: {current_date}</span>
+        <span class="ticker-tag">#{ticker}</span>
+    </div>
+</div>
+"""
+
+    article_html = metadata_html + article_html
+
+    return article_html
+
+
+def legacy_extract_metadata(article_html: str, ticker: str, company_name: str) -> Dict:
+    """Extract metadata from the generated article."""
+    soup = BeautifulSoup(article_html, 'html.parser')
+
+    # Count words
+    text = soup.get_text()
+    word_count = len(text.split())
+
+    # Count sections
+    h2_tags = soup.find_all('h2')
+    section_count = len(h2_tags)
+
+    # Check for schema (general, not FAQ-specific)
+    has_schema = bool(soup.find('script', type='application/ld+json'))
+
+    # Extract section titles
+    sections = [h2.get_text(strip=True) for h2 in h2_tags]
+
+    metadata = {
+        'ticker': ticker,
+        'company_name': company_name,
+        'word_count': word_count,
+        'section_count': section_count,
+        'sections': sections,
+        'has_schema': has_schema,
+        'generated_date': datetime.now().isoformat(),
+        'model': 'gemini-2.5-flash',
+    }
+
+    return metadata
+
+# ----------------------------------------------------------------------
+# Harness
+# ----------------------------------------------------------------------
+
+def load_articles(articles_dir, fixtures_dir):
+    """{name: raw article} from the golden set, the articles directory and recorded Gemini responses"""
+    articles = {}
+    for directory in (GOLDEN_ARTICLES_DIR, articles_dir):
+        for path in sorted(glob.glob(os.path.join(directory, '*'))):
+            # Golden outputs sit next to their inputs
+            if path.endswith(('.html', '.md', '.txt')) and not path.endswith('.expected.html'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    articles[os.path.basename(path)] = f.read()
+    store = FixtureStore(fixtures_dir, mode='replay')
+    for index, text in enumerate(store.values('gemini')):
+        # Only HTML articles; the sports pipeline also records JSON responses
+        if isinstance(text, str) and re.search(r'<(h2|p)\b', text, re.IGNORECASE):
+            articles[f"gemini_response_{index}"] = text
+    return articles
+
+
+def _normalize(html):
+    return _WHITESPACE.sub(' ', _BETWEEN_TAGS.sub('><', html)).strip()
+
+
+def compare_article(name, raw):
+    """Outcome of one article: 'identical', 'whitespace' or 'different' (with diff and metadata deltas)"""
+    expected_html = legacy_post_process_article(raw, TICKER, COMPANY_NAME)
+    expected_meta = legacy_extract_metadata(expected_html, TICKER, COMPANY_NAME)
+    actual_html, actual_meta = post_process_article(raw, TICKER, COMPANY_NAME)
+
+    meta_deltas = {field: (expected_meta[field], actual_meta[field])
+                   for field in METADATA_FIELDS if expected_meta[field] != actual_meta[field]}
+    if actual_html == expected_html:
+        outcome = 'identical'
+    elif _normalize(actual_html) == _normalize(expected_html):
+        outcome = 'whitespace'
+    else:
+        outcome = 'different'
+    diff = []
+    if outcome == 'different':
+        diff = list(difflib.unified_diff(
+            expected_html.splitlines(), actual_html.splitlines(),
+            fromfile=f"{name} (previous)", tofile=f"{name} (single-parse)", lineterm='', n=1
+        ))
+    return {'outcome': outcome, 'metadata': meta_deltas, 'diff': diff}
+
+
+def measure_throughput(articles, iterations):
+    """Articles per second for both implementations (post-processing + metadata)"""
+    texts = list(articles.values())
+    timings = {}
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for raw in texts:
+            html = legacy_post_process_article(raw, TICKER, COMPANY_NAME)
+            legacy_extract_metadata(html, TICKER, COMPANY_NAME)
+    timings['previous'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for raw in texts:
+            post_process_article(raw, TICKER, COMPANY_NAME)
+    timings['single_parse'] = time.perf_counter() - started
+
+    processed = len(texts) * iterations
+    return {impl: {'seconds': round(seconds, 3), 'articles_per_second': round(processed / seconds, 1)}
+            for impl, seconds in timings.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equivalence and throughput of article post-processing")
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--articles-dir', help="Raw Gemini articles (default <fixtures-dir>/articles)")
+    parser.add_argument('--iterations', type=int, default=20, help="Passes over the articles for throughput")
+    parser.add_argument('--diff-lines', type=int, default=40, help="Diff lines printed per differing article")
+    args = parser.parse_args(argv)
+
+    articles = load_articles(args.articles_dir or os.path.join(args.fixtures_dir, 'articles'), args.fixtures_dir)
+    if not articles:
+        print(f"No articles found (golden set {GOLDEN_ARTICLES_DIR} missing?); record some with "
+              f"run_benchmarks --mode record or put raw Gemini articles in the articles directory")
+        return 1
+
+    counts = {'identical': 0, 'whitespace': 0, 'different': 0}
+    for name, raw in articles.items():
+        result = compare_article(name, raw)
+        counts[result['outcome']] += 1
+        if result['outcome'] == 'different' or result['metadata']:
+            print(f"\n{name}: {result['outcome']}")
+            for field, (expected, actual) in result['metadata'].items():
+                print(f"  metadata {field}: {expected!r} -> {actual!r}")
+            for line in result['diff'][:args.diff_lines]:
+                print(f"  {line}")
+
+    print(f"\n{len(articles)} articles: {counts['identical']} identical, "
+          f"{counts['whitespace']} identical up to whitespace, {counts['different']} different")
+
+    throughput = measure_throughput(articles, args.iterations)
+    previous, single = throughput['previous'], throughput['single_parse']
+    print(f"previous:     {previous['articles_per_second']:>8} articles/s ({previous['seconds']}s)")
+    print(f"single-parse: {single['articles_per_second']:>8} articles/s ({single['seconds']}s)")
+    print(f"speedup:      {previous['seconds'] / single['seconds']:.2f}x")
+    return 1 if counts['different'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,484 @@
+"""
+Benchmark Fixture Store
+=======================
+
+Record / replay of every remote call the report pipelines make, so the
+benchmark scenarios can run offline and deterministically.
+
+Captured boundaries:
+--------------------
+- **yfinance**: ``yf.download`` and ``yf.Ticker`` (attributes such as
+  ``info`` / ``financials`` and method calls such as ``history()``)
+- **FRED**: ``pandas_datareader.get_data_fred``
+- **HTTP**: ``requests.Session.request`` (Perplexity, Finnhub, WordPress,
+  every ``requests.get/post``) and ``httpx.Client.send`` (Supabase)
+- **Gemini**: ``google.generativeai.GenerativeModel.generate_content``
+  (only the response text is kept)
+
+Firestore / Cloud Storage (gRPC) are not captured; the benchmark
+scenarios do not touch them.
+
+Matching:
+---------
+Calls are grouped under a stable key (endpoint, symbols, interval...) that
+leaves out volatile parts such as ``start``/``end`` dates and API keys.
+Within a key, replay first looks for a recording with the same payload
+fingerprint (request body / prompt) and otherwise hands out the recordings
+in the order they were made, repeating the last one once they run out. A
+call with no recording raises FixtureMissingError (a ConnectionError, so the
+pipelines take their normal network-failure paths) and is counted in
+``stats()['misses']``.
+
+Fixtures are pickled per namespace under the fixture directory; they are
+produced locally by ``run_benchmarks.py --mode record`` and only ever loaded
+from there.
+"""
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager, ExitStack
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+NAMESPACES = ('yfinance', 'fred', 'http', 'gemini')
+SENSITIVE_PARAMS = {'apikey', 'api_key', 'key', 'token', 'access_token', 'auth', 'password', 'secret'}
+VOLATILE_PARAMS = {'start', 'end', 'period1', 'period2', 'from', 'to', '_', 'timestamp', 'crumb'}
+
+DEFAULT_FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'benchmark_fixtures'
+)
+
+
+class FixtureMissingError(ConnectionError):
+    """Raised in replay mode when a call has no recording"""
+
+
+def _fingerprint(payload):
+    if payload is None:
+        return None
+    if not isinstance(payload, bytes):
+        payload = str(payload).encode('utf-8', errors='replace')
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _normalize_url(url):
+    """URL without credentials and volatile query parameters"""
+    parts = urlsplit(str(url))
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SENSITIVE_PARAMS and k.lower() not in VOLATILE_PARAMS
+    ]
+    return urlunsplit((parts.scheme, parts.hostname or '', parts.path, urlencode(sorted(query)), ''))
+
+
+def _normalize_call(args, kwargs):
+    """JSON-able form of call arguments, without dates and noise flags"""
+    kwargs = {
+        k: v for k, v in kwargs.items()
+        if k not in VOLATILE_PARAMS and k not in ('progress', 'threads', 'timeout', 'session')
+    }
+    return json.dumps([list(args), kwargs], sort_keys=True, default=str)
+
+
+class FixtureStore:
+    """Keyed recordings of remote responses, loaded from / saved to a fixture directory"""
+
+    def __init__(self, fixtures_dir=None, mode='replay'):
+        """
+        Args:
+            fixtures_dir: Directory holding one pickle per namespace
+            mode: 'record' (call through and keep responses) or 'replay'
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.fixtures_dir = os.path.abspath(fixtures_dir or DEFAULT_FIXTURES_DIR)
+        self.mode = mode
+        self._entries = {ns: {} for ns in NAMESPACES}  # ns -> key -> [(fingerprint, value)]
+        self.metadata = {}
+        self._cursors = {}
+        self._consumed = {}
+        self._lock = threading.RLock()
+        self._stats = {'recorded': 0, 'replayed': 0, 'misses': 0}
+        self._missing = []
+        self.load()
+
+    @property
+    def recording(self):
+        return self.mode == 'record'
+
+    def _path(self, namespace):
+        return os.path.join(self.fixtures_dir, f"{namespace}.pkl")
+
+    def load(self):
+        meta_path = os.path.join(self.fixtures_dir, 'meta.json')
+        if os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    self.metadata = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read fixture metadata {meta_path}: {e}")
+        for namespace in NAMESPACES:
+            path = self._path(namespace)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    self._entries[namespace] = pickle.load(f)
+            except Exception as e:
+                logger.warning(f"Could not load {namespace} fixtures from {path}: {e}")
+
+    def save(self):
+        """Write every namespace that has recordings (record mode only)"""
+        if not self.recording:
+            return
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        with self._lock:
+            for namespace, entries in self._entries.items():
+                if not entries:
+                    continue
+                tmp_path = self._path(namespace) + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._path(namespace))
+            with open(os.path.join(self.fixtures_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(self.metadata, f, indent=2, default=str)
+
+    def clear(self):
+        """Drop all recordings on disk and in memory (start of a fresh record run)"""
+        with self._lock:
+            self._entries = {ns: {} for ns in NAMESPACES}
+            self.metadata = {}
+            if os.path.isdir(self.fixtures_dir):
+                shutil.rmtree(self.fixtures_dir)
+
+    def record(self, namespace, key, value, fingerprint=None, once=False):
+        """
+        Keep a response under key.
+
+        With once=True only the first value is kept (attribute reads such as
+        Ticker.info that are repeated many times per run).
+        """
+        with self._lock:
+            entries = self._entries[namespace].setdefault(key, [])
+            if once and entries:
+                return
+            try:
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.debug(f"Skipping unpicklable {namespace} fixture {key}: {e}")
+                return
+            entries.append((fingerprint, value))
+            self._stats['recorded'] += 1
+
+    def is_empty(self):
+        """True when nothing has been recorded (or loaded) in any namespace"""
+        with self._lock:
+            return not any(self._entries.values())
+
+    def has(self, namespace, key):
+        with self._lock:
+            return bool(self._entries[namespace].get(key))
+
+    def replay(self, namespace, key, fingerprint=None):
+        """Recorded response for key (see module docstring for the matching rules)"""
+        with self._lock:
+            entries = self._entries[namespace].get(key)
+            if not entries:
+                self._stats['misses'] += 1
+                if len(self._missing) < 50:
+                    self._missing.append(f"{namespace}:{key}")
+                raise FixtureMissingError(f"No {namespace} fixture for {key}")
+
+            slot = (namespace, key)
+            consumed = self._consumed.setdefault(slot, set())
+            index = None
+            if fingerprint is not None:
+                index = next((i for i, (fp, _) in enumerate(entries) if fp == fingerprint and i not in consumed), None)
+            if index is None:
+                cursor = self._cursors.get(slot, 0)
+                while cursor < len(entries) and cursor in consumed:
+                    cursor += 1
+                index = min(cursor, len(entries) - 1)
+                self._cursors[slot] = cursor + 1
+            consumed.add(index)
+            self._stats['replayed'] += 1
+            return entries[index][1]
+
+    def values(self, namespace):
+        """Every recorded value of a namespace, in recording order per key"""
+        with self._lock:
+            return [value for entries in self._entries[namespace].values() for _, value in entries]
+
+    def attach_file(self, name, source_path=None):
+        """
+        Input file snapshot kept next to the fixtures.
+
+        Record mode copies source_path in; both modes return the stored copy
+        (None when nothing was recorded).
+        """
+        stored = os.path.join(self.fixtures_dir, 'files', name)
+        if self.recording and source_path and os.path.exists(source_path):
+            os.makedirs(os.path.dirname(stored), exist_ok=True)
+            shutil.copyfile(source_path, stored)
+        return stored if os.path.exists(stored) else None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['keys'] = {ns: len(entries) for ns, entries in self._entries.items()}
+            stats['missing'] = list(self._missing)
+        stats['mode'] = self.mode
+        return stats
+
+
+# ----------------------------------------------------------------------
+# yfinance
+# ----------------------------------------------------------------------
+
+def _download_key(tickers, kwargs):
+    if isinstance(tickers, str):
+        tickers = tickers.replace(',', ' ').split()
+    return json.dumps(['download', sorted(str(t).upper() for t in tickers), _normalize_call((), kwargs)])
+
+
+class _RecordingTicker:
+    """yf.Ticker proxy that records attribute values and method results"""
+
+    def __init__(self, store, real_ticker_cls, ticker, *args, **kwargs):
+        self._store = store
+        self._ticker = str(ticker).upper()
+        self._real = real_ticker_cls(ticker, *args, **kwargs)
+
+    def __getattr__(self, name):
+        value = getattr(self._real, name)
+        if name.startswith('_'):
+            return value
+        if callable(value):
+            store, symbol = self._store, self._ticker
+
+            def call(*args, **kwargs):
+                result = value(*args, **kwargs)
+                store.record('yfinance', json.dumps(['Ticker', symbol, name, 'methods']), True, once=True)
+                store.record('yfinance', json.dumps(['Ticker', symbol, name, _normalize_call(args, kwargs)]), result, once=True)
+                return result
+            return call
+        self._store.record('yfinance', json.dumps(['Ticker', self._ticker, name]), value, once=True)
+        return value
+
+
+class _ReplayTicker:
+    """yf.Ticker stand-in served entirely from fixtures"""
+
+    def __init__(self, store, ticker, *args, **kwargs):
+        self._store = store
+        self._ticker = str(ticker).upper()
+        self.ticker = self._ticker
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        store, symbol = self._store, self._ticker
+        attribute_key = json.dumps(['Ticker', symbol, name])
+        if store.has('yfinance', attribute_key):
+            return store.replay('yfinance', attribute_key)
+        if store.has('yfinance', json.dumps(['Ticker', symbol, name, 'methods'])):
+            def call(*args, **kwargs):
+                return store.replay('yfinance', json.dumps(['Ticker', symbol, name, _normalize_call(args, kwargs)]))
+            return call
+        return store.replay('yfinance', attribute_key)  # raises FixtureMissingError
+
+
+def _patch_yfinance(stack, store):
+    try:
+        import yfinance as yf
+    except ImportError:
+        return
+    real_download, real_ticker = yf.download, yf.Ticker
+
+    if store.recording:
+        def download(tickers, *args, **kwargs):
+            result = real_download(tickers, *args, **kwargs)
+            store.record('yfinance', _download_key(tickers, kwargs), result)
+            return result
+
+        def ticker(symbol, *args, **kwargs):
+            return _RecordingTicker(store, real_ticker, symbol, *args, **kwargs)
+    else:
+        def download(tickers, *args, **kwargs):
+            result = store.replay('yfinance', _download_key(tickers, kwargs))
+            return result.copy() if hasattr(result, 'copy') else result
+
+        def ticker(symbol, *args, **kwargs):
+            return _ReplayTicker(store, symbol, *args, **kwargs)
+
+    yf.download, yf.Ticker = download, ticker
+    stack.callback(setattr, yf, 'download', real_download)
+    stack.callback(setattr, yf, 'Ticker', real_ticker)
+
+
+# ----------------------------------------------------------------------
+# FRED
+# ----------------------------------------------------------------------
+
+def _patch_fred(stack, store):
+    try:
+        import pandas_datareader as pdr
+    except ImportError:
+        return
+    real_get_data_fred = pdr.get_data_fred
+
+    def get_data_fred(symbols, *args, **kwargs):
+        names = [symbols] if isinstance(symbols, str) else list(symbols)
+        key = json.dumps(['fred', sorted(names)])
+        if store.recording:
+            result = real_get_data_fred(symbols, *args, **kwargs)
+            store.record('fred', key, result)
+            return result
+        return store.replay('fred', key).copy()
+
+    pdr.get_data_fred = get_data_fred
+    stack.callback(setattr, pdr, 'get_data_fred', real_get_data_fred)
+
+
+# ----------------------------------------------------------------------
+# HTTP (requests / httpx)
+# ----------------------------------------------------------------------
+
+def _patch_requests(stack, store):
+    try:
+        import requests
+        from requests.structures import CaseInsensitiveDict
+    except ImportError:
+        return
+    real_request = requests.Session.request
+
+    def request(session, method, url, params=None, data=None, json=None, **kwargs):
+        if params:
+            url = requests.Request(method, url, params=params).prepare().url
+        key = f"{method.upper()} {_normalize_url(url)}"
+        body = json if json is not None else data
+        fingerprint = _fingerprint(_canonical_body(body))
+        if store.recording:
+            response = real_request(session, method, url, data=data, json=json, **kwargs)
+            store.record('http', key, {
+                'status_code': response.status_code,
+                'headers': dict(response.headers),
+                'content': response.content,
+                'encoding': response.encoding,
+                'url': response.url,
+            }, fingerprint=fingerprint)
+            return response
+
+        recorded = store.replay('http', key, fingerprint)
+        response = requests.Response()
+        response.status_code = recorded['status_code']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response._content = recorded['content']
+        response.encoding = recorded['encoding']
+        response.url = recorded['url']
+        response.reason = 'OK' if response.status_code < 400 else 'Replayed error'
+        return response
+
+    requests.Session.request = request
+    stack.callback(setattr, requests.Session, 'request', real_request)
+
+
+def _patch_httpx(stack, store):
+    try:
+        import httpx
+    except ImportError:
+        return
+    real_send = httpx.Client.send
+
+    def send(client, request, *args, **kwargs):
+        key = f"{request.method} {_normalize_url(request.url)}"
+        fingerprint = _fingerprint(request.content)
+        if store.recording:
+            response = real_send(client, request, *args, **kwargs)
+            response.read()
+            store.record('http', key, {
+                'status_code': response.status_code,
+                'headers': [(k, v) for k, v in response.headers.items() if k.lower() != 'content-encoding'],
+                'content': response.content,
+            }, fingerprint=fingerprint)
+            return response
+
+        recorded = store.replay('http', key, fingerprint)
+        return httpx.Response(
+            recorded['status_code'], headers=recorded['headers'], content=recorded['content'], request=request
+        )
+
+    httpx.Client.send = send
+    stack.callback(setattr, httpx.Client, 'send', real_send)
+
+
+def _canonical_body(body):
+    if body is None:
+        return None
+    if isinstance(body, (dict, list)):
+        return json.dumps(body, sort_keys=True, default=str)
+    return body
+
+
+# ----------------------------------------------------------------------
+# Gemini
+# ----------------------------------------------------------------------
+
+class ReplayedGeminiResponse:
+    """Minimal generate_content result: the text plus empty metadata"""
+
+    def __init__(self, text):
+        self.text = text
+        self.candidates = []
+        self.prompt_feedback = None
+        self.usage_metadata = None
+
+
+def _patch_gemini(stack, store):
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return
+    model_cls = genai.GenerativeModel
+    real_generate = model_cls.generate_content
+
+    def generate_content(model, contents, *args, **kwargs):
+        key = json.dumps(['generate_content', getattr(model, 'model_name', '')])
+        fingerprint = _fingerprint(contents)
+        if store.recording:
+            response = real_generate(model, contents, *args, **kwargs)
+            try:
+                store.record('gemini', key, response.text, fingerprint=fingerprint)
+            except Exception as e:
+                logger.warning(f"Gemini response not recorded (no text): {e}")
+            return response
+        return ReplayedGeminiResponse(store.replay('gemini', key, fingerprint))
+
+    model_cls.generate_content = generate_content
+    stack.callback(setattr, model_cls, 'generate_content', real_generate)
+
+
+@contextmanager
+def offline_environment(store):
+    """
+    Route every captured remote call through the fixture store.
+
+    Record mode calls the real services and keeps their responses (saved on
+    exit); replay mode never touches the network.
+    """
+    with ExitStack() as stack:
+        for patch in (_patch_yfinance, _patch_fred, _patch_requests, _patch_httpx, _patch_gemini):
+            try:
+                patch(stack, store)
+            except Exception as e:
+                logger.warning(f"Could not install {patch.__name__[7:]} fixtures: {e}")
+        try:
+            yield store
+        finally:
+            store.save()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Offline Pipeline Benchmarks
+===========================
+
+End-to-end wall time, peak RSS and per-stage breakdown for the report
+pipelines, run against recorded fixtures so results are comparable across
+commits and machines.
+
+Workflow:
+---------
+1. Record once with network access (real API keys in the environment):
+   ``python -m benchmarks.run_benchmarks --mode record``
+2. Replay offline and save the reference numbers:
+   ``python -m benchmarks.run_benchmarks --update-baseline``
+3. Replay after a change; the run exits with status 1 when a scenario's
+   wall time or peak RSS is more than ``--tolerance`` above the baseline:
+   ``python -m benchmarks.run_benchmarks``
+
+Fixtures and the baseline are machine-local (recordings hold live API
+responses), so nothing is committed for them. A replay refuses to start
+without recorded fixtures or, unless it is saving one, without a baseline,
+and a replay whose scenarios fail or hit unrecorded calls exits with
+status 1 instead of being compared (or saved as the baseline).
+
+Every scenario runs in its own spawned process with a fresh workspace, so
+module-level caches start cold and peak RSS belongs to that scenario only.
+The per-stage breakdown comes from the pipeline spans (automation_scripts
+.tracing) recorded into a private trace database for the run.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import logging
+import argparse
+import tempfile
+import multiprocessing
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fixture_store import FixtureStore, DEFAULT_FIXTURES_DIR
+from benchmarks.scenarios import SCENARIOS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TICKERS = ['AAPL', 'MSFT']
+DEFAULT_TOLERANCE = 0.20
+STAGE_REPORT_MIN_MS = 50  # stage changes smaller than this are noise
+
+# Credentials the pipelines insist on before calling out; in replay mode the
+# calls are served from fixtures, so placeholders are enough
+REPLAY_PLACEHOLDER_ENV = {
+    'FRED_API_KEY': 'replay',
+    'GOOGLE_API_KEY': 'replay',
+    'GEMINI_API_KEY': 'replay',
+    'PERPLEXITY_API_KEY': 'replay',
+    'FINNHUB_API_KEY': 'replay',
+    'ALPHA_API_KEY': 'replay',
+    'SUPABASE_KEY': 'replay.replay.replay',
+}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+    except ImportError:
+        try:
+            import psutil
+            info = psutil.Process().memory_info()
+            return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 1)
+        except Exception:
+            return None
+
+
+def _stage_breakdown(spans):
+    """{span name: {'ms': total, 'calls': n, 'depth': d}} for every span below the root"""
+    depth = {}
+    stages = {}
+    for span in spans:
+        parent = span['parent_id']
+        depth[span['span_id']] = 0 if parent is None else depth.get(parent, 0) + 1
+        if parent is None:
+            continue
+        entry = stages.setdefault(span['name'], {'ms': 0.0, 'calls': 0, 'depth': depth[span['span_id']]})
+        entry['ms'] = round(entry['ms'] + span['duration_ms'], 3)
+        entry['calls'] += 1
+        entry['depth'] = min(entry['depth'], depth[span['span_id']])
+    return stages
+
+
+def _run_scenario(name, options, results):
+    """Child process body: one scenario, cold, inside the offline environment"""
+    workspace = options['workspace']
+    os.environ['PIPELINE_TRACING'] = 'true'
+    os.environ['PIPELINE_TRACE_DB'] = os.path.join(workspace, 'traces.sqlite3')
+    os.environ.pop('PIPELINE_TRACE_JSONL', None)
+
+    store = FixtureStore(options['fixtures_dir'], mode=options['mode'])
+    if store.recording:
+        if os.getenv('SUPABASE_URL'):
+            store.metadata['SUPABASE_URL'] = os.getenv('SUPABASE_URL')
+    else:
+        # Requests are matched by host, so Supabase must look like the recorded project
+        if store.metadata.get('SUPABASE_URL'):
+            os.environ['SUPABASE_URL'] = store.metadata['SUPABASE_URL']
+        for key, value in REPLAY_PLACEHOLDER_ENV.items():
+            os.environ.setdefault(key, value)
+
+    logging.basicConfig(level=options['log_level'], format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    from benchmarks.fixture_store import offline_environment
+    from benchmarks.scenarios import prepare_workspace
+    from automation_scripts.tracing import trace, current_trace_id, get_span_store
+
+    app_root = prepare_workspace(workspace)
+    outcome = {'scenario': name, 'status': 'ok'}
+    started = time.perf_counter()
+    with offline_environment(store):
+        with trace(f"benchmark.{name}", mode=options['mode']):
+            trace_id = current_trace_id()
+            try:
+                outcome['summary'] = SCENARIOS[name](
+                    app_root, tickers=options['tickers'], articles=options['articles'], store=store
+                )
+            except Exception as e:
+                logger.exception(f"Scenario {name} failed")
+                outcome['status'] = 'error'
+                outcome['error'] = f"{type(e).__name__}: {e}"
+    outcome['wall_seconds'] = round(time.perf_counter() - started, 3)
+    outcome['peak_rss_mb'] = _peak_rss_mb()
+    outcome['stages'] = _stage_breakdown(get_span_store().trace_spans(trace_id)) if trace_id else {}
+    outcome['fixtures'] = store.stats()
+    results.put(outcome)
+
+
+def run_scenario(name, options):
+    """Run one scenario in a spawned process and return its measurements"""
+    workspace = tempfile.mkdtemp(prefix=f"bench_{name}_")
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_run_scenario, args=(name, dict(options, workspace=workspace), results))
+    try:
+        process.start()
+        outcome = None
+        while outcome is None:
+            try:
+                outcome = results.get(timeout=5)
+            except Exception:
+                if not process.is_alive():
+                    break
+        process.join()
+        if outcome is None:
+            outcome = {'scenario': name, 'status': 'error', 'error': f"worker exited with code {process.exitcode}"}
+        return outcome
+    finally:
+        if options.get('keep_workspace'):
+            logger.info(f"Workspace for {name} kept at {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Regression messages for scenarios slower / bigger than baseline * (1 + tolerance)"""
+    regressions = []
+    notes = []
+    for name, result in results.items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if not reference or reference.get('status') != 'ok' or result.get('status') != 'ok':
+            continue
+        for metric, unit in (('wall_seconds', 's'), ('peak_rss_mb', ' MB')):
+            current, previous = result.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            if change > tolerance:
+                regressions.append(f"{name}: {metric} {previous}{unit} -> {current}{unit} (+{change:.0%})")
+        for stage, stats in result.get('stages', {}).items():
+            previous = reference.get('stages', {}).get(stage, {}).get('ms')
+            if previous and stats['ms'] - previous > STAGE_REPORT_MIN_MS and stats['ms'] > previous * (1 + tolerance):
+                notes.append(f"{name}/{stage}: {previous:.0f}ms -> {stats['ms']:.0f}ms")
+    return regressions, notes
+
+
+def replay_failures(results):
+    """Messages for scenarios whose replay is not a valid measurement (errors, unrecorded calls)"""
+    failures = []
+    for name, result in results.items():
+        if result.get('status') != 'ok':
+            failures.append(f"{name}: {result.get('error') or result.get('status')}")
+        misses = result.get('fixtures', {}).get('misses')
+        if misses:
+            failures.append(f"{name}: {misses} calls without a recording; re-record the fixtures")
+    return failures
+
+
+def _print_results(results, max_depth):
+    for name, result in results.items():
+        print(f"\n{name}: {result.get('status')}  wall={result.get('wall_seconds')}s  peak_rss={result.get('peak_rss_mb')}MB")
+        if result.get('error'):
+            print(f"  error: {result['error']}")
+        if result.get('summary'):
+            print(f"  output: {result['summary']}")
+        fixtures = result.get('fixtures', {})
+        if fixtures.get('misses'):
+            print(f"  fixture misses: {fixtures['misses']} (first: {fixtures['missing'][:3]})")
+        stages = sorted(result.get('stages', {}).items(), key=lambda item: -item[1]['ms'])
+        for stage, stats in stages:
+            if stats['depth'] <= max_depth:
+                print(f"  {'  ' * (stats['depth'] - 1)}{stage:<40} {stats['ms']:>10.1f} ms  x{stats['calls']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks for the report pipelines")
+    parser.add_argument('--mode', choices=('record', 'replay'), default='replay')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument('--tickers', default=','.join(DEFAULT_TICKERS), help="Comma-separated tickers")
+    parser.add_argument('--articles', type=int, default=1, help="Sports articles to generate")
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="Save this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown, e.g. 0.2 = 20%%")
+    parser.add_argument('--stage-depth', type=int, default=2, help="Deepest span level printed")
+    parser.add_argument('--output', help="Write the full results as JSON to this path")
+    parser.add_argument('--keep-workspace', action='store_true')
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level, format='%(levelname)s %(name)s: %(message)s')
+    names = [n.strip() for n in args.scenarios.split(',') if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {unknown} (available: {list(SCENARIOS)})")
+
+    if args.mode == 'record':
+        FixtureStore(args.fixtures_dir, mode='record').clear()
+    else:
+        if FixtureStore(args.fixtures_dir).is_empty():
+            parser.error(f"No recorded fixtures in {os.path.abspath(args.fixtures_dir)}; "
+                         f"record them first with --mode record (needs network access and API keys)")
+        if not args.update_baseline and not os.path.exists(args.baseline):
+            parser.error(f"No baseline at {args.baseline}; save one with --update-baseline")
+
+    options = {
+        'mode': args.mode,
+        'fixtures_dir': os.path.abspath(args.fixtures_dir),
+        'tickers': [t.strip().upper() for t in args.tickers.split(',') if t.strip()],
+        'articles': args.articles,
+        'log_level': args.log_level,
+        'keep_workspace': args.keep_workspace,
+    }
+    results = {}
+    for name in names:
+        print(f"Running {name} ({args.mode})...", flush=True)
+        results[name] = run_scenario(name, options)
+    _print_results(results, args.stage_depth)
+
+    run = {
+        'run_id': uuid.uuid4().hex[:8],
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'mode': args.mode,
+        'tickers': options['tickers'],
+        'articles': args.articles,
+        'scenarios': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2, default=str)
+
+    if args.mode == 'record':
+        return 0
+    failures = replay_failures(results)
+    if failures:
+        print("\nINVALID REPLAY:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2, default=str)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('tickers') != options['tickers'] or baseline.get('articles') != args.articles:
+        print("\nWarning: baseline was recorded with different tickers/articles; comparison may be meaningless")
+    regressions, notes = compare_to_baseline(results, baseline, args.tolerance)
+    for note in notes:
+        print(f"  slower stage: {note}")
+    if regressions:
+        print("\nREGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions against baseline {baseline.get('run_id')} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Benchmark Scenarios
+===================
+
+The end-to-end workloads timed by run_benchmarks.py. Each scenario runs
+against a throwaway workspace (``<workspace>/app`` is the app_root, so the
+data caches under ``<workspace>/generated_data`` start cold and reports are
+written there instead of into the repository) and returns a small summary
+of what it produced.
+
+Scenarios:
+----------
+- ``stock_report``: automation_scripts.pipeline.run_pipeline per ticker
+- ``wp_assets``: automation_scripts.pipeline.run_wp_pipeline per ticker
+- ``wordpress_report``: reporting_tools.wordpress_reporter.generate_wordpress_report
+- ``smart_update``: database.smart_updater.SmartStockUpdater.update_multiple_stocks
+  (Supabase traffic is recorded / replayed at the HTTP layer; record
+  against a staging project, the run writes to it)
+- ``sports_articles``: Sports ArticleGenerationPipeline.generate_article_batch
+  (Perplexity research + Gemini writing, articles are not saved)
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+WORDPRESS_SECTIONS = [
+    "introduction", "metrics_summary", "detailed_forecast_table",
+    "technical_analysis_summary", "conclusion_outlook", "risk_factors",
+]
+
+
+def prepare_workspace(workspace):
+    """Create <workspace>/app with the static assets the report writers read"""
+    app_root = os.path.join(workspace, 'app')
+    os.makedirs(os.path.join(app_root, 'static'), exist_ok=True)
+    os.makedirs(os.path.join(workspace, 'generated_data', 'data_cache'), exist_ok=True)
+    for name in ('content_library.json',):
+        source = os.path.join(PROJECT_ROOT, 'app', name)
+        if os.path.exists(source):
+            shutil.copyfile(source, os.path.join(app_root, name))
+    return app_root
+
+
+def _ensure_path(*parts):
+    path = os.path.join(PROJECT_ROOT, *parts)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def stock_report(app_root, tickers, **_):
+    _ensure_path()
+    from automation_scripts.pipeline import run_pipeline
+
+    produced = 0
+    for ticker in tickers:
+        result = run_pipeline(ticker, str(int(time.time())), app_root)
+        produced += bool(result and result[2])
+    return {'reports': produced}
+
+
+def wp_assets(app_root, tickers, **_):
+    _ensure_path()
+    from automation_scripts.pipeline import run_wp_pipeline
+
+    produced = 0
+    for ticker in tickers:
+        result = run_wp_pipeline(ticker, str(int(time.time())), app_root)
+        produced += bool(result and result[2])
+    return {'asset_sets': produced}
+
+
+def wordpress_report(app_root, tickers, **_):
+    _ensure_path()
+    from reporting_tools.wordpress_reporter import generate_wordpress_report
+
+    produced = 0
+    for ticker in tickers:
+        _, html, _ = generate_wordpress_report("Benchmark Site", ticker, app_root, WORDPRESS_SECTIONS)
+        produced += bool(html) and "Error generating report" not in html
+    return {'reports': produced}
+
+
+def smart_update(app_root, tickers, **_):
+    _ensure_path()
+    from database.smart_updater import SmartStockUpdater
+
+    results = SmartStockUpdater().update_multiple_stocks(tickers, delay_between=0)
+    return {key: results.get(key) for key in ('updated', 'skipped', 'no_new_data', 'failed')}
+
+
+def sports_articles(app_root, articles=1, store=None, **_):
+    _ensure_path()
+    _ensure_path('Sports_Article_Automation')
+    from Sports_Article_Automation.utilities.perplexity_ai_client import PerplexityResearchCollector
+    from Sports_Article_Automation.utilities.sports_article_generator import SportsArticleGenerator
+    from Sports_Article_Automation.core.article_generation_pipeline import ArticleGenerationPipeline, DATA_DIR
+    try:
+        from Sports_Article_Automation.state_management.sports_publishing_state_manager import SportsPublishingStateManager
+    except ImportError:
+        SportsPublishingStateManager = None
+
+    # The headline database changes every collection run, so it is snapshotted with the fixtures
+    database_file = str(DATA_DIR / "sports_news_database.json")
+    if store is not None:
+        database_file = store.attach_file('sports_news_database.json', database_file) or database_file
+
+    state_manager = None
+    if SportsPublishingStateManager is not None:
+        state_manager = SportsPublishingStateManager(
+            pickle_file_path=os.path.join(app_root, '..', 'state', 'sports_publishing_state.pkl')
+        )
+    pipeline = ArticleGenerationPipeline(
+        database_file=database_file,
+        perplexity_client=PerplexityResearchCollector(research_save_dir=os.path.join(app_root, '..', 'research')),
+        gemini_client=SportsArticleGenerator(),
+        state_manager=state_manager,
+    )
+    generated = pipeline.generate_article_batch(num_articles=articles, save_articles=False)
+    return {'articles': len(generated or [])}
+
+
+SCENARIOS = {
+    'stock_report': stock_report,
+    'wp_assets': wp_assets,
+    'wordpress_report': wordpress_report,
+    'smart_update': smart_update,
+    'sports_articles': sports_articles,
+}
@@ -170,6 +170,14 @@ except ImportError:
     def is_realtime_enabled():
         return True
 
+# Optional pipeline tracing (no-op outside a traced pipeline run)
+try:
+    from automation_scripts.tracing import span
+except ImportError:
+    from contextlib import nullcontext as _nullcontext
+    def span(name, **attrs):
+        return _nullcontext()
+
 # Configure logging
 # Basic config for direct script run, real app might have this in __init__ or main.
 if not logging.getLogger().hasHandlers():
@@ -596,7 +604,8 @@ def fetch_stock_data(
     try:
         time.sleep(throttle_secs)
         yf_ticker = yf.Ticker(ticker)
-        info = yf_ticker.info # Attempt to get info first
+        with span('yfinance.info', ticker=ticker):
+            info = yf_ticker.info # Attempt to get info first
         
         # A more robust check for valid ticker info.
         # 'regularMarketPrice' is a common field. 'symbol' should also exist.
@@ -631,7 +640,8 @@ def fetch_stock_data(
         if start_date or end_date:
             download_params.pop('period', None)
         
-        data = yf.download(**download_params)
+        with span('yfinance.download', ticker=ticker, interval=interval):
+            data = yf.download(**download_params)
         
         if data.empty:
             logger.warning(f"No data returned by yfinance.download for ticker: {ticker} with interval {interval}. This could mean the ticker symbol is incorrect, the stock is delisted, or there's no trading data available for the requested period.")
@@ -732,7 +742,8 @@ def get_current_market_price(ticker, timeout=10):
     """
     try:
         yf_ticker = yf.Ticker(ticker)
-        info = yf_ticker.info
+        with span('yfinance.current_price', ticker=ticker):
+            info = yf_ticker.info
         
         if not info:
             logger.warning(f"No info available for ticker {ticker}")
@@ -273,8 +273,13 @@ def enforce_date_column(df, df_name):
     return df_copy
 
 
-def preprocess_data(stock_df, macro_df):
-    """Merge and align stock data with macroeconomic data"""
+def preprocess_data(stock_df, macro_df, ticker=None):
+    """
+    Merge and align stock data with macroeconomic data.
+
+    Passing ``ticker`` lets add_technical_indicators reuse the ticker's
+    incremental indicator checkpoint.
+    """
     # Standardize date columns on copies of the dataframes
     stock = enforce_date_column(stock_df.copy(), "Stock") # Use .copy() if stock_df might be used elsewhere
     macro = enforce_date_column(macro_df.copy(), "Macro") # Use .copy()
@@ -350,7 +355,7 @@ def preprocess_data(stock_df, macro_df):
         raise ValueError(f"Not enough merged data ({len(merged)} rows) to compute technical indicators. Minimum 30 required.")
 
     # Add technical indicators using external function
-    merged = add_technical_indicators(merged.copy()) # Pass a copy 
+    merged = add_technical_indicators(merged.copy(), ticker=ticker) # Pass a copy 
 
     # Verify presence of essential stock market data columns AFTER feature engineering
     required_stock_columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
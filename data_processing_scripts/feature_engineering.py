@@ -164,14 +164,102 @@ Version: 2.0
 Last Updated: January 2026
 """
 
+import logging
+
 import pandas as pd
 from ta.trend import MACD, EMAIndicator, SMAIndicator, ADXIndicator
 from ta.momentum import RSIIndicator, StochasticOscillator
 from ta.volatility import BollingerBands, AverageTrueRange
 from ta.volume import OnBalanceVolumeIndicator, VolumeWeightedAveragePrice
 
-def add_technical_indicators(data):
-    """Create technical indicators with strict feature control"""
+from data_processing_scripts.indicator_engine import (
+    INDICATOR_COLUMNS, ENGINE_DISABLED, VERIFY_RESULTS, assert_equivalent, get_indicator_engine
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _add_ta_indicators(df):
+    """Add the indicator columns with the ta library (full-history computation)"""
+    # MACD (3 components)
+    macd_indicator = MACD(close=df['Close'], window_slow=26, window_fast=12, window_sign=9, fillna=False)
+    df['MACD'] = macd_indicator.macd()
+    df['MACD_Signal'] = macd_indicator.macd_signal()
+    df['MACD_Histogram'] = macd_indicator.macd_diff()
+    
+    # RSI
+    df['RSI'] = RSIIndicator(close=df['Close'], window=14, fillna=False).rsi()
+    
+    # Bollinger Bands (3 bands)
+    bb = BollingerBands(close=df['Close'], window=20, window_dev=2, fillna=False)
+    df['BB_Upper'] = bb.bollinger_hband()
+    df['BB_Middle'] = bb.bollinger_mavg()
+    df['BB_Lower'] = bb.bollinger_lband()
+    
+    # Moving Averages - Simple (SMA)
+    df['MA_7'] = df['Close'].rolling(window=7, min_periods=1).mean()
+    df['MA_20'] = SMAIndicator(close=df['Close'], window=20, fillna=False).sma_indicator()
+    df['MA_50'] = SMAIndicator(close=df['Close'], window=50, fillna=False).sma_indicator()
+    df['MA_100'] = SMAIndicator(close=df['Close'], window=100, fillna=False).sma_indicator()
+    df['MA_200'] = SMAIndicator(close=df['Close'], window=200, fillna=False).sma_indicator()
+    
+    # Moving Averages - Exponential (EMA)
+    df['EMA_12'] = EMAIndicator(close=df['Close'], window=12, fillna=False).ema_indicator()
+    df['EMA_26'] = EMAIndicator(close=df['Close'], window=26, fillna=False).ema_indicator()
+    
+    # ATR (Average True Range) - Volatility
+    df['ATR'] = AverageTrueRange(high=df['High'], low=df['Low'], close=df['Close'], window=14, fillna=False).average_true_range()
+    
+    # Volatility (Rolling Standard Deviation)
+    df['Volatility_7'] = df['Close'].rolling(window=7, min_periods=7).std()
+    df['Volatility_30d'] = df['Close'].pct_change().rolling(window=30).std() * (252 ** 0.5) * 100  # Annualized volatility %
+    
+    # OBV (On-Balance Volume)
+    df['OBV'] = OnBalanceVolumeIndicator(close=df['Close'], volume=df['Volume'], fillna=False).on_balance_volume()
+    
+    # Stochastic Oscillator (K and D)
+    stoch = StochasticOscillator(high=df['High'], low=df['Low'], close=df['Close'], window=14, smooth_window=3, fillna=False)
+    df['Stochastic_K'] = stoch.stoch()
+    df['Stochastic_D'] = stoch.stoch_signal()
+    
+    # ADX (Average Directional Index) - Trend Strength
+    df['ADX'] = ADXIndicator(high=df['High'], low=df['Low'], close=df['Close'], window=14, fillna=False).adx()
+    
+    # VWAP (Volume Weighted Average Price) - needs reset for each day but we'll use cumulative
+    # Note: VWAP is typically intraday, but we can calculate cumulative for daily data
+    try:
+        vwap = VolumeWeightedAveragePrice(high=df['High'], low=df['Low'], close=df['Close'], volume=df['Volume'], fillna=False)
+        df['VWAP'] = vwap.volume_weighted_average_price()
+    except Exception:
+        # If VWAP fails (needs intraday data), use simple volume-weighted price
+        df['VWAP'] = (df['Close'] * df['Volume']).cumsum() / df['Volume'].cumsum()
+    
+    # Volume SMA
+    df['Volume_SMA_20'] = df['Volume'].rolling(window=20, min_periods=1).mean()
+    
+    # Green Days Count (last 30 days where Close > Open)
+    def calculate_green_days(row_idx):
+        if row_idx < 30:
+            return None
+        last_30 = df.iloc[row_idx-29:row_idx+1]
+        return int((last_30['Close'] > last_30['Open']).sum())
+    
+    df['Green_Days_Count'] = df.index.map(calculate_green_days)
+    
+    # Support & Resistance (30-day)
+    df['Support_30D'] = df['Low'].rolling(window=30, min_periods=30).min()
+    df['Resistance_30D'] = df['High'].rolling(window=30, min_periods=30).max()
+    return df
+
+
+def add_technical_indicators(data, ticker=None):
+    """
+    Create technical indicators with strict feature control.
+
+    With a ``ticker`` the indicators come from the incremental engine (only bars
+    newer than the ticker's checkpoint are computed); without one, or when the
+    engine cannot stream the data, the ta library computes the full history.
+    """
     if 'Date' not in data.columns:
         raise ValueError("Missing Date column in feature engineering input data")
     
@@ -228,76 +316,29 @@ def add_technical_indicators(data):
         df['High'] = pd.to_numeric(df['High'], errors='raise')
         df['Low'] = pd.to_numeric(df['Low'], errors='raise')
         df['Volume'] = pd.to_numeric(df['Volume'], errors='raise')
+        df['Open'] = pd.to_numeric(df['Open'], errors='raise')
+
+        if ticker and not ENGINE_DISABLED:
+            indicators, mode = None, None
+            try:
+                indicators, mode = get_indicator_engine().compute(ticker, df)
+            except Exception as e:
+                logger.warning(f"Incremental indicators failed for {ticker}, using ta: {e}")
+            if indicators is None:
+                _add_ta_indicators(df)
+            else:
+                for column in INDICATOR_COLUMNS:
+                    df[column] = indicators[column]
+                if VERIFY_RESULTS:
+                    reference = _add_ta_indicators(df.copy())
+                    try:
+                        assert_equivalent(df, reference)
+                    except AssertionError as e:
+                        logger.error(f"{ticker}: {e}")
+                        df[INDICATOR_COLUMNS] = reference[INDICATOR_COLUMNS]
+        else:
+            _add_ta_indicators(df)
 
-        # MACD (3 components)
-        macd_indicator = MACD(close=df['Close'], window_slow=26, window_fast=12, window_sign=9, fillna=False)
-        df['MACD'] = macd_indicator.macd()
-        df['MACD_Signal'] = macd_indicator.macd_signal()
-        df['MACD_Histogram'] = macd_indicator.macd_diff()
-        
-        # RSI
-        df['RSI'] = RSIIndicator(close=df['Close'], window=14, fillna=False).rsi()
-        
-        # Bollinger Bands (3 bands)
-        bb = BollingerBands(close=df['Close'], window=20, window_dev=2, fillna=False)
-        df['BB_Upper'] = bb.bollinger_hband()
-        df['BB_Middle'] = bb.bollinger_mavg()
-        df['BB_Lower'] = bb.bollinger_lband()
-        
-        # Moving Averages - Simple (SMA)
-        df['MA_7'] = df['Close'].rolling(window=7, min_periods=1).mean()
-        df['MA_20'] = SMAIndicator(close=df['Close'], window=20, fillna=False).sma_indicator()
-        df['MA_50'] = SMAIndicator(close=df['Close'], window=50, fillna=False).sma_indicator()
-        df['MA_100'] = SMAIndicator(close=df['Close'], window=100, fillna=False).sma_indicator()
-        df['MA_200'] = SMAIndicator(close=df['Close'], window=200, fillna=False).sma_indicator()
-        
-        # Moving Averages - Exponential (EMA)
-        df['EMA_12'] = EMAIndicator(close=df['Close'], window=12, fillna=False).ema_indicator()
-        df['EMA_26'] = EMAIndicator(close=df['Close'], window=26, fillna=False).ema_indicator()
-        
-        # ATR (Average True Range) - Volatility
-        df['ATR'] = AverageTrueRange(high=df['High'], low=df['Low'], close=df['Close'], window=14, fillna=False).average_true_range()
-        
-        # Volatility (Rolling Standard Deviation)
-        df['Volatility_7'] = df['Close'].rolling(window=7, min_periods=7).std()
-        df['Volatility_30d'] = df['Close'].pct_change().rolling(window=30).std() * (252 ** 0.5) * 100  # Annualized volatility %
-        
-        # OBV (On-Balance Volume)
-        df['OBV'] = OnBalanceVolumeIndicator(close=df['Close'], volume=df['Volume'], fillna=False).on_balance_volume()
-        
-        # Stochastic Oscillator (K and D)
-        stoch = StochasticOscillator(high=df['High'], low=df['Low'], close=df['Close'], window=14, smooth_window=3, fillna=False)
-        df['Stochastic_K'] = stoch.stoch()
-        df['Stochastic_D'] = stoch.stoch_signal()
-        
-        # ADX (Average Directional Index) - Trend Strength
-        df['ADX'] = ADXIndicator(high=df['High'], low=df['Low'], close=df['Close'], window=14, fillna=False).adx()
-        
-        # VWAP (Volume Weighted Average Price) - needs reset for each day but we'll use cumulative
-        # Note: VWAP is typically intraday, but we can calculate cumulative for daily data
-        try:
-            vwap = VolumeWeightedAveragePrice(high=df['High'], low=df['Low'], close=df['Close'], volume=df['Volume'], fillna=False)
-            df['VWAP'] = vwap.volume_weighted_average_price()
-        except Exception:
-            # If VWAP fails (needs intraday data), use simple volume-weighted price
-            df['VWAP'] = (df['Close'] * df['Volume']).cumsum() / df['Volume'].cumsum()
-        
-        # Volume SMA
-        df['Volume_SMA_20'] = df['Volume'].rolling(window=20, min_periods=1).mean()
-        
-        # Green Days Count (last 30 days where Close > Open)
-        def calculate_green_days(row_idx):
-            if row_idx < 30:
-                return None
-            last_30 = df.iloc[row_idx-29:row_idx+1]
-            return int((last_30['Close'] > last_30['Open']).sum())
-        
-        df['Green_Days_Count'] = df.index.map(calculate_green_days)
-        
-        # Support & Resistance (30-day)
-        df['Support_30D'] = df['Low'].rolling(window=30, min_periods=30).min()
-        df['Resistance_30D'] = df['High'].rolling(window=30, min_periods=30).max()
-        
         # Days since start
         df['Days'] = (df['Date'] - df['Date'].min()).dt.days
     
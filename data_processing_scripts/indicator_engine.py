@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Incremental Technical-Indicator Engine
+======================================
+
+Streaming implementation of the indicator set ``add_technical_indicators``
+produces, with per-ticker rolling state checkpointed next to the price cache
+so a daily run only processes the bars that arrived since the last one.
+
+State kept per ticker:
+----------------------
+- **EMA**: EMA_12 / EMA_26 values and the MACD signal EMA
+- **RSI**: Wilder-smoothed average gain / loss
+- **ATR / ADX**: Wilder true-range average, and the smoothed TR / +DM / -DM
+  sums and ADX value (same recurrences and warm-up as the ``ta`` library)
+- **OBV**: running on-balance volume
+- **Windows**: the last 200 closes (SMAs, Bollinger, volatility), 30 highs /
+  lows / green days, 30 returns, 14-bar VWAP and stochastic windows
+
+Semantics match ``ta`` (and the pandas rolling windows) bar for bar: every
+result equals a full recompute over the caller's frame, starting at its
+first row.
+
+Sliding windows:
+----------------
+Callers usually download a fixed period, so the first bar moves forward
+between runs. The checkpoint is then rebased onto the new first bar: a fresh
+state is streamed from it until its output matches the stored history (the
+recursive EMA / RSI / ATR / ADX state has forgotten the old start, and the
+200-bar windows are full), the remaining stored rows are reused with OBV
+shifted to start at the new first bar, and the checkpoint state continues
+from there. When the window is too short for that to happen, the frame is
+simply recomputed.
+
+Checkpoints:
+------------
+``<state dir>/<TICKER>.json`` holds the state after the checkpoint bar and
+that bar's OHLCV fingerprint; ``<TICKER>.pkl`` holds the indicator history up
+to it. The checkpoint is always the second-to-last row, so a revised latest
+bar (intraday refresh) is simply recomputed. The history is reused only when
+the checkpoint bar is present with identical OHLCV (restated / adjusted
+prices trigger a full recompute) and every earlier row of the input is
+covered by the stored history. The stored history starts at the first row
+of the frame it was computed for.
+
+Configuration:
+--------------
+- ``INDICATOR_STATE_DIR``: checkpoint directory (default generated_data/data_cache/indicator_state)
+- ``INDICATOR_ENGINE_VERIFY``: when set, every result is checked against a full ``ta`` recompute
+- ``INDICATOR_ENGINE_DISABLED``: when set, add_technical_indicators always uses ``ta``
+
+Usage:
+------
+```python
+from data_processing_scripts.indicator_engine import get_indicator_engine
+
+indicators, mode = get_indicator_engine().compute('AAPL', df)   # 'full' / 'incremental' / 'rebased'
+```
+"""
+
+import os
+import json
+import math
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'generated_data', 'data_cache', 'indicator_state'
+)
+STATE_VERSION = 1
+VERIFY_RESULTS = os.getenv('INDICATOR_ENGINE_VERIFY', '').lower() in ('1', 'true', 'yes')
+ENGINE_DISABLED = os.getenv('INDICATOR_ENGINE_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+# Columns produced by the engine, in add_technical_indicators order ('Days' stays with the caller)
+INDICATOR_COLUMNS = [
+    'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'RSI',
+    'BB_Upper', 'BB_Middle', 'BB_Lower',
+    'MA_7', 'MA_20', 'MA_50', 'MA_100', 'MA_200',
+    'EMA_12', 'EMA_26',
+    'ATR', 'Volatility_7', 'Volatility_30d',
+    'OBV', 'Stochastic_K', 'Stochastic_D',
+    'ADX', 'VWAP', 'Volume_SMA_20',
+    'Green_Days_Count', 'Support_30D', 'Resistance_30D',
+]
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+NAN = float('nan')
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+ADX_WINDOW = 14
+STOCH_WINDOW = 14
+STOCH_SMOOTH = 3
+VWAP_WINDOW = 14
+BB_WINDOW = 20
+SMA_WINDOWS = (20, 50, 100, 200)
+LOOKBACK_30 = 30
+
+# Rebasing: rows streamed from the new first bar before the stored history may
+# be reused (every window full), and how closely the two must agree
+REBASE_MIN_BARS = max(max(SMA_WINDOWS), 2 * ADX_WINDOW)
+REBASE_RTOL = 1e-9
+REBASE_ATOL = 1e-9
+
+
+def _divide(numerator, denominator):
+    """numpy float division semantics (x/0 -> +-inf, 0/0 -> nan) without raising"""
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+def _mean(window):
+    return sum(window) / len(window)
+
+
+def _std(window, ddof):
+    n = len(window)
+    if n - ddof <= 0:
+        return NAN
+    mean = sum(window) / n
+    return math.sqrt(sum((x - mean) ** 2 for x in window) / (n - ddof))
+
+
+class _EMA:
+    """``series.ewm(alpha=..., min_periods=..., adjust=False).mean()`` one value at a time"""
+
+    __slots__ = ('alpha', 'min_periods', 'value', 'count')
+
+    def __init__(self, alpha, min_periods, value=None, count=0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = value
+        self.count = count
+
+    def update(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        self.count += 1
+        return self.value if self.count >= self.min_periods else NAN
+
+    def to_dict(self):
+        return {'value': self.value, 'count': self.count}
+
+
+class IndicatorState:
+    """Rolling state of every indicator after the last processed bar"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.bars = data.get('bars', 0)
+        self.prev = data.get('prev')  # [high, low, close] of the previous bar
+
+        self.ema_12 = _EMA(2 / 13, 12, **data.get('ema_12', {}))
+        self.ema_26 = _EMA(2 / 27, 26, **data.get('ema_26', {}))
+        self.macd_signal = _EMA(2 / 10, 9, **data.get('macd_signal', {}))
+        self.rsi_up = _EMA(1 / RSI_WINDOW, RSI_WINDOW, **data.get('rsi_up', {}))
+        self.rsi_down = _EMA(1 / RSI_WINDOW, RSI_WINDOW, **data.get('rsi_down', {}))
+
+        self.closes = deque(data.get('closes', []), maxlen=max(SMA_WINDOWS))
+        self.volumes = deque(data.get('volumes', []), maxlen=20)
+        self.highs_30 = deque(data.get('highs_30', []), maxlen=LOOKBACK_30)
+        self.lows_30 = deque(data.get('lows_30', []), maxlen=LOOKBACK_30)
+        self.green_30 = deque(data.get('green_30', []), maxlen=LOOKBACK_30)
+        self.returns_30 = deque(data.get('returns_30', []), maxlen=LOOKBACK_30)
+        self.stoch_k = deque(data.get('stoch_k', []), maxlen=STOCH_SMOOTH)
+        self.vwap_pv = deque(data.get('vwap_pv', []), maxlen=VWAP_WINDOW)
+        self.vwap_v = deque(data.get('vwap_v', []), maxlen=VWAP_WINDOW)
+
+        self.obv = data.get('obv', 0.0)
+
+        # ATR: true ranges of the first window bars, then the Wilder average
+        self.atr_init = data.get('atr_init', [])
+        self.atr = data.get('atr', 0.0)
+
+        # ADX: first-window sums, smoothed TR / +DM / -DM, directional indexes of the warm-up, ADX
+        self.adx_init = data.get('adx_init', [[], [], []])
+        self.adx_trs = data.get('adx_trs', 0.0)
+        self.adx_dip = data.get('adx_dip', 0.0)
+        self.adx_din = data.get('adx_din', 0.0)
+        self.adx_dx_init = data.get('adx_dx_init', [])
+        self.adx = data.get('adx', 0.0)
+
+    def to_dict(self):
+        return {
+            'bars': self.bars, 'prev': self.prev,
+            'ema_12': self.ema_12.to_dict(), 'ema_26': self.ema_26.to_dict(),
+            'macd_signal': self.macd_signal.to_dict(),
+            'rsi_up': self.rsi_up.to_dict(), 'rsi_down': self.rsi_down.to_dict(),
+            'closes': list(self.closes), 'volumes': list(self.volumes),
+            'highs_30': list(self.highs_30), 'lows_30': list(self.lows_30),
+            'green_30': list(self.green_30), 'returns_30': list(self.returns_30),
+            'stoch_k': list(self.stoch_k), 'vwap_pv': list(self.vwap_pv), 'vwap_v': list(self.vwap_v),
+            'obv': self.obv,
+            'atr_init': list(self.atr_init), 'atr': self.atr,
+            'adx_init': [list(values) for values in self.adx_init],
+            'adx_trs': self.adx_trs, 'adx_dip': self.adx_dip, 'adx_din': self.adx_din,
+            'adx_dx_init': list(self.adx_dx_init), 'adx': self.adx,
+        }
+
+    def _directional_index(self):
+        dip = 100 * (self.adx_dip / self.adx_trs) if self.adx_trs != 0 else 0.0
+        din = 100 * (self.adx_din / self.adx_trs) if self.adx_trs != 0 else 0.0
+        return 100 * abs((dip - din) / (dip + din)) if dip + din != 0 else 0.0
+
+    def update(self, open_, high, low, close, volume):
+        """Process one bar; returns the indicator values in INDICATOR_COLUMNS order"""
+        bar = self.bars
+        prev_high, prev_low, prev_close = self.prev if self.prev is not None else (NAN, NAN, NAN)
+
+        # --- EMA / MACD ---
+        ema_12 = self.ema_12.update(close)
+        ema_26 = self.ema_26.update(close)
+        macd = ema_12 - ema_26
+        if math.isnan(macd):
+            macd_signal = NAN
+        else:
+            macd_signal = self.macd_signal.update(macd)
+
+        # --- RSI (Wilder) ---
+        diff = close - prev_close if bar else NAN
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        avg_up = self.rsi_up.update(up)
+        avg_down = self.rsi_down.update(down)
+        if avg_down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + _divide(avg_up, avg_down))) if not math.isnan(avg_down) else NAN
+
+        # --- Windows over closes ---
+        self.closes.append(close)
+        closes = self.closes
+        n_closes = len(closes)
+        if n_closes >= BB_WINDOW:
+            window = list(closes)[-BB_WINDOW:]
+            bb_middle = _mean(window)
+            bb_std = _std(window, 0)
+            bb_upper, bb_lower = bb_middle + 2 * bb_std, bb_middle - 2 * bb_std
+        else:
+            bb_upper = bb_middle = bb_lower = NAN
+        recent_7 = list(closes)[-7:]
+        ma_7 = _mean(recent_7)
+        volatility_7 = _std(recent_7, 1) if len(recent_7) == 7 else NAN
+        smas = []
+        for window_size in SMA_WINDOWS:
+            if n_closes >= window_size:
+                smas.append(bb_middle if window_size == BB_WINDOW else _mean(list(closes)[-window_size:]))
+            else:
+                smas.append(NAN)
+
+        # --- Returns volatility (30 daily returns, annualized %) ---
+        if bar:
+            self.returns_30.append(_divide(close - prev_close, prev_close))
+        volatility_30d = (_std(self.returns_30, 1) * (252 ** 0.5) * 100
+                          if len(self.returns_30) == LOOKBACK_30 else NAN)
+
+        # --- ATR (ta: mean of the first window true ranges, then Wilder) ---
+        if bar:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        else:
+            true_range = high - low
+        if bar < ATR_WINDOW - 1:
+            self.atr_init.append(true_range)
+            atr = 0.0
+        elif bar == ATR_WINDOW - 1:
+            self.atr_init.append(true_range)
+            self.atr = _mean(self.atr_init)
+            self.atr_init = []
+            atr = self.atr
+        else:
+            self.atr = (self.atr * (ATR_WINDOW - 1) + true_range) / float(ATR_WINDOW)
+            atr = self.atr
+
+        # --- OBV ---
+        self.obv += -volume if (bar and close < prev_close) else volume
+
+        # --- Stochastic oscillator ---
+        self.highs_30.append(high)
+        self.lows_30.append(low)
+        if len(self.lows_30) >= STOCH_WINDOW:
+            lowest = min(list(self.lows_30)[-STOCH_WINDOW:])
+            highest = max(list(self.highs_30)[-STOCH_WINDOW:])
+            stoch_k = 100 * _divide(close - lowest, highest - lowest)
+        else:
+            stoch_k = NAN
+        self.stoch_k.append(stoch_k)
+        if len(self.stoch_k) == STOCH_SMOOTH and not any(math.isnan(k) for k in self.stoch_k):
+            stoch_d = _mean(self.stoch_k)
+        else:
+            stoch_d = NAN
+
+        # --- ADX (ta recurrences: first smoothed sums over bars 1..window, ADX from bar 2*window-1) ---
+        if bar:
+            directional_movement = max(high, prev_close) - min(low, prev_close)
+            diff_up = high - prev_high
+            diff_down = prev_low - low
+            pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+            neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+            if bar <= ADX_WINDOW:
+                for values, value in zip(self.adx_init, (directional_movement, pos, neg)):
+                    values.append(value)
+                if bar == ADX_WINDOW:
+                    self.adx_trs, self.adx_dip, self.adx_din = (sum(values) for values in self.adx_init)
+                    self.adx_init = [[], [], []]
+            else:
+                self.adx_trs = self.adx_trs - (self.adx_trs / float(ADX_WINDOW)) + directional_movement
+                self.adx_dip = self.adx_dip - (self.adx_dip / float(ADX_WINDOW)) + pos
+                self.adx_din = self.adx_din - (self.adx_din / float(ADX_WINDOW)) + neg
+            if bar >= ADX_WINDOW:
+                directional_index = self._directional_index()
+                step = bar - ADX_WINDOW + 1  # index of the ADX value this bar receives
+                if step < ADX_WINDOW:
+                    self.adx_dx_init.append(directional_index)
+                elif step == ADX_WINDOW:
+                    self.adx_dx_init.append(directional_index)
+                    self.adx = _mean(self.adx_dx_init)
+                    self.adx_dx_init = []
+                else:
+                    self.adx = ((self.adx * (ADX_WINDOW - 1)) + directional_index) / float(ADX_WINDOW)
+        adx = self.adx if bar >= 2 * ADX_WINDOW - 1 else 0.0
+
+        # --- VWAP (ta: 14-bar typical price * volume over volume) ---
+        self.vwap_pv.append((high + low + close) / 3.0 * volume)
+        self.vwap_v.append(volume)
+        vwap = _divide(sum(self.vwap_pv), sum(self.vwap_v)) if len(self.vwap_v) == VWAP_WINDOW else NAN
+
+        # --- Volume SMA (min_periods=1) ---
+        self.volumes.append(volume)
+        volume_sma_20 = _mean(self.volumes)
+
+        # --- 30-day green days, support and resistance ---
+        self.green_30.append(1 if close > open_ else 0)
+        green_days = float(sum(self.green_30)) if bar >= LOOKBACK_30 else NAN
+        if len(self.lows_30) == LOOKBACK_30:
+            support, resistance = min(self.lows_30), max(self.highs_30)
+        else:
+            support = resistance = NAN
+
+        self.prev = [high, low, close]
+        self.bars += 1
+        return (
+            macd, macd_signal, macd - macd_signal,
+            rsi,
+            bb_upper, bb_middle, bb_lower,
+            ma_7, *smas,
+            ema_12, ema_26,
+            atr, volatility_7, volatility_30d,
+            self.obv, stoch_k, stoch_d,
+            adx, vwap, volume_sma_20,
+            green_days, support, resistance,
+        )
+
+
+def assert_equivalent(result, reference, columns=INDICATOR_COLUMNS, rtol=1e-6, atol=1e-8):
+    """Raise AssertionError when engine output and reference (``ta``) columns differ"""
+    mismatches = []
+    for column in columns:
+        ours = result[column].to_numpy(dtype=float)
+        theirs = reference[column].to_numpy(dtype=float)
+        close = np.isclose(ours, theirs, rtol=rtol, atol=atol, equal_nan=True)
+        if not close.all():
+            position = int(np.argmin(close))
+            mismatches.append(f"{column} (first at row {position}: {ours[position]!r} != {theirs[position]!r}, "
+                              f"{int((~close).sum())} rows)")
+    if mismatches:
+        raise AssertionError(f"Incremental indicators differ from ta: {'; '.join(mismatches)}")
+
+
+class IndicatorEngine:
+    """Per-ticker incremental indicator computation with checkpoints on disk"""
+
+    def __init__(self, state_dir=None):
+        """
+        Args:
+            state_dir: Checkpoint directory (``INDICATOR_STATE_DIR`` env overrides the default)
+        """
+        self.state_dir = os.path.abspath(state_dir or os.environ.get('INDICATOR_STATE_DIR') or DEFAULT_STATE_DIR)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._stats = {
+            'full_recomputes': 0,
+            'incremental_updates': 0,
+            'bars_streamed': 0,
+            'bars_reused': 0,
+            'rebases': 0,
+            'checkpoint_errors': 0,
+        }
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker):
+        safe = ''.join(ch if ch.isalnum() or ch in '-_.^' else '_' for ch in ticker.upper())
+        return os.path.join(self.state_dir, f"{safe}.json"), os.path.join(self.state_dir, f"{safe}.pkl")
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+    def _load(self, ticker):
+        state_path, history_path = self._paths(ticker)
+        if not (os.path.exists(state_path) and os.path.exists(history_path)):
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('version') != STATE_VERSION:
+                return None
+            history = pd.read_pickle(history_path)
+            return checkpoint, history
+        except Exception as e:
+            self._stats['checkpoint_errors'] += 1
+            logger.warning(f"Ignoring unreadable indicator checkpoint for {ticker}: {e}")
+            return None
+
+    def _save(self, ticker, checkpoint, history):
+        state_path, history_path = self._paths(ticker)
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            history.to_pickle(history_path + '.tmp')
+            with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f)
+            os.replace(history_path + '.tmp', history_path)
+            os.replace(state_path + '.tmp', state_path)
+        except Exception as e:
+            self._stats['checkpoint_errors'] += 1
+            logger.warning(f"Could not write indicator checkpoint for {ticker}: {e}")
+
+    @staticmethod
+    def _fingerprint(row):
+        return [float(row[column]) for column in PRICE_COLUMNS]
+
+    def _reusable_rows(self, checkpoint, history, dates, prices):
+        """Number of leading input rows covered by the checkpoint (0 when it cannot be used)"""
+        checkpoint_date = pd.Timestamp(checkpoint['checkpoint_date'])
+        positions = np.flatnonzero(dates.values == checkpoint_date.to_datetime64())
+        if len(positions) != 1:
+            return 0
+        position = int(positions[0])
+        if position >= len(dates) - 1:
+            return 0
+        if not np.allclose(self._fingerprint(prices.iloc[position]), checkpoint['fingerprint'], rtol=1e-12, atol=0):
+            return 0  # prices restated (dividend / split adjustment): recompute
+        leading = pd.DatetimeIndex(dates.iloc[:position + 1])
+        if not leading.isin(history.index).all():
+            return 0
+        return position + 1
+
+    def _rebase(self, checkpoint, history, dates, values, reused):
+        """
+        Continue a checkpoint whose first bar is no longer the frame's first bar.
+
+        Streams a fresh state from the frame's first bar until its output
+        agrees with the stored history, then reuses the rest of the first
+        ``reused`` rows from the history with OBV shifted to the new start.
+
+        Returns (state, warmup_rows, stored_rows): state continues after row
+        ``reused - 1``; stored_rows is None when the output never converged,
+        in which case warmup_rows cover every reused row.
+        """
+        stored = history.loc[pd.DatetimeIndex(dates.iloc[:reused])].to_numpy(dtype=float, copy=True)
+        obv = INDICATOR_COLUMNS.index('OBV')
+        # ta's OBV counts the first bar's volume as positive
+        offset = stored[0, obv] - values[0][4]
+        stored[:, obv] -= offset
+
+        state = IndicatorState()
+        rows = []
+        for i in range(reused):
+            row = state.update(*values[i])
+            rows.append(row)
+            if i + 1 >= REBASE_MIN_BARS and np.allclose(row, stored[i], rtol=REBASE_RTOL, atol=REBASE_ATOL,
+                                                         equal_nan=True):
+                rebased = IndicatorState(checkpoint['state'])
+                rebased.obv -= offset
+                rebased.bars = reused
+                return rebased, rows, stored[i + 1:]
+        return state, rows, None
+
+    # ------------------------------------------------------------------
+    # Computation
+    # ------------------------------------------------------------------
+    def compute(self, ticker, df):
+        """
+        Indicator columns for ``df`` (sorted by Date, numeric OHLCV without gaps).
+
+        Returns (DataFrame indexed like ``df`` with INDICATOR_COLUMNS, mode) where
+        mode is 'full', 'incremental' (same first bar as the checkpoint) or
+        'rebased' (the window moved forward); (None, None) when ``df`` cannot
+        be streamed (missing prices).
+        """
+        prices = df[PRICE_COLUMNS].astype(float)
+        if prices.isna().any().any() or df['Date'].isna().any():
+            return None, None
+        dates = pd.to_datetime(df['Date'])
+
+        with self._lock(ticker):
+            loaded = self._load(ticker)
+            reused = 0
+            if loaded is not None:
+                checkpoint, history = loaded
+                reused = self._reusable_rows(checkpoint, history, dates, prices)
+            values = prices.to_numpy()
+            warmup = 0
+            if reused and dates.iloc[0] == history.index[0]:
+                state = IndicatorState(checkpoint['state'])
+                prefix = history.loc[pd.DatetimeIndex(dates.iloc[:reused])].to_numpy(dtype=float)
+                mode = 'incremental'
+            elif reused:
+                state, warmup_rows, stored = self._rebase(checkpoint, history, dates, values, reused)
+                prefix = np.array(warmup_rows, dtype=float).reshape(-1, len(INDICATOR_COLUMNS))
+                warmup = len(warmup_rows)
+                if stored is None:
+                    mode = 'full'
+                else:
+                    prefix = np.vstack([prefix, stored])
+                    mode = 'rebased'
+            else:
+                state = IndicatorState()
+                prefix = np.empty((0, len(INDICATOR_COLUMNS)))
+                mode = 'full'
+
+            rows = []
+            checkpoint_state = None
+            last = len(values) - 1
+            for i in range(reused, len(values)):
+                if i == last:
+                    checkpoint_state = state.to_dict()
+                open_, high, low, close, volume = values[i]
+                rows.append(state.update(open_, high, low, close, volume))
+            streamed = np.array(rows, dtype=float).reshape(-1, len(INDICATOR_COLUMNS))
+            result = pd.DataFrame(np.vstack([prefix, streamed]), index=df.index, columns=INDICATOR_COLUMNS)
+
+            # Checkpoint after the second-to-last row; the latest bar may still be revised
+            if checkpoint_state is not None and last >= 1 and last > reused:
+                history = result.iloc[:last].set_axis(pd.DatetimeIndex(dates.iloc[:last]))
+                self._save(ticker, {
+                    'version': STATE_VERSION,
+                    'ticker': ticker.upper(),
+                    'checkpoint_date': dates.iloc[last - 1].isoformat(),
+                    'fingerprint': self._fingerprint(prices.iloc[last - 1]),
+                    'state': checkpoint_state,
+                }, history)
+
+            self._stats['full_recomputes' if mode == 'full' else 'incremental_updates'] += 1
+            if mode == 'rebased':
+                self._stats['rebases'] += 1
+            streamed_bars = warmup + len(rows)
+            reused_bars = len(df) - streamed_bars
+            self._stats['bars_streamed'] += streamed_bars
+            self._stats['bars_reused'] += reused_bars
+        logger.debug(f"Indicators for {ticker}: {mode}, {streamed_bars} bars streamed, {reused_bars} reused")
+        return result, mode
+
+    def stats(self):
+        return dict(self._stats)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine():
+    """Process-wide indicator engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = IndicatorEngine()
+        return _engine
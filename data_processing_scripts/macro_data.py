@@ -3,6 +3,7 @@
 import pandas as pd
 import os
 import numpy as np
+import threading
 try:
     import pandas_datareader as pdr
 except (ImportError, TypeError) as e:
@@ -21,6 +22,11 @@ CACHE_FILENAME = "macro_indicators.csv"
 
 FRED_API_KEY = os.environ.get('FRED_API_KEY') #
 
+# Parsed + processed cache file per path, reused while the file's (mtime, size) is unchanged
+# so every ticker in a process does not re-read the CSV and recompute the MA30 columns
+_processed_cache = {}
+_processed_cache_lock = threading.Lock()
+
 def is_macro_data_current_for_today(data):
     """
     Check if the macro data contains current/today's data.
@@ -159,7 +165,15 @@ def fetch_macro_indicators(app_root, start_date=None, end_date=None, stock_data=
     if cache_exists:
         logger.info(f"Attempting to load cached macro data from: {CACHE_FILENAME}")
         try:
-            macro_data_cache = pd.read_csv(cache_filepath, parse_dates=['Date']) #
+            file_stat = os.stat(cache_filepath)
+            signature = (file_stat.st_mtime, file_stat.st_size)
+            with _processed_cache_lock:
+                memo = _processed_cache.get(cache_filepath)
+            if memo is not None and memo[0] == signature:
+                macro_data_cache, memo_processed = memo[1], memo[2]
+            else:
+                macro_data_cache = pd.read_csv(cache_filepath, parse_dates=['Date']) #
+                memo_processed = None
             required_cols = ['Date', 'Interest_Rate', 'SP500'] 
             missing_cols = [col for col in required_cols if col not in macro_data_cache.columns]
 
@@ -176,6 +190,10 @@ def fetch_macro_indicators(app_root, start_date=None, end_date=None, stock_data=
             else:
                 logger.info(f"Successfully loaded {len(macro_data_cache)} macro records from cache with current data.")
                 
+                if memo_processed is not None:
+                    logger.info(f"Reusing processed macro data for unchanged cache file, {len(memo_processed)} rows.")
+                    return memo_processed.copy()
+                
                 macro_data_to_process = macro_data_cache.set_index('Date') #
                 
                 processing_steps = [
@@ -196,7 +214,9 @@ def fetch_macro_indicators(app_root, start_date=None, end_date=None, stock_data=
                     logger.warning(f"Cached macro data became empty after processing and dropna for {CACHE_FILENAME}. Re-downloading.")
                 else:
                     logger.info(f"Processed cached macro data, {len(processed_df)} rows remaining.")
-                    return processed_df
+                    with _processed_cache_lock:
+                        _processed_cache[cache_filepath] = (signature, macro_data_cache, processed_df)
+                    return processed_df.copy()
         except Exception as e:
             logger.warning(f"Failed to load or process cached file {CACHE_FILENAME}: {e}. Re-downloading.")
 
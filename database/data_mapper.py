@@ -795,9 +795,10 @@ class DataMapper:
             Dict ready for risk_data table (with all metadata)
         """
         try:
-            from analysis_scripts.risk_analysis import RiskAnalyzer
+            from analysis_scripts.risk_analysis import RiskAnalyzer, get_market_context
             
-            ra = RiskAnalyzer()
+            # Shared once-per-day benchmark/regime snapshot instead of per-ticker recomputation
+            ra = RiskAnalyzer(market_context=get_market_context())
             
             # Use NEW enhanced method that returns metrics + metadata
             full_profile = ra.comprehensive_risk_profile_with_metadata(
@@ -39,7 +39,7 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 from database.pipeline_data_collector import PipelineDataCollector
 from database.data_mapper import DataMapper
 from database.supabase_client import SupabaseClient
-from analysis_scripts.risk_analysis import RiskAnalyzer
+from analysis_scripts.risk_analysis import RiskAnalyzer, get_market_context
 
 # Configure logging
 logging.basicConfig(
@@ -692,11 +692,12 @@ class SupabaseDataExporter:
                 if 'SP500' in collected_data['processed_data'].columns:
                     market_data = collected_data['processed_data']['SP500']
                 
-                # Calculate comprehensive risk profile
+                # Calculate comprehensive risk profile (regimes come from the shared market context)
                 risk_profile = self.risk_analyzer.comprehensive_risk_profile(
                     price_data=price_data,
                     market_data=market_data,
-                    ticker=ticker
+                    ticker=ticker,
+                    market_context=get_market_context()
                 )
                 logger.info("  ✓ Calculated comprehensive risk profile")
             except Exception as e:
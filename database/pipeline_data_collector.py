@@ -492,7 +492,8 @@ class PipelineDataCollector:
             try:
                 processed_data = preprocess_data(
                     result['stock_data'], 
-                    macro_data
+                    macro_data,
+                    ticker=ticker
                 )
                 
                 if processed_data is None or processed_data.empty:
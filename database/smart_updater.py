@@ -695,7 +695,7 @@ class SmartStockUpdater:
             # Calculate technical indicators on FULL dataset (with context)
             app_root = Path(__file__).parent.parent  # tickzen2 directory
             macro_data = fetch_macro_indicators(app_root=str(app_root), stock_data=hist_data)
-            processed_data = preprocess_data(hist_data, macro_data)
+            processed_data = preprocess_data(hist_data, macro_data, ticker=ticker)
             
             # Debug: Check processed data
             logger.info(f"Processed data total records: {len(processed_data)}")
@@ -9,15 +9,24 @@ Modules:
     - data_processor: Normalizes and validates earnings data
     - report_generator: Generates pre-earnings and post-earnings articles
     - pipeline: Main orchestrator for the earnings pipeline
+    - batch_engine: Concurrent batch runner with a resumable SQLite job ledger
     - config: Configuration settings for the pipeline
     - utils: Helper utilities
+
+The classes below are imported lazily, so importing one submodule (e.g.
+``earnings_reports.batch_engine``) does not require yfinance and the other
+data-source dependencies of the collector.
 """
 
-from .data_collector import EarningsDataCollector
-from .data_processor import EarningsDataProcessor
-# from .report_generator import EarningsReportGenerator  # Temporarily disabled
-from .earnings_config import EarningsConfig
-# from .pipeline import EarningsPipeline, quick_generate  # Temporarily disabled
+import importlib
+
+_LAZY_IMPORTS = {
+    'EarningsDataCollector': 'data_collector',
+    'EarningsDataProcessor': 'data_processor',
+    # 'EarningsReportGenerator': 'report_generator',  # Temporarily disabled
+    'EarningsConfig': 'earnings_config',
+    # 'EarningsPipeline': 'pipeline', 'quick_generate': 'pipeline',  # Temporarily disabled
+}
 
 __all__ = [
     'EarningsDataCollector',
@@ -29,3 +38,10 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(f'.{_LAZY_IMPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Earnings Batch Engine
+=====================
+
+Runs the earnings workflow (collect -> process -> write) for a list of
+tickers on a bounded worker pool.
+
+- **Ledger**: every ticker's last completed stage, status and a compact
+  result (bulky HTML fields dropped, file paths kept) is recorded in a local
+  SQLite file, so a batch interrupted by a crash or restart resumes where it
+  stopped when it is run again with the same ``batch_id`` (finished tickers
+  are returned from the ledger, the rest are re-run). Without a
+  ``batch_id`` the newest interrupted batch with the same tickers, report
+  type and dry-run flag is resumed (see ``BatchLedger.incomplete_batches``).
+  Finished batches are pruned after ``EarningsConfig.BATCH_LEDGER_RETENTION_DAYS``.
+- **Stage limits**: besides the overall worker count, each stage can be
+  capped separately (e.g. at most two concurrent Gemini calls).
+- **Timings**: per-stage duration histograms for the run.
+- **Dry run**: the collect stage reads recorded fixture files instead of
+  calling any API and writers are told not to call Gemini or save files,
+  so a batch can be benchmarked offline. Fixtures are ``<TICKER>.json`` or
+  the collector's own ``<TICKER>_earnings_data_<date>.json`` cache files.
+
+Usage:
+    engine = EarningsBatchEngine(collect_fn, process_fn, write_fn, max_workers=4)
+    run = engine.run(['AAPL', 'MSFT'], batch_id='weekly-2026-10-19')
+    run['results'], run['timings']
+"""
+
+import os
+import glob
+import json
+import time
+import hashlib
+import uuid
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .earnings_config import EarningsConfig
+except ImportError:
+    from earnings_config import EarningsConfig
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('collect', 'process', 'write')
+# Result fields holding rendered articles; the ledger keeps the file paths instead
+BULKY_RESULT_FIELDS = ('html_content', 'article_html')
+
+
+def ledger_result(result: Any) -> Any:
+    """Copy of a stage result without rendered HTML (nested report results included)"""
+    if not isinstance(result, dict):
+        return result
+    return {key: ledger_result(value) for key, value in result.items() if key not in BULKY_RESULT_FIELDS}
+
+
+def ticker_key(tickers: List[str]) -> str:
+    """Stable fingerprint of an ordered ticker list"""
+    return hashlib.sha1('\n'.join(tickers).encode('utf-8')).hexdigest()
+
+
+class StageTimings:
+    """Thread-safe per-stage duration histograms"""
+
+    BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = {'count': 0, 'total': 0.0, 'max': 0.0, 'buckets': [0] * (len(self.BUCKETS) + 1)}
+                self._stages[stage] = entry
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            for index, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    entry['buckets'][index] += 1
+                    break
+            else:
+                entry['buckets'][-1] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for stage, entry in self._stages.items():
+                histogram = {f"<={bound}s": count for bound, count in zip(self.BUCKETS, entry['buckets'])}
+                histogram[f">{self.BUCKETS[-1]}s"] = entry['buckets'][-1]
+                result[stage] = {
+                    'count': entry['count'],
+                    'total_seconds': round(entry['total'], 3),
+                    'avg_seconds': round(entry['total'] / entry['count'], 3),
+                    'max_seconds': round(entry['max'], 3),
+                    'histogram': histogram,
+                }
+            return result
+
+
+class BatchLedger:
+    """SQLite record of batch items: stage reached, status, result and timings"""
+
+    def __init__(self, db_path: Optional[str] = None, retention_days: Optional[int] = None):
+        """
+        Args:
+            db_path: SQLite file (``EARNINGS_BATCH_LEDGER_PATH`` env overrides the configured default)
+            retention_days: Days a finished batch is kept (defaults to EarningsConfig.BATCH_LEDGER_RETENTION_DAYS)
+        """
+        self.db_path = os.path.abspath(
+            db_path or os.environ.get('EARNINGS_BATCH_LEDGER_PATH') or EarningsConfig.BATCH_LEDGER_PATH
+        )
+        self.retention_days = (EarningsConfig.BATCH_LEDGER_RETENTION_DAYS
+                               if retention_days is None else retention_days)
+        self._lock = threading.Lock()
+        self.available = self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> bool:
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS batches ('
+                    'batch_id TEXT PRIMARY KEY, report_type TEXT, total INTEGER NOT NULL, '
+                    'created_at TEXT NOT NULL, updated_at TEXT NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS batch_items ('
+                    'batch_id TEXT NOT NULL, position INTEGER NOT NULL, ticker TEXT NOT NULL, '
+                    'stage TEXT, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, '
+                    'error TEXT, result_json TEXT, timings_json TEXT, updated_at TEXT NOT NULL, '
+                    'PRIMARY KEY (batch_id, position))'
+                )
+                columns = {row['name'] for row in conn.execute('PRAGMA table_info(batches)')}
+                if 'ticker_key' not in columns:
+                    conn.execute('ALTER TABLE batches ADD COLUMN ticker_key TEXT')
+                if 'dry_run' not in columns:
+                    conn.execute('ALTER TABLE batches ADD COLUMN dry_run INTEGER NOT NULL DEFAULT 0')
+            return True
+        except Exception as e:
+            logger.warning(f"Batch ledger unavailable at {self.db_path}, progress will not be persisted: {e}")
+            return False
+
+    def start_batch(self, batch_id: str, tickers: List[str], report_type: str,
+                    dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        Register a batch (or reopen an existing one) and return its items.
+
+        Raises:
+            ValueError: If batch_id already exists with a different ticker list
+        """
+        now = datetime.now().isoformat()
+        if not self.available:
+            return [{'position': i, 'ticker': t, 'stage': None, 'status': 'pending', 'attempts': 0}
+                    for i, t in enumerate(tickers)]
+        self.prune()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                'SELECT position, ticker, stage, status, attempts, error, result_json '
+                'FROM batch_items WHERE batch_id = ? ORDER BY position', (batch_id,)
+            ).fetchall()
+            if rows:
+                if [row['ticker'] for row in rows] != list(tickers):
+                    raise ValueError(f"Batch {batch_id} already exists with a different ticker list")
+                conn.execute('UPDATE batches SET updated_at = ? WHERE batch_id = ?', (now, batch_id))
+                return [dict(row) for row in rows]
+            conn.execute(
+                'INSERT INTO batches (batch_id, report_type, total, created_at, updated_at, ticker_key, dry_run) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (batch_id, report_type, len(tickers), now, now, ticker_key(tickers), int(dry_run))
+            )
+            conn.executemany(
+                'INSERT INTO batch_items (batch_id, position, ticker, stage, status, attempts, updated_at) '
+                'VALUES (?, ?, ?, NULL, ?, 0, ?)',
+                [(batch_id, i, t, 'pending', now) for i, t in enumerate(tickers)]
+            )
+        return [{'position': i, 'ticker': t, 'stage': None, 'status': 'pending', 'attempts': 0}
+                for i, t in enumerate(tickers)]
+
+    def update_item(self, batch_id: str, position: int, **fields):
+        """Update stage/status/attempts/error/result/timings for one item"""
+        if not self.available:
+            return
+        columns = {'updated_at': datetime.now().isoformat()}
+        for key, value in fields.items():
+            if key == 'result':
+                columns['result_json'] = json.dumps(ledger_result(value), default=str)
+            elif key == 'timings':
+                columns['timings_json'] = json.dumps(value)
+            else:
+                columns[key] = value
+        assignments = ', '.join(f"{column} = ?" for column in columns)
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    f'UPDATE batch_items SET {assignments} WHERE batch_id = ? AND position = ?',
+                    (*columns.values(), batch_id, position)
+                )
+        except Exception as e:
+            logger.warning(f"Batch ledger update failed for {batch_id}#{position}: {e}")
+
+    def incomplete_batches(self, tickers: Optional[List[str]] = None, report_type: Optional[str] = None,
+                           dry_run: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Batches with items that never finished (pending or interrupted while running), newest first.
+
+        Failed items count as finished: a batch whose only leftovers are
+        failures ran to the end and is not offered for resumption.
+
+        Args:
+            tickers: Only batches over exactly this ticker list
+            report_type: Only batches with this report type
+            dry_run: Only dry-run (True) or live (False) batches
+        """
+        if not self.available:
+            return []
+        clauses, params = [], []
+        if tickers is not None:
+            clauses.append('b.ticker_key = ?')
+            params.append(ticker_key(tickers))
+        if report_type is not None:
+            clauses.append('b.report_type = ?')
+            params.append(report_type)
+        if dry_run is not None:
+            clauses.append('b.dry_run = ?')
+            params.append(int(dry_run))
+        where = ''.join(f' AND {clause}' for clause in clauses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT b.batch_id, b.report_type, b.total, b.created_at, b.updated_at, '
+                "SUM(CASE WHEN i.status IN ('done', 'failed') THEN 0 ELSE 1 END) AS unfinished "
+                'FROM batches b JOIN batch_items i ON i.batch_id = b.batch_id '
+                f'WHERE 1 = 1{where} GROUP BY b.batch_id HAVING unfinished > 0 '
+                'ORDER BY b.updated_at DESC', params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune(self) -> int:
+        """Delete finished batches not touched for ``retention_days``; returns how many were removed"""
+        if not self.available or self.retention_days is None or self.retention_days < 0:
+            return 0
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        try:
+            with self._lock, self._connect() as conn:
+                stale = [row['batch_id'] for row in conn.execute(
+                    'SELECT b.batch_id FROM batches b JOIN batch_items i ON i.batch_id = b.batch_id '
+                    'WHERE b.updated_at < ? GROUP BY b.batch_id '
+                    "HAVING SUM(CASE WHEN i.status IN ('done', 'failed') THEN 0 ELSE 1 END) = 0",
+                    (cutoff,)
+                )]
+                for batch_id in stale:
+                    conn.execute('DELETE FROM batch_items WHERE batch_id = ?', (batch_id,))
+                    conn.execute('DELETE FROM batches WHERE batch_id = ?', (batch_id,))
+        except Exception as e:
+            logger.warning(f"Batch ledger prune failed: {e}")
+            return 0
+        if stale:
+            logger.info(f"Pruned {len(stale)} finished batches older than {self.retention_days} days")
+        return len(stale)
+
+    def summary(self, batch_id: str) -> Dict[str, int]:
+        """Item counts by status"""
+        if not self.available:
+            return {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT status, COUNT(*) AS n FROM batch_items WHERE batch_id = ? GROUP BY status', (batch_id,)
+            ).fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+
+def load_fixture(ticker: str, fixtures_dir: str) -> Dict[str, Any]:
+    """
+    Recorded raw collector output for a ticker.
+
+    Looks for ``<TICKER>.json`` first, then the newest collector cache file
+    ``<TICKER>_earnings_data_<date>.json``.
+
+    Raises:
+        FileNotFoundError: If no fixture exists for the ticker
+    """
+    path = os.path.join(fixtures_dir, f"{ticker}.json")
+    if not os.path.exists(path):
+        candidates = sorted(glob.glob(os.path.join(fixtures_dir, f"{ticker}_earnings_data_*.json")))
+        if not candidates:
+            raise FileNotFoundError(f"No recorded fixture for {ticker} in {fixtures_dir}")
+        path = candidates[-1]
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_fixture(ticker: str, raw_data: Dict[str, Any], fixtures_dir: str) -> str:
+    """Record raw collector output (already JSON-serializable) as ``<TICKER>.json``"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = os.path.join(fixtures_dir, f"{ticker}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(raw_data, f, indent=2, default=str)
+    return path
+
+
+class EarningsBatchEngine:
+    """
+    Bounded worker pool running collect -> process -> write per ticker.
+
+    Stage callables:
+        collect_fn(ticker) -> raw_data
+        process_fn(raw_data) -> processed_data
+        write_fn(ticker, raw_data, processed_data, dry_run) -> result dict
+    """
+
+    def __init__(self, collect_fn: Callable, process_fn: Callable, write_fn: Callable,
+                 max_workers: Optional[int] = None, stage_limits: Optional[Dict[str, int]] = None,
+                 ledger: Optional[BatchLedger] = None, serializer: Optional[Callable] = None):
+        """
+        Args:
+            collect_fn: Collection stage
+            process_fn: Processing stage
+            write_fn: Writing stage
+            max_workers: Tickers in flight at once (defaults to EarningsConfig.BATCH_WORKERS)
+            stage_limits: Optional per-stage concurrency caps, e.g. {'write': 2}
+            ledger: BatchLedger to persist progress (a default ledger is opened when omitted)
+            serializer: Converts raw collector output to JSON-safe data when recording fixtures
+        """
+        self.stage_fns = {'collect': collect_fn, 'process': process_fn, 'write': write_fn}
+        self.max_workers = max(1, max_workers or EarningsConfig.BATCH_WORKERS)
+        self.stage_limits = dict(stage_limits or {})
+        self.ledger = ledger or BatchLedger()
+        self.serializer = serializer
+
+    def run(self, tickers: List[str], report_type: str = 'both', batch_id: Optional[str] = None,
+            dry_run: bool = False, fixtures_dir: Optional[str] = None, record_fixtures: bool = False,
+            retry_failed: bool = True) -> Dict[str, Any]:
+        """
+        Run (or resume) a batch.
+
+        Args:
+            tickers: Ticker symbols, in output order (duplicates are processed separately)
+            report_type: Label stored with the batch
+            batch_id: Ledger key; pass the id of an interrupted batch to resume it. When
+                      omitted, the newest interrupted batch over the same tickers,
+                      report type and dry-run flag is resumed, else a new id is made
+            dry_run: Read fixtures instead of collecting and tell the writer not to publish
+            fixtures_dir: Fixture directory (defaults to EarningsConfig.FIXTURES_DIR)
+            record_fixtures: Save each collected payload as a fixture for later dry runs
+            retry_failed: Re-run items that failed in a previous attempt of this batch
+
+        Returns:
+            Dictionary with batch_id, results (input order), timings, summary and duration_seconds.
+            Results restored from the ledger omit the rendered HTML fields
+            (BULKY_RESULT_FIELDS); their saved file paths are kept.
+        """
+        if batch_id is None:
+            interrupted = self.ledger.incomplete_batches(tickers, report_type, dry_run)
+            if interrupted:
+                batch_id = interrupted[0]['batch_id']
+                logger.info(f"Resuming interrupted batch {batch_id}")
+            else:
+                batch_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        fixtures_dir = fixtures_dir or EarningsConfig.FIXTURES_DIR
+        items = self.ledger.start_batch(batch_id, tickers, report_type, dry_run)
+        timings = StageTimings()
+        semaphores = {stage: threading.BoundedSemaphore(limit)
+                      for stage, limit in self.stage_limits.items() if limit and limit > 0}
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        started = time.perf_counter()
+
+        pending = []
+        for item in items:
+            if item['status'] == 'done' or (item['status'] == 'failed' and not retry_failed):
+                results[item['position']] = json.loads(item['result_json']) if item.get('result_json') else {
+                    'success': False, 'ticker': item['ticker'], 'error': item.get('error')
+                }
+            else:
+                pending.append(item)
+
+        resumed = len(items) - len(pending)
+        logger.info(
+            f"Batch {batch_id}: {len(pending)} of {len(items)} tickers to run"
+            + (f" ({resumed} restored from ledger)" if resumed else "")
+            + (" [dry run]" if dry_run else "")
+        )
+
+        completed = resumed
+        completed_lock = threading.Lock()
+
+        def _run_item(item):
+            nonlocal completed
+            result = self._run_item(batch_id, item, timings, semaphores, dry_run, fixtures_dir, record_fixtures)
+            with completed_lock:
+                completed += 1
+                done = completed
+            status = 'ok' if result.get('success', result.get('overall_success')) else 'failed'
+            logger.info(f"Batch {batch_id}: {item['ticker']} {status} ({done}/{len(items)})")
+            return item['position'], result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='earnings-batch') as executor:
+            futures = [executor.submit(_run_item, item) for item in pending]
+            for future in as_completed(futures):
+                position, result = future.result()
+                results[position] = result
+
+        duration = time.perf_counter() - started
+        summary = self.ledger.summary(batch_id)
+        logger.info(f"Batch {batch_id} finished in {duration:.2f}s: {summary or 'ledger unavailable'}")
+        return {
+            'batch_id': batch_id,
+            'results': results,
+            'timings': timings.snapshot(),
+            'summary': summary,
+            'duration_seconds': round(duration, 3),
+            'dry_run': dry_run,
+        }
+
+    def _run_item(self, batch_id, item, timings, semaphores, dry_run, fixtures_dir, record_fixtures):
+        ticker = item['ticker']
+        position = item['position']
+        attempts = (item.get('attempts') or 0) + 1
+        item_timings = {}
+        self.ledger.update_item(batch_id, position, status='running', attempts=attempts, error=None)
+        item_started = time.perf_counter()
+        stage = None
+
+        try:
+            raw_data = processed_data = result = None
+            for stage in STAGES:
+                semaphore = semaphores.get(stage)
+                if semaphore:
+                    semaphore.acquire()
+                stage_started = time.perf_counter()
+                try:
+                    if stage == 'collect':
+                        if dry_run:
+                            raw_data = load_fixture(ticker, fixtures_dir)
+                        else:
+                            raw_data = self.stage_fns['collect'](ticker)
+                            if record_fixtures:
+                                serializable = self.serializer(raw_data) if self.serializer else raw_data
+                                save_fixture(ticker, serializable, fixtures_dir)
+                    elif stage == 'process':
+                        processed_data = self.stage_fns['process'](raw_data)
+                    else:
+                        result = self.stage_fns['write'](ticker, raw_data, processed_data, dry_run)
+                finally:
+                    elapsed = time.perf_counter() - stage_started
+                    if semaphore:
+                        semaphore.release()
+                    timings.record(stage, elapsed)
+                    item_timings[stage] = round(elapsed, 3)
+                self.ledger.update_item(batch_id, position, stage=stage, timings=item_timings)
+
+            timings.record('total', time.perf_counter() - item_started)
+            succeeded = result.get('success', result.get('overall_success', True))
+            self.ledger.update_item(
+                batch_id, position, status='done' if succeeded else 'failed',
+                error=None if succeeded else result.get('error'), result=result
+            )
+            return result
+        except Exception as e:
+            timings.record('total', time.perf_counter() - item_started)
+            logger.error(f"Batch {batch_id}: {ticker} failed during {stage}: {e}", exc_info=True)
+            result = {'success': False, 'ticker': ticker, 'error': str(e), 'failed_stage': stage}
+            self.ledger.update_item(batch_id, position, status='failed', error=str(e), result=result)
+            return result
@@ -49,7 +49,11 @@ Data Collection Workflow:
 API Management:
 --------------
 - Automatic retry with exponential backoff
-- Rate limiting compliance across all sources
+- Per-provider token buckets shared across collectors; independent
+  endpoints are requested concurrently within quota
+- One yfinance fetch plan per ticker (YFinanceSnapshot): info, statements
+  and a single price history download shared by every extractor
+- Per-ticker collection time and remote-call counts in 'collection_stats'
 - API key rotation for high-volume usage
 - Error categorization and appropriate responses
 - Quota monitoring and usage optimization
@@ -110,6 +114,8 @@ Last Updated: January 2026
 import json
 import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Optional, Any
 import os
@@ -139,10 +145,128 @@ except ImportError:
     from adjusted_earnings_calculator import calculate_adjusted_earnings_for_ticker
     from cash_sustainability_analyzer import analyze_cash_sustainability_for_ticker
 
+from Sports_Article_Automation.utilities.rate_limiter import TokenBucket, get_provider_limiter
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def _get_provider_limiter(provider: str, config: EarningsConfig) -> TokenBucket:
+    """Process-wide limiter for a provider, so concurrent tickers share one quota"""
+    calls_per_minute, burst = config.PROVIDER_RATE_LIMITS.get(
+        provider, (60.0 / config.RATE_LIMIT_DELAY, 1)
+    )
+    return get_provider_limiter(provider, calls_per_minute, burst)
+
+
+class YFinanceSnapshot:
+    """
+    Fetch plan for one ticker.
+    
+    Requests each resource (``info``, statements, calendar,
+    recommendations, price history) at most once, so every extractor in a
+    collection run reads the same data. Price history is downloaded once for
+    ``HISTORY_PERIOD`` and the shorter windows are sliced from it locally.
+    Safe to share between threads: ``yf.Ticker`` keeps unsynchronized lazy
+    state, so each thread fetches through its own instance.
+    """
+    
+    HISTORY_PERIOD = '1y'
+    HISTORY_WINDOWS = {
+        '60d': pd.Timedelta(days=60),
+        '1mo': pd.DateOffset(months=1),
+        '3mo': pd.DateOffset(months=3),
+        '1y': None,
+    }
+    # Everything collect_all_data() reads, warmed concurrently up front
+    COLLECTION_PLAN = (
+        'info', 'history',
+        'income_stmt', 'quarterly_income_stmt',
+        'balance_sheet', 'quarterly_balance_sheet',
+        'cashflow', 'quarterly_cashflow',
+        'earnings', 'quarterly_earnings',
+        'calendar', 'recommendations', 'analyst_price_target', 'upgrades_downgrades',
+    )
+    
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self._local = threading.local()
+        self.remote_calls = 0
+        self._values = {}
+        self._errors = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str) -> Any:
+        """
+        Value of a yfinance resource, fetched on first use.
+        
+        Returns None for attributes this yfinance version does not provide;
+        a failed fetch is remembered and re-raised to every caller.
+        """
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name in self._values:
+                return self._values[name]
+            if name in self._errors:
+                raise self._errors[name]
+            with self._lock:
+                self.remote_calls += 1
+            try:
+                if name == 'history':
+                    value = self.stock.history(period=self.HISTORY_PERIOD)
+                else:
+                    value = getattr(self.stock, name, None)
+            except Exception as e:
+                self._errors[name] = e
+                raise
+            self._values[name] = value
+            return value
+    
+    @property
+    def stock(self) -> yf.Ticker:
+        """This thread's ``yf.Ticker`` for the symbol"""
+        stock = getattr(self._local, 'stock', None)
+        if stock is None:
+            stock = self._local.stock = yf.Ticker(self.ticker)
+        return stock
+    
+    @property
+    def info(self) -> Dict[str, Any]:
+        return self.get('info') or {}
+    
+    def history(self, period: str = None, ytd: bool = False) -> pd.DataFrame:
+        """Price history for a window ('60d', '1mo', '3mo', '1y') or year-to-date, sliced from one download"""
+        hist = self.get('history')
+        if hist is None or hist.empty:
+            return pd.DataFrame() if hist is None else hist
+        now = pd.Timestamp.now(tz=hist.index.tz)
+        if ytd:
+            return hist[hist.index >= pd.Timestamp(year=now.year, month=1, day=1, tz=hist.index.tz)]
+        window = self.HISTORY_WINDOWS[period]
+        if window is None:
+            return hist
+        return hist[hist.index >= now - window]
+    
+    def prefetch(self, names=None, max_workers: int = 4):
+        """Warm the given resources concurrently; failures are left for the extractors to report"""
+        names = list(names or self.COLLECTION_PLAN)
+        
+        def _warm(name):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.debug(f"Prefetch of {name} failed for {self.ticker}: {e}")
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='yf-snapshot') as executor:
+            list(executor.map(_warm, names))
+
+
+def _frame_to_dict(value) -> Dict[str, Any]:
+    return value.to_dict() if value is not None and hasattr(value, 'to_dict') else {}
+
+
 class EarningsDataCollector:
     """
     Collects earnings report data from multiple sources.
@@ -224,32 +348,39 @@ class EarningsDataCollector:
                 return cached_data
         
         # Collect ONLY from yfinance
+        started = time.perf_counter()
         earnings_data = {
             'ticker': ticker,
             'collection_timestamp': datetime.now().isoformat(),
             'data_sources': {}
         }
         
+        # One fetch plan for the ticker: every resource is requested once, concurrently,
+        # and shared by all of the extractors below
+        snapshot = YFinanceSnapshot(ticker)
+        snapshot.prefetch(max_workers=self.config.COLLECTION_WORKERS)
+        fetch_seconds = time.perf_counter() - started
+        
         # Collect comprehensive yfinance data
         logger.info(f"Collecting comprehensive yfinance data for {ticker}")
-        yf_data = self._collect_yfinance_data(ticker)
+        yf_data = self._collect_yfinance_data(ticker, snapshot)
         earnings_data['data_sources']['yfinance'] = yf_data
         
         # Collect additional yfinance-based data
         logger.info(f"Collecting analyst data from yfinance for {ticker}")
-        analyst_data = self.collect_analyst_data(ticker)
+        analyst_data = self.collect_analyst_data(ticker, snapshot)
         earnings_data['data_sources']['analyst'] = analyst_data
         
         logger.info(f"Collecting valuation metrics from yfinance for {ticker}")
-        valuation_data = self.collect_valuation_metrics(ticker)
+        valuation_data = self.collect_valuation_metrics(ticker, snapshot)
         earnings_data['data_sources']['valuation'] = valuation_data
         
         logger.info(f"Collecting performance data from yfinance for {ticker}")
-        performance_data = self.collect_performance_data(ticker)
+        performance_data = self.collect_performance_data(ticker, snapshot)
         earnings_data['data_sources']['performance'] = performance_data
         
         logger.info(f"Collecting segment revenue data from yfinance for {ticker}")
-        segment_data = self.collect_segment_revenue(ticker)
+        segment_data = self.collect_segment_revenue(ticker, snapshot)
         earnings_data['data_sources']['segment'] = segment_data
         
         # ENHANCED ANALYTICS - Phase 1 Implementation
@@ -267,18 +398,29 @@ class EarningsDataCollector:
         cash_sustainability = analyze_cash_sustainability_for_ticker(ticker, yf_data)
         earnings_data['enhanced_analytics']['cash_sustainability'] = cash_sustainability
         
+        duration = time.perf_counter() - started
+        earnings_data['collection_stats'] = {
+            'duration_seconds': round(duration, 3),
+            'fetch_seconds': round(fetch_seconds, 3),
+            'remote_calls': {'yfinance': snapshot.remote_calls}
+        }
+        
         # Save to cache
         self._save_to_cache(ticker, earnings_data)
         
-        logger.info(f"Completed data collection for {ticker}")
+        logger.info(
+            f"Completed data collection for {ticker} in {duration:.2f}s "
+            f"({snapshot.remote_calls} yfinance calls, {fetch_seconds:.2f}s fetching)"
+        )
         return earnings_data
     
-    def _collect_yfinance_data(self, ticker: str) -> Dict[str, Any]:
+    def _collect_yfinance_data(self, ticker: str, snapshot: Optional[YFinanceSnapshot] = None) -> Dict[str, Any]:
         """
         Collect data from yfinance.
         
         Args:
             ticker: Stock ticker symbol
+            snapshot: Shared fetch plan for the ticker; a new one is created if omitted
             
         Returns:
             Dictionary containing yfinance data
@@ -290,58 +432,38 @@ class EarningsDataCollector:
         }
         
         try:
-            stock = yf.Ticker(ticker)
+            snapshot = snapshot or YFinanceSnapshot(ticker)
             
             # Company identification and profile
-            info = stock.info
+            info = snapshot.get('info')
             yf_data['data']['info'] = info
             
-            # Financial statements (income statement)
-            try:
-                yf_data['data']['income_stmt'] = stock.income_stmt.to_dict() if hasattr(stock, 'income_stmt') and stock.income_stmt is not None else {}
-                yf_data['data']['quarterly_income_stmt'] = stock.quarterly_income_stmt.to_dict() if hasattr(stock, 'quarterly_income_stmt') and stock.quarterly_income_stmt is not None else {}
-            except Exception as e:
-                logger.warning(f"Could not fetch income statement from yfinance for {ticker}: {e}")
-                yf_data['data']['income_stmt'] = {}
-                yf_data['data']['quarterly_income_stmt'] = {}
-            
-            # Balance sheet
-            try:
-                yf_data['data']['balance_sheet'] = stock.balance_sheet.to_dict() if hasattr(stock, 'balance_sheet') and stock.balance_sheet is not None else {}
-                yf_data['data']['quarterly_balance_sheet'] = stock.quarterly_balance_sheet.to_dict() if hasattr(stock, 'quarterly_balance_sheet') and stock.quarterly_balance_sheet is not None else {}
-            except Exception as e:
-                logger.warning(f"Could not fetch balance sheet from yfinance for {ticker}: {e}")
-                yf_data['data']['balance_sheet'] = {}
-                yf_data['data']['quarterly_balance_sheet'] = {}
-            
-            # Cash flow
-            try:
-                yf_data['data']['cashflow'] = stock.cashflow.to_dict() if hasattr(stock, 'cashflow') and stock.cashflow is not None else {}
-                yf_data['data']['quarterly_cashflow'] = stock.quarterly_cashflow.to_dict() if hasattr(stock, 'quarterly_cashflow') and stock.quarterly_cashflow is not None else {}
-            except Exception as e:
-                logger.warning(f"Could not fetch cashflow from yfinance for {ticker}: {e}")
-                yf_data['data']['cashflow'] = {}
-                yf_data['data']['quarterly_cashflow'] = {}
-            
-            # Earnings data
-            try:
-                yf_data['data']['earnings'] = stock.earnings.to_dict() if hasattr(stock, 'earnings') and stock.earnings is not None else {}
-                yf_data['data']['quarterly_earnings'] = stock.quarterly_earnings.to_dict() if hasattr(stock, 'quarterly_earnings') and stock.quarterly_earnings is not None else {}
-            except Exception as e:
-                logger.warning(f"Could not fetch earnings from yfinance for {ticker}: {e}")
-                yf_data['data']['earnings'] = {}
-                yf_data['data']['quarterly_earnings'] = {}
+            # Financial statements, annual and quarterly
+            statements = (
+                ('income statement', 'income_stmt', 'quarterly_income_stmt'),
+                ('balance sheet', 'balance_sheet', 'quarterly_balance_sheet'),
+                ('cashflow', 'cashflow', 'quarterly_cashflow'),
+                ('earnings', 'earnings', 'quarterly_earnings'),
+            )
+            for label, annual_key, quarterly_key in statements:
+                try:
+                    yf_data['data'][annual_key] = _frame_to_dict(snapshot.get(annual_key))
+                    yf_data['data'][quarterly_key] = _frame_to_dict(snapshot.get(quarterly_key))
+                except Exception as e:
+                    logger.warning(f"Could not fetch {label} from yfinance for {ticker}: {e}")
+                    yf_data['data'][annual_key] = {}
+                    yf_data['data'][quarterly_key] = {}
             
             # Earnings calendar
             try:
-                if hasattr(stock, 'calendar') and stock.calendar is not None:
-                    # Handle both DataFrame and dict types
-                    if hasattr(stock.calendar, 'to_dict'):
-                        yf_data['data']['calendar'] = stock.calendar.to_dict()
-                    elif isinstance(stock.calendar, dict):
-                        yf_data['data']['calendar'] = stock.calendar
-                    else:
-                        yf_data['data']['calendar'] = {}
+                calendar = snapshot.get('calendar')
+                # Handle both DataFrame and dict types
+                if calendar is None:
+                    yf_data['data']['calendar'] = {}
+                elif hasattr(calendar, 'to_dict'):
+                    yf_data['data']['calendar'] = calendar.to_dict()
+                elif isinstance(calendar, dict):
+                    yf_data['data']['calendar'] = calendar
                 else:
                     yf_data['data']['calendar'] = {}
             except Exception as e:
@@ -350,8 +472,9 @@ class EarningsDataCollector:
             
             # Analyst recommendations and estimates
             try:
-                yf_data['data']['recommendations'] = stock.recommendations.to_dict() if hasattr(stock, 'recommendations') and stock.recommendations is not None else {}
-                yf_data['data']['analyst_price_target'] = stock.analyst_price_target if hasattr(stock, 'analyst_price_target') else {}
+                yf_data['data']['recommendations'] = _frame_to_dict(snapshot.get('recommendations'))
+                price_target = snapshot.get('analyst_price_target')
+                yf_data['data']['analyst_price_target'] = price_target if price_target is not None else {}
             except Exception as e:
                 logger.warning(f"Could not fetch recommendations from yfinance for {ticker}: {e}")
                 yf_data['data']['recommendations'] = {}
@@ -359,7 +482,7 @@ class EarningsDataCollector:
             
             # Historical price data (last 60 days for context)
             try:
-                hist = stock.history(period='60d')
+                hist = snapshot.history('60d')
                 if not hist.empty:
                     yf_data['data']['price_history'] = hist.to_dict()
                     
@@ -387,6 +510,46 @@ class EarningsDataCollector:
         
         return yf_data
     
+    def _run_provider_calls(self, provider: str, ticker: str, calls: Dict[str, Any],
+                            defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run independent endpoint calls for one provider concurrently.
+        
+        Each call waits on the provider's shared token bucket before it is
+        issued, so the combined request rate stays within quota.
+        
+        Args:
+            provider: Provider name (key into PROVIDER_RATE_LIMITS)
+            ticker: Stock ticker symbol (for logging)
+            calls: Result key -> zero-argument callable performing the request
+            defaults: Result key -> value used when the call fails
+            
+        Returns:
+            Dictionary with 'data', 'remote_calls' and 'rate_limit_wait_seconds'
+        """
+        limiter = _get_provider_limiter(provider, self.config)
+        stats_lock = threading.Lock()
+        stats = {'remote_calls': 0, 'rate_limit_wait_seconds': 0.0}
+        
+        def _call(key):
+            waited = limiter.acquire()
+            with stats_lock:
+                stats['remote_calls'] += 1
+                stats['rate_limit_wait_seconds'] += waited
+            try:
+                return calls[key]()
+            except Exception as e:
+                logger.warning(f"Could not fetch {key} from {provider} for {ticker}: {e}")
+                return defaults.get(key, {})
+        
+        workers = max(1, min(self.config.COLLECTION_WORKERS, len(calls)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{provider}-calls") as executor:
+            futures = {key: executor.submit(_call, key) for key in calls}
+            data = {key: future.result() for key, future in futures.items()}
+        
+        stats['rate_limit_wait_seconds'] = round(stats['rate_limit_wait_seconds'], 3)
+        return {'data': data, **stats}
+    
     def _collect_alpha_vantage_data(self, ticker: str) -> Dict[str, Any]:
         """
         Collect data from Alpha Vantage API.
@@ -411,112 +574,36 @@ class EarningsDataCollector:
         try:
             base_url = "https://www.alphavantage.co/query"
             
-            # Rate limiting
-            self._wait_for_rate_limit('alpha_vantage')
-            
-            # Get earnings data
-            try:
+            def _query(function):
                 params = {
-                    'function': 'EARNINGS',
+                    'function': function,
                     'symbol': ticker,
                     'apikey': self.config.ALPHA_VANTAGE_API_KEY
                 }
                 response = requests.get(base_url, params=params, timeout=self.config.REQUEST_TIMEOUT)
                 response.raise_for_status()
-                earnings_data = response.json()
-                
-                if 'Information' in earnings_data:
-                    logger.warning(f"Alpha Vantage API limit message: {earnings_data['Information']}")
-                    av_data['data']['earnings'] = {}
-                else:
-                    av_data['data']['earnings'] = earnings_data
+                payload = response.json()
                 
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch earnings from Alpha Vantage for {ticker}: {e}")
-                av_data['data']['earnings'] = {}
-            
-            # Get income statement
-            try:
-                params = {
-                    'function': 'INCOME_STATEMENT',
-                    'symbol': ticker,
-                    'apikey': self.config.ALPHA_VANTAGE_API_KEY
-                }
-                response = requests.get(base_url, params=params, timeout=self.config.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                income_data = response.json()
-                
-                if 'Information' not in income_data:
-                    av_data['data']['income_statement'] = income_data
-                else:
-                    av_data['data']['income_statement'] = {}
-                
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch income statement from Alpha Vantage for {ticker}: {e}")
-                av_data['data']['income_statement'] = {}
-            
-            # Get balance sheet
-            try:
-                params = {
-                    'function': 'BALANCE_SHEET',
-                    'symbol': ticker,
-                    'apikey': self.config.ALPHA_VANTAGE_API_KEY
-                }
-                response = requests.get(base_url, params=params, timeout=self.config.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                balance_data = response.json()
-                
-                if 'Information' not in balance_data:
-                    av_data['data']['balance_sheet'] = balance_data
-                else:
-                    av_data['data']['balance_sheet'] = {}
-                
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch balance sheet from Alpha Vantage for {ticker}: {e}")
-                av_data['data']['balance_sheet'] = {}
-            
-            # Get cash flow
-            try:
-                params = {
-                    'function': 'CASH_FLOW',
-                    'symbol': ticker,
-                    'apikey': self.config.ALPHA_VANTAGE_API_KEY
-                }
-                response = requests.get(base_url, params=params, timeout=self.config.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                cashflow_data = response.json()
-                
-                if 'Information' not in cashflow_data:
-                    av_data['data']['cash_flow'] = cashflow_data
-                else:
-                    av_data['data']['cash_flow'] = {}
-                
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch cash flow from Alpha Vantage for {ticker}: {e}")
-                av_data['data']['cash_flow'] = {}
-            
-            # Get company overview
-            try:
-                params = {
-                    'function': 'OVERVIEW',
-                    'symbol': ticker,
-                    'apikey': self.config.ALPHA_VANTAGE_API_KEY
-                }
-                response = requests.get(base_url, params=params, timeout=self.config.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                overview_data = response.json()
-                
-                if 'Information' not in overview_data:
-                    av_data['data']['overview'] = overview_data
-                else:
-                    av_data['data']['overview'] = {}
-            except Exception as e:
-                logger.warning(f"Could not fetch overview from Alpha Vantage for {ticker}: {e}")
-                av_data['data']['overview'] = {}
+                if 'Information' in payload:
+                    logger.warning(f"Alpha Vantage API limit message: {payload['Information']}")
+                    return {}
+                return payload
+            
+            endpoints = {
+                'earnings': 'EARNINGS',
+                'income_statement': 'INCOME_STATEMENT',
+                'balance_sheet': 'BALANCE_SHEET',
+                'cash_flow': 'CASH_FLOW',
+                'overview': 'OVERVIEW',
+            }
+            result = self._run_provider_calls(
+                'alpha_vantage', ticker,
+                {key: (lambda function=function: _query(function)) for key, function in endpoints.items()},
+                defaults={}
+            )
+            av_data['data'] = result['data']
+            av_data['remote_calls'] = result['remote_calls']
+            av_data['rate_limit_wait_seconds'] = result['rate_limit_wait_seconds']
             
             av_data['success'] = True
             logger.info(f"Successfully collected Alpha Vantage data for {ticker}")
@@ -549,80 +636,34 @@ class EarningsDataCollector:
             return fh_data
         
         try:
-            # Rate limiting
-            self._wait_for_rate_limit('finnhub')
+            client = self.finnhub_client
             
-            # Get company profile
-            try:
-                profile = self.finnhub_client.company_profile2(symbol=ticker)
-                fh_data['data']['profile'] = profile
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch profile from Finnhub for {ticker}: {e}")
-                fh_data['data']['profile'] = {}
+            # Earnings calendar window: 90 days either side of today
+            today = datetime.now()
+            from_date = (today - timedelta(days=90)).strftime('%Y-%m-%d')
+            to_date = (today + timedelta(days=90)).strftime('%Y-%m-%d')
             
-            # Get earnings calendar
-            try:
-                # Get earnings for next 30 days and past 30 days
-                today = datetime.now()
-                from_date = (today - timedelta(days=90)).strftime('%Y-%m-%d')
-                to_date = (today + timedelta(days=90)).strftime('%Y-%m-%d')
-                
-                earnings_calendar = self.finnhub_client.earnings_calendar(
+            calls = {
+                'profile': lambda: client.company_profile2(symbol=ticker),
+                'earnings_calendar': lambda: client.earnings_calendar(
                     _from=from_date,
                     to=to_date,
                     symbol=ticker,
                     international=False
-                )
-                fh_data['data']['earnings_calendar'] = earnings_calendar
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch earnings calendar from Finnhub for {ticker}: {e}")
-                fh_data['data']['earnings_calendar'] = {}
-            
-            # Get earnings surprises (historical)
-            try:
-                surprises = self.finnhub_client.company_earnings(ticker, limit=8)
-                fh_data['data']['earnings_surprises'] = surprises
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch earnings surprises from Finnhub for {ticker}: {e}")
-                fh_data['data']['earnings_surprises'] = []
-            
-            # Get analyst estimates
-            try:
-                estimates = self.finnhub_client.company_eps_estimates(ticker)
-                fh_data['data']['eps_estimates'] = estimates
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch EPS estimates from Finnhub for {ticker}: {e}")
-                fh_data['data']['eps_estimates'] = {}
-            
-            # Get revenue estimates
-            try:
-                revenue_estimates = self.finnhub_client.company_revenue_estimates(ticker)
-                fh_data['data']['revenue_estimates'] = revenue_estimates
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch revenue estimates from Finnhub for {ticker}: {e}")
-                fh_data['data']['revenue_estimates'] = {}
-            
-            # Get basic financials
-            try:
-                financials = self.finnhub_client.company_basic_financials(ticker, 'all')
-                fh_data['data']['basic_financials'] = financials
-                time.sleep(self.config.RATE_LIMIT_DELAY)
-            except Exception as e:
-                logger.warning(f"Could not fetch basic financials from Finnhub for {ticker}: {e}")
-                fh_data['data']['basic_financials'] = {}
-            
-            # Get recommendation trends
-            try:
-                recommendations = self.finnhub_client.recommendation_trends(ticker)
-                fh_data['data']['recommendations'] = recommendations
-            except Exception as e:
-                logger.warning(f"Could not fetch recommendations from Finnhub for {ticker}: {e}")
-                fh_data['data']['recommendations'] = []
+                ),
+                'earnings_surprises': lambda: client.company_earnings(ticker, limit=8),
+                'eps_estimates': lambda: client.company_eps_estimates(ticker),
+                'revenue_estimates': lambda: client.company_revenue_estimates(ticker),
+                'basic_financials': lambda: client.company_basic_financials(ticker, 'all'),
+                'recommendations': lambda: client.recommendation_trends(ticker),
+            }
+            result = self._run_provider_calls(
+                'finnhub', ticker, calls,
+                defaults={'earnings_surprises': [], 'recommendations': []}
+            )
+            fh_data['data'] = result['data']
+            fh_data['remote_calls'] = result['remote_calls']
+            fh_data['rate_limit_wait_seconds'] = result['rate_limit_wait_seconds']
             
             fh_data['success'] = True
             logger.info(f"Successfully collected Finnhub data for {ticker}")
@@ -640,11 +681,7 @@ class EarningsDataCollector:
         Args:
             api_name: Name of the API (for tracking)
         """
-        if api_name in self.last_api_call:
-            elapsed = time.time() - self.last_api_call[api_name]
-            if elapsed < self.config.RATE_LIMIT_DELAY:
-                time.sleep(self.config.RATE_LIMIT_DELAY - elapsed)
-        
+        _get_provider_limiter(api_name, self.config).acquire()
         self.last_api_call[api_name] = time.time()
     
     def _load_from_cache(self, ticker: str) -> Optional[Dict[str, Any]]:
@@ -711,12 +748,13 @@ class EarningsDataCollector:
         logger.info(f"Getting upcoming earnings for next {days_ahead} days")
         return []
     
-    def collect_analyst_data(self, ticker: str) -> Dict[str, Any]:
+    def collect_analyst_data(self, ticker: str, snapshot: Optional[YFinanceSnapshot] = None) -> Dict[str, Any]:
         """
         Collect comprehensive analyst ratings, recommendations, and price targets.
         
         Args:
             ticker: Stock ticker symbol
+            snapshot: Shared fetch plan for the ticker; a new one is created if omitted
             
         Returns:
             Dictionary containing analyst data
@@ -728,20 +766,17 @@ class EarningsDataCollector:
         }
         
         try:
-            stock = yf.Ticker(ticker)
+            snapshot = snapshot or YFinanceSnapshot(ticker)
             
             # Get analyst recommendations
             try:
-                if hasattr(stock, 'recommendations') and stock.recommendations is not None:
-                    analyst_data['data']['recommendations'] = stock.recommendations.to_dict()
-                else:
-                    analyst_data['data']['recommendations'] = {}
+                analyst_data['data']['recommendations'] = _frame_to_dict(snapshot.get('recommendations'))
             except Exception as e:
                 logger.warning(f"Could not fetch recommendations for {ticker}: {e}")
                 analyst_data['data']['recommendations'] = {}
             
             # Get recommendation summary from info
-            info = stock.info
+            info = snapshot.info
             analyst_data['data']['recommendation_key'] = info.get('recommendationKey', 'N/A')
             analyst_data['data']['recommendation_mean'] = info.get('recommendationMean', 'N/A')
             analyst_data['data']['number_of_analyst_opinions'] = info.get('numberOfAnalystOpinions', 'N/A')
@@ -754,10 +789,7 @@ class EarningsDataCollector:
             
             # Upgrades/Downgrades
             try:
-                if hasattr(stock, 'upgrades_downgrades') and stock.upgrades_downgrades is not None:
-                    analyst_data['data']['upgrades_downgrades'] = stock.upgrades_downgrades.to_dict()
-                else:
-                    analyst_data['data']['upgrades_downgrades'] = {}
+                analyst_data['data']['upgrades_downgrades'] = _frame_to_dict(snapshot.get('upgrades_downgrades'))
             except Exception as e:
                 logger.warning(f"Could not fetch upgrades/downgrades for {ticker}: {e}")
                 analyst_data['data']['upgrades_downgrades'] = {}
@@ -771,12 +803,13 @@ class EarningsDataCollector:
         
         return analyst_data
     
-    def collect_valuation_metrics(self, ticker: str) -> Dict[str, Any]:
+    def collect_valuation_metrics(self, ticker: str, snapshot: Optional[YFinanceSnapshot] = None) -> Dict[str, Any]:
         """
         Collect comprehensive valuation metrics.
         
         Args:
             ticker: Stock ticker symbol
+            snapshot: Shared fetch plan for the ticker; a new one is created if omitted
             
         Returns:
             Dictionary containing valuation metrics
@@ -788,8 +821,8 @@ class EarningsDataCollector:
         }
         
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            snapshot = snapshot or YFinanceSnapshot(ticker)
+            info = snapshot.info
             
             # Market Cap
             valuation_data['data']['market_cap'] = info.get('marketCap', 'N/A')
@@ -830,12 +863,13 @@ class EarningsDataCollector:
         
         return valuation_data
     
-    def collect_performance_data(self, ticker: str) -> Dict[str, Any]:
+    def collect_performance_data(self, ticker: str, snapshot: Optional[YFinanceSnapshot] = None) -> Dict[str, Any]:
         """
         Collect stock performance data including historical returns.
         
         Args:
             ticker: Stock ticker symbol
+            snapshot: Shared fetch plan for the ticker; a new one is created if omitted
             
         Returns:
             Dictionary containing performance data
@@ -847,13 +881,13 @@ class EarningsDataCollector:
         }
         
         try:
-            stock = yf.Ticker(ticker)
+            snapshot = snapshot or YFinanceSnapshot(ticker)
             
-            # Get historical data for various periods
-            hist_1m = stock.history(period='1mo')
-            hist_3m = stock.history(period='3mo')
-            hist_ytd = stock.history(start=f"{datetime.now().year}-01-01")
-            hist_1y = stock.history(period='1y')
+            # Get historical data for various periods (all sliced from one download)
+            hist_1m = snapshot.history('1mo')
+            hist_3m = snapshot.history('3mo')
+            hist_ytd = snapshot.history(ytd=True)
+            hist_1y = snapshot.history('1y')
             
             # Calculate returns
             if not hist_1m.empty:
@@ -902,7 +936,7 @@ class EarningsDataCollector:
                 performance_data['data']['avg_volume_3m'] = 'N/A'
             
             # Beta
-            info = stock.info
+            info = snapshot.info
             performance_data['data']['beta'] = info.get('beta', 'N/A')
             
             performance_data['success'] = True
@@ -914,12 +948,13 @@ class EarningsDataCollector:
         
         return performance_data
     
-    def collect_segment_revenue(self, ticker: str) -> Dict[str, Any]:
+    def collect_segment_revenue(self, ticker: str, snapshot: Optional[YFinanceSnapshot] = None) -> Dict[str, Any]:
         """
         Collect business segment revenue data.
         
         Args:
             ticker: Stock ticker symbol
+            snapshot: Shared fetch plan for the ticker; a new one is created if omitted
             
         Returns:
             Dictionary containing segment revenue data
@@ -931,11 +966,11 @@ class EarningsDataCollector:
         }
         
         try:
-            stock = yf.Ticker(ticker)
+            snapshot = snapshot or YFinanceSnapshot(ticker)
             
             # Try to get segment data from financials
             # Note: Segment breakdown is limited in yfinance
-            info = stock.info
+            info = snapshot.info
             
             # Get geographic revenue breakdown if available
             segment_data['data']['business_summary'] = info.get('longBusinessSummary', 'N/A')
@@ -30,6 +30,21 @@ class EarningsConfig:
     MAX_RETRIES = 3
     REQUEST_TIMEOUT = 30  # seconds
     RATE_LIMIT_DELAY = 1.0  # seconds between API calls
+
+    # Per-provider token buckets shared by every collector in the process:
+    # provider -> (sustained calls per minute, burst size)
+    PROVIDER_RATE_LIMITS = {
+        'alpha_vantage': (int(os.getenv('ALPHA_VANTAGE_CALLS_PER_MINUTE', '60')), 5),
+        'finnhub': (int(os.getenv('FINNHUB_CALLS_PER_MINUTE', '60')), 10),
+    }
+    COLLECTION_WORKERS = int(os.getenv('EARNINGS_COLLECTION_WORKERS', '4'))  # concurrent remote calls per ticker
+
+    # Batch Settings
+    BATCH_WORKERS = int(os.getenv('EARNINGS_BATCH_WORKERS', '4'))  # tickers in flight at once
+    BATCH_WRITE_WORKERS = int(os.getenv('EARNINGS_BATCH_WRITE_WORKERS', '2'))  # concurrent Gemini calls
+    BATCH_LEDGER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'generated_data', 'earnings_batches', 'batch_ledger.sqlite3')
+    BATCH_LEDGER_RETENTION_DAYS = int(os.getenv('EARNINGS_BATCH_LEDGER_RETENTION_DAYS', '7'))  # finished batches kept
+    FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'generated_data', 'earnings_fixtures')
     
     # Earnings Data Keys Configuration
     # All required data keys organized by category
@@ -14,7 +14,7 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,6 +25,7 @@ from dotenv import load_dotenv
 from earnings_reports.data_collector import EarningsDataCollector
 from earnings_reports.data_processor import EarningsDataProcessor
 from earnings_reports.earnings_config import EarningsConfig
+from earnings_reports.batch_engine import EarningsBatchEngine
 
 # Load environment variables
 load_dotenv()
@@ -1038,6 +1039,79 @@ Now write your complete, analytical earnings report in simple English as if you'
                 'ticker': ticker
             }
 
+    
+    def batch_generate_articles(self, tickers: List[str], max_workers: Optional[int] = None,
+                                batch_id: Optional[str] = None, dry_run: bool = False,
+                                fixtures_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate articles for several tickers on the batch engine
+        
+        Collection and processing run on up to max_workers tickers at once while
+        Gemini calls are capped at EarningsConfig.BATCH_WRITE_WORKERS. Progress is
+        recorded in the batch ledger, so re-running with the same batch_id resumes
+        an interrupted batch. With dry_run, recorded fixtures are used and Gemini is
+        not called; the article context is still built so the run can be timed.
+        
+        Args:
+            tickers: Stock ticker symbols
+            max_workers: Tickers in flight at once (defaults to EarningsConfig.BATCH_WORKERS)
+            batch_id: Ledger id; pass the id of an interrupted batch to resume it
+            dry_run: Offline run from fixtures without Gemini calls or saved files
+            fixtures_dir: Fixture directory for dry runs
+            
+        Returns:
+            Dict with batch_id, results (input order), timings, summary and duration_seconds
+        """
+        def write(ticker, raw_data, processed_data, dry_run):
+            info = (raw_data.get('data_sources', {}).get('yfinance', {}).get('data', {}) or {}).get('info') or {}
+            company_name = info.get('longName') or info.get('shortName') or ticker
+            sector = info.get('sector', 'Technology')
+            quality = processed_data.get('data_quality', {}).get('completeness_score', 0)
+            earnings_context = self.create_earnings_context(processed_data)
+            
+            if dry_run:
+                return {
+                    'success': True,
+                    'dry_run': True,
+                    'ticker': ticker,
+                    'company_name': company_name,
+                    'sector': sector,
+                    'context_chars': len(earnings_context),
+                    'data_quality_score': quality
+                }
+            
+            article_html = self.generate_article_with_gemini(ticker, earnings_context)
+            article_path = self.save_article(ticker, article_html)
+            word_count = len(article_html.split())
+            return {
+                'success': True,
+                'article_html': article_html,
+                'file_path': article_path,
+                'metadata_path': article_path.replace('.html', '_metadata.json'),
+                'ticker': ticker,
+                'word_count': word_count,
+                'metadata': {
+                    'ticker': ticker,
+                    'company_name': company_name,
+                    'sector': sector,
+                    'word_count': word_count,
+                    'data_quality_score': quality,
+                    'generated_at': datetime.now().isoformat(),
+                    'article_type': 'earnings'
+                },
+                'company_name': company_name,
+                'sector': sector
+            }
+        
+        engine = EarningsBatchEngine(
+            self.collect_earnings_data, self.process_earnings_data, write,
+            max_workers=max_workers,
+            stage_limits={'write': self.config.BATCH_WRITE_WORKERS},
+            serializer=self.collector._convert_to_serializable
+        )
+        return engine.run([t.upper() for t in tickers], report_type='gemini_article',
+                          batch_id=batch_id, dry_run=dry_run, fixtures_dir=fixtures_dir)
+
 
 def main():
     """Main execution function"""
@@ -12,6 +12,7 @@ from .data_collector import EarningsDataCollector
 from .data_processor import EarningsDataProcessor
 from .report_generator import EarningsReportGenerator
 from .earnings_config import EarningsConfig
+from .batch_engine import EarningsBatchEngine
 from .utils import (
     setup_logging, 
     format_ticker, 
@@ -49,6 +50,7 @@ class EarningsPipeline:
         self.collector = EarningsDataCollector(self.config)
         self.processor = EarningsDataProcessor(self.config)
         self.generator = EarningsReportGenerator(self.config)
+        self.last_batch = None
         
         logger.info("Earnings pipeline initialized")
     
@@ -88,26 +90,7 @@ class EarningsPipeline:
             
             # Step 3: Generate report
             logger.info(f"Step 3/3: Generating pre-earnings report for {ticker}")
-            html_content = self.generator.generate_pre_earnings_report(
-                processed_data, 
-                save_to_file=save_report
-            )
-            
-            # Create summary
-            summary = create_earnings_summary(processed_data)
-            
-            result = {
-                'success': True,
-                'ticker': ticker,
-                'report_type': 'pre_earnings',
-                'html_content': html_content,
-                'summary': summary,
-                'data_quality': processed_data.get('data_quality', {}),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            if save_report:
-                result['report_path'] = self.config.get_report_path(ticker, 'pre_earnings')
+            result = self._build_report_result(ticker, processed_data, 'pre_earnings', save_report)
             
             logger.info(f"Successfully generated pre-earnings report for {ticker}")
             return result
@@ -157,26 +140,7 @@ class EarningsPipeline:
             
             # Step 3: Generate report
             logger.info(f"Step 3/3: Generating post-earnings report for {ticker}")
-            html_content = self.generator.generate_post_earnings_report(
-                processed_data, 
-                save_to_file=save_report
-            )
-            
-            # Create summary
-            summary = create_earnings_summary(processed_data)
-            
-            result = {
-                'success': True,
-                'ticker': ticker,
-                'report_type': 'post_earnings',
-                'html_content': html_content,
-                'summary': summary,
-                'data_quality': processed_data.get('data_quality', {}),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            if save_report:
-                result['report_path'] = self.config.get_report_path(ticker, 'post_earnings')
+            result = self._build_report_result(ticker, processed_data, 'post_earnings', save_report)
             
             logger.info(f"Successfully generated post-earnings report for {ticker}")
             return result
@@ -190,6 +154,40 @@ class EarningsPipeline:
                 'report_type': 'post_earnings'
             }
     
+    def _build_report_result(self, ticker: str, processed_data: Dict[str, Any],
+                             report_type: str, save_report: bool) -> Dict[str, Any]:
+        """
+        Render one report from processed data.
+        
+        Args:
+            ticker: Stock ticker symbol
+            processed_data: Output of EarningsDataProcessor
+            report_type: 'pre_earnings' or 'post_earnings'
+            save_report: Whether to save the report to file
+            
+        Returns:
+            Report result dictionary
+        """
+        if report_type == 'pre_earnings':
+            html_content = self.generator.generate_pre_earnings_report(processed_data, save_to_file=save_report)
+        else:
+            html_content = self.generator.generate_post_earnings_report(processed_data, save_to_file=save_report)
+        
+        result = {
+            'success': True,
+            'ticker': ticker,
+            'report_type': report_type,
+            'html_content': html_content,
+            'summary': create_earnings_summary(processed_data),
+            'data_quality': processed_data.get('data_quality', {}),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        if save_report:
+            result['report_path'] = self.config.get_report_path(ticker, report_type)
+        
+        return result
+    
     def generate_both_reports(self, ticker: str, use_cache: bool = True, 
                             save_reports: bool = True) -> Dict[str, Any]:
         """
@@ -217,33 +215,76 @@ class EarningsPipeline:
         }
     
     def batch_generate_reports(self, tickers: List[str], report_type: str = 'both',
-                               use_cache: bool = True, save_reports: bool = True) -> List[Dict[str, Any]]:
+                               use_cache: bool = True, save_reports: bool = True,
+                               max_workers: Optional[int] = None, batch_id: Optional[str] = None,
+                               dry_run: bool = False, fixtures_dir: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Generate reports for multiple tickers.
         
+        Tickers run concurrently on EarningsBatchEngine; data is collected and
+        processed once per ticker even when both report types are requested.
+        Progress is recorded in the batch ledger, so re-running with the same
+        batch_id resumes an interrupted batch. Run statistics (per-stage timing
+        histograms, ledger summary) are kept in ``self.last_batch``.
+        
         Args:
             tickers: List of ticker symbols
             report_type: 'pre', 'post', or 'both'
             use_cache: Whether to use cached data
             save_reports: Whether to save reports to file
+            max_workers: Tickers processed at once (defaults to EarningsConfig.BATCH_WORKERS)
+            batch_id: Ledger id; pass the id of an interrupted batch to resume it
+            dry_run: Use recorded fixtures instead of live data and do not save reports
+            fixtures_dir: Fixture directory for dry runs (defaults to EarningsConfig.FIXTURES_DIR)
             
         Returns:
-            List of result dictionaries
+            List of result dictionaries, in input order
         """
+        tickers = [format_ticker(ticker) for ticker in tickers]
         logger.info(f"Starting batch report generation for {len(tickers)} tickers")
-        results = []
         
-        for ticker in tickers:
-            ticker = format_ticker(ticker)
-            logger.info(f"Processing {ticker} ({tickers.index(ticker)+1}/{len(tickers)})")
-            
-            if report_type == 'pre':
-                result = self.generate_pre_earnings_report(ticker, use_cache, save_reports)
-            elif report_type == 'post':
-                result = self.generate_post_earnings_report(ticker, use_cache, save_reports)
-            else:  # both
-                result = self.generate_both_reports(ticker, use_cache, save_reports)
-            
+        report_types = {'pre': ['pre_earnings'], 'post': ['post_earnings']}.get(
+            report_type, ['pre_earnings', 'post_earnings']
+        )
+        
+        def collect(ticker):
+            if not validate_ticker(ticker):
+                raise ValueError(f"Invalid ticker symbol: {ticker}")
+            return self.collector.collect_all_data(ticker, use_cache=use_cache)
+        
+        def write(ticker, raw_data, processed_data, dry_run):
+            save = save_reports and not dry_run
+            results = {}
+            for kind in report_types:
+                try:
+                    results[kind] = self._build_report_result(ticker, processed_data, kind, save)
+                except Exception as e:
+                    logger.error(f"Error generating {kind} report for {ticker}: {e}", exc_info=True)
+                    results[kind] = {'success': False, 'error': str(e), 'ticker': ticker, 'report_type': kind}
+            if len(report_types) == 1:
+                return results[report_types[0]]
+            return {
+                'ticker': ticker,
+                'pre_earnings': results['pre_earnings'],
+                'post_earnings': results['post_earnings'],
+                'overall_success': results['pre_earnings']['success'] and results['post_earnings']['success']
+            }
+        
+        engine = EarningsBatchEngine(
+            collect, self.processor.process_earnings_data, write,
+            max_workers=max_workers, serializer=self.collector._convert_to_serializable
+        )
+        run = engine.run(tickers, report_type=report_type, batch_id=batch_id,
+                         dry_run=dry_run, fixtures_dir=fixtures_dir)
+        self.last_batch = run
+        
+        results = []
+        for ticker, result in zip(tickers, run['results']):
+            if len(report_types) > 1 and 'overall_success' not in result:
+                # Collection or processing failed before either report could be written
+                failure = {'success': False, 'error': result.get('error'), 'ticker': ticker}
+                result = {'ticker': ticker, 'pre_earnings': dict(failure, report_type='pre_earnings'),
+                          'post_earnings': dict(failure, report_type='post_earnings'), 'overall_success': False}
             results.append(result)
         
         # Summary
@@ -252,7 +293,10 @@ class EarningsPipeline:
         else:
             successful = sum(1 for r in results if r.get('success'))
         
-        logger.info(f"Batch processing complete: {successful}/{len(tickers)} successful")
+        logger.info(
+            f"Batch processing complete: {successful}/{len(tickers)} successful "
+            f"in {run['duration_seconds']:.1f}s (batch {run['batch_id']})"
+        )
         
         return results
     
@@ -0,0 +1,318 @@
+"""
+Article Post-Processor
+Single-parse clean-up of the HTML Gemini returns for stock articles.
+
+The article is parsed into one BeautifulSoup tree, every structural
+transform (invalid table rows, missing-data paragraphs, FAQ and disclaimer
+sections, AI phrasing, long paragraphs) is applied to that tree, and the
+result is serialized once. The metadata rewrite_report() needs (word count,
+sections, schema) is read from the same tree instead of re-parsing the
+output.
+
+benchmarks/article_postprocess.py checks the output against the previous
+string/regex implementation on recorded articles and measures throughput.
+Output is identical except where the old regexes cut through an element
+(an inline "IMPORTANT DISCLAIMER:" label, a generated-report notice spanning
+paragraphs): the old output left the parser to re-nest the unclosed tags,
+while here the surrounding elements stay closed.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, List, Tuple
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+MARKDOWN_BOLD = re.compile(r'\*\*([^\*]+?)\*\*')
+MARKDOWN_ITALIC = re.compile(r'(?<!\*)\*([^\*]+?)\*(?!\*)')
+
+# Table rows / paragraphs / list items reporting missing data are dropped
+INVALID_ROW_INDICATORS = ('n/a', 'nan', 'null', 'none', ': 0', ': 0.0', ': $0', '$0.00')
+MISSING_DATA_PARAGRAPH_PHRASES = (
+    'not available', 'unavailable', 'no data', 'data is missing',
+    'information is not', 'currently unavailable', 'data not available',
+    'n/a', 'is n/a', 'shows n/a', 'not applicable',
+)
+MISSING_DATA_LIST_PHRASES = ('not available', 'unavailable', 'no data', 'n/a', 'is n/a')
+
+# AI-like and robotic phrases, stripped case-insensitively in a single pass
+AI_PHRASES = [
+    "based on the data provided",
+    "according to the report",
+    "as an AI",
+    "I cannot",
+    "I don't have access",
+    "the data shows",
+    "it appears that",
+    "the report indicates",
+    "it is important to note",
+    "it should be noted",
+    "it is worth mentioning",
+    "it is worth noting",
+    "one should consider",
+    "investors should be aware",
+    "it can be observed",
+    "analysis reveals",
+    "examination of the data",
+    "upon closer inspection",
+]
+AI_PHRASE_PATTERN = re.compile('|'.join(re.escape(phrase) for phrase in AI_PHRASES), re.IGNORECASE)
+
+# Disclaimer sections: a heading starting with "(Important) Disclaimer", a div
+# whose attributes mention a disclaimer, an inline "IMPORTANT DISCLAIMER:"
+# label (removed up to the next section) and the report generator's notice
+DISCLAIMER_HEADING = re.compile(r'\s*(important\s+)?disclaimer', re.IGNORECASE)
+DISCLAIMER_LABEL = re.compile(r'IMPORTANT DISCLAIMER:', re.IGNORECASE)
+GENERATED_NOTICE_START = re.compile(r'This\s+report\s+has\s+been\s+automatically\s+generated', re.IGNORECASE)
+GENERATED_NOTICE_END = re.compile(r'at\s+your\s+own\s+risk\.?', re.IGNORECASE)
+
+SECTION_HEADINGS = ('h2', 'h3')
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+EXCESS_BLANK_LINES = re.compile(r'\n\s*\n\s*\n')
+
+# Whitespace as html.parser sees it, and the tags where it is kept verbatim
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+PRESERVE_WHITESPACE_TAGS = ['pre', 'textarea']
+
+LONG_PARAGRAPH_CHARS = 200
+MAX_SENTENCES_PER_PARAGRAPH = 5
+SENTENCES_PER_SPLIT_PARAGRAPH = 4
+
+
+def _is_section_heading(node) -> bool:
+    return isinstance(node, Tag) and node.name in SECTION_HEADINGS
+
+
+def _remove_preceding_within(container: Tag, inner):
+    """Remove everything inside container that comes before inner"""
+    node = inner
+    while node is not container:
+        for previous in list(node.previous_siblings):
+            previous.extract()
+        node = node.parent
+
+
+def _remove_following(node, is_stop):
+    """
+    Remove everything after node in document order, up to the first node
+    matching is_stop (which is kept).
+
+    Returns:
+        The stopping node, or None when the removal ran to the end of the body
+    """
+    current = node
+    while True:
+        sibling = current.next_sibling
+        while sibling is not None:
+            following = sibling.next_sibling
+            if is_stop(sibling):
+                return sibling
+            if isinstance(sibling, Tag):
+                inner = next((d for d in sibling.descendants if is_stop(d)), None)
+                if inner is not None:
+                    _remove_preceding_within(sibling, inner)
+                    return inner
+            sibling.extract()
+            sibling = following
+        current = current.parent
+        if current is None or current.parent is None or current.name in ('body', 'html'):
+            return None
+
+
+def _replace_text(string: NavigableString, text: str):
+    """Swap a string node's text, keeping its type (comments stay comments)"""
+    string.replace_with(type(string)(text))
+
+
+def _remove_invalid_table_rows(soup: BeautifulSoup):
+    for table in soup.find_all('table'):
+        rows_to_remove = []
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            row_text = ' '.join([cell.get_text().strip() for cell in cells]).lower()
+            # Header rows stay even when they mention a missing value
+            if any(indicator in row_text for indicator in INVALID_ROW_INDICATORS) and not row.find('th'):
+                rows_to_remove.append(row)
+        for row in rows_to_remove:
+            row.decompose()
+
+
+def _remove_missing_data_blocks(soup: BeautifulSoup):
+    for p in soup.find_all('p'):
+        p_text = p.get_text().lower()
+        if any(phrase in p_text for phrase in MISSING_DATA_PARAGRAPH_PHRASES):
+            p.decompose()
+    for li in soup.find_all('li'):
+        li_text = li.get_text().lower()
+        if any(phrase in li_text for phrase in MISSING_DATA_LIST_PHRASES):
+            li.decompose()
+
+
+def _remove_faq_sections(soup: BeautifulSoup):
+    """FAQ heading and everything after it up to the next h2"""
+    for heading in soup.find_all(['h2', 'h3']):
+        heading_text = heading.get_text().lower()
+        if 'faq' in heading_text or 'frequently asked' in heading_text:
+            current = heading
+            while current:
+                next_sibling = current.find_next_sibling()
+                current.decompose()
+                if next_sibling and next_sibling.name == 'h2':
+                    break
+                current = next_sibling
+
+
+def _remove_disclaimers(soup: BeautifulSoup):
+    for heading in soup.find_all(['h2', 'h3']):
+        if heading.parent is None:
+            continue  # removed with an earlier disclaimer section
+        first = heading.contents[0] if heading.contents else None
+        if isinstance(first, NavigableString) and DISCLAIMER_HEADING.match(first):
+            _remove_following(heading, _is_section_heading)
+            heading.extract()
+
+    for div in soup.find_all('div'):
+        if getattr(div, '_decomposed', False):
+            continue
+        attributes = ' '.join(f"{name} {' '.join(value) if isinstance(value, list) else value}"
+                              for name, value in div.attrs.items())
+        if 'disclaimer' in attributes.lower():
+            div.decompose()
+
+    for string in soup.find_all(string=DISCLAIMER_LABEL):
+        if string.parent is None:
+            continue
+        match = DISCLAIMER_LABEL.search(string)
+        _remove_following(string, _is_section_heading)
+        _replace_text(string, string[:match.start()])
+
+    _remove_generated_notice(soup)
+
+
+def _remove_generated_notice(soup: BeautifulSoup):
+    """'This report has been automatically generated ... at your own risk.', possibly spanning elements"""
+    while True:
+        strings = soup.find_all(string=True)
+        for index, string in enumerate(strings):
+            start = GENERATED_NOTICE_START.search(string)
+            if not start:
+                continue
+            end = GENERATED_NOTICE_END.search(string, start.end())
+            if end:
+                _replace_text(string, string[:start.start()] + string[end.end():])
+                break
+            closing = next(((later, match) for later in strings[index + 1:]
+                            for match in [GENERATED_NOTICE_END.search(later)] if match), None)
+            if closing is None:
+                return  # no end marker anywhere after this notice
+            later, end = closing
+            _remove_following(string, lambda node, later=later: node is later)
+            _replace_text(string, string[:start.start()])
+            _replace_text(later, later[end.end():])
+            break
+        else:
+            return
+
+
+def _remove_ai_phrases(soup: BeautifulSoup):
+    for string in soup.find_all(string=AI_PHRASE_PATTERN):
+        _replace_text(string, AI_PHRASE_PATTERN.sub('', string))
+
+
+def break_long_paragraphs(soup: BeautifulSoup):
+    """Split paragraphs of more than 5 sentences into 4-sentence paragraphs"""
+    for p in soup.find_all('p'):
+        text = p.get_text().strip()
+        if not text or len(text) < LONG_PARAGRAPH_CHARS:
+            continue
+        sentences = SENTENCE_BOUNDARY.split(text)
+        if len(sentences) <= MAX_SENTENCES_PER_PARAGRAPH:
+            continue
+        new_paragraphs = []
+        for i in range(0, len(sentences), SENTENCES_PER_SPLIT_PARAGRAPH):
+            new_p = soup.new_tag('p')
+            new_p.string = ' '.join(sentences[i:i + SENTENCES_PER_SPLIT_PARAGRAPH])
+            new_paragraphs.append(new_p)
+        for new_p in reversed(new_paragraphs):
+            p.insert_after(new_p)
+        p.decompose()
+
+
+def _collapse_blank_strings(soup: BeautifulSoup):
+    """
+    Collapse runs of whitespace-only text left by removed elements to a
+    single newline (or space), as re-parsing the serialized HTML would.
+    """
+    for string in soup.find_all(string=True):
+        if type(string) is not NavigableString or type(string.previous_sibling) is NavigableString:
+            continue  # not plain text, or not the first string of a run
+        run = [string]
+        following = string.next_sibling
+        while type(following) is NavigableString:
+            run.append(following)
+            following = following.next_sibling
+        if len(run) == 1 and string in ('\n', ' '):
+            continue
+        text = ''.join(run)
+        if not text or text.strip(ASCII_SPACES) or string.find_parent(PRESERVE_WHITESPACE_TAGS):
+            continue
+        for extra in run[1:]:
+            extra.extract()
+        string.replace_with(NavigableString('\n' if '\n' in text else ' '))
+
+
+def _article_header(ticker: str, company_name: str) -> Tuple[str, List[str]]:
+    """Header block prepended to every article, and its visible text"""
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    texts = [f"{company_name} ({ticker}) Stock Analysis", f"Published: {current_date}", f"#{ticker}"]
+    header_html = f"""
+<div class="article-header">
+    <h1>{texts[0]}</h1>
+    <div class="article-meta">
+        <span class="publish-date">{texts[1]}</span>
+        <span class="ticker-tag">{texts[2]}</span>
+    </div>
+</div>
+"""
+    return header_html, texts
+
+
+def post_process_article(article_html: str, ticker: str, company_name: str) -> Tuple[str, Dict]:
+    """
+    Clean up and enhance a generated article.
+
+    Args:
+        article_html: Raw Gemini output (HTML, possibly with stray Markdown)
+        ticker: Stock ticker symbol
+        company_name: Full company name
+
+    Returns:
+        Tuple of (article_html, document_stats) where document_stats holds
+        word_count, section_count, sections and has_schema of the final article
+    """
+    # Stray Markdown is converted on the raw text so the tags it produces are parsed
+    article_html = MARKDOWN_BOLD.sub(r'<strong>\1</strong>', article_html)
+    article_html = MARKDOWN_ITALIC.sub(r'<em>\1</em>', article_html)
+    article_html = article_html.replace('```html', '').replace('```', '')
+
+    soup = BeautifulSoup(article_html, 'html.parser')
+    _remove_invalid_table_rows(soup)
+    _remove_missing_data_blocks(soup)
+    _remove_faq_sections(soup)
+    _remove_disclaimers(soup)
+    _remove_ai_phrases(soup)
+    break_long_paragraphs(soup)
+    _collapse_blank_strings(soup)
+
+    header_html, header_texts = _article_header(ticker, company_name)
+    sections = [h2.get_text(strip=True) for h2 in soup.find_all('h2')]
+    document_stats = {
+        'word_count': len(' '.join(header_texts).split()) + len(soup.get_text().split()),
+        'section_count': len(sections),
+        'sections': sections,
+        'has_schema': bool(soup.find('script', type='application/ld+json')),
+    }
+
+    article_html = EXCESS_BLANK_LINES.sub('\n\n', str(soup))
+    if not article_html.startswith('<'):
+        article_html = f'<div class="article-content">\n{article_html}\n</div>'
+    return header_html + article_html, document_stats
@@ -17,6 +17,21 @@ from dotenv import load_dotenv
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
+# Optional pipeline tracing (no-op outside a traced pipeline run)
+try:
+    from automation_scripts.tracing import span, traced
+except ImportError:
+    from contextlib import nullcontext as _nullcontext
+    def span(name, **attrs):
+        return _nullcontext()
+    def traced(name=None, root=False):
+        return lambda func: func
+
+try:
+    from .article_postprocessor import post_process_article, break_long_paragraphs
+except ImportError:
+    from article_postprocessor import post_process_article, break_long_paragraphs
+
 # Load environment variables
 load_dotenv()
 
@@ -167,10 +182,11 @@ class GeminiArticleRewriter:
             for attempt in range(max_retries):
                 try:
                     # Generate article using Gemini
-                    response = self.model.generate_content(
-                        prompt,
-                        generation_config=config
-                    )
+                    with span('gemini.generate_content', model=self.current_model_name, ticker=ticker):
+                        response = self.model.generate_content(
+                            prompt,
+                            generation_config=config
+                        )
                     
                     if not response or not response.text:
                         print("❌ Gemini returned empty response")
@@ -224,11 +240,12 @@ class GeminiArticleRewriter:
         
         # Post-process the article
         print("\nStep 3: Post-processing article...")
-        article_html = self._post_process_article(article_html, ticker, company_name)
+        with span('article.post_process', ticker=ticker):
+            article_html, document_stats = post_process_article(article_html, ticker, company_name)
         
         # Extract metadata
         print("Step 4: Extracting metadata...")
-        metadata = self._extract_metadata(article_html, ticker, company_name)
+        metadata = self._extract_metadata(article_html, ticker, company_name, document_stats)
         
         print(f"\n{'='*60}")
         print(f"✓ Article generation complete!")
@@ -564,219 +581,13 @@ Now rewrite the COMPLETE report with proper HTML formatting:
     
     def _break_long_paragraphs(self, html: str) -> str:
         """Break long paragraphs into shorter, more readable ones (max 4-5 sentences)."""
-        import re
-        from bs4 import BeautifulSoup
-        
         soup = BeautifulSoup(html, 'html.parser')
-        
-        # Find all paragraph tags
-        paragraphs = soup.find_all('p')
-        
-        for p in paragraphs:
-            text = p.get_text().strip()
-            
-            # Skip empty or short paragraphs
-            if not text or len(text) < 200:
-                continue
-            
-            # Split by sentences (look for period followed by space and capital letter)
-            sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', text)
-            
-            # If more than 5 sentences, break into multiple paragraphs
-            if len(sentences) > 5:
-                # Create new paragraphs (4 sentences each)
-                new_paragraphs = []
-                chunk_size = 4
-                
-                for i in range(0, len(sentences), chunk_size):
-                    chunk = sentences[i:i+chunk_size]
-                    new_p = soup.new_tag('p')
-                    new_p.string = ' '.join(chunk)
-                    new_paragraphs.append(new_p)
-                
-                # Replace original paragraph with new ones
-                if new_paragraphs:
-                    for new_p in reversed(new_paragraphs):
-                        p.insert_after(new_p)
-                    p.decompose()
-        
+        break_long_paragraphs(soup)
         return str(soup)
     
     def _post_process_article(self, article_html: str, ticker: str, company_name: str) -> str:
         """Clean up and enhance the generated article."""
-        
-        # Remove any Markdown syntax that might have slipped through
-        # Replace **text** with <strong>text</strong>
-        import re
-        from bs4 import BeautifulSoup
-        
-        # Replace **text** with <strong>text</strong>
-        article_html = re.sub(r'\*\*([^\*]+?)\*\*', r'<strong>\1</strong>', article_html)
-        
-        # Replace *text* with <em>text</em>
-        article_html = re.sub(r'(?<!\*)\*([^\*]+?)\*(?!\*)', r'<em>\1</em>', article_html)
-        
-        # Remove any remaining markdown code blocks
-        article_html = article_html.replace('```html', '').replace('```', '')
-        
-        # Parse HTML to remove problematic content
-        soup = BeautifulSoup(article_html, 'html.parser')
-        
-        # Remove table rows that contain N/A, nan, null, or 0 values
-        for table in soup.find_all('table'):
-            rows_to_remove = []
-            for row in table.find_all('tr'):
-                cells = row.find_all(['td', 'th'])
-                row_text = ' '.join([cell.get_text().strip() for cell in cells]).lower()
-                
-                # Check if row contains invalid/missing data indicators
-                if any(indicator in row_text for indicator in ['n/a', 'nan', 'null', 'none', ': 0', ': 0.0', ': $0', '$0.00']):
-                    # Don't remove header rows
-                    if not row.find('th'):
-                        rows_to_remove.append(row)
-            
-            # Remove problematic rows
-            for row in rows_to_remove:
-                row.decompose()
-        
-        # Remove paragraphs that explicitly mention unavailable/missing data
-        for p in soup.find_all('p'):
-            p_text = p.get_text().lower()
-            if any(phrase in p_text for phrase in [
-                'not available', 'unavailable', 'no data', 'data is missing',
-                'information is not', 'currently unavailable', 'data not available',
-                'n/a', 'is n/a', 'shows n/a', 'not applicable'
-            ]):
-                p.decompose()
-        
-        # Remove list items mentioning missing data
-        for li in soup.find_all('li'):
-            li_text = li.get_text().lower()
-            if any(phrase in li_text for phrase in [
-                'not available', 'unavailable', 'no data', 'n/a', 'is n/a'
-            ]):
-                li.decompose()
-        
-        # Remove any FAQ sections (we don't want them in the blog)
-        for heading in soup.find_all(['h2', 'h3']):
-            heading_text = heading.get_text().lower()
-            if 'faq' in heading_text or 'frequently asked' in heading_text:
-                # Remove the heading and all content until the next h2
-                current = heading
-                while current:
-                    next_sibling = current.find_next_sibling()
-                    current.decompose()
-                    if next_sibling and next_sibling.name == 'h2':
-                        break
-                    current = next_sibling
-        
-        # Convert back to string
-        article_html = str(soup)
-        
-        # Remove the disclaimer section if present (multiple patterns for thorough removal)
-        disclaimer_patterns = [
-            r'<h[23][^>]*>\s*IMPORTANT\s+DISCLAIMER:?\s*</h[23]>.*?(?=<h[23]|</body>|</div>\s*</body>|$)',
-            r'<h[23][^>]*>\s*Disclaimer:?\s*</h[23]>.*?(?=<h[23]|</body>|</div>\s*</body>|$)',
-            r'<h[23][^>]*>\s*Important\s+Disclaimer:?\s*</h[23]>.*?(?=<h[23]|</body>|</div>\s*</body>|$)',
-            r'<div[^>]*disclaimer[^>]*>.*?</div>',
-            r'IMPORTANT DISCLAIMER:.*?(?=<h[23]|</body>|$)',
-            r'This\s+report\s+has\s+been\s+automatically\s+generated.*?at\s+your\s+own\s+risk\.?',
-        ]
-        
-        for pattern in disclaimer_patterns:
-            article_html = re.sub(pattern, '', article_html, flags=re.IGNORECASE | re.DOTALL)
-        
-        # Additional cleanup for any remaining disclaimer-like content
-        lines = article_html.split('\n')
-        filtered_lines = []
-        skip_mode = False
-        
-        for line in lines:
-            # Check if line starts disclaimer section
-            if re.search(r'<h[23][^>]*>\s*(important\s+)?disclaimer', line, re.IGNORECASE):
-                skip_mode = True
-                continue
-            # Check if we're back to a normal section
-            if skip_mode and re.search(r'<h[23]', line):
-                skip_mode = False
-            # Only add line if not in skip mode
-            if not skip_mode:
-                filtered_lines.append(line)
-        
-        article_html = '\n'.join(filtered_lines)
-        
-        # Remove any AI-like and robotic phrases
-        ai_phrases = [
-            "based on the data provided",
-            "according to the report",
-            "as an AI",
-            "I cannot",
-            "I don't have access",
-            "the data shows",
-            "it appears that",
-            "the report indicates",
-            "it is important to note",
-            "it should be noted",
-            "it is worth mentioning",
-            "it is worth noting",
-            "one should consider",
-            "investors should be aware",
-            "it can be observed",
-            "analysis reveals",
-            "examination of the data",
-            "upon closer inspection",
-        ]
-        
-        for phrase in ai_phrases:
-            # Case-insensitive replacement
-            article_html = re.sub(re.escape(phrase), '', article_html, flags=re.IGNORECASE)
-        
-        # Remove any FAQ sections (we don't want them in stock analysis blogs)
-        soup = BeautifulSoup(article_html, 'html.parser')
-        for heading in soup.find_all(['h2', 'h3']):
-            heading_text = heading.get_text().lower()
-            if 'faq' in heading_text or 'frequently asked' in heading_text:
-                # Remove the heading and all content until the next h2
-                current = heading
-                elements_to_remove = [current]
-                while current:
-                    next_sibling = current.find_next_sibling()
-                    if next_sibling and next_sibling.name == 'h2':
-                        break
-                    if next_sibling:
-                        elements_to_remove.append(next_sibling)
-                    current = next_sibling
-                
-                # Remove all collected elements
-                for element in elements_to_remove:
-                    element.decompose()
-        
-        article_html = str(soup)
-        
-        # Break long paragraphs into shorter ones
-        article_html = self._break_long_paragraphs(article_html)
-        
-        # Clean up excessive whitespace
-        article_html = re.sub(r'\n\s*\n\s*\n', '\n\n', article_html)
-        
-        # Ensure proper HTML structure
-        if not article_html.startswith('<'):
-            article_html = f'<div class="article-content">\n{article_html}\n</div>'
-        
-        # Add article metadata at the top
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        metadata_html = f"""
-<div class="article-header">
-    <h1>{company_name} ({ticker}) Stock Analysis</h1>
-    <div class="article-meta">
-        <span class="publish-date">Published: {current_date}</span>
-        <span class="ticker-tag">#{ticker}</span>
-    </div>
-</div>
-"""
-        
-        article_html = metadata_html + article_html
-        
+        article_html, _ = post_process_article(article_html, ticker, company_name)
         return article_html
     
     def _generate_faq_schema(self, article_html: str, ticker: str, company_name: str) -> str:
@@ -873,31 +684,32 @@ Now rewrite the COMPLETE report with proper HTML formatting:
         
         return schema_html
     
-    def _extract_metadata(self, article_html: str, ticker: str, company_name: str) -> Dict:
-        """Extract metadata from the generated article."""
-        soup = BeautifulSoup(article_html, 'html.parser')
-        
-        # Count words
-        text = soup.get_text()
-        word_count = len(text.split())
-        
-        # Count sections
-        h2_tags = soup.find_all('h2')
-        section_count = len(h2_tags)
-        
-        # Check for schema (general, not FAQ-specific)
-        has_schema = bool(soup.find('script', type='application/ld+json'))
+    def _extract_metadata(self, article_html: str, ticker: str, company_name: str,
+                          document_stats: Optional[Dict] = None) -> Dict:
+        """
+        Extract metadata from the generated article.
         
-        # Extract section titles
-        sections = [h2.get_text(strip=True) for h2 in h2_tags]
+        Args:
+            document_stats: Counts already taken by post_process_article (skips re-parsing)
+        """
+        if document_stats is None:
+            soup = BeautifulSoup(article_html, 'html.parser')
+            sections = [h2.get_text(strip=True) for h2 in soup.find_all('h2')]
+            document_stats = {
+                'word_count': len(soup.get_text().split()),
+                'section_count': len(sections),
+                'sections': sections,
+                # Check for schema (general, not FAQ-specific)
+                'has_schema': bool(soup.find('script', type='application/ld+json')),
+            }
         
         metadata = {
             'ticker': ticker,
             'company_name': company_name,
-            'word_count': word_count,
-            'section_count': section_count,
-            'sections': sections,
-            'has_schema': has_schema,
+            'word_count': document_stats['word_count'],
+            'section_count': document_stats['section_count'],
+            'sections': document_stats['sections'],
+            'has_schema': document_stats['has_schema'],
             'generated_date': datetime.now().isoformat(),
             'model': 'gemini-2.5-flash',
         }
@@ -1096,6 +908,7 @@ def rewrite_stock_report(
     return article_path, metadata
 
 
+@traced('generate_article_from_pipeline', root=True)
 def generate_article_from_pipeline(
     ticker: str,
     company_name: Optional[str] = None,
@@ -0,0 +1,259 @@
+"""
+Content Templates
+=================
+
+Compiled form of ``content_library.json`` for the WordPress section
+generators in ``wordpress_reporter``.
+
+The library is loaded once per process per file and recompiled only when the
+file's mtime or size changes. At load time every dotted path
+(``introduction.summary_sentence.intros``) is flattened into one dict entry
+holding precompiled ``ContentTemplate`` variations, so a lookup is a single
+dict access instead of a walk over nested dicts.
+
+``ContentTemplate`` is a ``str`` subclass (generators keep concatenating,
+``in``-testing and ``.format``-ing it), parsed once into literal / field
+segments with a known ``fields`` set:
+
+- ``format()`` never raises ``KeyError``: a field with no value renders as
+  ``[field]`` (what ``safe_format`` used to produce after the exception).
+- ``ContentLibrary.render()`` checks the field sets up front and only picks
+  variations whose fields are all provided.
+- Templates that do not parse (stray braces) are reported once at load time
+  and rendered verbatim.
+
+Variation selection uses the library's own ``random.Random``; pass a seed
+(``load_content_library(path, seed=...)`` / ``library.with_seed(...)``) to make
+reports reproducible in tests.
+"""
+
+import os
+import json
+import random
+import logging
+import threading
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_formatter = Formatter()
+
+
+class ContentTemplate(str):
+    """A template string parsed once into (literal, field, spec, conversion) segments"""
+
+    def __new__(cls, text: str):
+        template = super().__new__(cls, text)
+        template.segments = None   # None: not parseable, rendered verbatim
+        template.fields = frozenset()
+        template.simple = True     # only {name[!conv][:spec]} fields with static specs
+        try:
+            segments = list(_formatter.parse(text))
+        except ValueError:
+            return template
+        fields = set()
+        for _literal, field_name, spec, _conversion in segments:
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or (spec and '{' in spec):
+                template.simple = False
+            fields.add(field_name)
+        template.segments = tuple(segments)
+        template.fields = frozenset(fields)
+        return template
+
+    @property
+    def valid(self) -> bool:
+        return self.segments is not None
+
+    def missing(self, provided) -> FrozenSet[str]:
+        """Fields of this template without a value in ``provided``"""
+        return self.fields.difference(provided)
+
+    def format(self, *args, **kwargs) -> str:
+        """str.format that renders missing fields as ``[field]`` instead of raising"""
+        if self.segments is None:
+            return str(self)
+        if args or not self.simple:
+            try:
+                return str.format(self, *args, **kwargs)
+            except (KeyError, IndexError, ValueError):
+                return str(self)
+        if self.fields <= kwargs.keys():
+            return str.format(self, **kwargs)
+        parts = []
+        for literal, field_name, spec, conversion in self.segments:
+            parts.append(literal)
+            if field_name is None:
+                continue
+            if field_name not in kwargs:
+                parts.append(f"[{field_name}]")
+                continue
+            value = kwargs[field_name]
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            parts.append(format(value, spec) if spec else str(value))
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(text: str) -> ContentTemplate:
+    """Compiled template for a string (cached; used for inline fallback text)"""
+    return text if isinstance(text, ContentTemplate) else ContentTemplate(text)
+
+
+def _compile_value(value):
+    if isinstance(value, str):
+        return compile_template(value)
+    if isinstance(value, list):
+        return tuple(compile_template(v) if isinstance(v, str) else v for v in value)
+    return value
+
+
+def _flatten(node: Dict[str, Any], prefix: str, index: Dict[str, Any]):
+    for key, value in node.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            index[path] = value  # sub-sections stay addressable for section-level checks
+            _flatten(value, path, index)
+        else:
+            index[path] = _compile_value(value)
+
+
+class ContentLibrary:
+    """Flattened, precompiled content library with its own variation RNG"""
+
+    def __init__(self, data: Dict[str, Any], seed: Optional[int] = None, source: Optional[str] = None,
+                 _index: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: Parsed content_library.json
+            seed: Seed for variation selection (None: unseeded)
+            source: File the library was loaded from (for messages)
+        """
+        self.data = data or {}
+        self.source = source
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if _index is None:
+            _index = {}
+            _flatten(self.data, '', _index)
+        self._index = _index
+
+    def with_seed(self, seed: Optional[int]) -> 'ContentLibrary':
+        """View sharing this library's compiled index with its own RNG"""
+        return ContentLibrary(self.data, seed=seed, source=self.source, _index=self._index)
+
+    def for_section(self, section: str) -> 'ContentLibrary':
+        """
+        Library to render one report section with.
+
+        Seeded libraries get an RNG derived from the seed and the section, so
+        output stays reproducible when sections render concurrently.
+        """
+        return self if self.seed is None else self.with_seed(f"{self.seed}:{section}")
+
+    def __bool__(self):
+        return bool(self.data)
+
+    def __contains__(self, section):
+        return section in self.data
+
+    def __len__(self):
+        return len(self._index)
+
+    def invalid_templates(self) -> List[str]:
+        """Paths holding templates that do not parse (rendered verbatim)"""
+        invalid = []
+        for path, value in self._index.items():
+            values = value if isinstance(value, tuple) else (value,)
+            if any(isinstance(v, ContentTemplate) and not v.valid for v in values):
+                invalid.append(path)
+        return invalid
+
+    def fields(self, path: str) -> FrozenSet[str]:
+        """Union of the fields used by the variations at ``path``"""
+        value = self._index.get(path)
+        values = value if isinstance(value, tuple) else (value,)
+        return frozenset().union(*(v.fields for v in values if isinstance(v, ContentTemplate)))
+
+    def _choose(self, options):
+        return options[0] if len(options) == 1 else self.rng.choice(options)
+
+    def template(self, path: str, default: Optional[str] = None) -> Optional[ContentTemplate]:
+        """The single template stored at ``path`` (not a variation list), or ``default``"""
+        value = self._index.get(path)
+        if isinstance(value, ContentTemplate):
+            return value
+        return compile_template(default) if isinstance(default, str) else default
+
+    def variation(self, path: str, fallback_list=None):
+        """
+        A variation stored at ``path`` (a single stored value is returned as is).
+
+        Falls back to a choice from ``fallback_list`` when the path is missing.
+        """
+        value = self._index.get(path)
+        if isinstance(value, tuple):
+            if value:
+                return self._choose(value)
+        elif value is not None and not isinstance(value, dict):
+            return value
+        if fallback_list:
+            return compile_template(self._choose(fallback_list)) if isinstance(fallback_list[0], str) \
+                else self._choose(fallback_list)
+        logger.warning(f"Missing content library path '{path}' and no fallback provided")
+        return f"[Missing content: {path}]"
+
+    def render(self, path: str, fallback_list=None, **values) -> str:
+        """
+        Pick a variation whose fields are all in ``values`` and format it.
+
+        Variations needing fields the caller does not provide are skipped; when
+        none qualifies the fallback list is used the same way.
+        """
+        for options in (self._index.get(path), fallback_list):
+            if isinstance(options, ContentTemplate):
+                options = (options,)
+            if not options or isinstance(options, dict):
+                continue
+            candidates = [compile_template(v) for v in options if isinstance(v, str)]
+            usable = [t for t in candidates if t.valid and not t.missing(values)]
+            if usable:
+                return self._choose(usable).format(**values)
+            if candidates:
+                missing = sorted(set().union(*(t.missing(values) for t in candidates)))
+                logger.debug(f"No variation at '{path}' renderable without {missing}")
+        return self.variation(path, fallback_list).format(**values)
+
+
+_library_cache: Dict[str, Tuple[Tuple[int, int], ContentLibrary]] = {}
+_library_cache_lock = threading.Lock()
+
+
+def load_content_library(path: str, seed: Optional[int] = None) -> ContentLibrary:
+    """
+    Compiled library for a content_library.json file.
+
+    Parsed and compiled once per process; recompiled when the file's mtime or
+    size changes. Raises OSError / ValueError when the file is missing or not
+    valid JSON.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _library_cache_lock:
+        cached = _library_cache.get(path)
+        if cached is None or cached[0] != signature:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            library = ContentLibrary(data, source=path)
+            invalid = library.invalid_templates()
+            if invalid:
+                logger.warning(f"{len(invalid)} content templates in {path} do not parse and will render verbatim: {invalid[:5]}")
+            logger.info(f"Compiled content library {path}: {len(library)} paths")
+            cached = (signature, library)
+            _library_cache[path] = cached
+    library = cached[1]
+    return library.with_seed(seed) if seed is not None else library
@@ -174,6 +174,9 @@ from io import BytesIO
 
 # Import currency symbol function
 from app.html_components import get_currency_symbol
+from automation_scripts.tracing import span
+from reporting_tools.section_graph import Section, SectionGraph
+from Models.forecast_periods import forecast_periods
 
 try:
     import psutil
@@ -631,7 +634,8 @@ def _write_plotly_image(fig, path, fallback_msg="Chart could not be generated.",
 
 
 # Helper function to prepare common data (Keep Unchanged)
-def _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fundamentals, plot_period_years, current_price_info=None):
+def _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fundamentals, plot_period_years, current_price_info=None,
+                         include_slow_extractions=True):
     # ... (implementation unchanged) ...
     data_out = {}
 
@@ -662,7 +666,10 @@ def _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fu
 
     # --- Determine time column and label ---
     time_col = "Period"; period_label = "Period"
-    if forecast_data is not None and not forecast_data.empty and "Period" in forecast_data.columns:
+    periods = forecast_periods(forecast_data) or forecast_periods(actual_data)
+    if periods is not None:
+        period_label = periods.period_label  # Tables built by train_prophet_model know their granularity
+    elif forecast_data is not None and not forecast_data.empty and "Period" in forecast_data.columns:
         first_period = str(forecast_data['Period'].iloc[0])
         if '-' in first_period:
              parts = first_period.split('-')
@@ -796,24 +803,31 @@ def _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fu
 
     # --- Extract Fundamental Data ---
     print("Extracting fundamental data sections...")
-    data_out['profile_data'] = extract_company_profile(fundamentals)
-    data_out['valuation_data'] = extract_valuation_metrics(fundamentals)
-    data_out['financial_health_data'] = extract_financial_health(fundamentals)
-    data_out['profitability_data'] = extract_profitability(fundamentals)
-    data_out['dividends_data'] = extract_dividends_splits(fundamentals)
-    data_out['analyst_info_data'] = extract_analyst_info(fundamentals)
-    data_out['news_list'] = extract_news(fundamentals, ticker)
-    data_out['total_valuation_data'] = extract_total_valuation_data(fundamentals, current_price)
-    data_out['share_statistics_data'] = extract_share_statistics_data(fundamentals, current_price)
-    data_out['financial_efficiency_data'] = extract_financial_efficiency_data(fundamentals)
-    data_out['stock_price_stats_data'] = extract_stock_price_stats_data(fundamentals)
-    data_out['short_selling_data'] = extract_short_selling_data(fundamentals)
-    data_out['peer_comparison_data'] = extract_peer_comparison_data(ticker)
-    
-    # --- NEW: Extract Risk, Sentiment, and Quarterly Earnings Analysis Data ---
-    data_out['risk_analysis_data'] = extract_risk_analysis_data(historical_data, market_data=None, ticker=ticker)  # Use historical_data for raw price data with Close column
-    data_out['sentiment_analysis_data'] = extract_sentiment_analysis_data(fundamentals, ticker=ticker)
-    data_out['quarterly_earnings_data'] = extract_quarterly_earnings_data(fundamentals, ticker=ticker)
+    with span('report.fundamental_sections'):
+        data_out['profile_data'] = extract_company_profile(fundamentals)
+        data_out['valuation_data'] = extract_valuation_metrics(fundamentals)
+        data_out['financial_health_data'] = extract_financial_health(fundamentals)
+        data_out['profitability_data'] = extract_profitability(fundamentals)
+        data_out['dividends_data'] = extract_dividends_splits(fundamentals)
+        data_out['analyst_info_data'] = extract_analyst_info(fundamentals)
+        data_out['news_list'] = extract_news(fundamentals, ticker)
+        data_out['total_valuation_data'] = extract_total_valuation_data(fundamentals, current_price)
+        data_out['share_statistics_data'] = extract_share_statistics_data(fundamentals, current_price)
+        data_out['financial_efficiency_data'] = extract_financial_efficiency_data(fundamentals)
+        data_out['stock_price_stats_data'] = extract_stock_price_stats_data(fundamentals)
+        data_out['short_selling_data'] = extract_short_selling_data(fundamentals)
+    if include_slow_extractions:
+        # Network-bound / heavy extractions; create_full_report runs them as section graph nodes instead
+        with span('report.peer_comparison'):
+            data_out['peer_comparison_data'] = extract_peer_comparison_data(ticker)
+        
+        # --- NEW: Extract Risk, Sentiment, and Quarterly Earnings Analysis Data ---
+        with span('report.risk_analysis'):
+            data_out['risk_analysis_data'] = extract_risk_analysis_data(historical_data, market_data=None, ticker=ticker)  # Use historical_data for raw price data with Close column
+        with span('report.sentiment_analysis'):
+            data_out['sentiment_analysis_data'] = extract_sentiment_analysis_data(fundamentals, ticker=ticker)
+        with span('report.quarterly_earnings'):
+            data_out['quarterly_earnings_data'] = extract_quarterly_earnings_data(fundamentals, ticker=ticker)
 
     # --- Calculate Risk Items ---
     print("Calculating risk factors...")
@@ -947,6 +961,25 @@ def _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fu
 
 
 # --- Full Report Generation Function (Keep Unchanged) ---
+def _report_data_sections(ticker, historical_data, fundamentals):
+    """Section graph nodes for the extractions _prepare_report_data skips with include_slow_extractions=False"""
+    return [
+        Section('peer_comparison_data',
+                lambda context: {'peer_comparison_data': extract_peer_comparison_data(ticker)},
+                outputs=('peer_comparison_data',), fallback={'peer_comparison_data': {}}),
+        Section('risk_analysis_data',
+                # Use historical_data for raw price data with Close column
+                lambda context: {'risk_analysis_data': extract_risk_analysis_data(historical_data, market_data=None, ticker=ticker)},
+                outputs=('risk_analysis_data',), fallback={'risk_analysis_data': {}}),
+        Section('sentiment_analysis_data',
+                lambda context: {'sentiment_analysis_data': extract_sentiment_analysis_data(fundamentals, ticker=ticker)},
+                outputs=('sentiment_analysis_data',), fallback={'sentiment_analysis_data': {}}),
+        Section('quarterly_earnings_data',
+                lambda context: {'quarterly_earnings_data': extract_quarterly_earnings_data(fundamentals, ticker=ticker)},
+                outputs=('quarterly_earnings_data',), fallback={'quarterly_earnings_data': {}}),
+    ]
+
+
 def create_full_report(
     ticker,
     actual_data,
@@ -969,8 +1002,10 @@ def create_full_report(
     print(f"[Full Report] Reports directory: {reports_dir}")
 
     try:
-        rdata = _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fundamentals, plot_period_years, current_price_info)
-        print("[Full Report] Generating plots...")
+        with span('report.prepare_data'):
+            rdata = _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fundamentals, plot_period_years, current_price_info,
+                                         include_slow_extractions=False)
+        print("[Full Report] Generating plots and HTML components...")
         def fig_to_html(fig, include_plotlyjs=True, full_html=False, div_id=None, config=None):
             # ... (fig_to_html implementation unchanged) ...
             if fig is None: return ""
@@ -987,159 +1022,171 @@ def create_full_report(
                  return f'<p style="color:red;">Error rendering plot: {e}</p>'
 
 
-        # --- Forecast Chart (Plotly - logic unchanged) ---
-        forecast_chart_fig = go.Figure()
-        display_actual = rdata.get('actual_data')
-        forecast_table = rdata.get('monthly_forecast_table_data')
-        period_label = rdata.get('period_label', 'Period')
-        time_col = rdata.get('time_col', 'Period')
-        forecast_1y = rdata.get('forecast_1y')
-        overall_pct_change = rdata.get('overall_pct_change', 0.0)
-        display_actual_plot = display_actual.tail(6) if display_actual is not None else pd.DataFrame()
-        time_axis_parts = []
-        if not display_actual_plot.empty and time_col in display_actual_plot.columns: time_axis_parts.append(display_actual_plot[time_col])
-        if forecast_table is not None and not forecast_table.empty and time_col in forecast_table.columns: time_axis_parts.append(forecast_table[time_col])
-        try:
-            if time_axis_parts: combined_time_axis = sorted(list(pd.concat(time_axis_parts).unique()))
-            else: combined_time_axis = []
-        except TypeError: combined_time_axis = list(pd.concat(time_axis_parts).unique()) if time_axis_parts else []
-
-        if not display_actual_plot.empty and 'Average' in display_actual_plot.columns:
-             forecast_chart_fig.add_trace( go.Scatter(x=display_actual_plot[time_col], y=display_actual_plot['Average'], mode='lines+markers', name='Actual', line=dict(color='#1f77b4', width=2), marker=dict(size=6), hovertemplate=f"<b>%{{x}} ({period_label})</b><br><b>Actual Avg</b>: %{{y:.2f}}<extra></extra>"))
-        if forecast_table is not None and not forecast_table.empty:
-            colors = {'Low': '#d62728', 'Average': '#2ca02c', 'High': '#9467bd'}
-            plot_cols = ['Low', 'Average', 'High'] if all(c in forecast_table for c in ['Low', 'Average', 'High']) else ['Average']
-            for col in plot_cols:
-                 forecast_chart_fig.add_trace(go.Scatter(x=forecast_table[time_col], y=forecast_table[col], mode='lines+markers', name=f'Fcst {col}', line=dict(color=colors[col], width=2), marker=dict(size=6, line=dict(width=1, color='#ffffff')), hovertemplate=f"<b>%{{x}} ({period_label})</b><br><b>{col}</b>: %{{y:.2f}}<extra></extra>"))
-            if forecast_1y is not None and 'Average' in forecast_table.columns and time_col in forecast_table.columns:
-                 annotation_text = (f"<b>{forecast_1y:.2f}</b><br><span style='color:{colors['Average']};'>{overall_pct_change:+.1f}% (1Y)</span>")
-                 last_time_period = forecast_table[time_col].iloc[-1]
-                 ax_val = 30; ay_val = -30
-                 if len(forecast_table) > 1:
-                     try: # Handle potential non-numeric comparison errors
-                         y_second_last = forecast_table['Average'].iloc[-2]
-                         if pd.to_numeric(forecast_1y, errors='coerce') < pd.to_numeric(y_second_last, errors='coerce'): ay_val = 30
-                     except (TypeError, IndexError): pass # Keep default annotation position on error
-                 forecast_chart_fig.add_annotation(x=last_time_period, y=forecast_1y, text=annotation_text, showarrow=True, arrowhead=2, ax=ax_val, ay=ay_val, bgcolor='rgba(255,255,255,0.8)', font=dict(color=colors['Average'], size=10), bordercolor='black', borderwidth=1)
-
-        forecast_chart_fig.update_layout(
-            title=dict(text=f"{ticker} Price Forecast ({rdata.get('forecast_horizon_periods', 0)} {period_label}s)", y=0.98, x=0.5, xanchor='center', yanchor='top', font_size=14),
-            legend=dict(orientation="h", yanchor="top", y=0.92, xanchor="center", x=0.5, font_size=10),
-            xaxis=dict(title=period_label, type="category", categoryorder='array', categoryarray=combined_time_axis, tickangle=-45, tickformat="%b %Y", tickfont_size=10, domain=[0, 1], automargin=True),
-            yaxis_title="Price ($)", yaxis=dict(domain=[0, 0.85], tickfont_size=10, automargin=True),
-            margin=dict(l=35, r=25, t=80, b=40), autosize=True, template="plotly_white", showlegend=True
-        )
-        forecast_chart_html = fig_to_html(forecast_chart_fig, div_id='forecast-chart-div')
-
-
-        # --- Technical Analysis Charts HTML (Plotly - logic unchanged) ---
-        hist_data_for_ta = rdata['historical_data'].copy()
-        historical_line_fig = plot_historical_line_chart(hist_data_for_ta, ticker)
-        historical_chart_html = fig_to_html(historical_line_fig, div_id='hist-chart-div', include_plotlyjs=False)
-        bb_fig, bb_conclusion = plot_price_bollinger(hist_data_for_ta.copy(), ticker, plot_period_years=plot_period_years)
-        bb_chart_html = fig_to_html(bb_fig, div_id='bb-chart-div', include_plotlyjs=False)
-        rsi_fig, rsi_conclusion = plot_rsi(hist_data_for_ta.copy(), ticker, plot_period_years=plot_period_years)
-        rsi_chart_html = fig_to_html(rsi_fig, div_id='rsi-chart-div', include_plotlyjs=False)
-        macd_conclusion = get_macd_conclusion(rdata['detailed_ta_data'].get('MACD_Line'), rdata['detailed_ta_data'].get('MACD_Signal'), rdata['detailed_ta_data'].get('MACD_Hist'), rdata['detailed_ta_data'].get('MACD_Hist_Prev')) if rdata['detailed_ta_data'].get('MACD_Hist') is not None else "MACD conclusion requires more data."
-        macd_lines_fig, _ = plot_macd_lines(hist_data_for_ta.copy(), ticker, plot_period_years=plot_period_years)
-        macd_lines_chart_html = fig_to_html(macd_lines_fig, div_id='macd-lines-chart-div', include_plotlyjs=False)
-        macd_hist_fig, _ = plot_macd_histogram(hist_data_for_ta.copy(), ticker, plot_period_years=plot_period_years)
-        macd_hist_chart_html = fig_to_html(macd_hist_fig, div_id='macd-hist-chart-div', include_plotlyjs=False)
-
-        # --- Generate HTML Components (logic unchanged) ---
-        print("[Full Report] Generating HTML components...")
-        intro_html = generate_introduction_html(ticker, rdata)
-        metrics_summary_html = generate_metrics_summary_html(ticker, rdata)
-        detailed_forecast_table_html = generate_detailed_forecast_table_html(ticker, rdata)
-        company_profile_html = generate_company_profile_html(ticker, rdata)
-        total_valuation_html = generate_total_valuation_html(ticker, rdata)
-        share_statistics_html = generate_share_statistics_html(ticker, rdata)
-        valuation_metrics_html = generate_valuation_metrics_html(ticker, rdata)
-        financial_health_html = generate_financial_health_html(ticker, rdata)
-        financial_efficiency_html = generate_financial_efficiency_html(ticker, rdata)
-        profitability_growth_html = generate_profitability_growth_html(ticker, rdata)
-        dividends_shareholder_returns_html = generate_dividends_shareholder_returns_html(ticker, rdata)
-        technical_analysis_summary_html = generate_technical_analysis_summary_html(ticker, rdata) 
-        stock_price_statistics_html = generate_stock_price_statistics_html(ticker, rdata)
-        short_selling_info_html = generate_short_selling_info_html(ticker, rdata)
-        peer_comparison_html = generate_peer_comparison_html(rdata.get('peer_comparison_data', {}), ticker)
-        risk_factors_html = generate_risk_factors_html(ticker, rdata)
-        analyst_insights_html = generate_analyst_insights_html(ticker, rdata)
-        recent_news_html = generate_recent_news_html(ticker, rdata)
-        
-        # --- NEW: Generate Risk, Sentiment, and Quarterly Earnings Analysis HTML ---
-        risk_analysis_html = generate_risk_analysis_html(ticker, rdata)
-        sentiment_analysis_html = generate_sentiment_analysis_html(ticker, rdata)
-        quarterly_earnings_html = generate_quarterly_earnings_html(ticker, rdata)
-        
-        conclusion_outlook_html = generate_conclusion_outlook_html(ticker, rdata)
-        faq_html = generate_faq_html(ticker, rdata)
-        report_info_disclaimer_html = generate_report_info_disclaimer_html(datetime.now(pytz.utc))
+        # --- Charts and HTML components: independent sections render concurrently ---
+        def render_forecast_chart(context):
+            # --- Forecast Chart (Plotly - logic unchanged) ---
+            forecast_chart_fig = go.Figure()
+            display_actual = rdata.get('actual_data')
+            forecast_table = rdata.get('monthly_forecast_table_data')
+            period_label = rdata.get('period_label', 'Period')
+            time_col = rdata.get('time_col', 'Period')
+            forecast_1y = rdata.get('forecast_1y')
+            overall_pct_change = rdata.get('overall_pct_change', 0.0)
+            display_actual_plot = display_actual.tail(6) if display_actual is not None else pd.DataFrame()
+            time_axis_parts = []
+            if not display_actual_plot.empty and time_col in display_actual_plot.columns: time_axis_parts.append(display_actual_plot[time_col])
+            if forecast_table is not None and not forecast_table.empty and time_col in forecast_table.columns: time_axis_parts.append(forecast_table[time_col])
+            try:
+                if time_axis_parts: combined_time_axis = sorted(list(pd.concat(time_axis_parts).unique()))
+                else: combined_time_axis = []
+            except TypeError: combined_time_axis = list(pd.concat(time_axis_parts).unique()) if time_axis_parts else []
+
+            if not display_actual_plot.empty and 'Average' in display_actual_plot.columns:
+                 forecast_chart_fig.add_trace( go.Scatter(x=display_actual_plot[time_col], y=display_actual_plot['Average'], mode='lines+markers', name='Actual', line=dict(color='#1f77b4', width=2), marker=dict(size=6), hovertemplate=f"<b>%{{x}} ({period_label})</b><br><b>Actual Avg</b>: %{{y:.2f}}<extra></extra>"))
+            if forecast_table is not None and not forecast_table.empty:
+                colors = {'Low': '#d62728', 'Average': '#2ca02c', 'High': '#9467bd'}
+                plot_cols = ['Low', 'Average', 'High'] if all(c in forecast_table for c in ['Low', 'Average', 'High']) else ['Average']
+                for col in plot_cols:
+                     forecast_chart_fig.add_trace(go.Scatter(x=forecast_table[time_col], y=forecast_table[col], mode='lines+markers', name=f'Fcst {col}', line=dict(color=colors[col], width=2), marker=dict(size=6, line=dict(width=1, color='#ffffff')), hovertemplate=f"<b>%{{x}} ({period_label})</b><br><b>{col}</b>: %{{y:.2f}}<extra></extra>"))
+                if forecast_1y is not None and 'Average' in forecast_table.columns and time_col in forecast_table.columns:
+                     annotation_text = (f"<b>{forecast_1y:.2f}</b><br><span style='color:{colors['Average']};'>{overall_pct_change:+.1f}% (1Y)</span>")
+                     last_time_period = forecast_table[time_col].iloc[-1]
+                     ax_val = 30; ay_val = -30
+                     if len(forecast_table) > 1:
+                         try: # Handle potential non-numeric comparison errors
+                             y_second_last = forecast_table['Average'].iloc[-2]
+                             if pd.to_numeric(forecast_1y, errors='coerce') < pd.to_numeric(y_second_last, errors='coerce'): ay_val = 30
+                         except (TypeError, IndexError): pass # Keep default annotation position on error
+                     forecast_chart_fig.add_annotation(x=last_time_period, y=forecast_1y, text=annotation_text, showarrow=True, arrowhead=2, ax=ax_val, ay=ay_val, bgcolor='rgba(255,255,255,0.8)', font=dict(color=colors['Average'], size=10), bordercolor='black', borderwidth=1)
+
+            forecast_chart_fig.update_layout(
+                title=dict(text=f"{ticker} Price Forecast ({rdata.get('forecast_horizon_periods', 0)} {period_label}s)", y=0.98, x=0.5, xanchor='center', yanchor='top', font_size=14),
+                legend=dict(orientation="h", yanchor="top", y=0.92, xanchor="center", x=0.5, font_size=10),
+                xaxis=dict(title=period_label, type="category", categoryorder='array', categoryarray=combined_time_axis, tickangle=-45, tickformat="%b %Y", tickfont_size=10, domain=[0, 1], automargin=True),
+                yaxis_title="Price ($)", yaxis=dict(domain=[0, 0.85], tickfont_size=10, automargin=True),
+                margin=dict(l=35, r=25, t=80, b=40), autosize=True, template="plotly_white", showlegend=True
+            )
+            return fig_to_html(forecast_chart_fig, div_id='forecast-chart-div')
+
+        def render_ta_chart(plot_func, div_id, returns_conclusion=True):
+            # Each chart works on its own copy; the plot helpers add indicator columns in place
+            def render(context):
+                hist_data_for_ta = context['historical_data'].copy()
+                if returns_conclusion:
+                    fig, _ = plot_func(hist_data_for_ta, ticker, plot_period_years=plot_period_years)
+                else:
+                    fig = plot_func(hist_data_for_ta, ticker)
+                return fig_to_html(fig, div_id=div_id, include_plotlyjs=False)
+            return render
+
+        def render_macd_charts(context):
+            macd_lines_chart_html = render_ta_chart(plot_macd_lines, 'macd-lines-chart-div')(context)
+            macd_hist_chart_html = render_ta_chart(plot_macd_histogram, 'macd-hist-chart-div')(context)
+            return (f'<div class="indicator-chart-container">{macd_lines_chart_html or ""}</div>' +
+                    f'<div class="indicator-chart-container">{macd_hist_chart_html or ""}</div>')
+
+        def html_section(key, generator, inputs=()):
+            return Section(key, lambda context: generator(ticker, context), inputs=inputs, fallback='')
+
+        sections = _report_data_sections(ticker, historical_data, fundamentals) + [
+            html_section('introduction', generate_introduction_html, ('profile_data', 'detailed_ta_data', 'analyst_info_data')),
+            html_section('metrics_summary', generate_metrics_summary_html, ('detailed_ta_data', 'analyst_info_data', 'historical_data')),
+            Section('forecast_chart', render_forecast_chart, inputs=('actual_data', 'monthly_forecast_table_data'), fallback=''),
+            html_section('detailed_forecast_table', generate_detailed_forecast_table_html, ('monthly_forecast_table_data',)),
+            html_section('company_profile', generate_company_profile_html, ('profile_data',)),
+            html_section('total_valuation', generate_total_valuation_html, ('total_valuation_data',)),
+            html_section('share_statistics', generate_share_statistics_html, ('share_statistics_data', 'short_selling_data')),
+            html_section('valuation_metrics', generate_valuation_metrics_html, ('valuation_data', 'total_valuation_data')),
+            html_section('financial_health', generate_financial_health_html, ('financial_health_data',)),
+            html_section('financial_efficiency', generate_financial_efficiency_html, ('financial_efficiency_data',)),
+            html_section('profitability_growth', generate_profitability_growth_html, ('profitability_data',)),
+            html_section('dividends_shareholder_returns', generate_dividends_shareholder_returns_html, ('dividends_data',)),
+            html_section('technical_analysis_summary', generate_technical_analysis_summary_html, ('detailed_ta_data',)),
+            Section('bb_chart', render_ta_chart(plot_price_bollinger, 'bb-chart-div'), inputs=('historical_data',), fallback=''),
+            Section('rsi_chart', render_ta_chart(plot_rsi, 'rsi-chart-div'), inputs=('historical_data',), fallback=''),
+            Section('macd_charts', render_macd_charts, inputs=('historical_data',), fallback=''),
+            Section('historical_chart', render_ta_chart(plot_historical_line_chart, 'hist-chart-div', returns_conclusion=False),
+                    inputs=('historical_data',), fallback=''),
+            html_section('historical_performance', generate_historical_performance_html, ('historical_data',)),
+            html_section('stock_price_statistics', generate_stock_price_statistics_html, ('stock_price_stats_data',)),
+            html_section('quarterly_earnings', generate_quarterly_earnings_html, ('quarterly_earnings_data',)),
+            html_section('short_selling_info', generate_short_selling_info_html, ('short_selling_data',)),
+            html_section('risk_analysis', generate_risk_analysis_html, ('risk_analysis_data',)),
+            html_section('sentiment_analysis', generate_sentiment_analysis_html, ('sentiment_analysis_data',)),
+            Section('peer_comparison', lambda context: generate_peer_comparison_html(context.get('peer_comparison_data', {}), ticker),
+                    inputs=('peer_comparison_data',), fallback=''),
+            html_section('risk_factors', generate_risk_factors_html, ('risk_items',)),
+            html_section('analyst_insights', generate_analyst_insights_html, ('analyst_info_data',)),
+            html_section('recent_news', generate_recent_news_html, ('news_list',)),
+            html_section('conclusion_outlook', generate_conclusion_outlook_html, ('detailed_ta_data', 'financial_health_data', 'valuation_data')),
+            html_section('faq', generate_faq_html, ('risk_items', 'detailed_ta_data')),
+            Section('report_info_disclaimer', lambda context: generate_report_info_disclaimer_html(datetime.now(pytz.utc)), fallback=''),
+        ]
+        rendered = SectionGraph(sections, name='full_report').render(rdata)
+        section_html = rendered.html
 
         # --- Assemble Final HTML Structure (structure unchanged) ---
-        print("[Full Report] Assembling final HTML structure...")
-        report_body_content = f'<h1 class="report-title">{ticker} Stock Analysis & Price Forecast ({datetime.now(pytz.utc):%Y-%m-%d})</h1>\n'
-        html_sections = [
-            ("Introduction and Overview", intro_html, "introduction-overview"),
-            ("Key Metrics and Forecast Summary", metrics_summary_html, "key-metrics-forecast"),
-            ("Price Forecast Chart", forecast_chart_html, "forecast-chart", "<div class=\"narrative\"><p>The chart below shows recent actual average prices and the forecasted price range (Low, Average, High) based on the Prophet model.</p></div>"),
-            ("Detailed Forecast Table", detailed_forecast_table_html, "detailed-forecast-table"),
-            ("Company Profile", company_profile_html, "company-profile"),
-            ("Total Valuation", total_valuation_html, "total-valuation"),
-            ("Share Statistics", share_statistics_html, "share-statistics"),
-            ("Valuation Metrics", valuation_metrics_html, "valuation-metrics"),
-            ("Financial Health", financial_health_html, "financial-health"),
-            ("Financial Efficiency", financial_efficiency_html, "financial-efficiency"),
-            ("Profitability and Growth", profitability_growth_html, "profitability-growth"),
-            ("Dividends and Shareholder Returns", dividends_shareholder_returns_html, "dividends-shareholder-returns"),
-            ("Technical Analysis", technical_analysis_summary_html, "technical-analysis-summary"),
-            ("Bollinger Bands Chart", bb_chart_html, "tech-chart-bb"),
-            ("RSI Chart", rsi_chart_html, "tech-chart-rsi"),
-            ("MACD Charts",
-             f'<div class="indicator-chart-container">{macd_lines_chart_html or ""}</div>' +
-             f'<div class="indicator-chart-container">{macd_hist_chart_html or ""}</div>',
-             "tech-chart-macd-combined"),
-            ("Historical Price & Volume Chart", historical_chart_html, "historical-chart", "<div class=\"narrative\"><p>Historical closing price and volume (with 20d avg). Use buttons above chart to change range.</p></div>"),
-            ("Historical Performance", generate_historical_performance_html(ticker, rdata), "historical-performance"),
-            ("Stock Price Statistics", stock_price_statistics_html, "stock-price-statistics"),
-            ("Quarterly Earnings Performance", quarterly_earnings_html, "quarterly-earnings"),
-            ("Short Selling Information", short_selling_info_html, "short-selling-information"),
-            ("Risk Analysis", risk_analysis_html, "risk-analysis"),
-            ("Sentiment Analysis", sentiment_analysis_html, "sentiment-analysis"),
-            ("Peer Comparison", peer_comparison_html, "peer-comparison"),
-            ("Risk Factors", risk_factors_html, "risk-factors"),
-            ("Analyst Insights and Consensus", analyst_insights_html, "analyst-insights"),
-            ("Recent News and Developments", recent_news_html, "recent-news"),
-            ("Conclusion and Outlook", conclusion_outlook_html, "conclusion-outlook"),
-            ("Frequently Asked Questions", faq_html, "frequently-asked-questions"),
-            ("Report Information and Disclaimer", report_info_disclaimer_html, "report-information-disclaimer")
-        ]
-        # --- (Loop to build report body remains the same) ---
-        for item in html_sections:
-            title, html_content = item[0], item[1]
-            section_class = item[2] if len(item) > 2 else title.lower().replace(" ", "-").replace("&", "and")
-            narrative = item[3] if len(item) > 3 else None
-            conclusion = item[4] if len(item) > 4 else None
-            has_content = bool(html_content and str(html_content).strip() and not str(html_content).startswith(("<p>No data",'<p style="color:red;">Error')))
-            is_chart_section = section_class.startswith("tech-chart-") or section_class in ["historical-chart", "forecast-chart"]
-            if has_content or (is_chart_section and (html_content or conclusion)):
-                 report_body_content += f'<div class="section {section_class}">\n  <h2>{title}</h2>\n'
-                 if narrative: report_body_content += f"  {narrative}\n"
-                 chart_fallback_message = f'<p style="text-align:center; color:red; padding: 2rem 1rem;">Chart for {title} could not be generated.</p>'
-                 if section_class == "tech-chart-macd-combined":
-                     # Handles potentially multiple charts + conclusion
-                     report_body_content += f"  {html_content or chart_fallback_message}\n"
-                 elif is_chart_section:
-                     # Standard single chart + conclusion structure
-                     chart_html = html_content or chart_fallback_message
-                     report_body_content += f'  <div class="indicator-chart-container">{chart_html}</div>\n'
-                     if conclusion: report_body_content += f'  <div class="indicator-conclusion">{conclusion}</div>\n'
-                 elif has_content:
-                     # Non-chart sections
-                     report_body_content += f"  {html_content}\n"
-                 report_body_content += f'</div>\n'
-            else:
-                 print(f"[Full Report] Skipping empty or failed section: {title}")
+        with span('report.assemble'):
+            print("[Full Report] Assembling final HTML structure...")
+            report_body_content = f'<h1 class="report-title">{ticker} Stock Analysis & Price Forecast ({datetime.now(pytz.utc):%Y-%m-%d})</h1>\n'
+            html_sections = [
+                ("Introduction and Overview", section_html.get('introduction', ''), "introduction-overview"),
+                ("Key Metrics and Forecast Summary", section_html.get('metrics_summary', ''), "key-metrics-forecast"),
+                ("Price Forecast Chart", section_html.get('forecast_chart', ''), "forecast-chart", "<div class=\"narrative\"><p>The chart below shows recent actual average prices and the forecasted price range (Low, Average, High) based on the Prophet model.</p></div>"),
+                ("Detailed Forecast Table", section_html.get('detailed_forecast_table', ''), "detailed-forecast-table"),
+                ("Company Profile", section_html.get('company_profile', ''), "company-profile"),
+                ("Total Valuation", section_html.get('total_valuation', ''), "total-valuation"),
+                ("Share Statistics", section_html.get('share_statistics', ''), "share-statistics"),
+                ("Valuation Metrics", section_html.get('valuation_metrics', ''), "valuation-metrics"),
+                ("Financial Health", section_html.get('financial_health', ''), "financial-health"),
+                ("Financial Efficiency", section_html.get('financial_efficiency', ''), "financial-efficiency"),
+                ("Profitability and Growth", section_html.get('profitability_growth', ''), "profitability-growth"),
+                ("Dividends and Shareholder Returns", section_html.get('dividends_shareholder_returns', ''), "dividends-shareholder-returns"),
+                ("Technical Analysis", section_html.get('technical_analysis_summary', ''), "technical-analysis-summary"),
+                ("Bollinger Bands Chart", section_html.get('bb_chart', ''), "tech-chart-bb"),
+                ("RSI Chart", section_html.get('rsi_chart', ''), "tech-chart-rsi"),
+                ("MACD Charts", section_html.get('macd_charts', ''), "tech-chart-macd-combined"),
+                ("Historical Price & Volume Chart", section_html.get('historical_chart', ''), "historical-chart", "<div class=\"narrative\"><p>Historical closing price and volume (with 20d avg). Use buttons above chart to change range.</p></div>"),
+                ("Historical Performance", section_html.get('historical_performance', ''), "historical-performance"),
+                ("Stock Price Statistics", section_html.get('stock_price_statistics', ''), "stock-price-statistics"),
+                ("Quarterly Earnings Performance", section_html.get('quarterly_earnings', ''), "quarterly-earnings"),
+                ("Short Selling Information", section_html.get('short_selling_info', ''), "short-selling-information"),
+                ("Risk Analysis", section_html.get('risk_analysis', ''), "risk-analysis"),
+                ("Sentiment Analysis", section_html.get('sentiment_analysis', ''), "sentiment-analysis"),
+                ("Peer Comparison", section_html.get('peer_comparison', ''), "peer-comparison"),
+                ("Risk Factors", section_html.get('risk_factors', ''), "risk-factors"),
+                ("Analyst Insights and Consensus", section_html.get('analyst_insights', ''), "analyst-insights"),
+                ("Recent News and Developments", section_html.get('recent_news', ''), "recent-news"),
+                ("Conclusion and Outlook", section_html.get('conclusion_outlook', ''), "conclusion-outlook"),
+                ("Frequently Asked Questions", section_html.get('faq', ''), "frequently-asked-questions"),
+                ("Report Information and Disclaimer", section_html.get('report_info_disclaimer', ''), "report-information-disclaimer")
+            ]
+            # --- (Loop to build report body remains the same) ---
+            for item in html_sections:
+                title, html_content = item[0], item[1]
+                section_class = item[2] if len(item) > 2 else title.lower().replace(" ", "-").replace("&", "and")
+                narrative = item[3] if len(item) > 3 else None
+                conclusion = item[4] if len(item) > 4 else None
+                has_content = bool(html_content and str(html_content).strip() and not str(html_content).startswith(("<p>No data",'<p style="color:red;">Error')))
+                is_chart_section = section_class.startswith("tech-chart-") or section_class in ["historical-chart", "forecast-chart"]
+                if has_content or (is_chart_section and (html_content or conclusion)):
+                     report_body_content += f'<div class="section {section_class}">\n  <h2>{title}</h2>\n'
+                     if narrative: report_body_content += f"  {narrative}\n"
+                     chart_fallback_message = f'<p style="text-align:center; color:red; padding: 2rem 1rem;">Chart for {title} could not be generated.</p>'
+                     if section_class == "tech-chart-macd-combined":
+                         # Handles potentially multiple charts + conclusion
+                         report_body_content += f"  {html_content or chart_fallback_message}\n"
+                     elif is_chart_section:
+                         # Standard single chart + conclusion structure
+                         chart_html = html_content or chart_fallback_message
+                         report_body_content += f'  <div class="indicator-chart-container">{chart_html}</div>\n'
+                         if conclusion: report_body_content += f'  <div class="indicator-conclusion">{conclusion}</div>\n'
+                     elif has_content:
+                         # Non-chart sections
+                         report_body_content += f"  {html_content}\n"
+                     report_body_content += f'</div>\n'
+                else:
+                     print(f"[Full Report] Skipping empty or failed section: {title}")
 
 
         # --- Assemble Final HTML Document (unchanged) ---
@@ -1170,15 +1217,16 @@ def create_full_report(
 </body>
 </html>"""
 
-        # Save Report
-        report_filename = f"{ticker}_detailed_report_{ts}.html"
-        report_path = os.path.join(reports_dir, report_filename) # Use reports_dir (static/stock_reports)
-        try:
-            with open(report_path, 'w', encoding='utf-8') as f: f.write(full_html)
-            print(f"[Full Report] Successfully generated and saved report: {report_path}")
-        except Exception as e:
-            print(f"[Full Report] Error writing report file to {report_path}: {e}")
-            return None, full_html # Return HTML even if saving failed
+        with span('report.save'):
+            # Save Report
+            report_filename = f"{ticker}_detailed_report_{ts}.html"
+            report_path = os.path.join(reports_dir, report_filename) # Use reports_dir (static/stock_reports)
+            try:
+                with open(report_path, 'w', encoding='utf-8') as f: f.write(full_html)
+                print(f"[Full Report] Successfully generated and saved report: {report_path}")
+            except Exception as e:
+                print(f"[Full Report] Error writing report file to {report_path}: {e}")
+                return None, full_html # Return HTML even if saving failed
 
         return report_path, full_html
 
@@ -1221,7 +1269,8 @@ def create_wordpress_report_assets(
     saved_forecast_chart_path = None # To store the path of the saved forecast chart
 
     try:
-        rdata = _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fundamentals, plot_period_years, current_price_info)
+        with span('report.prepare_data'):
+            rdata = _prepare_report_data(ticker, actual_data, forecast_data, historical_data, fundamentals, plot_period_years, current_price_info)
         hist_data_for_images = rdata['historical_data'].copy()
 
         image_configs = [
@@ -1233,115 +1282,117 @@ def create_wordpress_report_assets(
             ('macd_histogram', plot_macd_hist_mpl, hist_data_for_images.copy())
         ]
 
-        print("[WP Assets] Generating Matplotlib charts...") # Use logger
-        chart_conclusions = {}
-        for config_item in image_configs:
-            chart_key = config_item[0]
-            mpl_func = config_item[1]
-            data_arg = config_item[2]
-
-            print(f"  Generating {chart_key} for {ticker}...") # Use logger
-            if mpl_func is None: continue
-
-            mpl_fig = None
-            try:
-                if chart_key == 'forecast':
-                    mpl_fig = mpl_func(data_arg, ticker)
-                else:
-                    mpl_fig = mpl_func(data_arg, ticker, plot_period_years=plot_period_years)
-
-                if mpl_fig is None:
-                    print(f"    FAILED (Plot Generation): Function '{mpl_func.__name__}' returned None for '{chart_key}'.") # Use logger
-                    continue
-
-                # --- MODIFICATION FOR FORECAST CHART ---
-                if chart_key == 'forecast':
-                    forecast_chart_filename = f"{ticker}_forecast_featured_{ts}.png"
-                    # Save in the unique temp_images_dir for this ticker and timestamp
-                    saved_forecast_chart_path = os.path.join(report_assets_dir, forecast_chart_filename) # Use report_assets_dir
-                    mpl_fig.savefig(saved_forecast_chart_path, bbox_inches='tight', dpi=150) # Save with decent DPI
-                    print(f"    Successfully saved '{chart_key}' chart to: {saved_forecast_chart_path}") # Use logger
-                    # Optionally, still generate Base64 for embedding in HTML body if needed
-                    # base64_str = get_mpl_base64_from_file(saved_forecast_chart_path)
-                    # For simplicity, we'll assume if it's a featured image, it might not also be in the body,
-                    # or if it is, your existing get_img_tag will use the base64 version if populated.
-                    # If you want the saved forecast chart also as base64 in the HTML:
-                    base64_str_forecast = get_mpl_base64_from_file(saved_forecast_chart_path)
-                    if base64_str_forecast:
-                        chart_image_base64[chart_key] = base64_str_forecast
-                    plt.close(mpl_fig) # Close the figure
-                else:
-                    # For other charts, convert to Base64 as before for HTML embedding
-                    print(f"    Encoding {chart_key} to Base64...") # Use logger
-                    base64_str = get_mpl_base64(mpl_fig) # This function already closes the fig
-                    if base64_str:
-                        chart_image_base64[chart_key] = base64_str
-                        print(f"    Successfully encoded '{chart_key}'.") # Use logger
+        with span('report.charts'):
+            print("[WP Assets] Generating Matplotlib charts...") # Use logger
+            chart_conclusions = {}
+            for config_item in image_configs:
+                chart_key = config_item[0]
+                mpl_func = config_item[1]
+                data_arg = config_item[2]
+
+                print(f"  Generating {chart_key} for {ticker}...") # Use logger
+                if mpl_func is None: continue
+
+                mpl_fig = None
+                try:
+                    if chart_key == 'forecast':
+                        mpl_fig = mpl_func(data_arg, ticker)
+                    else:
+                        mpl_fig = mpl_func(data_arg, ticker, plot_period_years=plot_period_years)
+
+                    if mpl_fig is None:
+                        print(f"    FAILED (Plot Generation): Function '{mpl_func.__name__}' returned None for '{chart_key}'.") # Use logger
+                        continue
+
+                    # --- MODIFICATION FOR FORECAST CHART ---
+                    if chart_key == 'forecast':
+                        forecast_chart_filename = f"{ticker}_forecast_featured_{ts}.png"
+                        # Save in the unique temp_images_dir for this ticker and timestamp
+                        saved_forecast_chart_path = os.path.join(report_assets_dir, forecast_chart_filename) # Use report_assets_dir
+                        mpl_fig.savefig(saved_forecast_chart_path, bbox_inches='tight', dpi=150) # Save with decent DPI
+                        print(f"    Successfully saved '{chart_key}' chart to: {saved_forecast_chart_path}") # Use logger
+                        # Optionally, still generate Base64 for embedding in HTML body if needed
+                        # base64_str = get_mpl_base64_from_file(saved_forecast_chart_path)
+                        # For simplicity, we'll assume if it's a featured image, it might not also be in the body,
+                        # or if it is, your existing get_img_tag will use the base64 version if populated.
+                        # If you want the saved forecast chart also as base64 in the HTML:
+                        base64_str_forecast = get_mpl_base64_from_file(saved_forecast_chart_path)
+                        if base64_str_forecast:
+                            chart_image_base64[chart_key] = base64_str_forecast
+                        plt.close(mpl_fig) # Close the figure
                     else:
-                        print(f"    FAILED (Base64 Encoding) for '{chart_key}'.") # Use logger
-                        chart_image_base64[chart_key] = None
-                # --- END MODIFICATION ---
-
-                conclusion_data = rdata['detailed_ta_data']
-                if chart_key == 'bollinger_bands':
-                    chart_conclusions['bollinger_bands'] = get_bb_conclusion(
-                        conclusion_data.get('Current_Price'),
-                        conclusion_data.get('BB_Upper'),
-                        conclusion_data.get('BB_Lower'),
-                        conclusion_data.get('BB_Middle')
-                    )
-                elif chart_key == 'rsi':
-                    chart_conclusions['rsi'] = get_rsi_conclusion(conclusion_data.get('RSI_14'))
-                elif chart_key == 'macd_lines' or chart_key == 'macd_histogram': # Combined conclusion
-                     chart_conclusions['macd'] = get_macd_conclusion(
-                         conclusion_data.get('MACD_Line'),
-                         conclusion_data.get('MACD_Signal'),
-                         conclusion_data.get('MACD_Hist'),
-                         conclusion_data.get('MACD_Hist_Prev')
-                     )
-
-
-            except Exception as e_chart:
-                print(f"    FAILED (Generation/Encoding/Saving) for '{chart_key}': {e_chart}") # Use logger
-                import traceback
-                traceback.print_exc()
-                if mpl_fig and plt.fignum_exists(mpl_fig.number): # Check if fig exists and is open
-                     plt.close(mpl_fig)
-                chart_image_base64[chart_key] = None
-                if chart_key == 'forecast': # Ensure path is None if saving failed
-                    saved_forecast_chart_path = None
-
-
-        # --- Generate HTML Components (Same as before, using chart_image_base64 for embedded ones) ---
-        print("[WP Assets] Generating text/table HTML components...") # Use logger
-        # ... (all your intro_html, metrics_summary_html, etc. generation - unchanged) ...
-        intro_html = generate_introduction_html(ticker, rdata)
-        metrics_summary_html = generate_metrics_summary_html(ticker, rdata)
-        detailed_forecast_table_html = generate_detailed_forecast_table_html(ticker, rdata)
-        company_profile_html = generate_company_profile_html(ticker, rdata)
-        total_valuation_html = generate_total_valuation_html(ticker, rdata)
-        share_statistics_html = generate_share_statistics_html(ticker, rdata)
-        valuation_metrics_html = generate_valuation_metrics_html(ticker, rdata)
-        financial_health_html = generate_financial_health_html(ticker, rdata)
-        financial_efficiency_html = generate_financial_efficiency_html(ticker, rdata)
-        profitability_growth_html = generate_profitability_growth_html(ticker, rdata)
-        dividends_shareholder_returns_html = generate_dividends_shareholder_returns_html(ticker, rdata)
-        technical_analysis_summary_html = generate_technical_analysis_summary_html(ticker, rdata)
-        stock_price_statistics_html = generate_stock_price_statistics_html(ticker, rdata)
-        short_selling_info_html = generate_short_selling_info_html(ticker, rdata)
-        peer_comparison_html = generate_peer_comparison_html(rdata.get('peer_comparison_data', {}), ticker)
-        risk_factors_html = generate_risk_factors_html(ticker, rdata)
-        analyst_insights_html = generate_analyst_insights_html(ticker, rdata)
-        # recent_news_html = generate_recent_news_html(ticker, rdata) # USER REQUEST: Comment out news
-        recent_news_html = generate_recent_news_html(ticker, rdata)  # Re-enabled: News functionality fixed
+                        # For other charts, convert to Base64 as before for HTML embedding
+                        print(f"    Encoding {chart_key} to Base64...") # Use logger
+                        base64_str = get_mpl_base64(mpl_fig) # This function already closes the fig
+                        if base64_str:
+                            chart_image_base64[chart_key] = base64_str
+                            print(f"    Successfully encoded '{chart_key}'.") # Use logger
+                        else:
+                            print(f"    FAILED (Base64 Encoding) for '{chart_key}'.") # Use logger
+                            chart_image_base64[chart_key] = None
+                    # --- END MODIFICATION ---
+
+                    conclusion_data = rdata['detailed_ta_data']
+                    if chart_key == 'bollinger_bands':
+                        chart_conclusions['bollinger_bands'] = get_bb_conclusion(
+                            conclusion_data.get('Current_Price'),
+                            conclusion_data.get('BB_Upper'),
+                            conclusion_data.get('BB_Lower'),
+                            conclusion_data.get('BB_Middle')
+                        )
+                    elif chart_key == 'rsi':
+                        chart_conclusions['rsi'] = get_rsi_conclusion(conclusion_data.get('RSI_14'))
+                    elif chart_key == 'macd_lines' or chart_key == 'macd_histogram': # Combined conclusion
+                         chart_conclusions['macd'] = get_macd_conclusion(
+                             conclusion_data.get('MACD_Line'),
+                             conclusion_data.get('MACD_Signal'),
+                             conclusion_data.get('MACD_Hist'),
+                             conclusion_data.get('MACD_Hist_Prev')
+                         )
+
+
+                except Exception as e_chart:
+                    print(f"    FAILED (Generation/Encoding/Saving) for '{chart_key}': {e_chart}") # Use logger
+                    import traceback
+                    traceback.print_exc()
+                    if mpl_fig and plt.fignum_exists(mpl_fig.number): # Check if fig exists and is open
+                         plt.close(mpl_fig)
+                    chart_image_base64[chart_key] = None
+                    if chart_key == 'forecast': # Ensure path is None if saving failed
+                        saved_forecast_chart_path = None
+
+
+            # --- Generate HTML Components (Same as before, using chart_image_base64 for embedded ones) ---
+        with span('report.html_components'):
+            print("[WP Assets] Generating text/table HTML components...") # Use logger
+            # ... (all your intro_html, metrics_summary_html, etc. generation - unchanged) ...
+            intro_html = generate_introduction_html(ticker, rdata)
+            metrics_summary_html = generate_metrics_summary_html(ticker, rdata)
+            detailed_forecast_table_html = generate_detailed_forecast_table_html(ticker, rdata)
+            company_profile_html = generate_company_profile_html(ticker, rdata)
+            total_valuation_html = generate_total_valuation_html(ticker, rdata)
+            share_statistics_html = generate_share_statistics_html(ticker, rdata)
+            valuation_metrics_html = generate_valuation_metrics_html(ticker, rdata)
+            financial_health_html = generate_financial_health_html(ticker, rdata)
+            financial_efficiency_html = generate_financial_efficiency_html(ticker, rdata)
+            profitability_growth_html = generate_profitability_growth_html(ticker, rdata)
+            dividends_shareholder_returns_html = generate_dividends_shareholder_returns_html(ticker, rdata)
+            technical_analysis_summary_html = generate_technical_analysis_summary_html(ticker, rdata)
+            stock_price_statistics_html = generate_stock_price_statistics_html(ticker, rdata)
+            short_selling_info_html = generate_short_selling_info_html(ticker, rdata)
+            peer_comparison_html = generate_peer_comparison_html(rdata.get('peer_comparison_data', {}), ticker)
+            risk_factors_html = generate_risk_factors_html(ticker, rdata)
+            analyst_insights_html = generate_analyst_insights_html(ticker, rdata)
+            # recent_news_html = generate_recent_news_html(ticker, rdata) # USER REQUEST: Comment out news
+            recent_news_html = generate_recent_news_html(ticker, rdata)  # Re-enabled: News functionality fixed
         
-        # --- NEW: Generate Risk, Sentiment, and Quarterly Earnings Analysis HTML ---
-        risk_analysis_html = generate_risk_analysis_html(ticker, rdata)
-        sentiment_analysis_html = generate_sentiment_analysis_html(ticker, rdata)
-        quarterly_earnings_html = generate_quarterly_earnings_html(ticker, rdata)
+            # --- NEW: Generate Risk, Sentiment, and Quarterly Earnings Analysis HTML ---
+            risk_analysis_html = generate_risk_analysis_html(ticker, rdata)
+            sentiment_analysis_html = generate_sentiment_analysis_html(ticker, rdata)
+            quarterly_earnings_html = generate_quarterly_earnings_html(ticker, rdata)
         
-        conclusion_outlook_html = generate_conclusion_outlook_html(ticker, rdata)
-        faq_html = generate_faq_html(ticker, rdata)
+            conclusion_outlook_html = generate_conclusion_outlook_html(ticker, rdata)
+            faq_html = generate_faq_html(ticker, rdata)
 
 
         # --- Assemble Report Body Content using Base64 Images ---
@@ -0,0 +1,334 @@
+"""
+Section Graph Renderer
+======================
+
+Renders report sections concurrently while assembling them in document order.
+
+Each ``Section`` declares the report-context keys it reads (``inputs``) and the
+keys it adds to the context (``outputs``). A section that reads another
+section's output waits for it; everything else is independent and runs on a
+thread pool, so network-bound builders (peer comparison, risk / sentiment
+extraction) and heavy pandas / plotly work overlap instead of queueing.
+
+- **Timeouts**: a section still running ``timeout`` seconds after it started
+  is abandoned and replaced by its fallback. Threads cannot be interrupted,
+  so the section's cancellation flag is set instead: long builders call
+  ``check_cancelled()`` (or poll ``cancelled()``) between steps to stop early;
+  whatever they still return is discarded.
+- **Fallbacks**: a section that raises or times out renders its ``fallback``
+  (HTML string, or a callable ``fallback(context, error)``); data sections
+  fall back to a dict of default outputs.
+- **Timings**: per-section status, queue wait and run time are returned with
+  the HTML and logged (slowest first); each section also runs in a
+  ``section.<key>`` tracing span.
+
+Configuration:
+--------------
+- ``REPORT_SECTION_WORKERS``: pool size (default 6; 1 renders sequentially)
+- ``REPORT_SECTION_TIMEOUT``: default per-section timeout in seconds (default 90)
+
+Usage:
+------
+```python
+graph = SectionGraph([
+    Section('peer_data', lambda ctx: {'peer_comparison_data': fetch_peers(ticker)},
+            outputs=('peer_comparison_data',), fallback={'peer_comparison_data': {}}),
+    Section('peer_comparison', lambda ctx: render_peers(ctx['peer_comparison_data']),
+            inputs=('peer_comparison_data',)),
+    Section('profile', lambda ctx: render_profile(ctx), inputs=('profile_data',)),
+])
+result = graph.render(rdata)
+body = "\\n".join(result.html.values())
+```
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from automation_scripts.tracing import span, bind
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv('REPORT_SECTION_WORKERS', '6'))
+DEFAULT_TIMEOUT = float(os.getenv('REPORT_SECTION_TIMEOUT', '90'))
+DEFAULT_FALLBACK_HTML = "<p>Section temporarily unavailable.</p>"
+# How often the coordinator re-checks deadlines while sections wait for a worker
+_POLL_SECONDS = 0.25
+# Cancellation flag of the section the current worker thread is rendering
+_active = threading.local()
+
+
+class SectionCancelled(Exception):
+    """Raised by ``check_cancelled()`` inside a section that has been abandoned"""
+
+
+def cancelled() -> bool:
+    """True when the section running on this thread has timed out (always False outside a section)"""
+    flag = getattr(_active, 'flag', None)
+    return flag is not None and flag.is_set()
+
+
+def check_cancelled():
+    """Stop the current section if it has been abandoned"""
+    if cancelled():
+        raise SectionCancelled()
+
+
+class Section:
+    """One node of the section graph"""
+
+    def __init__(self, key: str, render: Callable[[Dict[str, Any]], Any], inputs: Iterable[str] = (),
+                 outputs: Iterable[str] = (), timeout: Optional[float] = None, fallback: Any = None):
+        """
+        Args:
+            key: Unique section key
+            render: ``render(context)`` returning HTML, or a dict of outputs when ``outputs`` are declared
+                    (an ``'html'`` entry in that dict is used as the section's HTML)
+            inputs: Context keys the section reads
+            outputs: Context keys the section produces for other sections
+            timeout: Seconds the section may run (None: graph default)
+            fallback: HTML / default outputs used when the section fails or times out,
+                      or a callable ``fallback(context, error)`` returning them
+        """
+        self.key = key
+        self.render = render
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.timeout = timeout
+        self.fallback = fallback
+
+    def fallback_value(self, context, error, default_html):
+        fallback = self.fallback
+        if callable(fallback):
+            try:
+                return fallback(context, error)
+            except Exception as e:
+                logger.warning(f"Fallback for section '{self.key}' failed: {e}")
+                fallback = None
+        if fallback is None:
+            return {} if self.outputs else default_html
+        return fallback
+
+
+class RenderResult:
+    """HTML per section in document order, plus per-section timings"""
+
+    def __init__(self):
+        self.html: 'OrderedDict[str, str]' = OrderedDict()
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.wall_ms = 0.0
+
+    def failed(self) -> List[str]:
+        return [key for key, timing in self.timings.items() if timing['status'] != 'ok']
+
+    def slowest(self, limit: int = 5) -> List[Tuple[str, float]]:
+        rows = sorted(((key, t['ms']) for key, t in self.timings.items()), key=lambda row: row[1], reverse=True)
+        return rows[:limit]
+
+
+class SectionGraph:
+    """Dependency-aware concurrent renderer for report sections"""
+
+    def __init__(self, sections: Iterable[Section], max_workers: int = DEFAULT_WORKERS,
+                 default_timeout: float = DEFAULT_TIMEOUT, default_fallback: str = DEFAULT_FALLBACK_HTML,
+                 name: str = 'report'):
+        """
+        Args:
+            sections: Sections in document order
+            max_workers: Thread pool size (<= 1 renders sequentially, without timeouts)
+            default_timeout: Timeout for sections that do not set one
+            default_fallback: HTML for failed sections without a fallback
+            name: Label used in log messages
+        """
+        self.sections = list(sections)
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.default_fallback = default_fallback
+        self.name = name
+
+        self._by_key = OrderedDict()
+        producers = {}
+        for section in self.sections:
+            if section.key in self._by_key:
+                raise ValueError(f"Duplicate section key '{section.key}'")
+            self._by_key[section.key] = section
+            for output in section.outputs:
+                if output in producers:
+                    raise ValueError(f"Output '{output}' is produced by both '{producers[output]}' and '{section.key}'")
+                producers[output] = section.key
+        self._producers = producers
+        self._deps = {
+            section.key: {producers[i] for i in section.inputs if i in producers and producers[i] != section.key}
+            for section in self.sections
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(key, path):
+            if state.get(key) == 'done':
+                return
+            if state.get(key) == 'visiting':
+                raise ValueError(f"Section graph has a cycle: {' -> '.join(path + [key])}")
+            state[key] = 'visiting'
+            for dep in self._deps[key]:
+                visit(dep, path + [key])
+            state[key] = 'done'
+
+        for key in self._by_key:
+            visit(key, [])
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def render(self, context: Dict[str, Any]) -> RenderResult:
+        """
+        Render every section against ``context``.
+
+        Outputs of data sections are written into ``context`` as they finish.
+        """
+        missing = {i for s in self.sections for i in s.inputs if i not in context and i not in self._producers}
+        if missing:
+            logger.debug(f"{self.name}: inputs not in the report context: {sorted(missing)}")
+
+        result = RenderResult()
+        started_at = time.perf_counter()
+        with span(f"{self.name}.sections", sections=len(self.sections)):
+            if self.max_workers <= 1:
+                self._render_sequential(context, result)
+            else:
+                self._render_concurrent(context, result)
+        result.wall_ms = round((time.perf_counter() - started_at) * 1000, 1)
+
+        # Document order, data-only sections omitted
+        ordered = OrderedDict()
+        for section in self.sections:
+            if section.key in result.html:
+                ordered[section.key] = result.html[section.key]
+        result.html = ordered
+
+        slowest = ', '.join(f"{key} {ms:.0f}ms" for key, ms in result.slowest(3))
+        failed = result.failed()
+        logger.info(f"{self.name}: rendered {len(self.sections)} sections in {result.wall_ms:.0f}ms "
+                    f"(slowest: {slowest}){f'; fallbacks: {failed}' if failed else ''}")
+        return result
+
+    def _run(self, section, context, started, flag):
+        if flag.is_set():
+            raise SectionCancelled()
+        started[section.key] = time.monotonic()
+        _active.flag = flag
+        try:
+            with span(f"section.{section.key}"):
+                return section.render(context)
+        finally:
+            _active.flag = None
+
+    def _finish(self, section, context, result, value, status, error=None, queued_ms=0.0, run_ms=0.0):
+        if status != 'ok':
+            value = section.fallback_value(context, error, self.default_fallback)
+        if section.outputs:
+            outputs = value if isinstance(value, dict) else {}
+            for output in section.outputs:
+                context[output] = outputs.get(output)
+            html = outputs.get('html')
+        else:
+            html = value
+        if html is not None:
+            result.html[section.key] = html if isinstance(html, str) else str(html)
+        result.timings[section.key] = {
+            'status': status,
+            'ms': round(run_ms, 1),
+            'queued_ms': round(queued_ms, 1),
+        }
+        if error is not None:
+            result.timings[section.key]['error'] = f"{type(error).__name__}: {error}"
+
+    def _render_sequential(self, context, result):
+        done = set()
+        pending = list(self._by_key)
+        while pending:
+            key = next(k for k in pending if self._deps[k] <= done)
+            pending.remove(key)
+            section = self._by_key[key]
+            start = time.perf_counter()
+            try:
+                with span(f"section.{key}"):
+                    value = section.render(context)
+                status, error = 'ok', None
+            except Exception as e:
+                logger.warning(f"Section '{key}' failed: {e}")
+                value, status, error = None, 'error', e
+            self._finish(section, context, result, value, status, error,
+                         run_ms=(time.perf_counter() - start) * 1000)
+            done.add(key)
+
+    def _render_concurrent(self, context, result):
+        done = set()
+        pending = list(self._by_key)
+        running = {}                 # future -> key
+        submitted = {}               # key -> monotonic submit time
+        started = {}                 # key -> monotonic start time (set by the worker)
+        flags = {}                   # key -> cancellation flag seen by the worker
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-section")
+        try:
+            while pending or running:
+                for key in [k for k in pending if self._deps[k] <= done]:
+                    pending.remove(key)
+                    submitted[key] = time.monotonic()
+                    flags[key] = threading.Event()
+                    future = executor.submit(bind(self._run), self._by_key[key], context, started, flags[key])
+                    running[future] = key
+
+                now = time.monotonic()
+                waits = []
+                for key in running.values():
+                    if key in started:
+                        waits.append(started[key] + self._timeout(key) - now)
+                    else:
+                        waits.append(_POLL_SECONDS)
+                timeout = max(0.0, min(waits)) if waits else None
+                finished, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                now = time.monotonic()
+                for future in finished:
+                    key = running.pop(future)
+                    section = self._by_key[key]
+                    start = started.get(key, now)
+                    queued_ms = (start - submitted[key]) * 1000
+                    run_ms = (now - start) * 1000
+                    try:
+                        value = future.result()
+                        status, error = 'ok', None
+                    except Exception as e:
+                        logger.warning(f"Section '{key}' failed: {e}")
+                        value, status, error = None, 'error', e
+                    self._finish(section, context, result, value, status, error, queued_ms, run_ms)
+                    done.add(key)
+
+                for future, key in list(running.items()):
+                    start = started.get(key)
+                    if start is not None and now - start >= self._timeout(key):
+                        running.pop(future)
+                        flags[key].set()
+                        future.cancel()
+                        error = TimeoutError(f"section exceeded {self._timeout(key):g}s")
+                        logger.warning(f"Section '{key}' timed out after {now - start:.1f}s; using fallback")
+                        self._finish(self._by_key[key], context, result, None, 'timeout', error,
+                                     (start - submitted[key]) * 1000, (now - start) * 1000)
+                        done.add(key)
+        finally:
+            # Abandoned workers see their flag and finish in the background
+            for key in running.values():
+                flags[key].set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timeout(self, key):
+        timeout = self._by_key[key].timeout
+        return self.default_timeout if timeout is None else timeout
@@ -40,66 +40,87 @@ except ImportError as e:
         START_DATE = None
         END_DATE = None
 
-def load_content_library(app_root: str):
-    """Load content library variations from JSON file for WordPress posts only."""
-    try:
-        # Determine the actual project root based on the app_root parameter
-        # If app_root ends with 'app', then it's already pointing to the app directory
-        # If not, we assume it's the project root and look for app/content_library.json
-        
-        possible_paths = []
-        
-        # Case 1: app_root is already pointing to the app directory (from auto_publisher)
-        if os.path.basename(app_root) == 'app':
-            possible_paths.extend([
-                os.path.join(app_root, 'content_library.json'),
-                os.path.join(app_root, 'report_assets', 'content_library.json'),
-                os.path.join(app_root, 'report_assets', 'TSLA_1751805931', 'content_library.json')
-            ])
-        
-        # Case 2: app_root is the project root (from wordpress_reporter itself or other callers)
+from reporting_tools.content_templates import (
+    ContentLibrary,
+    compile_template,
+    load_content_library as load_compiled_content_library,
+)
+from reporting_tools.section_graph import Section, SectionGraph, check_cancelled
+from Models.forecast_periods import forecast_periods
+
+# app_root -> resolved content_library.json path (probing the candidates is done once)
+_content_library_paths = {}
+
+
+def _content_library_candidates(app_root: str):
+    possible_paths = []
+    
+    # Case 1: app_root is already pointing to the app directory (from auto_publisher)
+    if os.path.basename(app_root) == 'app':
         possible_paths.extend([
-            os.path.join(app_root, 'app', 'content_library.json'),
-            os.path.join(app_root, 'app', 'report_assets', 'content_library.json'),
             os.path.join(app_root, 'content_library.json'),
-            os.path.join(app_root, 'app', 'report_assets', 'TSLA_1751805931', 'content_library.json')
+            os.path.join(app_root, 'report_assets', 'content_library.json'),
+            os.path.join(app_root, 'report_assets', 'TSLA_1751805931', 'content_library.json')
         ])
-        
-        # Case 3: Try going up one directory if we're in a subdirectory like reporting_tools
-        project_root = os.path.dirname(app_root)
-        possible_paths.extend([
-            os.path.join(project_root, 'app', 'content_library.json'),
-            os.path.join(project_root, 'app', 'report_assets', 'content_library.json')
-        ])
-        
-        # Case 4: Try absolute paths from current working directory
-        cwd = os.getcwd()
-        possible_paths.extend([
-            os.path.join(cwd, 'app', 'content_library.json'),
-            os.path.join(cwd, 'content_library.json')
-        ])
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                with open(path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        
-        print(f"WARNING: content_library.json not found in expected locations. Searched paths:")
-        for path in possible_paths[:8]:  # Show first 8 paths for debugging
-            print(f"  - {path} {'✓' if os.path.exists(path) else '✗'}")
-        print("Using inline variations as fallback.")
-        return None
+    
+    # Case 2: app_root is the project root (from wordpress_reporter itself or other callers)
+    possible_paths.extend([
+        os.path.join(app_root, 'app', 'content_library.json'),
+        os.path.join(app_root, 'app', 'report_assets', 'content_library.json'),
+        os.path.join(app_root, 'content_library.json'),
+        os.path.join(app_root, 'app', 'report_assets', 'TSLA_1751805931', 'content_library.json')
+    ])
+    
+    # Case 3: Try going up one directory if we're in a subdirectory like reporting_tools
+    project_root = os.path.dirname(app_root)
+    possible_paths.extend([
+        os.path.join(project_root, 'app', 'content_library.json'),
+        os.path.join(project_root, 'app', 'report_assets', 'content_library.json')
+    ])
+    
+    # Case 4: Try absolute paths from current working directory
+    cwd = os.getcwd()
+    possible_paths.extend([
+        os.path.join(cwd, 'app', 'content_library.json'),
+        os.path.join(cwd, 'content_library.json')
+    ])
+    return possible_paths
+
+
+def load_content_library(app_root: str, seed=None):
+    """
+    Load the compiled content library (see content_templates) for WordPress posts only.
+    
+    The file location is resolved once per app_root; the library itself is
+    compiled once per process and recompiled when the file changes. Pass
+    ``seed`` for reproducible variation selection.
+    """
+    try:
+        path = _content_library_paths.get(app_root)
+        if path is None or not os.path.exists(path):
+            possible_paths = _content_library_candidates(app_root)
+            path = next((p for p in possible_paths if os.path.exists(p)), None)
+            if path is None:
+                print(f"WARNING: content_library.json not found in expected locations. Searched paths:")
+                for candidate in possible_paths[:8]:  # Show first 8 paths for debugging
+                    print(f"  - {candidate} ✗")
+                print("Using inline variations as fallback.")
+                return None
+            _content_library_paths[app_root] = path
+        return load_compiled_content_library(path, seed=seed)
     except Exception as e:
         print(f"WARNING: Error loading content_library.json: {e}. Using inline variations.")
         return None
 
 def get_variation(content_lib, section_path, fallback_list=None):
     """Get a random variation from content library path or fallback to provided list."""
+    if isinstance(content_lib, ContentLibrary):
+        return content_lib.variation(section_path, fallback_list)
     if not content_lib:
-        return random.choice(fallback_list) if fallback_list else "Content unavailable"
+        return compile_template(random.choice(fallback_list)) if fallback_list else "Content unavailable"
     
     try:
-        # Navigate through nested dict using dot notation like 'introduction.summary_sentence.intros'
+        # Raw dict: navigate using dot notation like 'introduction.summary_sentence.intros'
         keys = section_path.split('.')
         current = content_lib
         for key in keys:
@@ -113,14 +134,28 @@ def get_variation(content_lib, section_path, fallback_list=None):
             print(f"Warning: Missing content library path '{section_path}' and no fallback provided")
             return f"[Missing content: {section_path}]"
 
+def get_template(content_lib, section_path, default=None):
+    """Get the single template stored at a dotted path, or the default."""
+    if isinstance(content_lib, ContentLibrary):
+        return content_lib.template(section_path, default)
+    current = content_lib or {}
+    for key in section_path.split('.'):
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return current
+
+def render_variation(content_lib, section_path, fallback_list=None, **kwargs):
+    """Format a variation, choosing only among those whose fields are all provided."""
+    if isinstance(content_lib, ContentLibrary):
+        return content_lib.render(section_path, fallback_list, **kwargs)
+    return safe_format(get_variation(content_lib, section_path, fallback_list), **kwargs)
+
 def safe_format(template_string, **kwargs):
     """Safely format a string, handling missing variables gracefully."""
-    try:
-        return template_string.format(**kwargs)
-    except KeyError as e:
-        # Log the missing variable and return the template with placeholder
-        print(f"Warning: Missing template variable {e} in: {template_string}")
-        return template_string.replace(f"{{{e}}}", f"[{e}]")
+    if not isinstance(template_string, str):
+        return str(template_string)
+    return compile_template(template_string).format(**kwargs)
 
 def validate_content_library(content_library, required_sections=None):
     """Validate that content library has all required sections."""
@@ -349,7 +384,7 @@ def generate_wordpress_introduction_html(ticker, rdata, content_library=None):
             ['What\'s Inside This Analysis?']).format(ticker=ticker)
         
         # Momentum base sentence using content library
-        momentum_base = content_library.get('introduction', {}).get('momentum', {}).get('base', 
+        momentum_base = get_template(content_library, 'introduction.momentum.base', 
             'The stock is currently {trading_verb} at <strong>{current_price_fmt}</strong> (as of {last_date_fmt}), and it\'s {momentum_phrase}.')
         momentum_sentence = momentum_base.format(
             trading_verb=trading_verb,
@@ -481,7 +516,7 @@ def generate_wordpress_metrics_summary_html(ticker, rdata, content_library=None)
         position_verb = get_variation(content_library, 'metrics_summary.paragraph1.technical_pattern.position_verbs', ['positioned'])
         
         # Technical pattern base using content library
-        technical_base = content_library.get('metrics_summary', {}).get('paragraph1', {}).get('technical_pattern', {}).get('base', 
+        technical_base = get_template(content_library, 'metrics_summary.paragraph1.technical_pattern.base', 
             'The technical indicators are showing a <strong>{technical_pattern_text}</strong>, as the price is {position_verb} relative to the {sma50_fmt} (50-day) and {sma200_fmt} (200-day) moving averages.')
         technical_sentence = technical_base.format(
             technical_pattern_text=technical_pattern_text,
@@ -555,7 +590,7 @@ def generate_wordpress_metrics_summary_html(ticker, rdata, content_library=None)
             high_52wk_fmt=hc.format_html_value(high_52wk_val, 'currency', ticker=ticker)
         )
         
-        range_analysis_base = content_library.get('metrics_summary', {}).get('paragraph2', {}).get('range_analysis', {}).get('base',
+        range_analysis_base = get_template(content_library, 'metrics_summary.paragraph2.range_analysis.base',
             'This tells us two things: first, {recovery_status_text}, and second, {range_position_text}, {implication_phrase}.')
         implication_phrase_range = get_variation(content_library, 'metrics_summary.paragraph2.range_analysis.implications',
             ['meaning big swings are less likely without a major catalyst'])
@@ -571,7 +606,7 @@ def generate_wordpress_metrics_summary_html(ticker, rdata, content_library=None)
         growth_desc = get_variation(content_library, 'metrics_summary.paragraph2.forecast.growth_descs', ['modest growth'])
         target_type = get_variation(content_library, 'metrics_summary.paragraph2.forecast.target_types', ['1-year target'])
         
-        forecast_base = content_library.get('metrics_summary', {}).get('paragraph2', {}).get('forecast', {}).get('base',
+        forecast_base = get_template(content_library, 'metrics_summary.paragraph2.forecast.base',
             '{analyst_verb} {growth_desc} ahead, with a {target_type} of <strong>{target_fmt} ({target_pct_fmt})</strong>.')
         forecast_text = forecast_base.format(
             analyst_verb=analyst_verb,
@@ -590,7 +625,7 @@ def generate_wordpress_metrics_summary_html(ticker, rdata, content_library=None)
         if short_float_val and short_float_val > 5.0:
             investor_bets_text = "a notable number of investors are betting on a price decline"
 
-        ownership_base = content_library.get('metrics_summary', {}).get('paragraph2', {}).get('ownership', {}).get('base',
+        ownership_base = get_template(content_library, 'metrics_summary.paragraph2.ownership.base',
             'Furthermore, with <strong>{inst_own_fmt} institutional ownership</strong> and {short_interest_desc} ({short_float_fmt}), it seems {investor_bets_text}.')
         ownership_text = ownership_base.format(
             inst_own_fmt=inst_own_fmt,
@@ -4421,12 +4456,12 @@ def generate_wordpress_analyst_insights_html(ticker, rdata, content_library=None
         elif recommendation.lower() in ['sell', 'underperform']:
             rec_key = "sell"
 
-        recommendation_analysis = safe_format(get_variation(content_library, f'analysts_insights.recommendation_analysis.{rec_key}',
-            [f'The consensus recommendation reflects confidence in {ticker}\'s prospects']), ticker=ticker, recommendation=recommendation)
+        recommendation_analysis = render_variation(content_library, f'analysts_insights.recommendation_analysis.{rec_key}',
+            [f'The consensus recommendation reflects confidence in {ticker}\'s prospects'], ticker=ticker, recommendation=recommendation)
 
         # Analyst count context
-        analyst_count_context = safe_format(get_variation(content_library, 'analysts_insights.analyst_count_context',
-            [f'This consensus is based on input from {num_analysts_fmt} analysts']), num_analysts_fmt=num_analysts_fmt)
+        analyst_count_context = render_variation(content_library, 'analysts_insights.analyst_count_context',
+            [f'This consensus is based on input from {num_analysts_fmt} analysts'], num_analysts_fmt=num_analysts_fmt)
 
         # Target price analysis
         target_key = "near_current"
@@ -5043,7 +5078,91 @@ def generate_wordpress_faq_html(ticker, rdata, content_library=None):
         </div>
         """
 
-def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report_sections_to_include: list):
+# Section key -> (<h2> title or None, WordPress builder, report context keys the section reads)
+WORDPRESS_SECTION_BUILDERS = {
+    "introduction": (None, generate_wordpress_introduction_html,
+                     ('profile_data', 'detailed_ta_data', 'analyst_info_data', 'financial_health_data', 'profitability_data')),
+    "metrics_summary": ("Key Metrics Summary", generate_wordpress_metrics_summary_html,
+                        ('detailed_ta_data', 'analyst_info_data', 'share_statistics_data', 'short_selling_data', 'historical_data')),
+    "total_valuation": ("Total Valuation", generate_wordpress_total_valuation_html,
+                        ('total_valuation_data', 'financial_health_data', 'dividends_data')),
+    "conclusion_outlook": ("Conclusion and Outlook", generate_wordpress_conclusion_outlook_html,
+                           ('detailed_ta_data', 'financial_health_data', 'profitability_data', 'valuation_data', 'sentiment')),
+    "detailed_forecast_table": ("Detailed Forecast Table", generate_wordpress_detailed_forecast_table_html,
+                                ('monthly_forecast_table_data', 'current_price')),
+    "company_profile": (None, generate_wordpress_company_profile_html, ('profile_data',)),
+    "valuation_metrics": ("Valuation Metrics", generate_wordpress_valuation_metrics_html,
+                          ('valuation_data', 'total_valuation_data')),
+    "analyst_insights": ("Analyst Insights", generate_wordpress_analyst_insights_html, ('analyst_info_data', 'current_price')),
+    "financial_health": ("Financial Health", generate_wordpress_financial_health_html, ('financial_health_data',)),
+    "financial_efficiency": ("Financial Efficiency", generate_wordpress_financial_efficiency_html, ('financial_efficiency_data',)),
+    "profitability_growth": ("Profitability and Growth", generate_wordpress_profitability_growth_html, ('profitability_data',)),
+    "dividends_shareholder_returns": ("Dividends and Shareholder Returns", generate_wordpress_dividends_shareholder_returns_html,
+                                      ('dividends_data',)),
+    "share_statistics": ("Share Statistics", generate_wordpress_share_statistics_html,
+                         ('share_statistics_data', 'short_selling_data')),
+    "stock_price_statistics": ("Stock Price Statistics", generate_wordpress_stock_price_statistics_html,
+                               ('stock_price_stats_data', 'volatility')),
+    "short_selling_info": ("Short Selling Information", generate_wordpress_short_selling_info_html, ('short_selling_data',)),
+    "technical_analysis_summary": ("Technical Analysis Summary", generate_wordpress_technical_analysis_summary_html,
+                                   ('detailed_ta_data', 'current_price')),
+    "historical_performance": ("Historical Performance", generate_wordpress_historical_performance_html, ('historical_data',)),
+    "peer_comparison": ("Peer Comparison",
+                        lambda ticker, rdata, content_library: generate_wordpress_peer_comparison_html(
+                            rdata.get('peer_comparison_data', {}), ticker, content_library),
+                        ('peer_comparison_data',)),
+    "risk_factors": ("Risk Factors", generate_wordpress_risk_factors_html, ('risk_items', 'industry', 'sector')),
+    "faq": ("Frequently Asked Questions", generate_wordpress_faq_html, ('current_price', 'profile_data')),
+}
+
+def _wordpress_section(section_key, ticker, content_library):
+    """
+    Section graph node rendering one report section with its <section> wrapper.
+    
+    html_components generators called for the section (fallbacks and generic
+    sections) render their metrics tables with the WordPress variant, using
+    the section's own content library.
+    """
+    section_library = content_library.for_section(section_key) if isinstance(content_library, ContentLibrary) else content_library
+    if section_key in WORDPRESS_SECTION_BUILDERS:
+        title, builder, inputs = WORDPRESS_SECTION_BUILDERS[section_key]
+        opening = [f"<section id='{section_key}'>"] + ([f"<h2>{title}</h2>"] if title else [])
+        
+        def build(context):
+            return builder(ticker, context, section_library)
+    elif section_key == "report_info_disclaimer":
+        # Requires generation_time parameter
+        inputs = ()
+        opening = [f"<section id='{section_key}'><h2>Report Information and Disclaimer</h2>"]
+        
+        def build(context):
+            return ALL_REPORT_SECTIONS[section_key](datetime.now())
+    else:
+        # Generic fallback for any remaining sections (html_components generators)
+        inputs = ()
+        opening = [f"<section id='{section_key}'><h2>{section_key.replace('_', ' ').title()}</h2>"]
+        
+        def build(context):
+            return ALL_REPORT_SECTIONS[section_key](ticker, context)
+    
+    def metrics_table(metrics, table_ticker=None):
+        return generate_wordpress_metrics_section_content(metrics, table_ticker, section_library)
+    
+    def render(context):
+        check_cancelled()
+        if section_library:
+            with hc.metrics_section_renderer(metrics_table):
+                body = build(context)
+        else:
+            body = build(context)
+        check_cancelled()
+        return "\n".join(opening + [body, "</section>"])
+    
+    return Section(section_key, render, inputs=inputs,
+                   fallback="\n".join(opening + ["<p>Section temporarily unavailable.</p>", "</section>"]))
+
+def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report_sections_to_include: list,
+                              variation_seed=None):
     """
     Generates a site-specific HTML report and CSS for a given stock ticker.
     Args:
@@ -5051,6 +5170,7 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
         ticker (str): Stock ticker symbol.
         app_root (str): Root path of the application (for accessing static files if needed).
         report_sections_to_include (list): A list of section keys (strings) to include in the report.
+        variation_seed (int, optional): Seed for content library variation selection (reproducible output).
     Returns:
         tuple: (rdata_dict, html_content, css_content)
     """
@@ -5069,7 +5189,7 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
     try:
         # --- 0. Load Content Library for WordPress Variations ---
         print("Step 0: Loading content library for WordPress variations...")
-        content_library = load_content_library(app_root)
+        content_library = load_content_library(app_root, seed=variation_seed)
         if content_library:
             print("✅ Content library loaded successfully")
         else:
@@ -5090,7 +5210,7 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
 
         # --- 2. Data Preprocessing (Same as before) ---
         print("Step 2: Preprocessing data...")
-        processed_data = preprocess_data(stock_data, macro_data)
+        processed_data = preprocess_data(stock_data, macro_data, ticker=ticker)
         if processed_data is None or processed_data.empty: raise ValueError("Preprocessing resulted in empty data.")
 
         # --- 3. Prophet Model Training (Same as before) ---
@@ -5155,8 +5275,11 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
         rdata['historical_data'] = processed_data
         rdata['actual_data'] = actual_df
         rdata['monthly_forecast_table_data'] = forecast_df
+        periods = forecast_periods(forecast_df)
         # ... (rest of rdata population as in your existing script, including period_label, forecast_1m/1y, TA calculations, sentiment, risk etc.)
-        if not forecast_df.empty and isinstance(forecast_df['Period'].iloc[0], str):
+        if periods is not None:
+             rdata['period_label'] = periods.period_label; rdata['time_col'] = 'Period'
+        elif not forecast_df.empty and isinstance(forecast_df['Period'].iloc[0], str):
              period_str = forecast_df['Period'].iloc[0]
              if re.match(r'\d{4}-\d{2}-\d{2}', period_str): rdata['period_label'] = 'Day'; rdata['time_col']='Period'
              elif re.match(r'\d{4}-\d{2}', period_str): rdata['period_label'] = 'Month'; rdata['time_col']='Period'
@@ -5166,26 +5289,30 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
 
         if not forecast_df.empty:
             try:
-                # Ensure 'ds' is datetime for proper comparison
-                if rdata['period_label']=='Month':
-                    forecast_df['ds'] = pd.to_datetime(forecast_df['Period'].astype(str) + '-01')
-                else: # Assuming 'Day' or other directly convertible format
-                    forecast_df['ds'] = pd.to_datetime(forecast_df['Period'].astype(str))
-
                 one_month_target_date = pd.to_datetime(rdata['last_date']) + timedelta(days=30)
                 one_year_target_date = pd.to_datetime(rdata['last_date']) + timedelta(days=365)
-                
-                forecast_df_sorted = forecast_df.sort_values('ds')
-                
-                month_row_idx = (forecast_df_sorted['ds'] - one_month_target_date).abs().argsort()[:1]
-                year_row_idx = (forecast_df_sorted['ds'] - one_year_target_date).abs().argsort()[:1]
 
-                month_row = forecast_df_sorted.iloc[month_row_idx]
-                year_row = forecast_df_sorted.iloc[year_row_idx]
-                
-                rdata['forecast_1m'] = month_row['Average'].iloc[0] if not month_row.empty else None
-                rdata['forecast_1y'] = year_row['Average'].iloc[0] if not year_row.empty else None
-                
+                if periods is not None:
+                    rdata['forecast_1m'] = periods.value_near(one_month_target_date)
+                    rdata['forecast_1y'] = periods.value_near(one_year_target_date)
+                else:
+                    # Ensure 'ds' is datetime for proper comparison
+                    if rdata['period_label']=='Month':
+                        forecast_df['ds'] = pd.to_datetime(forecast_df['Period'].astype(str) + '-01')
+                    else: # Assuming 'Day' or other directly convertible format
+                        forecast_df['ds'] = pd.to_datetime(forecast_df['Period'].astype(str))
+
+                    forecast_df_sorted = forecast_df.sort_values('ds')
+
+                    month_row_idx = (forecast_df_sorted['ds'] - one_month_target_date).abs().argsort()[:1]
+                    year_row_idx = (forecast_df_sorted['ds'] - one_year_target_date).abs().argsort()[:1]
+
+                    month_row = forecast_df_sorted.iloc[month_row_idx]
+                    year_row = forecast_df_sorted.iloc[year_row_idx]
+
+                    rdata['forecast_1m'] = month_row['Average'].iloc[0] if not month_row.empty else None
+                    rdata['forecast_1y'] = year_row['Average'].iloc[0] if not year_row.empty else None
+
                 if rdata['forecast_1y'] and rdata['current_price'] and rdata['current_price'] > 0:
                      rdata['overall_pct_change'] = ((rdata['forecast_1y'] - rdata['current_price']) / rdata['current_price']) * 100
                 else: rdata['overall_pct_change'] = 0.0
@@ -5207,7 +5334,6 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
         rdata['analyst_info_data'] = fa.extract_analyst_info(fundamentals)
         rdata['stock_price_stats_data'] = fa.extract_stock_price_stats_data(fundamentals)
         rdata['short_selling_data'] = fa.extract_short_selling_data(fundamentals)
-        rdata['peer_comparison_data'] = fa.extract_peer_comparison_data(ticker)
         rdata['industry'] = fundamentals.get('info', {}).get('industry', 'N/A')
         rdata['sector'] = fundamentals.get('info', {}).get('sector', 'N/A')
 
@@ -5258,168 +5384,28 @@ def generate_wordpress_report(site_name: str, ticker: str, app_root: str, report
         # --- 6. Generate HTML Report Parts (CONDITIONAL ASSEMBLY) ---
         print("Step 6: Generating HTML content based on selected sections...")
         
-        # Temporarily replace the metrics section content function with WordPress version
-        original_generate_metrics_section_content = hc.generate_metrics_section_content
-        if content_library:
-            hc.generate_metrics_section_content = lambda metrics, ticker=None: generate_wordpress_metrics_section_content(metrics, ticker, content_library)
-        
-        try:
-            for section_key in report_sections_to_include:
-                generator_func = ALL_REPORT_SECTIONS.get(section_key)
-                if generator_func:
-                    # Handle sections that depend on data existence (e.g., forecast table)
-                    if section_key == "detailed_forecast_table" and (forecast_df is None or forecast_df.empty):
-                        print(f"Skipping section '{section_key}' as forecast data is not available.")
-                        continue
-                    
-                    # Special handling for introduction - no h2 header, use content library
-                    if section_key == "introduction":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append(generate_wordpress_introduction_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for metrics_summary - use content library
-                    elif section_key == "metrics_summary":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Key Metrics Summary</h2>")
-                        html_report_parts.append(generate_wordpress_metrics_summary_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for total_valuation - use content library
-                    elif section_key == "total_valuation":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Total Valuation</h2>")
-                        html_report_parts.append(generate_wordpress_total_valuation_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for conclusion_outlook - use content library
-                    elif section_key == "conclusion_outlook":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Conclusion and Outlook</h2>")
-                        html_report_parts.append(generate_wordpress_conclusion_outlook_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for detailed_forecast_table - use content library
-                    elif section_key == "detailed_forecast_table":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Detailed Forecast Table</h2>")
-                        html_report_parts.append(generate_wordpress_detailed_forecast_table_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for company_profile - use content library
-                    elif section_key == "company_profile":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append(generate_wordpress_company_profile_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for valuation_metrics - use content library
-                    elif section_key == "valuation_metrics":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Valuation Metrics</h2>")
-                        html_report_parts.append(generate_wordpress_valuation_metrics_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for analyst_insights - use content library
-                    elif section_key == "analyst_insights":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Analyst Insights</h2>")
-                        html_report_parts.append(generate_wordpress_analyst_insights_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for analyst_insights - use content library
-                    elif section_key == "analyst_insights":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Analyst Insights</h2>")
-                        html_report_parts.append(generate_wordpress_analyst_insights_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for financial_health - use content library
-                    elif section_key == "financial_health":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Financial Health</h2>")
-                        html_report_parts.append(generate_wordpress_financial_health_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for financial_efficiency - use content library
-                    elif section_key == "financial_efficiency":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Financial Efficiency</h2>")
-                        html_report_parts.append(generate_wordpress_financial_efficiency_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for profitability_growth - use content library
-                    elif section_key == "profitability_growth":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Profitability and Growth</h2>")
-                        html_report_parts.append(generate_wordpress_profitability_growth_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for dividends_shareholder_returns - use content library
-                    elif section_key == "dividends_shareholder_returns":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Dividends and Shareholder Returns</h2>")
-                        html_report_parts.append(generate_wordpress_dividends_shareholder_returns_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for share_statistics - use content library
-                    elif section_key == "share_statistics":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Share Statistics</h2>")
-                        html_report_parts.append(generate_wordpress_share_statistics_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for stock_price_statistics - use content library
-                    elif section_key == "stock_price_statistics":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Stock Price Statistics</h2>")
-                        html_report_parts.append(generate_wordpress_stock_price_statistics_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for short_selling_info - use content library
-                    elif section_key == "short_selling_info":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Short Selling Information</h2>")
-                        html_report_parts.append(generate_wordpress_short_selling_info_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for technical_analysis_summary - use content library
-                    elif section_key == "technical_analysis_summary":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Technical Analysis Summary</h2>")
-                        html_report_parts.append(generate_wordpress_technical_analysis_summary_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for historical_performance - use content library
-                    elif section_key == "historical_performance":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Historical Performance</h2>")
-                        html_report_parts.append(generate_wordpress_historical_performance_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for peer_comparison - use content library
-                    elif section_key == "peer_comparison":
-                        peer_data = rdata.get('peer_comparison_data', {})
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Peer Comparison</h2>")
-                        html_report_parts.append(generate_wordpress_peer_comparison_html(peer_data, ticker, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for risk_factors - use content library
-                    elif section_key == "risk_factors":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Risk Factors</h2>")
-                        html_report_parts.append(generate_wordpress_risk_factors_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for faq - use content library
-                    elif section_key == "faq":
-                        html_report_parts.append(f"<section id='{section_key}'>")
-                        html_report_parts.append("<h2>Frequently Asked Questions</h2>")
-                        html_report_parts.append(generate_wordpress_faq_html(ticker, rdata, content_library))
-                        html_report_parts.append("</section>")
-                    # Special handling for report_info_disclaimer - requires generation_time parameter
-                    elif section_key == "report_info_disclaimer":
-                        from datetime import datetime
-                        section_title = "Report Information and Disclaimer"
-                        html_report_parts.append(f"<section id='{section_key}'><h2>{section_title}</h2>")
-                        html_report_parts.append(generator_func(datetime.now())) # Pass generation time
-                        html_report_parts.append("</section>")
-                    else:
-                        # Generic fallback for any remaining sections
-                        section_title = section_key.replace("_", " ").title()
-                        html_report_parts.append(f"<section id='{section_key}'><h2>{section_title}</h2>")
-                        try:
-                            html_report_parts.append(generator_func(ticker, rdata)) # Call the function from html_components
-                        except Exception as e:
-                            print(f"Error generating section '{section_key}': {e}")
-                            html_report_parts.append(f"<p>Section temporarily unavailable.</p>")
-                        html_report_parts.append("</section>")
-                else:
-                    print(f"Warning: Unknown report section key '{section_key}'. Skipping.")
-        
-        finally:
-            # Restore the original function
-            hc.generate_metrics_section_content = original_generate_metrics_section_content
+        sections = []
+        for section_key in dict.fromkeys(report_sections_to_include):
+            if section_key not in ALL_REPORT_SECTIONS:
+                print(f"Warning: Unknown report section key '{section_key}'. Skipping.")
+                continue
+            # Handle sections that depend on data existence (e.g., forecast table)
+            if section_key == "detailed_forecast_table" and (forecast_df is None or forecast_df.empty):
+                print(f"Skipping section '{section_key}' as forecast data is not available.")
+                continue
+            if section_key == "peer_comparison":
+                # Network-bound; fetched alongside the other sections instead of during data preparation
+                sections.append(Section(
+                    'peer_comparison_data',
+                    lambda context: {'peer_comparison_data': fa.extract_peer_comparison_data(ticker)},
+                    outputs=('peer_comparison_data',),
+                    fallback={'peer_comparison_data': {}},
+                ))
+            sections.append(_wordpress_section(section_key, ticker, content_library))
+        
+        rendered = SectionGraph(sections, name='wordpress_report').render(rdata)
+        html_report_parts.extend(rendered.html.values())
+        rdata['section_timings'] = rendered.timings
         
         # --- 7. Assemble Final HTML (Same as before) ---
         print("Step 7: Assembling final HTML...")
@@ -0,0 +1,210 @@
+"""
+Minimal in-memory stand-in for the parts of the Firestore client the services use
+
+Documents live in a dict keyed by path tuple. Batches and transactions buffer
+their writes and apply them on commit; a transaction function that raises
+commits nothing. ``install(monkeypatch)`` exposes a matching
+``firebase_admin.firestore`` module (FieldPath, Increment, ArrayUnion,
+ArrayRemove, DELETE_FIELD, SERVER_TIMESTAMP, transactional) for code that
+imports it lazily, plus the ``google.cloud.firestore_v1`` names used in type
+hints and queries (FieldFilter, Transaction).
+"""
+
+import sys
+import types
+from copy import deepcopy
+
+SERVER_TIMESTAMP = 'SERVER_TIMESTAMP'
+DELETE_FIELD = object()
+
+
+class FieldPath:
+    def __init__(self, *parts):
+        self.parts = parts
+
+    def to_api_repr(self):
+        return '.'.join(self.parts)
+
+
+class Increment:
+    def __init__(self, value):
+        self.value = value
+
+
+class ArrayUnion:
+    def __init__(self, values):
+        self.values = list(values)
+
+
+class ArrayRemove:
+    def __init__(self, values):
+        self.values = list(values)
+
+
+def _resolve(current, value):
+    if isinstance(value, Increment):
+        return (current or 0) + value.value
+    if isinstance(value, ArrayUnion):
+        current = list(current or [])
+        return current + [item for item in value.values if item not in current]
+    if isinstance(value, ArrayRemove):
+        return [item for item in (current or []) if item not in value.values]
+    return deepcopy(value)
+
+
+def _merge(doc, data):
+    for key, value in data.items():
+        if value is DELETE_FIELD:
+            doc.pop(key, None)
+        elif isinstance(value, dict):
+            target = doc.get(key)
+            if not isinstance(target, dict):
+                target = doc[key] = {}
+            _merge(target, value)
+        else:
+            doc[key] = _resolve(doc.get(key), value)
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = deepcopy(data)
+
+    def to_dict(self):
+        return deepcopy(self._data)
+
+
+class DocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.id = path[-1]
+
+    def collection(self, name):
+        return CollectionReference(self._client, self.path + (name,))
+
+    def get(self, field_paths=None, transaction=None):
+        self._client.reads += 1
+        return DocumentSnapshot(self, self._client.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        docs = self._client.docs
+        if not merge or self.path not in docs:
+            docs[self.path] = {}
+        _merge(docs[self.path], data)
+
+    def update(self, data):
+        doc = self._client.docs[self.path]
+        for dotted, value in data.items():
+            *parents, leaf = dotted.split('.')
+            target = doc
+            for part in parents:
+                target = target.setdefault(part, {})
+            if value is DELETE_FIELD:
+                target.pop(leaf, None)
+            else:
+                target[leaf] = _resolve(target.get(leaf), value)
+
+    def delete(self):
+        self._client.docs.pop(self.path, None)
+
+
+class CollectionReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+
+    def document(self, doc_id):
+        return DocumentReference(self._client, self.path + (doc_id,))
+
+    def list_documents(self):
+        return [DocumentReference(self._client, path) for path in list(self._client.docs)
+                if path[:-1] == self.path]
+
+    def stream(self):
+        self._client.streams += 1
+        return [DocumentSnapshot(ref, self._client.docs[ref.path]) for ref in self.list_documents()]
+
+
+class WriteBatch:
+    def __init__(self):
+        self._writes = []
+
+    def set(self, ref, data, merge=False):
+        self._writes.append(lambda: ref.set(data, merge=merge))
+
+    def update(self, ref, data):
+        self._writes.append(lambda: ref.update(data))
+
+    def delete(self, ref):
+        self._writes.append(ref.delete)
+
+    def commit(self):
+        for write in self._writes:
+            write()
+        self._writes = []
+
+
+class Transaction(WriteBatch):
+    pass
+
+
+def transactional(func):
+    def run(transaction, *args, **kwargs):
+        result = func(transaction, *args, **kwargs)
+        transaction.commit()
+        return result
+    return run
+
+
+class FieldFilter:
+    def __init__(self, field_path, op_string, value):
+        self.field_path = field_path
+        self.op_string = op_string
+        self.value = value
+
+
+class FakeFirestore:
+    """In-memory client; ``reads`` / ``streams`` count document reads and collection scans"""
+
+    def __init__(self):
+        self.docs = {}
+        self.reads = 0
+        self.streams = 0
+
+    def collection(self, name):
+        return CollectionReference(self, (name,))
+
+    def batch(self):
+        return WriteBatch()
+
+    def transaction(self):
+        return Transaction()
+
+    def get_all(self, refs):
+        return [ref.get() for ref in refs]
+
+    def doc(self, *path):
+        return self.docs.get(tuple(path))
+
+
+def install(monkeypatch):
+    """Make ``from firebase_admin import firestore`` resolve to this module's fakes"""
+    firestore = types.ModuleType('firebase_admin.firestore')
+    for name in ('FieldPath', 'Increment', 'ArrayUnion', 'ArrayRemove', 'DELETE_FIELD',
+                 'SERVER_TIMESTAMP', 'transactional'):
+        setattr(firestore, name, globals()[name])
+    package = types.ModuleType('firebase_admin')
+    package.firestore = firestore
+    monkeypatch.setitem(sys.modules, 'firebase_admin', package)
+    monkeypatch.setitem(sys.modules, 'firebase_admin.firestore', firestore)
+    firestore_v1 = types.ModuleType('google.cloud.firestore_v1')
+    firestore_v1.FieldFilter = FieldFilter
+    firestore_v1.Transaction = Transaction
+    for name in ('google', 'google.cloud'):
+        if name not in sys.modules:
+            monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+    monkeypatch.setitem(sys.modules, 'google.cloud.firestore_v1', firestore_v1)
+    return FakeFirestore()
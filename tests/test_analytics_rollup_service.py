@@ -0,0 +1,196 @@
+"""
+Tests for the analytics rollup service using the in-memory store
+(no Firestore or emulator required).
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.analytics_rollup_service import (
+    AnalyticsRollupService,
+    InMemoryRollupStore,
+    BUCKET_DAILY,
+    BUCKET_TICKERS,
+    BUCKET_YEARLY,
+    TOTALS_PATH,
+    set_rollup_service,
+)
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class _FakeSnapshot:
+    def __init__(self, data):
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _FakeQuery:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def select(self, fields):
+        return _FakeQuery([{k: v for k, v in row.items() if k in fields} for row in self._rows])
+
+    def stream(self):
+        return [_FakeSnapshot(row) for row in self._rows]
+
+
+class _FakeDb:
+    """Just enough of a Firestore client for AnalyticsRollupService.rebuild"""
+
+    def __init__(self, collections):
+        self._collections = collections
+
+    def collection(self, name):
+        return _FakeQuery(self._collections.get(name, []))
+
+
+REPORTS = [
+    {'user_uid': 'u1', 'ticker': 'AAPL', 'storage_type': 'firestore', 'generated_at': _utc(2025, 12, 31, 23, 0)},
+    {'user_uid': 'u1', 'ticker': 'aapl', 'storage_type': 'storage', 'generated_at': _utc(2026, 1, 2, 9, 0)},
+    {'user_uid': 'u2', 'ticker': 'MSFT', 'storage_type': 'firestore', 'generated_at': _utc(2026, 1, 2, 17, 30)},
+]
+FAILURES = [
+    {'user_id': 'u2', 'ticker': 'XYZ', 'timestamp': int(_utc(2026, 1, 2, 12, 0).timestamp())},
+]
+ARTICLES = [
+    {'user_uid': 'u1', 'ticker': 'AAPL', 'article_type': 'stock', 'published_at': _utc(2026, 1, 3, 8, 0)},
+]
+
+
+def _record_all(service):
+    for row in REPORTS:
+        assert service.record_report_generated(row['user_uid'], row['ticker'], row['storage_type'], row['generated_at'])
+    for row in FAILURES:
+        assert service.record_failed_analysis(row['user_id'], row['ticker'], row['timestamp'])
+    for row in ARTICLES:
+        assert service.record_article_published(row['user_uid'], row['ticker'], row['article_type'], row['published_at'])
+
+
+@pytest.fixture
+def service():
+    return AnalyticsRollupService(store=InMemoryRollupStore())
+
+
+def test_events_update_totals_and_time_buckets(service):
+    _record_all(service)
+
+    totals = service.get_totals()
+    assert totals['reports_generated'] == 3
+    assert totals['failed_analyses'] == 1
+    assert totals['articles_published'] == 1
+    assert totals['storage_breakdown'] == {'firestore': 2, 'storage': 1}
+
+    day = service.get_day(_utc(2026, 1, 2))
+    assert day['reports_generated'] == 2
+    assert day['failed_analyses'] == 1
+    assert day['users'] == {'u1': 1, 'u2': 1}
+    assert day['period'] == '2026-01-02'
+
+    series = service.get_daily_series(days=3, end=_utc(2026, 1, 2))
+    assert [key for key, _ in series] == ['2025-12-31', '2026-01-01', '2026-01-02']
+    assert [doc.get('reports_generated', 0) for _, doc in series] == [1, 0, 2]
+
+
+def test_yearly_rollup_holds_reports_by_day(service):
+    _record_all(service)
+
+    assert service.get_year(2025)['reports_by_day'] == {'2025-12-31': 1}
+    year_2026 = service.get_year(2026)
+    assert year_2026['reports_by_day'] == {'2026-01-02': 2}
+    assert year_2026['reports_generated'] == 2
+    # Per-user maps are kept on short buckets only, not on yearly documents
+    assert 'users' not in year_2026
+    assert service.get_latest_period(BUCKET_YEARLY) == '2026'
+
+
+def test_ticker_rollups(service):
+    _record_all(service)
+
+    assert service.get_top_tickers('reports_generated', 5) == [('AAPL', 2), ('MSFT', 1)]
+    assert service.get_top_tickers('failed_analyses', 5) == [('XYZ', 1)]
+    assert service.count_tickers() == 3
+
+
+def test_rebuild_matches_incremental_recording(service):
+    _record_all(service)
+    incremental = service.store.get_many([TOTALS_PATH, (BUCKET_DAILY, '2026-01-02'),
+                                          (BUCKET_YEARLY, '2026'), (BUCKET_TICKERS, 'AAPL')])
+
+    rebuilt_service = AnalyticsRollupService(store=InMemoryRollupStore())
+    db = _FakeDb({'userGeneratedReports': REPORTS, 'failed_analyses': FAILURES, 'userPublishedArticles': ARTICLES})
+    result = rebuilt_service.rebuild(db=db)
+
+    assert result['events'] == {'reports': 3, 'failed_analyses': 1, 'published_articles': 1}
+    assert rebuilt_service.store.get_many(list(incremental)) == incremental
+
+
+def test_rebuild_dry_run_does_not_write(service):
+    db = _FakeDb({'userGeneratedReports': REPORTS})
+    result = service.rebuild(db=db, dry_run=True)
+
+    assert result['dry_run'] is True
+    assert result['rollup_documents'] > 0
+    assert service.get_totals() == {}
+
+
+def test_activity_heatmap_reads_yearly_rollup(service):
+    # The dashboard module needs the web stack; the rollup service itself does not
+    pytest.importorskip('flask')
+    pytest.importorskip('pandas')
+    from analysis_scripts.firestore_dashboard_analytics import FirestoreDashboardAnalytics
+
+    _record_all(service)
+    set_rollup_service(service)
+    try:
+        analytics = FirestoreDashboardAnalytics()
+        assert analytics.get_activity_heatmap(2025) == {
+            'heatmap': {'2025-12-31': 1}, 'has_data': True, 'year': 2025
+        }
+        # Years without data fall back to the latest year that has data
+        assert analytics.get_activity_heatmap(2019)['year'] == 2026
+    finally:
+        set_rollup_service(None)
+
+
+def test_rebuild_retries_when_events_arrive_meanwhile(service):
+    late = {'user_uid': 'u3', 'ticker': 'NVDA', 'storage_type': 'firestore', 'generated_at': _utc(2026, 1, 4, 10, 0)}
+    reports = list(REPORTS)
+
+    class _RacingDb(_FakeDb):
+        """Records one more report (raw document + event) while the first rebuild is reading"""
+        raced = False
+
+        def collection(self, name):
+            if name == 'userGeneratedReports' and not self.raced:
+                self.raced = True
+                rows = list(reports)
+                reports.append(late)
+                service.record_report_generated(late['user_uid'], late['ticker'],
+                                                late['storage_type'], late['generated_at'])
+                return _FakeQuery(rows)
+            return _FakeQuery(reports if name == 'userGeneratedReports' else [])
+
+    result = service.rebuild(db=_RacingDb({}))
+
+    assert result['written'] is True
+    assert result['attempts'] == 2
+    assert result['events']['reports'] == 4
+    assert service.get_totals()['reports_generated'] == 4
+
+
+def test_weekly_and_monthly_rollups_keep_no_per_user_maps(service):
+    _record_all(service)
+
+    assert service.get_day(_utc(2026, 1, 3))['publishers'] == {'u1': 1}
+    _, week = service.get_weekly_series(weeks=1, end=_utc(2026, 1, 3))[0]
+    _, month = service.get_monthly_series(months=1, end=_utc(2026, 1, 3))[0]
+    for doc in (week, month):
+        assert doc['articles_published'] == 1
+        assert 'users' not in doc and 'publishers' not in doc
@@ -0,0 +1,56 @@
+"""
+Golden tests for article post-processing: the single-parse engine against
+recorded articles and the string/regex implementation it replaced
+"""
+
+import datetime
+import glob
+import os
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('google.generativeai')
+
+from benchmarks import article_postprocess
+from gemini_article_system import article_postprocessor
+
+ARTICLES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'articles')
+ARTICLES = sorted(path for path in glob.glob(os.path.join(ARTICLES_DIR, '*.html'))
+                  if not path.endswith('.expected.html'))
+
+
+class _FrozenDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 15, 9, 30)
+
+
+@pytest.fixture(autouse=True)
+def frozen_date(monkeypatch):
+    # The article header carries the publish date
+    monkeypatch.setattr(article_postprocessor, 'datetime', _FrozenDatetime)
+    monkeypatch.setattr(article_postprocess, 'datetime', _FrozenDatetime)
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=os.path.basename)
+def test_article_matches_recorded_output(path):
+    raw = _read(path)
+    expected = _read(path[:-len('.html')] + '.expected.html')
+
+    html, _ = article_postprocessor.post_process_article(raw, article_postprocess.TICKER,
+                                                         article_postprocess.COMPANY_NAME)
+    assert html == expected
+
+
+@pytest.mark.parametrize('path', ARTICLES, ids=os.path.basename)
+def test_article_matches_previous_implementation(path):
+    result = article_postprocess.compare_article(os.path.basename(path), _read(path))
+
+    assert result['outcome'] in ('identical', 'whitespace'), '\n'.join(result['diff'])
+    assert result['metadata'] == {}
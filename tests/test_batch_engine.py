@@ -0,0 +1,71 @@
+"""
+Tests for the earnings batch engine and its SQLite ledger
+"""
+
+import pytest
+
+pytest.importorskip('dotenv')
+
+from earnings_reports.batch_engine import BatchLedger, EarningsBatchEngine
+
+TICKERS = ['AAPL', 'MSFT', 'NVDA']
+
+
+class _Crash(BaseException):
+    """Escapes the engine's per-item error handling, like a killed process"""
+
+
+def _engine(ledger, write_calls, crash_on=None):
+    def write(ticker, raw_data, processed_data, dry_run):
+        if ticker == crash_on:
+            raise _Crash()
+        write_calls.append(ticker)
+        return {'success': True, 'ticker': ticker, 'html_content': '<html>' + 'x' * 1000,
+                'report_path': f"/reports/{ticker}.html"}
+
+    return EarningsBatchEngine(lambda ticker: {'ticker': ticker}, lambda raw: raw, write,
+                               max_workers=1, ledger=ledger)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return BatchLedger(str(tmp_path / 'ledger.sqlite3'))
+
+
+def test_interrupted_batch_resumes_without_a_batch_id(ledger):
+    calls = []
+    with pytest.raises(_Crash):
+        _engine(ledger, calls, crash_on='NVDA').run(TICKERS, report_type='pre')
+    assert calls == ['AAPL', 'MSFT']
+    interrupted = ledger.incomplete_batches(TICKERS, 'pre', dry_run=False)
+    assert len(interrupted) == 1
+    # Other ticker lists, report types and dry runs do not pick it up
+    assert ledger.incomplete_batches(TICKERS[:2], 'pre') == []
+    assert ledger.incomplete_batches(TICKERS, 'post') == []
+    assert ledger.incomplete_batches(TICKERS, 'pre', dry_run=True) == []
+
+    run = _engine(ledger, calls).run(TICKERS, report_type='pre')
+    assert run['batch_id'] == interrupted[0]['batch_id']
+    assert calls == ['AAPL', 'MSFT', 'NVDA']
+    assert [result['ticker'] for result in run['results']] == TICKERS
+    # AAPL came from the ledger: paths kept, rendered HTML dropped
+    assert run['results'][0] == {'success': True, 'ticker': 'AAPL', 'report_path': '/reports/AAPL.html'}
+    assert 'html_content' in run['results'][2]
+    assert ledger.incomplete_batches() == []
+
+    # A finished batch is not resumed; the same tickers start a new batch
+    again = _engine(ledger, calls).run(TICKERS, report_type='pre')
+    assert again['batch_id'] != run['batch_id']
+    assert calls[3:] == TICKERS
+
+
+def test_prune_removes_only_old_finished_batches(tmp_path):
+    calls = []
+    ledger = BatchLedger(str(tmp_path / 'ledger.sqlite3'), retention_days=0)
+    with pytest.raises(_Crash):
+        _engine(ledger, calls, crash_on='NVDA').run(TICKERS, batch_id='interrupted')
+    _engine(ledger, calls).run(['AAPL'], batch_id='finished')
+
+    assert ledger.prune() == 1
+    assert ledger.summary('finished') == {}
+    assert ledger.summary('interrupted') == {'done': 2, 'running': 1}
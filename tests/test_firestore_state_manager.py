@@ -0,0 +1,118 @@
+"""
+Tests for the WordPress publisher state manager against an in-memory Firestore
+"""
+
+import pytest
+
+from automation_scripts.firestore_state_manager import (
+    FirestoreStateManager,
+    STATE_COLLECTION,
+    INDEX_COLLECTION,
+    PUBLISHED_INDEX_DOC,
+    DAILY_LOGS_COLLECTION,
+    PUBLISHED_LOG_KEY,
+)
+from tests import fake_firestore
+
+PROFILES = ['p1', 'p2']
+
+
+@pytest.fixture
+def db(monkeypatch):
+    return fake_firestore.install(monkeypatch)
+
+
+def _manager(db):
+    manager = FirestoreStateManager()
+    manager.db = db
+    return manager
+
+
+def _load(manager):
+    state = manager.load_state_from_firestore('u1', PROFILES)
+    for pid in PROFILES:
+        state[PUBLISHED_LOG_KEY][pid] = set(state[PUBLISHED_LOG_KEY].get(pid) or [])
+    return state
+
+
+def _hot(db):
+    return db.doc(STATE_COLLECTION, 'u1')
+
+
+def test_save_writes_only_changes_and_load_reads_three_documents(db):
+    manager = _manager(db)
+    state = _load(manager)
+    state['posts_today_by_profile']['p1'] += 1
+    state[PUBLISHED_LOG_KEY]['p1'].add('AAPL')
+    assert manager.save_state_to_firestore('u1', state)
+    assert manager.save_state_to_firestore('u1', state)
+    assert manager.stats()['noop_saves'] == 1
+
+    assert _hot(db)['posts_today_by_profile'] == {'p1': 1, 'p2': 0}
+    day = state['last_run_date']
+    assert db.doc(STATE_COLLECTION, 'u1', DAILY_LOGS_COLLECTION, day)['published_tickers_by_profile'] == {'p1': ['AAPL']}
+
+    db.reads = db.streams = 0
+    fresh = _manager(db).load_state_from_firestore('u1', PROFILES)
+    assert fresh[PUBLISHED_LOG_KEY]['p1'] == {'AAPL'}
+    assert (db.reads, db.streams) == (3, 0)
+
+
+def test_concurrent_writers_keep_each_others_changes(db):
+    worker_a, worker_b = _manager(db), _manager(db)
+    state_a, state_b = _load(worker_a), _load(worker_b)
+
+    state_a['posts_today_by_profile']['p1'] += 1
+    state_a[PUBLISHED_LOG_KEY]['p1'].add('AAPL')
+    assert worker_a.save_state_to_firestore('u1', state_a)
+
+    state_b['posts_today_by_profile']['p1'] += 1
+    state_b[PUBLISHED_LOG_KEY]['p1'].add('MSFT')
+    state_b['pending_tickers_by_profile']['p2'] = ['TSLA']
+    assert worker_b.save_state_to_firestore('u1', state_b)
+    assert worker_b.stats()['conflicts'] == 1
+
+    assert _hot(db)['posts_today_by_profile']['p1'] == 2
+    # B's state now reflects A's write too, so saving it again reverts nothing
+    assert state_b[PUBLISHED_LOG_KEY]['p1'] == {'AAPL', 'MSFT'}
+    state_a['last_author_index_by_profile']['p1'] = 3
+    assert worker_a.save_state_to_firestore('u1', state_a)
+    hot = _hot(db)
+    assert hot['posts_today_by_profile']['p1'] == 2
+    assert hot['pending_tickers_by_profile']['p2'] == ['TSLA']
+    assert hot['last_author_index_by_profile']['p1'] == 3
+    index = db.doc(STATE_COLLECTION, 'u1', INDEX_COLLECTION, PUBLISHED_INDEX_DOC)
+    assert sorted(index['published_tickers_by_profile']['p1']) == ['AAPL', 'MSFT']
+
+
+def test_saves_of_two_states_in_one_process_do_not_overwrite_each_other(db):
+    manager = _manager(db)
+    first, second = _load(manager), _load(manager)
+
+    first['posts_today_by_profile']['p1'] += 1
+    assert manager.save_state_to_firestore('u1', first)
+    # The cache now holds the first save; the second state still diffs against what it loaded
+    second['posts_today_by_profile']['p1'] += 1
+    assert manager.save_state_to_firestore('u1', second)
+
+    assert _hot(db)['posts_today_by_profile']['p1'] == 2
+    assert manager.stats()['conflicts'] == 1
+
+
+def test_published_index_is_built_once_from_daily_logs(db):
+    manager = _manager(db)
+    state = _load(manager)
+    state[PUBLISHED_LOG_KEY]['p1'].update({'AAPL', 'MSFT'})
+    assert manager.save_state_to_firestore('u1', state)
+    # Simulate a document written before the index existed
+    del db.docs[(STATE_COLLECTION, 'u1', INDEX_COLLECTION, PUBLISHED_INDEX_DOC)]
+
+    migrated = _manager(db)
+    assert migrated.load_state_from_firestore('u1', PROFILES)[PUBLISHED_LOG_KEY]['p1'] == {'AAPL', 'MSFT'}
+    assert migrated.stats()['migrations'] == 1
+    assert db.doc(STATE_COLLECTION, 'u1', INDEX_COLLECTION, PUBLISHED_INDEX_DOC) is not None
+
+    state[PUBLISHED_LOG_KEY]['p1'].discard('AAPL')
+    assert manager.save_state_to_firestore('u1', state)
+    index = db.doc(STATE_COLLECTION, 'u1', INDEX_COLLECTION, PUBLISHED_INDEX_DOC)
+    assert index['published_tickers_by_profile']['p1'] == ['MSFT']
@@ -0,0 +1,86 @@
+"""
+Tests for the incremental indicator engine against a full ``ta`` recompute
+"""
+
+import logging
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('ta')
+
+from data_processing_scripts import feature_engineering
+from data_processing_scripts.feature_engineering import _add_ta_indicators
+from data_processing_scripts.indicator_engine import IndicatorEngine, assert_equivalent
+
+
+def _prices(bars, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, bars)))
+    open_ = close * (1 + rng.normal(0, 0.005, bars))
+    return pd.DataFrame({
+        'Date': pd.bdate_range('2021-01-04', periods=bars),
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, bars)),
+        'Low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, bars)),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, bars).astype(float),
+        'SP500': 4000 + rng.normal(0, 10, bars),
+    })
+
+
+def _window(prices, start, stop):
+    return prices.iloc[start:stop].reset_index(drop=True)
+
+
+def _assert_matches_ta(engine, df):
+    result, mode = engine.compute('TEST', df)
+    assert_equivalent(result, _add_ta_indicators(df.copy()))
+    return mode
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return IndicatorEngine(state_dir=str(tmp_path / 'state'))
+
+
+def test_growing_window_continues_the_checkpoint(engine):
+    prices = _prices(420)
+
+    assert _assert_matches_ta(engine, _window(prices, 0, 400)) == 'full'
+    assert _assert_matches_ta(engine, _window(prices, 0, 401)) == 'incremental'
+    assert _assert_matches_ta(engine, _window(prices, 0, 420)) == 'incremental'
+    assert engine.stats()['bars_reused'] == 399 + 400
+
+
+def test_sliding_window_is_rebased_onto_the_new_first_bar(engine):
+    prices = _prices(900)
+
+    assert _assert_matches_ta(engine, _window(prices, 0, 800)) == 'full'
+    assert _assert_matches_ta(engine, _window(prices, 1, 801)) == 'rebased'
+    assert _assert_matches_ta(engine, _window(prices, 40, 850)) == 'rebased'
+    # The rebased checkpoint is anchored at the new first bar
+    assert _assert_matches_ta(engine, _window(prices, 40, 851)) == 'incremental'
+    assert engine.stats()['rebases'] == 2
+
+
+def test_short_sliding_window_is_recomputed(engine):
+    prices = _prices(300)
+
+    assert _assert_matches_ta(engine, _window(prices, 0, 230)) == 'full'
+    assert _assert_matches_ta(engine, _window(prices, 20, 250)) == 'full'
+
+
+def test_verification_mode_accepts_rebased_results(engine, monkeypatch, caplog):
+    prices = _prices(800)
+    monkeypatch.setattr(feature_engineering, 'VERIFY_RESULTS', True)
+    monkeypatch.setattr(feature_engineering, 'get_indicator_engine', lambda: engine)
+
+    with caplog.at_level(logging.ERROR, logger=feature_engineering.__name__):
+        for start, stop in ((0, 700), (5, 705), (5, 706)):
+            feature_engineering.add_technical_indicators(_window(prices, start, stop), ticker='TEST')
+
+    assert caplog.records == []
+    assert engine.stats()['rebases'] == 1
+    assert engine.stats()['full_recomputes'] == 1
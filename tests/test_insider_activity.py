@@ -0,0 +1,56 @@
+"""
+Tests for the insider activity engine's transaction cache
+"""
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from analysis_scripts import insider_activity
+from analysis_scripts.insider_activity import InsiderActivityEngine
+
+TRANSACTIONS = [{'name': 'Jane Doe', 'share': 1000, 'change': -200, 'transactionCode': 'S',
+                 'transactionPrice': 190.0, 'transactionDate': '2026-01-05', 'filingDate': '2026-01-07'}]
+
+
+class _Fetcher:
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = 0
+
+    def __call__(self, ticker):
+        self.calls += 1
+        return self.answers.pop(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(insider_activity.time, 'time', lambda: now[0])
+    return now
+
+
+def test_failed_fetch_is_not_cached(clock):
+    fetch = _Fetcher(None, TRANSACTIONS)
+    engine = InsiderActivityEngine(fetch_transactions=fetch)
+
+    assert engine.transactions('AAPL') == []
+    assert engine.transactions('AAPL') == TRANSACTIONS
+    assert engine.transactions('AAPL') == TRANSACTIONS
+    assert fetch.calls == 2
+    assert engine.stats()['fetch_failures'] == 1
+
+
+def test_empty_result_expires_after_the_short_ttl(clock):
+    fetch = _Fetcher([], TRANSACTIONS)
+    engine = InsiderActivityEngine(transactions_ttl=3600, empty_ttl=60, fetch_transactions=fetch)
+
+    assert engine.transactions('AAPL') == []
+    clock[0] += 30
+    assert engine.transactions('AAPL') == []
+    assert fetch.calls == 1
+    clock[0] += 31
+    assert engine.transactions('AAPL') == TRANSACTIONS
+    clock[0] += 600
+    assert engine.transactions('AAPL') == TRANSACTIONS
+    assert fetch.calls == 2
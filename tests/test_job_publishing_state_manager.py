@@ -0,0 +1,56 @@
+"""
+Tests for concurrent updates of job automation runs and writer rotation state
+"""
+
+import threading
+
+import pytest
+
+from Job_Portal_Automation.state_management.job_publishing_state_manager import JobPublishingStateManager
+from tests import fake_firestore
+
+
+@pytest.fixture
+def db(monkeypatch):
+    return fake_firestore.install(monkeypatch)
+
+
+def _run_threads(targets):
+    threads = [threading.Thread(target=target, args=args) for target, args in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_results_and_errors_are_all_kept(tmp_path, db):
+    manager = JobPublishingStateManager(str(tmp_path), use_firestore=False)
+    manager.db = db
+    run_id = manager.create_run('u1', 'jobs', [{'id': 'a'}], ['p1', 'p2'])
+
+    _run_threads(
+        [(manager.add_run_result, (run_id, f"item{i}", 'Title', f"https://x/{i}", 'p1')) for i in range(20)]
+        + [(manager.add_run_error, (run_id, f"item{i}", 'Title', 'boom', 'publishing')) for i in range(10)]
+    )
+
+    remote = db.doc('job_automation_runs', run_id)
+    local = manager._load_local_run(run_id)
+    for run in (remote, local):
+        assert sorted(r['item_id'] for r in run['results']) == sorted(f"item{i}" for i in range(20))
+        assert len(run['errors']) == 10
+
+
+def test_author_indexes_of_different_profiles_do_not_overwrite_each_other(tmp_path, db):
+    manager = JobPublishingStateManager(str(tmp_path), use_firestore=False)
+    manager.db = db
+    # Another process already rotated authors on a profile this process never touched
+    db.collection('job_automation_writer_rotation').document('u1').set({'other': {'last_author_index': 5}})
+
+    _run_threads([(manager.set_last_author_index, ('u1', f"p{i}", i)) for i in range(8)])
+
+    for i in range(8):
+        assert manager.get_last_author_index('u1', f"p{i}") == i
+    remote = db.doc('job_automation_writer_rotation', 'u1')
+    assert remote['other'] == {'last_author_index': 5}
+    assert {key: value['last_author_index'] for key, value in remote.items() if key != 'other'} == \
+        {f"p{i}": i for i in range(8)}
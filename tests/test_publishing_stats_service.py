@@ -0,0 +1,131 @@
+"""
+Tests for the publishing stats service using the in-memory store
+(no Firestore or emulator required).
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.publishing_stats_service import (
+    PublishingStatsService,
+    InMemoryPublishingStatsStore,
+    RECENT_ACTIVITY_LIMIT,
+)
+
+
+def _article(user_uid, status='published', day=2, title='Article'):
+    return {'user_uid': user_uid, 'title': title, 'site': 'example.com', 'status': status,
+            'published_at': datetime(2026, 1, day, 9, 0, tzinfo=timezone.utc).isoformat(),
+            'article_type': 'stock'}
+
+
+class _FakeSnapshot:
+    def __init__(self, data):
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _FakeQuery:
+    def __init__(self, rows, on_stream=None):
+        self._rows = rows
+        self._on_stream = on_stream
+
+    def where(self, field, op, value):
+        assert op == '=='
+        return _FakeQuery([row for row in self._rows if row.get(field) == value], self._on_stream)
+
+    def select(self, fields):
+        return self
+
+    def stream(self):
+        rows = list(self._rows)
+        if self._on_stream:
+            self._on_stream()
+        return [_FakeSnapshot(row) for row in rows]
+
+
+class _FakeDb:
+    """userPublishedArticles only; ``on_stream`` runs once a query has been read"""
+
+    def __init__(self, articles, on_stream=None):
+        self.articles = articles
+        self.on_stream = on_stream
+
+    def collection(self, name):
+        assert name == 'userPublishedArticles'
+        return _FakeQuery(self.articles, self.on_stream)
+
+
+@pytest.fixture
+def store():
+    return InMemoryPublishingStatsStore()
+
+
+def test_record_article_updates_counts_and_recent_activity(store):
+    service = PublishingStatsService(store=store)
+    for day in range(1, RECENT_ACTIVITY_LIMIT + 3):
+        assert service.record_article(_article('u1', day=day, title=f"A{day}"))
+    assert service.record_article(_article('u1', status='draft', day=1))
+
+    summary = service.get_summary('u1', now=datetime(2026, 1, 5, tzinfo=timezone.utc))
+    assert summary['total_published_count'] == RECENT_ACTIVITY_LIMIT + 3
+    assert summary['pending_count'] == 1
+    assert len(summary['recent_activity']) == RECENT_ACTIVITY_LIMIT
+    assert summary['recent_activity'][0]['title'] == f"A{RECENT_ACTIVITY_LIMIT + 2}"
+    assert store.get('u1')['generation'] == RECENT_ACTIVITY_LIMIT + 3
+
+
+def test_first_recorded_article_rebuilds_from_raw_collection(store):
+    # u1 published two articles before the stats service existed
+    articles = [_article('u1', day=1), _article('u1', day=2)]
+    service = PublishingStatsService(store=store, db=_FakeDb(articles))
+
+    new_article = _article('u1', status='scheduled', day=3)
+    articles.append(new_article)
+    assert service.record_article(new_article)
+
+    stats = store.get('u1')
+    assert stats['total'] == 3
+    assert stats['by_status'] == {'published': 2, 'scheduled': 1}
+    # Later articles are folded in incrementally
+    articles.append(_article('u1', day=4))
+    assert service.record_article(articles[-1])
+    assert store.get('u1')['total'] == 4
+
+
+def test_rebuild_user_retries_when_an_article_is_recorded_meanwhile(store):
+    articles = [_article('u1', day=1)]
+    late = _article('u1', day=2, title='Late')
+    service = PublishingStatsService(store=store)
+    service.record_article(articles[0])
+
+    def record_late_once():
+        if late not in articles:
+            articles.append(late)
+            service.record_article(late)
+
+    service.db = _FakeDb(articles, on_stream=record_late_once)
+    stats = service.rebuild_user('u1')
+
+    assert stats['total'] == 2
+    assert store.get('u1')['total'] == 2
+    assert store.get('u1')['recent_activity'][0]['title'] == 'Late'
+
+
+def test_rebuild_all_reports_drift_and_dry_run_does_not_write(store):
+    articles = [_article('u1'), _article('u2'), _article('u2', status='draft')]
+    service = PublishingStatsService(store=store)
+    service.record_article(articles[0])
+    service.db = _FakeDb(articles)
+
+    result = service.rebuild_all(dry_run=True)
+    assert result['articles'] == 3
+    assert result['drifted_users'] == ['u2']
+    assert store.get('u2') is None
+
+    service.rebuild_all()
+    assert store.get('u2')['by_status'] == {'published': 1, 'draft': 1}
+    assert service.rebuild_all(dry_run=True)['drifted_users'] == []
@@ -0,0 +1,81 @@
+"""
+Tests for the usage history write-behind buffer against an in-memory Firestore
+"""
+
+import importlib
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+from tests import fake_firestore
+
+
+@pytest.fixture
+def quota_service(monkeypatch):
+    db = fake_firestore.install(monkeypatch)
+    # Import against the fake Firestore modules, and drop the module again afterwards
+    monkeypatch.delitem(sys.modules, 'app.services.quota_service', raising=False)
+    module = importlib.import_module('app.services.quota_service')
+    monkeypatch.delitem(sys.modules, 'app.services.quota_service')
+    return module, db
+
+
+def _usage(module, ticker, day):
+    return module.StockReportUsage(ticker=ticker, report_id=f"{ticker}-{day}",
+                                   timestamp=datetime(2026, 3, day, 12, tzinfo=timezone.utc))
+
+
+def _history(db, user_uid='u1'):
+    return db.doc('userQuotas', user_uid, 'usage_history', '2026-03')
+
+
+def test_flush_merges_buffered_records_without_reading(quota_service):
+    module, db = quota_service
+    buffer = module._UsageHistoryBuffer(db, flush_interval=3600)
+    buffer.append('u1', '2026-03', _usage(module, 'AAPL', 1))
+    buffer.append('u1', '2026-03', _usage(module, 'MSFT', 1))
+    buffer.append('u2', '2026-03', _usage(module, 'TSLA', 2))
+
+    assert buffer.flush() == 3
+    assert buffer.pending_count() == 0
+    assert db.reads == 0
+    history = _history(db)
+    assert [record['ticker'] for record in history['stock_reports']] == ['AAPL', 'MSFT']
+    assert history['daily_stats'] == {'2026-03-01': {'stock_reports': 2}}
+    assert history['summary']['total_stock_reports'] == 2
+    assert _history(db, 'u2')['summary']['total_stock_reports'] == 1
+
+
+def test_flush_keeps_records_written_by_another_worker(quota_service):
+    module, db = quota_service
+    ours = module._UsageHistoryBuffer(db, flush_interval=3600)
+    theirs = module._UsageHistoryBuffer(db, flush_interval=3600)
+    ours.append('u1', '2026-03', _usage(module, 'AAPL', 1))
+    theirs.append('u1', '2026-03', _usage(module, 'MSFT', 1))
+    theirs.append('u1', '2026-03', _usage(module, 'NVDA', 2))
+
+    theirs.flush()
+    ours.flush()
+
+    history = module.UsageHistory.from_dict(_history(db))
+    assert sorted(record['ticker'] for record in history.stock_reports) == ['AAPL', 'MSFT', 'NVDA']
+    assert history.daily_stats == {'2026-03-01': {'stock_reports': 2}, '2026-03-02': {'stock_reports': 1}}
+    assert history.summary.total_stock_reports == 3
+
+
+def test_failed_flush_requeues_records(quota_service):
+    module, db = quota_service
+    buffer = module._UsageHistoryBuffer(db, flush_interval=3600)
+    buffer.append('u1', '2026-03', _usage(module, 'AAPL', 1))
+
+    def failing_batch():
+        raise RuntimeError('unavailable')
+
+    db.batch = failing_batch
+    assert buffer.flush() == 0
+    assert buffer.pending_count() == 1
+
+    del db.batch
+    assert buffer.flush() == 1
+    assert _history(db)['summary']['total_stock_reports'] == 1
@@ -0,0 +1,82 @@
+"""
+Tests for the Reddit subreddit snapshot
+"""
+
+import os
+import json
+import threading
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('vaderSentiment')
+
+from analysis_scripts.reddit_sentiment_analyzer import RedditSentimentAnalyzer, SubredditSnapshot
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'reddit_posts.json')
+
+
+def _ids(posts):
+    return [post['id'] for post in posts]
+
+
+def test_fixture_snapshot_is_frozen_at_capture_time():
+    snapshot = SubredditSnapshot.from_fixture(FIXTURE)
+
+    assert snapshot.subreddits == ['wallstreetbets', 'stocks']
+    # Lookback counts from captured_at, not from now
+    mentions, checked = snapshot.mentions('AAPL', lookback_hours=24, limit_per_subreddit=100)
+    assert _ids(mentions) == ['w1', 'w2', 's1', 's2']
+    assert checked == 6
+    assert _ids(snapshot.mentions('AAPL', 24 * 8, 100, min_comments=3)[0]) == ['w1', 'w2', 'w4', 's1']
+    assert _ids(snapshot.mentions('AAPL', 24, limit_per_subreddit=1)[0]) == ['w1', 's1']
+    assert _ids(snapshot.mentions('BRK.B', 24, 100)[0]) == ['s1']
+    assert snapshot.mentions('5', 24, 100)[0] == []
+    assert mentions[0]['sentiment'] > 0 > mentions[1]['sentiment']
+
+    def fetch(name, limit):
+        raise AssertionError("a frozen snapshot is never refetched")
+    snapshot.refresh(fetch, limit=500)
+    assert snapshot.get_stats()['frozen']
+
+
+def test_analyzer_runs_offline_on_a_fixture():
+    analyzer = RedditSentimentAnalyzer(client_id='', client_secret='',
+                                       snapshot=SubredditSnapshot.from_fixture(FIXTURE))
+    result = analyzer.analyze_ticker_sentiment('$aapl')
+
+    assert result['mention_count'] == 3
+    assert result['post_count'] == 6
+    assert result['top_post']['title'] == '$AAPL crushed earnings, great quarter'
+    assert analyzer.stats['api_calls'] == 0
+
+
+def test_lookups_are_answered_while_a_refresh_is_fetching():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        posts = json.load(f)['subreddits']['wallstreetbets']
+    snapshot = SubredditSnapshot(['wallstreetbets'], ttl_seconds=3600)
+    snapshot.load_listing('wallstreetbets', posts[:1], limit=1)
+
+    fetching = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(name, limit):
+        calls.append(name)
+        fetching.set()
+        assert release.wait(5)
+        return posts[:limit]
+
+    refreshers = [threading.Thread(target=snapshot.refresh, args=(fetch, 2)) for _ in range(2)]
+    refreshers[0].start()
+    assert fetching.wait(5)
+    # The current listing keeps answering; the second refresh waits for the one in flight
+    assert _ids(snapshot.mentions('AAPL', 24 * 365 * 100, 2)[0]) == ['w1']
+    refreshers[1].start()
+    release.set()
+    for refresher in refreshers:
+        refresher.join()
+
+    assert calls == ['wallstreetbets']
+    assert _ids(snapshot.mentions('AAPL', 24 * 365 * 100, 2)[0]) == ['w1', 'w2']
+    assert snapshot.get_stats()['refreshes'] == 1
@@ -0,0 +1,68 @@
+"""
+Tests for the benchmark harness refusing runs it cannot measure
+"""
+
+import json
+
+import pytest
+
+from benchmarks import run_benchmarks
+from benchmarks.fixture_store import FixtureStore
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path):
+    store = FixtureStore(str(tmp_path / 'fixtures'), mode='record')
+    store.record('http', 'GET https://example.com/quote', {'price': 1})
+    store.save()
+    return store.fixtures_dir
+
+
+def _no_scenarios(monkeypatch):
+    def run_scenario(name, options):
+        raise AssertionError(f"{name} should not run")
+    monkeypatch.setattr(run_benchmarks, 'run_scenario', run_scenario)
+
+
+def test_replay_without_fixtures_fails(tmp_path, monkeypatch, capsys):
+    _no_scenarios(monkeypatch)
+    with pytest.raises(SystemExit) as exit_info:
+        run_benchmarks.main(['--fixtures-dir', str(tmp_path / 'empty'),
+                             '--baseline', str(tmp_path / 'baseline.json')])
+    assert exit_info.value.code == 2
+    assert 'No recorded fixtures' in capsys.readouterr().err
+
+
+def test_replay_without_baseline_fails(tmp_path, fixtures_dir, monkeypatch, capsys):
+    _no_scenarios(monkeypatch)
+    with pytest.raises(SystemExit) as exit_info:
+        run_benchmarks.main(['--fixtures-dir', fixtures_dir, '--baseline', str(tmp_path / 'baseline.json')])
+    assert exit_info.value.code == 2
+    assert 'No baseline' in capsys.readouterr().err
+
+
+def test_replay_with_unrecorded_calls_is_not_saved_as_baseline(tmp_path, fixtures_dir, monkeypatch):
+    baseline = tmp_path / 'baseline.json'
+    monkeypatch.setattr(run_benchmarks, 'run_scenario', lambda name, options: {
+        'scenario': name, 'status': 'ok', 'wall_seconds': 1.0, 'stages': {},
+        'fixtures': {'misses': 3, 'missing': ['http:GET https://example.com/other']},
+    })
+
+    code = run_benchmarks.main(['--scenarios', 'stock_report', '--fixtures-dir', fixtures_dir,
+                                '--baseline', str(baseline), '--update-baseline'])
+    assert code == 1
+    assert not baseline.exists()
+
+
+def test_regression_against_baseline_fails(tmp_path, fixtures_dir, monkeypatch):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'tickers': ['AAPL', 'MSFT'], 'articles': 1, 'scenarios': {
+        'stock_report': {'status': 'ok', 'wall_seconds': 1.0, 'peak_rss_mb': 100.0},
+    }}))
+    monkeypatch.setattr(run_benchmarks, 'run_scenario', lambda name, options: {
+        'scenario': name, 'status': 'ok', 'wall_seconds': 1.5, 'peak_rss_mb': 100.0,
+        'stages': {}, 'fixtures': {'misses': 0},
+    })
+
+    assert run_benchmarks.main(['--scenarios', 'stock_report', '--fixtures-dir', fixtures_dir,
+                                '--baseline', str(baseline)]) == 1
@@ -0,0 +1,57 @@
+"""
+Tests for the concurrent section renderer
+"""
+
+import threading
+import time
+
+import pytest
+
+from reporting_tools.section_graph import Section, SectionGraph, cancelled, check_cancelled
+
+
+def test_timed_out_section_sees_its_cancellation_flag():
+    stopped = threading.Event()
+
+    def slow(context):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if cancelled():
+                stopped.set()
+                check_cancelled()
+            time.sleep(0.01)
+        return '<p>late</p>'
+
+    graph = SectionGraph([
+        Section('slow', slow, timeout=0.2, fallback='<p>fallback</p>'),
+        Section('fast', lambda context: '<p>fast</p>'),
+    ], max_workers=2)
+    result = graph.render({})
+
+    assert result.html == {'slow': '<p>fallback</p>', 'fast': '<p>fast</p>'}
+    assert result.timings['slow']['status'] == 'timeout'
+    assert stopped.wait(2)
+    assert not cancelled()
+
+
+def test_metrics_renderer_is_scoped_to_the_rendering_thread():
+    hc = pytest.importorskip('app.html_components')
+    barrier = threading.Barrier(2)
+    tables = {}
+
+    def render(label):
+        def table(metrics, ticker=None):
+            return f"{label}:{sorted(metrics)}"
+
+        with hc.metrics_section_renderer(table):
+            barrier.wait()
+            tables[label] = hc.generate_metrics_section_content({'Beta': 1.2})
+
+    threads = [threading.Thread(target=render, args=(label,)) for label in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tables == {'a': "a:['Beta']", 'b': "b:['Beta']"}
+    assert 'metrics-table' in hc.generate_metrics_section_content({'Beta': 1.2})